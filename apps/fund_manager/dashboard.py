@@ -18,9 +18,12 @@ import customtkinter as ctk
 from CTkTable import CTkTable
 import sqlite3
 from datetime import datetime, timedelta
+import time
 import os
 from pathlib import Path
 import sys
+import threading
+from tkinter import ttk
 
 # For charts
 import matplotlib.pyplot as plt
@@ -36,6 +39,23 @@ try:
 except ImportError:
     HAS_PANDAS = False
 
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.fund_manager.data_refresh import (
+    ChangeTracker,
+    DataRefreshService,
+    SchemaCache,
+    open_read_connection,
+)
+from apps.fund_manager.result_grid import (
+    HAS_PYARROW,
+    QueryCancelled,
+    QueryExport,
+    ResultPager,
+    format_cell,
+)
+
 # Import alerts tab (optional - won't break if missing)
 try:
     from alerts_tab import AlertsTab
@@ -142,6 +162,11 @@ class DatabaseManager:
         
         if db_path and os.path.exists(db_path):
             self.connected = True
+        
+        # One persistent read-only connection per thread (Tk main thread
+        # and the refresh worker), reopened if db_path changes
+        self._local = threading.local()
+        self.schema = SchemaCache()
     
     def get_connection(self):
         """Get a database connection"""
@@ -149,35 +174,49 @@ class DatabaseManager:
             return None
         return sqlite3.connect(self.db_path)
     
+    def get_read_connection(self):
+        """Get this thread's persistent read-only connection"""
+        if not self.connected:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.path != self.db_path:
+            if conn is not None:
+                conn.close()
+            conn = open_read_connection(self.db_path)
+            self._local.conn = conn
+            self._local.path = self.db_path
+        return conn
+    
     def execute_query(self, query, params=None):
-        """Execute a query and return results"""
+        """Execute a read query and return results"""
         if not self.connected:
             return None, None
         
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            
+            cursor = self.get_read_connection().execute(query, params or ())
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
             results = cursor.fetchall()
-            conn.close()
             return columns, results
         except Exception as e:
-            conn.close()
             return None, str(e)
     
     def get_tables(self):
-        """Get list of all tables"""
-        cols, results = self.execute_query(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        )
-        if results and isinstance(results, list):
-            return [r[0] for r in results]
-        return []
+        """Get list of all tables (cached until the schema changes)"""
+        if not self.connected:
+            return []
+        try:
+            return self.schema.tables(self.get_read_connection(), self.db_path)
+        except Exception:
+            return []
+    
+    def get_columns(self, table_name):
+        """Get column names of a table (cached until the schema changes)"""
+        if not self.connected:
+            return []
+        try:
+            return self.schema.columns(self.get_read_connection(), self.db_path, table_name)
+        except Exception:
+            return []
     
     def get_table_data(self, table_name, limit=1000):
         """Get all data from a table"""
@@ -186,14 +225,7 @@ class DatabaseManager:
     def get_investors(self):
         """Get all investors with their current positions"""
         # First, check what columns exist in investors table
-        try:
-            cols_info = self.execute_query("PRAGMA table_info(investors)")
-            if cols_info and cols_info[1]:
-                col_names = [c[1] for c in cols_info[1]]
-            else:
-                col_names = []
-        except:
-            col_names = []
+        col_names = self.get_columns('investors')
         
         # Determine correct column name for shares
         if 'current_shares' in col_names:
@@ -233,15 +265,7 @@ class DatabaseManager:
     def get_investor_count(self):
         """Get count of active investors"""
         # Check if status column exists
-        try:
-            cols_info = self.execute_query("PRAGMA table_info(investors)")
-            if cols_info and cols_info[1]:
-                col_names = [c[1] for c in cols_info[1]]
-                has_status = 'status' in col_names
-            else:
-                has_status = False
-        except:
-            has_status = False
+        has_status = 'status' in self.get_columns('investors')
         
         if has_status:
             query = """
@@ -349,6 +373,16 @@ class DatabaseManager:
         return self.execute_query(query)
 
 
+def submit_refresh(tab, fetch=None):
+    """Run tab.fetch_data on the refresh worker and tab.apply_data on the
+    main thread; synchronously when the tab has no refresher"""
+    fetch = fetch or tab.fetch_data
+    if tab.refresher is not None:
+        tab.refresher.submit(tab.REFRESH_NAME, fetch, tab.apply_data)
+    else:
+        tab.apply_data(fetch())
+
+
 class MetricCard(ctk.CTkFrame):
     """A card widget for displaying a single metric"""
     
@@ -575,9 +609,13 @@ class DataTableFrame(ctk.CTkFrame):
 class DashboardTab(ctk.CTkFrame):
     """Main dashboard overview tab"""
     
-    def __init__(self, parent, db_manager, **kwargs):
+    REFRESH_NAME = "Dashboard"
+    
+    def __init__(self, parent, db_manager, refresher=None, **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
         self.db = db_manager
+        self.refresher = refresher
+        self.changes = ChangeTracker()
         
         self.create_widgets()
         self.refresh_data()
@@ -651,48 +689,22 @@ class DashboardTab(ctk.CTkFrame):
         """Refresh all dashboard data"""
         if not self.db.connected:
             return
-        
-        # Update portfolio summary
-        summary = self.db.get_portfolio_summary()
-        if summary:
-            # Portfolio value
-            self.card_portfolio.update_value(
-                f"${summary['total_value']:,.2f}",
-                f"Last update: {summary['last_update']}"
-            )
-            
-            # NAV per share with change color
-            nav_change = summary.get('nav_change', 0)
-            nav_change_pct = summary.get('nav_change_pct', 0)
-            
-            if nav_change > 0:
-                nav_color = COLORS['success']  # Green for up
-                nav_subtitle = f"▲ ${nav_change:.4f} ({nav_change_pct:+.2f}%)"
-            elif nav_change < 0:
-                nav_color = COLORS['danger']   # Red for down
-                nav_subtitle = f"▼ ${abs(nav_change):.4f} ({nav_change_pct:.2f}%)"
-            else:
-                nav_color = COLORS['text']     # Neutral
-                nav_subtitle = "No change"
-            
-            self.card_nav.update_value(
-                f"${summary['nav_per_share']:.4f}",
-                nav_subtitle,
-                color=nav_color
-            )
-            
-            # Total shares
-            self.card_shares.update_value(f"{summary['total_shares']:,.2f}")
-        
-        # Update investor count
-        investor_count = self.db.get_investor_count()
-        self.card_investors.update_value(str(investor_count))
-        
-        # Update investor positions table and pie chart
+        submit_refresh(self)
+    
+    def fetch_data(self):
+        """Query and format dashboard data (no widget access - runs on the refresh worker)"""
+        data = {
+            'summary': self.db.get_portfolio_summary(),
+            'investor_count': self.db.get_investor_count(),
+            'positions': None,
+            'allocation': None,
+            'nav_history': None,
+            'transactions': None,
+        }
+        
+        # Investor positions table and pie chart
         cols, investors = self.db.get_investors()
         if investors and isinstance(investors, list) and len(investors) > 0:
-            # Update positions table
-            headers = ["ID", "Name", "Shares", "Net Inv", "NAV", "Value", "Gain"]
             rows = []
             for inv in investors:
                 try:
@@ -708,45 +720,31 @@ class DashboardTab(ctk.CTkFrame):
                 except (IndexError, TypeError, ValueError) as e:
                     print(f"Error processing investor row: {e}")
                     continue
+            data['positions'] = rows
             
-            if rows:
-                self.positions_table.update_data(headers, rows)
-            
-            # Update allocation pie chart
             try:
                 names = [str(inv[1]) for inv in investors if inv[1]]
                 values = [float(inv[6]) for inv in investors if inv[6] and float(inv[6]) > 0]
-                names = names[:len(values)]
-                if values:
-                    self.allocation_chart.create_pie_chart(names, values)
+                data['allocation'] = (names[:len(values)], values)
             except (IndexError, TypeError, ValueError) as e:
                 print(f"Error creating allocation chart: {e}")
-        else:
-            # Show "no data" message
-            self.positions_table.update_data(["Message"], [["No investor data found"]])
         
-        # Update NAV history chart
+        # NAV history chart
         cols, nav_history = self.db.get_nav_history(days=60)
         if nav_history and isinstance(nav_history, list) and len(nav_history) > 0:
-            try:
-                dates = []
-                nav_values = []
-                for row in nav_history:
-                    try:
-                        dates.append(datetime.strptime(str(row[0]), '%Y-%m-%d'))
-                        nav_values.append(float(row[1]))
-                    except (ValueError, TypeError):
-                        continue
-                
-                if dates and nav_values:
-                    self.nav_chart.create_line_chart(dates, nav_values, ylabel="NAV per Share")
-            except Exception as e:
-                print(f"Error creating NAV chart: {e}")
+            dates = []
+            nav_values = []
+            for row in nav_history:
+                try:
+                    dates.append(datetime.strptime(str(row[0]), '%Y-%m-%d'))
+                    nav_values.append(float(row[1]))
+                except (ValueError, TypeError):
+                    continue
+            data['nav_history'] = (dates, nav_values)
         
-        # Update recent transactions
+        # Recent transactions
         cols, transactions = self.db.get_recent_transactions(limit=10)
         if transactions and isinstance(transactions, list) and len(transactions) > 0:
-            headers = ["Date", "Investor", "Type", "Amount", "Shares", "NAV"]
             rows = []
             for txn in transactions:
                 try:
@@ -761,11 +759,80 @@ class DashboardTab(ctk.CTkFrame):
                 except (IndexError, TypeError, ValueError) as e:
                     print(f"Error processing transaction row: {e}")
                     continue
+            data['transactions'] = rows
+        
+        return data
+    
+    def apply_data(self, data):
+        """Redraw the dashboard widgets whose data changed"""
+        summary = data['summary']
+        if summary and self.changes.changed('summary', summary):
+            # Portfolio value
+            self.card_portfolio.update_value(
+                f"${summary['total_value']:,.2f}",
+                f"Last update: {summary['last_update']}"
+            )
             
-            if rows:
-                self.transactions_table.update_data(headers, rows)
-        else:
-            self.transactions_table.update_data(["Message"], [["No recent transactions"]])
+            # NAV per share with change color
+            nav_change = summary.get('nav_change', 0)
+            nav_change_pct = summary.get('nav_change_pct', 0)
+            
+            if nav_change > 0:
+                nav_color = COLORS['success']  # Green for up
+                nav_subtitle = f"▲ ${nav_change:.4f} ({nav_change_pct:+.2f}%)"
+            elif nav_change < 0:
+                nav_color = COLORS['danger']   # Red for down
+                nav_subtitle = f"▼ ${abs(nav_change):.4f} ({nav_change_pct:.2f}%)"
+            else:
+                nav_color = COLORS['text']     # Neutral
+                nav_subtitle = "No change"
+            
+            self.card_nav.update_value(
+                f"${summary['nav_per_share']:.4f}",
+                nav_subtitle,
+                color=nav_color
+            )
+            
+            # Total shares
+            self.card_shares.update_value(f"{summary['total_shares']:,.2f}")
+        
+        # Investor count
+        if self.changes.changed('investor_count', data['investor_count']):
+            self.card_investors.update_value(str(data['investor_count']))
+        
+        # Investor positions table and pie chart
+        positions = data['positions']
+        if positions is None:
+            if self.changes.changed('positions', None):
+                self.positions_table.update_data(["Message"], [["No investor data found"]])
+        elif positions and self.changes.changed('positions', positions):
+            headers = ["ID", "Name", "Shares", "Net Inv", "NAV", "Value", "Gain"]
+            self.positions_table.update_data(headers, positions)
+        
+        allocation = data['allocation']
+        if allocation and allocation[1] and self.changes.changed('allocation', allocation):
+            try:
+                self.allocation_chart.create_pie_chart(*allocation)
+            except (IndexError, TypeError, ValueError) as e:
+                print(f"Error creating allocation chart: {e}")
+        
+        # NAV history chart
+        nav_history = data['nav_history']
+        if (nav_history and nav_history[0] and nav_history[1]
+                and self.changes.changed('nav_history', nav_history)):
+            try:
+                self.nav_chart.create_line_chart(*nav_history, ylabel="NAV per Share")
+            except Exception as e:
+                print(f"Error creating NAV chart: {e}")
+        
+        # Recent transactions
+        transactions = data['transactions']
+        if transactions is None:
+            if self.changes.changed('transactions', None):
+                self.transactions_table.update_data(["Message"], [["No recent transactions"]])
+        elif transactions and self.changes.changed('transactions', transactions):
+            headers = ["Date", "Investor", "Type", "Amount", "Shares", "NAV"]
+            self.transactions_table.update_data(headers, transactions)
 
 
 class DataExplorerTab(ctk.CTkFrame):
@@ -775,6 +842,14 @@ class DataExplorerTab(ctk.CTkFrame):
         super().__init__(parent, fg_color="transparent", **kwargs)
         self.db = db_manager
         
+        # Queries and exports run on this tab's own worker so a slow
+        # query never delays the other tabs' refreshes
+        self.worker = DataRefreshService(self.after)
+        self.worker.start()
+        self.pager = None
+        self.page_index = 0
+        self.export = None
+        
         self.create_widgets()
     
     def create_widgets(self):
@@ -851,158 +926,177 @@ class DataExplorerTab(ctk.CTkFrame):
         self.results_frame = ctk.CTkFrame(self, fg_color=COLORS['bg_card'], corner_radius=10)
         self.results_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Status bar
+        # Status bar and pager controls
+        self.pager_frame = ctk.CTkFrame(self.results_frame, fg_color="transparent")
+        self.pager_frame.pack(fill="x", padx=15, pady=10)
+        
         self.status_label = ctk.CTkLabel(
-            self.results_frame,
+            self.pager_frame,
             text="Ready",
             font=ctk.CTkFont(size=11),
             text_color=COLORS['text_secondary']
         )
-        self.status_label.pack(anchor="w", padx=15, pady=10)
+        self.status_label.pack(side="left")
         
-        # Results table container
-        self.results_scroll = ctk.CTkScrollableFrame(
-            self.results_frame,
-            fg_color="transparent"
+        self.cancel_btn = ctk.CTkButton(
+            self.pager_frame,
+            text="✖ Cancel",
+            width=80,
+            fg_color=COLORS['danger'],
+            state="disabled",
+            command=self.cancel_query
         )
-        self.results_scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.cancel_btn.pack(side="right", padx=5)
         
-        # Store current results
+        self.next_btn = ctk.CTkButton(
+            self.pager_frame, text="Next ▶", width=80, state="disabled",
+            command=lambda: self.show_page(self.page_index + 1)
+        )
+        self.next_btn.pack(side="right", padx=5)
+        
+        self.page_label = ctk.CTkLabel(self.pager_frame, text="", font=ctk.CTkFont(size=11))
+        self.page_label.pack(side="right", padx=5)
+        
+        self.prev_btn = ctk.CTkButton(
+            self.pager_frame, text="◀ Prev", width=80, state="disabled",
+            command=lambda: self.show_page(self.page_index - 1)
+        )
+        self.prev_btn.pack(side="right", padx=5)
+        
+        # Results grid: a Treeview holding only the rows of the current page
+        grid_frame = ctk.CTkFrame(self.results_frame, fg_color="transparent")
+        grid_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        
+        style = ttk.Style()
+        style.configure(
+            "Explorer.Treeview",
+            background=COLORS['bg_card'],
+            fieldbackground=COLORS['bg_card'],
+            foreground=COLORS['text'],
+            rowheight=22
+        )
+        style.configure("Explorer.Treeview.Heading", background=COLORS['accent'],
+                        foreground=COLORS['text'])
+        
+        self.results_grid = ttk.Treeview(grid_frame, show="headings", style="Explorer.Treeview")
+        y_scroll = ttk.Scrollbar(grid_frame, orient="vertical", command=self.results_grid.yview)
+        x_scroll = ttk.Scrollbar(grid_frame, orient="horizontal", command=self.results_grid.xview)
+        self.results_grid.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        y_scroll.pack(side="right", fill="y")
+        x_scroll.pack(side="bottom", fill="x")
+        self.results_grid.pack(fill="both", expand=True)
+        
+        # Current query (re-run by the streaming export)
+        self.current_query = ""
         self.current_columns = []
-        self.current_data = []
     
     def on_table_select(self, table_name):
         """Handle table selection"""
         pass  # Can add preview functionality
     
     def view_selected_table(self):
-        """View the selected table"""
+        """View the selected table (keyset-paged, no row limit)"""
         table_name = self.table_dropdown.get()
         if table_name and table_name != "No database connected":
-            cols, results = self.db.get_table_data(table_name)
-            self.display_results(cols, results, f"SELECT * FROM {table_name}")
+            self.start_query(ResultPager(self.db.db_path, table=table_name),
+                             f"SELECT * FROM {table_name}")
     
     def run_custom_sql(self):
         """Run custom SQL query"""
         query = self.sql_input.get("0.0", "end").strip()
-        if query:
-            cols, results = self.db.execute_query(query)
-            self.display_results(cols, results, query)
-    
-    def display_results(self, columns, results, query=""):
-        """Display query results in table"""
-        # Clear previous results
-        for widget in self.results_scroll.winfo_children():
-            widget.destroy()
+        if query and self.db.connected:
+            self.start_query(ResultPager(self.db.db_path, query=query), query)
+    
+    def start_query(self, pager, query):
+        """Replace the current result with a new pager and show its first page"""
+        if self.pager is not None:
+            self.pager.cancel()
+            self.pager.close()
+        self.pager = pager
+        self.current_query = query
+        self.current_columns = []
+        self.show_page(0)
+    
+    def show_page(self, index):
+        """Fetch one page on the worker and draw it when it arrives"""
+        pager = self.pager
+        if pager is None or index < 0:
+            return
+        self.status_label.configure(text="⏳ Running query...", text_color=COLORS['text_secondary'])
+        self.cancel_btn.configure(state="normal")
+        self.prev_btn.configure(state="disabled")
+        self.next_btn.configure(state="disabled")
         
-        if columns is None:
-            # Error occurred
+        def fetch():
+            started = time.perf_counter()
+            try:
+                rows, has_next = pager.page(index)
+            except QueryCancelled:
+                return {'cancelled': True}
+            except Exception as e:
+                return {'error': str(e)}
+            return {'rows': rows, 'has_next': has_next,
+                    'ms': (time.perf_counter() - started) * 1000}
+        
+        self.worker.submit("Data Explorer", fetch,
+                           lambda data: self.display_page(pager, index, data))
+    
+    def cancel_query(self):
+        """Interrupt the running query or export"""
+        if self.export is not None:
+            self.export.cancel()
+        if self.pager is not None:
+            self.pager.cancel()
+    
+    def display_page(self, pager, index, data):
+        """Draw one page of results (formats only the visible rows)"""
+        if pager is not self.pager:
+            return  # A newer query replaced this one
+        self.cancel_btn.configure(state="normal" if self.export else "disabled")
+        
+        if data.get('cancelled'):
+            self.status_label.configure(text="⚠️ Query cancelled", text_color=COLORS['warning'])
+            return
+        if 'error' in data:
             self.status_label.configure(
-                text=f"❌ Error: {results}",
+                text=f"❌ Error: {data['error']}",
                 text_color=COLORS['danger']
             )
             return
         
-        if not results:
+        rows = data['rows']
+        self.page_index = index
+        columns = pager.columns
+        if columns != self.current_columns:
+            self.current_columns = columns
+            self.results_grid.configure(columns=columns)
+            for col in columns:
+                self.results_grid.heading(col, text=col)
+                self.results_grid.column(col, width=120, stretch=False)
+        
+        self.results_grid.delete(*self.results_grid.get_children())
+        for row in rows:
+            self.results_grid.insert("", "end", values=[format_cell(v) for v in row])
+        
+        first = index * pager.page_size
+        if rows:
             self.status_label.configure(
-                text="No results returned",
-                text_color=COLORS['warning']
-            )
-            return
-        
-        # Store for export
-        self.current_columns = columns
-        self.current_data = results
-        
-        # Update status
-        self.status_label.configure(
-            text=f"✅ {len(results)} rows returned",
-            text_color=COLORS['success']
-        )
-        
-        # Format data for display
-        formatted_rows = []
-        for row in results:
-            formatted_row = []
-            for val in row:
-                if val is None:
-                    formatted_row.append("NULL")
-                elif isinstance(val, float):
-                    formatted_row.append(f"{val:.4f}")
-                else:
-                    # Truncate long strings for display
-                    s = str(val)
-                    formatted_row.append(s[:50] if len(s) > 50 else s)
-            formatted_rows.append(formatted_row)
-        
-        # Create table data with headers
-        table_data = [list(columns)] + formatted_rows[:100]
-        
-        try:
-            # Create table with explicit row/column count
-            table = CTkTable(
-                master=self.results_scroll,
-                values=table_data,
-                header_color=COLORS['accent'],
-                hover_color=COLORS['bg_dark'],
-                colors=[COLORS['bg_card'], COLORS['bg_dark']],
-                text_color=COLORS['text'],
-                corner_radius=5,
-                wraplength=150
+                text=f"✅ Rows {first + 1:,}–{first + len(rows):,}"
+                     f"{'+' if data['has_next'] else ''} ({data['ms']:.0f} ms)",
+                text_color=COLORS['success']
             )
-            table.pack(fill="both", expand=True, padx=5, pady=5)
-        except Exception as e:
-            # Fallback: display as text if CTkTable fails
+        else:
             self.status_label.configure(
-                text=f"⚠️ Table widget error, showing as text. {len(results)} rows.",
+                text="No results returned",
                 text_color=COLORS['warning']
             )
-            
-            # Create text display instead
-            text_widget = ctk.CTkTextbox(
-                self.results_scroll,
-                fg_color=COLORS['bg_dark'],
-                text_color=COLORS['text'],
-                font=ctk.CTkFont(family="Consolas", size=11)
-            )
-            text_widget.pack(fill="both", expand=True, padx=5, pady=5)
-            
-            # Format as text table
-            col_widths = []
-            for i, col in enumerate(columns):
-                max_width = len(str(col))
-                for row in formatted_rows[:100]:
-                    if i < len(row):
-                        max_width = max(max_width, len(str(row[i])))
-                col_widths.append(min(max_width + 2, 25))
-            
-            # Header
-            header_line = ""
-            for i, col in enumerate(columns):
-                header_line += str(col).ljust(col_widths[i])
-            text_widget.insert("end", header_line + "\n")
-            text_widget.insert("end", "-" * sum(col_widths) + "\n")
-            
-            # Data rows
-            for row in formatted_rows[:100]:
-                row_line = ""
-                for i, val in enumerate(row):
-                    if i < len(col_widths):
-                        row_line += str(val).ljust(col_widths[i])
-                text_widget.insert("end", row_line + "\n")
-            
-            text_widget.configure(state="disabled")
-        
-        if len(results) > 100:
-            ctk.CTkLabel(
-                self.results_scroll,
-                text=f"Showing first 100 of {len(results)} rows",
-                text_color=COLORS['warning']
-            ).pack(pady=5)
+        self.page_label.configure(text=f"Page {index + 1}")
+        self.prev_btn.configure(state="normal" if index > 0 else "disabled")
+        self.next_btn.configure(state="normal" if data['has_next'] else "disabled")
     
     def export_to_csv(self):
-        """Export current results to CSV"""
-        if not self.current_data:
+        """Stream the current query to CSV (or Parquet) on the worker"""
+        if not self.current_query:
             self.status_label.configure(
                 text="No data to export",
                 text_color=COLORS['warning']
@@ -1014,11 +1108,14 @@ class DataExplorerTab(ctk.CTkFrame):
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"export_{timestamp}.csv"
+        filetypes = [("CSV Files", "*.csv")]
+        if HAS_PYARROW:
+            filetypes.append(("Parquet Files", "*.parquet"))
         
         filename = filedialog.asksaveasfilename(
-            title="Save CSV Export",
+            title="Save Export",
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+            filetypes=filetypes + [("All Files", "*.*")],
             initialfile=default_filename
         )
         
@@ -1026,40 +1123,56 @@ class DataExplorerTab(ctk.CTkFrame):
             # User cancelled
             return
         
+        fmt = 'parquet' if filename.lower().endswith('.parquet') else 'csv'
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                # Write headers
-                f.write(",".join(str(col) for col in self.current_columns) + "\n")
-                # Write data
-                for row in self.current_data:
-                    formatted = []
-                    for val in row:
-                        if val is None:
-                            formatted.append("")
-                        elif isinstance(val, str) and ("," in val or '"' in val or '\n' in val):
-                            # Escape quotes and wrap in quotes
-                            formatted.append(f'"{val.replace(chr(34), chr(34)+chr(34))}"')
-                        else:
-                            formatted.append(str(val))
-                    f.write(",".join(formatted) + "\n")
-            
+            export = QueryExport(self.db.db_path, self.current_query, filename, fmt=fmt)
+        except (ValueError, RuntimeError) as e:
+            self.status_label.configure(text=f"❌ Export failed: {e}", text_color=COLORS['danger'])
+            return
+        self.export = export
+        self.cancel_btn.configure(state="normal")
+        self.status_label.configure(text=f"⏳ Exporting to {filename}...",
+                                    text_color=COLORS['text_secondary'])
+        
+        def run():
+            try:
+                return export.run()
+            except QueryCancelled:
+                return {'cancelled': True}
+            except Exception as e:
+                return {'error': str(e)}
+        
+        self.worker.submit("Export", run, self.export_finished)
+    
+    def export_finished(self, result):
+        """Report the outcome of a streaming export"""
+        self.export = None
+        self.cancel_btn.configure(state="disabled")
+        if result.get('cancelled'):
+            self.status_label.configure(text="⚠️ Export cancelled", text_color=COLORS['warning'])
+        elif 'error' in result:
             self.status_label.configure(
-                text=f"✅ Exported to {filename}",
-                text_color=COLORS['success']
+                text=f"❌ Export failed: {result['error']}",
+                text_color=COLORS['danger']
             )
-        except Exception as e:
+        else:
             self.status_label.configure(
-                text=f"❌ Export failed: {str(e)}",
-                text_color=COLORS['danger']
+                text=f"✅ Exported {result['rows']:,} rows to {result['path']} "
+                     f"in {result['seconds']:.1f}s",
+                text_color=COLORS['success']
             )
 
 
 class TradingJournalTab(ctk.CTkFrame):
     """Trading journal tab for viewing trades"""
     
-    def __init__(self, parent, db_manager, **kwargs):
+    REFRESH_NAME = "Trading Journal"
+    
+    def __init__(self, parent, db_manager, refresher=None, **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
         self.db = db_manager
+        self.refresher = refresher
+        self.changes = ChangeTracker()
         
         self.create_widgets()
         self.refresh_data()
@@ -1136,20 +1249,24 @@ class TradingJournalTab(ctk.CTkFrame):
         """Refresh trading data"""
         if not self.db.connected:
             return
-        
+        self.apply_filter()
+    
+    def apply_filter(self):
+        """Apply filters and load trades"""
+        # Read the filter widgets here, on the main thread
+        symbol = self.symbol_filter.get().strip().upper()
+        category = self.category_filter.get()
+        try:
+            limit = int(self.limit_filter.get())
+        except ValueError:
+            limit = 100
+        submit_refresh(self, lambda: self.fetch_data(symbol, category, limit))
+    
+    def fetch_data(self, symbol="", category="All", limit=100):
+        """Query summary stats and filtered trades (no widget access)"""
         # Check if trades table exists
-        tables = self.db.get_tables()
-        if 'trades' not in tables:
-            # Show message
-            for widget in self.trades_table.scroll_frame.winfo_children():
-                widget.destroy()
-            ctk.CTkLabel(
-                self.trades_table.scroll_frame,
-                text="Trading journal not available.\nRun: python scripts/import_tradier_history.py --import",
-                text_color=COLORS['warning'],
-                font=ctk.CTkFont(size=14)
-            ).pack(pady=50)
-            return
+        if 'trades' not in self.db.get_tables():
+            return {'available': False}
         
         # Get summary stats
         cols, results = self.db.execute_query("""
@@ -1161,24 +1278,7 @@ class TradingJournalTab(ctk.CTkFrame):
             FROM trades
             WHERE category = 'Trade'
         """)
-        
-        if results and len(results) > 0:
-            self.card_trades.update_value(str(results[0][0] or 0))
-            self.card_commission.update_value(f"${(results[0][1] or 0):,.2f}")
-            self.card_symbols.update_value(str(results[0][2] or 0))
-            self.card_volume.update_value(f"${(results[0][3] or 0):,.2f}")
-        
-        # Load trades
-        self.apply_filter()
-    
-    def apply_filter(self):
-        """Apply filters and load trades"""
-        symbol = self.symbol_filter.get().strip().upper()
-        category = self.category_filter.get()
-        try:
-            limit = int(self.limit_filter.get())
-        except ValueError:
-            limit = 100
+        summary = tuple(results[0]) if results and isinstance(results, list) else None
         
         # Build query
         conditions = []
@@ -1217,8 +1317,8 @@ class TradingJournalTab(ctk.CTkFrame):
         
         cols, results = self.db.execute_query(query, tuple(params))
         
+        rows = None
         if results and isinstance(results, list):
-            headers = ["Date", "Symbol", "Cat", "Type", "Qty", "Price", "Amount", "Comm", "Opt", "Strike", "Expiry", "Description"]
             rows = []
             for trade in results:
                 rows.append([
@@ -1235,17 +1335,51 @@ class TradingJournalTab(ctk.CTkFrame):
                     trade[10] or "",                                         # expiration_date
                     (trade[11] or "")[:30]                                   # description
                 ])
-            self.trades_table.update_data(headers, rows)
-        else:
-            self.trades_table.update_data([], [])
+        return {'available': True, 'summary': summary, 'trades': rows}
+    
+    def apply_data(self, data):
+        """Redraw the trading widgets whose data changed"""
+        if not data['available']:
+            if self.changes.changed('available', False):
+                # Show message
+                for widget in self.trades_table.scroll_frame.winfo_children():
+                    widget.destroy()
+                ctk.CTkLabel(
+                    self.trades_table.scroll_frame,
+                    text="Trading journal not available.\nRun: python scripts/import_tradier_history.py --import",
+                    text_color=COLORS['warning'],
+                    font=ctk.CTkFont(size=14)
+                ).pack(pady=50)
+                self.changes.reset()
+                self.changes.changed('available', False)
+            return
+        self.changes.changed('available', True)
+        
+        summary = data['summary']
+        if summary and self.changes.changed('summary', summary):
+            self.card_trades.update_value(str(summary[0] or 0))
+            self.card_commission.update_value(f"${(summary[1] or 0):,.2f}")
+            self.card_symbols.update_value(str(summary[2] or 0))
+            self.card_volume.update_value(f"${(summary[3] or 0):,.2f}")
+        
+        if self.changes.changed('trades', data['trades']):
+            if data['trades'] is not None:
+                headers = ["Date", "Symbol", "Cat", "Type", "Qty", "Price", "Amount", "Comm", "Opt", "Strike", "Expiry", "Description"]
+                self.trades_table.update_data(headers, data['trades'])
+            else:
+                self.trades_table.update_data([], [])
 
 
 class TaxManagementTab(ctk.CTkFrame):
     """Tax management tab"""
     
-    def __init__(self, parent, db_manager, **kwargs):
+    REFRESH_NAME = "Tax Management"
+    
+    def __init__(self, parent, db_manager, refresher=None, **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
         self.db = db_manager
+        self.refresher = refresher
+        self.changes = ChangeTracker()
         
         self.create_widgets()
         self.refresh_data()
@@ -1300,6 +1434,11 @@ class TaxManagementTab(ctk.CTkFrame):
         """Refresh tax data"""
         if not self.db.connected:
             return
+        submit_refresh(self)
+    
+    def fetch_data(self):
+        """Query and format tax data (no widget access)"""
+        data = {'positions': None, 'events': None}
         
         # Get investor tax positions
         cols, investors = self.db.get_investors()
@@ -1309,11 +1448,6 @@ class TaxManagementTab(ctk.CTkFrame):
             tax_rate = 0.37
             tax_liability = total_gains * tax_rate
             
-            self.card_total_gains.update_value(f"${total_gains:,.2f}")
-            self.card_tax_liability.update_value(f"${tax_liability:,.2f}")
-            
-            # Update tax positions table
-            headers = ["Investor", "Net Inv", "Value", "Gain", "Tax (37%)", "After-Tax"]
             rows = []
             for inv in investors:
                 gain = inv[7] if inv[7] else 0
@@ -1327,11 +1461,10 @@ class TaxManagementTab(ctk.CTkFrame):
                     f"${tax:,.2f}",
                     f"${after_tax:,.2f}"
                 ])
-            self.tax_positions.update_data(headers, rows)
+            data['positions'] = (total_gains, tax_liability, rows)
         
         # Get tax events if table exists
-        tables = self.db.get_tables()
-        if 'tax_events' in tables:
+        if 'tax_events' in self.db.get_tables():
             cols, events = self.db.execute_query("""
                 SELECT date, investor_id, event_type, realized_gain, tax_due, notes
                 FROM tax_events
@@ -1343,10 +1476,6 @@ class TaxManagementTab(ctk.CTkFrame):
                 ytd_realized = sum(e[3] for e in events if e[3])
                 ytd_taxes = sum(e[4] for e in events if e[4])
                 
-                self.card_ytd_realized.update_value(f"${ytd_realized:,.2f}")
-                self.card_ytd_taxes.update_value(f"${ytd_taxes:,.2f}")
-                
-                headers = ["Date", "Investor", "Event", "Realized", "Tax Due", "Notes"]
                 rows = []
                 for event in events:
                     rows.append([
@@ -1357,7 +1486,27 @@ class TaxManagementTab(ctk.CTkFrame):
                         f"${event[4]:,.2f}" if event[4] else "$0.00",
                         (event[5] or "")[:30]
                     ])
-                self.tax_events.update_data(headers, rows)
+                data['events'] = (ytd_realized, ytd_taxes, rows)
+        
+        return data
+    
+    def apply_data(self, data):
+        """Redraw the tax widgets whose data changed"""
+        positions = data['positions']
+        if positions and self.changes.changed('positions', positions):
+            total_gains, tax_liability, rows = positions
+            self.card_total_gains.update_value(f"${total_gains:,.2f}")
+            self.card_tax_liability.update_value(f"${tax_liability:,.2f}")
+            headers = ["Investor", "Net Inv", "Value", "Gain", "Tax (37%)", "After-Tax"]
+            self.tax_positions.update_data(headers, rows)
+        
+        events = data['events']
+        if events and self.changes.changed('events', events):
+            ytd_realized, ytd_taxes, rows = events
+            self.card_ytd_realized.update_value(f"${ytd_realized:,.2f}")
+            self.card_ytd_taxes.update_value(f"${ytd_taxes:,.2f}")
+            headers = ["Date", "Investor", "Event", "Realized", "Tax Due", "Notes"]
+            self.tax_events.update_data(headers, rows)
 
 
 class SettingsTab(ctk.CTkFrame):
@@ -1551,6 +1700,12 @@ class TovitoDashboard(ctk.CTk):
         # Initialize database
         self.db = DatabaseManager(db_path)
         
+        # Queries run on a background thread; results are drawn via after()
+        self.refresh_timings = {}
+        self.refresher = DataRefreshService(self.after, on_timing=self.show_refresh_timing)
+        self.refresher.start()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Window configuration
         self.title("Tovito Trader - Dashboard")
         self.geometry("1400x900")
@@ -1630,7 +1785,8 @@ class TovitoDashboard(ctk.CTk):
         self.tabview.add("⚙️ Settings")
         
         # Create tab content
-        self.dashboard_tab = DashboardTab(self.tabview.tab("📊 Dashboard"), self.db)
+        self.dashboard_tab = DashboardTab(self.tabview.tab("📊 Dashboard"), self.db,
+                                          refresher=self.refresher)
         self.dashboard_tab.pack(fill="both", expand=True)
         
         # Alerts tab (if available)
@@ -1644,10 +1800,12 @@ class TovitoDashboard(ctk.CTk):
         self.explorer_tab = DataExplorerTab(self.tabview.tab("🔍 Data Explorer"), self.db)
         self.explorer_tab.pack(fill="both", expand=True)
         
-        self.trading_tab = TradingJournalTab(self.tabview.tab("📈 Trading Journal"), self.db)
+        self.trading_tab = TradingJournalTab(self.tabview.tab("📈 Trading Journal"), self.db,
+                                             refresher=self.refresher)
         self.trading_tab.pack(fill="both", expand=True)
         
-        self.tax_tab = TaxManagementTab(self.tabview.tab("💰 Tax Management"), self.db)
+        self.tax_tab = TaxManagementTab(self.tabview.tab("💰 Tax Management"), self.db,
+                                        refresher=self.refresher)
         self.tax_tab.pack(fill="both", expand=True)
         
         self.settings_tab = SettingsTab(self.tabview.tab("⚙️ Settings"), self.db, self)
@@ -1669,6 +1827,15 @@ class TovitoDashboard(ctk.CTk):
         )
         self.db_label.pack(side="left", padx=10, pady=5)
         
+        # Per-tab refresh timing (query + draw)
+        self.timing_label = ctk.CTkLabel(
+            self.statusbar,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=COLORS['text_secondary']
+        )
+        self.timing_label.pack(side="left", padx=10, pady=5)
+        
         # Timestamp
         self.time_label = ctk.CTkLabel(
             self.statusbar,
@@ -1686,14 +1853,29 @@ class TovitoDashboard(ctk.CTk):
         self.time_label.configure(text=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         self.after(1000, self.update_time)
     
+    def show_refresh_timing(self, name, query_ms, draw_ms):
+        """Show each tab's last refresh time in the status bar"""
+        self.refresh_timings[name] = f"{name} {query_ms:.0f}+{draw_ms:.0f}ms"
+        if hasattr(self, 'timing_label'):
+            self.timing_label.configure(
+                text="Refresh (query+draw): " + " · ".join(self.refresh_timings.values())
+            )
+    
     def refresh_all(self):
-        """Refresh all tabs"""
+        """Refresh all tabs (each redraws as soon as its own data arrives)"""
         self.dashboard_tab.refresh_data()
         self.trading_tab.refresh_data()
         self.tax_tab.refresh_data()
         # Update connection status
         status_text = "🟢 Connected" if self.db.connected else "🔴 Not Connected"
         self.connection_label.configure(text=status_text)
+    
+    def on_close(self):
+        """Stop the refresh workers and close the window"""
+        self.refresher.stop()
+        self.explorer_tab.cancel_query()
+        self.explorer_tab.worker.stop()
+        self.destroy()
 
 
 def main():
@@ -0,0 +1,196 @@
+"""
+Dashboard Data Refresh
+======================
+
+Keeps database work off the Tk main thread for the desktop dashboards
+(apps/fund_manager/dashboard.py and apps/market_monitor/main.py).
+
+- open_read_connection(): a read-only SQLite connection.  The dashboard
+  keeps one per thread instead of opening a connection per query.
+- SchemaCache: table list and PRAGMA table_info results, re-read only
+  when PRAGMA schema_version changes.
+- DataRefreshService: one worker thread runs each tab's fetch function.
+  The main thread polls for results with after() and applies them, so
+  Tk widgets are only touched on the main thread.  Repeated requests
+  for the same tab are coalesced, and each tab's query and draw times
+  are reported through on_timing.
+- ChangeTracker: remembers what each widget last showed so a refresh
+  only redraws widgets whose data changed.
+
+Nothing here imports tkinter; the service only needs a schedule
+callable with the signature of widget.after(ms, fn).
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# How often the main thread checks for finished refreshes
+POLL_MS = 50
+
+
+def open_read_connection(db_path: str, **kwargs) -> sqlite3.Connection:
+    """Open a read-only connection to db_path.
+
+    Autocommit mode, so every SELECT sees the latest committed data
+    even though the connection is kept open between refreshes.
+    Extra kwargs are passed to sqlite3.connect().
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, isolation_level=None, **kwargs)
+
+
+class SchemaCache:
+    """Table names and columns, refreshed when the schema changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[str, int]] = None
+        self._tables: List[str] = []
+        self._columns: Dict[str, List[str]] = {}
+
+    def _sync(self, conn: sqlite3.Connection, db_path: str):
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        if self._key != (db_path, version):
+            self._key = (db_path, version)
+            self._tables = [r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")]
+            self._columns = {}
+
+    def tables(self, conn: sqlite3.Connection, db_path: str) -> List[str]:
+        with self._lock:
+            self._sync(conn, db_path)
+            return list(self._tables)
+
+    def columns(self, conn: sqlite3.Connection, db_path: str, table: str) -> List[str]:
+        with self._lock:
+            self._sync(conn, db_path)
+            if table not in self._columns:
+                self._columns[table] = [
+                    r[1] for r in conn.execute(f"PRAGMA table_info({table})")
+                ]
+            return list(self._columns[table])
+
+
+class ChangeTracker:
+    """Last value shown by each widget, keyed by name."""
+
+    def __init__(self):
+        self._last: Dict[str, Any] = {}
+
+    def changed(self, key: str, value: Any) -> bool:
+        """True (and remember value) if value differs from the last one."""
+        if key in self._last and self._last[key] == value:
+            return False
+        self._last[key] = value
+        return True
+
+    def reset(self):
+        self._last.clear()
+
+
+class DataRefreshService:
+    """Runs tab fetches on a worker thread and applies them on the main thread.
+
+    Usage:
+        refresher = DataRefreshService(app.after, on_timing=show_timing)
+        refresher.start()
+        refresher.submit("Dashboard", tab.fetch_data, tab.apply_data)
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable], Any],
+                 on_timing: Optional[Callable[[str, float, float], None]] = None,
+                 poll_ms: int = POLL_MS):
+        self.schedule = schedule
+        self.on_timing = on_timing
+        self.poll_ms = poll_ms
+        self._pending: Dict[str, Tuple[Callable, Callable]] = {}
+        self._order: List[str] = []
+        self._wake = threading.Condition()
+        self._results: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the worker thread and the main-thread poll loop."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="dashboard-refresh",
+                                        daemon=True)
+        self._thread.start()
+        self.schedule(self.poll_ms, self._poll)
+
+    def stop(self, timeout: float = 2.0):
+        with self._wake:
+            self._running = False
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, name: str, fetch: Callable[[], Any], apply: Callable[[Any], None]):
+        """Queue a refresh of one tab.
+
+        fetch runs on the worker thread and must not touch widgets; its
+        result is passed to apply on the main thread.  A request for a
+        tab that is still waiting replaces the older one.
+        """
+        with self._wake:
+            if name not in self._pending:
+                self._order.append(name)
+            self._pending[name] = (fetch, apply)
+            self._wake.notify()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while self._running and not self._order:
+                    self._wake.wait()
+                if not self._running:
+                    return
+                name = self._order.pop(0)
+                fetch, apply = self._pending.pop(name)
+
+            started = time.perf_counter()
+            try:
+                data, error = fetch(), None
+            except Exception as e:
+                data, error = None, e
+            query_ms = (time.perf_counter() - started) * 1000
+            self._results.put((name, apply, data, error, query_ms))
+
+    def _poll(self):
+        """Apply finished refreshes (main thread), then reschedule."""
+        self.process_results()
+        if self._running:
+            self.schedule(self.poll_ms, self._poll)
+
+    def process_results(self):
+        """Apply every refresh the worker has finished."""
+        while True:
+            try:
+                name, apply, data, error, query_ms = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if error is not None:
+                print(f"Error refreshing {name}: {error}")
+                continue
+            started = time.perf_counter()
+            try:
+                apply(data)
+            except Exception as e:
+                print(f"Error drawing {name}: {e}")
+            draw_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = {"query_ms": round(query_ms, 1),
+                                  "draw_ms": round(draw_ms, 1)}
+            if self.on_timing:
+                self.on_timing(name, query_ms, draw_ms)
@@ -0,0 +1,363 @@
+"""
+Data Explorer Result Paging and Export
+======================================
+
+Tk-free back end for the Data Explorer's paged result grid.
+
+- ResultPager: pages through a query without fetchall().
+    * Table views use keyset pagination on rowid
+      (WHERE rowid > :last ORDER BY rowid LIMIT n), so every page costs
+      the same no matter how deep it is.
+    * Custom SQL keeps a server-side cursor open and reads it with
+      fetchmany(); recently viewed pages are cached, and older pages
+      are re-read by re-running the query.
+    * cancel() calls sqlite3.Connection.interrupt() on the pager's own
+      connection, so a runaway query stops without touching the
+      dashboard's other connections.
+- format_cell(): display formatting, applied only to the rows on screen.
+- QueryExport: streams a query to CSV (or Parquet when pyarrow is
+  installed) in fetchmany() chunks, writing to a .part file that is
+  renamed into place only when the export completes.
+
+The dashboard runs pager and export work on a background thread and
+draws the results on the Tk main thread.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from apps.fund_manager.data_refresh import open_read_connection
+
+# Parquet export is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_PAGE_SIZE = 100
+MAX_CACHED_PAGES = 20
+EXPORT_CHUNK_ROWS = 5000
+CELL_MAX_CHARS = 50
+
+_NO_ROW = object()
+
+
+class QueryCancelled(Exception):
+    """Raised when a running query or export is cancelled."""
+
+
+def format_cell(value: Any) -> str:
+    """Format one value for the grid (NULL, 4dp floats, truncated text)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    text = str(value)
+    return text[:CELL_MAX_CHARS] if len(text) > CELL_MAX_CHARS else text
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _connect_for_worker(db_path: str) -> sqlite3.Connection:
+    # Opened on the worker thread, interrupted/closed from the main thread
+    return open_read_connection(db_path, check_same_thread=False)
+
+
+class ResultPager:
+    """Random access to pages of a query result without loading it all."""
+
+    def __init__(self, db_path: str, query: Optional[str] = None,
+                 params: Sequence = (), table: Optional[str] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 max_cached_pages: int = MAX_CACHED_PAGES,
+                 connect: Callable[[str], sqlite3.Connection] = _connect_for_worker):
+        if (query is None) == (table is None):
+            raise ValueError("Pass exactly one of query or table")
+        self.db_path = db_path
+        self.table = table
+        self.query = query if query is not None else f"SELECT * FROM {_quote_identifier(table)}"
+        self.params = tuple(params)
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.connect = connect
+        self.columns: List[str] = []
+        self.keyset = table is not None
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Keyset mode: last rowid of each page seen so far
+        self._page_end_keys: Dict[int, int] = {}
+        # Cursor mode: open cursor, index of the page it reads next, and
+        # the one row read ahead to know whether another page exists
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._cursor_page = 0
+        self._carry: Any = _NO_ROW
+        self._pages: "OrderedDict[int, Tuple[List[tuple], bool]]" = OrderedDict()
+
+    def _connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                self._conn = self.connect(self.db_path)
+            return self._conn
+
+    def page(self, index: int) -> Tuple[List[tuple], bool]:
+        """Return (rows, has_next) for page index (0-based).
+
+        Raises:
+            QueryCancelled: if cancel() interrupted the query
+            sqlite3.Error: for invalid SQL and other database errors
+        """
+        if index < 0:
+            raise ValueError("Page index must be >= 0")
+        try:
+            if self.keyset:
+                try:
+                    return self._keyset_page(index)
+                except sqlite3.OperationalError as e:
+                    if "rowid" not in str(e):
+                        raise
+                    # WITHOUT ROWID table: fall back to the cursor
+                    self.keyset = False
+            return self._cursor_page_at(index)
+        except sqlite3.OperationalError as e:
+            if "interrupt" in str(e):
+                self._reset_cursor()
+                raise QueryCancelled("Query cancelled") from e
+            raise
+
+    def _keyset_page(self, index: int) -> Tuple[List[tuple], bool]:
+        conn = self._connection()
+        # Walk forward until the start key of the page is known
+        while index > 0 and (index - 1) not in self._page_end_keys:
+            known = max(self._page_end_keys, default=-1)
+            _, has_next = self._keyset_page(known + 1)
+            if not has_next:
+                return [], False
+
+        table = _quote_identifier(self.table)
+        if index == 0:
+            cursor = conn.execute(
+                f"SELECT rowid, * FROM {table} ORDER BY rowid LIMIT ?",
+                (self.page_size + 1,))
+        else:
+            cursor = conn.execute(
+                f"SELECT rowid, * FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (self._page_end_keys[index - 1], self.page_size + 1))
+        self.columns = [d[0] for d in cursor.description[1:]]
+        rows = cursor.fetchall()
+        has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if rows:
+            self._page_end_keys[index] = rows[-1][0]
+        return [row[1:] for row in rows], has_next
+
+    def _cursor_page_at(self, index: int) -> Tuple[List[tuple], bool]:
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+
+        if self._cursor is None or index < self._cursor_page:
+            # Not cached and already read past: re-run the query
+            self._reset_cursor()
+            self._cursor = self._connection().execute(self.query, self.params)
+            self.columns = [d[0] for d in self._cursor.description or ()]
+
+        result: Tuple[List[tuple], bool] = ([], False)
+        while self._cursor_page <= index:
+            result = self._read_next_page()
+            self._cache(self._cursor_page, result)
+            self._cursor_page += 1
+            if not result[1]:
+                break
+        if self._cursor_page <= index:
+            return [], False
+        return result
+
+    def _read_next_page(self) -> Tuple[List[tuple], bool]:
+        rows = [] if self._carry is _NO_ROW else [self._carry]
+        rows.extend(self._cursor.fetchmany(self.page_size + 1 - len(rows)))
+        if len(rows) > self.page_size:
+            self._carry = rows.pop()
+            return rows, True
+        self._carry = _NO_ROW
+        return rows, False
+
+    def _cache(self, index: int, result: Tuple[List[tuple], bool]):
+        self._pages[index] = result
+        self._pages.move_to_end(index)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+
+    def _reset_cursor(self):
+        if self._cursor is not None:
+            try:
+                self._cursor.close()
+            except sqlite3.Error:
+                pass
+        self._cursor = None
+        self._cursor_page = 0
+        self._carry = _NO_ROW
+
+    def cancel(self):
+        """Interrupt whatever query the pager is running (any thread)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def close(self):
+        self._reset_cursor()
+        self._pages.clear()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _arrow_type(values: List[Any]):
+    kinds = {type(v) for v in values if v is not None}
+    if kinds and kinds <= {int}:
+        return pa.int64()
+    if kinds and kinds <= {int, float}:
+        return pa.float64()
+    if kinds and kinds <= {bytes}:
+        return pa.binary()
+    return pa.string()
+
+
+class QueryExport:
+    """Stream a query result to CSV or Parquet in chunks.
+
+    Usage:
+        export = QueryExport(db_path, "SELECT * FROM trades", path="trades.csv")
+        result = export.run()        # on a worker thread
+        export.cancel()              # from any thread
+    """
+
+    FORMATS = ('csv', 'parquet')
+
+    def __init__(self, db_path: str, query: str, path: str, params: Sequence = (),
+                 fmt: Optional[str] = None, chunk_rows: int = EXPORT_CHUNK_ROWS,
+                 connect: Callable[[str], sqlite3.Connection] = _connect_for_worker,
+                 progress: Optional[Callable[[int], None]] = None):
+        self.db_path = db_path
+        self.query = query
+        self.params = tuple(params)
+        self.path = path
+        self.fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or 'csv').lower()
+        if self.fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {self.fmt}")
+        if self.fmt == 'parquet' and not HAS_PYARROW:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.chunk_rows = chunk_rows
+        self.connect = connect
+        self.progress = progress
+        self._cancelled = threading.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def run(self) -> Dict[str, Any]:
+        """Write the export and return {path, rows, format, seconds}.
+
+        Raises:
+            QueryCancelled: if cancelled (the partial file is removed)
+        """
+        started = time.perf_counter()
+        part = self.path + '.part'
+        with self._lock:
+            self._conn = self.connect(self.db_path)
+        try:
+            cursor = self._conn.execute(self.query, self.params)
+            columns = [d[0] for d in cursor.description or ()]
+            writer = self._write_csv if self.fmt == 'csv' else self._write_parquet
+            rows = writer(cursor, columns, part)
+            os.replace(part, self.path)
+        except sqlite3.OperationalError as e:
+            self._discard(part)
+            if "interrupt" in str(e):
+                raise QueryCancelled("Export cancelled") from e
+            raise
+        except BaseException:
+            self._discard(part)
+            raise
+        finally:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+        return {
+            'path': self.path,
+            'rows': rows,
+            'format': self.fmt,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+
+    def _chunks(self, cursor):
+        rows = 0
+        while True:
+            if self._cancelled.is_set():
+                raise QueryCancelled("Export cancelled")
+            chunk = cursor.fetchmany(self.chunk_rows)
+            if not chunk:
+                return
+            rows += len(chunk)
+            yield chunk
+            if self.progress:
+                self.progress(rows)
+
+    def _write_csv(self, cursor, columns: List[str], part: str) -> int:
+        rows = 0
+        with open(part, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for chunk in self._chunks(cursor):
+                writer.writerows(
+                    ["" if v is None else v for v in row] for row in chunk
+                )
+                rows += len(chunk)
+        return rows
+
+    def _write_parquet(self, cursor, columns: List[str], part: str) -> int:
+        rows = 0
+        writer = None
+        try:
+            for chunk in self._chunks(cursor):
+                values = [list(col) for col in zip(*chunk)]
+                if writer is None:
+                    schema = pa.schema([
+                        (name, _arrow_type(col)) for name, col in zip(columns, values)
+                    ])
+                    writer = pq.ParquetWriter(part, schema)
+                arrays = [
+                    pa.array([None if v is None else str(v) for v in col]
+                             if field.type == pa.string() else col, type=field.type)
+                    for field, col in zip(writer.schema, values)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=writer.schema))
+                rows += len(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(part, pa.schema([(c, pa.string()) for c in columns]))
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    @staticmethod
+    def _discard(part: str):
+        try:
+            os.remove(part)
+        except OSError:
+            pass
@@ -90,8 +90,31 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
-    # Rate Limiting
+    # Authenticated principal cache (see services/principal_cache.py)
+    # TTL 0 disables caching; status changes made outside the API
+    # take effect within one TTL.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "1024"))
+
+    # Password hashing pool (see services/hash_pool.py)
+    # 0 workers = min(4, CPU count)
+    BCRYPT_POOL_WORKERS: int = int(os.getenv("BCRYPT_POOL_WORKERS", "0"))
+    BCRYPT_MAX_PENDING: int = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+
+    # PII audit log writer (see services/audit_sink.py)
+    # Rows are committed within PII_AUDIT_MAX_DELAY_MS of being logged;
+    # beyond PII_AUDIT_MAX_QUEUE waiting rows, new events are dropped.
+    PII_AUDIT_MAX_DELAY_MS: int = int(os.getenv("PII_AUDIT_MAX_DELAY_MS", "1000"))
+    PII_AUDIT_BATCH_SIZE: int = int(os.getenv("PII_AUDIT_BATCH_SIZE", "200"))
+    PII_AUDIT_MAX_QUEUE: int = int(os.getenv("PII_AUDIT_MAX_QUEUE", "10000"))
+
+    # Rate Limiting (see services/rate_limit.py)
     RATE_LIMIT_PER_MINUTE: int = 100
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite
+    RATE_LIMIT_DB_PATH: str = os.getenv("RATE_LIMIT_DB_PATH", "rate_limits.db")  # relative to DB dir
+    INQUIRY_RATE_LIMIT: int = int(os.getenv("INQUIRY_RATE_LIMIT", "5"))  # per IP per hour
+    LOGIN_RATE_LIMIT: int = int(os.getenv("LOGIN_RATE_LIMIT", "20"))  # per IP per 5 minutes
+    FORGOT_PASSWORD_RATE_LIMIT: int = int(os.getenv("FORGOT_PASSWORD_RATE_LIMIT", "5"))  # per IP per hour
     LOGIN_ATTEMPT_LIMIT: int = 5
     LOGIN_LOCKOUT_MINUTES: int = 15
 
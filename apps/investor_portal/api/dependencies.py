@@ -6,6 +6,7 @@ JWT token validation and user extraction.
 Used by all protected endpoints.
 """
 
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, Header, HTTPException, status
@@ -14,6 +15,7 @@ from jose import JWTError, jwt
 from pydantic import BaseModel
 
 from .config import settings
+from .services.principal_cache import principal_cache
 
 
 # Security scheme
@@ -41,7 +43,8 @@ def create_access_token(investor_id: str, email: str) -> str:
         "sub": investor_id,
         "email": email,
         "exp": expire,
-        "type": "access"
+        "type": "access",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
@@ -52,7 +55,8 @@ def create_refresh_token(investor_id: str) -> str:
     payload = {
         "sub": investor_id,
         "exp": expire,
-        "type": "refresh"
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
@@ -103,8 +107,17 @@ async def get_current_user(
         @app.get("/protected")
         async def protected_route(user: CurrentUser = Depends(get_current_user)):
             return {"investor_id": user.investor_id}
+
+    Successful lookups are cached per token for a few seconds (see
+    services/principal_cache.py); cache entries never outlive the
+    token's own expiry.
     """
     token = credentials.credentials
+
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     token_data = verify_token(token, "access")
     
     # Get user details from database
@@ -123,11 +136,18 @@ async def get_current_user(
             detail="Account is not active"
         )
     
-    return CurrentUser(
+    user = CurrentUser(
         investor_id=token_data.investor_id,
         email=token_data.email,
         name=investor.get("name", "")
     )
+    principal_cache.put(
+        token,
+        token_data.investor_id,
+        user,
+        token_expires_at=token_data.exp.timestamp(),
+    )
+    return user
 
 
 async def verify_admin_key(
@@ -75,9 +75,14 @@ async def lifespan(app: FastAPI):
     _refresh_benchmark_cache()
     _validate_encryption()
     _run_data_migrations()
+    from .services.audit_sink import pii_audit_sink
+    pii_audit_sink.start()
     yield
     # Shutdown
     print("[STOP] Fund API shutting down...")
+    from .services.hash_pool import hash_pool
+    hash_pool.shutdown(wait=False)
+    pii_audit_sink.stop()
 
 
 def _ensure_db_views():
@@ -11,7 +11,7 @@ require investor_id as a parameter to prevent data leakage.
 
 import sqlite3
 from typing import Optional, List, Dict, Any
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 import hashlib
 
@@ -599,22 +599,19 @@ def get_fund_performance() -> Dict:
 
 def get_cached_benchmark_data(days: int = 90) -> Dict[str, List[Dict]]:
     """Get cached benchmark prices for chart generation."""
+    from src.market_data.benchmarks import BENCHMARK_TICKERS, query_benchmark_pivot
+
     conn = get_connection()
-    cursor = conn.cursor()
 
     try:
         cutoff = (date.today() - timedelta(days=days)).isoformat()
-        tickers = ['SPY', 'QQQ', 'BTC-USD']
-        result = {}
+        result = {ticker: [] for ticker in BENCHMARK_TICKERS}
 
-        for ticker in tickers:
-            cursor.execute("""
-                SELECT date, close_price
-                FROM benchmark_prices
-                WHERE ticker = ? AND date >= ?
-                ORDER BY date ASC
-            """, (ticker, cutoff))
-            result[ticker] = [dict(row) for row in cursor.fetchall()]
+        # One pivoted query for all tickers
+        for date_str, *closes in query_benchmark_pivot(conn, BENCHMARK_TICKERS, cutoff):
+            for ticker, close in zip(BENCHMARK_TICKERS, closes):
+                if close is not None:
+                    result[ticker].append({'date': date_str, 'close_price': close})
 
         return result
 
@@ -1080,56 +1077,17 @@ def upsert_holdings_snapshot(header: Dict, positions: List[Dict]) -> int:
     Returns:
         snapshot_id of the upserted snapshot
     """
+    from src.database.holdings_store import write_holdings_snapshots
+
     conn = get_connection()
     try:
-        cursor = conn.cursor()
-
-        # Upsert snapshot header
-        cursor.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(date, source) DO UPDATE SET
-                snapshot_time = excluded.snapshot_time,
-                total_positions = excluded.total_positions
-        """, (
-            header["date"], header["source"],
-            header.get("snapshot_time", datetime.now().isoformat()),
-            header.get("total_positions", len(positions)),
-        ))
-
-        # Get the snapshot_id (whether inserted or updated)
-        cursor.execute("""
-            SELECT snapshot_id FROM holdings_snapshots
-            WHERE date = ? AND source = ?
-        """, (header["date"], header["source"]))
-        snapshot_id = cursor.fetchone()["snapshot_id"]
-
-        # Delete existing positions for this snapshot and re-insert
-        cursor.execute(
-            "DELETE FROM position_snapshots WHERE snapshot_id = ?",
-            (snapshot_id,)
+        snapshot_ids = write_holdings_snapshots(
+            conn,
+            header["date"],
+            {header["source"]: positions},
+            snapshot_time=header.get("snapshot_time"),
         )
-
-        for pos in positions:
-            cursor.execute("""
-                INSERT INTO position_snapshots (
-                    snapshot_id, symbol, underlying_symbol, quantity,
-                    instrument_type, average_open_price, close_price,
-                    market_value, cost_basis, unrealized_pl,
-                    option_type, strike, expiration_date, multiplier
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                snapshot_id, pos["symbol"], pos.get("underlying_symbol"),
-                pos["quantity"], pos.get("instrument_type"),
-                pos.get("average_open_price"), pos.get("close_price"),
-                pos.get("market_value"), pos.get("cost_basis"),
-                pos.get("unrealized_pl"), pos.get("option_type"),
-                pos.get("strike"), pos.get("expiration_date"),
-                pos.get("multiplier"),
-            ))
-
-        conn.commit()
-        return snapshot_id
+        return snapshot_ids[header["source"]]
     finally:
         conn.close()
 
@@ -1612,6 +1570,10 @@ def log_pii_access(investor_id: str, field_name: str, access_type: str,
     Non-fatal: errors are caught and logged, never propagated.
     This ensures PII audit logging never breaks application flow.
 
+    Inside the API the row is handed to the background audit sink
+    (services/audit_sink.py) and committed in a batch within
+    PII_AUDIT_MAX_DELAY_MS; elsewhere it is written immediately.
+
     Args:
         investor_id: The investor whose PII was accessed
         field_name: Which encrypted field (e.g., 'ssn_encrypted')
@@ -1621,14 +1583,19 @@ def log_pii_access(investor_id: str, field_name: str, access_type: str,
         context: Additional context (e.g., 'profile_view', 'key_rotation')
     """
     try:
+        from ..services.audit_sink import INSERT_SQL, pii_audit_sink
+
+        # Same format as the column's CURRENT_TIMESTAMP default (UTC)
+        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        row = (timestamp, investor_id, field_name, access_type,
+               performed_by, ip_address, context)
+        if pii_audit_sink.submit(row):
+            return
+
         conn = get_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("""
-                INSERT INTO pii_access_log
-                (investor_id, field_name, access_type, performed_by, ip_address, context)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (investor_id, field_name, access_type, performed_by, ip_address, context))
+            cursor.execute(INSERT_SQL, row)
             conn.commit()
         finally:
             conn.close()
@@ -2,8 +2,8 @@
 Admin API Routes
 =================
 
-Server-to-server endpoints for production database sync and
-prospect access management.
+Server-to-server endpoints for production database sync,
+prospect access management, and auth cache control.
 
 Protected by API key (X-Admin-Key header), not JWT.
 
@@ -22,6 +22,14 @@ from pydantic import BaseModel, Field
 
 from ..dependencies import verify_admin_key
 from ..config import settings
+from ..services.principal_cache import principal_cache
+from ..services.hash_pool import hash_pool
+from ..services.audit_sink import pii_audit_sink
+from ..services.rate_limit import (
+    inquiry_limiter,
+    login_limiter,
+    forgot_password_limiter,
+)
 from ..models.database import (
     get_connection,
     upsert_daily_nav,
@@ -391,6 +399,62 @@ async def list_prospects(
     return ProspectListResponse(prospects=prospects, total=len(prospects))
 
 
+# ============================================================
+# Auth Cache / Hash Pool / PII Audit / Rate Limit Metrics
+# ============================================================
+
+@router.post("/cache/invalidate/{investor_id}")
+async def invalidate_investor_sessions(
+    investor_id: str,
+    _admin: bool = Depends(verify_admin_key),
+):
+    """Drop cached principals for an investor after a status change.
+
+    Called after account closure or suspension so the change takes
+    effect immediately instead of after the cache TTL.
+    """
+    removed = principal_cache.invalidate_investor(investor_id)
+    logger.info(f"Invalidated {removed} cached session(s) for {investor_id}")
+    return {"success": True, "invalidated": removed}
+
+
+@router.get("/cache/stats")
+async def principal_cache_stats(
+    _admin: bool = Depends(verify_admin_key),
+):
+    """Principal cache hit/miss/eviction counters."""
+    return principal_cache.stats()
+
+
+@router.get("/hash-pool/stats")
+async def hash_pool_stats(
+    _admin: bool = Depends(verify_admin_key),
+):
+    """Password hash pool queue depth, wait times and rejections."""
+    return hash_pool.stats()
+
+
+@router.get("/pii-audit/stats")
+async def pii_audit_stats(
+    _admin: bool = Depends(verify_admin_key),
+):
+    """PII audit writer queue depth, batch sizes, lag and dropped events."""
+    return pii_audit_sink.stats()
+
+
+@router.get("/rate-limits/stats")
+async def rate_limit_stats(
+    _admin: bool = Depends(verify_admin_key),
+):
+    """Per-endpoint rate limit budgets, tracked IPs and rejections."""
+    return {
+        "limiters": [
+            limiter.stats()
+            for limiter in (inquiry_limiter, login_limiter, forgot_password_limiter)
+        ]
+    }
+
+
 # ============================================================
 # Internal Helpers
 # ============================================================
@@ -632,6 +632,7 @@ class HistoricalPerformerItem(BaseModel):
     latest_unrealized_pl_pct: Optional[float]
     first_seen: Optional[str]
     last_seen: Optional[str]
+    holding_days: Optional[int] = None
 
 
 class HistoricalPerformersResponse(BaseModel):
@@ -650,60 +651,28 @@ async def get_historical_performers(
     """
     Get best and worst performing positions from historical snapshots.
 
-    Queries position_snapshots across all historical holdings_snapshots
-    to find tickers with the best and worst unrealized P&L percentages.
-    Includes both current and past positions.
+    Reads the per-symbol performance summary maintained by each holdings
+    snapshot (src/reporting/performers.py) to find tickers with the best
+    and worst unrealized P&L percentages. Includes both current and past
+    positions.
     """
+    from src.reporting.performers import get_symbol_performance
+
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         cutoff = str(date.today() - timedelta(days=days))
 
-        # Get all position snapshots within the date range, aggregate by symbol
-        cursor.execute("""
-            SELECT
-                ps.symbol,
-                MIN(hs.date) as first_seen,
-                MAX(hs.date) as last_seen,
-                MAX(ps.unrealized_pl) as best_unrealized_pl,
-                MIN(ps.unrealized_pl) as worst_unrealized_pl,
-                SUM(CASE WHEN hs.date = (
-                    SELECT MAX(hs2.date)
-                    FROM holdings_snapshots hs2
-                    JOIN position_snapshots ps2 ON ps2.snapshot_id = hs2.snapshot_id
-                    WHERE ps2.symbol = ps.symbol AND hs2.date >= ?
-                ) THEN ps.unrealized_pl ELSE NULL END) as latest_pl,
-                SUM(CASE WHEN hs.date = (
-                    SELECT MAX(hs2.date)
-                    FROM holdings_snapshots hs2
-                    JOIN position_snapshots ps2 ON ps2.snapshot_id = hs2.snapshot_id
-                    WHERE ps2.symbol = ps.symbol AND hs2.date >= ?
-                ) THEN ps.cost_basis ELSE NULL END) as latest_cost_basis,
-                MAX(CASE WHEN ps.cost_basis > 0
-                    THEN (ps.unrealized_pl / ps.cost_basis * 100)
-                    ELSE NULL END) as best_pl_pct,
-                MIN(CASE WHEN ps.cost_basis > 0
-                    THEN (ps.unrealized_pl / ps.cost_basis * 100)
-                    ELSE NULL END) as worst_pl_pct
-            FROM position_snapshots ps
-            JOIN holdings_snapshots hs ON hs.snapshot_id = ps.snapshot_id
-            WHERE hs.date >= ?
-              AND ps.symbol NOT IN ('Cash', 'CASH')
-              AND ps.instrument_type NOT LIKE '%%Cash%%'
-            GROUP BY ps.symbol
-            HAVING MAX(ABS(ps.cost_basis)) > 0
-            ORDER BY best_pl_pct DESC
-        """, (cutoff, cutoff, cutoff))
-
-        rows = [dict(r) for r in cursor.fetchall()]
+        # Per-symbol P&L over the snapshots in range, best % first
+        rows = get_symbol_performance(conn, since=cutoff)
 
         # Build top performers (best unrealized P&L %)
         top_performers = []
         for row in rows[:5]:
             latest_pct = None
-            if row.get('latest_cost_basis') and row['latest_cost_basis'] > 0 and row.get('latest_pl') is not None:
-                latest_pct = round(row['latest_pl'] / row['latest_cost_basis'] * 100, 2)
+            if row.get('latest_cost_basis') and row['latest_cost_basis'] > 0 and row.get('latest_unrealized_pl') is not None:
+                latest_pct = round(row['latest_unrealized_pl'] / row['latest_cost_basis'] * 100, 2)
 
             top_performers.append(HistoricalPerformerItem(
                 symbol=row['symbol'].split(' ')[0] if ' ' in row['symbol'] else row['symbol'],
@@ -711,10 +680,11 @@ async def get_historical_performers(
                 best_unrealized_pl_pct=round(row['best_pl_pct'], 2) if row.get('best_pl_pct') is not None else None,
                 worst_unrealized_pl=round(row['worst_unrealized_pl'], 2) if row.get('worst_unrealized_pl') is not None else None,
                 worst_unrealized_pl_pct=round(row['worst_pl_pct'], 2) if row.get('worst_pl_pct') is not None else None,
-                latest_unrealized_pl=round(row['latest_pl'], 2) if row.get('latest_pl') is not None else None,
+                latest_unrealized_pl=round(row['latest_unrealized_pl'], 2) if row.get('latest_unrealized_pl') is not None else None,
                 latest_unrealized_pl_pct=latest_pct,
                 first_seen=row.get('first_seen'),
                 last_seen=row.get('last_seen'),
+                holding_days=row.get('holding_days'),
             ))
 
         # Bottom performers (worst unrealized P&L %) — sort ascending
@@ -722,8 +692,8 @@ async def get_historical_performers(
         bottom_performers = []
         for row in sorted_worst[:5]:
             latest_pct = None
-            if row.get('latest_cost_basis') and row['latest_cost_basis'] > 0 and row.get('latest_pl') is not None:
-                latest_pct = round(row['latest_pl'] / row['latest_cost_basis'] * 100, 2)
+            if row.get('latest_cost_basis') and row['latest_cost_basis'] > 0 and row.get('latest_unrealized_pl') is not None:
+                latest_pct = round(row['latest_unrealized_pl'] / row['latest_cost_basis'] * 100, 2)
 
             bottom_performers.append(HistoricalPerformerItem(
                 symbol=row['symbol'].split(' ')[0] if ' ' in row['symbol'] else row['symbol'],
@@ -731,10 +701,11 @@ async def get_historical_performers(
                 best_unrealized_pl_pct=round(row['best_pl_pct'], 2) if row.get('best_pl_pct') is not None else None,
                 worst_unrealized_pl=round(row['worst_unrealized_pl'], 2) if row.get('worst_unrealized_pl') is not None else None,
                 worst_unrealized_pl_pct=round(row['worst_pl_pct'], 2) if row.get('worst_pl_pct') is not None else None,
-                latest_unrealized_pl=round(row['latest_pl'], 2) if row.get('latest_pl') is not None else None,
+                latest_unrealized_pl=round(row['latest_unrealized_pl'], 2) if row.get('latest_unrealized_pl') is not None else None,
                 latest_unrealized_pl_pct=latest_pct,
                 first_seen=row.get('first_seen'),
                 last_seen=row.get('last_seen'),
+                holding_days=row.get('holding_days'),
             ))
 
         # Date range
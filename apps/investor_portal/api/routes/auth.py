@@ -38,6 +38,13 @@ from ..services.auth_service import (
     complete_password_reset
 )
 from ..models.database import get_investor_by_id
+from ..services.principal_cache import principal_cache
+from ..services.hash_pool import hash_pool, HashPoolBusy
+from ..services.rate_limit import (
+    login_limiter,
+    forgot_password_limiter,
+    rate_limit_dependency,
+)
 
 
 router = APIRouter()
@@ -204,6 +211,22 @@ Tovito Trader
         print(f"   Token for {email}: {token}")
 
 
+# ============================================================
+# Password Hash Offload
+# ============================================================
+
+async def _run_password_work(fn, *args):
+    """Run a bcrypt-bound auth service call off the event loop."""
+    try:
+        return await hash_pool.run(fn, *args)
+    except HashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests in progress. Please try again shortly.",
+            headers={"Retry-After": "2"},
+        )
+
+
 # ============================================================
 # Routes
 # ============================================================
@@ -255,7 +278,9 @@ async def verify_and_set_password(request: VerifyRequest):
     Called when user clicks the verification link and submits their new password.
     Returns JWT tokens on success (user is logged in).
     """
-    success, message, data = complete_verification(request.token, request.password)
+    success, message, data = await _run_password_work(
+        complete_verification, request.token, request.password
+    )
     
     if not success:
         raise HTTPException(
@@ -279,13 +304,20 @@ async def verify_and_set_password(request: VerifyRequest):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest):
+async def login(
+    request: LoginRequest,
+    _limit: None = Depends(rate_limit_dependency(
+        login_limiter, "Too many login attempts. Please try again later."
+    )),
+):
     """
     Login with email and password.
     
     Returns JWT access token and refresh token.
     """
-    success, message, data = authenticate_user(request.email, request.password)
+    success, message, data = await _run_password_work(
+        authenticate_user, request.email, request.password
+    )
     
     if not success:
         # Check for specific error types
@@ -355,7 +387,11 @@ async def refresh_token(request: RefreshRequest):
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
-async def forgot_password(request: ForgotPasswordRequest, background_tasks: BackgroundTasks):
+async def forgot_password(
+    request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
+    _limit: None = Depends(rate_limit_dependency(forgot_password_limiter)),
+):
     """
     Request a password reset link.
     
@@ -383,7 +419,9 @@ async def reset_password(request: ResetPasswordRequest):
     """
     Reset password using the token from email.
     """
-    success, message = complete_password_reset(request.token, request.new_password)
+    success, message = await _run_password_work(
+        complete_password_reset, request.token, request.new_password
+    )
     
     if not success:
         raise HTTPException(
@@ -400,8 +438,10 @@ async def logout(user: CurrentUser = Depends(get_current_user)):
     Logout - invalidate tokens.
     
     Note: With stateless JWT, tokens remain valid until expiration.
-    Client should discard tokens.
+    Client should discard tokens. Cached principals for this investor
+    are dropped so the next request re-checks account status.
     """
+    principal_cache.invalidate_investor(user.investor_id)
     return MessageResponse(message="Logged out successfully. Please discard your tokens.")
 
 
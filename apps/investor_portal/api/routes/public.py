@@ -13,13 +13,11 @@ no individual investor data.
 import os
 import secrets
 import sys
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel, EmailStr, Field
 
 # Add project root for imports
@@ -36,6 +34,7 @@ from ..models.database import (
     create_prospect_access_token,
 )
 from ..config import settings
+from ..services.rate_limit import inquiry_limiter, rate_limit_dependency
 
 
 router = APIRouter()
@@ -68,38 +67,9 @@ class InquiryResponse(BaseModel):
     success: bool
 
 
-# ============================================================
-# Rate Limiting (simple in-memory per-IP)
-# ============================================================
-
-# Track inquiry submissions: {ip: [timestamp, timestamp, ...]}
-_inquiry_rate_limit: dict = defaultdict(list)
-_RATE_LIMIT_MAX = 5        # Max inquiries per IP
-_RATE_LIMIT_WINDOW = 3600  # Per hour (seconds)
 _VERIFICATION_TOKEN_HOURS = 24  # Verification link expiry
 
 
-def _check_rate_limit(ip: str) -> bool:
-    """Check if the IP has exceeded the inquiry rate limit.
-
-    Returns True if the request is allowed, False if rate-limited.
-    Cleans up expired entries as a side effect.
-    """
-    now = time.time()
-    cutoff = now - _RATE_LIMIT_WINDOW
-
-    # Clean up old entries for this IP
-    _inquiry_rate_limit[ip] = [
-        ts for ts in _inquiry_rate_limit[ip] if ts > cutoff
-    ]
-
-    if len(_inquiry_rate_limit[ip]) >= _RATE_LIMIT_MAX:
-        return False
-
-    _inquiry_rate_limit[ip].append(now)
-    return True
-
-
 # ============================================================
 # Email Functions (Background Tasks)
 # ============================================================
@@ -314,6 +284,7 @@ async def submit_inquiry(
     inquiry: InquiryRequest,
     request: Request,
     background_tasks: BackgroundTasks,
+    _limit: None = Depends(rate_limit_dependency(inquiry_limiter)),
 ):
     """Submit a prospect inquiry from the landing page.
 
@@ -322,13 +293,7 @@ async def submit_inquiry(
     their email address. Returns the same success message for both
     new and duplicate emails to prevent email enumeration.
     """
-    # Rate limiting
-    client_ip = request.client.host if request.client else "unknown"
-    if not _check_rate_limit(client_ip):
-        raise HTTPException(
-            status_code=429,
-            detail="Too many requests. Please try again later."
-        )
+    # Rate limiting is enforced by the _limit dependency (per IP, per hour)
 
     # Insert prospect
     result = create_prospect(
@@ -0,0 +1,258 @@
+"""
+PII Audit Sink
+===============
+
+Moves pii_access_log writes off the request path.
+
+Writing one audit row per PII field read costs a connection, an INSERT
+and a commit (an fsync) each, so a profile view touching five encrypted
+fields paid five synchronous fsyncs before responding.
+
+The sink is a bounded in-process queue drained by one background
+writer thread.  The writer batch-inserts with ``executemany`` when
+either threshold is hit:
+- batch_size events are waiting, or
+- the oldest waiting event is max_delay_seconds old
+
+so an accepted event is committed within roughly max_delay_seconds
+(the durability bound).  The event time is captured when the event is
+submitted, not when it is written.
+
+The queue is bounded: when it is full, submit() drops the event and
+counts it rather than blocking the request.  stop() (called from the
+API lifespan shutdown) drains the queue before returning.
+
+When the sink is not running (CLI scripts, tests), log_pii_access()
+writes synchronously as before.
+
+Usage:
+    from ..services.audit_sink import pii_audit_sink
+    pii_audit_sink.start()                      # lifespan startup
+    pii_audit_sink.submit(row)                  # via log_pii_access()
+    pii_audit_sink.stop()                       # lifespan shutdown
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INSERT_SQL = """
+    INSERT INTO pii_access_log
+    (timestamp, investor_id, field_name, access_type, performed_by, ip_address, context)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Queue markers
+_STOP = object()
+
+
+class _Flush:
+    """Queue marker: write everything before it, then set done."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+def _default_connect() -> sqlite3.Connection:
+    from ..models.database import get_connection
+    return get_connection()
+
+
+class AuditSink:
+    """Bounded queue + background batch writer for pii_access_log rows."""
+
+    def __init__(self, connect: Optional[Callable[[], sqlite3.Connection]] = None,
+                 max_queue: int = 10_000, batch_size: int = 200,
+                 max_delay_seconds: float = 1.0):
+        self.connect = connect or _default_connect
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "peak_queue_depth": 0,
+            "max_lag_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread (no-op if already running)."""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="pii-audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, row: Tuple) -> bool:
+        """Queue one audit row without blocking.
+
+        Args:
+            row: (timestamp, investor_id, field_name, access_type,
+                  performed_by, ip_address, context)
+
+        Returns:
+            False if the sink is not running (caller should write it
+            directly); True otherwise, including when the row was dropped
+            because the queue is full.
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), row))
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+                dropped = self._stats["dropped"]
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("PII audit queue full (%d); %d event(s) dropped",
+                               self.max_queue, dropped)
+            return True
+        with self._lock:
+            self._stats["enqueued"] += 1
+            depth = self._queue.qsize()
+            if depth > self._stats["peak_queue_depth"]:
+                self._stats["peak_queue_depth"] = depth
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything submitted so far is committed.
+
+        Returns:
+            True if flushed within timeout (or the sink is not running)
+        """
+        if not self.running:
+            return True
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Drain the queue, commit the remainder and stop the writer."""
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("PII audit queue still full at shutdown; stopping anyway")
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, throughput and drop counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["max_queue"] = self.max_queue
+        stats["batch_size"] = self.batch_size
+        stats["max_delay_ms"] = round(self.max_delay_seconds * 1000, 1)
+        stats["max_lag_ms"] = round(stats["max_lag_ms"], 2)
+        stats["avg_batch_size"] = (
+            round(stats["written"] / stats["batches"], 1) if stats["batches"] else 0.0
+        )
+        stats["running"] = self.running
+        return stats
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        batch: List[Tuple[float, Tuple]] = []
+        while True:
+            if batch:
+                wait = batch[0][0] + self.max_delay_seconds - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(wait, 0))
+                except queue.Empty:
+                    self._write(batch)
+                    batch = []
+                    continue
+            else:
+                item = self._queue.get()
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, _Flush):
+                self._write(batch)
+                batch = []
+                item.done.set()
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch: List[Tuple[float, Tuple]]):
+        if not batch:
+            return
+        rows = [row for _, row in batch]
+        written = 0
+        try:
+            conn = self.connect()
+            try:
+                try:
+                    conn.executemany(INSERT_SQL, rows)
+                    conn.commit()
+                    written = len(rows)
+                except sqlite3.IntegrityError:
+                    # One bad row (e.g. access_type CHECK) must not lose
+                    # the rest of the batch
+                    conn.rollback()
+                    for row in rows:
+                        try:
+                            conn.execute(INSERT_SQL, row)
+                            written += 1
+                        except sqlite3.IntegrityError:
+                            pass
+                    conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            written = 0
+            logger.error("PII audit batch write failed (%d rows): %s", len(rows), e)
+
+        lag_ms = (time.monotonic() - batch[0][0]) * 1000
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["written"] += written
+            self._stats["failed"] += len(rows) - written
+            if lag_ms > self._stats["max_lag_ms"]:
+                self._stats["max_lag_ms"] = lag_ms
+
+
+def _build_default_sink() -> AuditSink:
+    from ..config import settings
+    return AuditSink(
+        max_queue=settings.PII_AUDIT_MAX_QUEUE,
+        batch_size=settings.PII_AUDIT_BATCH_SIZE,
+        max_delay_seconds=settings.PII_AUDIT_MAX_DELAY_MS / 1000,
+    )
+
+
+# Process-wide sink started by the API lifespan
+pii_audit_sink = _build_default_sink()
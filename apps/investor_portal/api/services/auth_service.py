@@ -9,6 +9,7 @@ Handles:
 - Login attempt tracking and lockout
 """
 
+import os
 import secrets
 import sqlite3
 import re
@@ -24,6 +25,12 @@ RESET_TOKEN_HOURS = 1
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_MINUTES = 15
 
+# bcrypt cost factor for new hashes.  With BCRYPT_REHASH_ON_LOGIN=true,
+# stored hashes at a different cost are transparently upgraded (or
+# downgraded) on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+REHASH_ON_LOGIN = os.getenv('BCRYPT_REHASH_ON_LOGIN', 'false').lower() == 'true'
+
 
 def get_project_root() -> Path:
     """Get project root directory"""
@@ -97,10 +104,10 @@ def validate_password(password: str) -> Tuple[bool, str]:
 # PASSWORD HASHING (using bcrypt directly)
 # ============================================================
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt (default cost: BCRYPT_ROUNDS)"""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -115,6 +122,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Extract the cost factor from a bcrypt hash ($2b$12$...)"""
+    try:
+        return int(hashed_password.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """True if a stored hash was created with a different cost factor"""
+    current = get_hash_rounds(hashed_password)
+    return current is not None and current != (rounds or BCRYPT_ROUNDS)
+
+
 # ============================================================
 # TOKEN GENERATION
 # ============================================================
@@ -340,6 +361,15 @@ def authenticate_user(email: str, password: str) -> Tuple[bool, str, Optional[Di
                 updated_at = CURRENT_TIMESTAMP
             WHERE investor_id = ?
         """, (investor_id,))
+        
+        # Transparently upgrade the stored hash to the configured cost
+        if REHASH_ON_LOGIN and needs_rehash(password_hash):
+            cursor.execute("""
+                UPDATE investor_auth
+                SET password_hash = ?
+                WHERE investor_id = ?
+            """, (hash_password(password), investor_id))
+        
         conn.commit()
         
         return True, "Login successful", {
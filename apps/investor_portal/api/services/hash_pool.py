@@ -0,0 +1,146 @@
+"""
+Password Hash Pool
+===================
+
+Runs bcrypt-bound auth work off the event loop.
+
+bcrypt at cost 12 takes ~250 ms of CPU per hash/check.  Called directly
+from an ``async def`` route it blocks the whole event loop, so every
+other request (including /health) stalls during a login.
+
+bcrypt releases the GIL while hashing, so a small dedicated thread pool
+gives real parallelism without the pickling and DB-connection issues of
+a process pool.  The pool is bounded twice:
+- max_workers caps concurrent hashes (CPU)
+- max_pending caps queued + running jobs; beyond that new requests are
+  rejected with HashPoolBusy (routes return 503) instead of piling up
+
+Usage:
+    from ..services.hash_pool import hash_pool
+    success, message, data = await hash_pool.run(authenticate_user, email, password)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class HashPoolBusy(Exception):
+    """Raised when too many hash jobs are already queued."""
+
+
+class HashPool:
+    """Bounded thread pool for bcrypt work, with queue-depth metrics."""
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 64):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "peak_queue_depth": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bcrypt",
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and await its result.
+
+        Raises:
+            HashPoolBusy: if max_pending jobs are already queued or running
+        """
+        with self._lock:
+            if self._queued + self._active >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise HashPoolBusy("Too many authentication requests in progress")
+            self._queued += 1
+            if self._queued > self._stats["peak_queue_depth"]:
+                self._stats["peak_queue_depth"] = self._queued
+
+        submitted = time.perf_counter()
+        # Guarded by _lock: "queued" until job() claims it or the caller
+        # gives up on it ("abandoned"), so _queued is released exactly once
+        state = ["queued"]
+
+        def job():
+            started = time.perf_counter()
+            wait_ms = (started - submitted) * 1000
+            with self._lock:
+                if state[0] == "abandoned":
+                    return None
+                state[0] = "started"
+                self._queued -= 1
+                self._active += 1
+                self._stats["total_wait_ms"] += wait_ms
+                if wait_ms > self._stats["max_wait_ms"]:
+                    self._stats["max_wait_ms"] = wait_ms
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._stats["completed"] += 1
+                    self._stats["total_run_ms"] += (time.perf_counter() - started) * 1000
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), job)
+        except (asyncio.CancelledError, RuntimeError):
+            # Cancelled while queued (client disconnect, timeout), or the
+            # executor shut down between _get_executor() and submit
+            with self._lock:
+                if state[0] == "queued":
+                    state[0] = "abandoned"
+                    self._queued -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self._queued
+            stats["active"] = self._active
+        completed = stats["completed"]
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / completed, 2) if completed else 0.0
+        stats["avg_run_ms"] = round(stats["total_run_ms"] / completed, 2) if completed else 0.0
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 2)
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        del stats["total_wait_ms"], stats["total_run_ms"]
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop worker threads (a later run() starts a fresh pool)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _build_default_pool() -> HashPool:
+    from ..config import settings
+    return HashPool(
+        max_workers=settings.BCRYPT_POOL_WORKERS or None,
+        max_pending=settings.BCRYPT_MAX_PENDING,
+    )
+
+
+# Process-wide pool used by the auth routes
+hash_pool = _build_default_pool()
@@ -0,0 +1,166 @@
+"""
+Principal Cache
+================
+
+Short-lived, size-bounded cache of authenticated principals.
+
+A portal page load fires 6-10 API calls with the same access token.
+Without a cache each one re-decodes the JWT and opens a SQLite
+connection just to confirm the investor is still Active.
+
+Design:
+- Keyed by a SHA-256 digest of the access token (tokens carry a
+  unique ``jti`` claim, so every issued token has its own entry)
+- Secondary index by investor_id for explicit invalidation
+- Entry lifetime = min(TTL, token expiry), so an expired token is
+  never served from cache and always goes back through verify_token()
+- Only successful lookups are cached; unknown or inactive investors
+  hit the database every time
+- LRU eviction once max_entries is reached
+
+Status changes made out-of-process (e.g. close_investor_account.py)
+take effect within one TTL, or immediately via
+POST /admin/cache/invalidate/{investor_id}.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+
+def token_key(token: str) -> str:
+    """Cache key for a raw bearer token (never store the token itself)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU cache of principals keyed by token digest."""
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (principal, investor_id, expires_at)
+        self._entries: "OrderedDict[str, Tuple[Any, str, float]]" = OrderedDict()
+        self._by_investor: Dict[str, Set[str]] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _remove(self, key: str):
+        """Drop one entry and its investor index link (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        investor_id = entry[1]
+        keys = self._by_investor.get(investor_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_investor[investor_id]
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached principal for a token, or None."""
+        if not self.enabled:
+            return None
+        key = token_key(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[2] <= now:
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, token: str, investor_id: str, principal: Any,
+            token_expires_at: Optional[float] = None):
+        """Cache a principal until the TTL or the token expiry, whichever is first."""
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = now + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        if expires_at <= now:
+            return
+
+        key = token_key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, investor_id, expires_at)
+            self._by_investor.setdefault(investor_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate_token(self, token: str) -> bool:
+        """Drop a single token's entry. Returns True if one was cached."""
+        key = token_key(token)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._stats["invalidations"] += 1
+            return True
+
+    def invalidate_investor(self, investor_id: str) -> int:
+        """Drop every cached token for an investor (status change, closure)."""
+        with self._lock:
+            keys = list(self._by_investor.get(investor_id, ()))
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_investor.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of counters plus current size and hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+def _build_default_cache() -> PrincipalCache:
+    from ..config import settings
+    return PrincipalCache(
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    )
+
+
+# Process-wide instance used by get_current_user
+principal_cache = _build_default_cache()
+
+
+def invalidate_investor(investor_id: str) -> int:
+    """Invalidate cached principals for an investor (module-level helper)."""
+    return principal_cache.invalidate_investor(investor_id)
@@ -0,0 +1,332 @@
+"""
+Rate Limiting
+==============
+
+Per-client request budgets for unauthenticated endpoints
+(/public/inquiry, /auth/login, /auth/forgot-password).
+
+Algorithm: sliding-window counter.  Each key keeps three numbers --
+the current window index and the counts for the current and previous
+fixed windows.  The effective count is
+
+    previous * (1 - elapsed_fraction_of_current_window) + current
+
+which approximates a true sliding window in O(1) time and constant
+memory per key, instead of a growing list of timestamps.
+
+Backends:
+- MemoryBackend (default): dict in this process, swept of stale keys
+  once per window and capped at max_keys
+- SQLiteBackend: small shared SQLite file so every uvicorn worker on
+  the host enforces one budget.  Enable with
+  RATE_LIMIT_BACKEND=sqlite (path: RATE_LIMIT_DB_PATH)
+
+Usage (FastAPI dependency):
+    @router.post("/login")
+    async def login(body: LoginRequest,
+                    _limit: None = Depends(rate_limit_dependency(login_limiter))):
+        ...
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+
+class MemoryBackend:
+    """In-process sliding-window counters with periodic eviction."""
+
+    def __init__(self, max_keys: int = 200_000,
+                 clock: Callable[[], float] = time.time):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        # scope -> {key: (window_index, previous_count, current_count)}
+        self._scopes: Dict[str, Dict[str, Tuple[int, int, int]]] = {}
+        self._last_sweep: Dict[str, int] = {}
+        self._total = 0
+        self.evicted = 0
+
+    def _sweep(self, scope: str, window_index: int):
+        """Drop keys whose both windows have expired (lock held)."""
+        counters = self._scopes[scope]
+        stale = [k for k, c in counters.items() if c[0] < window_index - 1]
+        for k in stale:
+            del counters[k]
+        self._total -= len(stale)
+        self.evicted += len(stale)
+        self._last_sweep[scope] = window_index
+
+    def hit(self, scope: str, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        """Record one request if under budget.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = self._clock()
+        window_index = int(now // window)
+        elapsed = (now % window) / window
+
+        with self._lock:
+            counters = self._scopes.get(scope)
+            if counters is None:
+                counters = self._scopes[scope] = {}
+                self._last_sweep[scope] = window_index
+            elif self._last_sweep[scope] < window_index:
+                self._sweep(scope, window_index)
+
+            counter = counters.get(key)
+            if counter is None:
+                if self._total >= self.max_keys:
+                    self._make_room(scope, window_index)
+                self._total += 1
+                previous = current = 0
+            elif counter[0] == window_index:
+                _, previous, current = counter
+            else:
+                previous = counter[2] if counter[0] == window_index - 1 else 0
+                current = 0
+
+            allowed, retry_after = _decide(previous, current, limit, window, elapsed)
+            if allowed:
+                current += 1
+            counters[key] = (window_index, previous, current)
+            return allowed, retry_after
+
+    def _make_room(self, scope: str, window_index: int):
+        """Sweep, then drop oldest-inserted keys if still full (lock held)."""
+        self._sweep(scope, window_index)
+        counters = self._scopes[scope]
+        while self._total >= self.max_keys and counters:
+            del counters[next(iter(counters))]  # Fails open for that key
+            self._total -= 1
+            self.evicted += 1
+
+    def clear(self, scope: Optional[str] = None):
+        with self._lock:
+            if scope is None:
+                self._scopes.clear()
+                self._last_sweep.clear()
+                self._total = 0
+            else:
+                self._total -= len(self._scopes.pop(scope, {}))
+                self._last_sweep.pop(scope, None)
+
+    def size(self, scope: Optional[str] = None) -> int:
+        with self._lock:
+            if scope is None:
+                return self._total
+            return len(self._scopes.get(scope, {}))
+
+
+class SQLiteBackend:
+    """Sliding-window counters in a SQLite file shared by all workers."""
+
+    def __init__(self, db_path, clock: Callable[[], float] = time.time):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._local = threading.local()
+        self._last_sweep: Dict[str, int] = {}
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_counters (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                window_index INTEGER NOT NULL,
+                previous_count INTEGER NOT NULL,
+                current_count INTEGER NOT NULL,
+                PRIMARY KEY (scope, key)
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, scope: str, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        now = self._clock()
+        window_index = int(now // window)
+        elapsed = (now % window) / window
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._last_sweep.get(scope, window_index) < window_index:
+                conn.execute(
+                    "DELETE FROM rate_limit_counters WHERE scope = ? AND window_index < ?",
+                    (scope, window_index - 1),
+                )
+            self._last_sweep[scope] = window_index
+
+            row = conn.execute(
+                "SELECT window_index, previous_count, current_count "
+                "FROM rate_limit_counters WHERE scope = ? AND key = ?",
+                (scope, key),
+            ).fetchone()
+            if row is None:
+                previous = current = 0
+            elif row[0] == window_index:
+                _, previous, current = row
+            else:
+                previous = row[2] if row[0] == window_index - 1 else 0
+                current = 0
+
+            allowed, retry_after = _decide(previous, current, limit, window, elapsed)
+            if allowed:
+                current += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_counters "
+                "(scope, key, window_index, previous_count, current_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (scope, key, window_index, previous, current),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    def clear(self, scope: Optional[str] = None):
+        conn = self._conn()
+        if scope is None:
+            conn.execute("DELETE FROM rate_limit_counters")
+            self._last_sweep.clear()
+        else:
+            conn.execute("DELETE FROM rate_limit_counters WHERE scope = ?", (scope,))
+            self._last_sweep.pop(scope, None)
+
+    def size(self, scope: Optional[str] = None) -> int:
+        conn = self._conn()
+        if scope is None:
+            return conn.execute("SELECT COUNT(*) FROM rate_limit_counters").fetchone()[0]
+        return conn.execute(
+            "SELECT COUNT(*) FROM rate_limit_counters WHERE scope = ?", (scope,)
+        ).fetchone()[0]
+
+
+def _decide(previous: int, current: int, limit: int, window: int,
+            elapsed: float) -> Tuple[bool, float]:
+    """Apply the sliding-window estimate for the current window.
+
+    Returns:
+        (allowed, retry_after_seconds)
+    """
+    if previous * (1 - elapsed) + current + 1 <= limit:
+        return True, 0.0
+    # Time until the previous window's weight decays enough for one more
+    if previous and current < limit:
+        needed = 1 - (limit - 1 - current) / previous
+        retry_after = max(0.0, (needed - elapsed) * window)
+    else:
+        retry_after = (1 - elapsed) * window
+    return False, retry_after
+
+
+class RateLimiter:
+    """A named request budget (limit per window seconds) on a backend."""
+
+    def __init__(self, scope: str, limit: int, window: int, backend=None):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.backend = backend or default_backend()
+        self.allowed = 0
+        self.rejected = 0
+
+    def check(self, key: str) -> Tuple[bool, float]:
+        """Record a request for key. Returns (allowed, retry_after_seconds)."""
+        allowed, retry_after = self.backend.hit(self.scope, key, self.limit, self.window)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return allowed, retry_after
+
+    def hit(self, key: str) -> bool:
+        return self.check(key)[0]
+
+    def clear(self):
+        self.backend.clear(self.scope)
+
+    def stats(self) -> Dict:
+        return {
+            "scope": self.scope,
+            "limit": self.limit,
+            "window_seconds": self.window,
+            "tracked_keys": self.backend.size(self.scope),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_dependency(limiter: RateLimiter,
+                          detail: str = "Too many requests. Please try again later."):
+    """Build a FastAPI dependency that enforces limiter per client IP.
+
+    The dependency is a plain function so FastAPI runs it in its thread
+    pool: SQLiteBackend can block on a contended lock for up to its busy
+    timeout, which must not stall the event loop.
+    """
+
+    def dependency(request: Request) -> None:
+        allowed, retry_after = limiter.check(client_ip(request))
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=detail,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    return dependency
+
+
+# ============================================================
+# Shared backend and endpoint budgets
+# ============================================================
+
+_default_backend = None
+_backend_lock = threading.Lock()
+
+
+def default_backend():
+    """Backend selected by RATE_LIMIT_BACKEND (memory | sqlite)."""
+    global _default_backend
+    with _backend_lock:
+        if _default_backend is None:
+            from ..config import settings, get_database_path
+            if settings.RATE_LIMIT_BACKEND == "sqlite":
+                db_path = Path(settings.RATE_LIMIT_DB_PATH)
+                if not db_path.is_absolute():
+                    db_path = get_database_path().parent / db_path
+                _default_backend = SQLiteBackend(db_path)
+            else:
+                _default_backend = MemoryBackend()
+        return _default_backend
+
+
+def _build_limiters():
+    from ..config import settings
+    return (
+        RateLimiter("inquiry", settings.INQUIRY_RATE_LIMIT, 3600),
+        RateLimiter("login", settings.LOGIN_RATE_LIMIT, 300),
+        RateLimiter("forgot_password", settings.FORGOT_PASSWORD_RATE_LIMIT, 3600),
+    )
+
+
+inquiry_limiter, login_limiter, forgot_password_limiter = _build_limiters()
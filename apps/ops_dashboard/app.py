@@ -411,6 +411,48 @@ if email_stats['recent']:
         st.dataframe(pd.DataFrame(email_stats['recent']),
                      use_container_width=True)
 
+# ---------------------------------------------------------------------------
+# Section 8: Pipeline Stage Timings
+# ---------------------------------------------------------------------------
+st.divider()
+st.subheader("Pipeline Stage Timings")
+
+timings = svc.get_stage_timings(days=days_range)
+if timings['stages']:
+    import pandas as pd
+
+    slowest = timings['slowest_today']
+    t_cols = st.columns(3)
+    if slowest:
+        t_cols[0].metric("Slowest stage today", slowest['name'],
+                         f"{slowest['duration_ms'] / 1000:,.1f} s",
+                         delta_color="off")
+    else:
+        t_cols[0].metric("Slowest stage today", "No runs yet")
+    t_cols[1].metric("Stages traced", len(timings['stages']))
+    t_cols[2].metric("Failed spans",
+                     sum(stage['errors'] for stage in timings['stages']))
+
+    st.dataframe(
+        pd.DataFrame(timings['stages'])[
+            ['name', 'runs', 'errors', 'avg_ms', 'p50_ms', 'p95_ms',
+             'max_ms', 'last_ms', 'last_run']],
+        use_container_width=True, hide_index=True,
+    )
+
+    if timings['trend']:
+        stage_names = [stage['name'] for stage in timings['stages']]
+        selected = st.multiselect("Duration trend (daily average, ms)",
+                                  stage_names, default=stage_names[:5])
+        if selected:
+            trend = pd.DataFrame(timings['trend'])
+            trend = trend[trend['name'].isin(selected)]
+            st.line_chart(trend.pivot(index='date', columns='name',
+                                      values='avg_ms'))
+else:
+    st.info("No stage timings recorded yet. Spans are written by the "
+            "daily NAV pipeline, ETL, production sync and report runs.")
+
 # ---------------------------------------------------------------------------
 # Auto-refresh
 # ---------------------------------------------------------------------------
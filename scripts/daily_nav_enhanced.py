@@ -11,12 +11,23 @@ Comprehensive daily update that:
 Supports multiple brokerage providers (Tradier, TastyTrade) via
 the BROKERAGE_PROVIDER environment variable.
 
+The steps run as a task graph (src/automation/pipeline.py):
+balance and shares -> NAV write (critical, fail-fast), then holdings
+snapshot, reconciliation, trade sync, Discord and benchmark refresh in
+parallel, then production sync. Per-step timings are saved to the
+pipeline_runs table.
+
+Usage:
+    python scripts/daily_nav_enhanced.py
+    python scripts/daily_nav_enhanced.py --from-step trade_sync
+
 This script should be monitored by watchdog_monitor.py
 """
 
 import os
 import sys
 import sqlite3
+import threading
 import requests
 from datetime import datetime
 from pathlib import Path
@@ -55,6 +66,15 @@ TRADIER_BASE_URL = os.getenv('TRADIER_BASE_URL', 'https://api.tradier.com/v1')
 # Financial rounding
 from src.utils.rounding import round_nav, round_dollars, round_pct
 
+# Investor valuation (share count and reconciliation)
+from src.automation.valuation import active_investor_filter, value_fund
+
+# Step graph runner
+from src.automation.pipeline import (
+    Pipeline, PipelineStep, SUCCESS, DEFAULT_MAX_WORKERS, record_pipeline_run,
+)
+from src.monitoring.tracing import span
+
 # External monitoring
 HEALTHCHECK_DAILY_NAV_URL = os.getenv('HEALTHCHECK_DAILY_NAV_URL', '')
 
@@ -67,32 +87,50 @@ SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
 ALERT_EMAIL = os.getenv('ALERT_EMAIL') or os.getenv('ADMIN_EMAIL', '')
 
 
+# Discord step limit: notify_nav_written() waits up to the publisher's
+# NOTIFY_TIMEOUT (120 s), then the one-shot updater may still run
+DISCORD_STEP_TIMEOUT = 180
+
+# Pipeline step names, in declared (resume) order
+STEP_NAMES = [
+    'balance', 'shares', 'nav', 'holdings_snapshot', 'plan_performance',
+    'reconciliation', 'trade_sync', 'discord', 'benchmarks', 'production_sync',
+]
+
+
 class DailyNAVUpdater:
     def __init__(self):
         self.errors = []
         self.portfolio_value = None
         self.nav_per_share = None
+        # Raw inputs to the NAV calculation (shared between steps)
+        self.brokerage_balance = None
+        self.total_shares = None
+        self._log_lock = threading.Lock()
         
     def log(self, message, level="INFO"):
         """Write to log file"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_line = f"[{timestamp}] [{level}] {message}"
-        print(log_line)
-        
-        try:
-            LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            # Try to write to log, handle permission errors gracefully
+
+        # Pipeline steps log from several threads at once
+        with self._log_lock:
+            print(log_line)
+
             try:
-                with open(LOG_FILE, 'a', encoding='utf-8') as f:
-                    f.write(log_line + '\n')
-            except PermissionError:
-                # Try alternate log file if main one is locked
-                alt_log = LOG_FILE.parent / f"daily_runner_{datetime.now().strftime('%Y%m%d')}.log"
-                with open(alt_log, 'a', encoding='utf-8') as f:
-                    f.write(log_line + '\n')
-        except Exception as e:
-            # Don't let logging failures stop the script
-            pass  # Silently continue - we already printed to console
+                LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+                # Try to write to log, handle permission errors gracefully
+                try:
+                    with open(LOG_FILE, 'a', encoding='utf-8') as f:
+                        f.write(log_line + '\n')
+                except PermissionError:
+                    # Try alternate log file if main one is locked
+                    alt_log = LOG_FILE.parent / f"daily_runner_{datetime.now().strftime('%Y%m%d')}.log"
+                    with open(alt_log, 'a', encoding='utf-8') as f:
+                        f.write(log_line + '\n')
+            except Exception as e:
+                # Don't let logging failures stop the script
+                pass  # Silently continue - we already printed to console
     
     def write_heartbeat(self):
         """Write heartbeat file so watchdog knows we ran"""
@@ -258,11 +296,9 @@ Automated alert from daily_nav_enhanced.py
         try:
             conn = sqlite3.connect(str(DB_PATH), timeout=10)
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT SUM(current_shares) 
-                FROM investors 
-                WHERE status = 'Active' OR status IS NULL OR status = ''
-            """)
+            cursor.execute(
+                f"SELECT SUM(current_shares) FROM investors WHERE {active_investor_filter()}"
+            )
             result = cursor.fetchone()
             conn.close()
             
@@ -370,85 +406,68 @@ Automated alert from daily_nav_enhanced.py
 
         Stores a daily snapshot of every position held across all brokerage
         accounts. This builds the dataset for per-holding performance charts
-        in monthly reports.
+        in monthly reports. All brokerages are written in one transaction;
+        only positions that changed since the previous snapshot add rows
+        (see src/database/holdings_store.py).
 
-        Non-fatal: if this fails, the NAV update is still valid.
+        A brokerage that cannot list positions is skipped; any other
+        failure raises so the pipeline records the step as failed.
         """
-        try:
-            if str(PROJECT_DIR) not in sys.path:
-                sys.path.insert(0, str(PROJECT_DIR))
-
-            from src.api.brokerage import get_all_brokerage_clients
+        if str(PROJECT_DIR) not in sys.path:
+            sys.path.insert(0, str(PROJECT_DIR))
 
-            clients = get_all_brokerage_clients()
-            today = datetime.now().strftime('%Y-%m-%d')
-            now = datetime.now().isoformat()
+        from src.api.brokerage import get_all_brokerage_clients
+        from src.database.holdings_store import write_holdings_snapshots
 
-            conn = sqlite3.connect(str(DB_PATH), timeout=10)
-            cursor = conn.cursor()
+        clients = get_all_brokerage_clients()
+        today = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now().isoformat()
 
-            for provider, client in clients.items():
-                try:
-                    positions = client.get_positions()
-                except Exception as e:
-                    self.log(f"  Holdings snapshot skipped for {provider}: {e}", "WARNING")
-                    continue
-
-                # Insert or replace snapshot header
-                cursor.execute("""
-                    INSERT OR REPLACE INTO holdings_snapshots
-                    (date, source, snapshot_time, total_positions)
-                    VALUES (?, ?, ?, ?)
-                """, (today, provider, now, len(positions)))
-
-                snapshot_id = cursor.lastrowid
-
-                # Clear any existing position records for this snapshot
-                cursor.execute(
-                    "DELETE FROM position_snapshots WHERE snapshot_id = ?",
-                    (snapshot_id,)
-                )
+        positions_by_source = {}
+        for provider, client in clients.items():
+            try:
+                positions = client.get_positions()
+            except Exception as e:
+                self.log(f"  Holdings snapshot skipped for {provider}: {e}", "WARNING")
+                continue
 
-                # Insert each position
-                for pos in positions:
-                    qty = pos.get('quantity', 0) or 0
-                    price = pos.get('close_price', 0) or 0
-                    avg_price = pos.get('average_open_price', 0) or 0
-                    market_value = qty * price
-                    cost_basis = qty * avg_price if avg_price else None
-                    unrealized_pl = (market_value - cost_basis) if cost_basis else None
-
-                    cursor.execute("""
-                        INSERT INTO position_snapshots (
-                            snapshot_id, symbol, underlying_symbol, quantity,
-                            instrument_type, average_open_price, close_price,
-                            market_value, cost_basis, unrealized_pl,
-                            option_type, strike, expiration_date, multiplier
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        snapshot_id,
-                        pos.get('symbol'),
-                        pos.get('underlying_symbol'),
-                        qty,
-                        pos.get('instrument_type'),
-                        avg_price if avg_price else None,
-                        price if price else None,
-                        round(market_value, 2),
-                        round(cost_basis, 2) if cost_basis else None,
-                        round(unrealized_pl, 2) if unrealized_pl is not None else None,
-                        pos.get('option_type'),
-                        pos.get('strike'),
-                        pos.get('expiration_date'),
-                        pos.get('multiplier'),
-                    ))
-
-                self.log(f"  [OK] Holdings snapshot: {provider} - {len(positions)} positions")
+            rows = []
+            for pos in positions:
+                qty = pos.get('quantity', 0) or 0
+                price = pos.get('close_price', 0) or 0
+                avg_price = pos.get('average_open_price', 0) or 0
+                market_value = qty * price
+                cost_basis = qty * avg_price if avg_price else None
+                unrealized_pl = (market_value - cost_basis) if cost_basis else None
+
+                rows.append({
+                    'symbol': pos.get('symbol'),
+                    'underlying_symbol': pos.get('underlying_symbol'),
+                    'quantity': qty,
+                    'instrument_type': pos.get('instrument_type'),
+                    'average_open_price': avg_price if avg_price else None,
+                    'close_price': price if price else None,
+                    'market_value': round(market_value, 2),
+                    'cost_basis': round(cost_basis, 2) if cost_basis else None,
+                    'unrealized_pl': round(unrealized_pl, 2) if unrealized_pl is not None else None,
+                    'option_type': pos.get('option_type'),
+                    'strike': pos.get('strike'),
+                    'expiration_date': pos.get('expiration_date'),
+                    'multiplier': pos.get('multiplier'),
+                })
+            positions_by_source[provider] = rows
+
+        if not positions_by_source:
+            return
 
-            conn.commit()
+        conn = sqlite3.connect(str(DB_PATH), timeout=10)
+        try:
+            write_holdings_snapshots(conn, today, positions_by_source, snapshot_time=now)
+        finally:
             conn.close()
 
-        except Exception as e:
-            self.log(f"Holdings snapshot failed: {e}", "WARNING")
+        for provider, rows in positions_by_source.items():
+            self.log(f"  [OK] Holdings snapshot: {provider} - {len(rows)} positions")
 
     def compute_plan_performance(self):
         """
@@ -458,15 +477,15 @@ Automated alert from daily_nav_enhanced.py
         a plan (CASH, ETF, or Plan A), aggregates market_value/cost_basis/
         unrealized_pl per plan, and writes to plan_daily_performance table.
 
-        Non-fatal: if this fails, the NAV update is still valid.
+        Raises on failure so the pipeline records the step as failed.
         """
-        try:
-            from src.plans.classification import (
-                classify_position_by_underlying, PLAN_IDS
-            )
+        from src.plans.classification import (
+            classify_position_by_underlying, PLAN_IDS
+        )
 
-            today = datetime.now().strftime('%Y-%m-%d')
-            conn = sqlite3.connect(str(DB_PATH), timeout=10)
+        today = datetime.now().strftime('%Y-%m-%d')
+        conn = sqlite3.connect(str(DB_PATH), timeout=10)
+        try:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -479,7 +498,6 @@ Automated alert from daily_nav_enhanced.py
             row = cursor.fetchone()
             if not row:
                 self.log("  Plan performance skipped: no snapshot for today", "WARNING")
-                conn.close()
                 return
 
             snapshot_id = row["snapshot_id"]
@@ -495,7 +513,6 @@ Automated alert from daily_nav_enhanced.py
 
             if not positions:
                 self.log("  Plan performance skipped: no positions in snapshot", "WARNING")
-                conn.close()
                 return
 
             # Classify and aggregate
@@ -539,17 +556,15 @@ Automated alert from daily_nav_enhanced.py
                 ))
 
             conn.commit()
+        finally:
             conn.close()
 
-            plan_summary = ", ".join(
-                f"{pid}: {d['position_count']} pos ({d['market_value'] / total_value * 100:.0f}%)"
-                if total_value > 0 else f"{pid}: {d['position_count']} pos"
-                for pid, d in plans.items()
-            )
-            self.log(f"  [OK] Plan performance: {plan_summary}")
-
-        except Exception as e:
-            self.log(f"Plan performance computation failed: {e}", "WARNING")
+        plan_summary = ", ".join(
+            f"{pid}: {d['position_count']} pos ({d['market_value'] / total_value * 100:.0f}%)"
+            if total_value > 0 else f"{pid}: {d['position_count']} pos"
+            for pid, d in plans.items()
+        )
+        self.log(f"  [OK] Plan performance: {plan_summary}")
 
     def run_daily_reconciliation(self, portfolio_value, total_shares):
         """
@@ -558,14 +573,16 @@ Automated alert from daily_nav_enhanced.py
         Checks:
         1. Brokerage balance matches what we recorded
         2. Investor shares sum matches total_shares in daily_nav
-        3. Portfolio value is positive and reasonable
-        4. NAV per share is within expected bounds
+        3. Investor values add up to the portfolio value
+        4. Portfolio value is positive and reasonable
+        5. NAV per share is within expected bounds
 
-        Non-fatal: warnings are logged but don't block the NAV update.
+        Mismatches are logged as warnings; errors raise so the pipeline
+        records the step as failed.
         """
         self.log("Running daily reconciliation...")
+        conn = sqlite3.connect(str(DB_PATH), timeout=10)
         try:
-            conn = sqlite3.connect(str(DB_PATH), timeout=10)
             cursor = conn.cursor()
             today = datetime.now().strftime('%Y-%m-%d')
 
@@ -577,7 +594,6 @@ Automated alert from daily_nav_enhanced.py
             nav_row = cursor.fetchone()
             if not nav_row:
                 self.log("Reconciliation skipped: no NAV entry for today", "WARNING")
-                conn.close()
                 return
 
             recorded_nav = nav_row[0]
@@ -585,15 +601,16 @@ Automated alert from daily_nav_enhanced.py
             recorded_shares = nav_row[2]
 
             # Cross-check: sum of investor shares vs daily_nav total_shares
-            cursor.execute("""
-                SELECT SUM(current_shares) FROM investors
-                WHERE status = 'Active' OR status IS NULL OR status = ''
-            """)
-            investor_shares_sum = cursor.fetchone()[0] or 0
+            valuation = value_fund(conn)
+            investor_shares_sum = valuation.total_shares
 
             share_diff = abs(recorded_shares - investor_shares_sum)
             shares_match = share_diff < 0.01  # Allow tiny float rounding
 
+            # Cross-check: investor values account for the whole portfolio
+            allocation = valuation.total_portfolio_percent if len(valuation) else 100.0
+            allocation_match = abs(allocation - 100.0) < 0.01
+
             # Cross-check: portfolio value matches brokerage balance
             value_diff = abs(recorded_value - portfolio_value)
             value_match = value_diff < 0.01
@@ -608,6 +625,9 @@ Automated alert from daily_nav_enhanced.py
                 issues.append(f"Share mismatch: NAV table={recorded_shares:.4f}, "
                               f"investor sum={investor_shares_sum:.4f}, "
                               f"diff={share_diff:.4f}")
+            if not allocation_match:
+                issues.append(f"Investor values add up to {allocation:.4f}% "
+                              f"of the portfolio (${valuation.total_value:,.2f})")
             if not value_match:
                 issues.append(f"Value mismatch: NAV table={recorded_value:.2f}, "
                               f"brokerage={portfolio_value:.2f}, "
@@ -635,161 +655,271 @@ Automated alert from daily_nav_enhanced.py
             ))
 
             conn.commit()
+        finally:
             conn.close()
 
-            if issues:
-                for issue in issues:
-                    self.log(f"  RECONCILIATION WARNING: {issue}", "WARNING")
-            else:
-                self.log("[OK] Daily reconciliation passed - all checks matched")
-
-        except Exception as e:
-            self.log(f"Daily reconciliation failed: {e}", "WARNING")
+        if issues:
+            for issue in issues:
+                self.log(f"  RECONCILIATION WARNING: {issue}", "WARNING")
+        else:
+            self.log("[OK] Daily reconciliation passed - all checks matched")
 
     def run_trade_sync(self):
         """
-        Step 6: Sync brokerage trades via ETL pipeline (non-fatal).
+        Step 6: Sync brokerage trades via ETL pipeline (non-critical).
 
         Runs the ETL pipeline for the last 3 days to catch any trades
         made since the last sync (covers weekends and holidays).
         """
+        self.log("Running trade sync via ETL pipeline...")
+        from src.etl.load import run_full_pipeline
+        from datetime import timedelta
+
+        stats = run_full_pipeline(
+            start_date=datetime.now() - timedelta(days=3),
+            end_date=datetime.now(),
+        )
+
+        # Log extract results
+        for provider, extract_stats in stats.get('extract', {}).items():
+            if 'error' in extract_stats:
+                self.log(f"  Trade sync extract [{provider}]: FAILED - {extract_stats['error']}", "WARNING")
+            else:
+                ingested = extract_stats.get('ingested', 0)
+                skipped = extract_stats.get('skipped', 0)
+                self.log(f"  [OK] Trade sync [{provider}]: {ingested} new, {skipped} existing")
+
+        # Log load results
+        load_stats = stats.get('load', {})
+        loaded = load_stats.get('loaded', 0)
+        dupes = load_stats.get('duplicates', 0)
+        errors = load_stats.get('load_errors', 0)
+
+        if errors > 0:
+            self.log(f"  Trade sync load: {loaded} loaded, {dupes} dupes, {errors} errors", "WARNING")
+        else:
+            self.log(f"  [OK] Trade sync: {loaded} new trades loaded, {dupes} already existed")
+
+    # ----------------------------------------------------------
+    # Pipeline steps
+    # ----------------------------------------------------------
+    # Each step raises on failure so the pipeline can record it.
+    # Critical steps (balance -> shares -> NAV) stop the run; the
+    # others log a warning and never block the NAV update.
+
+    def step_balance(self):
+        """Step 1: Get portfolio balance from configured brokerage"""
+        portfolio_value = self.get_portfolio_balance()
+        if portfolio_value is None:
+            raise Exception("Failed to get portfolio balance")
+        self.brokerage_balance = portfolio_value
+        return portfolio_value
+
+    def step_shares(self):
+        """Step 2: Get total shares"""
+        total_shares = self.get_total_shares()
+        if total_shares is None or total_shares <= 0:
+            raise Exception("Failed to get total shares")
+        self.total_shares = total_shares
+        return total_shares
+
+    def step_nav(self):
+        """Step 3: Update NAV"""
+        # Resumed at this step: balance and shares were not fetched yet
+        if self.brokerage_balance is None:
+            self.step_balance()
+        if self.total_shares is None:
+            self.step_shares()
+        if not self.update_nav(self.brokerage_balance, self.total_shares):
+            raise Exception("Failed to update NAV")
+
+    def _load_todays_nav(self):
+        """Fill balance/shares from today's daily_nav row (resumed runs)."""
+        if self.brokerage_balance is not None and self.total_shares is not None:
+            return
+        conn = sqlite3.connect(str(DB_PATH), timeout=10)
         try:
-            self.log("Running trade sync via ETL pipeline...")
-            from src.etl.load import run_full_pipeline
-            from datetime import timedelta
-
-            stats = run_full_pipeline(
-                start_date=datetime.now() - timedelta(days=3),
-                end_date=datetime.now(),
-            )
+            row = conn.execute(
+                "SELECT total_portfolio_value, total_shares, nav_per_share "
+                "FROM daily_nav WHERE date = ?",
+                (datetime.now().strftime('%Y-%m-%d'),)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            raise Exception("No NAV entry for today - run from the 'balance' step")
+        self.brokerage_balance = self.brokerage_balance if self.brokerage_balance is not None else row[0]
+        self.total_shares = self.total_shares if self.total_shares is not None else row[1]
+        self.portfolio_value = self.portfolio_value or row[0]
+        self.nav_per_share = self.nav_per_share or row[2]
+
+    def step_reconciliation(self):
+        """Step 5: Daily reconciliation"""
+        self._load_todays_nav()
+        self.run_daily_reconciliation(self.brokerage_balance, self.total_shares)
+
+    def step_discord(self):
+        """Step 7: Update Discord pinned NAV message
+
+        Sends a "NAV written" event to the NAV publisher service when it is
+        running; otherwise updates the message with a one-shot connection.
+        """
+        from scripts.discord.nav_publisher import notify_nav_written
+        self.log("Step 7: Updating Discord pinned NAV message...")
+        nav_per_share = (self.brokerage_balance / self.total_shares
+                         if self.brokerage_balance and self.total_shares else None)
+        status = notify_nav_written(datetime.now().strftime('%Y-%m-%d'), nav_per_share)
+        if status is not None:
+            if status == 'error':
+                raise RuntimeError("NAV publisher failed to update Discord")
+            self.log(f"  [OK] NAV publisher: {status}")
+            return
 
-            # Log extract results
-            for provider, extract_stats in stats.get('extract', {}).items():
-                if 'error' in extract_stats:
-                    self.log(f"  Trade sync extract [{provider}]: FAILED - {extract_stats['error']}", "WARNING")
-                else:
-                    ingested = extract_stats.get('ingested', 0)
-                    skipped = extract_stats.get('skipped', 0)
-                    self.log(f"  [OK] Trade sync [{provider}]: {ingested} new, {skipped} existing")
-
-            # Log load results
-            load_stats = stats.get('load', {})
-            loaded = load_stats.get('loaded', 0)
-            dupes = load_stats.get('duplicates', 0)
-            errors = load_stats.get('load_errors', 0)
-
-            if errors > 0:
-                self.log(f"  Trade sync load: {loaded} loaded, {dupes} dupes, {errors} errors", "WARNING")
-            else:
-                self.log(f"  [OK] Trade sync: {loaded} new trades loaded, {dupes} already existed")
+        from scripts.discord.update_nav_message import update_nav_message
+        if update_nav_message():
+            self.log("  [OK] Discord NAV message updated")
+        else:
+            self.log("  Discord NAV update skipped (not configured)", "WARNING")
+
+    def step_benchmarks(self):
+        """Step 8: Refresh benchmark data cache"""
+        from src.market_data.benchmarks import refresh_benchmark_cache
+        self.log("Step 8: Refreshing benchmark data cache...")
+        stats = refresh_benchmark_cache(DB_PATH)
+        for bmk_ticker, count in stats.items():
+            self.log(f"  [OK] {bmk_ticker}: {count} new prices cached")
+
+    def step_production_sync(self):
+        """Step 9: Sync to production"""
+        production_url = os.getenv("PRODUCTION_API_URL", "")
+        admin_key = os.getenv("ADMIN_API_KEY", "")
+        if not (production_url and admin_key):
+            self.log("Step 9: Production sync skipped (not configured)")
+            return
+        from scripts.sync_to_production import sync_to_production
+        self.log("Step 9: Syncing to production...")
+        result = sync_to_production()
+        if result.get("success"):
+            self.log("  [OK] Production sync completed")
+        else:
+            errors = result.get("errors", [])
+            self.log(f"  Production sync had errors: {errors}", "WARNING")
+
+    def build_pipeline(self, max_workers=DEFAULT_MAX_WORKERS):
+        """Declare the daily update as a task graph.
+
+        Holdings snapshot, reconciliation, trade sync, Discord and the
+        benchmark refresh only need the NAV write, so they run side by
+        side. Production sync waits for all of them because it uploads
+        what they wrote; if one of them times out, production sync (and
+        plan performance after a snapshot timeout) is skipped rather than
+        run against half-written data.
+        """
+        after_nav = ('nav',)
+        steps = [
+            PipelineStep('balance', self.step_balance, critical=True, timeout=120),
+            PipelineStep('shares', self.step_shares, critical=True, timeout=60),
+            PipelineStep('nav', self.step_nav, depends_on=('balance', 'shares'),
+                         critical=True, timeout=120),
+            PipelineStep('holdings_snapshot', self.snapshot_holdings,
+                         depends_on=after_nav, timeout=180),
+            PipelineStep('plan_performance', self.compute_plan_performance,
+                         depends_on=('holdings_snapshot',), timeout=60),
+            PipelineStep('reconciliation', self.step_reconciliation,
+                         depends_on=after_nav, timeout=60),
+            PipelineStep('trade_sync', self.run_trade_sync,
+                         depends_on=after_nav, timeout=300),
+            PipelineStep('discord', self.step_discord, depends_on=after_nav,
+                         timeout=DISCORD_STEP_TIMEOUT),
+            PipelineStep('benchmarks', self.step_benchmarks, depends_on=after_nav, timeout=180),
+            PipelineStep('production_sync', self.step_production_sync,
+                         depends_on=('plan_performance', 'reconciliation', 'trade_sync',
+                                     'benchmarks'),
+                         timeout=300),
+        ]
+        return Pipeline('daily_nav', steps, max_workers=max_workers,
+                        on_event=self._log_step_event)
+
+    def _log_step_event(self, event, result):
+        if event == 'start':
+            return
+        if result.status == SUCCESS:
+            self.log(f"  [{result.name}] done in {result.duration_ms:,.0f} ms")
+        else:
+            level = "ERROR" if result.critical else "WARNING"
+            self.log(f"  [{result.name}] {result.status}: {result.error}", level)
+            if result.critical:
+                self.errors.append(result.error)
 
-        except Exception as e:
-            self.log(f"Trade sync failed: {e}", "WARNING")
+    def run(self, from_step=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Main execution
 
-    def run(self):
-        """Main execution"""
+        Args:
+            from_step: Resume from this pipeline step (see STEP_NAMES)
+            max_workers: Maximum non-dependent steps run at once
+        """
         self.log("=" * 60)
         self.log("TOVITO TRADER - Daily NAV Update")
         self.log("=" * 60)
         self.log(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        success = False
-        
-        try:
-            # Step 1: Get portfolio balance from configured brokerage
-            portfolio_value = self.get_portfolio_balance()
-            if portfolio_value is None:
-                raise Exception("Failed to get portfolio balance")
-            
-            # Step 2: Get total shares
-            total_shares = self.get_total_shares()
-            if total_shares is None or total_shares <= 0:
-                raise Exception("Failed to get total shares")
-            
-            # Step 3: Update NAV
-            if not self.update_nav(portfolio_value, total_shares):
-                raise Exception("Failed to update NAV")
-
-            # Step 4: Snapshot holdings (non-fatal)
-            self.snapshot_holdings()
-
-            # Step 4b: Compute plan performance (non-fatal)
-            self.compute_plan_performance()
-
-            # Step 5: Daily reconciliation (non-fatal)
-            self.run_daily_reconciliation(portfolio_value, total_shares)
+        if from_step:
+            self.log(f"Resuming from step: {from_step}")
 
-            # Step 6: Sync brokerage trades via ETL (non-fatal)
-            self.run_trade_sync()
+        success = False
 
-            # Step 7: Update Discord pinned NAV message (non-fatal)
-            try:
-                from scripts.discord.update_nav_message import update_nav_message
-                self.log("Step 7: Updating Discord pinned NAV message...")
-                if update_nav_message():
-                    self.log("  [OK] Discord NAV message updated")
-                else:
-                    self.log("  Discord NAV update skipped (not configured)", "WARNING")
-            except Exception as e:
-                self.log(f"  Discord NAV update failed: {e}", "WARNING")
+        try:
+            # One trace per run; each step is a child span
+            with span('daily_nav', from_step=from_step or '') as run_span:
+                report = self.build_pipeline(max_workers).run(from_step=from_step)
+                run_span.set_attribute('success', report.success)
 
-            # Step 8: Refresh benchmark data cache (non-fatal)
             try:
-                from src.market_data.benchmarks import refresh_benchmark_cache
-                self.log("Step 8: Refreshing benchmark data cache...")
-                stats = refresh_benchmark_cache(DB_PATH)
-                for bmk_ticker, count in stats.items():
-                    self.log(f"  [OK] {bmk_ticker}: {count} new prices cached")
+                record_pipeline_run(DB_PATH, report)
             except Exception as e:
-                self.log(f"  Benchmark cache refresh failed: {e}", "WARNING")
+                self.log(f"Could not record pipeline timings: {e}", "WARNING")
+            self.log(report.summary())
 
-            # Step 9: Sync to production (non-fatal)
-            try:
-                production_url = os.getenv("PRODUCTION_API_URL", "")
-                admin_key = os.getenv("ADMIN_API_KEY", "")
-                if production_url and admin_key:
-                    from scripts.sync_to_production import sync_to_production
-                    self.log("Step 9: Syncing to production...")
-                    result = sync_to_production()
-                    if result.get("success"):
-                        self.log("  [OK] Production sync completed")
-                    else:
-                        errors = result.get("errors", [])
-                        self.log(f"  Production sync had errors: {errors}", "WARNING")
-                else:
-                    self.log("Step 9: Production sync skipped (not configured)")
-            except Exception as e:
-                self.log(f"  Production sync failed: {e}", "WARNING")
+            if not report.success:
+                raise Exception(f"Critical step failed: {report.halted_by}")
 
             # Success!
             success = True
             self.log("=" * 60)
             self.log("[OK] DAILY NAV UPDATE COMPLETED SUCCESSFULLY")
             self.log("=" * 60)
-            
+
         except Exception as e:
             self.log(f"FATAL ERROR: {e}", "ERROR")
             self.errors.append(str(e))
-        
+
         # Always write heartbeat (even on failure - shows we tried)
         self.write_heartbeat()
-        
+
         # Ping external monitor
         if success:
             self.ping_healthcheck("success")
         else:
             self.ping_healthcheck("fail")
             self.send_failure_alert(str(self.errors))
-        
+
         return success
 
 
 def main():
     """Entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Daily NAV update')
+    parser.add_argument('--from-step', choices=STEP_NAMES,
+                        help='Resume from this step (earlier steps are skipped)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'Steps run in parallel after the NAV write (default: {DEFAULT_MAX_WORKERS})')
+    args = parser.parse_args()
+
     os.chdir(PROJECT_DIR)
-    
+
     updater = DailyNAVUpdater()
-    success = updater.run()
+    success = updater.run(from_step=args.from_step, max_workers=args.workers)
     
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,216 @@
+"""
+Backup Benchmark
+================
+Builds a synthetic database (default 1 GB) and compares the old
+copy-then-rehash backup with the online, page-deduplicated snapshot
+engine: first snapshot, a "next day" snapshot after a day's appends
+and a few scattered updates, fast and deep verification, restore, and
+how long a writer stalls while a snapshot is being taken.
+
+Usage:
+    python scripts/devops/backup_benchmark.py                  # 1 GB database
+    python scripts/devops/backup_benchmark.py --size-mb 200
+    python scripts/devops/backup_benchmark.py --change-pct 1   # Append 1% of rows per day
+    python scripts/devops/backup_benchmark.py --keep DIR       # Keep the work dir for inspection
+"""
+
+import warnings
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.utilities.backup_database import _sha256_file
+from scripts.utilities.incremental_backup import IncrementalBackup
+
+ROW_BYTES = 400  # Approximate payload per synthetic row
+
+
+def build_database(db_path: Path, size_mb: int):
+    """Fill a trades-like table until the file reaches size_mb."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE trades (
+            id INTEGER PRIMARY KEY,
+            trade_date TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            quantity REAL NOT NULL,
+            price REAL NOT NULL,
+            notes TEXT
+        )
+    """)
+    rows = size_mb * 1024 * 1024 // ROW_BYTES
+    rng = random.Random(42)
+    batch = []
+    for i in range(rows):
+        batch.append((
+            i, f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            rng.choice(['SPY', 'QQQ', 'IWM', 'TLT', 'GLD']),
+            rng.uniform(1, 500), rng.uniform(10, 600),
+            os.urandom(ROW_BYTES // 2 - 40).hex(),
+        ))
+        if len(batch) == 50_000:
+            conn.executemany("INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def mutate(db_path: Path, rows: int, change_pct: float, updates: int = 100):
+    """Simulate a day of activity.
+
+    Appends change_pct of the table as new rows (trades, NAV history and
+    audit rows all grow at the end) and corrects `updates` random
+    existing rows.  Returns the number of rows touched.
+    """
+    rng = random.Random()
+    appended = max(1, int(rows * change_pct / 100))
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO trades (trade_date, symbol, quantity, price, notes) VALUES (?, ?, ?, ?, ?)",
+        (('2026-12-31', 'SPY', 1.0, 500.0, os.urandom(ROW_BYTES // 2 - 40).hex())
+         for _ in range(appended)),
+    )
+    conn.executemany("UPDATE trades SET price = price * 1.01 WHERE id = ?",
+                     ((i,) for i in rng.sample(range(rows), updates)))
+    conn.commit()
+    conn.close()
+    return appended + updates
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def writer_stalls(db_path: Path, engine: IncrementalBackup):
+    """Take a snapshot while another connection commits every 20ms.
+
+    Returns (snapshot_seconds, max_commit_ms, commits, copy_restarts).
+    """
+    stop = threading.Event()
+    latencies = []
+
+    def writer():
+        conn = sqlite3.connect(db_path, timeout=30)
+        while not stop.is_set():
+            started = time.perf_counter()
+            conn.execute("INSERT INTO trades (trade_date, symbol, quantity, price) "
+                         "VALUES ('2027-01-01', 'SPY', 1, 1)")
+            conn.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.02)
+        conn.close()
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    manifest, elapsed = timed(engine.create_snapshot)
+    stop.set()
+    thread.join()
+    return (elapsed, max(latencies) if latencies else 0.0, len(latencies),
+            manifest['stats']['copy_restarts'])
+
+
+def mb(n_bytes):
+    return n_bytes / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full vs incremental database backups')
+    parser.add_argument('--size-mb', type=int, default=1024, help='Database size in MB (default: 1024)')
+    parser.add_argument('--change-pct', type=float, default=0.5,
+                        help='Rows appended between snapshots as a percent of the table, '
+                             'plus 100 random updates (default: 0.5)')
+    parser.add_argument('--keep', type=str, default=None, metavar='DIR',
+                        help='Work in DIR and keep it afterwards')
+    parser.add_argument('--skip-writer', action='store_true',
+                        help='Skip the concurrent-writer stall measurement')
+    args = parser.parse_args()
+
+    work = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix='backup_bench_'))
+    work.mkdir(parents=True, exist_ok=True)
+    db_path = work / 'tovito.db'
+
+    try:
+        print("=" * 72)
+        print(f"BACKUP BENCHMARK ({args.size_mb} MB database, {args.change_pct}% daily change)")
+        print("=" * 72)
+
+        if not db_path.exists():
+            rows, elapsed = timed(build_database, db_path, args.size_mb)
+            print(f"Built database:          {mb(db_path.stat().st_size):>9.0f} MB "
+                  f"({rows:,} rows) in {elapsed:.1f}s")
+        else:
+            rows = sqlite3.connect(db_path).execute("SELECT MAX(id) FROM trades").fetchone()[0]
+        db_bytes = db_path.stat().st_size
+
+        # Old approach: copy2 then re-read the copy for its SHA256
+        def copy_and_hash():
+            dest = work / 'copy2.db'
+            shutil.copy2(db_path, dest)
+            _sha256_file(str(dest))
+            dest.unlink()
+        _, old_seconds = timed(copy_and_hash)
+        print(f"copy2 + rehash (old):    {old_seconds:>9.2f}s   "
+              f"{mb(db_bytes) / old_seconds:>7.0f} MB/s   stores {mb(db_bytes):>7.0f} MB")
+
+        engine = IncrementalBackup(db_path, work / 'incremental')
+        first, first_seconds = timed(engine.create_snapshot)
+        print(f"Snapshot 1 (cold store): {first_seconds:>9.2f}s   "
+              f"{mb(db_bytes) / first_seconds:>7.0f} MB/s   stores "
+              f"{mb(first['stats']['bytes_stored']):>7.0f} MB")
+
+        changed = mutate(db_path, rows, args.change_pct)
+        second, second_seconds = timed(engine.create_snapshot)
+        stats = second['stats']
+        print(f"Snapshot 2 (next day):   {second_seconds:>9.2f}s   "
+              f"{mb(second['size_bytes']) / second_seconds:>7.0f} MB/s   stores "
+              f"{mb(stats['bytes_stored']):>7.1f} MB "
+              f"({stats['chunks_new']:,}/{stats['chunks_total']:,} chunks new, "
+              f"{changed:,} rows changed)")
+
+        result, fast_seconds = timed(engine.verify_snapshot, second['snapshot_id'])
+        print(f"Verify (chunk presence): {fast_seconds:>9.2f}s   [{result['status']}]")
+        result, deep_seconds = timed(engine.verify_snapshot, second['snapshot_id'], True)
+        print(f"Verify (deep re-hash):   {deep_seconds:>9.2f}s   [{result['status']}]")
+
+        _, restore_seconds = timed(engine.restore_snapshot, second['snapshot_id'],
+                                   work / 'restored.db')
+        print(f"Restore snapshot 2:      {restore_seconds:>9.2f}s   "
+              f"{mb(second['size_bytes']) / restore_seconds:>7.0f} MB/s")
+        (work / 'restored.db').unlink()
+
+        if not args.skip_writer:
+            seconds, max_commit, commits, restarts = writer_stalls(db_path, engine)
+            print(f"Snapshot with writer:    {seconds:>9.2f}s   "
+                  f"max commit {max_commit:.0f} ms over {commits} commits "
+                  f"({restarts} copy restarts)")
+
+        two_days_old = mb(db_bytes) * 2
+        two_days_new = mb(first['stats']['bytes_stored'] + stats['bytes_stored'])
+        print("-" * 72)
+        print(f"Two daily backups stored: {two_days_old:,.0f} MB (full copies) vs "
+              f"{two_days_new:,.0f} MB (incremental, compressed)")
+        print(f"Chunk store on disk:      {mb(engine.chunks.size_bytes()):,.0f} MB")
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Hot-Path Benchmark
+==================
+Generates a synthetic fund (years of daily NAV, thousands of investors,
+hundreds of thousands of trades and raw ETL rows), times the hot paths
+in src/perf/hot_paths.py against it and compares the medians with a
+saved JSON baseline, so slowdowns are caught before production.
+
+The generated database is kept in data/perf/ and reused while its
+profile (and end date) is unchanged.  Baselines are machine-specific:
+save one on your machine before comparing.
+
+Exit code is 1 when any benchmark regressed beyond the tolerance.
+
+Usage:
+    python scripts/devops/hot_path_benchmark.py                      # medium profile
+    python scripts/devops/hot_path_benchmark.py --profile large
+    python scripts/devops/hot_path_benchmark.py --save-baseline      # Record a new baseline
+    python scripts/devops/hot_path_benchmark.py --tolerance 0.10     # Flag >10% slowdowns
+    python scripts/devops/hot_path_benchmark.py --only risk_metrics,sanitize_message
+    python scripts/devops/hot_path_benchmark.py --regenerate         # Rebuild the database
+"""
+
+import warnings
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.perf.synthetic_fund import PROFILES, generate_fund
+from src.perf.hot_paths import (
+    HOT_PATHS,
+    compare_to_baseline,
+    load_baseline,
+    profile_mismatch,
+    run_hot_paths,
+    save_baseline,
+)
+
+PERF_DIR = PROJECT_ROOT / 'data' / 'perf'
+BASELINE_DIR = PERF_DIR / 'baselines'
+
+
+def ensure_database(profile, regenerate=False):
+    """Return the generated database for profile, building it if needed."""
+    db_path = PERF_DIR / f'synthetic_{profile.name}.db'
+    meta_path = db_path.with_suffix('.json')
+    described = profile.describe()
+
+    if not regenerate and db_path.exists() and meta_path.exists():
+        if json.loads(meta_path.read_text(encoding='utf-8')) == described:
+            print(f"Using {db_path.relative_to(PROJECT_ROOT)}")
+            return db_path
+
+    print(f"Generating '{profile.name}' fund ...")
+    stats = generate_fund(db_path, profile)
+    meta_path.write_text(json.dumps(described, indent=2), encoding='utf-8')
+    print(f"  {stats['nav_days']:,} NAV days ({stats['start_date']} to {stats['end_date']}), "
+          f"{stats['investors']:,} investors, {stats['transactions']:,} transactions, "
+          f"{stats['trades']:,} trades, {stats['raw_rows']:,} raw rows "
+          f"in {stats['seconds']:.1f}s")
+    return db_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hot paths against a synthetic fund')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='medium',
+                        help='Synthetic fund size (default: medium)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed runs per benchmark (default: 5)')
+    parser.add_argument('--only', type=str, default=None,
+                        help=f"Comma-separated benchmarks ({', '.join(HOT_PATHS)})")
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Baseline file (default: data/perf/baselines/<profile>.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Save this run as the baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before a regression is reported (default: 0.25)')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='Rebuild the synthetic database even if it is current')
+    args = parser.parse_args()
+
+    # The ETL and schema modules log every batch at INFO
+    logging.disable(logging.INFO)
+
+    profile = PROFILES[args.profile]
+    baseline_path = args.baseline or BASELINE_DIR / f'{profile.name}.json'
+    names = [n.strip() for n in args.only.split(',')] if args.only else None
+
+    print("=" * 72)
+    print(f"HOT-PATH BENCHMARK ({profile.name} profile, {args.repeat} runs each)")
+    print("=" * 72)
+    db_path = ensure_database(profile, args.regenerate)
+
+    try:
+        results = run_hot_paths(db_path, profile, repeat=args.repeat, names=names)
+    except ValueError as e:
+        print(f"[FAIL] {e}")
+        sys.exit(2)
+
+    print()
+    print(f"{'benchmark':<26} {'ops':>9} {'best':>10} {'median':>10} {'per op':>12}")
+    for result in results.values():
+        print(f"{result.name:<26} {result.ops:>9,} {result.best:>9.3f}s {result.median:>9.3f}s "
+              f"{result.per_op_us:>10.1f}us")
+
+    if args.save_baseline:
+        save_baseline(results, baseline_path, profile)
+        print(f"\n[OK] Baseline saved to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one")
+        return
+
+    baseline = load_baseline(baseline_path)
+    mismatch = profile_mismatch(baseline, profile)
+    if mismatch:
+        print(f"\n[WARN] Baseline was recorded with a different profile ({', '.join(mismatch)})")
+
+    print(f"\nCompared with {baseline_path.name} ({baseline['created_at']}, "
+          f"tolerance {args.tolerance:.0%}):")
+    comparisons = compare_to_baseline(results, baseline, args.tolerance)
+    for c in comparisons:
+        change = f"{(c.ratio - 1):+.1%}" if c.ratio is not None else 'n/a'
+        marker = {'regressed': '❌', 'faster': '✅', 'ok': '  ', 'new': '  '}[c.status]
+        print(f"  {marker} {c.name:<26} {change:>8}  {c.status}")
+
+    regressed = [c.name for c in comparisons if c.status == 'regressed']
+    if regressed:
+        print(f"\n[FAIL] {len(regressed)} regression(s): {', '.join(regressed)}")
+        sys.exit(1)
+    print("\n[OK] No regressions")
+
+
+if __name__ == "__main__":
+    main()
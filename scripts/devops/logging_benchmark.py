@@ -0,0 +1,183 @@
+"""
+Logging Benchmark
+=================
+Pushes a synthetic mix of log lines (default one million) through the
+PII sanitizer and SafeLogger, comparing the old four-pass sanitizer and
+eager formatting with the single-pass sanitizer, memoized key lookups,
+lazy formatting and the async QueueHandler pipeline.
+
+Sections:
+- sanitize_message: four sequential re.sub calls vs one combined pass
+  (also checks both produce identical output for every line)
+- mask_dict: per-key substring scan vs memoized lookup
+- Filtered DEBUG calls: eager sanitize-then-drop vs lazy (never sanitized)
+- INFO to a log file: synchronous handlers vs the async pipeline
+
+Usage:
+    python scripts/devops/logging_benchmark.py                 # 1,000,000 lines
+    python scripts/devops/logging_benchmark.py --lines 200000
+"""
+
+import warnings
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+import re
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.safe_logging import (
+    PIIProtector,
+    SafeLogger,
+    enable_async_logging,
+    disable_async_logging,
+)
+
+
+class LegacySanitizer:
+    """The pre-optimization sanitizer: four passes, unmemoized key scan."""
+
+    DOLLAR_PATTERN = re.compile(r'\$[\d,]+\.?\d*')
+    EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+    PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+    API_KEY_PATTERN = re.compile(r'(sk_|pk_|api_)[a-zA-Z0-9]{20,}')
+
+    @classmethod
+    def sanitize_message(cls, message):
+        message = cls.DOLLAR_PATTERN.sub("$***", message)
+        message = cls.EMAIL_PATTERN.sub("***@***.com", message)
+        message = cls.PHONE_PATTERN.sub("***-***-****", message)
+        return cls.API_KEY_PATTERN.sub("***_KEY", message)
+
+    @classmethod
+    def mask_dict(cls, data):
+        masked = {}
+        for key, value in data.items():
+            key_lower = key.lower()
+            if any(field in key_lower for field in PIIProtector.SENSITIVE_FIELDS):
+                masked[key] = PIIProtector.mask_string(value) if isinstance(value, str) else "***"
+            elif isinstance(value, dict):
+                masked[key] = cls.mask_dict(value)
+            else:
+                masked[key] = value
+        return masked
+
+    @classmethod
+    def format(cls, message, kwargs):
+        safe_message = cls.sanitize_message(message)
+        if kwargs:
+            safe_kwargs = cls.mask_dict(kwargs)
+            return f"{safe_message} | " + " | ".join(f"{k}={v}" for k, v in safe_kwargs.items())
+        return safe_message
+
+
+TEMPLATES = [
+    "Daily NAV update completed for fund without issues",
+    "Loaded {n} rows from tastytrade_positions in 0.{n}s",
+    "NAV 2026-03-{d:02d} per share 1.0{n}",
+    "Processed ${n},{n:03d}.00 contribution for investor {d}",
+    "Sent statement to investor{n}@example.com",
+    "Callback from 555-{n:03d}-{n:04d} recorded",
+    "Brokerage sync using sk_{key} finished",
+    "Heartbeat ok",
+]
+
+
+def build_lines(count, seed=42):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        n = rng.randint(100, 999)
+        lines.append(template.format(n=n, d=rng.randint(1, 28),
+                                     key=''.join(rng.choices('abcdef0123456789', k=24))))
+    return lines
+
+
+PAYLOAD = {'investor_id': '20260101-01A', 'amount': 5000.0, 'shares': 4750,
+           'email': 'john@example.com', 'trade_id': 'TXN-12345', 'status': 'ok'}
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def report(label, old_seconds, new_seconds, count):
+    print(f"{label:<28} {count / old_seconds:>12,.0f}/s {count / new_seconds:>12,.0f}/s "
+          f"{old_seconds / new_seconds:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PII sanitization and SafeLogger')
+    parser.add_argument('--lines', type=int, default=1_000_000,
+                        help='Log lines per measurement (default: 1,000,000)')
+    args = parser.parse_args()
+
+    lines = build_lines(args.lines)
+    print("=" * 72)
+    print(f"LOGGING BENCHMARK ({args.lines:,} lines)")
+    print("=" * 72)
+    print(f"{'':<28} {'old':>14} {'new':>14} {'speedup':>8}")
+
+    # sanitize_message
+    old_out, new_out = [], []
+    old_seconds = timed(lambda: old_out.extend(map(LegacySanitizer.sanitize_message, lines)))
+    new_seconds = timed(lambda: new_out.extend(map(PIIProtector.sanitize_message, lines)))
+    report("sanitize_message", old_seconds, new_seconds, args.lines)
+    mismatches = sum(1 for a, b in zip(old_out, new_out) if a != b)
+
+    # mask_dict
+    payloads = [dict(PAYLOAD)] * args.lines
+    old_seconds = timed(lambda: [LegacySanitizer.mask_dict(p) for p in payloads])
+    new_seconds = timed(lambda: [PIIProtector.mask_dict(p) for p in payloads])
+    report("mask_dict", old_seconds, new_seconds, args.lines)
+
+    work = Path(tempfile.mkdtemp(prefix='logging_bench_'))
+    try:
+        # Filtered DEBUG (console handler is INFO)
+        safe = SafeLogger('logging_benchmark.filtered')
+        safe.logger.handlers[0].stream = open(work / 'console.log', 'w')
+        raw = safe.logger
+
+        def eager():
+            for line in lines:
+                raw.debug(LegacySanitizer.format(line, PAYLOAD))
+
+        def lazy():
+            for line in lines:
+                safe.debug(line, **PAYLOAD)
+        report("DEBUG (filtered out)", timed(eager), timed(lazy), args.lines)
+
+        # INFO to a file: sync vs async
+        safe = SafeLogger('logging_benchmark.file', log_file=str(work / 'logs' / 'sync.log'))
+        safe.logger.handlers[0].stream = open(work / 'console.log', 'w')
+        safe.logger.propagate = False
+        sync_seconds = timed(lambda: [safe.info(line, **PAYLOAD) for line in lines])
+
+        pipeline = enable_async_logging(max_queue=args.lines + 1)
+        call_seconds = timed(lambda: [safe.info(line, **PAYLOAD) for line in lines])
+        drain_seconds = call_seconds + timed(disable_async_logging)
+        report("INFO to file (caller)", sync_seconds, call_seconds, args.lines)
+        print(f"{'INFO to file (drained)':<28} {'':>14} {args.lines / drain_seconds:>12,.0f}/s "
+              f"{'':>8}   dropped {pipeline.dropped}")
+        for handler in safe.logger.handlers:
+            handler.close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print("-" * 72)
+    print(f"Output identical to the old sanitizer: "
+          f"{'yes' if mismatches == 0 else f'NO ({mismatches:,} lines differ)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Login Load Test
+===============
+Fires N simultaneous logins at the Fund API (in-process, no network) and
+reports login throughput, tail latency, and how long /health requests
+stall while bcrypt is running.
+
+With password hashing offloaded to the hash pool, /health stays fast
+during a login burst.  --blocking runs the same test with bcrypt on the
+event loop (the old behaviour) for comparison.
+
+Usage:
+    python scripts/devops/login_load_test.py                 # 20 concurrent logins
+    python scripts/devops/login_load_test.py --logins 50
+    python scripts/devops/login_load_test.py --blocking      # Baseline: bcrypt on event loop
+
+Requires: pip install httpx
+"""
+
+import warnings
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+import sys
+import time
+import sqlite3
+import asyncio
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import httpx
+except ImportError:
+    print("[ERROR] httpx not installed")
+    print("   Install with: pip install httpx")
+    sys.exit(1)
+
+PASSWORD = "LoadTest1!"
+
+
+def build_database(db_path: Path, n_investors: int):
+    """Create a minimal investors/investor_auth database with hashed passwords."""
+    from apps.investor_portal.api.services.auth_service import hash_password
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE investors (
+            investor_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            email TEXT,
+            status TEXT NOT NULL DEFAULT 'Active'
+        );
+        CREATE TABLE investor_auth (
+            investor_id TEXT NOT NULL UNIQUE,
+            password_hash TEXT,
+            email_verified INTEGER DEFAULT 0,
+            last_login TIMESTAMP,
+            failed_attempts INTEGER DEFAULT 0,
+            locked_until TIMESTAMP,
+            updated_at TIMESTAMP
+        );
+    """)
+    password_hash = hash_password(PASSWORD)  # Same hash for all: setup cost once
+    for i in range(n_investors):
+        investor_id = f"20260101-{i:02d}A"
+        conn.execute(
+            "INSERT INTO investors VALUES (?, ?, ?, 'Active')",
+            (investor_id, f"Load Investor {i}", f"load{i}@example.com"),
+        )
+        conn.execute(
+            "INSERT INTO investor_auth (investor_id, password_hash, email_verified) VALUES (?, ?, 1)",
+            (investor_id, password_hash),
+        )
+    conn.commit()
+    conn.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(n_logins: int, health_interval: float):
+    from apps.investor_portal.api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    login_latencies = []
+    health_latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+
+        async def one_login(i):
+            started = time.perf_counter()
+            resp = await client.post("/auth/login", json={
+                "email": f"load{i}@example.com", "password": PASSWORD,
+            })
+            login_latencies.append((time.perf_counter() - started) * 1000)
+            return resp.status_code
+
+        async def probe_health():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(health_interval)
+
+        prober = asyncio.create_task(probe_health())
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(one_login(i) for i in range(n_logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    return statuses, elapsed, login_latencies, health_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent login load test for the Fund API')
+    parser.add_argument('--logins', type=int, default=20, help='Simultaneous logins (default: 20)')
+    parser.add_argument('--blocking', action='store_true', help='Run bcrypt on the event loop (pre-offload baseline)')
+    parser.add_argument('--health-interval', type=float, default=0.01, help='Seconds between /health probes (default: 0.01)')
+    args = parser.parse_args()
+
+    from apps.investor_portal.api.services import auth_service
+    from apps.investor_portal.api.services.hash_pool import hash_pool
+    from apps.investor_portal.api.routes import auth as auth_routes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "loadtest.db"
+        build_database(db_path, args.logins)
+
+        def get_connection():
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        auth_service.get_connection = get_connection
+
+        if args.blocking:
+            async def run_inline(fn, *fn_args):
+                return fn(*fn_args)
+            auth_routes._run_password_work = run_inline
+
+        statuses, elapsed, logins, health = asyncio.run(
+            run_load(args.logins, args.health_interval)
+        )
+
+    ok = sum(1 for s in statuses if s == 200)
+    print("=" * 60)
+    print(f"LOGIN LOAD TEST ({'bcrypt on event loop' if args.blocking else 'hash pool'})")
+    print("=" * 60)
+    print(f"Logins:            {ok}/{len(statuses)} succeeded")
+    print(f"Wall time:         {elapsed:.2f}s")
+    print(f"Throughput:        {len(statuses) / elapsed:.1f} logins/s")
+    print(f"Login latency:     p50 {percentile(logins, 50):.0f} ms   "
+          f"p95 {percentile(logins, 95):.0f} ms   p99 {percentile(logins, 99):.0f} ms")
+    if health:
+        print(f"/health during:    p50 {statistics.median(health):.1f} ms   "
+              f"max {max(health):.1f} ms   ({len(health)} probes)")
+    if not args.blocking:
+        pool = hash_pool.stats()
+        print(f"Hash pool:         {pool['max_workers']} workers, "
+              f"peak queue {pool['peak_queue_depth']}, "
+              f"avg wait {pool['avg_wait_ms']:.0f} ms, rejected {pool['rejected']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Rate Limiter Microbenchmark
+===========================
+Pushes requests from 100k distinct IPs through the portal rate limiter
+backends and reports throughput and memory, alongside the previous
+list-of-timestamps implementation for comparison.
+
+Usage:
+    python scripts/devops/rate_limit_benchmark.py
+    python scripts/devops/rate_limit_benchmark.py --ips 250000 --hits-per-ip 3
+    python scripts/devops/rate_limit_benchmark.py --skip-sqlite
+"""
+
+import warnings
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from collections import defaultdict
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.investor_portal.api.services.rate_limit import (
+    MemoryBackend,
+    SQLiteBackend,
+    RateLimiter,
+)
+
+LIMIT = 5
+WINDOW = 3600
+
+
+class ListTimestampLimiter:
+    """The original public.py limiter: {ip: [timestamps]}, never evicted."""
+
+    def __init__(self):
+        self.hits = defaultdict(list)
+
+    def hit(self, ip):
+        now = time.time()
+        cutoff = now - WINDOW
+        self.hits[ip] = [ts for ts in self.hits[ip] if ts > cutoff]
+        if len(self.hits[ip]) >= LIMIT:
+            return False
+        self.hits[ip].append(now)
+        return True
+
+
+def make_ips(n):
+    return [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(n)]
+
+
+def _drive(limiter, ips, hits_per_ip):
+    for _ in range(hits_per_ip):
+        for ip in ips:
+            limiter.hit(ip)
+
+
+def bench(name, make_limiter, ips, hits_per_ip):
+    """Time one pass, then measure retained memory on a second pass.
+
+    Timing runs without tracemalloc, which would otherwise inflate the
+    cost of every allocation.
+    """
+    started = time.perf_counter()
+    _drive(make_limiter(), ips, hits_per_ip)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    limiter = make_limiter()
+    _drive(limiter, ips, hits_per_ip)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ops = len(ips) * hits_per_ip
+    print(f"{name:<28} {ops / elapsed:>12,.0f} ops/s   "
+          f"{elapsed * 1e6 / ops:>7.2f} us/op   retained {retained / 1024 / 1024:>7.1f} MB")
+    return limiter
+
+
+def eviction_check(ips):
+    """Show stale keys are dropped once their windows pass."""
+    now = [0.0]
+    backend = MemoryBackend(clock=lambda: now[0])
+    limiter = RateLimiter("bench", LIMIT, 60, backend=backend)
+    for ip in ips:
+        limiter.hit(ip)
+    before = backend.size()
+    now[0] += 180  # Two full windows later
+    limiter.hit("203.0.113.1")
+    print(f"{'Eviction (memory backend)':<28} {before:>12,} keys -> {backend.size():,} "
+          f"after two idle windows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the portal rate limiter')
+    parser.add_argument('--ips', type=int, default=100_000, help='Distinct client IPs (default: 100000)')
+    parser.add_argument('--hits-per-ip', type=int, default=2, help='Requests per IP (default: 2)')
+    parser.add_argument('--skip-sqlite', action='store_true', help='Skip the shared SQLite backend')
+    args = parser.parse_args()
+
+    ips = make_ips(args.ips)
+    print("=" * 80)
+    print(f"RATE LIMITER BENCHMARK: {args.ips:,} IPs x {args.hits_per_ip} requests")
+    print("=" * 80)
+
+    bench("List of timestamps (old)", ListTimestampLimiter, ips, args.hits_per_ip)
+    bench("Sliding window (memory)",
+          lambda: RateLimiter("bench", LIMIT, WINDOW, backend=MemoryBackend()),
+          ips, args.hits_per_ip)
+
+    if not args.skip_sqlite:
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = []
+
+            def make_sqlite_limiter():
+                backend = SQLiteBackend(Path(tmp) / f"rate_limits_{len(backends)}.db")
+                backends.append(backend)
+                return RateLimiter("bench", LIMIT, WINDOW, backend=backend)
+
+            bench("Sliding window (sqlite)", make_sqlite_limiter, ips, args.hits_per_ip)
+            for backend in backends:
+                backend._conn().close()
+
+    eviction_check(ips)
+
+
+if __name__ == "__main__":
+    main()
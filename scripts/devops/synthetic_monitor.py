@@ -14,6 +14,15 @@ Usage:
     python scripts/devops/synthetic_monitor.py --no-notify           # Skip alerts
     python scripts/devops/synthetic_monitor.py --url http://localhost:8000  # Test against local
     python scripts/devops/synthetic_monitor.py --json                # JSON output
+    python scripts/devops/synthetic_monitor.py --repeat 10           # 10 probes per check
+    python scripts/devops/synthetic_monitor.py --trend               # Recent latency history
+
+Independent checks run concurrently; checks that need the login token
+start as soon as login completes.  Each check is probed --repeat times
+(default SYNTHETIC_MONITOR_REPEAT or 5) to produce p50/p95/p99, which
+are compared against per-check latency SLOs and stored in a local
+history database (data/devops/synthetic_monitor_history.db) so
+regressions against the recent baseline are alerted on as well.
 """
 
 import warnings
@@ -23,8 +32,11 @@ import os
 import sys
 import json
 import time
+import asyncio
 import logging
+import sqlite3
 import argparse
+import statistics
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -41,6 +53,136 @@ from src.utils.safe_logging import get_safe_logger
 logger = get_safe_logger(__name__)
 
 
+# p95 latency SLOs per check (milliseconds).  Login includes bcrypt and
+# authenticated_endpoints covers three sequential requests.
+DEFAULT_LATENCY_SLOS_MS = {
+    'health_endpoint': 500,
+    'public_teaser': 1000,
+    'frontend_accessible': 2000,
+    'login_flow': 2000,
+    'nav_freshness': 1000,
+    'authenticated_endpoints': 3000,
+    'admin_endpoint': 1000,
+}
+
+# Regression: current p95 exceeds the median p95 of recent passing runs
+# by this factor and by at least REGRESSION_MIN_DELTA_MS.
+REGRESSION_FACTOR = 1.5
+REGRESSION_MIN_DELTA_MS = 100
+BASELINE_RUNS = 20
+MIN_BASELINE_RUNS = 5
+
+DEFAULT_HISTORY_DB = PROJECT_ROOT / 'data' / 'devops' / 'synthetic_monitor_history.db'
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(samples):
+    """Build the latency summary stored on each check result.
+
+    Args:
+        samples: Response times in milliseconds, one per probe.
+
+    Returns:
+        Dict with samples, min/mean/max and p50/p95/p99 (ms).
+    """
+    return {
+        'samples': len(samples),
+        'min_ms': round(min(samples), 1),
+        'mean_ms': round(statistics.fmean(samples), 1),
+        'p50_ms': round(percentile(samples, 50), 1),
+        'p95_ms': round(percentile(samples, 95), 1),
+        'p99_ms': round(percentile(samples, 99), 1),
+        'max_ms': round(max(samples), 1),
+    }
+
+
+class LatencyHistory:
+    """Local SQLite store of per-check latency percentiles.
+
+    One row per check per run.  Kept separate from the fund database so
+    the monitor stays runnable on a machine without it.
+
+    Args:
+        db_path: Path to the history database (created if missing).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS latency_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_at TEXT NOT NULL,
+                    base_url TEXT NOT NULL,
+                    check_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    samples INTEGER NOT NULL,
+                    p50_ms REAL NOT NULL,
+                    p95_ms REAL NOT NULL,
+                    p99_ms REAL NOT NULL,
+                    max_ms REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_latency_history_check
+                ON latency_history (base_url, check_key, run_at)
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, run_at, base_url, check_key, status, latency):
+        """Insert one check's latency summary for a run."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO latency_history "
+                "(run_at, base_url, check_key, status, samples, p50_ms, p95_ms, p99_ms, max_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_at, base_url, check_key, status, latency['samples'],
+                 latency['p50_ms'], latency['p95_ms'], latency['p99_ms'],
+                 latency['max_ms']),
+            )
+
+    def baseline_p95(self, base_url, check_key, runs=BASELINE_RUNS):
+        """Median p95 over the most recent passing runs of a check.
+
+        Returns:
+            Baseline in ms, or None if fewer than MIN_BASELINE_RUNS exist.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p95_ms FROM latency_history "
+                "WHERE base_url = ? AND check_key = ? AND status = 'pass' "
+                "ORDER BY run_at DESC, id DESC LIMIT ?",
+                (base_url, check_key, runs),
+            ).fetchall()
+        if len(rows) < MIN_BASELINE_RUNS:
+            return None
+        return statistics.median(row['p95_ms'] for row in rows)
+
+    def recent(self, base_url, limit=10):
+        """Most recent rows per check, newest first, for trend output."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM ("
+                "  SELECT *, ROW_NUMBER() OVER ("
+                "    PARTITION BY check_key ORDER BY run_at DESC, id DESC"
+                "  ) AS rn FROM latency_history WHERE base_url = ?"
+                ") WHERE rn <= ? ORDER BY check_key, run_at DESC",
+                (base_url, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
 class SyntheticMonitor:
     """External synthetic monitor for Tovito Trader production system.
 
@@ -53,9 +195,17 @@ class SyntheticMonitor:
                   or https://api.tovitotrader.com.
         admin_key: Admin API key for admin endpoint checks.
                    Defaults to ADMIN_API_KEY env var.
+        repeat: Probes per check for latency percentiles.  Defaults to
+                SYNTHETIC_MONITOR_REPEAT env var or 5.
+        slos: Optional {check_key: p95_ms} overrides for
+              DEFAULT_LATENCY_SLOS_MS.
+        history_db: Latency history database path.  Defaults to
+                    SYNTHETIC_MONITOR_HISTORY_DB env var or
+                    data/devops/synthetic_monitor_history.db.
     """
 
-    def __init__(self, base_url=None, admin_key=None):
+    def __init__(self, base_url=None, admin_key=None, repeat=None,
+                 slos=None, history_db=None):
         self.base_url = (
             base_url
             or os.getenv('PRODUCTION_API_URL', 'https://api.tovitotrader.com')
@@ -68,6 +218,15 @@ class SyntheticMonitor:
         self.monitor_password = os.getenv('SYNTHETIC_MONITOR_PASSWORD', '')
         self.timeout = 10  # seconds per request
         self.log_file = PROJECT_ROOT / 'logs' / 'synthetic_monitor.log'
+        self.repeat = max(1, int(
+            repeat or os.getenv('SYNTHETIC_MONITOR_REPEAT', '5')
+        ))
+        self.slos = {**DEFAULT_LATENCY_SLOS_MS, **(slos or {})}
+        self.history_db = Path(
+            history_db
+            or os.getenv('SYNTHETIC_MONITOR_HISTORY_DB', '')
+            or DEFAULT_HISTORY_DB
+        )
 
     # ------------------------------------------------------------------
     # Result helpers
@@ -542,43 +701,88 @@ class SyntheticMonitor:
     # Orchestration
     # ------------------------------------------------------------------
 
-    def run_all_checks(self):
-        """Run all synthetic checks in sequence.
+    def probe(self, check_fn, *args):
+        """Run one check self.repeat times and summarize its latency.
+
+        Repetitions run back to back so the check measures the server,
+        not load generated by the monitor itself.  A skipped check is
+        not repeated.
 
-        Some checks depend on the login token, so ordering matters:
-        1. health_endpoint
-        2. public_teaser
-        3. frontend_accessible
-        4. login_flow (captures access_token)
-        5. nav_freshness (uses token)
-        6. authenticated_endpoints (uses token)
-        7. admin_endpoint
+        Args:
+            check_fn: Bound check method (e.g. self.check_health_endpoint).
+            *args: Arguments passed to the check on every run.
 
         Returns:
-            Dict with overall_status, per-check results, counts, and
-            aggregate response time.
+            Result dict for the first failing run (or the last run if all
+            passed), with response_time_ms set to the p50 and a 'latency'
+            summary added.  For repeated login runs the details carry the
+            last issued access_token.
         """
-        results = {}
+        runs = []
+        for _ in range(self.repeat):
+            result = check_fn(*args)
+            runs.append(result)
+            if result['status'] == 'skip':
+                return result
+
+        failures = [r for r in runs if r['status'] == 'fail']
+        result = dict(failures[0] if failures else runs[-1])
+        latency = summarize_latencies([r['response_time_ms'] for r in runs])
+        result['response_time_ms'] = latency['p50_ms']
+        result['latency'] = latency
+        if failures:
+            result['failed_runs'] = len(failures)
+        return result
+
+    async def run_all_checks_async(self):
+        """Run all synthetic checks concurrently, respecting dependencies.
+
+        health_endpoint, public_teaser, frontend_accessible, admin_endpoint
+        and login_flow start together.  nav_freshness and
+        authenticated_endpoints need the login token, so they start as
+        soon as login_flow finishes.  Each check runs on a worker thread
+        via probe().
 
-        # Independent checks first
-        results['health_endpoint'] = self.check_health_endpoint()
-        results['public_teaser'] = self.check_public_teaser()
-        results['frontend_accessible'] = self.check_frontend_accessible()
-
-        # Login (captures token for subsequent checks)
-        login_result = self.check_login_flow()
-        results['login_flow'] = login_result
-
-        access_token = None
-        if login_result['status'] == 'pass' and login_result.get('details'):
-            access_token = login_result['details'].get('access_token')
-
-        # Token-dependent checks
-        results['nav_freshness'] = self.check_nav_freshness(access_token)
-        results['authenticated_endpoints'] = self.check_authenticated_endpoints(access_token)
-
-        # Admin check (independent of login token)
-        results['admin_endpoint'] = self.check_admin_endpoint()
+        Returns:
+            Dict with overall_status, per-check results (in the report
+            order), counts, latency SLO breaches, summed and wall-clock
+            response times.
+        """
+        started = time.perf_counter()
+
+        def run(check_fn, *args):
+            return asyncio.to_thread(self.probe, check_fn, *args)
+
+        async def token_dependent():
+            login_result = await run(self.check_login_flow)
+            access_token = None
+            if login_result['status'] == 'pass' and login_result.get('details'):
+                access_token = login_result['details'].get('access_token')
+            nav_result, auth_result = await asyncio.gather(
+                run(self.check_nav_freshness, access_token),
+                run(self.check_authenticated_endpoints, access_token),
+            )
+            return login_result, nav_result, auth_result
+
+        (health, teaser, frontend, admin,
+         (login, nav, authenticated)) = await asyncio.gather(
+            run(self.check_health_endpoint),
+            run(self.check_public_teaser),
+            run(self.check_frontend_accessible),
+            run(self.check_admin_endpoint),
+            token_dependent(),
+        )
+        wall_time = (time.perf_counter() - started) * 1000
+
+        results = {
+            'health_endpoint': health,
+            'public_teaser': teaser,
+            'frontend_accessible': frontend,
+            'login_flow': login,
+            'nav_freshness': nav,
+            'authenticated_endpoints': authenticated,
+            'admin_endpoint': admin,
+        }
 
         # Aggregate
         passed = sum(1 for r in results.values() if r['status'] == 'pass')
@@ -597,40 +801,149 @@ class SyntheticMonitor:
             'checks_failed': failed,
             'checks_skipped': skipped,
             'total_response_time_ms': round(total_time, 1),
+            'wall_time_ms': round(wall_time, 1),
+            'repeat': self.repeat,
+            'slo_breaches': self.find_slo_breaches(results),
+            'regressions': [],
             'results': results,
         }
 
+    def run_all_checks(self):
+        """Synchronous wrapper around run_all_checks_async()."""
+        return asyncio.run(self.run_all_checks_async())
+
+    def find_slo_breaches(self, results):
+        """List checks whose p95 latency exceeds their SLO.
+
+        Args:
+            results: Per-check results keyed by check key.
+
+        Returns:
+            List of dicts with check, name, p95_ms and slo_ms.
+        """
+        breaches = []
+        for check_key, result in results.items():
+            latency = result.get('latency')
+            slo = self.slos.get(check_key)
+            if not latency or slo is None or result['status'] == 'skip':
+                continue
+            if latency['p95_ms'] > slo:
+                breaches.append({
+                    'check': check_key,
+                    'name': result['name'],
+                    'p95_ms': latency['p95_ms'],
+                    'slo_ms': slo,
+                })
+        return breaches
+
+    # ------------------------------------------------------------------
+    # Latency history
+    # ------------------------------------------------------------------
+
+    def record_history(self, results):
+        """Compare against the latency baseline, then store this run.
+
+        Regressions are checked before inserting so a run is never
+        compared with itself.  Populates results['regressions'].
+        Non-fatal -- history errors are logged and ignored.
+
+        Args:
+            results: The dict returned by run_all_checks().
+
+        Returns:
+            The list of regressions found (also stored on results).
+        """
+        regressions = []
+        try:
+            history = LatencyHistory(self.history_db)
+            for check_key, result in results['results'].items():
+                latency = result.get('latency')
+                if not latency or result['status'] == 'skip':
+                    continue
+
+                baseline = history.baseline_p95(self.base_url, check_key)
+                if (baseline is not None
+                        and latency['p95_ms'] > baseline * REGRESSION_FACTOR
+                        and latency['p95_ms'] - baseline >= REGRESSION_MIN_DELTA_MS):
+                    regressions.append({
+                        'check': check_key,
+                        'name': result['name'],
+                        'p95_ms': latency['p95_ms'],
+                        'baseline_p95_ms': round(baseline, 1),
+                    })
+
+                history.record(
+                    results['timestamp'], self.base_url, check_key,
+                    result['status'], latency,
+                )
+        except Exception as exc:
+            try:
+                logger.error(f'Latency history update failed: {exc}')
+            except UnicodeEncodeError:
+                logger.error(f'Latency history update failed: {ascii(str(exc))}')
+
+        results['regressions'] = regressions
+        return regressions
+
     # ------------------------------------------------------------------
     # Notifications
     # ------------------------------------------------------------------
 
     def send_notifications(self, results):
-        """Send Discord and email alerts when checks fail.
+        """Send Discord and email alerts on failures or latency problems.
 
-        Only sends notifications if at least one check has status 'fail'.
-        Both notification channels are non-fatal -- failures are logged
-        but do not raise exceptions.
+        Sends if at least one check has status 'fail', a check breached
+        its p95 latency SLO, or a latency regression was detected.  Both
+        notification channels are non-fatal -- failures are logged but
+        do not raise exceptions.
 
         Args:
             results: The dict returned by run_all_checks().
         """
-        if results['overall_status'] != 'fail':
-            return
-
         failed_checks = {
             k: v for k, v in results['results'].items()
             if v['status'] == 'fail'
         }
-        if not failed_checks:
+        breaches = results.get('slo_breaches', [])
+        regressions = results.get('regressions', [])
+        if not failed_checks and not breaches and not regressions:
             return
 
-        # Build failure summary
-        failure_lines = []
+        # Build alert lines: (title, message)
+        alerts = []
         for check_name, result in failed_checks.items():
-            failure_lines.append(
-                f"  - {result['name']}: {result.get('error', 'unknown error')}"
+            alerts.append((result['name'], result.get('error', 'unknown error')))
+        for breach in breaches:
+            alerts.append((
+                f'{breach["name"]} (latency SLO)',
+                f'p95 {breach["p95_ms"]:.0f}ms > SLO {breach["slo_ms"]:.0f}ms',
+            ))
+        for regression in regressions:
+            alerts.append((
+                f'{regression["name"]} (latency regression)',
+                f'p95 {regression["p95_ms"]:.0f}ms vs baseline '
+                f'{regression["baseline_p95_ms"]:.0f}ms',
+            ))
+        failure_summary = '\n'.join(
+            f'  - {title}: {message}' for title, message in alerts
+        )
+
+        total_checks = (
+            results['checks_passed'] + results['checks_failed']
+            + results['checks_skipped']
+        )
+        if failed_checks:
+            headline = f'{results["checks_failed"]} checks failed'
+            description = (
+                f'{results["checks_failed"]} of {total_checks} '
+                f'checks failed against {results["base_url"]}'
+            )
+        else:
+            headline = f'{len(breaches) + len(regressions)} latency alerts'
+            description = (
+                f'All checks passed against {results["base_url"]} but '
+                f'latency is outside SLO or baseline'
             )
-        failure_summary = '\n'.join(failure_lines)
 
         # --- Discord notification ---
         try:
@@ -638,22 +951,15 @@ class SyntheticMonitor:
 
             webhook_url = os.getenv('DISCORD_ALERTS_WEBHOOK_URL', '')
             if webhook_url:
-                fields = []
-                for check_name, result in failed_checks.items():
-                    fields.append({
-                        'name': result['name'],
-                        'value': result.get('error', 'unknown error'),
-                        'inline': False,
-                    })
+                fields = [
+                    {'name': title, 'value': message, 'inline': False}
+                    for title, message in alerts
+                ]
 
                 embed = make_embed(
                     title='Synthetic Monitor Alert',
-                    color=COLORS['critical'],
-                    description=(
-                        f'{results["checks_failed"]} of '
-                        f'{results["checks_passed"] + results["checks_failed"] + results["checks_skipped"]} '
-                        f'checks failed against {results["base_url"]}'
-                    ),
+                    color=COLORS['critical'] if failed_checks else COLORS['orange'],
+                    description=description,
                     fields=fields,
                 )
                 post_embed(webhook_url, embed)
@@ -670,15 +976,12 @@ class SyntheticMonitor:
 
             admin_email = os.getenv('ADMIN_EMAIL', os.getenv('ALERT_EMAIL', ''))
             if admin_email:
-                subject = (
-                    f'[ALERT] Synthetic Monitor - '
-                    f'{results["checks_failed"]} checks failed'
-                )
+                subject = f'[ALERT] Synthetic Monitor - {headline}'
                 body = (
-                    f'Synthetic Monitor detected failures at '
+                    f'Synthetic Monitor detected problems at '
                     f'{results["timestamp"]}\n'
                     f'Target: {results["base_url"]}\n\n'
-                    f'Failed checks:\n{failure_summary}\n\n'
+                    f'Alerts:\n{failure_summary}\n\n'
                     f'Passed: {results["checks_passed"]}  |  '
                     f'Failed: {results["checks_failed"]}  |  '
                     f'Skipped: {results["checks_skipped"]}\n'
@@ -731,7 +1034,8 @@ class SyntheticMonitor:
 
         Format:
             [YYYY-MM-DD HH:MM:SS] [PASS/FAIL] N/M checks passed (Xms total)
-            On failure, lists which checks failed.
+            On failure, lists which checks failed, followed by any latency
+            SLO breaches and regressions.
 
         Args:
             results: The dict returned by run_all_checks().
@@ -761,6 +1065,17 @@ class SyntheticMonitor:
                             f'  FAILED: {result["name"]} - '
                             f'{result.get("error", "unknown")}'
                         )
+            for breach in results.get('slo_breaches', []):
+                lines.append(
+                    f'  SLO: {breach["name"]} - p95 {breach["p95_ms"]:.0f}ms '
+                    f'> {breach["slo_ms"]:.0f}ms'
+                )
+            for regression in results.get('regressions', []):
+                lines.append(
+                    f'  REGRESSION: {regression["name"]} - p95 '
+                    f'{regression["p95_ms"]:.0f}ms vs baseline '
+                    f'{regression["baseline_p95_ms"]:.0f}ms'
+                )
 
             with open(self.log_file, 'a', encoding='utf-8') as f:
                 for line in lines:
@@ -798,11 +1113,17 @@ class SyntheticMonitor:
             name = result['name']
             ms = result['response_time_ms']
 
+            latency = result.get('latency')
             if status == 'SKIP':
                 detail = result.get('details', '')
                 if isinstance(detail, dict):
                     detail = ''
                 lines.append(f'{tag:8s} {name:<30s} ({detail})')
+            elif latency and latency['samples'] > 1:
+                lines.append(
+                    f'{tag:8s} {name:<30s} (p50 {latency["p50_ms"]:.0f}ms  '
+                    f'p95 {latency["p95_ms"]:.0f}ms  p99 {latency["p99_ms"]:.0f}ms)'
+                )
             else:
                 lines.append(f'{tag:8s} {name:<30s} ({ms:.0f}ms)')
 
@@ -818,6 +1139,21 @@ class SyntheticMonitor:
         )
         if results['checks_skipped'] > 0:
             lines.append(f'Skipped: {results["checks_skipped"]}')
+        if 'wall_time_ms' in results:
+            lines.append(
+                f'Wall time: {results["wall_time_ms"]:.0f}ms '
+                f'({results.get("repeat", 1)} probes per check)'
+            )
+        for breach in results.get('slo_breaches', []):
+            lines.append(
+                f'[SLO]    {breach["name"]}: p95 {breach["p95_ms"]:.0f}ms '
+                f'> {breach["slo_ms"]:.0f}ms'
+            )
+        for regression in results.get('regressions', []):
+            lines.append(
+                f'[SLOW]   {regression["name"]}: p95 {regression["p95_ms"]:.0f}ms '
+                f'vs baseline {regression["baseline_p95_ms"]:.0f}ms'
+            )
         lines.append(divider)
 
         return '\n'.join(lines)
@@ -848,20 +1184,36 @@ def main():
         '--json', action='store_true', dest='output_json',
         help='Output results as JSON to stdout'
     )
+    parser.add_argument(
+        '--repeat', type=int,
+        help='Probes per check for p50/p95/p99 (default: SYNTHETIC_MONITOR_REPEAT or 5)'
+    )
+    parser.add_argument(
+        '--no-history', action='store_true',
+        help='Do not record latency history or check for regressions'
+    )
+    parser.add_argument(
+        '--trend', action='store_true',
+        help='Print recent latency history per check and exit'
+    )
     args = parser.parse_args()
 
-    monitor = SyntheticMonitor(base_url=args.url)
+    monitor = SyntheticMonitor(base_url=args.url, repeat=args.repeat)
+
+    if args.trend:
+        _print_trend(monitor)
+        return
 
     if args.check:
         # Single-check mode
         check_map = {
-            'health': lambda: monitor.check_health_endpoint(),
-            'teaser': lambda: monitor.check_public_teaser(),
-            'frontend': lambda: monitor.check_frontend_accessible(),
-            'login': lambda: monitor.check_login_flow(),
+            'health': lambda: monitor.probe(monitor.check_health_endpoint),
+            'teaser': lambda: monitor.probe(monitor.check_public_teaser),
+            'frontend': lambda: monitor.probe(monitor.check_frontend_accessible),
+            'login': lambda: monitor.probe(monitor.check_login_flow),
             'nav': lambda: _run_nav_check(monitor),
             'auth': lambda: _run_auth_check(monitor),
-            'admin': lambda: monitor.check_admin_endpoint(),
+            'admin': lambda: monitor.probe(monitor.check_admin_endpoint),
         }
 
         result = check_map[args.check]()
@@ -871,6 +1223,10 @@ def main():
         else:
             status = result['status'].upper()
             print(f'[{status}] {result["name"]} ({result["response_time_ms"]:.0f}ms)')
+            latency = result.get('latency')
+            if latency and latency['samples'] > 1:
+                print(f'  p50 {latency["p50_ms"]:.0f}ms  p95 {latency["p95_ms"]:.0f}ms  '
+                      f'p99 {latency["p99_ms"]:.0f}ms  ({latency["samples"]} probes)')
             if result.get('error'):
                 print(f'  Error: {result["error"]}')
             if result.get('details') and isinstance(result['details'], dict):
@@ -883,6 +1239,8 @@ def main():
     else:
         # Full run
         results = monitor.run_all_checks()
+        if not args.no_history:
+            monitor.record_history(results)
 
         if args.output_json:
             # Strip access tokens from JSON output
@@ -907,7 +1265,7 @@ def _run_nav_check(monitor):
     token = None
     if login_result['status'] == 'pass' and login_result.get('details'):
         token = login_result['details'].get('access_token')
-    return monitor.check_nav_freshness(token)
+    return monitor.probe(monitor.check_nav_freshness, token)
 
 
 def _run_auth_check(monitor):
@@ -916,7 +1274,29 @@ def _run_auth_check(monitor):
     token = None
     if login_result['status'] == 'pass' and login_result.get('details'):
         token = login_result['details'].get('access_token')
-    return monitor.check_authenticated_endpoints(token)
+    return monitor.probe(monitor.check_authenticated_endpoints, token)
+
+
+def _print_trend(monitor, limit=10):
+    """Print the most recent latency history rows for each check."""
+    history_path = monitor.history_db
+    if not history_path.exists():
+        print(f'No latency history at {history_path}')
+        return
+
+    rows = LatencyHistory(history_path).recent(monitor.base_url, limit=limit)
+    print('=' * 60)
+    print(f'LATENCY TREND: {monitor.base_url}')
+    print('=' * 60)
+    current = None
+    for row in rows:
+        if row['check_key'] != current:
+            current = row['check_key']
+            slo = monitor.slos.get(current)
+            print(f'\n{current} (SLO p95 {slo}ms)' if slo else f'\n{current}')
+        print(f'  {row["run_at"][:19]}  [{row["status"].upper():4s}]  '
+              f'p50 {row["p50_ms"]:>7.0f}ms  p95 {row["p95_ms"]:>7.0f}ms  '
+              f'p99 {row["p99_ms"]:>7.0f}ms  (n={row["samples"]})')
 
 
 def _strip_tokens(results):
@@ -0,0 +1,368 @@
+"""
+TOVITO TRADER - Discord NAV Publisher Service
+
+Long-running alternative to update_nav_message.py. It keeps one Discord
+gateway connection open and updates the pinned NAV message whenever the
+daily NAV pipeline reports that a NAV was written.
+
+Each update first compares the current data with what was last pushed:
+    - NAV and chart inputs unchanged  -> nothing is sent
+    - NAV changed, chart inputs same  -> embed edited, chart kept
+    - Chart inputs changed            -> chart re-rendered and replaced
+
+Events arrive on a local TCP port (127.0.0.1 only) as one JSON line:
+    {"event": "nav_written", "date": "2026-02-21", "nav_per_share": 11.05}
+The reply is one JSON line with the outcome, e.g. {"status": "edited"}.
+daily_nav_enhanced.py sends this with notify_nav_written() and falls
+back to the one-shot updater when the service is not running.
+
+Usage:
+    python scripts/discord/nav_publisher.py              # Run the service
+    python scripts/discord/nav_publisher.py --fake       # Offline: log instead of posting
+    python scripts/discord/nav_publisher.py --port 8766  # Custom event port
+
+Requirements:
+    Same as update_nav_message.py (DISCORD_BOT_TOKEN, DISCORD_NAV_CHANNEL_ID).
+    DISCORD_PUBLISHER_PORT in .env (optional, default 8765)
+"""
+
+import sys
+import os
+import json
+import socket
+import asyncio
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import discord
+
+from scripts.discord import update_nav_message as nav_message
+from scripts.discord.update_nav_message import (
+    DEFAULT_CHART_DAYS,
+    build_nav_embed,
+    find_bot_pinned_message,
+)
+
+logger = logging.getLogger("nav_publisher")
+
+PUBLISHER_HOST = "127.0.0.1"
+PUBLISHER_PORT = int(os.getenv("DISCORD_PUBLISHER_PORT", "8765"))
+CHART_FILENAME = "nav_chart.png"
+
+# Seconds notify_nav_written() waits for the service to push the update
+NOTIFY_TIMEOUT = 120
+
+
+def fingerprint(data) -> str:
+    """Stable hash of JSON-serialisable data."""
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Gateways
+# ---------------------------------------------------------------------------
+
+class DiscordGateway:
+    """One persistent discord.py connection to the NAV channel.
+
+    discord.py reconnects on its own if the gateway drops.
+    """
+
+    def __init__(self, bot_token: str, channel_id: int):
+        self.bot_token = bot_token
+        self.channel_id = channel_id
+        self.client = discord.Client(intents=discord.Intents.default())
+        self.channel = None
+        self._task = None
+
+    async def connect(self):
+        self._task = asyncio.create_task(self.client.start(self.bot_token))
+        ready = asyncio.create_task(self.client.wait_until_ready())
+        done, _ = await asyncio.wait({self._task, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if self._task in done:
+            ready.cancel()
+            self._task.result()   # Raises the login/connection error
+            raise ConnectionError("Discord client stopped before it was ready")
+
+        logger.info("Connected as %s", self.client.user)
+        self.channel = self.client.get_channel(self.channel_id)
+        if self.channel is None:
+            self.channel = await self.client.fetch_channel(self.channel_id)
+
+    async def find_pinned(self):
+        return await find_bot_pinned_message(self.channel, self.client.user.id)
+
+    async def post(self, embed, chart_path: Path = None):
+        if chart_path:
+            msg = await self.channel.send(
+                embed=embed, file=discord.File(str(chart_path), filename=CHART_FILENAME))
+        else:
+            msg = await self.channel.send(embed=embed)
+        try:
+            await msg.pin()
+        except discord.Forbidden:
+            logger.warning("Bot lacks permission to pin messages")
+        return msg
+
+    async def edit(self, message, embed, chart_path: Path = None):
+        """Edit the message; returns None if it no longer exists."""
+        try:
+            if chart_path:
+                chart_file = discord.File(str(chart_path), filename=CHART_FILENAME)
+                await message.edit(embed=embed, attachments=[chart_file])
+            else:
+                # Existing attachments are kept, so the chart stays in place
+                await message.edit(embed=embed)
+        except discord.NotFound:
+            return None
+        return message
+
+    async def close(self):
+        await self.client.close()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class FakeGateway:
+    """In-memory stand-in for DiscordGateway (offline runs and tests).
+
+    Records every call in `calls` as (action, message_id, embed, had_chart).
+    Message IDs added to `deleted` behave as deleted in Discord.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.connects = 0
+        self.pinned = None
+        self.deleted = set()
+        self._next_id = 1
+
+    async def connect(self):
+        self.connects += 1
+
+    async def find_pinned(self):
+        return self.pinned
+
+    async def post(self, embed, chart_path: Path = None):
+        message = {"id": self._next_id, "embed": embed, "chart": chart_path is not None}
+        self._next_id += 1
+        self.pinned = message
+        self.calls.append(("post", message["id"], embed, chart_path is not None))
+        logger.info("[fake] Posted and pinned message %d", message["id"])
+        return message
+
+    async def edit(self, message, embed, chart_path: Path = None):
+        if message["id"] in self.deleted:
+            self.calls.append(("edit_missing", message["id"], embed, chart_path is not None))
+            return None
+        message["embed"] = embed
+        message["chart"] = message["chart"] or chart_path is not None
+        self.calls.append(("edit", message["id"], embed, chart_path is not None))
+        logger.info("[fake] Edited message %d (%s)", message["id"],
+                    "new chart" if chart_path else "chart kept")
+        return message
+
+    async def close(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Publisher
+# ---------------------------------------------------------------------------
+
+class NavPublisher:
+    """Pushes the pinned NAV message only when its inputs changed."""
+
+    def __init__(self, gateway, chart_days: int = DEFAULT_CHART_DAYS):
+        self.gateway = gateway
+        self.chart_days = chart_days
+        self.message = None
+        self._nav_hash = None
+        self._chart_hash = None
+        self._lock = asyncio.Lock()
+        self.port = None
+
+    async def publish(self) -> str:
+        """Update the pinned message if needed.
+
+        Returns 'posted', 'edited', 'unchanged' or 'no_data'.
+        """
+        async with self._lock:
+            # DB reads and chart rendering are blocking; keep them off the gateway loop
+            nav_data = await asyncio.to_thread(nav_message.get_current_nav_data)
+            if not nav_data:
+                logger.error("No NAV data available")
+                return "no_data"
+            chart_inputs = await asyncio.to_thread(nav_message.load_chart_inputs, self.chart_days)
+
+            nav_hash = fingerprint(nav_data)
+            chart_hash = fingerprint(chart_inputs)
+            if self.message is not None and (nav_hash, chart_hash) == (self._nav_hash,
+                                                                      self._chart_hash):
+                logger.info("NAV %s unchanged — nothing to push", nav_data["date"])
+                return "unchanged"
+
+            if self.message is None:
+                self.message = await self.gateway.find_pinned()
+
+            chart_path = None
+            if self.message is None or chart_hash != self._chart_hash:
+                chart_path = await asyncio.to_thread(nav_message.render_chart, chart_inputs)
+            has_chart = chart_path is not None or self._chart_hash is not None
+
+            embed = build_nav_embed(nav_data, CHART_FILENAME if has_chart else None)
+            try:
+                if self.message is None:
+                    self.message = await self.gateway.post(embed, chart_path)
+                    status = "posted"
+                elif await self.gateway.edit(self.message, embed, chart_path) is not None:
+                    status = "edited"
+                else:
+                    # The pinned message was deleted: post a new one with a chart
+                    logger.warning("Pinned NAV message is gone — posting a new one")
+                    self._chart_hash = None
+                    if chart_path is None:
+                        chart_path = await asyncio.to_thread(nav_message.render_chart,
+                                                             chart_inputs)
+                        embed = build_nav_embed(nav_data,
+                                                CHART_FILENAME if chart_path else None)
+                    self.message = await self.gateway.post(embed, chart_path)
+                    status = "posted"
+            finally:
+                if chart_path and Path(chart_path).exists():
+                    try:
+                        Path(chart_path).unlink()
+                    except OSError:
+                        pass
+
+            self._nav_hash = nav_hash
+            if chart_path is not None:
+                self._chart_hash = chart_hash
+            logger.info("Pinned NAV message %s (NAV %s, %s)", status, nav_data["date"],
+                        "new chart" if chart_path else "chart kept")
+            return status
+
+    async def handle_event(self, reader, writer):
+        """Serve one connection: read a JSON event line, reply with the outcome."""
+        try:
+            line = await reader.readline()
+            try:
+                event = json.loads(line or b"{}")
+            except json.JSONDecodeError:
+                event = {}
+
+            if event.get("event") != "nav_written":
+                reply = {"status": "error", "error": "unknown event"}
+            else:
+                # The event's nav_per_share is only logged: the embed also
+                # needs the day's change, inception return and chart history,
+                # so publish() reads the NAV row back from the database.
+                logger.info("NAV written for %s (NAV/share %s)",
+                            event.get("date"), event.get("nav_per_share"))
+                try:
+                    reply = {"status": await self.publish()}
+                except Exception as e:
+                    logger.error("Publish failed: %s", e)
+                    reply = {"status": "error", "error": str(e)}
+
+            writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = PUBLISHER_HOST, port: int = PUBLISHER_PORT,
+                    started: asyncio.Event = None):
+        """Connect once, publish the current NAV, then wait for events."""
+        await self.gateway.connect()
+        try:
+            await self.publish()
+            server = await asyncio.start_server(self.handle_event, host, port)
+            self.port = server.sockets[0].getsockname()[1]
+            logger.info("Listening for NAV events on %s:%d", host, self.port)
+            if started is not None:
+                started.set()
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.gateway.close()
+
+
+# ---------------------------------------------------------------------------
+# Event client (called from daily_nav_enhanced.py)
+# ---------------------------------------------------------------------------
+
+def notify_nav_written(nav_date: str = None, nav_per_share: float = None,
+                       host: str = PUBLISHER_HOST, port: int = None,
+                       timeout: float = NOTIFY_TIMEOUT):
+    """
+    Tell a running publisher service that a NAV was written.
+
+    Returns the service's status string ('edited', 'unchanged', ...), or
+    None if no service is listening (the caller should fall back to the
+    one-shot update_nav_message()).
+    """
+    event = {"event": "nav_written", "date": nav_date, "nav_per_share": nav_per_share}
+    try:
+        with socket.create_connection((host, port or PUBLISHER_PORT), timeout=timeout) as sock:
+            sock.sendall((json.dumps(event) + "\n").encode())
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except ConnectionRefusedError:
+        return None
+    except OSError as e:
+        logger.warning("NAV publisher did not respond: %s", e)
+        return None
+
+    try:
+        return json.loads(line).get("status")
+    except (json.JSONDecodeError, AttributeError):
+        return "error"
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    parser = argparse.ArgumentParser(description="Run the Discord NAV publisher service")
+    parser.add_argument("--port", type=int, default=PUBLISHER_PORT,
+                        help=f"Local event port (default: {PUBLISHER_PORT})")
+    parser.add_argument("--days", type=int, default=DEFAULT_CHART_DAYS,
+                        help=f"Days of NAV history for chart (default: {DEFAULT_CHART_DAYS})")
+    parser.add_argument("--fake", action="store_true",
+                        help="Use an offline fake gateway (logs instead of posting)")
+    args = parser.parse_args()
+
+    if args.fake:
+        gateway = FakeGateway()
+    else:
+        if not nav_message.BOT_TOKEN:
+            print("[FAIL] DISCORD_BOT_TOKEN not set in .env")
+            sys.exit(1)
+        try:
+            channel_id = int(nav_message.CHANNEL_ID)
+        except ValueError:
+            print(f"[FAIL] DISCORD_NAV_CHANNEL_ID is not a valid integer: "
+                  f"{nav_message.CHANNEL_ID}")
+            sys.exit(1)
+        gateway = DiscordGateway(nav_message.BOT_TOKEN, channel_id)
+
+    try:
+        asyncio.run(NavPublisher(gateway, chart_days=args.days).serve(port=args.port))
+    except KeyboardInterrupt:
+        print("\nNAV publisher stopped")
+
+
+if __name__ == "__main__":
+    main()
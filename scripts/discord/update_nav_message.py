@@ -150,26 +150,44 @@ DISCORD_CHART_HEIGHT = 7.0   # inches — tall enough to be impactful
 DISCORD_CHART_DPI = 200      # high-res for crisp rendering
 
 
-def generate_chart(days: int = DEFAULT_CHART_DAYS) -> Path:
-    """Generate NAV vs Benchmarks chart PNG sized for Discord.
+def load_chart_inputs(days: int = DEFAULT_CHART_DAYS) -> dict:
+    """Fetch everything the chart is drawn from.
+
+    Returns a dict with nav_history, benchmark_data (empty if unavailable)
+    and trade_counts.  The NAV publisher compares these between updates
+    to decide whether the chart needs re-rendering.
+    """
+    benchmark_data = {}
+    try:
+        from src.market_data.benchmarks import get_benchmark_data
+        benchmark_data = get_benchmark_data(DB_PATH, days=days)
+    except Exception as e:
+        logger.warning("Benchmark data unavailable: %s", e)
+
+    return {
+        "nav_history": get_nav_history(days),
+        "benchmark_data": benchmark_data,
+        "trade_counts": get_trade_counts(days),
+    }
+
+
+def render_chart(inputs: dict) -> Path:
+    """Render the Discord chart PNG from load_chart_inputs() data.
 
     Falls back to the NAV-only chart if benchmark data is unavailable.
     """
-    nav_history = get_nav_history(days)
+    nav_history = inputs["nav_history"]
 
     if not nav_history:
         logger.warning("No NAV history found — cannot generate chart")
         return None
 
     # Try benchmark chart first (includes NAV mountain + SPY/QQQ/BTC)
-    try:
-        from src.reporting.charts import generate_benchmark_chart
-        from src.market_data.benchmarks import get_benchmark_data
-
-        benchmark_data = get_benchmark_data(DB_PATH, days=days)
-        has_benchmarks = any(len(v) > 0 for v in benchmark_data.values())
+    benchmark_data = inputs.get("benchmark_data") or {}
+    if any(len(v) > 0 for v in benchmark_data.values()):
+        try:
+            from src.reporting.charts import generate_benchmark_chart
 
-        if has_benchmarks:
             chart_path = generate_benchmark_chart(
                 nav_history,
                 benchmark_data,
@@ -179,16 +197,15 @@ def generate_chart(days: int = DEFAULT_CHART_DAYS) -> Path:
             )
             logger.info("Benchmark chart generated: %s", chart_path)
             return chart_path
-    except Exception as e:
-        logger.warning("Benchmark chart failed, falling back to NAV chart: %s", e)
+        except Exception as e:
+            logger.warning("Benchmark chart failed, falling back to NAV chart: %s", e)
 
     # Fallback: NAV-only chart
     from src.reporting.charts import generate_nav_chart
 
-    trade_counts = get_trade_counts(days)
     chart_path = generate_nav_chart(
         nav_history,
-        trade_counts,
+        inputs.get("trade_counts"),
         width=DISCORD_CHART_WIDTH,
         height=DISCORD_CHART_HEIGHT,
         dpi=DISCORD_CHART_DPI,
@@ -197,6 +214,11 @@ def generate_chart(days: int = DEFAULT_CHART_DAYS) -> Path:
     return chart_path
 
 
+def generate_chart(days: int = DEFAULT_CHART_DAYS) -> Path:
+    """Generate NAV vs Benchmarks chart PNG sized for Discord."""
+    return render_chart(load_chart_inputs(days))
+
+
 # ---------------------------------------------------------------------------
 # Embed builder
 # ---------------------------------------------------------------------------
@@ -0,0 +1,148 @@
+"""
+Bulk Email Throughput Benchmark
+
+Measures month-end statement delivery against a local SMTP stub (aiosmtpd),
+comparing one-connection-per-message sends with BulkMailer's reused
+connections and worker pool. Nothing leaves the machine.
+
+Usage:
+    python scripts/email/benchmark_bulk_email.py
+    python scripts/email/benchmark_bulk_email.py --emails 200 --workers 8 --latency-ms 20
+
+Requires: pip install aiosmtpd
+"""
+
+import warnings
+warnings.filterwarnings('ignore', message='Session.login_data')
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for src/ imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import AuthResult
+except ImportError:
+    print("❌ aiosmtpd not installed")
+    print("   Install with: pip install aiosmtpd")
+    sys.exit(1)
+
+
+class CountingHandler:
+    """aiosmtpd handler that counts accepted messages."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.messages = 0
+        self.latency = latency_ms / 1000.0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.latency:
+            import asyncio
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+        return '250 Message accepted for delivery'
+
+
+def _accept_any_login(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+def start_stub(latency_ms: float = 0.0, port: int = 8025):
+    """Start the SMTP stub and point EmailService at it."""
+    handler = CountingHandler(latency_ms)
+    controller = Controller(
+        handler, hostname='127.0.0.1', port=port,
+        authenticator=_accept_any_login, auth_require_tls=False,
+    )
+    controller.start()
+
+    os.environ.update({
+        'EMAIL_PROVIDER': 'smtp',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_PORT': str(port),
+        'SMTP_STARTTLS': 'false',
+        'SMTP_USERNAME': 'bench@tovitotrader.local',
+        'SMTP_PASSWORD': 'bench',
+        'SMTP_FROM_EMAIL': 'bench@tovitotrader.local',
+    })
+    return controller, handler
+
+
+def make_statement(directory: Path, size_kb: int) -> Path:
+    path = directory / 'statement.pdf'
+    path.write_bytes(os.urandom(size_kb * 1024))
+    return path
+
+
+def run_benchmark(n_emails: int, workers: int, latency_ms: float, size_kb: int):
+    from src.automation.email_service import EmailService
+    from src.automation.bulk_mailer import BulkMailer, OutgoingEmail
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / 'bench.db')
+        from src.database.models import Database
+        Database(str(tmp / 'bench.db')).create_all_tables()
+
+        attachment = make_statement(tmp, size_kb)
+        emails = [
+            OutgoingEmail(
+                to_email=f'investor{i:04d}@example.com',
+                subject='Tovito Trader - Monthly Statement',
+                message='Attached is your monthly account statement.',
+                attachments=[str(attachment)],
+                email_type='MonthlyReport',
+            )
+            for i in range(n_emails)
+        ]
+
+        controller, handler = start_stub(latency_ms)
+        try:
+            # Baseline: one connection + login per message, one log commit each
+            service = EmailService()
+            started = time.perf_counter()
+            for e in emails:
+                service.send_email(e.to_email, e.subject, e.message,
+                                   attachments=e.attachments, email_type=e.email_type)
+            sequential = time.perf_counter() - started
+            sequential_count = handler.messages
+
+            handler.messages = 0
+            report = BulkMailer(max_workers=workers).send_all(emails)
+        finally:
+            controller.stop()
+
+    print("=" * 70)
+    print("BULK EMAIL THROUGHPUT (local SMTP stub)")
+    print("=" * 70)
+    print(f"Emails: {n_emails}   Attachment: {size_kb} KB   Stub latency: {latency_ms} ms")
+    print()
+    print(f"Sequential send_email():  {sequential:7.2f}s  "
+          f"{sequential_count / sequential:8.1f} emails/s")
+    print(f"BulkMailer ({workers} workers):  {report.elapsed_seconds:7.2f}s  "
+          f"{report.emails_per_second:8.1f} emails/s")
+    print(f"Delivered by stub:        {handler.messages}")
+    print(f"Speedup:                  {sequential / report.elapsed_seconds:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk email delivery against a local SMTP stub')
+    parser.add_argument('--emails', type=int, default=100, help='Number of emails to send (default: 100)')
+    parser.add_argument('--workers', type=int, default=4, help='BulkMailer worker threads (default: 4)')
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='Simulated server latency per message (default: 10)')
+    parser.add_argument('--attachment-kb', type=int, default=200, help='Attachment size in KB (default: 200)')
+    args = parser.parse_args()
+
+    run_benchmark(args.emails, args.workers, args.latency_ms, args.attachment_kb)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,31 @@ except ImportError:
         pass
 
 
+def invalidate_portal_sessions(investor_id):
+    """Ask the production API to drop cached sessions for this investor.
+
+    The portal caches authenticated principals for a few seconds, so
+    closure takes effect within one cache TTL regardless.  This makes it
+    immediate.  Non-fatal: skipped if the API URL/key are not configured.
+    """
+    api_url = os.getenv('PRODUCTION_API_URL', '').rstrip('/')
+    admin_key = os.getenv('ADMIN_API_KEY', '')
+    if not api_url or not admin_key:
+        return False
+    try:
+        import requests
+        response = requests.post(
+            f"{api_url}/admin/cache/invalidate/{investor_id}",
+            headers={"X-Admin-Key": admin_key},
+            timeout=10,
+        )
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"   Note: Portal session cache not invalidated ({e})")
+        return False
+
+
 def close_account():
     """Close investor account with full liquidation via fund flow workflow."""
 
@@ -257,6 +282,9 @@ def close_account():
 
         print("   Database updated")
 
+        if invalidate_portal_sessions(inv_id):
+            print("   Portal sessions invalidated")
+
         # Send emails
         if EMAIL_AVAILABLE:
             try:
@@ -27,10 +27,11 @@ DB_PATH = PROJECT_DIR / 'data' / 'tovito.db'
 # Try to load encryption
 ENC_AVAILABLE = False
 try:
-    from src.utils.encryption import FieldEncryptor
+    from src.utils.encryption import FieldEncryptor, plaintext_cache
     encryptor = FieldEncryptor()
     ENC_AVAILABLE = True
 except Exception:
+    from contextlib import nullcontext as plaintext_cache
     encryptor = None
 
 
@@ -256,56 +257,58 @@ def manage_profile():
         profile = get_or_create_profile(conn, investor_id)
 
         while True:
-            print()
-            print(f"PROFILE: {investor_id}")
-            print("=" * 60)
-            display_profile(profile)
-
-            # Show completion
-            completion = check_completion(profile)
-            print(f"Profile Completion: {completion['percent']:.0f}% "
-                  f"({completion['filled']}/{completion['total']} required fields)")
-            if completion['missing']:
-                print(f"  Missing: {', '.join(completion['missing'][:5])}")
-            print()
-
-            # Action menu
-            print("Actions:")
-            print("  1. Edit Contact Information")
-            print("  2. Edit Personal Information")
-            print("  3. Edit Employment Information")
-            print("  4. Edit Sensitive / Banking")
-            print("  5. Edit Accreditation")
-            print("  6. Edit Preferences")
-            print("  7. Mark Profile as Complete")
-            print("  q. Quit")
-            print()
-
-            action = input("Select action: ").strip().lower()
-
-            if action == 'q':
-                break
-            elif action == '7':
-                if completion['percent'] >= 80:
-                    conn.execute(
-                        "UPDATE investor_profiles SET profile_completed = 1, updated_at = ? WHERE investor_id = ?",
-                        (datetime.now().isoformat(), investor_id)
-                    )
-                    conn.commit()
-                    print("Profile marked as complete.")
+            # Decrypted values live only for one screen (display + edit)
+            with plaintext_cache():
+                print()
+                print(f"PROFILE: {investor_id}")
+                print("=" * 60)
+                display_profile(profile)
+
+                # Show completion
+                completion = check_completion(profile)
+                print(f"Profile Completion: {completion['percent']:.0f}% "
+                      f"({completion['filled']}/{completion['total']} required fields)")
+                if completion['missing']:
+                    print(f"  Missing: {', '.join(completion['missing'][:5])}")
+                print()
+
+                # Action menu
+                print("Actions:")
+                print("  1. Edit Contact Information")
+                print("  2. Edit Personal Information")
+                print("  3. Edit Employment Information")
+                print("  4. Edit Sensitive / Banking")
+                print("  5. Edit Accreditation")
+                print("  6. Edit Preferences")
+                print("  7. Mark Profile as Complete")
+                print("  q. Quit")
+                print()
+
+                action = input("Select action: ").strip().lower()
+
+                if action == 'q':
+                    break
+                elif action == '7':
+                    if completion['percent'] >= 80:
+                        conn.execute(
+                            "UPDATE investor_profiles SET profile_completed = 1, updated_at = ? WHERE investor_id = ?",
+                            (datetime.now().isoformat(), investor_id)
+                        )
+                        conn.commit()
+                        print("Profile marked as complete.")
+                    else:
+                        print(f"Profile only {completion['percent']:.0f}% complete. "
+                              f"Fill required fields first.")
+                    profile = get_or_create_profile(conn, investor_id)
+                elif action in ('1', '2', '3', '4', '5', '6'):
+                    section_names = list(SECTIONS.keys())
+                    section_idx = int(action) - 1
+                    section_name = section_names[section_idx]
+                    fields = SECTIONS[section_name]
+                    edit_section(conn, profile, section_name, fields, investor_id)
+                    profile = get_or_create_profile(conn, investor_id)
                 else:
-                    print(f"Profile only {completion['percent']:.0f}% complete. "
-                          f"Fill required fields first.")
-                profile = get_or_create_profile(conn, investor_id)
-            elif action in ('1', '2', '3', '4', '5', '6'):
-                section_names = list(SECTIONS.keys())
-                section_idx = int(action) - 1
-                section_name = section_names[section_idx]
-                fields = SECTIONS[section_name]
-                edit_section(conn, profile, section_name, fields, investor_id)
-                profile = get_or_create_profile(conn, investor_id)
-            else:
-                print("Invalid choice.")
+                    print("Invalid choice.")
 
         return True
 
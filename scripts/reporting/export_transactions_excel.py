@@ -1,161 +1,412 @@
 """
-Export All Transactions to Excel (FIXED)
+Export Transactions to Excel, CSV or Parquet
 
-Shows complete transaction history from database in Excel format.
+Exports the transaction history from the database.
+
+The export streams rows from a SQLite cursor in fetchmany() chunks
+instead of loading the whole table into a DataFrame:
+
+- xlsx: openpyxl write-only workbook (rows are written straight to the
+  sheet XML, so memory stays flat however many transactions there are)
+- csv: csv.writer, one chunk at a time
+- parquet: pyarrow ParquetWriter, one row group per chunk (needs pyarrow)
+
+Works on both transaction table layouts: the share price is read from
+nav_per_share (schema_v2) or share_price (legacy) and exported as
+share_price, and soft-deleted rows (is_deleted = 1) are left out.
+
+Date-range and investor filters are applied in the SQL WHERE clause, and
+the summaries (by type, by investor, overview) are SQL GROUP BY
+aggregates over the same filter, so nothing is filtered in Python.
+The run prints rows/sec and peak Python memory.
 
 Usage:
-    python scripts/export_transactions_excel.py
+    python scripts/reporting/export_transactions_excel.py
+    python scripts/reporting/export_transactions_excel.py --start 2026-01-01 --end 2026-01-31
+    python scripts/reporting/export_transactions_excel.py --investor 20260101-01A
+    python scripts/reporting/export_transactions_excel.py --format csv --output data/exports/tx.csv
 """
 
+import argparse
+import csv
+import os
 import sqlite3
-import pandas as pd
-from pathlib import Path
+import sys
+import time
+import tracemalloc
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import Workbook
+
+# Parquet export is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+CHUNK_ROWS = 5000
+FORMATS = ('xlsx', 'csv', 'parquet')
+
+TRANSACTION_COLUMNS = (
+    ('t.transaction_id', 'transaction_id'),
+    ('t.date', 'date'),
+    ('t.investor_id', 'investor_id'),
+    ('i.name', 'investor_name'),
+    ('t.transaction_type', 'transaction_type'),
+    ('t.amount', 'amount'),
+    ('t.nav_per_share', 'share_price'),   # share_price on legacy tables
+    ('t.shares_transacted', 'shares_transacted'),
+    ('t.notes', 'notes'),
+    ('t.created_at', 'created_at'),
+)
+
+_FROM = "FROM transactions t LEFT JOIN investors i ON t.investor_id = i.investor_id"
+
+
+def get_database_path() -> Path:
+    """Get path to the fund database."""
+    return PROJECT_ROOT / 'data' / 'tovito.db'
+
+
+def build_filter(start: Optional[str] = None, end: Optional[str] = None,
+                 investor: Optional[str] = None,
+                 live_only: bool = False) -> Tuple[str, List[Any]]:
+    """Return (WHERE clause, params) for the export filters.
+
+    Dates are inclusive YYYY-MM-DD strings; investor is an investor_id.
+    live_only drops soft-deleted rows (tables with an is_deleted column).
+    """
+    conditions, params = [], []
+    if live_only:
+        conditions.append("t.is_deleted = 0")
+    if start:
+        conditions.append("t.date >= ?")
+        params.append(start)
+    if end:
+        conditions.append("t.date <= ?")
+        params.append(end)
+    if investor:
+        conditions.append("t.investor_id = ?")
+        params.append(investor)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    return where, params
+
+
+class TransactionExport:
+    """Stream filtered transactions to a file and summarise them in SQL.
+
+    Usage:
+        export = TransactionExport(db_path, start='2026-01-01', investor='20260101-01A')
+        result = export.write('data/exports/tx.xlsx')
+        summary = export.summaries()
+    """
+
+    def __init__(self, db_path, start: Optional[str] = None, end: Optional[str] = None,
+                 investor: Optional[str] = None, chunk_rows: int = CHUNK_ROWS):
+        self.db_path = str(db_path)
+        self.filters = (start, end, investor)
+        self.where, self.params = build_filter(*self.filters)
+        self.chunk_rows = chunk_rows
+        self.columns = [alias for _, alias in TRANSACTION_COLUMNS]
+        self.select_columns = TRANSACTION_COLUMNS
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    def _adapt_to(self, conn: sqlite3.Connection):
+        """Match the query to this database's transactions table.
+
+        Called by summaries(), which write() runs before streaming rows.
+        """
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+        if 'nav_per_share' not in existing and 'share_price' in existing:
+            self.select_columns = tuple(
+                ('t.share_price', alias) if alias == 'share_price' else (expr, alias)
+                for expr, alias in TRANSACTION_COLUMNS
+            )
+        self.where, self.params = build_filter(*self.filters,
+                                               live_only='is_deleted' in existing)
+
+    def _select(self) -> str:
+        fields = ", ".join(f"{expr} AS {alias}" for expr, alias in self.select_columns)
+        return f"SELECT {fields} {_FROM} {self.where} ORDER BY t.date, t.created_at"
+
+    def _chunks(self, conn: sqlite3.Connection) -> Iterator[List[tuple]]:
+        cursor = conn.execute(self._select(), self.params)
+        while True:
+            chunk = cursor.fetchmany(self.chunk_rows)
+            if not chunk:
+                return
+            yield chunk
+
+    def summaries(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+        """Summaries by type, by investor and overall, as SQL aggregates."""
+        own = conn is None
+        conn = conn or self._connect()
+        try:
+            self._adapt_to(conn)
+            aggregates = "COUNT(*), COALESCE(SUM(t.amount), 0), COALESCE(SUM(t.shares_transacted), 0)"
+            by_type = conn.execute(
+                f"SELECT t.transaction_type, {aggregates} {_FROM} {self.where} "
+                f"GROUP BY t.transaction_type ORDER BY t.transaction_type",
+                self.params).fetchall()
+            investor_where = (self.where + " AND" if self.where else "WHERE") + " i.name IS NOT NULL"
+            by_investor = conn.execute(
+                f"SELECT i.name, {aggregates} {_FROM} {investor_where} "
+                f"GROUP BY i.name ORDER BY i.name",
+                self.params).fetchall()
+            first, last, count, total = conn.execute(
+                f"SELECT MIN(t.date), MAX(t.date), COUNT(*), COALESCE(SUM(t.amount), 0) "
+                f"{_FROM} {self.where}", self.params).fetchone()
+        finally:
+            if own:
+                conn.close()
+
+        days = None
+        if first and last:
+            days = (datetime.fromisoformat(str(last)[:10])
+                    - datetime.fromisoformat(str(first)[:10])).days
+        return {
+            'by_type': by_type,
+            'by_investor': by_investor,
+            'overview': {
+                'first_date': first,
+                'last_date': last,
+                'days': days,
+                'count': count,
+                'total_amount': total,
+            },
+        }
+
+    def write(self, path, fmt: Optional[str] = None) -> Dict[str, Any]:
+        """Write the export to path and return its stats.
+
+        The file is written to path + '.part' and renamed into place when
+        complete, so a failed export never leaves a truncated file.
+
+        Returns:
+            dict with path, format, rows, seconds, rows_per_sec,
+            peak_memory_mb, summaries and preview (first 10 rows)
+        """
+        path = str(path)
+        fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or 'xlsx').lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt == 'parquet' and not HAS_PYARROW:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+        writer = {'xlsx': self._write_xlsx, 'csv': self._write_csv,
+                  'parquet': self._write_parquet}[fmt]
+        part = path + '.part'
+        self.preview: List[tuple] = []
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        conn = self._connect()
+        try:
+            summaries = self.summaries(conn)
+            rows = writer(conn, part, summaries)
+            os.replace(part, path)
+        except BaseException:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+            raise
+        finally:
+            conn.close()
+            seconds = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+
+        return {
+            'path': path,
+            'format': fmt,
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'rows_per_sec': round(rows / seconds) if seconds > 0 else rows,
+            'peak_memory_mb': round(peak / 1024 / 1024, 2),
+            'summaries': summaries,
+            'preview': self.preview,
+        }
+
+    def _stream(self, conn: sqlite3.Connection) -> Iterator[List[tuple]]:
+        for chunk in self._chunks(conn):
+            if len(self.preview) < 10:
+                self.preview.extend(chunk[:10 - len(self.preview)])
+            yield chunk
+
+    def _write_xlsx(self, conn: sqlite3.Connection, part: str,
+                    summaries: Dict[str, Any]) -> int:
+        wb = Workbook(write_only=True)
+
+        sheet = wb.create_sheet('All Transactions')
+        sheet.append(self.columns)
+        rows = 0
+        for chunk in self._stream(conn):
+            for row in chunk:
+                sheet.append(row)
+            rows += len(chunk)
 
+        header = ['Count', 'Total Amount', 'Total Shares']
+        sheet = wb.create_sheet('Summary by Type')
+        sheet.append(['Transaction Type'] + header)
+        for row in summaries['by_type']:
+            sheet.append(row)
+
+        sheet = wb.create_sheet('Summary by Investor')
+        sheet.append(['Investor Name'] + header)
+        for row in summaries['by_investor']:
+            sheet.append(row)
+
+        overview = summaries['overview']
+        sheet = wb.create_sheet('Overview')
+        sheet.append(['Metric', 'Value'])
+        sheet.append(['First Transaction', overview['first_date']])
+        sheet.append(['Last Transaction', overview['last_date']])
+        sheet.append(['Date Range (Days)', overview['days']])
+        sheet.append(['Total Transactions', overview['count']])
+        sheet.append(['Total Amount', f"${overview['total_amount']:,.2f}"])
+
+        wb.save(part)
+        return rows
+
+    def _write_csv(self, conn: sqlite3.Connection, part: str,
+                   summaries: Dict[str, Any]) -> int:
+        rows = 0
+        with open(part, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            for chunk in self._stream(conn):
+                writer.writerows(["" if v is None else v for v in row] for row in chunk)
+                rows += len(chunk)
+        return rows
+
+    def _write_parquet(self, conn: sqlite3.Connection, part: str,
+                       summaries: Dict[str, Any]) -> int:
+        schema = pa.schema([
+            ('transaction_id', pa.int64()),
+            ('date', pa.string()),
+            ('investor_id', pa.string()),
+            ('investor_name', pa.string()),
+            ('transaction_type', pa.string()),
+            ('amount', pa.float64()),
+            ('share_price', pa.float64()),
+            ('shares_transacted', pa.float64()),
+            ('notes', pa.string()),
+            ('created_at', pa.string()),
+        ])
+        rows = 0
+        with pq.ParquetWriter(part, schema) as writer:
+            for chunk in self._stream(conn):
+                arrays = [
+                    pa.array([None if v is None else str(v) for v in col]
+                             if field.type == pa.string() else list(col), type=field.type)
+                    for field, col in zip(schema, zip(*chunk))
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(chunk)
+        return rows
+
+
+def _print_summaries(summaries: Dict[str, Any]):
+    print("TRANSACTION SUMMARY BY TYPE:")
+    print("-" * 40)
+    for trans_type, count, total, _ in summaries['by_type']:
+        print(f"  {trans_type}: {count} transactions, ${total:,.2f}")
+    print()
+
+    print("TRANSACTION SUMMARY BY INVESTOR:")
+    print("-" * 40)
+    for investor, count, total, _ in summaries['by_investor']:
+        print(f"  {investor}: {count} transactions, ${total:,.2f}")
+    print()
+
+
+def _print_preview(columns: Sequence[str], preview: List[tuple], total: int):
+    shown = ['date', 'investor_name', 'transaction_type', 'amount', 'shares_transacted']
+    index = [columns.index(c) for c in shown]
+    print("FIRST 10 TRANSACTIONS:")
+    print("-" * 80)
+    print("  ".join(f"{c:<18}" for c in shown))
+    for row in preview:
+        print("  ".join(f"{'' if row[i] is None else str(row[i]):<18}" for i in index))
+    print()
+    if total > len(preview):
+        print(f"... and {total - len(preview)} more transactions (see export file)")
+        print()
+
+
+def export_transactions_to_excel(start: Optional[str] = None, end: Optional[str] = None,
+                                 investor: Optional[str] = None, fmt: str = 'xlsx',
+                                 output: Optional[str] = None, chunk_rows: int = CHUNK_ROWS,
+                                 db_path: Optional[Path] = None) -> bool:
+    """Export transactions (all, or filtered) and print summaries."""
+    db_path = Path(db_path) if db_path else get_database_path()
 
-def export_transactions_to_excel():
-    """Export all transactions to Excel"""
-    
-    db_path = Path(__file__).parent.parent / 'data' / 'tovito.db'
-    
     if not db_path.exists():
         print(f"❌ Database not found: {db_path}")
         return False
-    
+
     try:
-        conn = sqlite3.connect(db_path)
-        
         print("=" * 80)
-        print("EXPORT TRANSACTIONS TO EXCEL")
+        print("EXPORT TRANSACTIONS")
         print("=" * 80)
         print()
-        
-        # Get all transactions
-        query = """
-            SELECT 
-                t.transaction_id,
-                t.date,
-                t.investor_id,
-                i.name as investor_name,
-                t.transaction_type,
-                t.amount,
-                t.share_price,
-                t.shares_transacted,
-                t.notes,
-                t.created_at
-            FROM transactions t
-            LEFT JOIN investors i ON t.investor_id = i.investor_id
-            ORDER BY t.date, t.created_at
-        """
-        
-        df = pd.read_sql_query(query, conn)
-        
-        if df.empty:
-            print("⚠️  No transactions found in database")
-            conn.close()
+
+        export = TransactionExport(db_path, start=start, end=end, investor=investor,
+                                   chunk_rows=chunk_rows)
+        summaries = export.summaries()
+        if summaries['overview']['count'] == 0:
+            print("⚠️  No transactions found for the selected filters")
             return False
-        
-        print(f"Found {len(df)} transactions in database")
-        print()
-        
-        # Summary by type
-        print("TRANSACTION SUMMARY BY TYPE:")
-        print("-" * 40)
-        for trans_type in df['transaction_type'].unique():
-            type_data = df[df['transaction_type'] == trans_type]
-            count = len(type_data)
-            total = type_data['amount'].sum()
-            print(f"  {trans_type}: {count} transactions, ${total:,.2f}")
-        print()
-        
-        # Summary by investor
-        print("TRANSACTION SUMMARY BY INVESTOR:")
-        print("-" * 40)
-        for investor in df['investor_name'].unique():
-            if pd.notna(investor):
-                inv_data = df[df['investor_name'] == investor]
-                count = len(inv_data)
-                total = inv_data['amount'].sum()
-                print(f"  {investor}: {count} transactions, ${total:,.2f}")
-        print()
-        
-        # Export to Excel
-        output_dir = Path(__file__).parent.parent / 'data' / 'exports'
-        output_dir.mkdir(exist_ok=True)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = output_dir / f'transactions_export_{timestamp}.xlsx'
-        
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            # All transactions
-            df.to_excel(writer, sheet_name='All Transactions', index=False)
-            
-            # Summary by type (FIXED - flatten MultiIndex)
-            type_summary = df.groupby('transaction_type').agg({
-                'amount': ['count', 'sum'],
-                'shares_transacted': 'sum'
-            })
-            # Flatten MultiIndex columns
-            type_summary.columns = ['_'.join(col).strip() for col in type_summary.columns.values]
-            type_summary = type_summary.reset_index()
-            # Rename columns for clarity
-            type_summary.columns = ['Transaction Type', 'Count', 'Total Amount', 'Total Shares']
-            type_summary.to_excel(writer, sheet_name='Summary by Type', index=False)
-            
-            # Summary by investor (FIXED - flatten MultiIndex)
-            inv_summary = df.groupby('investor_name').agg({
-                'amount': ['count', 'sum'],
-                'shares_transacted': 'sum'
-            })
-            # Flatten MultiIndex columns
-            inv_summary.columns = ['_'.join(col).strip() for col in inv_summary.columns.values]
-            inv_summary = inv_summary.reset_index()
-            # Rename columns for clarity
-            inv_summary.columns = ['Investor Name', 'Count', 'Total Amount', 'Total Shares']
-            inv_summary.to_excel(writer, sheet_name='Summary by Investor', index=False)
-            
-            # Date range
-            date_range = pd.DataFrame({
-                'Metric': ['First Transaction', 'Last Transaction', 'Date Range (Days)', 'Total Transactions', 'Total Amount'],
-                'Value': [
-                    df['date'].min(),
-                    df['date'].max(),
-                    (pd.to_datetime(df['date'].max()) - pd.to_datetime(df['date'].min())).days,
-                    len(df),
-                    f"${df['amount'].sum():,.2f}"
-                ]
-            })
-            date_range.to_excel(writer, sheet_name='Overview', index=False)
-        
-        print(f"✅ Excel file created: {output_file}")
-        print()
-        print(f"   Location: {output_file.relative_to(Path.cwd())}")
+
+        print(f"Found {summaries['overview']['count']} transactions in database")
         print()
-        
-        # Display first few transactions
-        print("FIRST 10 TRANSACTIONS:")
-        print("-" * 80)
-        display_cols = ['date', 'investor_name', 'transaction_type', 'amount', 'shares_transacted']
-        print(df[display_cols].head(10).to_string(index=False))
+        _print_summaries(summaries)
+
+        if output:
+            output_file = Path(output)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            output_dir = PROJECT_ROOT / 'data' / 'exports'
+            output_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_file = output_dir / f'transactions_export_{timestamp}.{fmt}'
+
+        result = export.write(output_file, fmt)
+
+        print(f"✅ Export file created: {output_file}")
+        print(f"[STATS] {result['rows']:,} rows in {result['seconds']:.2f}s "
+              f"({result['rows_per_sec']:,} rows/sec), "
+              f"peak Python memory {result['peak_memory_mb']:.1f} MB")
         print()
-        
-        if len(df) > 10:
-            print(f"... and {len(df) - 10} more transactions (see Excel file)")
+
+        _print_preview(export.columns, result['preview'], result['rows'])
+
+        if fmt == 'xlsx':
+            print("=" * 80)
+            print("EXCEL FILE CONTAINS 4 SHEETS:")
+            print("=" * 80)
+            print("  1. All Transactions - Complete transaction history")
+            print("  2. Summary by Type - Grouped by transaction type")
+            print("  3. Summary by Investor - Grouped by investor")
+            print("  4. Overview - Date ranges and totals")
             print()
-        
-        print("=" * 80)
-        print("EXCEL FILE CONTAINS 4 SHEETS:")
-        print("=" * 80)
-        print("  1. All Transactions - Complete transaction history")
-        print("  2. Summary by Type - Grouped by transaction type")
-        print("  3. Summary by Investor - Grouped by investor")
-        print("  4. Overview - Date ranges and totals")
-        print()
-        
-        conn.close()
+
         return True
-        
+
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
@@ -163,9 +414,37 @@ def export_transactions_to_excel():
         return False
 
 
-if __name__ == "__main__":
-    success = export_transactions_to_excel()
+def main():
+    parser = argparse.ArgumentParser(description='Export transactions to Excel, CSV or Parquet')
+    parser.add_argument('--start', '--start-date', dest='start',
+                        help='First transaction date to include (YYYY-MM-DD)')
+    parser.add_argument('--end', '--end-date', dest='end',
+                        help='Last transaction date to include (YYYY-MM-DD)')
+    parser.add_argument('--investor', help='Only this investor_id')
+    parser.add_argument('--format', choices=FORMATS, default='xlsx', dest='fmt',
+                        help='Output format (default: xlsx)')
+    parser.add_argument('--output', help='Output file (default: data/exports/transactions_export_<timestamp>.<format>)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help=f'Rows fetched per chunk (default: {CHUNK_ROWS})')
+    args = parser.parse_args()
+
+    for value in (args.start, args.end):
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                print(f"❌ Invalid date: {value} (use YYYY-MM-DD)")
+                sys.exit(1)
+
+    success = export_transactions_to_excel(start=args.start, end=args.end,
+                                           investor=args.investor, fmt=args.fmt,
+                                           output=args.output, chunk_rows=args.chunk_rows)
     if success:
         print("✅ Export complete!")
     else:
         print("❌ Export failed")
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
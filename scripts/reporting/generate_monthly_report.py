@@ -60,20 +60,29 @@ try:
 except ImportError:
     HAS_EMAIL = False
 
+from src.monitoring.tracing import current_span, traced
+from src.automation.valuation import value_fund
+
+# Bulk sender for --email runs over all investors
+try:
+    from src.automation.bulk_mailer import BulkMailer, OutgoingEmail
+    HAS_BULK_EMAIL = True
+except ImportError:
+    HAS_BULK_EMAIL = False
+
 
 def get_database_path():
     """Get database path"""
     return Path(__file__).parent.parent.parent / 'data' / 'tovito.db'
 
 
-def get_investor_info(cursor, investor_id):
-    """Get investor information"""
+def get_investor_email(cursor, investor_id):
+    """Get an investor's email address"""
     cursor.execute("""
-        SELECT investor_id, name, email, current_shares, net_investment
-        FROM investors
-        WHERE investor_id = ? AND status = 'Active'
+        SELECT email FROM investors WHERE investor_id = ?
     """, (investor_id,))
-    return cursor.fetchone()
+    row = cursor.fetchone()
+    return row[0] if row else None
 
 
 def get_active_investors(cursor):
@@ -87,17 +96,6 @@ def get_active_investors(cursor):
     return cursor.fetchall()
 
 
-def get_current_nav(cursor):
-    """Get current NAV"""
-    cursor.execute("""
-        SELECT nav_per_share, total_portfolio_value, date
-        FROM daily_nav
-        ORDER BY date DESC
-        LIMIT 1
-    """)
-    return cursor.fetchone()
-
-
 def get_month_start_nav(cursor, year, month):
     """Get NAV at start of month (January 1 for first month)"""
     if month == 1:
@@ -159,13 +157,6 @@ def get_monthly_contribution_withdrawal_totals(cursor, investor_id, month, year)
     return (contributions, withdrawals)
 
 
-def get_portfolio_allocation(cursor, investor_id, current_value, total_portfolio_value):
-    """Calculate investor's % of total portfolio"""
-    if total_portfolio_value > 0:
-        return (current_value / total_portfolio_value) * 100
-    return 0
-
-
 # ============================================================
 # CHART DATA QUERIES
 # ============================================================
@@ -313,19 +304,22 @@ def get_current_positions(cursor):
         return []
 
 
-def generate_pdf_report(investor_info, nav_info, transactions, month, year, output_path):
-    """Generate comprehensive PDF report"""
+def generate_pdf_report(position, nav_info, transactions, month, year, output_path):
+    """Generate comprehensive PDF report
+
+    position is the investor's row from value_fund()."""
     
     if not HAS_PDF:
         return None
     
-    investor_id, name, email, shares, net_investment = investor_info
+    investor_id, name = position['investor_id'], position['name']
+    shares, net_investment = position['current_shares'], position['net_investment']
     nav_per_share, total_portfolio, nav_date = nav_info
     
-    # Calculate values
-    current_value = shares * nav_per_share
-    unrealized_gain = current_value - net_investment
-    return_pct = (unrealized_gain / net_investment * 100) if net_investment > 0 else 0
+    # Values from the fund valuation
+    current_value = position['current_value']
+    unrealized_gain = position['total_gain']
+    return_pct = position['total_return_percent']
     
     # Get month start NAV
     conn = sqlite3.connect(get_database_path())
@@ -340,13 +334,10 @@ def generate_pdf_report(investor_info, nav_info, transactions, month, year, outp
     if start_nav and start_nav > 0:
         nav_change_pct = ((nav_per_share - start_nav) / start_nav) * 100
     
-    # Get portfolio allocation
-    portfolio_allocation = get_portfolio_allocation(cursor, investor_id, current_value, total_portfolio)
-    
-    # Calculate tax
-    tax_rate = 0.37
-    tax_liability = unrealized_gain * tax_rate if unrealized_gain > 0 else 0
-    after_tax_value = current_value - tax_liability
+    # Portfolio allocation and tax from the fund valuation
+    portfolio_allocation = position['portfolio_percent']
+    tax_liability = position['tax_liability']
+    after_tax_value = position['after_tax_value']
     
     conn.close()
     
@@ -698,16 +689,19 @@ def generate_pdf_report(investor_info, nav_info, transactions, month, year, outp
     return output_path
 
 
-def generate_text_report(investor_info, nav_info, transactions, month, year, output_path):
-    """Generate comprehensive text report (fallback)"""
+def generate_text_report(position, nav_info, transactions, month, year, output_path):
+    """Generate comprehensive text report (fallback)
+
+    position is the investor's row from value_fund()."""
     
-    investor_id, name, email, shares, net_investment = investor_info
+    investor_id, name = position['investor_id'], position['name']
+    shares, net_investment = position['current_shares'], position['net_investment']
     nav_per_share, total_portfolio, nav_date = nav_info
     
-    # Calculate values
-    current_value = shares * nav_per_share
-    unrealized_gain = current_value - net_investment
-    return_pct = (unrealized_gain / net_investment * 100) if net_investment > 0 else 0
+    # Values from the fund valuation
+    current_value = position['current_value']
+    unrealized_gain = position['total_gain']
+    return_pct = position['total_return_percent']
     
     # Get additional data
     conn = sqlite3.connect(get_database_path())
@@ -719,11 +713,9 @@ def generate_text_report(investor_info, nav_info, transactions, month, year, out
     if start_nav and start_nav > 0:
         nav_change_pct = ((nav_per_share - start_nav) / start_nav) * 100
     
-    portfolio_allocation = get_portfolio_allocation(cursor, investor_id, current_value, total_portfolio)
-    
-    tax_rate = 0.37
-    tax_liability = unrealized_gain * tax_rate if unrealized_gain > 0 else 0
-    after_tax_value = current_value - tax_liability
+    portfolio_allocation = position['portfolio_percent']
+    tax_liability = position['tax_liability']
+    after_tax_value = position['after_tax_value']
     
     conn.close()
     
@@ -796,24 +788,33 @@ def generate_text_report(investor_info, nav_info, transactions, month, year, out
     return output_path
 
 
-def generate_monthly_report(cursor, investor_id, month, year, use_pdf=True):
+@traced('report.generate_monthly_report')
+def generate_monthly_report(cursor, investor_id, month, year, use_pdf=True,
+                            valuation=None, email=None):
     """
     Generate comprehensive monthly report for investor
     
+    Args:
+        valuation: value_fund() result shared across a run (valued here if None)
+        email: Investor email, if already known
+    
     Returns: (report_path, investor_name, investor_email) or None if failed
     """
     
-    # Get investor info
-    investor_info = get_investor_info(cursor, investor_id)
-    if not investor_info:
+    if valuation is None:
+        valuation = value_fund(cursor.connection)
+    
+    # Get investor position
+    position = valuation.row(investor_id)
+    if not position:
         print(f"❌ Investor {investor_id} not found or inactive")
         return None
     
     # Get current NAV
-    nav_info = get_current_nav(cursor)
-    if not nav_info:
+    if valuation.nav_per_share is None:
         print(f"❌ No NAV data found")
         return None
+    nav_info = (valuation.nav_per_share, valuation.total_portfolio_value, valuation.nav_date)
     
     # Get transactions
     transactions = get_monthly_transactions(cursor, investor_id, month, year)
@@ -823,16 +824,19 @@ def generate_monthly_report(cursor, investor_id, month, year, use_pdf=True):
     output_dir.mkdir(exist_ok=True, parents=True)
     
     # Generate report
-    _, name, email, _, _ = investor_info
+    name = position['name']
+    if email is None:
+        email = get_investor_email(cursor, investor_id)
     
+    current_span().set_attribute('format', 'pdf' if use_pdf and HAS_PDF else 'text')
     if use_pdf and HAS_PDF:
         filename = f"monthly_statement_{investor_id}_{year}{month:02d}.pdf"
         output_path = output_dir / filename
-        result = generate_pdf_report(investor_info, nav_info, transactions, month, year, output_path)
+        result = generate_pdf_report(position, nav_info, transactions, month, year, output_path)
     else:
         filename = f"monthly_statement_{investor_id}_{year}{month:02d}.txt"
         output_path = output_dir / filename
-        result = generate_text_report(investor_info, nav_info, transactions, month, year, output_path)
+        result = generate_text_report(position, nav_info, transactions, month, year, output_path)
     
     if result:
         print(f"✅ Report generated: {output_path}")
@@ -841,18 +845,8 @@ def generate_monthly_report(cursor, investor_id, month, year, use_pdf=True):
         return None
 
 
-def send_monthly_report(report_path, investor_name, investor_email, month, year):
-    """Send monthly report via email"""
-    
-    if not HAS_EMAIL:
-        print("❌ Email service not available")
-        print("   Make sure email_adapter.py exists and is configured")
-        return False
-    
-    if not investor_email:
-        print(f"❌ No email address for {investor_name}")
-        return False
-    
+def build_monthly_report_email(investor_name, month, year):
+    """Return (subject, body) for a monthly statement email"""
     month_name = datetime(year, month, 1).strftime('%B %Y')
     
     subject = f"Tovito Trader - Monthly Statement - {month_name}"
@@ -874,12 +868,33 @@ Tovito Trader Team
 ---
 This is an automated message. Please do not reply directly to this email.
 """
+    return subject, body
+
+
+def statement_attachment_name(report_path, month, year):
+    """Filename investors see on the attached statement"""
+    month_name = datetime(year, month, 1).strftime('%B_%Y')
+    return f"Monthly_Statement_{month_name}{Path(report_path).suffix}"
+
+
+def send_monthly_report(report_path, investor_name, investor_email, month, year):
+    """Send monthly report via email"""
+    
+    if not HAS_EMAIL:
+        print("❌ Email service not available")
+        print("   Make sure email_adapter.py exists and is configured")
+        return False
+    
+    if not investor_email:
+        print(f"❌ No email address for {investor_name}")
+        return False
+    
+    subject, body = build_monthly_report_email(investor_name, month, year)
     
     print(f"📧 Sending report to {investor_name} ({investor_email})...")
     
     try:
-        file_extension = report_path.suffix
-        attachment_name = f"Monthly_Statement_{month_name.replace(' ', '_')}{file_extension}"
+        attachment_name = statement_attachment_name(report_path, month, year)
         
         success = send_email_with_attachment(
             to_email=investor_email,
@@ -903,6 +918,52 @@ This is an automated message. Please do not reply directly to this email.
         return False
 
 
+def send_monthly_reports_bulk(reports, month, year, max_workers=4):
+    """Send many statements concurrently over reused connections.
+
+    Args:
+        reports: list of (report_path, investor_name, investor_email)
+
+    Returns: number of emails sent successfully
+    """
+    if not HAS_BULK_EMAIL:
+        # Fall back to one-at-a-time delivery
+        return sum(
+            1 for path, name, email in reports
+            if send_monthly_report(path, name, email, month, year)
+        )
+    
+    emails = []
+    for report_path, name, email in reports:
+        if not email:
+            print(f"❌ No email address for {name}")
+            continue
+        subject, body = build_monthly_report_email(name, month, year)
+        emails.append(OutgoingEmail(
+            to_email=email,
+            subject=subject,
+            message=body,
+            attachments=[(str(report_path),
+                          statement_attachment_name(report_path, month, year))],
+            email_type='MonthlyReport',
+        ))
+    
+    if not emails:
+        return 0
+    
+    print(f"📧 Sending {len(emails)} statements ({max_workers} workers)...")
+    report = BulkMailer(max_workers=max_workers).send_all(emails)
+    
+    for result in report.results:
+        if result.success:
+            print(f"✅ Email sent successfully to {result.email.to_email}")
+        else:
+            print(f"❌ Failed to send email to {result.email.to_email}: {result.error}")
+    print(f"   {report.summary()}")
+    
+    return report.sent
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate comprehensive monthly account statements')
     parser.add_argument('--month', type=int, help='Month (1-12) - defaults to current month')
@@ -911,6 +972,7 @@ def main():
     parser.add_argument('--email', action='store_true', help='Send report via email')
     parser.add_argument('--text', action='store_true', help='Generate text report instead of PDF')
     parser.add_argument('--previous-month', action='store_true', help='Generate for previous month (useful for automation on 1st of month)')
+    parser.add_argument('--email-workers', type=int, default=4, help='Concurrent email senders when using --email (default: 4)')
     
     args = parser.parse_args()
     
@@ -969,9 +1031,13 @@ def main():
         
         print()
         
+        # Value every active investor once for the whole run
+        valuation = value_fund(conn)
+        
         # Generate reports
         generated_count = 0
         emailed_count = 0
+        to_email = []
         
         for investor_data in investors:
             investor_id = investor_data[0]
@@ -981,18 +1047,24 @@ def main():
                 investor_id, 
                 month,
                 year,
-                use_pdf=(not args.text)
+                use_pdf=(not args.text),
+                valuation=valuation,
+                email=investor_data[2],
             )
             
             if result:
                 report_path, name, email = result
                 generated_count += 1
                 
-                # Send email if requested
+                # Queue email if requested (sent together below)
                 if args.email:
-                    if send_monthly_report(report_path, name, email, month, year):
-                        emailed_count += 1
-                    print()
+                    to_email.append((report_path, name, email))
+        
+        if to_email:
+            print()
+            emailed_count = send_monthly_reports_bulk(
+                to_email, month, year, max_workers=args.email_workers
+            )
         
         # Summary
         print()
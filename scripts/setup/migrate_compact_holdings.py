@@ -0,0 +1,126 @@
+"""
+Migration: Compact Holdings Snapshot Storage
+=============================================
+
+Converts the position_snapshots table (one row per position per day)
+to compact storage: a position_symbols table plus position_history rows
+that are only added when a position opens, closes or changes.
+position_snapshots becomes a view with the same columns, so existing
+queries keep working.
+
+The original table is kept as position_snapshots_legacy and every
+snapshot is checked against it.  Use --drop-legacy once you are happy
+with the result to delete it and reclaim the space.
+
+The daily pipeline and the portal also convert automatically on their
+first snapshot write; this script adds the verification and the report.
+
+Usage:
+    python scripts/setup/migrate_compact_holdings.py
+    python scripts/setup/migrate_compact_holdings.py --drop-legacy
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+DB_PATH = os.getenv("DATABASE_PATH", str(PROJECT_DIR / "data" / "tovito.db"))
+
+from src.database.holdings_store import (
+    LEGACY_TABLE,
+    SYMBOL_FIELDS,
+    VALUE_FIELDS,
+    migrate_legacy_snapshots,
+    ensure_holdings_schema,
+    storage_stats,
+)
+from src.reporting.performers import rebuild_performance_summary
+
+
+def _table_exists(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def verify_against_legacy(conn) -> list:
+    """Snapshot ids whose rebuilt positions differ from the legacy table."""
+    columns = ', '.join(SYMBOL_FIELDS + VALUE_FIELDS)
+    mismatched = []
+    for (snapshot_id,) in conn.execute("SELECT snapshot_id FROM holdings_snapshots").fetchall():
+        legacy = conn.execute(
+            f"SELECT {columns} FROM {LEGACY_TABLE} WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchall()
+        rebuilt = conn.execute(
+            f"SELECT {columns} FROM position_snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchall()
+        if sorted(map(tuple, legacy), key=repr) != sorted(map(tuple, rebuilt), key=repr):
+            mismatched.append(snapshot_id)
+    return mismatched
+
+
+def run_migration(drop_legacy: bool = False):
+    """Convert position_snapshots to compact storage and verify it."""
+    conn = sqlite3.connect(DB_PATH)
+
+    print(f"Database: {DB_PATH}")
+    print()
+
+    print("Converting position_snapshots...")
+    converted = migrate_legacy_snapshots(conn)
+    if converted:
+        print(f"[OK] Converted {converted} snapshots")
+    else:
+        ensure_holdings_schema(conn)
+        print("[SKIP] Already using compact storage")
+
+    if _table_exists(conn, LEGACY_TABLE):
+        print()
+        print(f"Verifying against {LEGACY_TABLE}...")
+        mismatched = verify_against_legacy(conn)
+        if mismatched:
+            print(f"[FAIL] {len(mismatched)} snapshot(s) differ: {mismatched[:10]}")
+            conn.close()
+            sys.exit(1)
+        print("[OK] Every snapshot matches")
+
+        if drop_legacy:
+            conn.execute(f"DROP TABLE {LEGACY_TABLE}")
+            conn.commit()
+            conn.execute("VACUUM")
+            print(f"[OK] Dropped {LEGACY_TABLE}")
+
+    print()
+    print("Rebuilding symbol_performance_summary...")
+    symbols = rebuild_performance_summary(conn)
+    conn.commit()
+    print(f"[OK] {symbols} symbols summarized")
+
+    stats = storage_stats(conn)
+    conn.close()
+
+    print()
+    print(f"  Snapshots:       {stats['snapshots']:,}")
+    print(f"  Positions:       {stats['snapshot_positions']:,} (across all snapshots)")
+    print(f"  Symbols:         {stats['symbols']:,}")
+    print(f"  History rows:    {stats['history_rows']:,}")
+    print()
+    print("[OK] Migration complete")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert position_snapshots to compact storage"
+    )
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help=f"Drop {LEGACY_TABLE} after a successful verification",
+    )
+    args = parser.parse_args()
+    run_migration(drop_legacy=args.drop_legacy)
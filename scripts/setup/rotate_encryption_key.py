@@ -4,30 +4,50 @@ Encryption Key Rotation Script
 
 Rotates the encryption key for all encrypted PII fields in investor_profiles.
 Creates a database backup first, then decrypts all fields with the current key
-and re-encrypts with the new key using versioned ciphertext format (v1:...).
+and re-encrypts with the new key using versioned ciphertext format (v<N>:...),
+where N is one more than the current ENCRYPTION_KEY_VERSION.
+
+Profiles are processed in chunks (keyset-paginated by investor_id). Each
+chunk is decrypted/re-encrypted on a thread pool with the batch
+FieldEncryptor API, then written and committed by the main thread, and a
+checkpoint is saved so an interrupted run can continue with --resume.
+Values already carrying the new version prefix are skipped, so re-running
+over a partly rotated table is safe.
 
 Safety:
     - Creates a database backup before starting
-    - Wraps all updates in a single transaction (rollback on any failure)
+    - Each chunk is one transaction (rolled back if any field in it fails)
     - Validates every field round-trips correctly before committing
+    - Stops at the first failing chunk; earlier chunks stay committed and
+      --resume picks up after them
     - Supports --dry-run to preview changes without writing
 
+While a live rotation is part-way through, rows already rotated can only
+be read with the new key, so stop services that read PII until it finishes.
+
 Usage:
     python scripts/setup/rotate_encryption_key.py                    # Generate new key and rotate
     python scripts/setup/rotate_encryption_key.py --dry-run          # Preview without writing
     python scripts/setup/rotate_encryption_key.py --new-key KEY      # Use specific new key
+    python scripts/setup/rotate_encryption_key.py --new-key KEY --resume   # Continue an interrupted run
+    python scripts/setup/rotate_encryption_key.py --chunk-size 500 --workers 8
 
 Post-rotation steps:
     1. Update ENCRYPTION_KEY in .env with the new key
-    2. Add the old key to ENCRYPTION_LEGACY_KEYS in .env
-    3. Restart any running services
-    4. Verify profile access still works
+    2. Set ENCRYPTION_KEY_VERSION in .env to the new version
+    3. Add the old key to the front of ENCRYPTION_LEGACY_KEYS in .env
+    4. Restart any running services
+    5. Verify profile access still works
 """
 
 import os
 import sys
+import json
+import time
+import hashlib
 import sqlite3
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -39,6 +59,12 @@ load_dotenv(PROJECT_DIR / ".env")
 
 DB_PATH = os.getenv("DATABASE_PATH", str(PROJECT_DIR / "data" / "tovito.db"))
 
+# Progress of an interrupted live rotation (no key material, only a fingerprint)
+CHECKPOINT_PATH = PROJECT_DIR / "data" / ".key_rotation_checkpoint.json"
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 # Fields in investor_profiles that are encrypted
 ENCRYPTED_FIELDS = [
     'ssn_encrypted',
@@ -72,16 +98,141 @@ def create_backup():
         return True
 
 
-def rotate_keys(new_key: str, dry_run: bool = False):
+def _key_fingerprint(key: str) -> str:
+    """Short, non-reversible identifier for a key (for the checkpoint)."""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _mask(plaintext: str) -> str:
+    return plaintext[:2] + "***" + plaintext[-2:] if len(plaintext) > 4 else "****"
+
+
+def load_checkpoint(path: Path, fingerprint: str):
+    """
+    Load a rotation checkpoint written for the same new key.
+
+    Returns:
+        The checkpoint dict, or None if there is none
+
+    Raises:
+        ValueError: If the checkpoint was written for a different new key
+    """
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('new_key_fingerprint') != fingerprint:
+        raise ValueError(
+            "Checkpoint belongs to a rotation with a different new key. "
+            "Resume with the same --new-key, or delete %s to start over." % path
+        )
+    return state
+
+
+def save_checkpoint(path: Path, state: dict):
+    """Atomically write the rotation checkpoint."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def rotate_rows(rows, current_enc, new_enc, dry_run: bool = False) -> dict:
+    """
+    Re-encrypt the encrypted fields of a batch of profile rows.
+
+    Runs on a worker thread; does not touch the database.
+
+    Args:
+        rows: List of dicts with investor_id and ENCRYPTED_FIELDS
+        current_enc: FieldEncryptor able to read the existing values
+        new_enc: FieldEncryptor for the new key (no legacy keys)
+        dry_run: Collect masked previews of what would change
+
+    Returns:
+        dict with updates ({investor_id: {field: ciphertext}}), rotated,
+        skipped, already_rotated, errors and previews
+    """
+    result = {
+        'updates': {}, 'rotated': 0, 'skipped': 0, 'already_rotated': 0,
+        'errors': [], 'previews': [],
+    }
+
+    pending = []  # (investor_id, field, ciphertext)
+    for row in rows:
+        for field in ENCRYPTED_FIELDS:
+            value = row[field]
+            if value is None:
+                result['skipped'] += 1
+            elif new_enc.key_version_of(value) == new_enc.key_version:
+                result['already_rotated'] += 1
+            else:
+                pending.append((row['investor_id'], field, value))
+    if not pending:
+        return result
+
+    # Decrypt with current key; on failure, retry one by one to name the field
+    try:
+        plaintexts = current_enc.decrypt_many(value for _, _, value in pending)
+    except ValueError:
+        plaintexts = []
+        for investor_id, field, value in pending:
+            try:
+                plaintexts.append(current_enc.decrypt(value))
+            except ValueError as e:
+                plaintexts.append(None)
+                result['errors'].append(f"  {investor_id}.{field}: decrypt failed - {e}")
+
+    # Re-encrypt with new key and validate the round-trip
+    new_ciphertexts = new_enc.encrypt_many(plaintexts)
+    try:
+        verified = new_enc.decrypt_many(new_ciphertexts)
+    except ValueError as e:
+        verified = [None] * len(pending)
+        result['errors'].append(f"  verification decrypt failed - {e}")
+
+    for (investor_id, field, _), plaintext, ciphertext, check in zip(
+            pending, plaintexts, new_ciphertexts, verified):
+        if plaintext is None:
+            continue
+        if check != plaintext:
+            result['errors'].append(f"  {investor_id}.{field}: round-trip verification failed")
+            continue
+        result['updates'].setdefault(investor_id, {})[field] = ciphertext
+        result['rotated'] += 1
+        if dry_run:
+            result['previews'].append(
+                f"  [DRY-RUN] {investor_id}.{field}: would re-encrypt ({_mask(plaintext)})"
+            )
+
+    return result
+
+
+def rotate_keys(new_key: str, dry_run: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                workers: int = DEFAULT_WORKERS,
+                resume: bool = False,
+                db_path: str = None,
+                checkpoint_path: Path = None):
     """
     Rotate encryption key for all encrypted fields.
 
     Args:
         new_key: The new Fernet key to encrypt with
         dry_run: If True, show what would change without writing
+        chunk_size: Profiles per chunk (one transaction each)
+        workers: Threads re-encrypting each chunk
+        resume: Continue after the last committed chunk of an
+                interrupted run with the same new key
+        db_path: Database to rotate (default: DB_PATH)
+        checkpoint_path: Checkpoint file (default: CHECKPOINT_PATH)
     """
     from src.utils.encryption import FieldEncryptor
 
+    db_path = db_path or DB_PATH
+    checkpoint_path = Path(checkpoint_path or CHECKPOINT_PATH)
+
     # Initialize encryptors
     current_key = os.getenv('ENCRYPTION_KEY')
     if not current_key:
@@ -94,8 +245,9 @@ def rotate_keys(new_key: str, dry_run: bool = False):
         print(f"[ERROR] Current key is invalid: {e}")
         return False
 
+    new_version = current_enc.key_version + 1
     try:
-        new_enc = FieldEncryptor(new_key)
+        new_enc = FieldEncryptor(new_key, legacy_keys=[], key_version=new_version)
     except ValueError as e:
         print(f"[ERROR] New key is invalid: {e}")
         return False
@@ -104,78 +256,105 @@ def rotate_keys(new_key: str, dry_run: bool = False):
         print("[ERROR] New key is the same as the current key. Nothing to rotate.")
         return False
 
+    fingerprint = _key_fingerprint(new_key)
+    state = None
+    if resume and not dry_run:
+        try:
+            state = load_checkpoint(checkpoint_path, fingerprint)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return False
+        if state:
+            print(f"Resuming after investor {state['last_investor_id']} "
+                  f"({state['profiles_done']} profile(s) already done)")
+    if state is None:
+        state = {
+            'new_key_fingerprint': fingerprint,
+            'new_key_version': new_version,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'last_investor_id': '',
+            'profiles_done': 0,
+            'rotated': 0,
+            'skipped': 0,
+            'already_rotated': 0,
+        }
+
     # Connect to database
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
 
     try:
-        # Read all profiles with encrypted fields
-        field_list = ', '.join(['investor_id'] + ENCRYPTED_FIELDS)
-        cursor.execute(f"SELECT {field_list} FROM investor_profiles")
-        rows = cursor.fetchall()
+        total_profiles = conn.execute("SELECT COUNT(*) FROM investor_profiles").fetchone()[0]
 
-        if not rows:
+        if not total_profiles:
             print("[OK] No investor profiles found. Nothing to rotate.")
             conn.close()
             return True
 
-        print(f"Found {len(rows)} investor profile(s) to process")
+        print(f"Found {total_profiles} investor profile(s) to process "
+              f"(chunks of {chunk_size}, {workers} worker(s))")
         print()
 
-        total_fields = 0
-        rotated_fields = 0
-        skipped_fields = 0
+        field_list = ', '.join(['investor_id'] + ENCRYPTED_FIELDS)
+        last_id = state['last_investor_id']
+        started = time.perf_counter()
+        processed = 0
+        fields_done = 0
         errors = []
 
-        for row in rows:
-            investor_id = row['investor_id']
-            updates = {}
-
-            for field in ENCRYPTED_FIELDS:
-                total_fields += 1
-                value = row[field]
-
-                if value is None:
-                    skipped_fields += 1
-                    continue
-
-                # Decrypt with current key
-                try:
-                    plaintext = current_enc.decrypt(value)
-                except ValueError as e:
-                    errors.append(f"  {investor_id}.{field}: decrypt failed - {e}")
-                    continue
-
-                # Re-encrypt with new key (produces v1: prefix)
-                new_ciphertext = new_enc.encrypt(plaintext)
-
-                # Validate round-trip with new key
-                try:
-                    verify = new_enc.decrypt(new_ciphertext)
-                    if verify != plaintext:
-                        errors.append(f"  {investor_id}.{field}: round-trip verification failed")
-                        continue
-                except ValueError as e:
-                    errors.append(f"  {investor_id}.{field}: verification decrypt failed - {e}")
-                    continue
-
-                updates[field] = new_ciphertext
-                rotated_fields += 1
-
-                if dry_run:
-                    # Mask the field for display
-                    masked = plaintext[:2] + "***" + plaintext[-2:] if len(plaintext) > 4 else "****"
-                    print(f"  [DRY-RUN] {investor_id}.{field}: would re-encrypt ({masked})")
-
-            # Apply updates for this investor
-            if updates and not dry_run:
-                set_clause = ', '.join([f"{f} = ?" for f in updates.keys()])
-                values = list(updates.values()) + [investor_id]
-                cursor.execute(
-                    f"UPDATE investor_profiles SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE investor_id = ?",
-                    values
-                )
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while True:
+                rows = [dict(r) for r in conn.execute(
+                    f"SELECT {field_list} FROM investor_profiles "
+                    f"WHERE investor_id > ? ORDER BY investor_id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()]
+                if not rows:
+                    break
+
+                step = -(-len(rows) // max(1, workers))
+                slices = [rows[i:i + step] for i in range(0, len(rows), step)]
+                results = list(pool.map(
+                    lambda batch: rotate_rows(batch, current_enc, new_enc, dry_run), slices
+                ))
+
+                chunk_errors = [e for r in results for e in r['errors']]
+                errors.extend(chunk_errors)
+                for r in results:
+                    for line in r['previews']:
+                        print(line)
+
+                if chunk_errors and not dry_run:
+                    break
+
+                if not dry_run:
+                    for r in results:
+                        for investor_id, updates in r['updates'].items():
+                            set_clause = ', '.join(f"{f} = ?" for f in updates)
+                            conn.execute(
+                                f"UPDATE investor_profiles SET {set_clause}, "
+                                f"updated_at = CURRENT_TIMESTAMP WHERE investor_id = ?",
+                                list(updates.values()) + [investor_id],
+                            )
+                    conn.commit()
+
+                last_id = rows[-1]['investor_id']
+                processed += len(rows)
+                state['last_investor_id'] = last_id
+                state['profiles_done'] += len(rows)
+                for key in ('rotated', 'skipped', 'already_rotated'):
+                    state[key] += sum(r[key] for r in results)
+                fields_done += len(rows) * len(ENCRYPTED_FIELDS)
+
+                if not dry_run:
+                    save_checkpoint(checkpoint_path, state)
+
+                elapsed = time.perf_counter() - started
+                print(f"  [{state['profiles_done']}/{total_profiles}] profiles  "
+                      f"{processed / elapsed:,.0f} profiles/s  "
+                      f"{fields_done / elapsed:,.0f} fields/s")
+
+        elapsed = time.perf_counter() - started
 
         # Check for errors before committing
         if errors:
@@ -185,16 +364,15 @@ def rotate_keys(new_key: str, dry_run: bool = False):
                 print(err)
             print()
             if not dry_run:
-                print("[ROLLBACK] Rolling back due to errors. No changes written.")
                 conn.rollback()
                 conn.close()
+                print("[ROLLBACK] Rolled back the failing chunk. Earlier chunks are committed;")
+                print("  fix the errors and re-run with the same --new-key and --resume.")
                 return False
 
-        # Commit if not dry-run
-        if not dry_run:
-            conn.commit()
-
         conn.close()
+        if not dry_run and checkpoint_path.exists():
+            checkpoint_path.unlink()
 
         # Print summary
         print()
@@ -204,23 +382,31 @@ def rotate_keys(new_key: str, dry_run: bool = False):
         else:
             print("  ROTATION COMPLETE")
         print("=" * 60)
-        print(f"  Profiles processed: {len(rows)}")
-        print(f"  Fields checked:     {total_fields}")
-        print(f"  Fields rotated:     {rotated_fields}")
-        print(f"  Fields skipped:     {skipped_fields} (NULL)")
+        print(f"  Profiles processed: {state['profiles_done']}")
+        print(f"  Fields checked:     {state['profiles_done'] * len(ENCRYPTED_FIELDS)}")
+        print(f"  Fields rotated:     {state['rotated']}")
+        print(f"  Fields skipped:     {state['skipped']} (NULL)")
+        print(f"  Already rotated:    {state['already_rotated']}")
         print(f"  Errors:             {len(errors)}")
+        if elapsed > 0:
+            print(f"  Throughput:         {processed / elapsed:,.0f} profiles/s, "
+                  f"{fields_done / elapsed:,.0f} fields/s ({elapsed:.2f}s)")
         print()
 
-        if not dry_run and rotated_fields > 0:
+        if not dry_run and state['rotated'] > 0:
+            legacy = os.getenv('ENCRYPTION_LEGACY_KEYS', '').strip()
             print("  NEXT STEPS:")
             print("  1. Update ENCRYPTION_KEY in .env with the new key:")
             print(f"     ENCRYPTION_KEY={new_key}")
             print()
-            print("  2. Add the old key to ENCRYPTION_LEGACY_KEYS:")
-            print(f"     ENCRYPTION_LEGACY_KEYS={current_key}")
+            print("  2. Set the new key version:")
+            print(f"     ENCRYPTION_KEY_VERSION={new_version}")
+            print()
+            print("  3. Add the old key to the front of ENCRYPTION_LEGACY_KEYS:")
+            print(f"     ENCRYPTION_LEGACY_KEYS={current_key}" + (f",{legacy}" if legacy else ""))
             print()
-            print("  3. Restart any running services (API, scripts)")
-            print("  4. Verify profile access still works:")
+            print("  4. Restart any running services (API, scripts)")
+            print("  5. Verify profile access still works:")
             print("     python scripts/investor/manage_profile.py")
             print()
 
@@ -249,6 +435,23 @@ def main():
         action='store_true',
         help='Show what would change without writing to database'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted rotation (requires the same --new-key)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Profiles per chunk/transaction (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Re-encryption threads (default: {DEFAULT_WORKERS})'
+    )
     parser.add_argument(
         '--skip-backup',
         action='store_true',
@@ -268,10 +471,16 @@ def main():
     if args.new_key:
         new_key = args.new_key
         print("  Using provided key")
+    elif args.resume:
+        print("[ERROR] --resume requires the --new-key used by the interrupted run")
+        sys.exit(1)
     else:
         from src.utils.encryption import FieldEncryptor
         new_key = FieldEncryptor.generate_key()
         print("  Generated new key")
+        if not args.dry_run:
+            # Needed to --resume if the run is interrupted
+            print(f"  Save it now: {new_key}")
 
     print()
 
@@ -285,7 +494,9 @@ def main():
         print()
 
     # Perform rotation
-    success = rotate_keys(new_key, dry_run=args.dry_run)
+    success = rotate_keys(new_key, dry_run=args.dry_run,
+                          chunk_size=args.chunk_size, workers=args.workers,
+                          resume=args.resume)
 
     if not success:
         sys.exit(1)
@@ -166,28 +166,9 @@ def create_schema(conn):
         )
     """)
 
-    # Position snapshots table
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS position_snapshots (
-            position_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            snapshot_id INTEGER NOT NULL,
-            symbol TEXT NOT NULL,
-            underlying_symbol TEXT,
-            quantity REAL NOT NULL,
-            instrument_type TEXT,
-            average_open_price REAL,
-            close_price REAL,
-            market_value REAL,
-            cost_basis REAL,
-            unrealized_pl REAL,
-            option_type TEXT,
-            strike REAL,
-            expiration_date TEXT,
-            multiplier INTEGER,
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY (snapshot_id) REFERENCES holdings_snapshots(snapshot_id)
-        )
-    """)
+    # Compact position storage + position_snapshots view
+    from src.database.holdings_store import ensure_holdings_schema
+    ensure_holdings_schema(conn)
 
     # Email logs table
     conn.execute("""
@@ -38,6 +38,8 @@ try:
 except ImportError:
     pass
 
+from src.monitoring.tracing import span, traced
+
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
 PRODUCTION_API_URL = os.getenv("PRODUCTION_API_URL", "").rstrip("/")
 
@@ -243,6 +245,7 @@ def push_to_production(payload: dict) -> dict:
     return response.json()
 
 
+@traced('sync.sync_to_production')
 def sync_to_production(target_date: str = None, lookback_days: int = 3,
                        dry_run: bool = False) -> dict:
     """Main sync function — collects data and pushes to production.
@@ -258,7 +261,8 @@ def sync_to_production(target_date: str = None, lookback_days: int = 3,
         target_date = datetime.now().strftime("%Y-%m-%d")
 
     print(f"[SYNC] Building payload for {target_date}...")
-    payload = build_sync_payload(target_date, lookback_days)
+    with span('sync.build_payload', target_date=target_date):
+        payload = build_sync_payload(target_date, lookback_days)
 
     # Summary
     has_nav = "daily_nav" in payload
@@ -301,7 +305,9 @@ def sync_to_production(target_date: str = None, lookback_days: int = 3,
         return payload
 
     print(f"\n[SYNC] Pushing to {PRODUCTION_API_URL}...")
-    result = push_to_production(payload)
+    with span('sync.push') as push_span:
+        result = push_to_production(payload)
+        push_span.set_attribute('success', bool(result.get('success')))
     print(f"[SYNC] Result: success={result.get('success')}")
     if result.get("nav_synced"):
         print(f"  NAV synced: yes")
@@ -8,24 +8,34 @@ Usage:
     python scripts/trading/discord_trade_notifier.py              # Run service
     python scripts/trading/discord_trade_notifier.py --test       # Post a test embed and exit
     python scripts/trading/discord_trade_notifier.py --once       # Run one poll cycle and exit
+    python scripts/trading/discord_trade_notifier.py --stream     # Tradier fills pushed from the account stream
 
 Features:
-    - Polls TastyTrade and Tradier every 5 minutes during market hours
+    - Polls TastyTrade and Tradier concurrently every 5 minutes during market hours
+    - Fetches only activity after each brokerage's stored cursor
     - Posts only opening/closing trades (excludes dividends, fees, ACH, etc.)
-    - Deduplicates via in-memory seen-set with warm-up on startup
+    - Cursors and seen trades persist in SQLite, so restarts neither repeat
+      nor miss posts; warm-up only runs for a brokerage's first start
+    - Optional push updates from the Tradier account event stream
     - Color-coded Discord embeds (green=open, red=close)
     - Graceful error handling — API failures never crash the service
 """
 
 import sys
 import os
+import re
 import time
+import queue
 import signal
 import sqlite3
 import logging
+import threading
 import requests
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timedelta, time as dt_time, timezone
+from datetime import date, datetime, timedelta, time as dt_time, timezone
+from typing import Optional, Tuple
 
 PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_DIR))
@@ -65,6 +75,16 @@ COLOR_INFO = 0x2196F3    # Blue (startup/status messages)
 
 DB_PATH = PROJECT_DIR / os.getenv("DATABASE_PATH", "data/tovito.db")
 
+# In-memory seen-trade cache size (the SQLite store is the full record)
+SEEN_CACHE_SIZE = 2000
+
+# A cursor never trails today by more than this, however quiet the account
+MAX_CURSOR_LAG_DAYS = 5
+
+# Brokerage whose fills can be pushed from an account event stream
+STREAM_SOURCE = "tradier"
+STREAMING_ENABLED = os.getenv("TRADE_NOTIFIER_STREAMING", "").lower() in ("1", "true", "yes")
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -219,17 +239,243 @@ def post_to_discord(embed: dict, webhook_url: str = WEBHOOK_URL) -> bool:
     return False
 
 
+# ---------------------------------------------------------------------------
+# Notifier state (cursors and seen trades)
+# ---------------------------------------------------------------------------
+
+def fill_key(txn: dict) -> str:
+    """Content key matching a streamed fill to its row in Tradier's history.
+
+    A fill pushed from the order stream and the same fill read back from
+    Tradier's history carry different IDs (order ID vs history ID or a
+    GENERATED_ one) and different types ('buy_to_open' vs 'trade'), so
+    only the instrument, day, size and price are compared.  Identical
+    fills share a key, so matches are counted, never used as the dedup key.
+    """
+    instrument = (txn.get("option_symbol") or txn.get("symbol") or "").upper()
+    quantity = abs(float(txn.get("quantity") or 0))
+    price = float(txn.get("price") or 0)
+    return f"fill|{txn.get('date')}|{instrument}|{quantity:g}|{price:.4f}"
+
+
+def trade_key(txn: dict) -> str:
+    """Dedup key for a trade.
+
+    Uses the brokerage ID, except for Tradier's synthetic GENERATED_ IDs,
+    which depend on the event's position in the response and so change as
+    new events arrive; those trades are keyed by their contents instead.
+    """
+    txn_id = txn.get("brokerage_transaction_id") or ""
+    if txn_id and not txn_id.startswith("GENERATED_"):
+        return txn_id
+    return "|".join(str(txn.get(field)) for field in (
+        "date", "transaction_type", "symbol", "quantity", "price", "amount",
+    ))
+
+
+def trade_keys(transactions: list) -> list:
+    """trade_key() of each transaction, numbering repeated content keys.
+
+    A second identical fill without a brokerage ID is keyed '<key>#1'
+    (a third '#2', ...) rather than colliding with the first, so each is
+    posted.  Fetches cover whole days, so a fill keeps its number from
+    one poll to the next.
+    """
+    keys, repeats = [], Counter()
+    for txn in transactions:
+        key = trade_key(txn)
+        if key != txn.get("brokerage_transaction_id"):
+            occurrence = repeats[key]
+            repeats[key] += 1
+            if occurrence:
+                key = f"{key}#{occurrence}"
+        keys.append(key)
+    return keys
+
+
+class BoundedSeenSet:
+    """Set of (source, trade_key) with a size cap; the oldest keys go first."""
+
+    def __init__(self, maxlen: int = SEEN_CACHE_SIZE):
+        self.maxlen = maxlen
+        self._keys: OrderedDict = OrderedDict()
+
+    def add(self, key):
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxlen:
+            self._keys.popitem(last=False)
+
+    def clear(self):
+        self._keys.clear()
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class NotifierState:
+    """
+    Per-brokerage cursors and seen trades, kept in SQLite so a restart
+    resumes where the last run stopped.
+
+    Fetches start at a brokerage's cursor_date, so seen trades dated
+    before it can never come back and are pruned whenever the cursor
+    moves.  The default ':memory:' database gives a throwaway state
+    (used by --once).
+    """
+
+    def __init__(self, db_path=":memory:"):
+        from src.database.schema_v2 import TRADE_NOTIFIER_CURSORS_TABLE, TRADE_NOTIFIER_SEEN_TABLE
+
+        self.conn = sqlite3.connect(str(db_path), timeout=10)
+        self.conn.execute(TRADE_NOTIFIER_CURSORS_TABLE)
+        self.conn.execute(TRADE_NOTIFIER_SEEN_TABLE)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(trade_notifier_seen)")}
+        if "stream_fill" not in columns:
+            self.conn.execute("ALTER TABLE trade_notifier_seen ADD COLUMN stream_fill TEXT")
+        self.conn.commit()
+
+    def get_cursor(self, source: str) -> Optional[Tuple[date, Optional[datetime]]]:
+        """(cursor_date, cursor_at) for a brokerage, or None before its first fetch."""
+        row = self.conn.execute(
+            "SELECT cursor_date, cursor_at FROM trade_notifier_cursors WHERE source = ?",
+            (source,),
+        ).fetchone()
+        if row is None:
+            return None
+        cursor_at = datetime.fromisoformat(row[1]) if row[1] else None
+        return date.fromisoformat(row[0]), cursor_at
+
+    def is_seen(self, source: str, key: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM trade_notifier_seen WHERE source = ? AND trade_key = ?",
+            (source, key),
+        ).fetchone() is not None
+
+    def mark_seen(self, source: str, key: str, trade_date: str, posted: bool = True,
+                  stream_fill: Optional[str] = None):
+        """Record a handled trade; stream_fill is the fill_key() of a streamed fill."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO trade_notifier_seen "
+            "(source, trade_key, trade_date, posted, stream_fill) VALUES (?, ?, ?, ?, ?)",
+            (source, key, trade_date, int(posted), stream_fill),
+        )
+        self.conn.commit()
+
+    def claim_stream_fill(self, source: str, fill: str) -> bool:
+        """Match one not yet matched streamed fill with this fill_key().
+
+        Each streamed fill matches a single history row, so two identical
+        fills need two streamed fills to be skipped.
+        """
+        cursor = self.conn.execute("""
+            UPDATE trade_notifier_seen SET stream_fill = NULL
+            WHERE rowid = (SELECT rowid FROM trade_notifier_seen
+                           WHERE source = ? AND stream_fill = ? LIMIT 1)
+        """, (source, fill))
+        self.conn.commit()
+        return cursor.rowcount > 0
+
+    def advance(self, source: str, cursor_date: date, cursor_at: Optional[datetime] = None):
+        """Move a brokerage's cursor and drop seen trades dated before it."""
+        self.conn.execute("""
+            INSERT INTO trade_notifier_cursors (source, cursor_date, cursor_at, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source) DO UPDATE SET
+                cursor_date = excluded.cursor_date,
+                cursor_at = excluded.cursor_at,
+                updated_at = CURRENT_TIMESTAMP
+        """, (source, cursor_date.isoformat(), cursor_at.isoformat() if cursor_at else None))
+        self.conn.execute(
+            "DELETE FROM trade_notifier_seen WHERE source = ? AND trade_date < ?",
+            (source, cursor_date.isoformat()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _parse_occ_symbol(option_symbol: str) -> dict:
+    """Option fields from an OCC symbol such as SPY260320C00600000."""
+    match = re.match(r"^[A-Z.]+?(\d{2})(\d{2})(\d{2})([CP])(\d{8})$", option_symbol or "")
+    if not match:
+        return {}
+    yy, mm, dd, kind, strike = match.groups()
+    return {
+        "option_type": "call" if kind == "C" else "put",
+        "strike": int(strike) / 1000,
+        "expiration_date": f"20{yy}-{mm}-{dd}",
+    }
+
+
+def order_to_trade(order: dict) -> dict:
+    """Normalize a filled Tradier order to the get_transactions() format."""
+    side = (order.get("side") or "").lower()
+    option_symbol = order.get("option_symbol") or ""
+    quantity = float(order.get("exec_quantity") or order.get("quantity") or 0)
+    price = float(order.get("avg_fill_price") or 0)
+    amount = quantity * price * (100 if option_symbol else 1)
+    option = _parse_occ_symbol(option_symbol)
+
+    return {
+        "date": (order.get("transaction_date") or datetime.now().isoformat())[:10],
+        "transaction_type": side,
+        "symbol": order.get("symbol", "") or "",
+        "option_symbol": option_symbol or None,
+        "quantity": quantity,
+        "price": price or None,
+        "amount": round(-amount if side.startswith("buy") else amount, 2),
+        "commission": 0.0,
+        "fees": 0.0,
+        "option_type": option.get("option_type"),
+        "strike": option.get("strike"),
+        "expiration_date": option.get("expiration_date"),
+        "description": f"{side} {option_symbol or order.get('symbol', '')}",
+        "brokerage_transaction_id": f"order-{order.get('id', '')}",
+        "category": "Trade",
+        "subcategory": "",
+    }
+
+
 # ---------------------------------------------------------------------------
 # TradeNotifier service
 # ---------------------------------------------------------------------------
 
 class TradeNotifier:
-    """Polls brokerages for new trades and posts them to Discord."""
-
-    def __init__(self):
-        self.seen: set = set()  # (source, brokerage_transaction_id)
+    """
+    Polls brokerages for new trades and posts them to Discord.
+
+    Each brokerage is fetched from its stored cursor rather than from the
+    start of the day: TastyTrade from the last execution time it reported,
+    Tradier (whose history API only takes dates) from the last activity
+    date.  All brokerages are fetched concurrently; new trades are posted
+    in the main thread, one brokerage at a time.
+
+    With streaming on, Tradier fills arrive from the account event stream
+    and Tradier is only polled while the stream is disconnected.  Streamed
+    fills are keyed by order ID and remember their fill_key(); when Tradier
+    is polled after a disconnect, each history row with no seen ID consumes
+    one matching streamed fill instead of being posted again.
+    """
+
+    def __init__(self, state: Optional[NotifierState] = None, streaming: bool = False):
+        """
+        Args:
+            state: Cursor and seen-trade store (default: in-memory)
+            streaming: Take Tradier fills from the account event stream
+        """
+        self.state = state or NotifierState()
+        self.seen = BoundedSeenSet()  # Cache of (source, trade_key) in front of the store
         self.running = False
+        self.streaming = streaming
         self._clients = None
+        self._stream = None
+        self._stream_connected = threading.Event()
+        self._pushed: queue.Queue = queue.Queue()
 
     # -- Brokerage clients (lazy init) -------------------------------------
 
@@ -247,79 +493,217 @@ class TradeNotifier:
                 self._clients = {}
         return self._clients
 
+    # -- Fetching ----------------------------------------------------------
+
+    @staticmethod
+    def _fetch(client, cursor) -> list:
+        """Transactions after a cursor (today's when there is none)."""
+        if cursor is None:
+            start = datetime.combine(date.today(), dt_time.min)
+            return client.get_transactions(start_date=start, end_date=datetime.now())
+
+        cursor_date, cursor_at = cursor
+        if cursor_at is not None and hasattr(client, "get_transactions_since"):
+            return client.get_transactions_since(cursor_at)
+        return client.get_transactions(
+            start_date=datetime.combine(cursor_date, dt_time.min), end_date=datetime.now()
+        )
+
+    def _fetch_all(self, sources: list) -> dict:
+        """Fetch from several brokerages at once. Returns {source: transactions}."""
+        clients = self._get_clients()
+        sources = [source for source in sources if source in clients]
+        if not sources:
+            return {}
+
+        # Cursors are read here: the SQLite connection belongs to this thread
+        cursors = {source: self.state.get_cursor(source) for source in sources}
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+            futures = {
+                pool.submit(self._fetch, clients[source], cursors[source]): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    results[source] = future.result()
+                except Exception as e:
+                    logger.warning("API fetch failed for %s: %s", source, e)
+        return results
+
+    def _advance(self, source: str, transactions: list):
+        """Move a brokerage's cursor past the transactions just handled."""
+        today = date.today()
+        cursor = self.state.get_cursor(source)
+        dates = [date.fromisoformat(t["date"]) for t in transactions if t.get("date")]
+        executed = [datetime.fromisoformat(t["executed_at"])
+                    for t in transactions if t.get("executed_at")]
+
+        # Never hold the cursor back further than MAX_CURSOR_LAG_DAYS,
+        # so a quiet account does not widen every fetch
+        floor = today - timedelta(days=MAX_CURSOR_LAG_DAYS)
+        cursor_date = min(today, max(dates + [floor] + ([cursor[0]] if cursor else [])))
+        cursor_at = max(executed + ([cursor[1]] if cursor and cursor[1] else []), default=None)
+        self.state.advance(source, cursor_date, cursor_at)
+
+    # -- Seen trades -------------------------------------------------------
+
+    def _is_seen(self, source: str, key: str) -> bool:
+        if (source, key) in self.seen:
+            return True
+        if self.state.is_seen(source, key):
+            self.seen.add((source, key))
+            return True
+        return False
+
+    def _mark_seen(self, source: str, key: str, txn: dict, posted: bool = True,
+                   stream_fill: Optional[str] = None):
+        self.seen.add((source, key))
+        self.state.mark_seen(source, key, txn.get("date") or date.today().isoformat(),
+                             posted, stream_fill)
+
     # -- Warm-up -----------------------------------------------------------
 
     def warm_up(self):
-        """Load today's existing trades into the seen-set without posting."""
-        logger.info("Warming up — loading today's existing trades...")
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        """
+        Absorb today's trades without posting, for brokerages with no cursor.
+
+        A brokerage with a stored cursor needs no warm-up: the next poll
+        resumes from the cursor and posts what was missed while stopped.
+        """
+        new_sources = [s for s in self._get_clients() if self.state.get_cursor(s) is None]
+        if not new_sources:
+            logger.info("Resuming from stored cursors — no warm-up needed")
+            log_to_db("INFO", "Trade notifier started. Resuming from stored cursors.")
+            return
+
+        logger.info("Warming up — loading today's existing trades for %s...", ", ".join(new_sources))
         total = 0
-
-        for source, client in self._get_clients().items():
-            try:
-                transactions = client.get_transactions(
-                    start_date=today, end_date=datetime.now()
-                )
-                for txn in transactions:
-                    if is_trading_trade(txn):
-                        key = (source, txn.get("brokerage_transaction_id", ""))
-                        self.seen.add(key)
-                        total += 1
-            except Exception as e:
-                logger.warning("Warm-up failed for %s: %s", source, e)
+        for source, transactions in self._fetch_all(new_sources).items():
+            trades = [t for t in transactions if is_trading_trade(t)]
+            for key, txn in zip(trade_keys(trades), trades):
+                self._mark_seen(source, key, txn, posted=False)
+                total += 1
+            self._advance(source, transactions)
 
         logger.info("Warm-up complete — %d trades already seen today", total)
         log_to_db("INFO", f"Trade notifier started. Warm-up loaded {total} existing trades.")
 
     # -- Poll cycle --------------------------------------------------------
 
-    def poll_cycle(self) -> int:
-        """Run one fetch-filter-post cycle. Returns count of new trades posted."""
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        posted = 0
+    def _process(self, source: str, transactions: list, streamed: bool = False) -> int:
+        """
+        Post the unseen trades among transactions. Returns count posted.
 
-        for source, client in self._get_clients().items():
-            try:
-                transactions = client.get_transactions(
-                    start_date=today, end_date=datetime.now()
-                )
-            except Exception as e:
-                logger.warning("API fetch failed for %s: %s", source, e)
+        streamed marks fills pushed from the account stream; they are
+        remembered by fill_key() so the history row of the same fill is
+        not posted again.
+        """
+        posted = 0
+        trades = [t for t in transactions if is_trading_trade(t)]
+        for key, txn in zip(trade_keys(trades), trades):
+            if self._is_seen(source, key):
                 continue
 
-            for txn in transactions:
-                if not is_trading_trade(txn):
+            if streamed:
+                stream_fill = fill_key(txn)
+            else:
+                stream_fill = None
+                if source == STREAM_SOURCE and self.state.claim_stream_fill(source, fill_key(txn)):
+                    # Already posted when the stream pushed it
+                    self._mark_seen(source, key, txn, posted=False)
                     continue
 
-                key = (source, txn.get("brokerage_transaction_id", ""))
-                if key in self.seen:
-                    continue
+            # New trade — mark before posting so a failed post is not retried
+            self._mark_seen(source, key, txn, stream_fill=stream_fill)
+            success = post_to_discord(format_embed(txn, source))
 
-                # New trade — post to Discord
-                self.seen.add(key)
-                embed = format_embed(txn, source)
-                success = post_to_discord(embed)
-
-                if success:
-                    posted += 1
-                    logger.info(
-                        "Posted: %s %s %s @ %s [%s]",
-                        txn.get("transaction_type"),
-                        txn.get("symbol"),
-                        txn.get("quantity"),
-                        txn.get("price"),
-                        source,
-                    )
-                else:
-                    logger.error(
-                        "Failed to post: %s %s [%s]",
-                        txn.get("transaction_type"),
-                        txn.get("symbol"),
-                        source,
-                    )
+            if success:
+                posted += 1
+                logger.info(
+                    "Posted: %s %s %s @ %s [%s]",
+                    txn.get("transaction_type"),
+                    txn.get("symbol"),
+                    txn.get("quantity"),
+                    txn.get("price"),
+                    source,
+                )
+            else:
+                logger.error(
+                    "Failed to post: %s %s [%s]",
+                    txn.get("transaction_type"),
+                    txn.get("symbol"),
+                    source,
+                )
 
+        self._advance(source, transactions)
         return posted
 
+    def poll_cycle(self) -> int:
+        """Run one fetch-filter-post cycle. Returns count of new trades posted."""
+        sources = [s for s in self._get_clients() if not self._is_streamed(s)]
+        results = self._fetch_all(sources)
+
+        posted = 0
+        for source in sources:
+            if source in results:
+                posted += self._process(source, results[source])
+        return posted
+
+    # -- Account stream (Tradier) ------------------------------------------
+
+    def _is_streamed(self, source: str) -> bool:
+        return source == STREAM_SOURCE and self._stream_connected.is_set()
+
+    def start_stream(self) -> bool:
+        """Start the Tradier account event stream in the background."""
+        if STREAM_SOURCE not in self._get_clients():
+            logger.warning("Streaming requested but %s is not configured", STREAM_SOURCE)
+            return False
+
+        try:
+            from src.streaming import TradierStreaming
+            stream = TradierStreaming().subscribe_account_events()
+        except Exception as e:
+            logger.warning("Account stream unavailable, polling %s instead: %s", STREAM_SOURCE, e)
+            return False
+
+        stream.on_order(self._on_order)
+        stream.on_connect(self._stream_connected.set)
+        stream.on_disconnect(self._stream_connected.clear)
+        stream.start(blocking=False)
+        self._stream = stream
+        return True
+
+    def _on_order(self, event):
+        """Stream-thread callback: queue filled orders for the main loop."""
+        if event.status == "filled":
+            self._pushed.put(event.order_id)
+
+    def handle_streamed(self, timeout: float = 0) -> int:
+        """
+        Post streamed fills, waiting up to timeout seconds for them.
+
+        Returns count of trades posted.
+        """
+        deadline = time.monotonic() + timeout
+        posted = 0
+        while True:
+            try:
+                order_id = self._pushed.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                return posted
+            if order_id is None:  # stop() wake-up
+                return posted
+
+            try:
+                order = self._get_clients()[STREAM_SOURCE].get_order(order_id)
+            except Exception as e:
+                logger.warning("Order lookup failed for %s: %s", order_id, e)
+                continue
+            posted += self._process(STREAM_SOURCE, [order_to_trade(order)], streamed=True)
+
     # -- Main loop ---------------------------------------------------------
 
     def start(self):
@@ -330,21 +714,25 @@ class TradeNotifier:
 
         self.running = True
         self.warm_up()
+        if self.streaming:
+            self.start_stream()
 
         logger.info(
-            "Trade notifier running (poll every %ds, market hours %s-%s ET)",
+            "Trade notifier running (poll every %ds, market hours %s-%s ET%s)",
             POLL_INTERVAL_SECONDS,
             MARKET_START.strftime("%H:%M"),
             MARKET_END.strftime("%H:%M"),
+            ", streaming " + STREAM_SOURCE if self._stream else "",
         )
 
         while self.running:
             try:
                 if is_market_hours():
                     new_count = self.poll_cycle()
+                    # Streamed fills are posted as they arrive between polls
+                    new_count += self.handle_streamed(timeout=POLL_INTERVAL_SECONDS)
                     if new_count:
                         logger.info("Cycle complete — %d new trades posted", new_count)
-                    time.sleep(POLL_INTERVAL_SECONDS)
                 else:
                     # Outside market hours — check less frequently
                     time.sleep(OFF_HOURS_CHECK_SECONDS)
@@ -354,12 +742,16 @@ class TradeNotifier:
                 logger.error("Unexpected error in poll loop: %s", e)
                 time.sleep(POLL_INTERVAL_SECONDS)
 
+        if self._stream:
+            self._stream.stop()
+        self.state.close()
         logger.info("Trade notifier stopped.")
         log_to_db("INFO", "Trade notifier stopped.")
 
     def stop(self):
         """Signal the main loop to exit."""
         self.running = False
+        self._pushed.put(None)
 
 
 # ---------------------------------------------------------------------------
@@ -393,13 +785,22 @@ def main():
     parser = argparse.ArgumentParser(description="Discord Trade Notifier Service")
     parser.add_argument("--test", action="store_true", help="Send a test embed and exit")
     parser.add_argument("--once", action="store_true", help="Run one poll cycle and exit")
+    parser.add_argument("--stream", action="store_true", default=STREAMING_ENABLED,
+                        help="Take Tradier fills from the account event stream "
+                             "(default: TRADE_NOTIFIER_STREAMING)")
     args = parser.parse_args()
 
     if args.test:
         success = send_test_embed()
         sys.exit(0 if success else 1)
 
-    notifier = TradeNotifier()
+    if args.once:
+        # Throwaway state, so --once posts today's trades whatever has been posted
+        count = TradeNotifier().poll_cycle()
+        print(f"Posted {count} trades to Discord")
+        sys.exit(0)
+
+    notifier = TradeNotifier(state=NotifierState(DB_PATH), streaming=args.stream)
 
     # Graceful shutdown on SIGINT / SIGTERM
     def handle_signal(signum, frame):
@@ -409,14 +810,6 @@ def main():
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    if args.once:
-        notifier.warm_up()
-        # Clear seen-set so --once actually posts today's trades
-        notifier.seen.clear()
-        count = notifier.poll_cycle()
-        print(f"Posted {count} trades to Discord")
-        sys.exit(0)
-
     notifier.start()
 
 
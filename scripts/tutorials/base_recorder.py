@@ -18,9 +18,7 @@ from scripts.tutorials.config import (
     ensure_output_dirs,
 )
 from scripts.tutorials.html_generator import generate_guide
-from scripts.tutorials.video_composer import (
-    compose_cli_video, add_title_card, add_end_card, check_ffmpeg,
-)
+from scripts.tutorials.video_composer import compose_tutorial_video, check_ffmpeg
 
 
 class TutorialStep:
@@ -52,6 +50,7 @@ class BaseRecorder(ABC):
         self.meta = TUTORIAL_REGISTRY[tutorial_id]
         self.steps = []
         self._frame_paths = []  # For CLI video composition
+        self.video_status = None  # 'built' or 'cached' after generate_video()
 
         ensure_output_dirs()
 
@@ -123,8 +122,8 @@ class BaseRecorder(ABC):
         """
         Generate the video from recorded frames.
 
-        For CLI tutorials, stitches frame PNGs into video.
-        For browser tutorials, this is overridden to handle Playwright video.
+        Title card, frames and end card are encoded in one ffmpeg pass.
+        The video is reused as-is when none of its inputs changed.
         """
         if not check_ffmpeg():
             print("  WARNING: ffmpeg not found, skipping video generation")
@@ -134,17 +133,15 @@ class BaseRecorder(ABC):
             print("  WARNING: No frames recorded, skipping video generation")
             return None
 
-        compose_cli_video(self._frame_paths, self.video_path)
-
-        # Add title and end cards
-        add_title_card(
+        _, rendered = compose_tutorial_video(
+            self._frame_paths,
             self.video_path,
             title=self.meta['title'],
             subtitle='Tovito Trader',
         )
-        add_end_card(self.video_path)
+        self.video_status = 'built' if rendered else 'cached'
 
-        print(f"  Video: {self.video_path}")
+        print(f"  Video: {self.video_path}" + ("" if rendered else " (unchanged, cached)"))
         return self.video_path
 
     def run(self, skip_video=False):
@@ -0,0 +1,152 @@
+"""
+Tutorial Build Farm
+===================
+
+Plans and runs tutorial builds across a process pool.
+
+Each tutorial is an independent build unit, except tutorials that share a
+resource (registry key 'resource', e.g. 'dev_db' for tutorials that drive
+live scripts against the dev database): those are chained into one unit
+and recorded in order.  Units run in parallel, longest first.
+
+Combined with the render cache (terminal frames, annotations and videos
+are keyed by content hash), rebuilding the full set after one tutorial
+changes only re-encodes that tutorial's video.
+
+Usage:
+    from scripts.tutorials.build_farm import run_builds
+
+    results = run_builds(['admin_backup', 'admin_daily_nav'], jobs=4)
+"""
+
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional
+
+from scripts.tutorials.config import TUTORIAL_REGISTRY
+
+
+@dataclass
+class BuildResult:
+    """Outcome of one tutorial build."""
+    tutorial_id: str
+    status: str  # 'built', 'cached', 'guide_only', 'empty' or 'failed'
+    steps: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def get_recorder_class(tutorial_id):
+    """Dynamically import and return the recorder class for a tutorial."""
+    meta = TUTORIAL_REGISTRY[tutorial_id]
+    module_path = meta['module']
+
+    module = importlib.import_module(module_path)
+
+    # Find the recorder class (subclass of BaseRecorder)
+    from scripts.tutorials.base_recorder import BaseRecorder
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (isinstance(attr, type)
+                and issubclass(attr, BaseRecorder)
+                and attr is not BaseRecorder):
+            return attr
+
+    raise RuntimeError(f"No BaseRecorder subclass found in {module_path}")
+
+
+def _estimated_seconds(tutorial_id):
+    """Registry duration ('1:30') in seconds, used to start long units first."""
+    minutes, _, seconds = TUTORIAL_REGISTRY[tutorial_id].get('duration', '0:00').partition(':')
+    try:
+        return int(minutes) * 60 + int(seconds or 0)
+    except ValueError:
+        return 0
+
+
+def plan_builds(tutorial_ids):
+    """
+    Group tutorials into independent build units.
+
+    Returns:
+        List of units (lists of tutorial IDs), longest estimated first.
+        Tutorials sharing a resource keep their given order within a unit.
+    """
+    units = []
+    by_resource = {}
+    for tid in tutorial_ids:
+        resource = TUTORIAL_REGISTRY[tid].get('resource')
+        if resource is None:
+            units.append([tid])
+        elif resource in by_resource:
+            by_resource[resource].append(tid)
+        else:
+            by_resource[resource] = [tid]
+            units.append(by_resource[resource])
+
+    return sorted(units, key=lambda unit: -sum(_estimated_seconds(t) for t in unit))
+
+
+def build_unit(tutorial_ids, skip_video=False):
+    """Build tutorials one after another (runs inside a pool worker)."""
+    results = []
+    for tid in tutorial_ids:
+        started = time.perf_counter()
+        try:
+            recorder = get_recorder_class(tid)(tid)
+            recorder.run(skip_video=skip_video)
+            if not recorder.steps:
+                status = 'empty'
+            elif skip_video or recorder.video_status is None:
+                status = 'guide_only'
+            else:
+                status = recorder.video_status
+            results.append(BuildResult(tid, status, len(recorder.steps),
+                                       round(time.perf_counter() - started, 2)))
+        except Exception as e:
+            results.append(BuildResult(tid, 'failed', 0,
+                                       round(time.perf_counter() - started, 2),
+                                       f"{type(e).__name__}: {e}"))
+    return results
+
+
+def run_builds(tutorial_ids, jobs=None, skip_video=False, executor_factory=None) -> List[BuildResult]:
+    """
+    Build tutorials in parallel.
+
+    Args:
+        tutorial_ids: Tutorials to build
+        jobs: Worker processes (default: CPU count; 1 builds in-process)
+        skip_video: Produce HTML guides only
+        executor_factory: Callable(max_workers) returning an Executor
+            (default: ProcessPoolExecutor)
+
+    Returns:
+        BuildResults in the order of tutorial_ids.
+    """
+    units = plan_builds(tutorial_ids)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(units) or 1))
+
+    results = {}
+    if jobs == 1:
+        for unit in units:
+            for result in build_unit(unit, skip_video):
+                results[result.tutorial_id] = result
+    else:
+        executor_factory = executor_factory or ProcessPoolExecutor
+        with executor_factory(max_workers=jobs) as pool:
+            futures = {pool.submit(build_unit, unit, skip_video): unit for unit in units}
+            for future in as_completed(futures):
+                try:
+                    unit_results = future.result()
+                except Exception as e:
+                    # Worker process died; every tutorial in the unit failed
+                    unit_results = [BuildResult(tid, 'failed', error=f"{type(e).__name__}: {e}")
+                                    for tid in futures[future]]
+                for result in unit_results:
+                    results[result.tutorial_id] = result
+
+    return [results[tid] for tid in tutorial_ids]
@@ -14,6 +14,7 @@ from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from scripts.tutorials import render_cache
 from scripts.tutorials.config import (
     PROJECT_ROOT, DEV_DB_PATH, SCREENSHOT_DIR,
     VIEWPORT_WIDTH, VIEWPORT_HEIGHT,
@@ -120,6 +121,9 @@ def save_terminal_frame(text, output_path, title=None):
     """
     Render terminal text to a PNG file.
 
+    Identical text and title are served from the render cache instead of
+    being drawn again.
+
     Args:
         text: Terminal text content
         output_path: Where to save the PNG
@@ -128,12 +132,18 @@ def save_terminal_frame(text, output_path, title=None):
     Returns:
         Path to the saved image.
     """
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    img = render_terminal_frame(text, title=title)
-    img.save(output_path)
-    return output_path
+    # Pillow's built-in fallback font has no file path (it loads from memory)
+    font_path = getattr(_get_mono_font(TERMINAL_FONT_SIZE), 'path', None)
+    key = render_cache.content_hash(
+        'terminal', text, title, VIEWPORT_WIDTH, VIEWPORT_HEIGHT,
+        TERMINAL_COLS, TERMINAL_BG_COLOR, TERMINAL_FG_COLOR,
+        TERMINAL_FONT_SIZE, TERMINAL_PADDING,
+        font_path if isinstance(font_path, str) else 'default',
+    )
+    return render_cache.cached_image(
+        key, output_path,
+        lambda path: render_terminal_frame(text, title=title).save(path),
+    )
 
 
 class CLIRecorder:
@@ -24,6 +24,9 @@ VIDEO_DIR = OUTPUT_DIR / 'videos'
 GUIDE_DIR = OUTPUT_DIR / 'guides'
 SCREENSHOT_DIR = OUTPUT_DIR / 'screenshots'
 
+# Content-hash cache for rendered frames and composed videos
+CACHE_DIR = OUTPUT_DIR / '.cache'
+
 # Dev database for recordings
 DEV_DB_PATH = PROJECT_ROOT / 'data' / 'dev_tovito.db'
 
@@ -43,6 +46,7 @@ VIDEO_CRF = 28  # H.264 quality (lower = better, 18-28 is typical)
 FRAME_DURATION_SECONDS = 3  # How long each CLI frame shows in video
 TITLE_CARD_DURATION = 3  # Seconds for title card
 END_CARD_DURATION = 2  # Seconds for end card
+VIDEO_FPS = 25  # Output frame rate for composed videos
 
 # Terminal rendering (for CLI tutorials)
 TERMINAL_COLS = 100
@@ -71,6 +75,9 @@ TUTORIAL_REGISTRY = {
         'category': 'admin',
         'duration': '1:30',
         'module': 'scripts.tutorials.admin.tutorial_fund_flow',
+        # Drives live scripts against the dev database: never record in parallel
+        # with another tutorial using the same resource
+        'resource': 'dev_db',
     },
     'admin_daily_nav': {
         'title': 'Running Daily NAV Update',
@@ -78,6 +85,7 @@ TUTORIAL_REGISTRY = {
         'category': 'admin',
         'duration': '0:45',
         'module': 'scripts.tutorials.admin.tutorial_daily_nav',
+        'resource': 'dev_db',
     },
     'admin_close_account': {
         'title': 'Closing an Investor Account',
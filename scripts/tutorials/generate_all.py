@@ -13,6 +13,11 @@ Usage:
     python scripts/tutorials/generate_all.py --skip-video             # Guides only (no ffmpeg needed)
     python scripts/tutorials/generate_all.py --dry-run                # Show what would be generated
     python scripts/tutorials/generate_all.py --deploy                 # Copy to frontend public/
+    python scripts/tutorials/generate_all.py --jobs 1                 # Build one at a time
+
+Tutorials are built in parallel worker processes (see build_farm.py).
+Unchanged frames and videos come from the render cache in
+data/tutorials/.cache; set TUTORIAL_CACHE=off to re-render everything.
 """
 
 import argparse
@@ -32,6 +37,7 @@ from scripts.tutorials.config import (
     FRONTEND_PUBLIC_DIR, DEV_DB_PATH,
     get_tutorials_by_category, ensure_output_dirs, check_ffmpeg,
 )
+from scripts.tutorials.build_farm import plan_builds, run_builds
 
 
 def verify_dependencies(skip_video=False):
@@ -74,25 +80,6 @@ def refresh_dev_database():
         return False
 
 
-def get_recorder_class(tutorial_id):
-    """Dynamically import and return the recorder class for a tutorial."""
-    meta = TUTORIAL_REGISTRY[tutorial_id]
-    module_path = meta['module']
-
-    module = importlib.import_module(module_path)
-
-    # Find the recorder class (subclass of BaseRecorder)
-    from scripts.tutorials.base_recorder import BaseRecorder
-    for attr_name in dir(module):
-        attr = getattr(module, attr_name)
-        if (isinstance(attr, type)
-                and issubclass(attr, BaseRecorder)
-                and attr is not BaseRecorder):
-            return attr
-
-    raise RuntimeError(f"No BaseRecorder subclass found in {module_path}")
-
-
 def generate_metadata_js():
     """Generate the tutorialData.js file for the React frontend."""
     lines = ['// Auto-generated by scripts/tutorials/generate_all.py',
@@ -225,6 +212,10 @@ def main():
         '--no-db-refresh', action='store_true',
         help='Skip dev database refresh',
     )
+    parser.add_argument(
+        '--jobs', type=int, default=None,
+        help='Parallel build processes (default: CPU count)',
+    )
 
     args = parser.parse_args()
 
@@ -252,6 +243,12 @@ def main():
         meta = TUTORIAL_REGISTRY[tid]
         print(f"  [{meta['category']:15s}] {tid}: {meta['title']}")
 
+    units = plan_builds(tutorial_ids)
+    print(f"\nBuild plan: {len(units)} independent unit(s)")
+    for unit in units:
+        if len(unit) > 1:
+            print(f"  In order (shared resource): {' -> '.join(unit)}")
+
     if args.dry_run:
         print("\n(Dry run — no files generated)")
         return
@@ -274,18 +271,16 @@ def main():
 
     # Generate tutorials
     start_time = time.time()
-    success_count = 0
-    fail_count = 0
-
-    for tid in tutorial_ids:
-        try:
-            recorder_class = get_recorder_class(tid)
-            recorder = recorder_class(tid)
-            recorder.run(skip_video=args.skip_video)
-            success_count += 1
-        except Exception as e:
-            print(f"\n  FAILED: {tid}: {e}")
-            fail_count += 1
+    results = run_builds(tutorial_ids, jobs=args.jobs, skip_video=args.skip_video)
+
+    print("\nBuild results:")
+    for r in results:
+        line = f"  {r.tutorial_id:35s} {r.status:10s} {r.steps:3d} steps  {r.seconds:6.1f}s"
+        if r.error:
+            line += f"  FAILED: {r.error}"
+        print(line)
+    success_count = sum(1 for r in results if r.status != 'failed')
+    fail_count = len(results) - success_count
 
     elapsed = time.time() - start_time
 
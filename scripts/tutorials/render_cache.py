@@ -0,0 +1,104 @@
+"""
+Render Cache
+============
+
+Content-hash cache for rendered tutorial images and composed videos.
+
+A render is keyed by a hash of everything that affects its pixels (text,
+source image bytes, sizes, colours, fonts).  On a hit the cached PNG is
+copied to the requested path instead of being drawn again; on a miss the
+image is rendered and stored.  Videos keep a small stamp file holding the
+hash of their inputs, so an unchanged tutorial is not re-encoded.
+
+The cache lives under config.CACHE_DIR and is safe to share between the
+build farm's worker processes (entries are written atomically).  Delete
+the directory, or set TUTORIAL_CACHE=off, to force a full re-render.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from scripts.tutorials import config
+
+# Bump to invalidate every cached render after a drawing-code change
+CACHE_VERSION = 1
+
+
+def enabled():
+    return os.getenv('TUTORIAL_CACHE', 'on').lower() != 'off'
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(*parts):
+    """Stable hash of JSON-serialisable key parts."""
+    payload = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _atomic_copy(src, dest):
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f'{dest.name}.{os.getpid()}.tmp')
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def cached_image(key, output_path, render):
+    """
+    Produce output_path from the cache, or by calling render(output_path).
+
+    Args:
+        key: content_hash() of the render inputs
+        output_path: Where the PNG should end up
+        render: Callable that draws the image to the given path
+
+    Returns:
+        Path to the output image.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if not enabled():
+        render(output_path)
+        return output_path
+
+    cached = config.CACHE_DIR / 'frames' / f'{key}.png'
+    if cached.exists():
+        if cached.resolve() != output_path.resolve():
+            _atomic_copy(cached, output_path)
+        return output_path
+
+    render(output_path)
+    _atomic_copy(output_path, cached)
+    return output_path
+
+
+def _stamp_path(output_path):
+    return config.CACHE_DIR / 'videos' / f'{Path(output_path).name}.sha256'
+
+
+def video_is_current(output_path, key):
+    """True if output_path exists and was built from inputs hashing to key."""
+    if not enabled() or not Path(output_path).exists():
+        return False
+    stamp = _stamp_path(output_path)
+    return stamp.exists() and stamp.read_text(encoding='utf-8').strip() == key
+
+
+def record_video(output_path, key):
+    """Remember the input hash of a freshly composed video."""
+    stamp = _stamp_path(output_path)
+    stamp.parent.mkdir(parents=True, exist_ok=True)
+    tmp = stamp.with_name(f'{stamp.name}.{os.getpid()}.tmp')
+    tmp.write_text(key, encoding='utf-8')
+    os.replace(tmp, stamp)
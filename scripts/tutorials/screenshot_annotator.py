@@ -11,6 +11,7 @@ Uses Pillow to add visual annotations to screenshots:
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
+from scripts.tutorials import render_cache
 from scripts.tutorials.config import (
     CALLOUT_COLOR, CALLOUT_FONT_SIZE,
     ARROW_COLOR, LABEL_BG_COLOR, LABEL_FG_COLOR,
@@ -28,20 +29,8 @@ def _get_font(size):
             return ImageFont.load_default()
 
 
-def add_numbered_callout(image_path, x, y, number, label=None, output_path=None):
-    """
-    Draw a numbered circle callout at (x, y) on the image.
-
-    Args:
-        image_path: Path to source image
-        x, y: Center coordinates for the callout circle
-        number: Number to display inside the circle
-        label: Optional text label displayed near the callout
-        output_path: Where to save. If None, overwrites the source.
-
-    Returns:
-        Path to the annotated image.
-    """
+def _draw_numbered_callout(image_path, x, y, number, label=None, output_path=None):
+    """Draw and save (uncached; see add_numbered_callout)."""
     image_path = Path(image_path)
     output_path = Path(output_path) if output_path else image_path
 
@@ -93,20 +82,38 @@ def add_numbered_callout(image_path, x, y, number, label=None, output_path=None)
     return output_path
 
 
-def add_arrow(image_path, from_xy, to_xy, output_path=None, color=None):
+def add_numbered_callout(image_path, x, y, number, label=None, output_path=None):
     """
-    Draw an arrow from from_xy to to_xy on the image.
+    Draw a numbered circle callout at (x, y) on the image.
 
     Args:
         image_path: Path to source image
-        from_xy: (x, y) start point
-        to_xy: (x, y) end point (arrowhead)
+        x, y: Center coordinates for the callout circle
+        number: Number to display inside the circle
+        label: Optional text label displayed near the callout
         output_path: Where to save. If None, overwrites the source.
-        color: Arrow color tuple (R, G, B). Defaults to ARROW_COLOR.
+
+    Results are served from the render cache when the source image
+    and parameters match an earlier render.
 
     Returns:
         Path to the annotated image.
     """
+    image_path = Path(image_path)
+    output_path = Path(output_path) if output_path else image_path
+    key = render_cache.content_hash(
+        'callout', x, y, number, label, CALLOUT_COLOR, CALLOUT_FONT_SIZE,
+        LABEL_BG_COLOR, LABEL_FG_COLOR, render_cache.file_digest(image_path),
+    )
+    return render_cache.cached_image(
+        key, output_path,
+        lambda path: _draw_numbered_callout(image_path, x, y, number,
+                                            label=label, output_path=path),
+    )
+
+
+def _draw_arrow(image_path, from_xy, to_xy, output_path=None, color=None):
+    """Draw and save (uncached; see add_arrow)."""
     import math
 
     image_path = Path(image_path)
@@ -138,21 +145,38 @@ def add_arrow(image_path, from_xy, to_xy, output_path=None, color=None):
     return output_path
 
 
-def add_label(image_path, x, y, text, output_path=None):
+def add_arrow(image_path, from_xy, to_xy, output_path=None, color=None):
     """
-    Draw a text label with a semi-transparent background at (x, y).
+    Draw an arrow from from_xy to to_xy on the image.
 
     Args:
         image_path: Path to source image
-        x, y: Top-left corner of the label
-        text: Label text
+        from_xy: (x, y) start point
+        to_xy: (x, y) end point (arrowhead)
         output_path: Where to save. If None, overwrites the source.
+        color: Arrow color tuple (R, G, B). Defaults to ARROW_COLOR.
+
+    Results are served from the render cache when the source image
+    and parameters match an earlier render.
 
     Returns:
         Path to the annotated image.
     """
     image_path = Path(image_path)
     output_path = Path(output_path) if output_path else image_path
+    key = render_cache.content_hash(
+        'arrow', from_xy, to_xy, color or ARROW_COLOR, render_cache.file_digest(image_path),
+    )
+    return render_cache.cached_image(
+        key, output_path,
+        lambda path: _draw_arrow(image_path, from_xy, to_xy, output_path=path, color=color),
+    )
+
+
+def _draw_label(image_path, x, y, text, output_path=None):
+    """Draw and save (uncached; see add_label)."""
+    image_path = Path(image_path)
+    output_path = Path(output_path) if output_path else image_path
 
     img = Image.open(image_path).convert('RGBA')
     overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
@@ -175,6 +199,34 @@ def add_label(image_path, x, y, text, output_path=None):
     return output_path
 
 
+def add_label(image_path, x, y, text, output_path=None):
+    """
+    Draw a text label with a semi-transparent background at (x, y).
+
+    Args:
+        image_path: Path to source image
+        x, y: Top-left corner of the label
+        text: Label text
+        output_path: Where to save. If None, overwrites the source.
+
+    Results are served from the render cache when the source image
+    and parameters match an earlier render.
+
+    Returns:
+        Path to the annotated image.
+    """
+    image_path = Path(image_path)
+    output_path = Path(output_path) if output_path else image_path
+    key = render_cache.content_hash(
+        'label', x, y, text, LABEL_BG_COLOR, LABEL_FG_COLOR,
+        render_cache.file_digest(image_path),
+    )
+    return render_cache.cached_image(
+        key, output_path,
+        lambda path: _draw_label(image_path, x, y, text, output_path=path),
+    )
+
+
 def annotate_steps(image_path, annotations, output_path=None):
     """
     Apply multiple annotations to an image.
@@ -6,8 +6,13 @@ Wraps ffmpeg to handle video encoding and composition:
 - Encode Playwright webm recordings to H.264 MP4
 - Stitch CLI terminal frame PNGs into MP4 video
 - Add title and end cards
+- Compose a whole tutorial (title card, frames, end card) in one
+  ffmpeg filter graph: a single decode/encode pass, skipped entirely
+  when the inputs are unchanged (compose_tutorial_video)
 """
 
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -15,12 +20,15 @@ from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from scripts.tutorials import render_cache
 from scripts.tutorials.config import (
-    VIDEO_CRF, VIEWPORT_WIDTH, VIEWPORT_HEIGHT,
+    VIDEO_CRF, VIDEO_FPS, VIEWPORT_WIDTH, VIEWPORT_HEIGHT,
     FRAME_DURATION_SECONDS, TITLE_CARD_DURATION, END_CARD_DURATION,
     check_ffmpeg,
 )
 
+END_CARD_SUBTITLE = "www.tovitotrader.com"
+
 
 def _get_font(size):
     """Get a font, falling back to default if system fonts aren't available."""
@@ -232,7 +240,6 @@ def add_title_card(video_path, title, subtitle=None, duration=None):
     ])
 
     # Replace original
-    import shutil
     shutil.move(output_path, video_path)
 
     # Cleanup
@@ -261,7 +268,7 @@ def add_end_card(video_path, text="Tovito Trader", duration=None):
     duration = duration or END_CARD_DURATION
     video_path = Path(video_path)
 
-    card_path = _create_card_image(text, subtitle="www.tovitotrader.com")
+    card_path = _create_card_image(text, subtitle=END_CARD_SUBTITLE)
 
     card_video = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
     card_video_path = card_video.name
@@ -295,7 +302,6 @@ def add_end_card(video_path, text="Tovito Trader", duration=None):
         output_path,
     ])
 
-    import shutil
     shutil.move(output_path, video_path)
 
     Path(card_path).unlink(missing_ok=True)
@@ -303,3 +309,117 @@ def add_end_card(video_path, text="Tovito Trader", duration=None):
     Path(concat_file.name).unlink(missing_ok=True)
 
     return video_path
+
+
+def build_tutorial_command(segments, output_path, fps=None):
+    """
+    Build the ffmpeg arguments that render still-image segments to one MP4.
+
+    Every segment becomes a looped image input; the filter graph scales and
+    pads each to the viewport, then concatenates them, so the whole video
+    is encoded once with no intermediate files.
+
+    Args:
+        segments: List of (image_path, seconds) in playback order
+        output_path: Path for the MP4
+        fps: Output frame rate (defaults to VIDEO_FPS)
+
+    Returns:
+        List of ffmpeg arguments (without the leading 'ffmpeg -y').
+    """
+    if not segments:
+        raise ValueError("No frames provided")
+    fps = fps or VIDEO_FPS
+
+    args = []
+    filters = []
+    for i, (image_path, seconds) in enumerate(segments):
+        args += ['-loop', '1', '-framerate', str(fps), '-t', f'{seconds:g}',
+                 '-i', str(Path(image_path).resolve())]
+        filters.append(
+            f'[{i}:v]scale={VIEWPORT_WIDTH}:{VIEWPORT_HEIGHT}:force_original_aspect_ratio=decrease,'
+            f'pad={VIEWPORT_WIDTH}:{VIEWPORT_HEIGHT}:(ow-iw)/2:(oh-ih)/2,'
+            f'setsar=1,format=yuv420p[v{i}]'
+        )
+    labels = ''.join(f'[v{i}]' for i in range(len(segments)))
+    filters.append(f'{labels}concat=n={len(segments)}:v=1:a=0[out]')
+
+    return args + [
+        '-filter_complex', ';'.join(filters),
+        '-map', '[out]',
+        '-r', str(fps),
+        '-c:v', 'libx264',
+        '-crf', str(VIDEO_CRF),
+        '-preset', 'medium',
+        '-pix_fmt', 'yuv420p',
+        '-movflags', '+faststart',
+        '-f', 'mp4',
+        str(output_path),
+    ]
+
+
+def _card(text, subtitle, directory):
+    """Render (or fetch from cache) a title/end card into directory."""
+    key = render_cache.content_hash('card', text, subtitle, VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+
+    def render(path):
+        shutil.move(_create_card_image(text, subtitle), path)
+
+    return render_cache.cached_image(key, Path(directory) / f'{key[:16]}.png', render)
+
+
+def compose_tutorial_video(frame_paths, output_path, title, subtitle=None,
+                           end_text="Tovito Trader", frame_duration=None):
+    """
+    Compose title card + frames + end card into one MP4 in a single pass.
+
+    The video is skipped when it already exists and its inputs (frame
+    contents, card text, timings and encoder settings) hash to the same
+    value as the last build.
+
+    Args:
+        frame_paths: List of paths to PNG frame images
+        output_path: Path for the final MP4
+        title: Title card text
+        subtitle: Optional title card subtitle
+        end_text: End card text
+        frame_duration: Seconds per frame (defaults to FRAME_DURATION_SECONDS)
+
+    Returns:
+        Tuple of (output_path, rendered) where rendered is False when the
+        cached video was reused.
+    """
+    if not check_ffmpeg():
+        raise RuntimeError("ffmpeg not found on PATH. Install from https://ffmpeg.org/")
+    if not frame_paths:
+        raise ValueError("No frames provided")
+
+    frame_duration = frame_duration or FRAME_DURATION_SECONDS
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    key = render_cache.content_hash(
+        'video', [render_cache.file_digest(fp) for fp in frame_paths],
+        title, subtitle, end_text, END_CARD_SUBTITLE, frame_duration,
+        TITLE_CARD_DURATION, END_CARD_DURATION,
+        VIDEO_CRF, VIDEO_FPS, VIEWPORT_WIDTH, VIEWPORT_HEIGHT,
+    )
+    if render_cache.video_is_current(output_path, key):
+        return output_path, False
+
+    with tempfile.TemporaryDirectory(prefix='tutorial_cards_') as cards:
+        segments = (
+            [(_card(title, subtitle, cards), TITLE_CARD_DURATION)]
+            + [(fp, frame_duration) for fp in frame_paths]
+            + [(_card(end_text, END_CARD_SUBTITLE, cards), END_CARD_DURATION)]
+        )
+        # Encode next to the target and swap in, so a failed build keeps the old video
+        partial = output_path.with_name(f'{output_path.stem}.part{output_path.suffix}')
+        try:
+            _run_ffmpeg(build_tutorial_command(segments, partial), timeout=600)
+            os.replace(partial, output_path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    render_cache.record_video(output_path, key)
+    return output_path, True
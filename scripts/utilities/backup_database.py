@@ -8,13 +8,20 @@ with optional passphrase-based encryption for sensitive files.
 
 Includes backup verification, rotation, and manifest tracking.
 
+Databases are copied with the SQLite online backup API, so backups are
+consistent even while the API or a pipeline is writing.  --incremental
+stores a page-deduplicated snapshot (see incremental_backup.py): only
+chunks that changed since earlier snapshots are written.
+
 Usage:
     python scripts/utilities/backup_database.py             # Simple DB backup
+    python scripts/utilities/backup_database.py --incremental  # Deduplicated snapshot
     python scripts/utilities/backup_database.py --full       # Full backup (DB only, no passphrase)
     python scripts/utilities/backup_database.py --full --passphrase SECRET  # Full backup with encrypted .env
     python scripts/utilities/backup_database.py --list       # List all backups
     python scripts/utilities/backup_database.py --summary    # Show backup summary
     python scripts/utilities/backup_database.py --verify PATH  # Verify backup integrity
+    python scripts/utilities/backup_database.py --verify PATH --deep  # Also re-hash snapshot chunks
     python scripts/utilities/backup_database.py --rotate     # Rotate old backups
 """
 
@@ -27,6 +34,7 @@ import sqlite3
 import hashlib
 import json
 import base64
+import struct
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
@@ -37,6 +45,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.utils.safe_logging import get_safe_logger
+from scripts.utilities.incremental_backup import IncrementalBackup, online_copy
 
 logger = get_safe_logger(__name__)
 
@@ -49,6 +58,12 @@ SENSITIVE_FILES = [
 # Salt file location for passphrase-based encryption
 SALT_FILE = 'data/backups/.backup_salt'
 
+# Encrypted files are written as a sequence of independently
+# authenticated Fernet tokens so they can be decrypted in constant
+# memory.  Files without the magic header are single-token (legacy).
+ENCRYPTION_MAGIC = b'TVENC2\n'
+ENCRYPTION_CHUNK_BYTES = 1024 * 1024
+
 
 def _derive_key_from_passphrase(passphrase: str, salt: bytes) -> bytes:
     """
@@ -120,6 +135,11 @@ def _encrypt_file(source_path: str, dest_path: str, passphrase: str, salt: bytes
     """
     Encrypt a file using Fernet with a passphrase-derived key.
 
+    The file is streamed in ENCRYPTION_CHUNK_BYTES pieces.  Each piece is
+    its own Fernet token whose plaintext starts with the chunk index and
+    a final-chunk flag, so chunks cannot be reordered or truncated
+    without decryption failing.
+
     Args:
         source_path: Path to the plaintext file
         dest_path: Path to write the encrypted file
@@ -131,19 +151,76 @@ def _encrypt_file(source_path: str, dest_path: str, passphrase: str, salt: bytes
     key = _derive_key_from_passphrase(passphrase, salt)
     fernet = Fernet(key)
 
-    with open(source_path, 'rb') as f:
-        plaintext = f.read()
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        dst.write(ENCRYPTION_MAGIC)
+        index = 0
+        chunk = src.read(ENCRYPTION_CHUNK_BYTES)
+        while True:
+            next_chunk = src.read(ENCRYPTION_CHUNK_BYTES)
+            is_final = not next_chunk
+            token = fernet.encrypt(struct.pack('>QB', index, is_final) + chunk)
+            dst.write(struct.pack('>I', len(token)))
+            dst.write(token)
+            if is_final:
+                break
+            chunk = next_chunk
+            index += 1
 
-    ciphertext = fernet.encrypt(plaintext)
 
-    with open(dest_path, 'wb') as f:
-        f.write(ciphertext)
+def _iter_decrypted_chunks(source_path: str, passphrase: str, salt: bytes):
+    """
+    Yield the plaintext of a file encrypted with _encrypt_file, chunk by chunk.
+
+    Legacy single-token files are decrypted in one piece.
+
+    Args:
+        source_path: Path to the encrypted file
+        passphrase: User passphrase (same as used for encryption)
+        salt: PBKDF2 salt bytes (same as used for encryption)
+
+    Yields:
+        Decrypted bytes, in order
+
+    Raises:
+        cryptography.fernet.InvalidToken: If passphrase is wrong, or the
+            chunk sequence has been reordered or truncated
+    """
+    from cryptography.fernet import Fernet, InvalidToken
+
+    key = _derive_key_from_passphrase(passphrase, salt)
+    fernet = Fernet(key)
+
+    with open(source_path, 'rb') as f:
+        if f.read(len(ENCRYPTION_MAGIC)) != ENCRYPTION_MAGIC:
+            f.seek(0)
+            yield fernet.decrypt(f.read())
+            return
+
+        expected_index = 0
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                raise InvalidToken()  # Ended before the final chunk
+            token = f.read(struct.unpack('>I', header)[0])
+            plaintext = fernet.decrypt(token)
+            index, is_final = struct.unpack('>QB', plaintext[:9])
+            if index != expected_index:
+                raise InvalidToken()
+            yield plaintext[9:]
+            if is_final:
+                if f.read(1):
+                    raise InvalidToken()  # Data after the final chunk
+                return
+            expected_index += 1
 
 
 def _decrypt_file(source_path: str, passphrase: str, salt: bytes) -> bytes:
     """
     Decrypt a file encrypted with _encrypt_file.
 
+    Holds the whole plaintext in memory; use _decrypt_file_to for
+    anything large.
+
     Args:
         source_path: Path to the encrypted file
         passphrase: User passphrase (same as used for encryption)
@@ -155,15 +232,46 @@ def _decrypt_file(source_path: str, passphrase: str, salt: bytes) -> bytes:
     Raises:
         cryptography.fernet.InvalidToken: If passphrase is wrong
     """
-    from cryptography.fernet import Fernet
+    return b''.join(_iter_decrypted_chunks(source_path, passphrase, salt))
 
-    key = _derive_key_from_passphrase(passphrase, salt)
-    fernet = Fernet(key)
 
-    with open(source_path, 'rb') as f:
-        ciphertext = f.read()
+def _decrypt_file_to(source_path: str, dest_path: str, passphrase: str,
+                     salt: bytes) -> dict:
+    """
+    Stream-decrypt a file to dest_path, hashing the plaintext on the way.
 
-    return fernet.decrypt(ciphertext)
+    The plaintext goes to a temp file beside dest_path that is renamed
+    into place only after every chunk has decrypted.
+
+    Args:
+        source_path: Path to the encrypted file
+        dest_path: Path to write the decrypted file
+        passphrase: User passphrase (same as used for encryption)
+        salt: PBKDF2 salt bytes (same as used for encryption)
+
+    Returns:
+        dict with size_bytes and sha256 of the plaintext
+
+    Raises:
+        cryptography.fernet.InvalidToken: If passphrase is wrong
+    """
+    import tempfile
+
+    dest_dir = os.path.dirname(dest_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix='.tmp')
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in _iter_decrypted_chunks(source_path, passphrase, salt):
+                h.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {'size_bytes': size, 'sha256': h.hexdigest()}
 
 
 class DatabaseBackup:
@@ -176,10 +284,14 @@ class DatabaseBackup:
         # Create backup directory if it doesn't exist
         os.makedirs(self.backup_dir, exist_ok=True)
 
-    def create_backup(self) -> dict:
+    def create_backup(self, label: Optional[str] = None) -> dict:
         """
         Create a timestamped backup of the database.
 
+        Args:
+            label: Optional suffix for one-off backups, e.g. 'pre_restore'
+                   gives tovito_backup_<timestamp>_pre_restore.db
+
         Returns:
             dict: Result with status, backup_path, and size
         """
@@ -191,14 +303,13 @@ class DatabaseBackup:
                     'error': f'Database not found: {self.db_path}'
                 }
 
-            # Get database size
-            db_size = os.path.getsize(self.db_path)
-
             # Create timestamp: YYYY-MM-DD_HHMMSS
             timestamp = datetime.now().strftime('%Y-%m-%d_%H%M%S')
 
             # Create backup filename
             backup_filename = f'tovito_backup_{timestamp}.db'
+            if label:
+                backup_filename = f'tovito_backup_{timestamp}_{label}.db'
             backup_path = os.path.join(self.backup_dir, backup_filename)
 
             # Copy database file
@@ -206,7 +317,7 @@ class DatabaseBackup:
             print(f"   Source: {self.db_path}")
             print(f"   Destination: {backup_path}")
 
-            shutil.copy2(self.db_path, backup_path)
+            online_copy(self.db_path, backup_path)
 
             # Verify backup was created
             if not os.path.exists(backup_path):
@@ -215,14 +326,19 @@ class DatabaseBackup:
                     'error': 'Backup file was not created'
                 }
 
-            # Get backup size
+            # Get backup size.  It can legitimately differ from the source
+            # file when the source has un-checkpointed WAL frames, so check
+            # it against the backup's own page count instead.
             backup_size = os.path.getsize(backup_path)
+            conn = sqlite3.connect(backup_path)
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+            conn.close()
 
-            # Verify sizes match
-            if backup_size != db_size:
+            if backup_size != page_size * page_count:
                 return {
                     'status': 'error',
-                    'error': f'Size mismatch: original={db_size}, backup={backup_size}'
+                    'error': f'Size mismatch: pages={page_size * page_count}, backup={backup_size}'
                 }
 
             print(f"[OK] Backup created successfully!")
@@ -257,7 +373,7 @@ class DatabaseBackup:
         """
         Create a full backup including database, .env, and .tastytrade_session.
 
-        The database is copied as-is. Sensitive files (.env, .tastytrade_session)
+        The database is copied with the online backup API. Sensitive files (.env, .tastytrade_session)
         are encrypted with Fernet using a passphrase-derived key (PBKDF2).
 
         Args:
@@ -282,7 +398,7 @@ class DatabaseBackup:
             # --- Step 1: Database backup ---
             if os.path.exists(self.db_path):
                 db_dest = os.path.join(backup_dir_path, 'tovito_backup.db')
-                shutil.copy2(self.db_path, db_dest)
+                online_copy(self.db_path, db_dest)
 
                 db_size = os.path.getsize(db_dest)
                 db_hash = _sha256_file(db_dest)
@@ -375,17 +491,86 @@ class DatabaseBackup:
                 'error': str(e),
             }
 
-    def verify_backup(self, backup_path: str) -> dict:
+    def incremental_engine(self) -> IncrementalBackup:
+        """Snapshot engine rooted at <backup_dir>/incremental."""
+        return IncrementalBackup(
+            self.db_path, os.path.join(self.backup_dir, 'incremental')
+        )
+
+    def create_incremental_backup(self) -> dict:
+        """
+        Create a page-deduplicated snapshot of the database.
+
+        Only chunks that are not already in the chunk store are written,
+        so a daily snapshot of a mostly-unchanged database costs a small
+        fraction of a full copy.
+
+        Returns:
+            dict with status, snapshot_id, manifest_path and stats
+        """
+        try:
+            if not os.path.exists(self.db_path):
+                return {
+                    'status': 'error',
+                    'error': f'Database not found: {self.db_path}'
+                }
+
+            print(f"[BACKUP] Creating incremental snapshot...")
+            print(f"   Source: {self.db_path}")
+
+            engine = self.incremental_engine()
+            manifest = engine.create_snapshot()
+            stats = manifest['stats']
+            manifest_path = str(engine.snapshot_dir / f"{manifest['snapshot_id']}.json")
+
+            print(f"[OK] Snapshot created: {manifest['snapshot_id']}")
+            print(f"   Database size: {manifest['size_bytes']:,} bytes")
+            print(f"   Chunks: {stats['chunks_new']:,} new, "
+                  f"{stats['chunks_reused']:,} reused")
+            print(f"   Stored: {stats['bytes_stored']:,} bytes (compressed)")
+
+            logger.info("Incremental backup created",
+                       snapshot_id=manifest['snapshot_id'],
+                       chunks_new=stats['chunks_new'],
+                       bytes_stored=stats['bytes_stored'])
+
+            return {
+                'status': 'success',
+                'snapshot_id': manifest['snapshot_id'],
+                'manifest_path': manifest_path,
+                'size_bytes': manifest['size_bytes'],
+                'stats': stats,
+                'timestamp': manifest['timestamp'],
+            }
+
+        except Exception as e:
+            try:
+                error_msg = f"Incremental backup failed: {str(e)}"
+            except UnicodeEncodeError:
+                error_msg = f"Incremental backup failed: {ascii(e)}"
+            print(f"[ERROR] {error_msg}")
+            logger.error("Incremental backup failed", error=str(e))
+            return {
+                'status': 'error',
+                'error': str(e)
+            }
+
+    def verify_backup(self, backup_path: str, deep: bool = False) -> dict:
         """
-        Verify the integrity of a backup file or full backup directory.
+        Verify the integrity of a backup file, full backup directory,
+        or incremental snapshot manifest.
 
         For a .db file: runs PRAGMA integrity_check and verifies size > 0.
         For a full backup directory: reads manifest.json, verifies each file
         exists, checks SHA256 checksums, and runs PRAGMA integrity_check on
         the .db file.
+        For a snapshot manifest (.json): checks every chunk is present;
+        with deep=True also re-hashes each chunk.
 
         Args:
-            backup_path: Path to a .db file or a full backup directory
+            backup_path: Path to a .db file, full backup directory, or
+                         snapshot manifest
+            deep: Re-hash snapshot chunks instead of checking presence only
 
         Returns:
             dict with status ('ok' or 'corrupted') and details list
@@ -395,6 +580,13 @@ class DatabaseBackup:
         try:
             backup_path_obj = Path(backup_path)
 
+            # --- Case 0: Incremental snapshot manifest ---
+            if backup_path_obj.is_file() and backup_path_obj.suffix == '.json':
+                engine = IncrementalBackup(
+                    self.db_path, backup_path_obj.parent.parent
+                )
+                return engine.verify_snapshot(backup_path_obj, deep=deep)
+
             # --- Case 1: Single .db file ---
             if backup_path_obj.is_file() and backup_path_obj.suffix == '.db':
                 return self._verify_db_file(str(backup_path_obj))
@@ -536,6 +728,7 @@ class DatabaseBackup:
             removed_count = 0
             freed_bytes = 0
             remaining = []
+            removed_snapshots = False
 
             for i, backup in enumerate(all_backups):
                 # Always keep the oldest backup (baseline)
@@ -551,7 +744,12 @@ class DatabaseBackup:
                     # Remove this backup
                     try:
                         btype = backup.get('type', 'simple')
-                        if btype == 'full' and os.path.isdir(backup['path']):
+                        if btype == 'incremental':
+                            # Chunks are shared; freed space is counted by
+                            # the garbage collection pass below.
+                            os.remove(backup['path'])
+                            removed_snapshots = True
+                        elif btype == 'full' and os.path.isdir(backup['path']):
                             dir_size = self._get_dir_size(backup['path'])
                             shutil.rmtree(backup['path'])
                             freed_bytes += dir_size
@@ -570,6 +768,10 @@ class DatabaseBackup:
                 else:
                     remaining.append(backup)
 
+            if removed_snapshots:
+                gc_result = self.incremental_engine().garbage_collect()
+                freed_bytes += gc_result['freed_bytes']
+
             result = {
                 'removed_count': removed_count,
                 'remaining_count': len(remaining),
@@ -657,6 +859,19 @@ class DatabaseBackup:
                         'type': 'full',
                     })
 
+            # Incremental snapshots (size = compressed bytes they added)
+            incremental_dir = os.path.join(self.backup_dir, 'incremental')
+            if os.path.isdir(incremental_dir):
+                for snapshot in self.incremental_engine().list_snapshots():
+                    backups.append({
+                        'filename': snapshot['snapshot_id'],
+                        'path': snapshot['path'],
+                        'size_bytes': snapshot['stats']['bytes_stored'],
+                        'logical_size_bytes': snapshot['size_bytes'],
+                        'modified': datetime.fromisoformat(snapshot['created_at']),
+                        'type': 'incremental',
+                    })
+
             # Sort by modified date (newest first)
             backups.sort(key=lambda x: x['modified'], reverse=True)
 
@@ -699,11 +914,15 @@ class DatabaseBackup:
             size_kb = backup['size_bytes'] / 1024
             total_size += backup['size_bytes']
             btype = backup.get('type', 'simple')
-            type_label = '[FULL]' if btype == 'full' else '[DB]'
+            type_label = {'full': '[FULL]', 'incremental': '[INCR]'}.get(btype, '[DB]')
 
             print(f"  {type_label} {backup['filename']}")
             print(f"   Date: {backup['modified'].strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"   Size: {size_kb:.1f} KB")
+            if btype == 'incremental':
+                print(f"   Size: {size_kb:.1f} KB new "
+                      f"({backup['logical_size_bytes'] / 1024:.1f} KB database)")
+            else:
+                print(f"   Size: {size_kb:.1f} KB")
             print()
 
         print(f"{'='*70}")
@@ -720,13 +939,17 @@ def main():
     parser.add_argument('--list', action='store_true', help='List all backups')
     parser.add_argument('--summary', action='store_true', help='Show backup summary')
     parser.add_argument('--full', action='store_true', help='Create full backup (DB + .env + session)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Create a page-deduplicated incremental snapshot')
     parser.add_argument('--passphrase', type=str, default=None,
                         help='Passphrase for encrypting sensitive files in full backup')
     parser.add_argument('--rotate', action='store_true', help='Rotate old backups')
     parser.add_argument('--keep', type=int, default=30,
                         help='Number of backups to keep during rotation (default: 30)')
     parser.add_argument('--verify', type=str, default=None, metavar='PATH',
-                        help='Verify integrity of a backup file or directory')
+                        help='Verify integrity of a backup file, directory, or snapshot manifest')
+    parser.add_argument('--deep', action='store_true',
+                        help='With --verify on a snapshot: re-hash every chunk')
 
     args = parser.parse_args()
 
@@ -737,7 +960,7 @@ def main():
 
     elif args.verify:
         print(f"[VERIFY] Checking backup: {args.verify}")
-        result = backup_manager.verify_backup(args.verify)
+        result = backup_manager.verify_backup(args.verify, deep=args.deep)
         for detail in result.get('details', []):
             print(f"   {detail}")
         if result['status'] == 'ok':
@@ -751,6 +974,15 @@ def main():
         print(f"[ROTATE] Running backup rotation (keep={args.keep}, keep_days=90)...")
         backup_manager.rotate_backups(keep_count=args.keep, keep_days=90)
 
+    elif args.incremental:
+        result = backup_manager.create_incremental_backup()
+        if result['status'] == 'success':
+            print(f"\n[OK] Incremental backup complete!")
+            sys.exit(0)
+        else:
+            print(f"\n[ERROR] Incremental backup failed: {result.get('error')}")
+            sys.exit(1)
+
     elif args.full:
         result = backup_manager.create_full_backup(passphrase=args.passphrase)
         if result['status'] == 'success':
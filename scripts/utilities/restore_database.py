@@ -4,29 +4,39 @@ Database Restore Script
 
 Restores the Tovito database from a backup file or full backup directory.
 Always creates a safety backup of the current database before restoring.
+Backups are streamed into a staging file beside the target, checksummed
+and integrity-checked there, then atomically renamed into place.
 
 Supports restoring:
   - Simple .db backups (database only)
   - Full backup directories (database + encrypted .env + session)
+  - Incremental snapshots (snapshot manifest .json), including
+    point-in-time restore of the newest snapshot at or before --as-of
 
 Usage:
     python scripts/utilities/restore_database.py --list                # List available backups
     python scripts/utilities/restore_database.py --restore PATH        # Restore from specific backup
     python scripts/utilities/restore_database.py --latest              # Restore from most recent backup
     python scripts/utilities/restore_database.py --verify PATH         # Verify backup integrity only
+    python scripts/utilities/restore_database.py --verify-only         # Verify every backup concurrently
+    python scripts/utilities/restore_database.py --verify-only DIR --workers 8
     python scripts/utilities/restore_database.py --full DIR --passphrase X  # Full restore (DB + .env)
     python scripts/utilities/restore_database.py --restore PATH --target data/other.db  # Custom target
+    python scripts/utilities/restore_database.py --as-of "2026-03-01 18:00"  # Point-in-time (snapshots)
 """
 
 import warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
 import os
-import shutil
-import sqlite3
 import json
+import time
+import hashlib
 import tempfile
+import tracemalloc
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -39,6 +49,33 @@ from src.utils.safe_logging import get_safe_logger
 
 logger = get_safe_logger(__name__)
 
+# Read size for streaming a backup into the staging file
+RESTORE_BLOCK_BYTES = 1024 * 1024
+
+
+def _iter_file_blocks(path: str, block_bytes: int = RESTORE_BLOCK_BYTES):
+    """Yield a file's contents in block_bytes pieces."""
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                return
+            yield block
+
+
+@contextmanager
+def _report_resources(label: str):
+    """Print wall time and peak Python heap for the enclosed block."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"[STATS] {label}: {time.perf_counter() - started:.2f}s, "
+              f"peak Python memory {peak / 1024 / 1024:.1f} MB")
+
 
 class DatabaseRestore:
     """Handle database restoration from backups"""
@@ -60,6 +97,7 @@ class DatabaseRestore:
         """
         from scripts.utilities.backup_database import DatabaseBackup
         backup_mgr = DatabaseBackup()
+        backup_mgr.backup_dir = self.backup_dir
         return backup_mgr.list_backups()
 
     def restore_database(self, backup_path: str,
@@ -68,126 +106,303 @@ class DatabaseRestore:
         Restore a database from a backup file or full backup directory.
 
         Steps:
-          1. Create a safety backup of the current database
-          2. Verify the backup file integrity (PRAGMA integrity_check)
-          3. Copy backup to target path
-          4. Run PRAGMA integrity_check on the restored copy
+          1. Create a safety backup of the current database (in the
+             background, while step 2 runs)
+          2. Stream the backup into a staging file beside the target,
+             computing its SHA256 on the way and checking it against the
+             full-backup or snapshot manifest when there is one
+          3. Run PRAGMA integrity_check on the staged copy (worker thread)
+          4. Atomically rename the staged copy over the target
+
+        The target is never partially written: if any step fails the
+        staging file is removed and the current database is untouched.
 
         Args:
-            backup_path: Path to a .db file or a full backup directory
-                         (will look for tovito_backup.db inside it)
+            backup_path: Path to a .db file, a full backup directory
+                         (will look for tovito_backup.db inside it), or
+                         an incremental snapshot manifest (.json)
             target_path: Where to restore to. Defaults to data/tovito.db
 
         Returns:
-            dict with status, safety_backup_path, restored_from
+            dict with status, safety_backup_path, restored_from, sha256,
+            size_bytes, seconds and throughput_mb_s (plus snapshot_id for
+            snapshot restores)
         """
         if target_path is None:
             target_path = self.db_path
 
         try:
-            # Resolve the actual .db file to restore from
-            source_db = self._resolve_db_path(backup_path)
-            if source_db is None:
-                return {
-                    'status': 'error',
-                    'error': f'No database file found at: {backup_path}',
-                }
+            snapshot_id = None
+            if Path(backup_path).suffix == '.json':
+                from scripts.utilities.incremental_backup import IncrementalBackup
+                engine = IncrementalBackup(self.db_path, Path(backup_path).parent.parent)
+                manifest = engine.load_manifest(backup_path)
+                snapshot_id = manifest['snapshot_id']
+                source = str(backup_path)
+                blocks = engine.iter_snapshot(manifest)
+                expected_sha256 = manifest['sha256']
+            else:
+                # Resolve the actual .db file to restore from
+                source = self._resolve_db_path(backup_path)
+                if source is None:
+                    return {
+                        'status': 'error',
+                        'error': f'No database file found at: {backup_path}',
+                    }
+                blocks = _iter_file_blocks(source)
+                expected_sha256 = self._manifest_sha256(source)
 
-            print(f"[RESTORE] Restoring database...")
-            print(f"   Source: {source_db}")
-            print(f"   Target: {target_path}")
+            result = self._stream_restore(source, blocks, expected_sha256, target_path)
+            if snapshot_id is not None:
+                result['snapshot_id'] = snapshot_id
+            return result
 
-            # --- Step 1: Safety backup of current database ---
-            safety_backup_path = None
-            if os.path.exists(target_path):
-                print(f"   [STEP 1] Creating safety backup of current database...")
-                from scripts.utilities.backup_database import DatabaseBackup
-                backup_mgr = DatabaseBackup()
-                safety_result = backup_mgr.create_backup()
-                if safety_result['status'] == 'success':
-                    safety_backup_path = safety_result['backup_path']
-                    print(f"   [OK] Safety backup: {safety_backup_path}")
+        except Exception as e:
+            try:
+                msg = str(e)
+            except UnicodeEncodeError:
+                msg = ascii(e)
+            print(f"[ERROR] Restore failed: {msg}")
+            logger.error("Database restore failed", error=str(e))
+            return {
+                'status': 'error',
+                'error': str(e),
+            }
+
+    def _stream_restore(self, source: str, blocks, expected_sha256: Optional[str],
+                        target_path: str) -> dict:
+        """
+        Stage, verify and swap in a database; see restore_database().
+
+        Args:
+            source: Backup path, for messages and the result
+            blocks: Iterable of bytes making up the database file
+            expected_sha256: Checksum the streamed bytes must match, or None
+            target_path: Where to restore to
+
+        Returns:
+            restore_database() result dict
+        """
+        from scripts.utilities.backup_database import DatabaseBackup
+
+        print(f"[RESTORE] Restoring database...")
+        print(f"   Source: {source}")
+        print(f"   Target: {target_path}")
+
+        target_dir = os.path.dirname(target_path) or '.'
+        os.makedirs(target_dir, exist_ok=True)
+        verify_mgr = DatabaseBackup()
+        started = time.perf_counter()
+
+        fd, staged_path = tempfile.mkstemp(dir=target_dir, prefix='.restore_', suffix='.db')
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                # --- Step 1: Safety backup of current database ---
+                safety_future = None
+                if os.path.exists(target_path):
+                    print(f"   [STEP 1] Creating safety backup of current database (background)...")
+                    safety_future = pool.submit(self._safety_backup, target_path)
                 else:
+                    print(f"   [STEP 1] No existing database at target -- skipping safety backup")
+
+                # --- Step 2: Stream backup into staging file ---
+                print(f"   [STEP 2] Streaming backup to staging file...")
+                file_hash = hashlib.sha256()
+                size = 0
+                with os.fdopen(fd, 'wb') as out:
+                    for block in blocks:
+                        file_hash.update(block)
+                        size += len(block)
+                        out.write(block)
+                digest = file_hash.hexdigest()
+
+                # --- Step 3: Integrity check of staged copy (worker thread) ---
+                verify_future = None
+                if expected_sha256 is None or digest == expected_sha256:
+                    print(f"   [STEP 3] Verifying staged copy...")
+                    verify_future = pool.submit(verify_mgr._verify_db_file, staged_path)
+
+                safety_result = safety_future.result() if safety_future else None
+                verify_result = verify_future.result() if verify_future else None
+
+            safety_backup_path = None
+            if safety_result is not None:
+                if safety_result['status'] != 'success':
                     print(f"   [ERROR] Safety backup failed: {safety_result.get('error')}")
                     print(f"   Aborting restore to prevent data loss.")
                     return {
                         'status': 'error',
                         'error': f"Safety backup failed: {safety_result.get('error')}",
                     }
-            else:
-                print(f"   [STEP 1] No existing database at target -- skipping safety backup")
+                safety_backup_path = safety_result['backup_path']
+                print(f"   [OK] Safety backup: {safety_backup_path}")
 
-            # --- Step 2: Verify backup file integrity ---
-            print(f"   [STEP 2] Verifying backup integrity...")
-            from scripts.utilities.backup_database import DatabaseBackup
-            verify_mgr = DatabaseBackup()
-            verify_result = verify_mgr.verify_backup(source_db)
-            if verify_result['status'] != 'ok':
-                print(f"   [ERROR] Backup verification failed:")
-                for detail in verify_result.get('details', []):
-                    print(f"      {detail}")
-                print(f"   Aborting restore -- backup may be corrupted.")
+            if verify_future is None:
+                print(f"   [ERROR] Checksum mismatch -- backup may be corrupted.")
                 return {
                     'status': 'error',
-                    'error': 'Backup verification failed',
-                    'details': verify_result.get('details', []),
+                    'error': 'Backup checksum does not match manifest',
                     'safety_backup_path': safety_backup_path,
                 }
+            if expected_sha256 is not None:
+                print(f"   [OK] SHA256 matches manifest")
 
             for detail in verify_result.get('details', []):
                 print(f"      {detail}")
-            print(f"   [OK] Backup integrity verified")
-
-            # --- Step 3: Copy backup to target ---
-            print(f"   [STEP 3] Copying backup to target...")
-            target_dir = os.path.dirname(target_path)
-            if target_dir:
-                os.makedirs(target_dir, exist_ok=True)
-            shutil.copy2(source_db, target_path)
-            print(f"   [OK] Database restored to: {target_path}")
-
-            # --- Step 4: Verify restored copy ---
-            print(f"   [STEP 4] Verifying restored database...")
-            post_result = verify_mgr.verify_backup(target_path)
-            if post_result['status'] != 'ok':
-                print(f"   [ERROR] Restored database failed verification:")
-                for detail in post_result.get('details', []):
-                    print(f"      {detail}")
-                print(f"   [WARN] The restored file may be corrupted.")
-                print(f"   Safety backup available at: {safety_backup_path}")
+            if verify_result['status'] != 'ok':
+                print(f"   [ERROR] Backup verification failed.")
+                print(f"   Aborting restore -- backup may be corrupted.")
                 return {
                     'status': 'error',
-                    'error': 'Post-restore verification failed',
+                    'error': 'Backup verification failed',
+                    'details': verify_result.get('details', []),
                     'safety_backup_path': safety_backup_path,
-                    'restored_from': source_db,
                 }
+            print(f"   [OK] Staged copy passed integrity check")
+
+            # --- Step 4: Atomic swap ---
+            print(f"   [STEP 4] Swapping restored database into place...")
+            for suffix in ('-wal', '-shm', '-journal'):
+                # Stale sidecar files from the old database would be
+                # replayed against the restored one on next open.
+                if os.path.exists(target_path + suffix):
+                    os.remove(target_path + suffix)
+            os.replace(staged_path, target_path)
+        finally:
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+
+        seconds = time.perf_counter() - started
+        throughput = size / 1024 / 1024 / seconds if seconds > 0 else 0.0
+        print(f"   [OK] Database restored to: {target_path}")
+        print(f"[OK] Database restore complete! "
+              f"({size / 1024 / 1024:.1f} MB in {seconds:.2f}s, {throughput:.1f} MB/s)")
+
+        logger.info("Database restored successfully",
+                   restored_from=source,
+                   target=target_path)
+
+        return {
+            'status': 'success',
+            'safety_backup_path': safety_backup_path,
+            'restored_from': source,
+            'target_path': target_path,
+            'sha256': digest,
+            'size_bytes': size,
+            'seconds': seconds,
+            'throughput_mb_s': throughput,
+        }
+
+    def _safety_backup(self, target_path: str) -> dict:
+        """Back up the database about to be overwritten into backup_dir."""
+        from scripts.utilities.backup_database import DatabaseBackup
+        backup_mgr = DatabaseBackup()
+        backup_mgr.db_path = target_path
+        backup_mgr.backup_dir = self.backup_dir
+        return backup_mgr.create_backup(label='pre_restore')
+
+    def _manifest_sha256(self, source_db: str) -> Optional[str]:
+        """
+        Checksum recorded for source_db in its full backup's manifest.json.
+
+        Returns:
+            The SHA256 hex digest, or None for simple .db backups
+        """
+        manifest_path = Path(source_db).parent / 'manifest.json'
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for file_entry in manifest.get('files', []):
+            if file_entry.get('filename') == Path(source_db).name:
+                return file_entry.get('sha256')
+        return None
+
+    def verify_all_backups(self, backup_dir: Optional[str] = None,
+                           workers: Optional[int] = None) -> dict:
+        """
+        Verify every backup in backup_dir concurrently, without restoring.
 
-            print(f"   [OK] Restored database passed integrity check")
-            print(f"[OK] Database restore complete!")
+        Simple .db backups get PRAGMA integrity_check, full backups get
+        manifest checksums plus integrity_check, and incremental
+        snapshots get a deep (re-hash every chunk) verification.
+        Hashing and SQLite both release the GIL, so threads overlap well.
 
-            logger.info("Database restored successfully",
-                       restored_from=source_db,
-                       target=target_path)
+        Args:
+            backup_dir: Directory to scan. Defaults to data/backups
+            workers: Concurrent verifications (default: min(4, CPU count))
+
+        Returns:
+            dict with status ('ok' or 'corrupted'), results (one per
+            backup), checked, failed, bytes_verified, seconds,
+            throughput_mb_s
+        """
+        from scripts.utilities.backup_database import DatabaseBackup
 
+        verify_mgr = DatabaseBackup()
+        verify_mgr.backup_dir = backup_dir or self.backup_dir
+        backups = verify_mgr.list_backups()
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+
+        def check(backup):
+            started = time.perf_counter()
+            result = verify_mgr.verify_backup(backup['path'], deep=True)
             return {
-                'status': 'success',
-                'safety_backup_path': safety_backup_path,
-                'restored_from': source_db,
-                'target_path': target_path,
+                'filename': backup['filename'],
+                'path': backup['path'],
+                'type': backup.get('type', 'simple'),
+                'status': result['status'],
+                'details': result.get('details', []),
+                'size_bytes': backup.get('logical_size_bytes', backup['size_bytes']),
+                'seconds': time.perf_counter() - started,
             }
 
-        except Exception as e:
-            try:
-                msg = str(e)
-            except UnicodeEncodeError:
-                msg = ascii(e)
-            print(f"[ERROR] Restore failed: {msg}")
-            logger.error("Database restore failed", error=str(e))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(check, backups))
+        seconds = time.perf_counter() - started
+
+        failed = [r for r in results if r['status'] != 'ok']
+        total_bytes = sum(r['size_bytes'] for r in results)
+        return {
+            'status': 'ok' if not failed else 'corrupted',
+            'results': results,
+            'checked': len(results),
+            'failed': len(failed),
+            'bytes_verified': total_bytes,
+            'seconds': seconds,
+            'throughput_mb_s': total_bytes / 1024 / 1024 / seconds if seconds > 0 else 0.0,
+        }
+
+    def restore_as_of(self, when: datetime,
+                      target_path: Optional[str] = None) -> dict:
+        """
+        Point-in-time restore: newest incremental snapshot at or before when.
+
+        Args:
+            when: Point in time to restore to
+            target_path: Where to restore to. Defaults to data/tovito.db
+
+        Returns:
+            restore_database() result dict
+        """
+        from scripts.utilities.incremental_backup import IncrementalBackup
+
+        engine = IncrementalBackup(
+            self.db_path, os.path.join(self.backup_dir, 'incremental')
+        )
+        snapshot = engine.snapshot_as_of(when)
+        if snapshot is None:
             return {
                 'status': 'error',
-                'error': str(e),
+                'error': f'No snapshot at or before {when.isoformat(sep=" ")}',
             }
 
+        print(f"[INFO] Snapshot for {when.isoformat(sep=' ')}: "
+              f"{snapshot['snapshot_id']} (taken {snapshot['created_at']})")
+        return self.restore_database(snapshot['path'], target_path=target_path)
+
     def restore_env(self, backup_dir: str, passphrase: str) -> dict:
         """
         Decrypt and inspect the .env backup from a full backup directory.
@@ -214,7 +429,7 @@ class DatabaseRestore:
             print(f"[RESTORE] Decrypting .env backup...")
 
             # Load salt
-            from scripts.utilities.backup_database import _decrypt_file, _get_or_create_salt, SALT_FILE
+            from scripts.utilities.backup_database import _decrypt_file_to, SALT_FILE
             salt_path = PROJECT_ROOT / SALT_FILE
             if not salt_path.exists():
                 return {
@@ -224,28 +439,24 @@ class DatabaseRestore:
                 }
             salt = salt_path.read_bytes()
 
-            # Decrypt
+            # Decrypt straight to the output file
+            decrypted_dir = os.path.join(backup_dir, 'decrypted')
+            os.makedirs(decrypted_dir, exist_ok=True)
+            decrypted_path = os.path.join(decrypted_dir, 'env_restored')
             try:
-                decrypted_bytes = _decrypt_file(enc_file, passphrase, salt)
+                _decrypt_file_to(enc_file, decrypted_path, passphrase, salt)
             except Exception:
                 return {
                     'status': 'error',
                     'error': 'Decryption failed -- wrong passphrase or corrupted file.',
                 }
 
-            # Write decrypted content to a temp file
-            decrypted_dir = os.path.join(backup_dir, 'decrypted')
-            os.makedirs(decrypted_dir, exist_ok=True)
-            decrypted_path = os.path.join(decrypted_dir, 'env_restored')
-            with open(decrypted_path, 'wb') as f:
-                f.write(decrypted_bytes)
-
             print(f"   [OK] Decrypted .env written to: {decrypted_path}")
 
             # Parse and compare
             changes = self._compare_env_files(
                 current_path=os.path.join(str(PROJECT_ROOT), '.env'),
-                backup_content=decrypted_bytes.decode('utf-8', errors='replace'),
+                backup_content=self._read_file_safe(decrypted_path),
             )
 
             if changes:
@@ -314,16 +525,14 @@ class DatabaseRestore:
             print(f"[INFO] Encrypted .tastytrade_session backup found: {session_enc}")
             print(f"   To decrypt, use the same passphrase with the backup_database module.")
             try:
-                from scripts.utilities.backup_database import _decrypt_file, SALT_FILE
+                from scripts.utilities.backup_database import _decrypt_file_to, SALT_FILE
                 salt_path = PROJECT_ROOT / SALT_FILE
                 if salt_path.exists():
                     salt = salt_path.read_bytes()
-                    decrypted_bytes = _decrypt_file(session_enc, passphrase, salt)
                     decrypted_dir = os.path.join(backup_dir, 'decrypted')
                     os.makedirs(decrypted_dir, exist_ok=True)
                     session_dest = os.path.join(decrypted_dir, 'tastytrade_session_restored')
-                    with open(session_dest, 'wb') as f:
-                        f.write(decrypted_bytes)
+                    _decrypt_file_to(session_enc, session_dest, passphrase, salt)
                     print(f"   [OK] Decrypted session written to: {session_dest}")
                     print(f"   To restore, copy to: {os.path.join(str(PROJECT_ROOT), '.tastytrade_session')}")
                     session_result = {'status': 'success', 'decrypted_path': session_dest}
@@ -459,7 +668,7 @@ def _print_backup_list(backups: list):
 
     for i, backup in enumerate(backups, 1):
         btype = backup.get('type', 'simple')
-        type_label = '[FULL]' if btype == 'full' else '[DB]  '
+        type_label = {'full': '[FULL]', 'incremental': '[INCR]'}.get(btype, '[DB]  ')
         size_kb = backup['size_bytes'] / 1024
         date_str = backup['modified'].strftime('%Y-%m-%d %H:%M:%S')
 
@@ -473,6 +682,31 @@ def _print_backup_list(backups: list):
     print(f"{'='*70}\n")
 
 
+def _print_verify_report(result: dict):
+    """Pretty-print the result of verify_all_backups()."""
+    if not result['results']:
+        print("[INFO] No backups found")
+        return
+
+    print(f"\n{'='*70}")
+    print("BACKUP VERIFICATION")
+    print(f"{'='*70}\n")
+
+    for r in result['results']:
+        label = '[OK]   ' if r['status'] == 'ok' else '[ERROR]'
+        print(f"  {label} {r['filename']}  ({r['type']}, "
+              f"{r['size_bytes'] / 1024 / 1024:.1f} MB, {r['seconds']:.2f}s)")
+        if r['status'] != 'ok':
+            for detail in r['details']:
+                print(f"      {detail}")
+
+    print(f"\n{'='*70}")
+    print(f"Checked: {result['checked']}  |  Failed: {result['failed']}  |  "
+          f"{result['bytes_verified'] / 1024 / 1024:.1f} MB in {result['seconds']:.2f}s "
+          f"({result['throughput_mb_s']:.1f} MB/s)")
+    print(f"{'='*70}\n")
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -490,8 +724,18 @@ def main():
                         help='Passphrase for decrypting sensitive files in full restore')
     parser.add_argument('--verify', type=str, default=None, metavar='PATH',
                         help='Verify backup integrity without restoring')
+    parser.add_argument('--verify-only', type=str, nargs='?', const='', default=None,
+                        metavar='DIR',
+                        help='Verify every backup in DIR (default: data/backups) '
+                             'concurrently without restoring')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Concurrent verifications for --verify-only '
+                             '(default: min(4, CPU count))')
     parser.add_argument('--target', type=str, default=None, metavar='PATH',
                         help='Custom restore target path (default: data/tovito.db)')
+    parser.add_argument('--as-of', type=str, default=None, metavar='DATETIME',
+                        help='Point-in-time restore from the newest snapshot at or before '
+                             'DATETIME (e.g. "2026-03-01 18:00")')
 
     args = parser.parse_args()
 
@@ -515,6 +759,34 @@ def main():
             print(f"[ERROR] Backup is corrupted or invalid")
             sys.exit(1)
 
+    elif args.verify_only is not None:
+        backup_dir = args.verify_only or restore_mgr.backup_dir
+        print(f"[VERIFY] Checking every backup in: {backup_dir}")
+        with _report_resources('Verification'):
+            result = restore_mgr.verify_all_backups(backup_dir, workers=args.workers)
+        _print_verify_report(result)
+        sys.exit(0 if result['status'] == 'ok' else 1)
+
+    elif args.as_of:
+        try:
+            when = datetime.fromisoformat(args.as_of)
+        except ValueError:
+            print(f"[ERROR] Invalid --as-of value: {args.as_of}")
+            print("   Use YYYY-MM-DD or YYYY-MM-DD HH:MM[:SS]")
+            sys.exit(1)
+        if len(args.as_of) == 10:
+            when = when.replace(hour=23, minute=59, second=59)  # End of that day
+
+        with _report_resources('Restore'):
+            result = restore_mgr.restore_as_of(when, target_path=args.target)
+
+        if result['status'] == 'success':
+            print(f"\n[OK] Restore complete!")
+            sys.exit(0)
+        else:
+            print(f"\n[ERROR] Restore failed: {result.get('error')}")
+            sys.exit(1)
+
     elif args.latest:
         backups = restore_mgr.list_available_backups()
         if not backups:
@@ -528,10 +800,11 @@ def main():
         print(f"   Size: {latest['size_bytes'] / 1024:.1f} KB")
         print()
 
-        result = restore_mgr.restore_database(
-            latest['path'],
-            target_path=args.target,
-        )
+        with _report_resources('Restore'):
+            result = restore_mgr.restore_database(
+                latest['path'],
+                target_path=args.target,
+            )
 
         if result['status'] == 'success':
             print(f"\n[OK] Restore complete!")
@@ -550,7 +823,8 @@ def main():
             print(f"[ERROR] Not a directory: {args.full}")
             sys.exit(1)
 
-        result = restore_mgr.restore_full(args.full, args.passphrase)
+        with _report_resources('Restore'):
+            result = restore_mgr.restore_full(args.full, args.passphrase)
 
         if result['status'] == 'success':
             print(f"\n[OK] Full restore complete!")
@@ -567,10 +841,11 @@ def main():
             print(f"[ERROR] Backup path not found: {args.restore}")
             sys.exit(1)
 
-        result = restore_mgr.restore_database(
-            args.restore,
-            target_path=args.target,
-        )
+        with _report_resources('Restore'):
+            result = restore_mgr.restore_database(
+                args.restore,
+                target_path=args.target,
+            )
 
         if result['status'] == 'success':
             print(f"\n[OK] Restore complete!")
@@ -262,6 +262,35 @@ class TastyTradeClient:
             account.get_history(session, start_date=sd, end_date=ed)
         )
 
+        normalized = self._normalize_transactions(transactions)
+        logger.info("TastyTrade transactions fetched: %d records", len(normalized))
+        return normalized
+
+    def get_transactions_since(self, since):
+        """
+        Get normalized transactions executed at or after a point in time.
+
+        Lets incremental readers (the Discord trade notifier) ask only for
+        activity after the last one they saw instead of re-reading the day.
+
+        Args:
+            since: datetime of the last execution already seen
+
+        Returns:
+            list of dicts in the get_transactions() format
+        """
+        session = self._get_session()
+        account = self._get_account()
+
+        transactions = self._run_async(
+            account.get_history(session, start_at=since)
+        )
+        normalized = self._normalize_transactions(transactions)
+        logger.info("TastyTrade transactions since %s: %d records", since, len(normalized))
+        return normalized
+
+    def _normalize_transactions(self, transactions):
+        """Convert SDK transaction objects to the standard format."""
         normalized = []
         for txn in transactions:
             txn_type = self._map_transaction_type(txn)
@@ -300,9 +329,9 @@ class TastyTradeClient:
                 'brokerage_transaction_id': str(txn.id) if hasattr(txn, 'id') else '',
                 'category': category,
                 'subcategory': subcategory,
+                'executed_at': txn.executed_at.isoformat() if hasattr(txn, 'executed_at') and txn.executed_at else None,
             })
 
-        logger.info("TastyTrade transactions fetched: %d records", len(normalized))
         return normalized
 
     def get_raw_transactions(self, start_date=None, end_date=None):
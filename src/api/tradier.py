@@ -161,7 +161,30 @@ class TradierClient:
             
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch history: {str(e)}")
-    
+
+    def get_order(self, order_id) -> Dict:
+        """
+        Get one order by ID (symbol, side, fill quantity and price)
+
+        Account stream events only carry the order ID and status, so
+        this fills in the details of a streamed fill.
+
+        Args:
+            order_id: Tradier order ID
+
+        Returns:
+            dict: Order fields as returned by Tradier
+        """
+        url = f"{self.base_url}/accounts/{self.account_id}/orders/{order_id}"
+
+        try:
+            response = requests.get(url, headers=self.headers)
+            response.raise_for_status()
+            return response.json().get('order', {}) or {}
+
+        except requests.RequestException as e:
+            raise Exception(f"Failed to fetch order {order_id}: {str(e)}")
+
     def get_transactions(self, start_date=None, end_date=None):
         """
         Get normalized transaction history.
@@ -0,0 +1,309 @@
+"""
+Bulk Mailer
+Concurrent, rate-limited delivery for large email runs (month-end statements,
+prospect reports).
+
+Builds on EmailService:
+- SMTP: each worker thread holds one persistent connection (smtp_session)
+  instead of a TLS handshake per message
+- Resend: emails without attachments go out through the batch endpoint
+  (up to 100 per request); emails with attachments are sent individually
+- Attachments are read and encoded once per file (see load_attachment)
+- Failures are retried with exponential backoff only when the message
+  certainly was not accepted (see is_retryable); anything else is
+  reported as failed rather than risk a duplicate statement
+- Each provider has its own request rate limit
+- email_logs rows for the whole run are written in one transaction
+
+Usage:
+    from src.automation.bulk_mailer import BulkMailer, OutgoingEmail
+
+    mailer = BulkMailer(max_workers=4)
+    report = mailer.send_all([
+        OutgoingEmail('a@example.com', 'Statement', body,
+                      attachments=['reports/a.pdf'], email_type='MonthlyReport'),
+        ...
+    ])
+    print(report.summary())
+"""
+
+import os
+import queue
+import smtplib
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path (for when running this file directly)
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.automation.email_service import (
+    Attachment,
+    EmailService,
+    ResendAPIError,
+    RESEND_BATCH_LIMIT,
+    SMTPNotSentError,
+    write_email_logs,
+)
+
+
+# Requests per second allowed by each provider (None = unlimited).
+# Resend's default account limit is 2 requests/second.
+# Override with EMAIL_RATE_LIMIT (requests/second, applies to the active provider).
+PROVIDER_RATE_LIMITS: Dict[str, Optional[float]] = {
+    'resend': 2.0,
+    'smtp': None,
+}
+
+
+@dataclass
+class OutgoingEmail:
+    """One message queued for bulk delivery."""
+    to_email: str
+    subject: str
+    message: str
+    html: bool = False
+    attachments: Optional[List[Attachment]] = None
+    email_type: str = 'General'
+
+
+@dataclass
+class SendResult:
+    """Outcome of delivering one OutgoingEmail."""
+    email: OutgoingEmail
+    success: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkSendReport:
+    """Aggregate outcome of a BulkMailer.send_all() run."""
+    results: List[SendResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    requests_made: int = 0
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for r in self.results if r.success)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for r in self.results if not r.success)
+
+    @property
+    def emails_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.results) / self.elapsed_seconds
+
+    def summary(self) -> str:
+        return (f"{self.sent} sent, {self.failed} failed in "
+                f"{self.elapsed_seconds:.2f}s ({self.emails_per_second:.1f} emails/s, "
+                f"{self.requests_made} provider requests)")
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least 1/rate seconds apart."""
+
+    def __init__(self, rate_per_second: Optional[float],
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def acquire(self):
+        """Block until the caller may issue the next request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if wait > 0:
+            self._sleep(wait)
+
+
+def is_retryable(error: Exception) -> bool:
+    """True if a delivery error is transient and the message was not accepted.
+
+    Retrying is opt-in: connection failures before DATA, SMTP 4xx replies,
+    Resend throttling/5xx and Resend connect timeouts.  SMTP 5xx replies
+    are permanent, and any other error (a disconnect or timeout partway
+    through a send) is treated as permanent too, since the server may
+    already have accepted the message.
+    """
+    if isinstance(error, SMTPNotSentError):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, ResendAPIError):
+        return error.retryable
+
+    import requests
+    return isinstance(error, requests.exceptions.ConnectTimeout)
+
+
+class BulkMailer:
+    """Bounded, concurrent send queue on top of EmailService."""
+
+    def __init__(self, max_workers: int = 4, queue_size: Optional[int] = None,
+                 max_retries: int = 3, backoff_base: float = 1.0,
+                 rate_limit: Optional[float] = None,
+                 service_factory: Callable[[], EmailService] = EmailService,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_workers: Concurrent sender threads (one SMTP connection each)
+            queue_size: Max emails waiting for a worker (default 2 x workers)
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: First retry delay in seconds, doubled each retry
+            rate_limit: Provider requests/second (default: PROVIDER_RATE_LIMITS
+                or EMAIL_RATE_LIMIT env var)
+            service_factory: Builds the EmailService used by each worker
+            sleep: Injected for tests
+        """
+        self.max_workers = max(1, max_workers)
+        self.queue_size = queue_size or self.max_workers * 2
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.service_factory = service_factory
+        self._sleep = sleep
+
+        self.provider = service_factory().provider
+        if rate_limit is None:
+            env_limit = os.getenv('EMAIL_RATE_LIMIT')
+            rate_limit = float(env_limit) if env_limit else PROVIDER_RATE_LIMITS.get(self.provider)
+        self.rate_limiter = RateLimiter(rate_limit, sleep=sleep)
+
+        self._requests = 0
+        self._requests_lock = threading.Lock()
+
+    # ----------------------------------------------------------
+    # Retry wrapper
+    # ----------------------------------------------------------
+
+    def _with_retry(self, send: Callable[[], object]):
+        """Run send() with rate limiting and exponential backoff.
+
+        Returns:
+            tuple: (attempts, error_or_None, send_return_value)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.rate_limiter.acquire()
+            with self._requests_lock:
+                self._requests += 1
+            try:
+                return attempt, None, send()
+            except Exception as e:
+                if attempt > self.max_retries or not is_retryable(e):
+                    return attempt, e, None
+                self._sleep(self.backoff_base * (2 ** (attempt - 1)))
+
+    # ----------------------------------------------------------
+    # Delivery paths
+    # ----------------------------------------------------------
+
+    def _worker(self, work: queue.Queue, results: List[SendResult]):
+        """Drain the queue, reusing one EmailService/SMTP connection."""
+        service = self.service_factory()
+        with service.smtp_session():
+            while True:
+                email = work.get()
+                if email is None:
+                    break
+                attempts, error, _ = self._with_retry(
+                    lambda: service.deliver(email.to_email, email.subject,
+                                            email.message, email.html,
+                                            email.attachments))
+                results.append(SendResult(
+                    email=email,
+                    success=error is None,
+                    attempts=attempts,
+                    error=str(error) if error else None,
+                ))
+
+    def _send_queued(self, emails: List[OutgoingEmail]) -> List[SendResult]:
+        """Send individually through the bounded worker queue."""
+        if not emails:
+            return []
+        work = queue.Queue(maxsize=self.queue_size)
+        results: List[SendResult] = []
+        n_workers = min(self.max_workers, len(emails))
+        threads = [
+            threading.Thread(target=self._worker, args=(work, results), daemon=True)
+            for _ in range(n_workers)
+        ]
+        for t in threads:
+            t.start()
+        for email in emails:
+            work.put(email)  # Blocks while the queue is full
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+        return results
+
+    def _send_resend_batches(self, emails: List[OutgoingEmail]) -> List[SendResult]:
+        """Send attachment-free emails through the Resend batch endpoint."""
+        service = self.service_factory()
+        results = []
+        for start in range(0, len(emails), RESEND_BATCH_LIMIT):
+            chunk = emails[start:start + RESEND_BATCH_LIMIT]
+            payloads = [
+                service._build_resend_payload(e.to_email, e.subject, e.message, e.html)
+                for e in chunk
+            ]
+            attempts, error, _ = self._with_retry(
+                lambda: service.send_batch_via_resend(payloads))
+            for email in chunk:
+                results.append(SendResult(
+                    email=email,
+                    success=error is None,
+                    attempts=attempts,
+                    error=str(error) if error else None,
+                ))
+        return results
+
+    def send_all(self, emails: List[OutgoingEmail]) -> BulkSendReport:
+        """Deliver every email and log all outcomes in one transaction."""
+        self._requests = 0
+        started = time.perf_counter()
+
+        if self.provider == 'resend':
+            batchable = [e for e in emails if not e.attachments]
+            individual = [e for e in emails if e.attachments]
+            results = self._send_resend_batches(batchable) + self._send_queued(individual)
+        else:
+            results = self._send_queued(emails)
+
+        report = BulkSendReport(
+            results=results,
+            elapsed_seconds=time.perf_counter() - started,
+            requests_made=self._requests,
+        )
+
+        write_email_logs([
+            {
+                'recipient': r.email.to_email,
+                'subject': r.email.subject[:200],
+                'email_type': r.email.email_type,
+                'status': 'Sent' if r.success else 'Failed',
+                'error_message': r.error[:500] if r.error else None,
+            }
+            for r in results
+        ])
+        return report
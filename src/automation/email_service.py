@@ -13,18 +13,24 @@ Provides both:
 - send_email() function for simple use
 
 Every send attempt is recorded in the email_logs table for audit trail.
+
+For bulk sends (e.g. month-end statements) see src/automation/bulk_mailer.py,
+which reuses one SMTP connection per worker via EmailService.smtp_session().
 """
 
 import smtplib
 import os
 import sys
 import json
+import base64
+import functools
+from contextlib import contextmanager
 from pathlib import Path
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from dotenv import load_dotenv
 
 # Add project root to path (for when running this file directly)
@@ -34,6 +40,70 @@ if str(project_root) not in sys.path:
 
 load_dotenv()
 
+# Resend batch endpoint accepts at most 100 emails per request
+RESEND_BATCH_LIMIT = 100
+
+
+class ResendAPIError(Exception):
+    """Non-2xx response from the Resend API."""
+
+    def __init__(self, status_code: int, detail: str, endpoint: str = 'emails'):
+        self.status_code = status_code
+        label = 'Resend batch API' if endpoint == 'batch' else 'Resend API'
+        super().__init__(f"{label} error {status_code}: {detail}")
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limiting and server errors are worth retrying."""
+        return self.status_code == 429 or self.status_code >= 500
+
+
+class SMTPNotSentError(Exception):
+    """The SMTP connection failed before the message was handed over.
+
+    Raised instead of the underlying network error when the failure is
+    known to have happened before DATA, so the message can safely be
+    sent again.
+    """
+
+
+# A file path, or a (file path, display filename) pair
+Attachment = Union[str, Tuple[str, str]]
+
+
+@functools.lru_cache(maxsize=64)
+def _read_attachment(filepath: str, mtime_ns: int, size: int) -> tuple:
+    """Read and base64-encode an attachment once per file version.
+
+    mtime_ns/size are part of the cache key so a regenerated report is
+    re-read rather than served stale.
+
+    Returns:
+        tuple: (filename, raw_bytes, base64_str)
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    return (os.path.basename(filepath), data,
+            base64.b64encode(data).decode('ascii'))
+
+
+def load_attachment(attachment: Attachment) -> Optional[tuple]:
+    """Return cached (filename, raw_bytes, base64_str), or None if missing.
+
+    A (path, filename) pair is attached under that filename instead of
+    the file's own name.
+    """
+    filepath, filename = (attachment if isinstance(attachment, tuple)
+                          else (attachment, None))
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    loaded = _read_attachment(str(filepath), stat.st_mtime_ns, stat.st_size)
+    if filename:
+        return (filename,) + loaded[1:]
+    return loaded
+
 
 class EmailService:
     """Email delivery service (advanced interface).
@@ -66,48 +136,124 @@ class EmailService:
             if not self.email_from:
                 self.email_from = self.smtp_user or ''
 
+            # STARTTLS can be disabled for local relays / test stubs (port 587 only)
+            self.smtp_starttls = os.getenv('SMTP_STARTTLS', 'true').lower() != 'false'
+
             if not self.smtp_user or not self.smtp_password:
                 print("[WARN] SMTP credentials not configured - emails will not be sent")
 
+        # Persistent SMTP connection (only set inside smtp_session())
+        self._smtp = None
+        # Pending email_logs rows (only set inside buffer_logs())
+        self._log_buffer = None
+
     def _log_email(self, recipient: str, subject: str, email_type: str,
                    status: str, error_message: str = None):
         """Record email send attempt in email_logs table.
 
+        Inside buffer_logs() the row is queued and written with the rest
+        of the batch on exit instead of committing one row at a time.
+
         Never raises -- logging failures are printed but don't break
         the calling workflow.
         """
+        record = {
+            'recipient': recipient,
+            'subject': subject[:200],  # Respect column length
+            'email_type': email_type,
+            'status': status,
+            'error_message': str(error_message)[:500] if error_message else None,
+        }
+        if self._log_buffer is not None:
+            self._log_buffer.append(record)
+            return
+        write_email_logs([record])
+
+    @contextmanager
+    def buffer_logs(self):
+        """Collect email_logs rows and write them in one transaction on exit."""
+        self._log_buffer = []
         try:
-            from src.database.models import Database, EmailLog
-            db = Database()
-            session = db.get_session()
-            try:
-                log = EmailLog(
-                    recipient=recipient,
-                    subject=subject[:200],  # Respect column length
-                    email_type=email_type,
-                    status=status,
-                    error_message=str(error_message)[:500] if error_message else None,
-                )
-                session.add(log)
-                session.commit()
-            finally:
-                session.close()
-        except Exception as e:
-            print(f"  [WARN] Could not log email to database: {e}")
-
-    def _send_via_resend(self, to_email: str, subject: str, message: str,
-                         html: bool = False, attachments: Optional[List[str]] = None) -> bool:
-        """Send email via Resend HTTP API.
+            yield self._log_buffer
+        finally:
+            pending, self._log_buffer = self._log_buffer, None
+            if pending:
+                write_email_logs(pending)
+
+    # ----------------------------------------------------------
+    # SMTP connection management
+    # ----------------------------------------------------------
+
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        if not self.smtp_user or not self.smtp_password:
+            raise ValueError("SMTP credentials not configured")
 
-        Resend API docs: https://resend.com/docs/api-reference/emails/send-email
-        Uses plain requests.post() — no SDK dependency needed.
+        # Port 465 uses SSL directly; port 587 uses STARTTLS
+        if self.smtp_port == 465:
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=30)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+            if self.smtp_starttls:
+                server.starttls()
+        try:
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _open_smtp(self) -> smtplib.SMTP:
+        """_connect_smtp(), with network failures raised as SMTPNotSentError."""
+        try:
+            return self._connect_smtp()
+        except smtplib.SMTPResponseException:
+            raise  # The server answered: its reply code decides
+        except OSError as e:
+            raise SMTPNotSentError(f"SMTP connection failed: {e}") from e
+
+    def _close_smtp(self):
+        """Close the persistent SMTP connection, ignoring shutdown errors."""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @contextmanager
+    def smtp_session(self):
+        """Reuse one SMTP connection for every send_email() inside the block.
+
+        The connection is opened lazily on the first message.  Before each
+        later message it is checked with NOOP and re-established if the
+        server dropped it; a message is never re-sent after a failure
+        partway through, since the server may already have accepted it.
+
+        Example:
+            with service.smtp_session():
+                for investor in investors:
+                    service.send_email(...)
         """
-        import requests
-
-        if not self.resend_api_key:
-            raise ValueError("RESEND_API_KEY not configured")
+        self._smtp = False  # Marker: session active, not yet connected
+        try:
+            yield self
+        finally:
+            if self._smtp:
+                self._close_smtp()
+            self._smtp = None
+
+    def _resend_headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.resend_api_key}",
+            "Content-Type": "application/json",
+        }
 
-        # Build the request payload
+    def _build_resend_payload(self, to_email: str, subject: str, message: str,
+                              html: bool = False,
+                              attachments: Optional[List[Attachment]] = None) -> dict:
+        """Build a single-email Resend payload."""
         payload = {
             "from": f"{self.from_name} <{self.email_from}>",
             "to": [to_email],
@@ -119,28 +265,72 @@ class EmailService:
         else:
             payload["text"] = message
 
-        # Handle attachments (base64 encoded for Resend API)
+        # Handle attachments (base64 encoded for Resend API, cached per file)
         if attachments:
-            import base64
             attachment_list = []
-            for filepath in attachments:
-                if os.path.exists(filepath):
-                    with open(filepath, 'rb') as f:
-                        file_data = f.read()
+            for attachment in attachments:
+                loaded = load_attachment(attachment)
+                if loaded:
+                    filename, _, encoded = loaded
                     attachment_list.append({
-                        "filename": os.path.basename(filepath),
-                        "content": base64.b64encode(file_data).decode('ascii'),
+                        "filename": filename,
+                        "content": encoded,
                     })
             if attachment_list:
                 payload["attachments"] = attachment_list
 
+        return payload
+
+    def send_batch_via_resend(self, payloads: List[dict]) -> List[str]:
+        """Send up to RESEND_BATCH_LIMIT emails in one Resend batch request.
+
+        The batch endpoint does not accept attachments, so callers should
+        only pass payloads built without them.
+
+        Returns:
+            List of Resend message IDs, in request order
+
+        Raises:
+            ResendAPIError: on any non-2xx response (the whole batch failed)
+        """
+        import requests
+
+        if not self.resend_api_key:
+            raise ValueError("RESEND_API_KEY not configured")
+        if len(payloads) > RESEND_BATCH_LIMIT:
+            raise ValueError(f"Resend batch limit is {RESEND_BATCH_LIMIT} emails")
+
+        resp = requests.post(
+            "https://api.resend.com/emails/batch",
+            headers=self._resend_headers(),
+            data=json.dumps(payloads),
+            timeout=60,
+        )
+
+        if resp.status_code in (200, 201):
+            data = resp.json().get('data', [])
+            return [item.get('id', 'unknown') for item in data]
+        raise ResendAPIError(resp.status_code, resp.text[:300], endpoint='batch')
+
+    def _send_via_resend(self, to_email: str, subject: str, message: str,
+                         html: bool = False, attachments: Optional[List[Attachment]] = None) -> bool:
+        """Send email via Resend HTTP API.
+
+        Resend API docs: https://resend.com/docs/api-reference/emails/send-email
+        Uses plain requests.post() — no SDK dependency needed.
+        """
+        import requests
+
+        if not self.resend_api_key:
+            raise ValueError("RESEND_API_KEY not configured")
+
+        payload = self._build_resend_payload(to_email, subject, message,
+                                             html, attachments)
+
         # Send via Resend API
         resp = requests.post(
             "https://api.resend.com/emails",
-            headers={
-                "Authorization": f"Bearer {self.resend_api_key}",
-                "Content-Type": "application/json",
-            },
+            headers=self._resend_headers(),
             data=json.dumps(payload),
             timeout=30,
         )
@@ -150,12 +340,15 @@ class EmailService:
             print(f"  [OK] Email sent via Resend (id: {result.get('id', 'unknown')})")
             return True
         else:
-            error_detail = resp.text[:300]
-            raise Exception(f"Resend API error {resp.status_code}: {error_detail}")
+            raise ResendAPIError(resp.status_code, resp.text[:300])
 
     def _send_via_smtp(self, to_email: str, subject: str, message: str,
-                       html: bool = False, attachments: Optional[List[str]] = None) -> bool:
-        """Send email via SMTP (traditional transport)."""
+                       html: bool = False, attachments: Optional[List[Attachment]] = None) -> bool:
+        """Send email via SMTP (traditional transport).
+
+        Reuses the persistent connection when called inside smtp_session(),
+        otherwise opens a connection for this one message.
+        """
         if not self.smtp_user or not self.smtp_password:
             raise ValueError("SMTP credentials not configured")
 
@@ -173,33 +366,57 @@ class EmailService:
 
         # Add attachments if any
         if attachments:
-            for filepath in attachments:
-                if os.path.exists(filepath):
-                    with open(filepath, 'rb') as f:
-                        attachment = MIMEApplication(f.read())
-                        attachment.add_header(
-                            'Content-Disposition',
-                            'attachment',
-                            filename=os.path.basename(filepath)
-                        )
-                        msg.attach(attachment)
-
-        # Send email
-        # Port 465 uses SSL directly; port 587 uses STARTTLS
-        if self.smtp_port == 465:
-            with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port) as server:
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+            for attachment in attachments:
+                loaded = load_attachment(attachment)
+                if loaded:
+                    filename, data, _ = loaded
+                    attachment = MIMEApplication(data)
+                    attachment.add_header(
+                        'Content-Disposition',
+                        'attachment',
+                        filename=filename
+                    )
+                    msg.attach(attachment)
+
+        # One-off send: connect, send, disconnect
+        if self._smtp is None:
+            server = self._open_smtp()
+            try:
                 server.send_message(msg)
+            finally:
+                try:
+                    server.quit()
+                except Exception:
+                    server.close()
+            return True
+
+        # Session send: reuse the open connection, reconnecting if it was
+        # dropped while idle (checked before anything is sent)
+        if self._smtp:
+            try:
+                self._smtp.noop()
+            except OSError:
+                self._close_smtp()
+                self._smtp = False
+        if not self._smtp:
+            self._smtp = self._open_smtp()
+        self._smtp.send_message(msg)
 
         return True
 
+    def deliver(self, to_email: str, subject: str, message: str,
+                html: bool = False, attachments: Optional[List[Attachment]] = None) -> bool:
+        """Send through the configured transport without logging.
+
+        Unlike send_email(), errors propagate so callers (e.g. BulkMailer)
+        can decide whether to retry.
+        """
+        if self.provider == 'resend':
+            return self._send_via_resend(to_email, subject, message, html, attachments)
+        return self._send_via_smtp(to_email, subject, message, html, attachments)
+
     def send_email(self, to_email: str, subject: str, message: str,
-                   html: bool = False, attachments: Optional[List[str]] = None,
+                   html: bool = False, attachments: Optional[List[Attachment]] = None,
                    email_type: str = 'General') -> bool:
         """
         Send an email and log the attempt.
@@ -213,17 +430,14 @@ class EmailService:
             subject: Email subject
             message: Email body (plain text or HTML)
             html: True if message is HTML
-            attachments: List of file paths to attach
+            attachments: File paths (or (path, filename) pairs) to attach
             email_type: Category for email_logs (e.g. MonthlyReport, Alert)
 
         Returns:
             bool: True if sent successfully
         """
         try:
-            if self.provider == 'resend':
-                self._send_via_resend(to_email, subject, message, html, attachments)
-            else:
-                self._send_via_smtp(to_email, subject, message, html, attachments)
+            self.deliver(to_email, subject, message, html, attachments)
 
             # Log success
             self._log_email(to_email, subject, email_type, 'Sent')
@@ -260,10 +474,31 @@ class EmailService:
                                html=True, email_type='Alert')
 
 
+def write_email_logs(records: List[dict]):
+    """Insert email_logs rows in a single transaction.
+
+    Never raises -- logging failures are printed but don't break
+    the calling workflow.
+    """
+    if not records:
+        return
+    try:
+        from src.database.models import Database, EmailLog
+        db = Database()
+        session = db.get_session()
+        try:
+            session.add_all([EmailLog(**record) for record in records])
+            session.commit()
+        finally:
+            session.close()
+    except Exception as e:
+        print(f"  [WARN] Could not log email to database: {e}")
+
+
 # ===== SIMPLE INTERFACE FOR EASY USE =====
 
 def send_email(to_email: str, subject: str, message: str,
-               html: bool = False, attachments: Optional[List[str]] = None,
+               html: bool = False, attachments: Optional[List[Attachment]] = None,
                email_type: str = 'General') -> bool:
     """
     Simple email sending function (uses EmailService internally).
@@ -273,7 +508,7 @@ def send_email(to_email: str, subject: str, message: str,
         subject: Email subject
         message: Email body (plain text or HTML)
         html: True if message is HTML
-        attachments: List of file paths to attach
+        attachments: File paths (or (path, filename) pairs) to attach
         email_type: Category for email_logs (MonthlyReport, Alert, etc.)
 
     Returns:
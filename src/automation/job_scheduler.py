@@ -0,0 +1,298 @@
+"""
+Job Scheduler
+Event-driven scheduler core used by TaskScheduler (src/automation/scheduler.py).
+
+Jobs sit in a priority queue keyed by their next fire time and the loop
+sleeps exactly until the earliest one is due - there is no polling, so
+an idle scheduler does not wake up at all.
+
+Each Job has a rule: a function returning the first fire time strictly
+after a given datetime.  Rules for market-calendar jobs are built with
+trading_days_at() and last_trading_day_of_month_at(), so closed days
+never produce a fire time and early closes move the fire time earlier.
+
+Run state is persisted in the scheduler_state table.  A slot is claimed
+(status 'running') before its job starts, so a slot is never run twice -
+not after a restart and not by a second scheduler process.  On start, a
+job whose slots were missed while the scheduler was down runs once for
+the most recent missed slot (catch_up=True) and then resumes normally.
+A job's first-ever start records no missed slots.  Jobs whose work
+depends on the slot (e.g. which day to value) set pass_slot=True and
+are called with the slot's fire time, so a catch-up run does the missed
+slot's work rather than today's.
+
+Usage:
+    from src.automation.job_scheduler import Job, JobScheduler, trading_days_at
+
+    scheduler = JobScheduler('data/tovito.db', tz=pytz.timezone('America/New_York'))
+    scheduler.add(Job('daily_nav', update_nav, trading_days_at(calendar, tz=tz)))
+    scheduler.run_forever()       # stop() from another thread to exit
+"""
+
+import heapq
+import itertools
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on days a rule searches for its next fire time, and on
+# missed slots walked through during catch-up
+MAX_RULE_DAYS = 400
+MAX_CATCH_UP_SLOTS = 10000
+
+Rule = Callable[[datetime], datetime]
+
+
+@dataclass
+class Job:
+    """A named callable and the rule that schedules it."""
+    name: str
+    func: Callable[..., Any]
+    rule: Rule
+    catch_up: bool = True
+    pass_slot: bool = False    # Call func(fire_at) instead of func()
+
+
+# ================================================================
+# RULES
+# ================================================================
+
+def _at(day: date, at: dt_time, tz) -> datetime:
+    fire = datetime.combine(day, at)
+    return tz.localize(fire) if tz is not None else fire
+
+
+def _search(after: datetime, fire_on: Callable[[date], Optional[datetime]]) -> datetime:
+    day = after.date()
+    for _ in range(MAX_RULE_DAYS):
+        fire = fire_on(day)
+        if fire is not None and fire > after:
+            return fire
+        day += timedelta(days=1)
+    raise ValueError(f"No fire time within {MAX_RULE_DAYS} days of {after}")
+
+
+def daily_at(at: dt_time, tz=None) -> Rule:
+    """Every day at a fixed time."""
+    return lambda after: _search(after, lambda d: _at(d, at, tz))
+
+
+def weekly_at(weekday: int, at: dt_time, tz=None) -> Rule:
+    """Once a week (weekday: Monday=0 ... Sunday=6)."""
+    return lambda after: _search(
+        after, lambda d: _at(d, at, tz) if d.weekday() == weekday else None)
+
+
+def trading_days_at(calendar, offset: timedelta = timedelta(0), tz=None) -> Rule:
+    """Every trading day at the market close plus offset.
+
+    Early-close days fire relative to the early close.
+    """
+    def fire_on(d: date) -> Optional[datetime]:
+        close = calendar.close_time(d)
+        if close is None:
+            return None
+        return _at(d, close, tz) + offset
+    return lambda after: _search(after, fire_on)
+
+
+def last_trading_day_of_month_at(calendar, at: dt_time, tz=None) -> Rule:
+    """The last trading day of each month at a fixed time."""
+    def fire_on(d: date) -> Optional[datetime]:
+        if d != calendar.last_trading_day_of_month(d.year, d.month):
+            return None
+        return _at(d, at, tz)
+    return lambda after: _search(after, fire_on)
+
+
+# ================================================================
+# SCHEDULER
+# ================================================================
+
+class JobScheduler:
+    """Runs Jobs at their next fire time, sleeping in between."""
+
+    def __init__(self, db_path: str, tz=None, clock: Optional[Callable[[], datetime]] = None):
+        """
+        Args:
+            db_path: Database holding the scheduler_state table
+            tz: pytz timezone for fire times (None: naive local time)
+            clock: Returns the current time (default: now in tz)
+        """
+        self.db_path = str(db_path)
+        self.tz = tz
+        self.clock = clock or (lambda: datetime.now(tz) if tz is not None else datetime.now())
+        self.jobs: Dict[str, Job] = {}
+        self._queue: List[Tuple[datetime, int, str]] = []
+        self._seq = itertools.count()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._started = False
+
+    def add(self, job: Job):
+        if job.name in self.jobs:
+            raise ValueError(f"Duplicate job: {job.name}")
+        self.jobs[job.name] = job
+        if self._started:
+            self._schedule(job, self.clock())
+            self._wake.set()
+
+    def next_runs(self) -> List[Tuple[datetime, str]]:
+        """Queued (fire time, job name) pairs, earliest first."""
+        return [(fire_at, name) for fire_at, _, name in sorted(self._queue)]
+
+    # ----------------------------------------------------------------
+    # Main loop
+    # ----------------------------------------------------------------
+
+    def start(self):
+        """Load run state and queue every job (including catch-up runs)."""
+        from src.database.schema_v2 import SCHEDULER_STATE_TABLE
+
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute(SCHEDULER_STATE_TABLE)
+            conn.commit()
+        finally:
+            conn.close()
+
+        now = self.clock()
+        state = self._load_state()
+        for job in self.jobs.values():
+            last = state.get(job.name)
+            if last is None:
+                # First start: nothing was missed, record the baseline
+                self._record(job.name, now, 'success')
+            self._schedule(job, now, last)
+        self._started = True
+
+    def run_forever(self):
+        """Sleep until the next job is due, run it, repeat until stop()."""
+        if not self._started:
+            self.start()
+        while not self._stopped:
+            if not self._queue:
+                self._wake.wait()
+            else:
+                delay = (self._queue[0][0] - self.clock()).total_seconds()
+                if delay > 0:
+                    self._wake.wait(delay)
+                else:
+                    self.run_pending()
+            self._wake.clear()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def run_pending(self) -> List[str]:
+        """Run every job that is due now; returns the job names run."""
+        ran = []
+        now = self.clock()
+        while self._queue and self._queue[0][0] <= now:
+            fire_at, _, name = heapq.heappop(self._queue)
+            job = self.jobs[name]
+            if self._fire(job, fire_at):
+                ran.append(name)
+            self._schedule(job, self.clock(), fire_at)
+        return ran
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+
+    def _schedule(self, job: Job, now: datetime, last: Optional[datetime] = None):
+        """Queue the next slot: the latest missed slot since `last` (once)
+        when the job catches up, otherwise the first slot after now."""
+        if last is None:
+            fire_at = job.rule(now)
+        else:
+            missed, fire_at = None, job.rule(last)
+            for _ in range(MAX_CATCH_UP_SLOTS):
+                if fire_at > now:
+                    break
+                missed, fire_at = fire_at, job.rule(fire_at)
+            if missed is not None:
+                if job.catch_up:
+                    logger.info("%s missed its %s run; catching up", job.name, missed)
+                    fire_at = missed
+                else:
+                    logger.info("%s missed its %s run; skipping", job.name, missed)
+        heapq.heappush(self._queue, (fire_at, next(self._seq), job.name))
+
+    def _fire(self, job: Job, fire_at: datetime) -> bool:
+        if not self._claim(job.name, fire_at):
+            logger.info("%s slot %s already claimed; skipping", job.name, fire_at)
+            return False
+
+        logger.info("Running %s (slot %s)", job.name, fire_at)
+        try:
+            if job.pass_slot:
+                job.func(fire_at)
+            else:
+                job.func()
+        except Exception as e:
+            logger.exception("%s failed", job.name)
+            self._record(job.name, fire_at, 'failed', f"{type(e).__name__}: {e}")
+        else:
+            self._record(job.name, fire_at, 'success')
+        return True
+
+    def _claim(self, name: str, fire_at: datetime) -> bool:
+        """Mark a slot as running unless it (or a later one) was claimed."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT last_fire_at FROM scheduler_state WHERE job_name = ?",
+                               (name,)).fetchone()
+            if row and datetime.fromisoformat(row[0]) >= fire_at:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute("""
+                INSERT OR REPLACE INTO scheduler_state
+                    (job_name, last_fire_at, started_at, finished_at, status, error)
+                VALUES (?, ?, ?, NULL, 'running', NULL)
+            """, (name, fire_at.isoformat(), datetime.now().isoformat()))
+            conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    def _record(self, name: str, fire_at: datetime, status: str, error: Optional[str] = None):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("""
+                INSERT INTO scheduler_state (job_name, last_fire_at, finished_at, status, error)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_name) DO UPDATE SET
+                    last_fire_at = excluded.last_fire_at,
+                    finished_at = excluded.finished_at,
+                    status = excluded.status,
+                    error = excluded.error
+            """, (name, fire_at.isoformat(), datetime.now().isoformat(), status, error))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load_state(self) -> Dict[str, datetime]:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            rows = conn.execute("SELECT job_name, last_fire_at, status FROM scheduler_state").fetchall()
+        finally:
+            conn.close()
+
+        state = {}
+        for name, last_fire_at, status in rows:
+            if status == 'running':
+                logger.warning("%s was interrupted during its %s run; not re-running it",
+                               name, last_fire_at)
+            last = datetime.fromisoformat(last_fire_at)
+            if self.tz is not None and last.tzinfo is None:
+                last = self.tz.localize(last)
+            state[name] = last
+        return state
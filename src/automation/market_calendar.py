@@ -0,0 +1,289 @@
+"""
+Market Calendar
+Locally cached NYSE trading calendar for the scheduler.
+
+Days are looked up in the market_calendar table.  A month that is not
+cached yet is fetched once from Tradier (TradierClient.get_market_calendar)
+when a client is available, otherwise filled from the bundled holiday and
+early-close table below, and written to the cache either way.  Years
+beyond the bundled table fall back to weekends-only with a warning.
+
+When a client is configured, a month filled from the bundled table is
+provisional: it is fetched from Tradier again on a lookup at most once
+per PROVISIONAL_RETRY_SECONDS (and when the cache is next loaded), so a
+Tradier outage is not cached for good.
+
+Times are US/Eastern wall-clock times (HH:MM), matching the exchange.
+
+Usage:
+    from src.automation.market_calendar import MarketCalendar
+
+    calendar = MarketCalendar('data/tovito.db')
+    if calendar.is_trading_day(date.today()):
+        print(calendar.close_time(date.today()))   # 16:00 or 13:00
+"""
+
+import calendar as _calendar
+import logging
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+REGULAR_OPEN = '09:30'
+REGULAR_CLOSE = '16:00'
+EARLY_CLOSE = '13:00'
+
+# NYSE full-day closures (observed dates)
+BUNDLED_HOLIDAYS = {
+    '2025-01-01': "New Year's Day",
+    '2025-01-09': 'National Day of Mourning (President Carter)',
+    '2025-01-20': 'Martin Luther King, Jr. Day',
+    '2025-02-17': "Washington's Birthday",
+    '2025-04-18': 'Good Friday',
+    '2025-05-26': 'Memorial Day',
+    '2025-06-19': 'Juneteenth',
+    '2025-07-04': 'Independence Day',
+    '2025-09-01': 'Labor Day',
+    '2025-11-27': 'Thanksgiving Day',
+    '2025-12-25': 'Christmas Day',
+    '2026-01-01': "New Year's Day",
+    '2026-01-19': 'Martin Luther King, Jr. Day',
+    '2026-02-16': "Washington's Birthday",
+    '2026-04-03': 'Good Friday',
+    '2026-05-25': 'Memorial Day',
+    '2026-06-19': 'Juneteenth',
+    '2026-07-03': 'Independence Day (observed)',
+    '2026-09-07': 'Labor Day',
+    '2026-11-26': 'Thanksgiving Day',
+    '2026-12-25': 'Christmas Day',
+    '2027-01-01': "New Year's Day",
+    '2027-01-18': 'Martin Luther King, Jr. Day',
+    '2027-02-15': "Washington's Birthday",
+    '2027-03-26': 'Good Friday',
+    '2027-05-31': 'Memorial Day',
+    '2027-06-18': 'Juneteenth (observed)',
+    '2027-07-05': 'Independence Day (observed)',
+    '2027-09-06': 'Labor Day',
+    '2027-11-25': 'Thanksgiving Day',
+    '2027-12-24': 'Christmas Day (observed)',
+}
+
+# NYSE 1:00 PM closes
+BUNDLED_EARLY_CLOSES = {
+    '2025-07-03': 'Day before Independence Day',
+    '2025-11-28': 'Day after Thanksgiving',
+    '2025-12-24': 'Christmas Eve',
+    '2026-11-27': 'Day after Thanksgiving',
+    '2026-12-24': 'Christmas Eve',
+    '2027-11-26': 'Day after Thanksgiving',
+}
+
+BUNDLED_YEARS = {int(d[:4]) for d in BUNDLED_HOLIDAYS}
+
+# Upper bound on days searched when looking for the next trading day
+MAX_SEARCH_DAYS = 31
+
+# Seconds between Tradier retries for a month filled from the bundled table
+PROVISIONAL_RETRY_SECONDS = 3600
+
+
+def bundled_day(day: date) -> Dict:
+    """Calendar entry for a day from the bundled table (weekends closed)."""
+    key = day.isoformat()
+    if day.weekday() >= 5:
+        return {'status': 'closed', 'open_time': None, 'close_time': None,
+                'description': 'Weekend'}
+    if key in BUNDLED_HOLIDAYS:
+        return {'status': 'closed', 'open_time': None, 'close_time': None,
+                'description': BUNDLED_HOLIDAYS[key]}
+    if key in BUNDLED_EARLY_CLOSES:
+        return {'status': 'open', 'open_time': REGULAR_OPEN, 'close_time': EARLY_CLOSE,
+                'description': BUNDLED_EARLY_CLOSES[key]}
+    return {'status': 'open', 'open_time': REGULAR_OPEN, 'close_time': REGULAR_CLOSE,
+            'description': None}
+
+
+def parse_tradier_calendar(payload: Dict) -> Dict[str, Dict]:
+    """Convert a Tradier /markets/calendar response to {date: entry}."""
+    days = ((payload or {}).get('calendar') or {}).get('days') or {}
+    rows = days.get('day') or []
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    parsed = {}
+    for row in rows:
+        status = row.get('status')
+        if not row.get('date') or status not in ('open', 'closed'):
+            continue
+        hours = row.get('open') or {}
+        parsed[row['date']] = {
+            'status': status,
+            'open_time': hours.get('start') if status == 'open' else None,
+            'close_time': hours.get('end') if status == 'open' else None,
+            'description': row.get('description'),
+        }
+    return parsed
+
+
+class MarketCalendar:
+    """Trading days and closing times, cached month by month in SQLite."""
+
+    def __init__(self, db_path: str, client=None):
+        """
+        Args:
+            db_path: Database holding the market_calendar table
+            client: Optional TradierClient used to fill uncached months
+        """
+        self.db_path = str(db_path)
+        self.client = client
+        self._days: Dict[str, Dict] = {}
+        self._months = set()
+        self._provisional: Dict[tuple, float] = {}   # month -> last Tradier attempt
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------
+    # Lookups
+    # ----------------------------------------------------------------
+
+    def day(self, day: date) -> Dict:
+        """Calendar entry for a day: status, open_time, close_time, description."""
+        with self._lock:
+            month = (day.year, day.month)
+            if month not in self._months:
+                self._load_month(*month)
+            elif self._retry_due(month):
+                self._fill_month(*month)
+            return self._days.get(day.isoformat()) or bundled_day(day)
+
+    def is_trading_day(self, day: date) -> bool:
+        return self.day(day)['status'] == 'open'
+
+    def open_time(self, day: date) -> Optional[dt_time]:
+        """Opening time on a trading day (None when the market is closed)."""
+        entry = self.day(day)
+        if entry['status'] != 'open':
+            return None
+        return datetime.strptime(entry['open_time'] or REGULAR_OPEN, '%H:%M').time()
+
+    def close_time(self, day: date) -> Optional[dt_time]:
+        """Closing time on a trading day (None when the market is closed)."""
+        entry = self.day(day)
+        if entry['status'] != 'open':
+            return None
+        return datetime.strptime(entry['close_time'] or REGULAR_CLOSE, '%H:%M').time()
+
+    def is_early_close(self, day: date) -> bool:
+        close = self.close_time(day)
+        return close is not None and close < dt_time(16, 0)
+
+    def next_trading_day(self, day: date, include: bool = False) -> date:
+        """First trading day after `day` (or on it, with include=True)."""
+        candidate = day if include else day + timedelta(days=1)
+        for _ in range(MAX_SEARCH_DAYS):
+            if self.is_trading_day(candidate):
+                return candidate
+            candidate += timedelta(days=1)
+        raise ValueError(f"No trading day within {MAX_SEARCH_DAYS} days of {day}")
+
+    def last_trading_day_of_month(self, year: int, month: int) -> date:
+        day = date(year, month, _calendar.monthrange(year, month)[1])
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    # ----------------------------------------------------------------
+    # Cache
+    # ----------------------------------------------------------------
+
+    def refresh_month(self, year: int, month: int) -> str:
+        """Re-fetch a month from Tradier (or the bundled table) into the cache.
+
+        Returns the source used: 'tradier' or 'bundled'.
+        """
+        with self._lock:
+            self._months.discard((year, month))
+            return self._fill_month(year, month)
+
+    def _retry_due(self, month: tuple) -> bool:
+        attempted = self._provisional.get(month)
+        return attempted is not None and time.monotonic() - attempted >= PROVISIONAL_RETRY_SECONDS
+
+    def _load_month(self, year: int, month: int):
+        prefix = f"{year:04d}-{month:02d}-"
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            try:
+                rows = conn.execute("""
+                    SELECT date, status, open_time, close_time, description, source
+                    FROM market_calendar WHERE date LIKE ?
+                """, (prefix + '%',)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.OperationalError:
+            rows = []   # Table not created yet
+
+        provisional = self.client is not None and any(r[5] == 'bundled' for r in rows)
+        if rows and not provisional:
+            for d, status, open_time, close_time, description, _ in rows:
+                self._days[d] = {'status': status, 'open_time': open_time,
+                                 'close_time': close_time, 'description': description}
+            self._months.add((year, month))
+        else:
+            self._fill_month(year, month)
+
+    def _fill_month(self, year: int, month: int) -> str:
+        entries, source = {}, 'bundled'
+        if self.client is not None:
+            try:
+                entries = parse_tradier_calendar(
+                    self.client.get_market_calendar(month=month, year=year))
+                source = 'tradier'
+            except Exception as e:
+                logger.warning("Tradier calendar unavailable for %d-%02d: %s", year, month, e)
+
+        if not entries:
+            source = 'bundled'
+            if year not in BUNDLED_YEARS:
+                logger.warning("No holiday data for %d; treating only weekends as closed", year)
+            for day_num in range(1, _calendar.monthrange(year, month)[1] + 1):
+                day = date(year, month, day_num)
+                entries[day.isoformat()] = bundled_day(day)
+
+        prefix = f"{year:04d}-{month:02d}-"
+        for key in [d for d in self._days if d.startswith(prefix)]:
+            del self._days[key]
+        self._days.update(entries)
+        self._months.add((year, month))
+        if source == 'bundled' and self.client is not None:
+            self._provisional[(year, month)] = time.monotonic()
+        else:
+            self._provisional.pop((year, month), None)
+        self._store(prefix, entries, source)
+        return source
+
+    def _store(self, prefix: str, entries: Dict[str, Dict], source: str):
+        """Replace the cached month whose dates start with prefix."""
+        from src.database.schema_v2 import MARKET_CALENDAR_TABLE
+
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            try:
+                conn.execute(MARKET_CALENDAR_TABLE)
+                conn.execute("DELETE FROM market_calendar WHERE date LIKE ?", (prefix + '%',))
+                conn.executemany("""
+                    INSERT OR REPLACE INTO market_calendar
+                        (date, status, open_time, close_time, description, source)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (d, e['status'], e['open_time'], e['close_time'], e['description'], source)
+                    for d, e in sorted(entries.items())
+                ])
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Could not cache market calendar: %s", e)
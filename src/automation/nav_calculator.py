@@ -6,11 +6,14 @@ Core engine for calculating Net Asset Value and updating investor positions
 from datetime import datetime, date
 from typing import Dict, List, Optional
 import os
+import sqlite3
 from dotenv import load_dotenv
 
 from src.database.models import Database, Investor, DailyNAV, Transaction, SystemLog
 from src.api.brokerage import get_brokerage_client, get_combined_balance, get_configured_providers
 from src.utils.rounding import round_nav, round_shares, round_dollars, round_pct
+from src.monitoring.tracing import traced
+from src.automation.valuation import FundValuation, value_fund
 
 load_dotenv()
 
@@ -24,6 +27,7 @@ class NAVCalculator:
         self.brokerage = get_brokerage_client(brokerage_provider)
         self.tax_rate = float(os.getenv('TAX_RATE', 0.37))
     
+    @traced('nav.fetch_and_update_nav')
     def fetch_and_update_nav(self, update_date: date = None) -> Dict:
         """
         Main automation function: Fetch from Tradier and update NAV
@@ -169,6 +173,22 @@ class NAVCalculator:
         finally:
             session.close()
     
+    def value_fund(self, investor_ids: List[str] = None) -> FundValuation:
+        """
+        Value investors against the latest NAV in one query
+
+        Args:
+            investor_ids: Investors to value (defaults to all active)
+
+        Returns:
+            FundValuation: Columnar positions (see src/automation/valuation.py)
+        """
+        conn = sqlite3.connect(self.db.engine.url.database)
+        try:
+            return value_fund(conn, tax_rate=self.tax_rate, investor_ids=investor_ids)
+        finally:
+            conn.close()
+
     def get_investor_value(self, investor_id: str) -> Dict:
         """
         Calculate current value and metrics for an investor
@@ -179,58 +199,20 @@ class NAVCalculator:
         Returns:
             dict: Current position details
         """
-        session = self.db.get_session()
-        
-        try:
-            investor = session.query(Investor).filter(Investor.investor_id == investor_id).first()
-            if not investor:
-                raise ValueError(f"Investor {investor_id} not found")
-            
-            # Get current NAV
-            current_nav = self.get_current_nav()
-            if not current_nav:
-                raise ValueError("No NAV data available")
-            
-            # Calculate values (round dollars to 2 decimals)
-            current_value = round_dollars(investor.current_shares * current_nav)
-            unrealized_gain = round_dollars(max(0, current_value - investor.net_investment))
-            tax_liability = round_dollars(unrealized_gain * self.tax_rate)
-            after_tax_value = round_dollars(current_value - tax_liability)
-            
-            # Calculate return
-            if investor.net_investment > 0:
-                total_return_percent = round_pct(((current_value - investor.net_investment) / investor.net_investment) * 100)
-                after_tax_return_percent = round_pct(((after_tax_value - investor.net_investment) / investor.net_investment) * 100)
-            else:
-                total_return_percent = 0.0
-                after_tax_return_percent = 0.0
-            
-            return {
-                'investor_id': investor_id,
-                'name': investor.name,
-                'current_shares': investor.current_shares,
-                'share_price': current_nav,
-                'current_value': current_value,
-                'net_investment': investor.net_investment,
-                'unrealized_gain': unrealized_gain,
-                'tax_liability': tax_liability,
-                'after_tax_value': after_tax_value,
-                'total_return_percent': total_return_percent,
-                'after_tax_return_percent': after_tax_return_percent
-            }
-            
-        finally:
-            session.close()
+        valuation = self.value_fund([investor_id])
+        position = valuation.row(investor_id)
+        if position is None:
+            raise ValueError(f"Investor {investor_id} not found")
+        if valuation.nav_per_share is None:
+            raise ValueError("No NAV data available")
+        return position
     
     def get_all_investor_values(self) -> List[Dict]:
         """Get current values for all active investors"""
-        session = self.db.get_session()
-        
-        try:
-            active_investors = session.query(Investor).filter(Investor.status == 'Active').all()
-            return [self.get_investor_value(inv.investor_id) for inv in active_investors]
-        finally:
-            session.close()
+        valuation = self.value_fund()
+        if valuation.nav_per_share is None and len(valuation):
+            raise ValueError("No NAV data available")
+        return valuation.rows()
     
     def validate_data(self) -> Dict:
         """
@@ -250,30 +232,29 @@ class NAVCalculator:
                     'errors': ['No NAV data found']
                 }
             
-            # Get all active investors
-            investors = session.query(Investor).filter(Investor.status == 'Active').all()
+            # Value all active investors in one query
+            valuation = self.value_fund()
             
             # Calculate total shares from investors
-            investor_total_shares = sum(inv.current_shares for inv in investors)
+            investor_total_shares = valuation.total_shares
             
             # Compare with NAV record
             shares_match = abs(investor_total_shares - latest_nav.total_shares) < 0.01
             
             # Calculate percentages
             total_portfolio_value = latest_nav.total_portfolio_value
-            investor_values = []
-            total_percentage = 0.0
-            
-            for inv in investors:
-                value = inv.current_shares * latest_nav.nav_per_share
-                percentage = (value / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
-                total_percentage += percentage
-                investor_values.append({
-                    'investor': inv.name,
-                    'shares': inv.current_shares,
+            total_percentage = valuation.total_portfolio_percent
+            investor_values = [
+                {
+                    'investor': name,
+                    'shares': shares,
                     'value': value,
                     'percentage': percentage
-                })
+                }
+                for name, shares, value, percentage in zip(
+                    valuation.name, valuation.current_shares,
+                    valuation.current_value, valuation.portfolio_percent)
+            ]
             
             percentages_valid = abs(total_percentage - 100.0) < 0.01
             
@@ -0,0 +1,319 @@
+"""
+Pipeline Runner
+Small dependency-aware task graph for multi-step jobs (the daily NAV update).
+
+Each PipelineStep declares:
+- depends_on: steps that must finish first
+- critical: a failure (or timeout) stops the pipeline - nothing new is
+  started and the remaining steps are marked skipped (fail-fast)
+- timeout: seconds before the step is marked 'timeout'
+
+Steps whose dependencies have finished run concurrently on daemon
+threads (up to max_workers at once).  A failed non-critical step does not
+block the steps that depend on it; dependencies only order the work.
+A step that times out may still be running (and writing), so every step
+that depends on it, directly or not, is skipped.  Other steps carry on,
+and run() waits for the timed-out step's thread before it returns so
+the process does not exit in the middle of its work.
+
+Resume: run(from_step='trade_sync') skips every step declared before
+trade_sync and treats it as already done.
+
+Per-step status and duration can be written to the pipeline_runs table
+with record_pipeline_run().  Each step also runs inside a tracing span
+named '<pipeline>.<step>' (src/monitoring/tracing.py), joined to the
+caller's trace.
+
+Usage:
+    from src.automation.pipeline import Pipeline, PipelineStep
+
+    pipeline = Pipeline('daily_nav', [
+        PipelineStep('balance', get_balance, critical=True),
+        PipelineStep('nav', write_nav, depends_on=('balance',), critical=True),
+        PipelineStep('snapshot', snapshot, depends_on=('nav',), timeout=120),
+    ])
+    report = pipeline.run()
+    print(report.summary())
+"""
+
+import contextvars
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.monitoring.tracing import span
+
+# Step outcomes (pipeline_runs.status)
+SUCCESS = 'success'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+SKIPPED = 'skipped'
+
+DEFAULT_MAX_WORKERS = 4
+
+@dataclass
+class PipelineStep:
+    """One unit of work in a Pipeline."""
+    name: str
+    func: Callable[[], Any]
+    depends_on: Sequence[str] = ()
+    critical: bool = False
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step in a pipeline run."""
+    name: str
+    status: str
+    critical: bool = False
+    started_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    value: Any = None
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of a Pipeline.run()."""
+    pipeline: str
+    run_id: str
+    results: Dict[str, StepResult] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """False if a critical step failed or timed out."""
+        return self.halted_by is None
+
+    @property
+    def halted_by(self) -> Optional[str]:
+        """Name of the critical step that stopped the run, if any."""
+        for r in self.results.values():
+            if r.critical and r.status in (FAILED, TIMEOUT):
+                return r.name
+        return None
+
+    def summary(self) -> str:
+        counts: Dict[str, int] = {}
+        for r in self.results.values():
+            counts[r.status] = counts.get(r.status, 0) + 1
+        parts = ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+        return f"{self.pipeline}: {parts} in {self.elapsed_seconds:.2f}s"
+
+
+class Pipeline:
+    """Runs PipelineSteps in dependency order, in parallel where possible."""
+
+    def __init__(self, name: str, steps: Sequence[PipelineStep],
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 on_event: Optional[Callable[[str, StepResult], None]] = None):
+        """
+        Args:
+            name: Pipeline name (pipeline_runs.pipeline)
+            steps: Steps in their declared (resume) order
+            max_workers: Maximum steps running at once
+            on_event: Called with ('start' | 'finish', StepResult) from
+                the scheduling thread
+        """
+        self.name = name
+        self.steps = list(steps)
+        self.max_workers = max(1, max_workers)
+        self.on_event = on_event
+        self._by_name = {s.name: s for s in self.steps}
+        self._validate()
+
+    @property
+    def step_names(self) -> List[str]:
+        return [s.name for s in self.steps]
+
+    def _validate(self):
+        if len(self._by_name) != len(self.steps):
+            raise ValueError(f"Duplicate step names in pipeline {self.name}")
+        for step in self.steps:
+            for dep in step.depends_on:
+                if dep not in self._by_name:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dep}")
+
+        # Cycle check (depth-first)
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dep in self._by_name[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 2
+
+        for step in self.steps:
+            visit(step.name, [])
+
+    def run(self, from_step: Optional[str] = None, run_id: Optional[str] = None) -> PipelineReport:
+        """Run the pipeline and return a PipelineReport.
+
+        Args:
+            from_step: Resume point; steps declared before it are skipped
+            run_id: Identifier stored with each step (default: timestamp)
+        """
+        if from_step is not None and from_step not in self._by_name:
+            raise ValueError(f"Unknown step: {from_step}")
+
+        report = PipelineReport(
+            pipeline=self.name,
+            run_id=run_id or datetime.now().strftime('%Y%m%d_%H%M%S_%f'),
+        )
+        started = time.perf_counter()
+
+        done = set()
+        if from_step is not None:
+            for step in self.steps[:self.step_names.index(from_step)]:
+                report.results[step.name] = StepResult(step.name, SKIPPED, step.critical,
+                                                       error=f'resumed from {from_step}')
+                done.add(step.name)
+
+        pending = [s for s in self.steps if s.name not in done]
+        running: Dict[str, tuple] = {}   # name -> (StepResult, deadline, thread)
+        abandoned: Dict[str, threading.Thread] = {}
+        finished: "queue.Queue" = queue.Queue()
+        halted = False
+
+        while pending or running:
+            # Start every step whose dependencies are done
+            if not halted:
+                for step in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+                    if all(dep in done for dep in step.depends_on):
+                        pending.remove(step)
+                        result, deadline, thread = self._start(step, finished)
+                        report.results[step.name] = result
+                        running[step.name] = (result, deadline, thread)
+
+            if not running:
+                break
+
+            # Wait for the next step to finish or the nearest deadline
+            deadlines = [d for _, d, _ in running.values() if d is not None]
+            wait = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            try:
+                name, value, error, duration_ms = finished.get(timeout=wait)
+            except queue.Empty:
+                name = None
+
+            if name is not None and name in running:
+                result, _, _ = running.pop(name)
+                result.duration_ms = round(duration_ms, 1)
+                result.value = value
+                if error is None:
+                    result.status = SUCCESS
+                else:
+                    result.status = FAILED
+                    result.error = f"{type(error).__name__}: {error}"
+                halted = self._finish(result, done, halted)
+
+            now = time.monotonic()
+            for step_name, (result, deadline, thread) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    running.pop(step_name)
+                    abandoned[step_name] = thread
+                    step = self._by_name[step_name]
+                    result.status = TIMEOUT
+                    result.duration_ms = round(step.timeout * 1000, 1)
+                    result.error = f"Timed out after {step.timeout:g}s"
+                    self._skip_dependents(step_name, pending, report)
+                    halted = self._finish(result, done, halted)
+
+        for step in pending:
+            report.results[step.name] = StepResult(step.name, SKIPPED, step.critical,
+                                                   error='not run: pipeline halted')
+
+        # Don't return (and let the process exit) while a timed-out step
+        # is still working
+        for thread in abandoned.values():
+            thread.join()
+        while not finished.empty():
+            name, _, error, duration_ms = finished.get()
+            if name in abandoned:
+                outcome = 'failed' if error is not None else 'finished'
+                report.results[name].error += f"; {outcome} after {duration_ms / 1000:.1f}s"
+
+        report.results = {n: report.results[n] for n in self.step_names}
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return report
+
+    def _start(self, step: PipelineStep, finished: "queue.Queue") -> tuple:
+        result = StepResult(step.name, 'running', step.critical, started_at=datetime.now())
+        if self.on_event:
+            self.on_event('start', result)
+
+        def target():
+            began = time.perf_counter()
+            try:
+                with span(f"{self.name}.{step.name}", critical=step.critical):
+                    value, error = step.func(), None
+            except Exception as e:
+                value, error = None, e
+            finished.put((step.name, value, error, (time.perf_counter() - began) * 1000))
+
+        # Copy the caller's context so step spans join the caller's trace
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(target,),
+                                  name=f"{self.name}:{step.name}", daemon=True)
+        thread.start()
+        deadline = time.monotonic() + step.timeout if step.timeout else None
+        return result, deadline, thread
+
+    def _skip_dependents(self, name: str, pending: List[PipelineStep],
+                         report: PipelineReport):
+        """Skip every pending step that depends, directly or not, on the
+        timed-out step."""
+        blocked = {name}
+        changed = True
+        while changed:
+            changed = False
+            for step in list(pending):
+                if blocked.intersection(step.depends_on):
+                    pending.remove(step)
+                    blocked.add(step.name)
+                    report.results[step.name] = StepResult(
+                        step.name, SKIPPED, step.critical, error=f'not run: {name} timed out')
+                    changed = True
+
+    def _finish(self, result: StepResult, done: set, halted: bool) -> bool:
+        if result.status != TIMEOUT:
+            done.add(result.name)
+        if self.on_event:
+            self.on_event('finish', result)
+        return halted or (result.critical and result.status != SUCCESS)
+
+
+def record_pipeline_run(db_path, report: PipelineReport):
+    """Write one pipeline_runs row per step in a single transaction.
+
+    Creates the table if the database predates it.
+    """
+    from src.database.schema_v2 import PIPELINE_RUNS_TABLE, PIPELINE_RUNS_INDEX
+
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    try:
+        conn.execute(PIPELINE_RUNS_TABLE)
+        conn.execute(PIPELINE_RUNS_INDEX)
+        conn.executemany("""
+            INSERT INTO pipeline_runs (run_id, pipeline, step_name, status, critical,
+                                       started_at, duration_ms, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (report.run_id, report.pipeline, r.name, r.status, int(r.critical),
+             r.started_at.isoformat() if r.started_at else None, r.duration_ms, r.error)
+            for r in report.results.values()
+        ])
+        conn.commit()
+    finally:
+        conn.close()
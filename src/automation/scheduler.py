@@ -1,21 +1,59 @@
 """
 Automated Task Scheduler
 Handles all scheduled tasks: daily NAV updates, reports, newsletters
+
+Jobs run on the event-driven JobScheduler (src/automation/job_scheduler.py)
+against a cached trading calendar (src/automation/market_calendar.py):
+- Daily NAV update: every trading day at the close (MARKET_CLOSE_TIME is
+  read as an offset from the 16:00 close, so early closes move it too)
+- Weekly newsletter: WEEKLY_NEWSLETTER_DAY at NEWSLETTER_TIME
+- Monthly reports: last trading day of the month at MONTHLY_REPORT_TIME
+
+Missed runs are caught up once after a restart.  A missed NAV update is
+only caught up before the next session opens: the NAV is valued from the
+live balance, so once trading has resumed the missed day is skipped,
+logged and alerted for a manual entry instead.  Monthly reports are not caught up (a
+late run would report on the wrong month).  Run state lives in the
+scheduler_state table.
 """
 
-import schedule
-import time
 import os
 from datetime import datetime, time as dt_time
 from dotenv import load_dotenv
 import pytz
 
+from src.automation.job_scheduler import (
+    Job,
+    JobScheduler,
+    last_trading_day_of_month_at,
+    trading_days_at,
+    weekly_at,
+)
+from src.automation.market_calendar import REGULAR_CLOSE, MarketCalendar
 from src.automation.nav_calculator import NAVCalculator
 from src.automation.email_service import EmailService
 from src.database.models import Database, SystemLog
 
 load_dotenv()
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def _parse_time(value: str) -> dt_time:
+    return datetime.strptime(value, '%H:%M').time()
+
+
+def _calendar_client():
+    """TradierClient for calendar refreshes, or None if not configured."""
+    if not os.getenv('TRADIER_API_KEY'):
+        return None
+    try:
+        from src.api.tradier import TradierClient
+        return TradierClient()
+    except Exception as e:
+        print(f"⚠️  Tradier calendar unavailable, using bundled holidays: {e}")
+        return None
+
 
 class TaskScheduler:
     """Manages all automated tasks"""
@@ -30,25 +68,46 @@ class TaskScheduler:
         self.market_close_time = os.getenv('MARKET_CLOSE_TIME', '16:00')
         self.auto_update_enabled = os.getenv('AUTO_UPDATE_ENABLED', 'true').lower() == 'true'
         self.notify_on_error = os.getenv('NOTIFY_ON_ERROR', 'true').lower() == 'true'
+
+        db_path = os.getenv('DATABASE_PATH', 'data/tovito.db')
+        self.calendar = MarketCalendar(db_path, client=_calendar_client())
+        self.scheduler = JobScheduler(db_path, tz=self.timezone)
     
-    def daily_nav_update(self):
+    def daily_nav_update(self, fire_at: datetime = None):
         """
         Daily NAV update task
         Runs at market close (4:00 PM ET by default)
+
+        Args:
+            fire_at: Scheduled slot; a catch-up run after a restart values
+                the missed slot's day, not the restart day (default: today)
         """
+        update_date = (fire_at or datetime.now(self.timezone)).date()
+
+        if fire_at is not None and self._session_opened_since(update_date):
+            # The live balance now includes later trading: recording it as
+            # the missed day's NAV would misprice every later transaction
+            message = (f'Missed NAV update for {update_date}: a trading session has '
+                       f'opened since, enter that day manually')
+            print(f"⚠️  {message}")
+            self._log_event('ERROR', 'DailyUpdate', message)
+            if self.notify_on_error:
+                self._send_error_notification("Daily NAV Update Missed", message)
+            return
+
         print(f"\n{'='*60}")
-        print(f"AUTOMATED DAILY NAV UPDATE - {datetime.now()}")
+        print(f"AUTOMATED DAILY NAV UPDATE - {update_date} (run at {datetime.now()})")
         print(f"{'='*60}\n")
         
         try:
             # Check if market is open (only update on trading days)
-            if not self._is_trading_day():
-                print("⏸️  Market is closed today (weekend/holiday)")
-                self._log_event('INFO', 'DailyUpdate', 'Skipped - Market closed')
+            if not self._is_trading_day(update_date):
+                print(f"⏸️  Market is closed on {update_date} (weekend/holiday)")
+                self._log_event('INFO', 'DailyUpdate', f'Skipped {update_date} - Market closed')
                 return
             
             # Perform the update
-            result = self.nav_calculator.fetch_and_update_nav()
+            result = self.nav_calculator.fetch_and_update_nav(update_date=update_date)
             
             if result['status'] == 'success':
                 print("\n✅ Daily NAV update completed successfully!")
@@ -133,15 +192,27 @@ class TaskScheduler:
                     str(e)
                 )
     
-    def _is_trading_day(self) -> bool:
-        """Check if today is a trading day"""
+    def _is_trading_day(self, day=None) -> bool:
+        """Check if a day (default today) is a trading day (cached market calendar)"""
+        if day is None:
+            day = datetime.now(self.timezone).date()
         try:
-            is_open = self.nav_calculator.brokerage.is_market_open()
-            return is_open
-        except:
+            return self.calendar.is_trading_day(day)
+        except Exception:
             # If can't check, assume it's a trading day (safer to update)
             return True
     
+    def _session_opened_since(self, day) -> bool:
+        """Whether the first trading session after `day` has already opened"""
+        try:
+            next_day = self.calendar.next_trading_day(day)
+            opens_at = self.timezone.localize(
+                datetime.combine(next_day, self.calendar.open_time(next_day)))
+        except Exception:
+            # Without a calendar, only the same evening is safe to catch up
+            return self.scheduler.clock().date() > day
+        return self.scheduler.clock() >= opens_at
+
     def _send_error_notification(self, subject: str, error: str):
         """Send error notification email"""
         try:
@@ -177,45 +248,44 @@ class TaskScheduler:
             return
         
         print("Setting up automated schedules...")
+        tz = self.timezone
         
-        # Daily NAV update at market close (4:00 PM ET)
-        schedule.every().day.at(self.market_close_time).do(self.daily_nav_update)
-        print(f"✅ Daily NAV update scheduled for {self.market_close_time} ET")
+        # Daily NAV update at market close, trading days only
+        close_offset = (datetime.combine(datetime.min, _parse_time(self.market_close_time))
+                        - datetime.combine(datetime.min, _parse_time(REGULAR_CLOSE)))
+        self.scheduler.add(Job('daily_nav_update', self.daily_nav_update,
+                               trading_days_at(self.calendar, close_offset, tz=tz),
+                               pass_slot=True))
+        print(f"✅ Daily NAV update scheduled for {self.market_close_time} ET on trading days "
+              f"(earlier on early-close days)")
         
         # Weekly newsletter (Sunday 6:00 PM)
         newsletter_day = os.getenv('WEEKLY_NEWSLETTER_DAY', 'sunday').lower()
         newsletter_time = os.getenv('NEWSLETTER_TIME', '18:00')
         
-        if newsletter_day == 'sunday':
-            schedule.every().sunday.at(newsletter_time).do(self.weekly_newsletter)
-        elif newsletter_day == 'saturday':
-            schedule.every().saturday.at(newsletter_time).do(self.weekly_newsletter)
-        elif newsletter_day == 'friday':
-            schedule.every().friday.at(newsletter_time).do(self.weekly_newsletter)
+        if newsletter_day in WEEKDAYS:
+            self.scheduler.add(Job('weekly_newsletter', self.weekly_newsletter,
+                                   weekly_at(WEEKDAYS.index(newsletter_day),
+                                             _parse_time(newsletter_time), tz=tz)))
+            print(f"✅ Weekly newsletter scheduled for {newsletter_day.title()} {newsletter_time}")
+        else:
+            print(f"⚠️  Unknown WEEKLY_NEWSLETTER_DAY '{newsletter_day}' - newsletter not scheduled")
         
-        print(f"✅ Weekly newsletter scheduled for {newsletter_day.title()} {newsletter_time}")
+        # Monthly reports (last trading day of month, 8:00 PM).  Not caught
+        # up: a late run would report on the month it runs in.
+        report_time = os.getenv('MONTHLY_REPORT_TIME', '20:00')
+        self.scheduler.add(Job('monthly_reports', self.monthly_reports,
+                               last_trading_day_of_month_at(self.calendar,
+                                                            _parse_time(report_time), tz=tz),
+                               catch_up=False))
+        print(f"✅ Monthly reports scheduled for last trading day of month at {report_time}")
         
-        # Monthly reports (last day of month, 8:00 PM)
-        # Note: We'll check daily if it's the last day of the month
-        schedule.every().day.at("20:00").do(self._check_monthly_reports)
-        print(f"✅ Monthly reports scheduled for last day of month at 20:00")
+        self.scheduler.start()
         
         print("\n🎉 All schedules configured!")
         print("\nScheduled tasks:")
-        for job in schedule.jobs:
-            print(f"  - {job}")
-    
-    def _check_monthly_reports(self):
-        """Check if today is last day of month and send reports"""
-        today = datetime.now().date()
-        
-        # Check if tomorrow is first day of next month
-        from datetime import timedelta
-        tomorrow = today + timedelta(days=1)
-        
-        if tomorrow.day == 1:
-            print("\n📅 Last day of month detected - running monthly reports...")
-            self.monthly_reports()
+        for fire_at, name in self.scheduler.next_runs():
+            print(f"  - {fire_at:%a %Y-%m-%d %H:%M %Z}  {name}")
     
     def run(self):
         """
@@ -238,9 +308,8 @@ class TaskScheduler:
         print(f"{'='*60}\n")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            # Sleeps until the next job is due (no polling)
+            self.scheduler.run_forever()
                 
         except KeyboardInterrupt:
             print("\n\n👋 Automation service stopped by user")
@@ -260,10 +329,6 @@ def test_schedules():
     """Test that schedules are set up correctly"""
     scheduler = TaskScheduler()
     scheduler.setup_schedules()
-    
-    print("\n📋 Next scheduled tasks:")
-    for job in schedule.jobs:
-        print(f"  - {job.next_run} - {job}")
 
 
 if __name__ == "__main__":
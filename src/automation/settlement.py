@@ -0,0 +1,559 @@
+"""
+Batch Settlement
+================
+Plans and applies fund flows and quarterly tax settlement as batches.
+
+plan_fund_flows() takes the matched fund_flow_requests (all of them, or
+the ids given) and works out the share accounting for every one.
+plan_quarterly_tax() takes a quarter's unsettled realized-gain tax
+events and works out the tax each investor pays by redeeming shares.
+
+Both look up every NAV they need in one query (resolve_navs), do the
+share and tax math in Decimal in a single pass, and return a
+SettlementPlan.  format_plan() renders the plan for review (the dry
+run); apply_plan() writes it in one transaction.
+
+A plan with errors is never applied, so a batch is all or nothing.
+Investors a tax plan cannot settle (plan.skipped) count as errors until
+the plan is acknowledged with acknowledge_skipped().
+apply_plan() also refuses a plan that has gone stale, i.e. a request
+was processed or an investor's balance changed after the plan was made.
+
+Usage:
+    from src.automation.settlement import plan_fund_flows, format_plan, apply_plan
+
+    plan = plan_fund_flows(conn)
+    print(format_plan(plan))
+    if not plan.errors:
+        apply_plan(conn, plan)
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TAX_RATE = Decimal('0.37')
+
+SHARES = Decimal('0.0001')
+CENTS = Decimal('0.01')
+ZERO = Decimal('0')
+
+# NAV for each target date: that date's NAV, else the most recent NAV
+# before it, else the most recent NAV (same fallbacks as the old
+# per-request lookup, in one statement)
+_NAV_SQL = """
+    WITH targets(target) AS (VALUES {values})
+    SELECT t.target, n.date, n.nav_per_share
+    FROM targets t
+    LEFT JOIN daily_nav n ON n.date = COALESCE(
+        (SELECT MAX(date) FROM daily_nav WHERE date <= t.target),
+        (SELECT MAX(date) FROM daily_nav)
+    )
+"""
+
+_FLOWS_SQL = """
+    SELECT ffr.request_id, ffr.investor_id, ffr.flow_type,
+           COALESCE(ffr.actual_amount, ffr.requested_amount),
+           COALESCE(SUBSTR(ffr.matched_date, 1, 10), ffr.request_date),
+           ffr.matched_trade_id,
+           i.name, i.email, i.current_shares, i.net_investment
+    FROM fund_flow_requests ffr
+    JOIN investors i ON ffr.investor_id = i.investor_id
+    WHERE ffr.status = 'matched' {where}
+    ORDER BY ffr.request_date, ffr.request_id
+"""
+
+_TAX_EVENTS_SQL = """
+    SELECT te.rowid, te.investor_id, te.realized_gain,
+           i.name, i.email, i.current_shares, i.net_investment
+    FROM tax_events te
+    JOIN investors i ON te.investor_id = i.investor_id
+    WHERE te.event_type = 'Realized_Gain'
+      AND te.date BETWEEN ? AND ?
+      AND te.tax_due = 0
+      AND te.realized_gain > 0
+    ORDER BY i.name, te.investor_id, te.date
+"""
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def _shares(value: Decimal) -> Decimal:
+    return value.quantize(SHARES, rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class SettlementItem:
+    """One fund flow or one investor's tax payment in a plan."""
+
+    kind: str                       # 'contribution', 'withdrawal' or 'tax_payment'
+    investor_id: str
+    investor_name: str
+    date: str
+    amount: Decimal
+    nav_per_share: Optional[Decimal] = None
+    nav_date: Optional[str] = None
+    shares_transacted: Decimal = ZERO   # Issued or redeemed, always positive
+    shares_before: Decimal = ZERO
+    shares_after: Decimal = ZERO
+    net_investment_before: Decimal = ZERO
+    net_investment_after: Decimal = ZERO
+    realized_gain: Decimal = ZERO
+    email: Optional[str] = None
+    request_id: Optional[int] = None
+    matched_trade_id: Optional[int] = None
+    tax_event_ids: List[int] = field(default_factory=list)
+    tax_event_amounts: List[Decimal] = field(default_factory=list)
+    error: Optional[str] = None
+    transaction_id: Optional[int] = None  # Set by apply_plan()
+
+    @property
+    def label(self) -> str:
+        return f"#{self.request_id}" if self.request_id is not None else self.investor_id
+
+
+@dataclass
+class SettlementPlan:
+    """A reviewable batch of settlement items."""
+
+    kind: str                       # 'fund_flows' or 'quarterly_tax'
+    title: str
+    items: List[SettlementItem] = field(default_factory=list)
+    skipped: List[Tuple[SettlementItem, str]] = field(default_factory=list)
+    reference_id: Optional[str] = None  # Quarterly tax only
+    nav_date: Optional[str] = None      # Quarterly tax only
+    tax_rate: Optional[Decimal] = None  # Quarterly tax only
+    skipped_acknowledged: bool = False
+
+    @property
+    def errors(self) -> List[str]:
+        errors = [f"{item.label}: {item.error}" for item in self.items if item.error]
+        if not self.skipped_acknowledged:
+            errors += [f"{item.label}: not settled, {reason}" for item, reason in self.skipped]
+        return errors
+
+    def acknowledge_skipped(self):
+        """Accept that the skipped items stay unsettled, so the rest can be applied."""
+        self.skipped_acknowledged = True
+
+    @property
+    def total_amount(self) -> Decimal:
+        return sum((item.amount for item in self.items), ZERO)
+
+    @property
+    def total_shares(self) -> Decimal:
+        return sum((item.shares_transacted for item in self.items), ZERO)
+
+    def investor_changes(self) -> Dict[str, Dict]:
+        """Each investor's balances before the first and after the last item."""
+        changes = {}
+        for item in self.items:
+            change = changes.setdefault(item.investor_id, {
+                'name': item.investor_name,
+                'shares_before': item.shares_before,
+                'net_investment_before': item.net_investment_before,
+            })
+            change['shares_after'] = item.shares_after
+            change['net_investment_after'] = item.net_investment_after
+        return changes
+
+
+def resolve_navs(conn: sqlite3.Connection,
+                 dates: Sequence[str]) -> Dict[str, Tuple[str, Decimal]]:
+    """
+    NAV per share (4 decimal places) for each date, in one query.
+
+    Returns:
+        dict: target date -> (date of the NAV used, nav_per_share).
+        Dates are missing when there is no NAV at all.
+    """
+    targets = sorted(set(dates))
+    if not targets:
+        return {}
+
+    sql = _NAV_SQL.format(values=', '.join('(?)' for _ in targets))
+    return {
+        target: (nav_date, Decimal(str(round(nav, 4))))
+        for target, nav_date, nav in conn.execute(sql, targets).fetchall()
+        if nav is not None
+    }
+
+
+def quarter_dates(year: int, quarter: int) -> Tuple[str, str]:
+    """First and last day of a calendar quarter as ISO dates."""
+    if quarter not in (1, 2, 3, 4):
+        raise ValueError(f"Quarter must be 1-4, got {quarter}")
+    first_month = 3 * (quarter - 1) + 1
+    start = date(year, first_month, 1)
+    end = date(year + 1, 1, 1) if quarter == 4 else date(year, first_month + 3, 1)
+    return start.isoformat(), date.fromordinal(end.toordinal() - 1).isoformat()
+
+
+def plan_fund_flows(conn: sqlite3.Connection,
+                    request_ids: Optional[Sequence[int]] = None) -> SettlementPlan:
+    """
+    Plan the share accounting for matched fund flow requests.
+
+    Requests are settled in request_date order.  Several requests for
+    the same investor build on each other, exactly as if they had been
+    processed one after another.
+
+    Args:
+        conn: Database connection
+        request_ids: Requests to settle (default: every matched request)
+
+    Returns:
+        SettlementPlan.  Withdrawals larger than the investor's value
+        and requests without a NAV are reported in plan.errors.
+    """
+    where, params = "", ()
+    if request_ids is not None:
+        if not request_ids:
+            return SettlementPlan(kind='fund_flows', title='FUND FLOWS')
+        where = f"AND ffr.request_id IN ({', '.join('?' * len(request_ids))})"
+        params = tuple(request_ids)
+    rows = conn.execute(_FLOWS_SQL.format(where=where), params).fetchall()
+
+    navs = resolve_navs(conn, [row[4] for row in rows])
+    balances = {}
+    plan = SettlementPlan(kind='fund_flows', title='FUND FLOWS')
+
+    for (request_id, investor_id, flow_type, amount, flow_date, trade_id,
+         name, email, current_shares, net_investment) in rows:
+        shares, invested = balances.get(
+            investor_id, (_dec(current_shares), _dec(net_investment)))
+        item = SettlementItem(
+            kind=flow_type, investor_id=investor_id, investor_name=name,
+            date=flow_date, amount=_dec(amount), email=email,
+            request_id=request_id, matched_trade_id=trade_id,
+            shares_before=shares, shares_after=shares,
+            net_investment_before=invested, net_investment_after=invested,
+        )
+        plan.items.append(item)
+
+        if flow_date not in navs:
+            item.error = "No NAV available"
+            continue
+        item.nav_date, nav = navs[flow_date]
+        item.nav_per_share = nav
+        item.shares_transacted = _shares(item.amount / nav)
+
+        if flow_type == 'contribution':
+            item.shares_after = shares + item.shares_transacted
+            item.net_investment_after = invested + item.amount
+        else:
+            current_value = shares * nav
+            if item.amount > current_value:
+                item.error = (f"Withdrawal ${float(item.amount):,.2f} exceeds "
+                              f"current value ${float(current_value):,.2f}")
+                continue
+
+            # Proportional gain allocation; tax is settled quarterly
+            proportion = item.amount / current_value if current_value > 0 else ZERO
+            item.realized_gain = _money(max(ZERO, current_value - invested) * proportion)
+            item.shares_after = shares - item.shares_transacted
+            item.net_investment_after = invested - _money(invested * proportion)
+
+        balances[investor_id] = (item.shares_after, item.net_investment_after)
+
+    return plan
+
+
+def plan_quarterly_tax(conn: sqlite3.Connection, year: int, quarter: int,
+                       tax_rate: Decimal = TAX_RATE,
+                       settle_date: Optional[str] = None) -> SettlementPlan:
+    """
+    Plan the quarter's tax settlement from its realized-gain tax events.
+
+    Each unsettled Realized_Gain event in the quarter is taxed at
+    tax_rate (rounded per event), and each investor pays their total by
+    redeeming shares at the NAV on settle_date.  Investors without
+    enough shares (e.g. fully withdrawn or closed accounts) are listed in
+    plan.skipped and reported in plan.errors until acknowledged; their
+    events stay unsettled and must be settled by hand (see
+    scripts/tax/quarterly_tax_payment.py).
+
+    Args:
+        conn: Database connection
+        year: Tax year
+        quarter: Quarter (1-4)
+        tax_rate: Tax rate on realized gains
+        settle_date: Payment date (default: today)
+
+    Returns:
+        SettlementPlan with one tax_payment item per investor
+    """
+    start, end = quarter_dates(year, quarter)
+    settle_date = settle_date or date.today().isoformat()
+    plan = SettlementPlan(kind='quarterly_tax', title=f"Q{quarter} {year} TAX",
+                          reference_id=f"tax-{year}-Q{quarter}", tax_rate=tax_rate)
+
+    by_investor = {}
+    for (event_id, investor_id, gain, name, email,
+         current_shares, net_investment) in conn.execute(_TAX_EVENTS_SQL, (start, end)).fetchall():
+        item = by_investor.get(investor_id)
+        if item is None:
+            shares, invested = _dec(current_shares), _dec(net_investment)
+            item = by_investor[investor_id] = SettlementItem(
+                kind='tax_payment', investor_id=investor_id, investor_name=name,
+                date=settle_date, amount=ZERO, email=email,
+                shares_before=shares, net_investment_before=invested,
+                net_investment_after=invested,
+            )
+        event_tax = _money(_dec(gain) * tax_rate)
+        item.realized_gain += _dec(gain)
+        item.amount += event_tax
+        item.tax_event_ids.append(event_id)
+        item.tax_event_amounts.append(event_tax)
+
+    if not by_investor:
+        return plan
+
+    navs = resolve_navs(conn, [settle_date])
+    nav_date, nav = navs.get(settle_date, (None, None))
+    plan.nav_date = nav_date
+
+    for item in by_investor.values():
+        item.nav_date, item.nav_per_share = nav_date, nav
+        if nav is None:
+            item.error = "No NAV available"
+            plan.items.append(item)
+            continue
+        item.shares_transacted = _shares(item.amount / nav)
+        item.shares_after = item.shares_before - item.shares_transacted
+        if item.shares_after < 0:
+            plan.skipped.append((item, f"only {float(item.shares_before):,.4f} shares "
+                                       f"to pay ${float(item.amount):,.2f}"))
+            continue
+        plan.items.append(item)
+
+    return plan
+
+
+def format_plan(plan: SettlementPlan) -> str:
+    """Render a plan for review before it is applied."""
+    lines = [f"{plan.title} SETTLEMENT PLAN ({len(plan.items)} items)", "-" * 60]
+    if plan.nav_date:
+        lines.append(f"  NAV date: {plan.nav_date}")
+
+    for item in plan.items:
+        if item.kind == 'tax_payment':
+            detail = f"gain ${float(item.realized_gain):>10,.2f}  tax"
+        else:
+            detail = f"{item.kind:>12}  {item.date}"
+        nav = f"@ ${float(item.nav_per_share):,.4f}" if item.nav_per_share else "@ (no NAV)"
+        sign = '+' if item.kind == 'contribution' else '-'
+        lines.append(f"  {item.label:>5}  {detail}  ${float(item.amount):>10,.2f} {nav}  "
+                     f"{sign}{float(item.shares_transacted):,.4f} sh  {item.investor_name}")
+        if item.realized_gain and item.kind == 'withdrawal':
+            lines.append(f"         realized gain ${float(item.realized_gain):,.2f} "
+                         f"(tax settled quarterly)")
+
+    changes = plan.investor_changes()
+    if changes:
+        lines += ["", "INVESTOR CHANGES"]
+        for investor_id, change in changes.items():
+            share_diff = change['shares_after'] - change['shares_before']
+            invested_diff = change['net_investment_after'] - change['net_investment_before']
+            lines.append(f"  {change['name']} ({investor_id})")
+            lines.append(f"    shares:         {float(change['shares_before']):,.4f} -> "
+                         f"{float(change['shares_after']):,.4f}  ({float(share_diff):+,.4f})")
+            if invested_diff:
+                lines.append(f"    net investment: ${float(change['net_investment_before']):,.2f} -> "
+                             f"${float(change['net_investment_after']):,.2f}  "
+                             f"({float(invested_diff):+,.2f})")
+
+    if plan.skipped and plan.skipped_acknowledged:
+        lines += ["", "SKIPPED (acknowledged, tax stays unsettled)"]
+        lines += [f"  {item.investor_name} ({item.investor_id}): {reason}"
+                  for item, reason in plan.skipped]
+
+    if plan.errors:
+        lines += ["", "ERRORS (nothing will be applied)"]
+        lines += [f"  {error}" for error in plan.errors]
+
+    lines += ["-" * 60, f"  Total: ${float(plan.total_amount):,.2f}  "
+                        f"({float(plan.total_shares):,.4f} shares)"]
+    return '\n'.join(lines)
+
+
+def _check_rowcount(cursor, expected: int, what: str):
+    if cursor.rowcount != expected:
+        raise ValueError(f"Plan is out of date: {what} changed since it was made")
+
+
+def _write_fund_flows(conn, plan, now):
+    for item in plan.items:
+        sign = 1 if item.kind == 'contribution' else -1
+        cursor = conn.execute("""
+            INSERT INTO transactions (
+                date, investor_id, transaction_type, amount,
+                shares_transacted, nav_per_share, description,
+                reference_id, notes, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            item.date,
+            item.investor_id,
+            item.kind.title(),
+            float(sign * item.amount),
+            float(sign * item.shares_transacted),
+            float(item.nav_per_share),
+            f"{item.kind.title()} of ${float(item.amount):,.2f} "
+            f"at NAV ${float(item.nav_per_share):,.4f}",
+            f"ffr-{item.request_id}",
+            f"Fund flow request #{item.request_id}",
+            now, now,
+        ))
+        item.transaction_id = cursor.lastrowid
+
+    # Realized gains are recorded for quarterly settlement, not withheld
+    conn.executemany("""
+        INSERT INTO tax_events (
+            date, investor_id, event_type, withdrawal_amount,
+            realized_gain, tax_rate, tax_due, net_proceeds,
+            reference_id, created_at, updated_at
+        ) VALUES (?, ?, 'Realized_Gain', ?, ?, ?, 0.0, ?, ?, ?, ?)
+    """, [
+        (item.date, item.investor_id, float(item.amount), float(item.realized_gain),
+         float(TAX_RATE), float(item.amount), f"ffr-{item.request_id}", now, now)
+        for item in plan.items if item.realized_gain > 0
+    ])
+
+    cursor = conn.executemany("""
+        UPDATE fund_flow_requests
+        SET status = 'processed',
+            processed_date = ?,
+            actual_amount = ?,
+            shares_transacted = ?,
+            nav_per_share = ?,
+            transaction_id = ?,
+            realized_gain = ?,
+            tax_withheld = 0,
+            net_proceeds = ?,
+            updated_at = ?
+        WHERE request_id = ? AND status = 'matched'
+    """, [
+        (now, float(item.amount), float(item.shares_transacted), float(item.nav_per_share),
+         item.transaction_id, float(item.realized_gain), float(item.amount), now,
+         item.request_id)
+        for item in plan.items
+    ])
+    _check_rowcount(cursor, len(plan.items), "a fund flow request")
+
+    conn.executemany("""
+        INSERT INTO system_logs (timestamp, level, category, message, details)
+        VALUES (?, 'INFO', 'Fund Flow', ?, ?)
+    """, [
+        (now,
+         f"Fund flow request #{item.request_id} processed: "
+         f"{item.kind} ${float(item.amount):,.2f} for {item.investor_id}",
+         f"transaction_id={item.transaction_id}, "
+         f"shares={float(item.shares_transacted):.4f}, "
+         f"nav={float(item.nav_per_share):.4f}")
+        for item in plan.items
+    ])
+
+
+def _write_quarterly_tax(conn, plan, now):
+    for item in plan.items:
+        cursor = conn.execute("""
+            INSERT INTO transactions (
+                date, investor_id, transaction_type, amount,
+                shares_transacted, nav_per_share, description,
+                reference_id, notes, created_at, updated_at
+            ) VALUES (?, ?, 'Tax_Payment', ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            item.date,
+            item.investor_id,
+            float(-item.amount),
+            float(-item.shares_transacted),
+            float(item.nav_per_share),
+            f"Tax of ${float(item.amount):,.2f} on "
+            f"${float(item.realized_gain):,.2f} realized gains",
+            plan.reference_id,
+            f"{plan.title.title()} settlement",
+            now, now,
+        ))
+        item.transaction_id = cursor.lastrowid
+
+    events = [(float(tax), now, event_id)
+              for item in plan.items
+              for event_id, tax in zip(item.tax_event_ids, item.tax_event_amounts)]
+    cursor = conn.executemany("""
+        UPDATE tax_events SET tax_due = ?, updated_at = ?
+        WHERE rowid = ? AND tax_due = 0
+    """, events)
+    _check_rowcount(cursor, len(events), "a tax event")
+
+    # The tax leaves the fund: keep the NAV row's totals in step
+    conn.execute("""
+        UPDATE daily_nav
+        SET total_portfolio_value = ROUND(total_portfolio_value - ?, 2),
+            total_shares = ROUND(total_shares - ?, 4)
+        WHERE date = ?
+    """, (float(plan.total_amount), float(plan.total_shares), plan.nav_date))
+
+    conn.execute("""
+        INSERT INTO system_logs (timestamp, level, category, message, details)
+        VALUES (?, 'INFO', 'Tax', ?, ?)
+    """, (
+        now,
+        f"{plan.title.title()} settled: ${float(plan.total_amount):,.2f} "
+        f"for {len(plan.items)} investors",
+        f"reference_id={plan.reference_id}, events={len(events)}, "
+        f"shares={float(plan.total_shares):.4f}",
+    ))
+
+
+def apply_plan(conn: sqlite3.Connection, plan: SettlementPlan) -> SettlementPlan:
+    """
+    Write a plan in one transaction.
+
+    Sets transaction_id on each item.
+
+    Raises:
+        ValueError: The plan has errors, or is out of date (nothing is
+            written in either case)
+    """
+    if plan.errors:
+        raise ValueError(f"Plan has {len(plan.errors)} error(s): {plan.errors[0]}")
+    if not plan.items:
+        return plan
+
+    now = datetime.now().isoformat()
+    try:
+        changes = plan.investor_changes()
+        cursor = conn.executemany("""
+            UPDATE investors
+            SET current_shares = ?,
+                net_investment = ?,
+                updated_at = ?
+            WHERE investor_id = ? AND current_shares = ? AND net_investment = ?
+        """, [
+            (float(change['shares_after']), float(change['net_investment_after']), now,
+             investor_id, float(change['shares_before']), float(change['net_investment_before']))
+            for investor_id, change in changes.items()
+        ])
+        _check_rowcount(cursor, len(changes), "an investor's balance")
+
+        if plan.kind == 'fund_flows':
+            _write_fund_flows(conn, plan, now)
+        else:
+            _write_quarterly_tax(conn, plan, now)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        for item in plan.items:
+            item.transaction_id = None
+        raise
+
+    return plan
@@ -0,0 +1,196 @@
+"""
+Fund Valuation
+==============
+Values investors against the latest NAV with a single query.
+
+value_fund() reads every active investor's shares and net investment
+together with the latest daily_nav row in one statement, then derives
+current value, gain, estimated tax, after-tax value, returns and share
+of the fund in one pass.  Valuing the fund costs the same one query
+however many investors there are.
+
+The result is columnar (one list per field, in investor_id order), so a
+caller that only needs totals or one field never builds per-investor
+dicts.  row() and rows() give the dict shape that
+NAVCalculator.get_investor_value() returns.
+
+Used by NAVCalculator, the daily NAV pipeline's reconciliation and the
+monthly statements (scripts/reporting/generate_monthly_report.py).
+
+Usage:
+    from src.automation.valuation import value_fund
+
+    valuation = value_fund(conn)
+    print(valuation.total_value, valuation.row('20260101-01A')['after_tax_value'])
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, List, Optional, Sequence
+
+from src.utils.rounding import round_dollars, round_pct
+
+# Estimated tax on unrealized gains (NAVCalculator reads TAX_RATE instead)
+DEFAULT_TAX_RATE = 0.37
+
+def active_investor_filter(alias: str = "") -> str:
+    """SQL predicate selecting active investors.
+
+    A missing or empty status counts as active.  The daily NAV's total
+    shares and every valuation use this, so the two always agree.
+    """
+    column = f"{alias}.status" if alias else "status"
+    return f"({column} = 'Active' OR {column} IS NULL OR {column} = '')"
+
+
+# Investors joined to the latest NAV row.  A LEFT JOIN so investors are
+# still returned (with NULL NAV columns) before any NAV exists.
+_VALUATION_SQL = """
+    WITH latest AS (
+        SELECT date, nav_per_share, total_portfolio_value, total_shares
+        FROM daily_nav
+        ORDER BY date DESC
+        LIMIT 1
+    )
+    SELECT
+        i.investor_id,
+        i.name,
+        i.current_shares,
+        i.net_investment,
+        latest.date,
+        latest.nav_per_share,
+        latest.total_portfolio_value,
+        latest.total_shares
+    FROM investors i
+    LEFT JOIN latest ON 1 = 1
+    WHERE {where}
+    ORDER BY i.investor_id
+"""
+
+
+@dataclass
+class FundValuation:
+    """Every valued investor's position, one list per column."""
+
+    # Per-investor columns, in output order
+    COLUMNS: ClassVar[tuple] = (
+        'investor_id', 'name', 'current_shares', 'net_investment',
+        'current_value', 'total_gain', 'unrealized_gain', 'tax_liability',
+        'after_tax_value', 'total_return_percent', 'after_tax_return_percent',
+        'portfolio_percent',
+    )
+
+    nav_date: Optional[str] = None
+    nav_per_share: Optional[float] = None
+    total_portfolio_value: Optional[float] = None
+    nav_total_shares: Optional[float] = None     # daily_nav.total_shares
+    tax_rate: float = DEFAULT_TAX_RATE
+
+    investor_id: List[str] = field(default_factory=list)
+    name: List[str] = field(default_factory=list)
+    current_shares: List[float] = field(default_factory=list)
+    net_investment: List[float] = field(default_factory=list)
+    current_value: List[float] = field(default_factory=list)
+    total_gain: List[float] = field(default_factory=list)         # Signed
+    unrealized_gain: List[float] = field(default_factory=list)    # Taxable, never negative
+    tax_liability: List[float] = field(default_factory=list)
+    after_tax_value: List[float] = field(default_factory=list)
+    total_return_percent: List[float] = field(default_factory=list)
+    after_tax_return_percent: List[float] = field(default_factory=list)
+    portfolio_percent: List[float] = field(default_factory=list)  # Unrounded
+
+    def __len__(self) -> int:
+        return len(self.investor_id)
+
+    @property
+    def total_shares(self) -> float:
+        return sum(self.current_shares)
+
+    @property
+    def total_value(self) -> float:
+        return round_dollars(sum(self.current_value))
+
+    @property
+    def total_portfolio_percent(self) -> float:
+        return sum(self.portfolio_percent)
+
+    def row(self, investor_id: str) -> Optional[Dict]:
+        """One investor's position as a dict, or None if not valued."""
+        try:
+            index = self.investor_id.index(investor_id)
+        except ValueError:
+            return None
+        return self._row(index)
+
+    def rows(self) -> List[Dict]:
+        return [self._row(index) for index in range(len(self))]
+
+    def _row(self, index: int) -> Dict:
+        row = {column: getattr(self, column)[index] for column in self.COLUMNS}
+        row['share_price'] = self.nav_per_share
+        return row
+
+
+def value_fund(conn: sqlite3.Connection, tax_rate: float = DEFAULT_TAX_RATE,
+               investor_ids: Optional[Sequence[str]] = None) -> FundValuation:
+    """
+    Value investors against the latest NAV.
+
+    Args:
+        conn: Database connection
+        tax_rate: Estimated tax rate on unrealized gains
+        investor_ids: Value these investors whatever their status
+            (default: every active investor)
+
+    Returns:
+        FundValuation.  Its NAV fields are None when there is no NAV yet
+        or no investor matched.
+    """
+    if investor_ids is None:
+        where, params = active_investor_filter("i"), ()
+    else:
+        where = f"i.investor_id IN ({', '.join('?' * len(investor_ids))})"
+        params = tuple(investor_ids)
+        if not params:
+            return FundValuation(tax_rate=tax_rate)
+
+    rows = conn.execute(_VALUATION_SQL.format(where=where), params).fetchall()
+    if not rows:
+        return FundValuation(tax_rate=tax_rate)
+
+    _, _, _, _, nav_date, nav, portfolio_value, nav_total_shares = rows[0]
+    valuation = FundValuation(nav_date=nav_date, nav_per_share=nav,
+                              total_portfolio_value=portfolio_value,
+                              nav_total_shares=nav_total_shares, tax_rate=tax_rate)
+    valuation.investor_id = [r[0] for r in rows]
+    valuation.name = [r[1] for r in rows]
+    valuation.current_shares = [r[2] or 0.0 for r in rows]
+    valuation.net_investment = [r[3] or 0.0 for r in rows]
+
+    if nav is None:
+        for column in FundValuation.COLUMNS[4:]:
+            setattr(valuation, column, [None] * len(rows))
+        return valuation
+
+    # Same rounding as NAVCalculator.get_investor_value() has always used
+    for shares, invested in zip(valuation.current_shares, valuation.net_investment):
+        value = round_dollars(shares * nav)
+        gain = round_dollars(max(0, value - invested))
+        tax = round_dollars(gain * tax_rate)
+        after_tax = round_dollars(value - tax)
+
+        valuation.current_value.append(value)
+        valuation.total_gain.append(round_dollars(value - invested))
+        valuation.unrealized_gain.append(gain)
+        valuation.tax_liability.append(tax)
+        valuation.after_tax_value.append(after_tax)
+        if invested > 0:
+            valuation.total_return_percent.append(round_pct((value - invested) / invested * 100))
+            valuation.after_tax_return_percent.append(round_pct((after_tax - invested) / invested * 100))
+        else:
+            valuation.total_return_percent.append(0.0)
+            valuation.after_tax_return_percent.append(0.0)
+        valuation.portfolio_percent.append(
+            shares * nav / portfolio_value * 100 if portfolio_value else 0.0)
+
+    return valuation
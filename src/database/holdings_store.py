@@ -0,0 +1,368 @@
+"""
+Holdings Snapshot Storage
+=========================
+Compact storage for the daily per-position holdings snapshots.
+
+Instead of one row per position per day, positions are stored as:
+
+- position_symbols:  one row per symbol (with its underlying, instrument
+                     type and option contract details)
+- position_history:  one row per stretch of snapshots during which a
+                     position was unchanged, valid from valid_from up to
+                     (not including) valid_to
+
+A snapshot only writes rows for positions that were opened, closed or
+changed since the source's previous snapshot, so storage grows with
+portfolio activity instead of days x positions.  Snapshot headers stay
+in holdings_snapshots, and the position_snapshots view rebuilds the full
+positions of any snapshot with the original columns, so existing
+queries keep working.
+
+A database with the original position_snapshots table is converted the
+first time ensure_holdings_schema() runs; the old table is kept as
+position_snapshots_legacy.
+
+Usage:
+    from src.database.holdings_store import write_holdings_snapshots, get_holdings_as_of
+
+    write_holdings_snapshots(conn, '2026-03-06', {'tradier': positions})
+    positions = get_holdings_as_of(conn, '2026-03-08')
+"""
+
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEGACY_TABLE = 'position_snapshots_legacy'
+
+# Contract details stored once per symbol in position_symbols
+SYMBOL_FIELDS = ('symbol', 'underlying_symbol', 'instrument_type', 'option_type',
+                 'strike', 'expiration_date', 'multiplier')
+
+# Values tracked over time in position_history
+VALUE_FIELDS = ('quantity', 'average_open_price', 'close_price',
+                'market_value', 'cost_basis', 'unrealized_pl')
+
+# (symbol_id, lot) -> VALUE_FIELDS tuple; lot numbers repeated symbols
+# within one snapshot
+PositionState = Dict[Tuple[int, int], Tuple]
+
+
+# ============================================================
+# SCHEMA
+# ============================================================
+
+def _object_type(conn: sqlite3.Connection, name: str) -> Optional[str]:
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _create_tables(conn: sqlite3.Connection) -> None:
+    from src.database.schema_v2 import (
+        HOLDINGS_SNAPSHOTS_TABLE,
+        POSITION_HISTORY_TABLE,
+        POSITION_SNAPSHOTS_VIEW,
+        POSITION_STORAGE_INDEXES,
+        POSITION_SYMBOLS_TABLE,
+    )
+
+    conn.execute(HOLDINGS_SNAPSHOTS_TABLE)
+    conn.execute(POSITION_SYMBOLS_TABLE)
+    conn.execute(POSITION_HISTORY_TABLE)
+    for index in POSITION_STORAGE_INDEXES:
+        conn.execute(index)
+    conn.execute(POSITION_SNAPSHOTS_VIEW)
+
+
+def ensure_holdings_schema(conn: sqlite3.Connection) -> None:
+    """
+    Create the compact holdings tables and the position_snapshots view.
+
+    Converts an original position_snapshots table first if there is one.
+    """
+    if _object_type(conn, 'position_snapshots') == 'table':
+        migrate_legacy_snapshots(conn)
+    else:
+        _create_tables(conn)
+
+
+def migrate_legacy_snapshots(conn: sqlite3.Connection) -> int:
+    """
+    Convert an original position_snapshots table to compact storage.
+
+    The table is renamed to position_snapshots_legacy and every snapshot
+    is replayed in date order per source, in one transaction.
+
+    Returns:
+        Number of snapshots converted (0 if there was nothing to convert).
+    """
+    if _object_type(conn, 'position_snapshots') != 'table':
+        return 0
+    if _object_type(conn, LEGACY_TABLE):
+        raise RuntimeError(f"Cannot convert position_snapshots: {LEGACY_TABLE} already exists")
+
+    # ALTER TABLE would otherwise commit on its own
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    with conn:
+        conn.execute(f"ALTER TABLE position_snapshots RENAME TO {LEGACY_TABLE}")
+        _create_tables(conn)
+
+        snapshots = conn.execute("""
+            SELECT snapshot_id, source, date FROM holdings_snapshots
+            ORDER BY source, date
+        """).fetchall()
+        columns = ', '.join(SYMBOL_FIELDS + VALUE_FIELDS)
+        for snapshot_id, source, snapshot_date in snapshots:
+            cursor = conn.execute(
+                f"SELECT {columns} FROM {LEGACY_TABLE} WHERE snapshot_id = ? ORDER BY position_id",
+                (snapshot_id,),
+            )
+            positions = [dict(zip(SYMBOL_FIELDS + VALUE_FIELDS, row)) for row in cursor]
+            _append_state(conn, source, snapshot_date, _to_state(conn, positions))
+
+    logger.info(f"Converted {len(snapshots)} holdings snapshots to compact storage")
+    return len(snapshots)
+
+
+# ============================================================
+# WRITES
+# ============================================================
+
+def _normalize_key(key: Tuple) -> Tuple:
+    """
+    Collapse the values idx_position_symbols_key treats as equal.
+
+    The index compares IFNULL(text, '') and IFNULL(number, -1), so '' and
+    NULL (and -1 and NULL) are the same symbol; both become None here.
+    """
+    symbol, underlying, instrument_type, option_type, strike, expiration, multiplier = key
+    return (
+        symbol,
+        underlying or None,
+        instrument_type or None,
+        option_type or None,
+        float(strike) if strike is not None and strike != -1 else None,
+        str(expiration) if expiration not in (None, '') else None,
+        int(multiplier) if multiplier is not None and multiplier != -1 else None,
+    )
+
+
+def _symbol_key(position: Dict) -> Tuple:
+    return _normalize_key((position['symbol'],) +
+                          tuple(position.get(field) for field in SYMBOL_FIELDS[1:]))
+
+
+def _symbol_ids(conn: sqlite3.Connection, keys) -> Dict[Tuple, int]:
+    """symbol_id for each key, adding new symbols to position_symbols."""
+    keys = set(keys)
+    if not keys:
+        return {}
+
+    placeholders = ', '.join('?' * len(SYMBOL_FIELDS))
+    conn.executemany(
+        f"INSERT OR IGNORE INTO position_symbols ({', '.join(SYMBOL_FIELDS)}) "
+        f"VALUES ({placeholders})",
+        sorted(keys, key=repr),
+    )
+
+    # Rows written before normalization may hold '' or -1 where the key
+    # has None, so compare them the way the unique index does
+    symbols = sorted({key[0] for key in keys})
+    rows = conn.execute(
+        f"SELECT symbol_id, {', '.join(SYMBOL_FIELDS)} FROM position_symbols "
+        f"WHERE symbol IN ({', '.join('?' * len(symbols))})",
+        symbols,
+    ).fetchall()
+    ids = {_normalize_key(tuple(row[1:])): row[0] for row in rows}
+    return {key: ids[key] for key in keys}
+
+
+def _to_state(conn: sqlite3.Connection, positions: List[Dict]) -> PositionState:
+    keys = [_symbol_key(p) for p in positions]
+    ids = _symbol_ids(conn, keys)
+
+    state = {}
+    lots = {}
+    for key, position in zip(keys, positions):
+        symbol_id = ids[key]
+        lot = lots.get(symbol_id, 0)
+        lots[symbol_id] = lot + 1
+        values = tuple(position.get(field) for field in VALUE_FIELDS)
+        state[(symbol_id, lot)] = (float(values[0] or 0),) + values[1:]
+    return state
+
+
+def _state_at(conn: sqlite3.Connection, source: str, snapshot_date: str) -> PositionState:
+    rows = conn.execute(f"""
+        SELECT symbol_id, lot, {', '.join(VALUE_FIELDS)} FROM position_history
+        WHERE source = ? AND valid_to > ? AND valid_from <= ?
+    """, (source, snapshot_date, snapshot_date)).fetchall()
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def _append_state(conn: sqlite3.Connection, source: str, snapshot_date: str,
+                  state: PositionState) -> None:
+    """Record state as of snapshot_date, after every stored snapshot of source."""
+    from src.database.schema_v2 import POSITION_OPEN_END
+
+    rows = conn.execute(f"""
+        SELECT history_id, symbol_id, lot, {', '.join(VALUE_FIELDS)} FROM position_history
+        WHERE source = ? AND valid_to = ?
+    """, (source, POSITION_OPEN_END)).fetchall()
+    current = {(row[1], row[2]): (row[0], tuple(row[3:])) for row in rows}
+
+    closed = [(snapshot_date, history_id) for key, (history_id, values) in current.items()
+              if state.get(key) != values]
+    opened = [(source, symbol_id, lot, snapshot_date, *values)
+              for (symbol_id, lot), values in state.items()
+              if (symbol_id, lot) not in current or current[(symbol_id, lot)][1] != values]
+
+    conn.executemany("UPDATE position_history SET valid_to = ? WHERE history_id = ?", closed)
+    conn.executemany(f"""
+        INSERT INTO position_history (source, symbol_id, lot, valid_from, {', '.join(VALUE_FIELDS)})
+        VALUES (?, ?, ?, ?, {', '.join('?' * len(VALUE_FIELDS))})
+    """, opened)
+
+
+def _write_source(conn: sqlite3.Connection, source: str, snapshot_date: str,
+                  positions: List[Dict], snapshot_time: str) -> int:
+    from src.database.schema_v2 import POSITION_OPEN_END
+
+    conn.execute("""
+        INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(date, source) DO UPDATE SET
+            snapshot_time = excluded.snapshot_time,
+            total_positions = excluded.total_positions
+    """, (snapshot_date, source, snapshot_time, len(positions)))
+    snapshot_id = conn.execute(
+        "SELECT snapshot_id FROM holdings_snapshots WHERE date = ? AND source = ?",
+        (snapshot_date, source),
+    ).fetchone()[0]
+
+    # Rewriting an earlier date (a re-run or a backfill): unwind history
+    # back to it, then replay the later snapshots on top
+    later = [row[0] for row in conn.execute(
+        "SELECT date FROM holdings_snapshots WHERE source = ? AND date > ? ORDER BY date",
+        (source, snapshot_date),
+    )]
+    replay = [(later_date, _state_at(conn, source, later_date)) for later_date in later]
+
+    conn.execute("DELETE FROM position_history WHERE source = ? AND valid_from >= ?",
+                 (source, snapshot_date))
+    conn.execute("""
+        UPDATE position_history SET valid_to = ?
+        WHERE source = ? AND valid_to >= ? AND valid_to < ?
+    """, (POSITION_OPEN_END, source, snapshot_date, POSITION_OPEN_END))
+
+    _append_state(conn, source, snapshot_date, _to_state(conn, positions))
+    for later_date, state in replay:
+        _append_state(conn, source, later_date, state)
+
+    return snapshot_id
+
+
+def write_holdings_snapshots(
+    conn: sqlite3.Connection,
+    snapshot_date: str,
+    positions_by_source: Dict[str, List[Dict]],
+    snapshot_time: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Store one day's holdings for one or more brokerages in one transaction.
+
+    Re-writing a (date, source) that already has a snapshot replaces it.
+    The per-symbol performance summary is updated in the same transaction.
+
+    Args:
+        conn: Database connection (committed on success, rolled back on error)
+        snapshot_date: Snapshot date (YYYY-MM-DD)
+        positions_by_source: Brokerage name -> list of position dicts with
+            the position_snapshots columns (symbol, quantity, market_value, ...)
+        snapshot_time: When the positions were read (default: now)
+
+    Returns:
+        Brokerage name -> snapshot_id
+    """
+    from src.reporting.performers import update_performance_summary
+
+    snapshot_time = snapshot_time or datetime.now().isoformat()
+    ensure_holdings_schema(conn)
+
+    with conn:
+        snapshot_ids = {
+            source: _write_source(conn, source, snapshot_date, positions, snapshot_time)
+            for source, positions in positions_by_source.items()
+        }
+        update_performance_summary(conn, snapshot_date)
+        return snapshot_ids
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def _dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_snapshot_positions(conn: sqlite3.Connection, snapshot_id: int) -> List[Dict]:
+    """Full positions of one snapshot, largest market value first."""
+    cursor = conn.execute("""
+        SELECT * FROM position_snapshots
+        WHERE snapshot_id = ?
+        ORDER BY market_value DESC
+    """, (snapshot_id,))
+    return _dicts(cursor)
+
+
+def get_holdings_as_of(conn: sqlite3.Connection, as_of: str,
+                       source: Optional[str] = None) -> List[Dict]:
+    """
+    Full holdings on a date, from each brokerage's latest snapshot on or
+    before it.
+
+    Args:
+        conn: Database connection
+        as_of: Date (YYYY-MM-DD)
+        source: Only this brokerage (default: all)
+
+    Returns:
+        position_snapshots rows plus snapshot_date and source, by source
+        and largest market value first.
+    """
+    query = """
+        SELECT hs.date AS snapshot_date, hs.source, ps.*
+        FROM holdings_snapshots hs
+        JOIN position_snapshots ps ON ps.snapshot_id = hs.snapshot_id
+        WHERE hs.date = (
+            SELECT MAX(h2.date) FROM holdings_snapshots h2
+            WHERE h2.source = hs.source AND h2.date <= ?
+        )
+    """
+    params = [as_of]
+    if source:
+        query += " AND hs.source = ?"
+        params.append(source)
+    query += " ORDER BY hs.source, ps.market_value DESC"
+    return _dicts(conn.execute(query, params))
+
+
+def storage_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Row counts of the compact tables against the positions they represent."""
+    symbols = conn.execute("SELECT COUNT(*) FROM position_symbols").fetchone()[0]
+    history_rows = conn.execute("SELECT COUNT(*) FROM position_history").fetchone()[0]
+    snapshots, positions = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(total_positions), 0) FROM holdings_snapshots"
+    ).fetchone()
+    return {
+        'snapshots': snapshots,
+        'snapshot_positions': positions,
+        'symbols': symbols,
+        'history_rows': history_rows,
+    }
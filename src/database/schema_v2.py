@@ -227,28 +227,107 @@ CREATE TABLE IF NOT EXISTS holdings_snapshots (
 );
 """
 
-POSITION_SNAPSHOTS_TABLE = """
-CREATE TABLE IF NOT EXISTS position_snapshots (
-    position_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    snapshot_id INTEGER NOT NULL,
+# Positions are stored compactly: one row per symbol in position_symbols,
+# and one row in position_history per stretch of days a position stayed
+# unchanged (valid_from inclusive, valid_to exclusive, POSITION_OPEN_END
+# while still held).  See src/database/holdings_store.py.
+POSITION_OPEN_END = '9999-12-31'
+
+POSITION_SYMBOLS_TABLE = """
+CREATE TABLE IF NOT EXISTS position_symbols (
+    symbol_id INTEGER PRIMARY KEY AUTOINCREMENT,
     symbol TEXT NOT NULL,
     underlying_symbol TEXT,
-    quantity REAL NOT NULL,
     instrument_type TEXT,
+    option_type TEXT,
+    strike REAL,
+    expiration_date DATE,
+    multiplier INTEGER,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+POSITION_HISTORY_TABLE = f"""
+CREATE TABLE IF NOT EXISTS position_history (
+    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    symbol_id INTEGER NOT NULL,
+    lot INTEGER NOT NULL DEFAULT 0,
+    valid_from DATE NOT NULL,
+    valid_to DATE NOT NULL DEFAULT '{POSITION_OPEN_END}',
+    quantity REAL NOT NULL,
     average_open_price REAL,
     close_price REAL,
     market_value REAL,
     cost_basis REAL,
     unrealized_pl REAL,
-    option_type TEXT,
-    strike REAL,
-    expiration_date DATE,
-    multiplier INTEGER,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (snapshot_id) REFERENCES holdings_snapshots(snapshot_id)
+    FOREIGN KEY (symbol_id) REFERENCES position_symbols(symbol_id)
+);
+"""
+
+# Per-symbol P&L over all snapshots, kept current by each snapshot write
+# (see src/reporting/performers.py)
+SYMBOL_PERFORMANCE_TABLE = """
+CREATE TABLE IF NOT EXISTS symbol_performance_summary (
+    symbol TEXT PRIMARY KEY,
+    first_seen DATE NOT NULL,
+    last_seen DATE NOT NULL,
+    holding_days INTEGER NOT NULL DEFAULT 0,
+    observation_days INTEGER NOT NULL DEFAULT 0,
+    best_unrealized_pl REAL,
+    worst_unrealized_pl REAL,
+    best_pl_pct REAL,
+    worst_pl_pct REAL,
+    latest_unrealized_pl REAL,
+    latest_cost_basis REAL,
+    max_abs_cost_basis REAL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 """
 
+POSITION_STORAGE_INDEXES = [
+    # One row per distinct symbol + contract details
+    """CREATE UNIQUE INDEX IF NOT EXISTS idx_position_symbols_key ON position_symbols(
+        symbol, IFNULL(underlying_symbol, ''), IFNULL(instrument_type, ''), IFNULL(option_type, ''),
+        IFNULL(strike, -1), IFNULL(expiration_date, ''), IFNULL(multiplier, -1))""",
+    # Covers the snapshot -> position join and the P&L columns used by
+    # src/reporting/performers.py
+    """CREATE INDEX IF NOT EXISTS idx_position_history_covering ON position_history(
+        source, valid_to, valid_from, symbol_id, cost_basis, unrealized_pl)""",
+    "CREATE INDEX IF NOT EXISTS idx_position_history_source_from ON position_history(source, valid_from)",
+    "CREATE INDEX IF NOT EXISTS idx_position_history_symbol ON position_history(symbol_id)",
+]
+
+# Full per-snapshot positions rebuilt from the compact tables, with the
+# columns of the original position_snapshots table
+POSITION_SNAPSHOTS_VIEW = """
+CREATE VIEW IF NOT EXISTS position_snapshots AS
+SELECT
+    ph.history_id AS position_id,
+    hs.snapshot_id,
+    s.symbol,
+    s.underlying_symbol,
+    ph.quantity,
+    s.instrument_type,
+    ph.average_open_price,
+    ph.close_price,
+    ph.market_value,
+    ph.cost_basis,
+    ph.unrealized_pl,
+    s.option_type,
+    s.strike,
+    s.expiration_date,
+    s.multiplier,
+    ph.created_at
+FROM holdings_snapshots hs
+JOIN position_history ph
+    ON ph.source = hs.source
+   AND ph.valid_to > hs.date
+   AND ph.valid_from <= hs.date
+JOIN position_symbols s ON s.symbol_id = ph.symbol_id
+"""
+
 BROKERAGE_TRANSACTIONS_RAW_TABLE = """
 CREATE TABLE IF NOT EXISTS brokerage_transactions_raw (
     -- Primary identifier
@@ -501,6 +580,96 @@ CREATE TABLE IF NOT EXISTS pii_access_log (
 );
 """
 
+PIPELINE_RUNS_TABLE = """
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    -- One row per step per pipeline run (see src/automation/pipeline.py)
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    step_name TEXT NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('success', 'failed', 'timeout', 'skipped')),
+    critical INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP,
+    duration_ms REAL,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+PIPELINE_RUNS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_pipeline_runs_pipeline_step "
+    "ON pipeline_runs(pipeline, step_name, created_at)"
+)
+
+TRACE_SPANS_TABLE = """
+CREATE TABLE IF NOT EXISTS trace_spans (
+    -- Timed pipeline stages (see src/monitoring/tracing.py)
+    span_id TEXT PRIMARY KEY,
+    trace_id TEXT NOT NULL,
+    parent_id TEXT,
+    name TEXT NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    duration_ms REAL NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('ok', 'error')),
+    error TEXT,
+    attributes TEXT  -- JSON
+);
+"""
+
+TRACE_SPANS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_trace_spans_name_started "
+    "ON trace_spans(name, started_at)"
+)
+
+MARKET_CALENDAR_TABLE = """
+CREATE TABLE IF NOT EXISTS market_calendar (
+    -- Cached trading calendar (see src/automation/market_calendar.py)
+    date DATE PRIMARY KEY,
+    status TEXT NOT NULL CHECK (status IN ('open', 'closed')),
+    open_time TEXT,                          -- HH:MM ET, NULL when closed
+    close_time TEXT,                         -- HH:MM ET (13:00 on early closes)
+    description TEXT,
+    source TEXT NOT NULL CHECK (source IN ('tradier', 'bundled')),
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SCHEDULER_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS scheduler_state (
+    -- Last claimed fire time per job (see src/automation/job_scheduler.py)
+    job_name TEXT PRIMARY KEY,
+    last_fire_at TIMESTAMP NOT NULL,         -- Scheduled slot, not wall-clock start
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL CHECK (status IN ('running', 'success', 'failed')),
+    error TEXT
+);
+"""
+
+TRADE_NOTIFIER_CURSORS_TABLE = """
+CREATE TABLE IF NOT EXISTS trade_notifier_cursors (
+    -- Per-brokerage fetch position (see scripts/trading/discord_trade_notifier.py)
+    source TEXT PRIMARY KEY,
+    cursor_date DATE NOT NULL,               -- Fetches start on this day
+    cursor_at TIMESTAMP,                     -- Last execution time, if the brokerage reports one
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+TRADE_NOTIFIER_SEEN_TABLE = """
+CREATE TABLE IF NOT EXISTS trade_notifier_seen (
+    -- Trades already handled, kept only from each source's cursor_date on
+    source TEXT NOT NULL,
+    trade_key TEXT NOT NULL,
+    trade_date DATE NOT NULL,
+    posted INTEGER NOT NULL DEFAULT 1,       -- 0 = absorbed at first start, not posted
+    stream_fill TEXT,                        -- fill_key() of a streamed fill not yet matched
+                                             -- to its Tradier history row
+    seen_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, trade_key)
+);
+"""
+
 SYSTEM_CONFIG_TABLE = """
 CREATE TABLE IF NOT EXISTS system_config (
     key TEXT PRIMARY KEY,
@@ -544,9 +713,8 @@ INDEXES = [
     # Holdings Snapshots
     "CREATE INDEX IF NOT EXISTS idx_holdings_snapshots_date ON holdings_snapshots(date)",
 
-    # Position Snapshots
-    "CREATE INDEX IF NOT EXISTS idx_position_snapshots_snapshot ON position_snapshots(snapshot_id)",
-    "CREATE INDEX IF NOT EXISTS idx_position_snapshots_symbol ON position_snapshots(symbol)",
+    # Position Symbols / History
+    *POSITION_STORAGE_INDEXES,
 
     # Brokerage Transactions Raw (ETL staging)
     "CREATE INDEX IF NOT EXISTS idx_raw_txn_source_brokerage_id ON brokerage_transactions_raw(source, brokerage_transaction_id)",
@@ -579,6 +747,13 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_pii_access_investor ON pii_access_log(investor_id)",
     "CREATE INDEX IF NOT EXISTS idx_pii_access_timestamp ON pii_access_log(timestamp)",
     "CREATE INDEX IF NOT EXISTS idx_pii_access_field ON pii_access_log(field_name)",
+
+    # Pipeline Runs
+    PIPELINE_RUNS_INDEX,
+
+    # Trace Spans
+    TRACE_SPANS_INDEX,
+    "CREATE INDEX IF NOT EXISTS idx_trace_spans_trace ON trace_spans(trace_id)",
 ]
 
 # ============================================================
@@ -884,10 +1059,18 @@ class DatabaseManager:
             cursor.execute(TAX_EVENTS_TABLE)
             cursor.execute(TRADES_TABLE)
             cursor.execute(HOLDINGS_SNAPSHOTS_TABLE)
-            cursor.execute(POSITION_SNAPSHOTS_TABLE)
+            cursor.execute(POSITION_SYMBOLS_TABLE)
+            cursor.execute(POSITION_HISTORY_TABLE)
+            cursor.execute(SYMBOL_PERFORMANCE_TABLE)
             cursor.execute(BENCHMARK_PRICES_TABLE)
             cursor.execute(AUDIT_LOG_TABLE)
             cursor.execute(PII_ACCESS_LOG_TABLE)
+            cursor.execute(PIPELINE_RUNS_TABLE)
+            cursor.execute(TRACE_SPANS_TABLE)
+            cursor.execute(MARKET_CALENDAR_TABLE)
+            cursor.execute(SCHEDULER_STATE_TABLE)
+            cursor.execute(TRADE_NOTIFIER_CURSORS_TABLE)
+            cursor.execute(TRADE_NOTIFIER_SEEN_TABLE)
             cursor.execute(SYSTEM_CONFIG_TABLE)
 
             # Create indexes
@@ -897,6 +1080,7 @@ class DatabaseManager:
             
             # Create views
             logger.info("Creating views...")
+            cursor.execute(POSITION_SNAPSHOTS_VIEW)
             for view_name, view_sql in VIEWS.items():
                 cursor.execute(f"DROP VIEW IF EXISTS {view_name}")
                 cursor.execute(view_sql)
@@ -1001,12 +1185,22 @@ class DatabaseManager:
             cursor.execute(TAX_EVENTS_TABLE)
             cursor.execute(TRADES_TABLE)
             cursor.execute(HOLDINGS_SNAPSHOTS_TABLE)
-            cursor.execute(POSITION_SNAPSHOTS_TABLE)
             cursor.execute(BENCHMARK_PRICES_TABLE)
             cursor.execute(AUDIT_LOG_TABLE)
             cursor.execute(PII_ACCESS_LOG_TABLE)
+            cursor.execute(PIPELINE_RUNS_TABLE)
+            cursor.execute(TRACE_SPANS_TABLE)
+            cursor.execute(MARKET_CALENDAR_TABLE)
+            cursor.execute(SCHEDULER_STATE_TABLE)
+            cursor.execute(TRADE_NOTIFIER_CURSORS_TABLE)
+            cursor.execute(TRADE_NOTIFIER_SEEN_TABLE)
             cursor.execute(SYSTEM_CONFIG_TABLE)
 
+            # Compact position storage (converts a legacy position_snapshots table)
+            from src.database.holdings_store import ensure_holdings_schema
+            ensure_holdings_schema(conn)
+            cursor.execute(SYMBOL_PERFORMANCE_TABLE)
+
             # Create indexes
             for idx in INDEXES:
                 try:
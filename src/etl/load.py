@@ -12,6 +12,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from src.monitoring.tracing import span, trace_to
+
 logger = logging.getLogger(__name__)
 
 PROJECT_DIR = Path("C:/tovito-trader")
@@ -224,6 +226,12 @@ def run_full_pipeline(
     Returns:
         dict with combined stats from all three steps
     """
+    # Spans go to the database being loaded, not the default one
+    with trace_to(db_path), span('etl.run_full_pipeline'):
+        return _run_full_pipeline(source, start_date, end_date, db_path)
+
+
+def _run_full_pipeline(source, start_date, end_date, db_path) -> Dict:
     import sys
     if str(PROJECT_DIR) not in sys.path:
         sys.path.insert(0, str(PROJECT_DIR))
@@ -250,29 +258,36 @@ def run_full_pipeline(
 
     # Step 1: Extract from each provider
     for provider in providers:
-        try:
-            extract_result = extract_from_brokerage(
-                provider, start_date, end_date, db_path
-            )
-            stats['extract'][provider] = extract_result
-        except Exception as e:
-            logger.error("Extract failed for %s: %s", provider, e)
-            stats['extract'][provider] = {'error': str(e)}
+        with span('etl.extract', provider=provider) as extract_span:
+            try:
+                extract_result = extract_from_brokerage(
+                    provider, start_date, end_date, db_path
+                )
+                stats['extract'][provider] = extract_result
+                extract_span.set_attribute('ingested', extract_result.get('ingested', 0))
+            except Exception as e:
+                logger.error("Extract failed for %s: %s", provider, e)
+                stats['extract'][provider] = {'error': str(e)}
+                extract_span.set_attribute('error', str(e))
 
     # Step 2: Transform all pending rows
-    transform_result = transform_pending(db_path)
-    stats['transform']['transformed'] = len(transform_result['transformed'])
-    stats['transform']['errors'] = len(transform_result['errors'])
-    stats['transform']['skipped'] = len(transform_result['skipped'])
+    with span('etl.transform') as transform_span:
+        transform_result = transform_pending(db_path)
+        stats['transform']['transformed'] = len(transform_result['transformed'])
+        stats['transform']['errors'] = len(transform_result['errors'])
+        stats['transform']['skipped'] = len(transform_result['skipped'])
+        transform_span.set_attribute('transformed', stats['transform']['transformed'])
 
     # Step 3: Load into production
     if transform_result['transformed'] or transform_result['errors'] or transform_result['skipped']:
-        load_result = load_to_trades(
-            transform_result['transformed'],
-            transform_result['errors'],
-            transform_result['skipped'],
-            db_path,
-        )
-        stats['load'] = load_result
+        with span('etl.load') as load_span:
+            load_result = load_to_trades(
+                transform_result['transformed'],
+                transform_result['errors'],
+                transform_result['skipped'],
+                db_path,
+            )
+            stats['load'] = load_result
+            load_span.set_attribute('loaded', load_result.get('loaded', 0))
 
     return stats
@@ -2,8 +2,20 @@
 Benchmark Market Data - Fetch & Cache
 ======================================
 Fetches daily close prices for benchmark indices (SPY, QQQ, BTC-USD)
-from Yahoo Finance via yfinance. Caches results in the benchmark_prices
-SQLite table for reuse across charts, reports, and Discord messages.
+and caches them in the benchmark_prices SQLite table for reuse across
+charts, reports, and Discord messages.
+
+A refresh works out the missing date range of every ticker, fetches
+them all with one provider call (one yfinance download for all
+tickers) and writes the result with one upsert in one transaction.
+The last cached day is fetched again, so a close cached while the
+market was still open is replaced by the final one.
+
+Reads use one query that pivots the cache into date-by-ticker rows.
+
+Prices come from a PriceProvider: Yahoo Finance by default, or a local
+CSV file (BENCHMARK_PROVIDER=csv, BENCHMARK_CSV_PATH=...) for offline
+runs and tests.
 
 Usage:
     from src.market_data.benchmarks import refresh_benchmark_cache, get_benchmark_data
@@ -13,13 +25,18 @@ Usage:
 
     # Get data for chart generation
     data = get_benchmark_data(db_path, days=90)
+
+    # Or as a DataFrame (index: date, columns: tickers)
+    frame = get_benchmark_frame(db_path, days=90)
 """
 
+import csv
+import os
 import sqlite3
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Protocol, Sequence, Tuple, runtime_checkable
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +49,119 @@ TICKER_LABELS = {
     'BTC-USD': 'Bitcoin (BTC)',
 }
 
+# (date 'YYYY-MM-DD', ticker, close)
+PriceRow = Tuple[str, str, float]
+
+
+# ============================================================
+# PRICE PROVIDERS
+# ============================================================
+
+@runtime_checkable
+class PriceProvider(Protocol):
+    """
+    Source of daily closes for the benchmark cache.
+
+    fetch_closes() is called once per refresh with every ticker that
+    needs data.
+    """
+
+    def fetch_closes(self, tickers: Sequence[str], start: str, end: str) -> List[PriceRow]:
+        """
+        Args:
+            tickers: Tickers to fetch
+            start: First date (YYYY-MM-DD, inclusive)
+            end: Last date (YYYY-MM-DD, exclusive)
+
+        Returns:
+            (date, ticker, close) rows; days without a close are omitted.
+        """
+        ...
+
+
+class YFinanceProvider:
+    """Daily closes from Yahoo Finance, all tickers in one download."""
+
+    def fetch_closes(self, tickers: Sequence[str], start: str, end: str) -> List[PriceRow]:
+        import yfinance as yf
+
+        tickers = list(tickers)
+        data = yf.download(
+            tickers,
+            start=start,
+            end=end,
+            progress=False,
+            auto_adjust=True,
+        )
+        if data is None or data.empty:
+            return []
+
+        closes = data['Close']
+        if not hasattr(closes, 'columns'):
+            # Single-ticker downloads may come back with flat columns
+            closes = closes.to_frame(name=tickers[0])
+
+        rows = []
+        for ticker in tickers:
+            if ticker not in closes.columns:
+                continue
+            # Crypto trades every day, so stock columns are empty on weekends
+            for date_idx, close in closes[ticker].dropna().items():
+                rows.append((date_idx.strftime('%Y-%m-%d'), ticker, float(close)))
+        return rows
+
+
+class CsvPriceProvider:
+    """
+    Daily closes from a local CSV file with columns date,ticker,close.
+
+    Stands in for Yahoo Finance offline and in tests.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def fetch_closes(self, tickers: Sequence[str], start: str, end: str) -> List[PriceRow]:
+        wanted = set(tickers)
+        with open(self.path, newline='', encoding='utf-8') as f:
+            return [
+                (row['date'], row['ticker'], float(row['close']))
+                for row in csv.DictReader(f)
+                if row['ticker'] in wanted and start <= row['date'] < end
+            ]
+
+
+def get_price_provider(name: str = None) -> PriceProvider:
+    """
+    Create the configured price provider.
+
+    Args:
+        name: 'yfinance' or 'csv'. If None, reads BENCHMARK_PROVIDER
+              (default: 'yfinance'). 'csv' reads BENCHMARK_CSV_PATH.
+
+    Raises:
+        ValueError: If the provider is unknown or misconfigured.
+    """
+    if name is None:
+        name = os.getenv('BENCHMARK_PROVIDER', 'yfinance').lower().strip()
+
+    if name == 'yfinance':
+        return YFinanceProvider()
+    elif name == 'csv':
+        csv_path = os.getenv('BENCHMARK_CSV_PATH', '').strip()
+        if not csv_path:
+            raise ValueError("BENCHMARK_PROVIDER=csv requires BENCHMARK_CSV_PATH")
+        return CsvPriceProvider(csv_path)
+    else:
+        raise ValueError(
+            f"Unknown benchmark provider: '{name}'. "
+            f"Supported providers: 'yfinance', 'csv'"
+        )
+
+
+# ============================================================
+# CACHE
+# ============================================================
 
 def _ensure_table(db_path: Path) -> None:
     """Create the benchmark_prices table if it doesn't exist."""
@@ -55,117 +185,154 @@ def _ensure_table(db_path: Path) -> None:
 
 def _get_latest_cached_date(db_path: Path, ticker: str) -> Optional[str]:
     """Get the most recent cached date for a ticker."""
+    return _get_latest_cached_dates(db_path, [ticker]).get(ticker)
+
+
+def _get_latest_cached_dates(db_path: Path, tickers: Sequence[str]) -> Dict[str, str]:
+    """Most recent cached date per ticker (tickers with no rows are omitted)."""
+    placeholders = ','.join('?' * len(tickers))
     conn = sqlite3.connect(str(db_path), timeout=10)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT MAX(date) FROM benchmark_prices WHERE ticker = ?",
-        (ticker,)
-    )
-    result = cursor.fetchone()
-    conn.close()
-    return result[0] if result and result[0] else None
+    try:
+        rows = conn.execute(
+            f"SELECT ticker, MAX(date) FROM benchmark_prices "
+            f"WHERE ticker IN ({placeholders}) GROUP BY ticker",
+            list(tickers),
+        ).fetchall()
+    finally:
+        conn.close()
+    return {ticker: latest for ticker, latest in rows if latest}
 
 
 def refresh_benchmark_cache(
     db_path: Path,
     tickers: Optional[List[str]] = None,
     lookback_days: int = 400,
+    provider: Optional[PriceProvider] = None,
 ) -> Dict[str, int]:
     """
     Fetch and cache benchmark daily close prices.
 
-    Only fetches dates not already in the cache (incremental).
+    Only fetches dates not already in the cache (incremental), with one
+    provider call for all tickers and one write transaction.
 
     Args:
         db_path: Path to SQLite database.
         tickers: List of Yahoo Finance tickers (default: BENCHMARK_TICKERS).
         lookback_days: How far back to fetch on first run.
+        provider: Price source (default: get_price_provider()).
 
     Returns:
         Dict mapping ticker -> number of new rows inserted.
     """
-    try:
-        import yfinance as yf
-    except ImportError:
-        logger.error("yfinance not installed. Run: pip install yfinance")
-        return {}
-
     if tickers is None:
         tickers = BENCHMARK_TICKERS
 
     _ensure_table(db_path)
 
-    stats = {}
+    stats = {ticker: 0 for ticker in tickers}
     today = datetime.now().strftime('%Y-%m-%d')
+    latest = _get_latest_cached_dates(db_path, tickers)
 
+    # First date to fetch per ticker
+    starts = {}
     for ticker in tickers:
-        try:
-            latest = _get_latest_cached_date(db_path, ticker)
-
-            if latest:
-                # Incremental: fetch from the day after the last cached date
-                start_date = (
-                    datetime.strptime(latest, '%Y-%m-%d') + timedelta(days=1)
-                ).strftime('%Y-%m-%d')
-            else:
-                # First run: fetch full lookback
-                start_date = (
-                    datetime.now() - timedelta(days=lookback_days)
-                ).strftime('%Y-%m-%d')
-
-            if start_date > today:
-                logger.info(f"{ticker}: cache is up to date ({latest})")
-                stats[ticker] = 0
-                continue
+        if ticker not in latest:
+            starts[ticker] = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+        elif latest[ticker] >= today:
+            logger.info(f"{ticker}: cache is up to date ({latest[ticker]})")
+        else:
+            # Refetch the last cached day too, replacing an intraday close
+            starts[ticker] = latest[ticker]
 
-            logger.info(f"{ticker}: fetching {start_date} to {today}")
-            data = yf.download(
-                ticker,
-                start=start_date,
-                end=(datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
-                progress=False,
-                auto_adjust=True,
-            )
-
-            if data.empty:
-                logger.warning(f"{ticker}: no data returned from Yahoo Finance")
-                stats[ticker] = 0
-                continue
+    if not starts:
+        return stats
+
+    start = min(starts.values())
+    end = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+    logger.info(f"Fetching {', '.join(starts)} from {start} to {today}")
+    try:
+        provider = provider or get_price_provider()
+        fetched = provider.fetch_closes(list(starts), start, end)
+    except ImportError:
+        logger.error("yfinance not installed. Run: pip install yfinance")
+        return {}
+    except Exception as e:
+        logger.error(f"Benchmark fetch failed - {e}")
+        return stats
+
+    # One download covers the earliest start; don't rewrite history that
+    # was already cached before a ticker's last cached day
+    rows = [(date_str, ticker, round(close, 2)) for date_str, ticker, close in fetched
+            if ticker in starts and date_str >= latest.get(ticker, '')]
+    if not rows:
+        logger.warning("No benchmark data returned")
+        return stats
 
-            # Insert into cache
-            conn = sqlite3.connect(str(db_path), timeout=10)
-            cursor = conn.cursor()
-            inserted = 0
-
-            for date_idx, row in data.iterrows():
-                date_str = date_idx.strftime('%Y-%m-%d')
-                # Handle both single-ticker and multi-ticker column formats
-                close = float(row['Close'].iloc[0]) if hasattr(row['Close'], 'iloc') else float(row['Close'])
-
-                try:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO benchmark_prices (date, ticker, close_price) "
-                        "VALUES (?, ?, ?)",
-                        (date_str, ticker, round(close, 2))
-                    )
-                    if cursor.rowcount > 0:
-                        inserted += 1
-                except sqlite3.IntegrityError:
-                    pass  # Already cached
-
-            conn.commit()
-            conn.close()
-
-            stats[ticker] = inserted
-            logger.info(f"{ticker}: {inserted} new prices cached")
-
-        except Exception as e:
-            logger.error(f"{ticker}: fetch failed - {e}")
-            stats[ticker] = 0
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    try:
+        with conn:
+            conn.executemany("""
+                INSERT INTO benchmark_prices (date, ticker, close_price)
+                VALUES (?, ?, ?)
+                ON CONFLICT(date, ticker) DO UPDATE SET close_price = excluded.close_price
+            """, rows)
+    finally:
+        conn.close()
+
+    for date_str, ticker, _ in rows:
+        if ticker not in latest or date_str > latest[ticker]:
+            stats[ticker] += 1
+    for ticker in starts:
+        logger.info(f"{ticker}: {stats[ticker]} new prices cached")
 
     return stats
 
 
+# ============================================================
+# READS
+# ============================================================
+
+def query_benchmark_pivot(
+    conn: sqlite3.Connection,
+    tickers: Sequence[str],
+    start_date: str,
+    end_date: Optional[str] = None,
+) -> List[Tuple]:
+    """
+    Cached closes pivoted to one row per date, in a single query.
+
+    Returns:
+        List of (date, close_for_tickers[0], close_for_tickers[1], ...)
+        ordered by date; a close is None where that ticker has no price.
+    """
+    columns = ', '.join(
+        f"MAX(CASE WHEN ticker = ? THEN close_price END) AS c{i}" for i in range(len(tickers))
+    )
+    placeholders = ','.join('?' * len(tickers))
+    query = (
+        f"SELECT date, {columns} FROM benchmark_prices "
+        f"WHERE ticker IN ({placeholders}) AND date >= ?"
+    )
+    params = [*tickers, *tickers, start_date]
+    if end_date:
+        query += " AND date <= ?"
+        params.append(end_date)
+    query += " GROUP BY date ORDER BY date ASC"
+    return [tuple(row) for row in conn.execute(query, params).fetchall()]
+
+
+def _read_pivot(db_path, tickers, days, start_date, end_date):
+    if start_date is None:
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+    _ensure_table(db_path)
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    try:
+        return query_benchmark_pivot(conn, tickers, start_date, end_date)
+    finally:
+        conn.close()
+
+
 def get_benchmark_data(
     db_path: Path,
     tickers: Optional[List[str]] = None,
@@ -190,44 +357,38 @@ def get_benchmark_data(
     if tickers is None:
         tickers = BENCHMARK_TICKERS
 
-    _ensure_table(db_path)
+    result = {ticker: [] for ticker in tickers}
+    for date_str, *closes in _read_pivot(db_path, tickers, days, start_date, end_date):
+        for ticker, close in zip(tickers, closes):
+            if close is not None:
+                result[ticker].append({'date': date_str, 'close_price': close})
+    return result
 
-    conn = sqlite3.connect(str(db_path), timeout=10)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
 
-    result = {}
+def get_benchmark_frame(
+    db_path: Path,
+    tickers: Optional[List[str]] = None,
+    days: int = 90,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    """
+    Cached closes as a pandas DataFrame.
 
-    for ticker in tickers:
-        if start_date:
-            query = (
-                "SELECT date, close_price FROM benchmark_prices "
-                "WHERE ticker = ? AND date >= ?"
-            )
-            params = [ticker, start_date]
-            if end_date:
-                query += " AND date <= ?"
-                params.append(end_date)
-            query += " ORDER BY date ASC"
-        else:
-            cutoff = (
-                datetime.now() - timedelta(days=days)
-            ).strftime('%Y-%m-%d')
-            query = (
-                "SELECT date, close_price FROM benchmark_prices "
-                "WHERE ticker = ? AND date >= ? ORDER BY date ASC"
-            )
-            params = [ticker, cutoff]
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        result[ticker] = [
-            {'date': row['date'], 'close_price': row['close_price']}
-            for row in rows
-        ]
+    Same arguments as get_benchmark_data().
 
-    conn.close()
-    return result
+    Returns:
+        DataFrame indexed by date (YYYY-MM-DD) with one column per
+        ticker; NaN where a ticker has no close on that date.
+    """
+    import pandas as pd
+
+    if tickers is None:
+        tickers = BENCHMARK_TICKERS
+
+    rows = _read_pivot(db_path, tickers, days, start_date, end_date)
+    frame = pd.DataFrame(rows, columns=['date', *tickers], dtype=object)
+    return frame.set_index('date').astype(float)
 
 
 def normalize_series(
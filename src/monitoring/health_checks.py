@@ -845,7 +845,87 @@ class HealthCheckService:
             }
 
     # ------------------------------------------------------------------
-    # 13. Overall Health Score
+    # 13. Stage Timings (trace_spans)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+        """Nearest-rank percentile of an ascending list."""
+        if not sorted_values:
+            return None
+        rank = max(1, int(-(-pct * len(sorted_values) // 100)))  # ceil
+        return sorted_values[rank - 1]
+
+    def get_stage_timings(self, days: int = 30) -> dict:
+        """Per-stage durations recorded by src/monitoring/tracing.py.
+
+        Returns:
+            dict with keys:
+                stages   -- one dict per span name: runs, errors, avg_ms,
+                            p50_ms, p95_ms, max_ms, last_ms, last_run
+                            (sorted by p95, slowest first)
+                trend    -- [{date, name, avg_ms}] daily averages
+                slowest_today -- {name, duration_ms, started_at} of the
+                            longest non-root span today, or None
+        """
+        result: dict = {'stages': [], 'trend': [], 'slowest_today': None}
+        conn = self._connect()
+        cur = conn.cursor()
+        try:
+            if not self._table_exists(cur, 'trace_spans'):
+                return result
+
+            since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            rows = self._safe_query(cur, """
+                SELECT name, duration_ms, status, started_at
+                FROM trace_spans
+                WHERE started_at >= ?
+                ORDER BY name, started_at
+            """, (since,))
+
+            by_name: Dict[str, List[dict]] = {}
+            for row in rows:
+                by_name.setdefault(row['name'], []).append(row)
+
+            for name, spans in by_name.items():
+                durations = sorted(r['duration_ms'] for r in spans)
+                result['stages'].append({
+                    'name': name,
+                    'runs': len(spans),
+                    'errors': sum(1 for r in spans if r['status'] != 'ok'),
+                    'avg_ms': round(sum(durations) / len(durations), 1),
+                    'p50_ms': round(self._percentile(durations, 50), 1),
+                    'p95_ms': round(self._percentile(durations, 95), 1),
+                    'max_ms': round(durations[-1], 1),
+                    'last_ms': round(spans[-1]['duration_ms'], 1),
+                    'last_run': spans[-1]['started_at'],
+                })
+            result['stages'].sort(key=lambda s: s['p95_ms'], reverse=True)
+
+            result['trend'] = self._safe_query(cur, """
+                SELECT substr(started_at, 1, 10) AS date, name,
+                       ROUND(AVG(duration_ms), 1) AS avg_ms
+                FROM trace_spans
+                WHERE started_at >= ?
+                GROUP BY date, name
+                ORDER BY date, name
+            """, (since,))
+
+            # Root spans cover whole runs; the slowest *stage* is a child
+            slowest = self._safe_query(cur, """
+                SELECT name, duration_ms, started_at
+                FROM trace_spans
+                WHERE started_at >= ? AND parent_id IS NOT NULL
+                ORDER BY duration_ms DESC
+                LIMIT 1
+            """, (datetime.now().strftime('%Y-%m-%d'),))
+            result['slowest_today'] = slowest[0] if slowest else None
+            return result
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # 14. Overall Health Score
     # ------------------------------------------------------------------
 
     def get_overall_health_score(self) -> dict:
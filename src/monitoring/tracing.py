@@ -0,0 +1,263 @@
+"""
+Pipeline Tracing
+================
+Lightweight spans for timing pipeline stages (daily NAV, ETL, production
+sync, report generation).  Spans are stored in the trace_spans table and
+summarised by HealthCheckService.get_stage_timings() for the ops
+dashboard.
+
+A span has a name, start time, duration, status (ok/error), attributes
+and an optional parent.  The current span is tracked with contextvars,
+so nested spans become children automatically.  Spans of one trace are
+buffered and written in a single transaction when the root span ends.
+
+Tracing never breaks the traced code: storage errors are logged at
+DEBUG level and dropped, and a database that does not exist is never
+created (nothing is written).
+
+Configuration (environment):
+    TRACING_ENABLED   'false' disables tracing (default: enabled)
+    TRACE_DB_PATH     Database for spans (default: DATABASE_PATH, then
+                      data/tovito.db under the project root)
+
+Usage:
+    from src.monitoring.tracing import span, traced
+
+    @traced('etl.run_full_pipeline')
+    def run_full_pipeline(...):
+        with span('etl.extract', provider=provider) as s:
+            result = extract(...)
+            s.set_attribute('ingested', result['ingested'])
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    'current_span', default=None)
+_trace_db_path: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    'trace_db_path', default=None)
+
+
+class Span:
+    """One timed operation.  Use as a context manager via Tracer.span()."""
+
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id', 'db_path',
+                 'attributes', 'started_at', 'duration_ms', 'status', 'error',
+                 '_start', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, parent: Optional['Span'],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.db_path = parent.db_path if parent else _trace_db_path.get()
+        self.attributes = dict(attributes)
+        self.started_at: Optional[datetime] = None
+        self.duration_ms: Optional[float] = None
+        self.status = STATUS_OK
+        self.error: Optional[str] = None
+        self._start = 0.0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self) -> 'Span':
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        self.tracer._opened(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        if exc is not None:
+            self.status = STATUS_ERROR
+            self.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in a different context (e.g. a generator); just clear
+            _current_span.set(None)
+        self.tracer._closed(self)
+        return False
+
+    def as_row(self) -> tuple:
+        return (
+            self.span_id, self.trace_id, self.parent_id, self.name,
+            self.started_at.isoformat(timespec='milliseconds') if self.started_at else None,
+            self.duration_ms, self.status, self.error,
+            json.dumps(self.attributes, default=str) if self.attributes else None,
+        )
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled."""
+
+    name = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def default_trace_db_path() -> str:
+    return (os.getenv('TRACE_DB_PATH') or os.getenv('DATABASE_PATH')
+            or str(_PROJECT_ROOT / 'data' / 'tovito.db'))
+
+
+def write_spans(db_path: str, spans: List[Span]):
+    """Insert spans in one transaction; never creates the database file."""
+    if not spans:
+        return
+    from src.database.schema_v2 import TRACE_SPANS_TABLE, TRACE_SPANS_INDEX
+
+    uri = Path(db_path).resolve().as_uri() + '?mode=rw'
+    conn = sqlite3.connect(uri, uri=True, timeout=10)
+    try:
+        conn.execute(TRACE_SPANS_TABLE)
+        conn.execute(TRACE_SPANS_INDEX)
+        conn.executemany("""
+            INSERT OR REPLACE INTO trace_spans (
+                span_id, trace_id, parent_id, name, started_at,
+                duration_ms, status, error, attributes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [s.as_row() for s in spans])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class Tracer:
+    """Creates spans and writes finished traces to SQLite."""
+
+    def __init__(self, db_path: Optional[str] = None, enabled: Optional[bool] = None,
+                 exporter: Optional[Callable[[List[Span]], None]] = None):
+        """
+        Args:
+            db_path: Span database (default: default_trace_db_path(),
+                resolved when a trace is written)
+            enabled: Default: TRACING_ENABLED env var (true unless 'false')
+            exporter: Called with each finished batch of spans instead of
+                writing to SQLite (tests)
+        """
+        if enabled is None:
+            enabled = os.getenv('TRACING_ENABLED', 'true').lower() != 'false'
+        self.enabled = enabled
+        self.db_path = db_path
+        self.exporter = exporter
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, List[Span]] = {}
+
+    def span(self, name: str, **attributes):
+        """Context manager timing the enclosed block as a child of the
+        current span (or a new trace if there is none)."""
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, _current_span.get(), attributes)
+
+    def _opened(self, span: Span):
+        if span.parent_id is None:
+            with self._lock:
+                self._buffers[span.trace_id] = []
+
+    def _closed(self, span: Span):
+        with self._lock:
+            if span.parent_id is None:
+                batch = self._buffers.pop(span.trace_id, []) + [span]
+            elif span.trace_id in self._buffers:
+                self._buffers[span.trace_id].append(span)
+                return
+            else:
+                # Finished after its root (e.g. a step that timed out)
+                batch = [span]
+        self._export(batch)
+
+    def _export(self, batch: List[Span]):
+        try:
+            if self.exporter is not None:
+                self.exporter(batch)
+            else:
+                write_spans(batch[-1].db_path or self.db_path or default_trace_db_path(),
+                            batch)
+        except Exception as e:
+            logger.debug("Dropped %d span(s): %s", len(batch), e)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def configure_tracing(db_path: Optional[str] = None, enabled: Optional[bool] = None,
+                      exporter: Optional[Callable[[List[Span]], None]] = None) -> Tracer:
+    """Replace the module tracer (used by span() and traced())."""
+    global _tracer
+    _tracer = Tracer(db_path=db_path, enabled=enabled, exporter=exporter)
+    return _tracer
+
+
+@contextlib.contextmanager
+def trace_to(db_path):
+    """Write traces started inside the block to db_path (None: the
+    tracer's database).  Spans joining an existing trace follow its root."""
+    token = _trace_db_path.set(str(db_path) if db_path is not None else None)
+    try:
+        yield
+    finally:
+        _trace_db_path.reset(token)
+
+
+def span(name: str, **attributes):
+    """Start a span on the module tracer (see Tracer.span)."""
+    return _tracer.span(name, **attributes)
+
+
+def current_span():
+    """The innermost open span, or a no-op span outside any trace."""
+    return _current_span.get() or _NOOP
+
+
+def traced(name: Optional[str] = None):
+    """Decorator: run the function inside a span (default name:
+    module.qualname)."""
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,30 @@
+"""
+Performance Module
+==================
+Synthetic data and timed benchmarks for the fund's hot paths.
+
+- synthetic_fund.py: Deterministic, production-shaped database generator
+- hot_paths.py:      Timed benchmarks, JSON baselines and regression checks
+
+Run from the command line with scripts/devops/hot_path_benchmark.py.
+"""
+
+from src.perf.synthetic_fund import PROFILES, FundProfile, generate_fund
+from src.perf.hot_paths import (
+    HOT_PATHS,
+    compare_to_baseline,
+    load_baseline,
+    run_hot_paths,
+    save_baseline,
+)
+
+__all__ = [
+    'PROFILES',
+    'FundProfile',
+    'generate_fund',
+    'HOT_PATHS',
+    'run_hot_paths',
+    'save_baseline',
+    'load_baseline',
+    'compare_to_baseline',
+]
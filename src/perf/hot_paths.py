@@ -0,0 +1,308 @@
+"""
+Hot-Path Benchmarks
+===================
+Times the code paths that slow down as the fund grows, against a
+database from synthetic_fund.generate_fund():
+
+- find_closest_nav:        _find_closest_nav for every NAV date (rolling returns)
+- risk_metrics:            GET /analysis/risk-metrics over the maximum lookback
+- investor_value_history:  get_investor_value_history for a sample of investors
+- etl_load_to_trades:      load_to_trades for the whole pending raw backlog
+- sanitize_message:        PIIProtector.sanitize_message over synthetic log lines
+
+Each benchmark runs once untimed, then `repeat` times; per-run setup
+(e.g. restoring the raw backlog before another load) is not timed.
+Results are saved as JSON baselines and later runs are compared
+against them on the median time, so a slowdown beyond the tolerance
+shows up as a regression.
+
+Usage:
+    from src.perf.hot_paths import run_hot_paths, compare_to_baseline, load_baseline
+
+    results = run_hot_paths('data/perf/medium.db', PROFILES['medium'])
+    for row in compare_to_baseline(results, load_baseline(path), tolerance=0.25):
+        print(row.name, row.status)
+"""
+
+import asyncio
+import json
+import platform
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.perf.synthetic_fund import FundProfile, synthetic_log_lines
+
+BASELINE_VERSION = 1
+
+# Investors sampled by investor_value_history
+VALUE_HISTORY_SAMPLE = 25
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one hot path (seconds per run)."""
+    name: str
+    ops: int          # Items processed per run (calls, rows, lines)
+    runs: int
+    best: float
+    median: float
+    mean: float
+
+    @property
+    def per_op_us(self) -> float:
+        return self.median / self.ops * 1e6 if self.ops else 0.0
+
+
+@dataclass
+class Comparison:
+    """A result measured against its baseline."""
+    name: str
+    baseline: Optional[float]   # Median seconds, None if not in the baseline
+    current: float
+    ratio: Optional[float]      # current / baseline
+    status: str                 # 'ok', 'regressed', 'faster' or 'new'
+
+
+# A benchmark's prepare step returns (run, ops, reset); reset runs untimed
+# before every run and may be None
+Prepared = Tuple[Callable[[], object], int, Optional[Callable[[], None]]]
+
+
+@contextmanager
+def _portal_database(db_path):
+    """Point the investor portal's get_connection() at db_path."""
+    from apps.investor_portal.api.config import settings
+
+    previous = settings.DATABASE_PATH
+    settings.DATABASE_PATH = str(Path(db_path).resolve())
+    try:
+        yield
+    finally:
+        settings.DATABASE_PATH = previous
+
+
+def _read(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+# ================================================================
+# BENCHMARKS
+# ================================================================
+
+def _find_closest_nav(db_path, profile, work_dir) -> Prepared:
+    from apps.investor_portal.api.routes.analysis import _find_closest_nav
+
+    rows = _read(db_path, "SELECT date, nav_per_share FROM daily_nav ORDER BY date")
+    nav_by_date = dict(rows)
+    dates_list = [d for d, _ in rows]
+
+    def run():
+        # Same lookups as the rolling-returns endpoint, over the full history
+        for current in dates_list:
+            current_day = date.fromisoformat(current)
+            for lookback in (30, 90):
+                target = str(current_day - timedelta(days=lookback))
+                _find_closest_nav(dates_list, nav_by_date, target, current)
+
+    return run, 2 * len(dates_list), None
+
+
+def _risk_metrics(db_path, profile, work_dir) -> Prepared:
+    from apps.investor_portal.api.routes.analysis import get_risk_metrics
+
+    def run():
+        with _portal_database(db_path):
+            return asyncio.run(get_risk_metrics(user=None, days=730))
+
+    return run, 1, None
+
+
+def _investor_value_history(db_path, profile, work_dir) -> Prepared:
+    from apps.investor_portal.api.models.database import get_investor_value_history
+
+    investor_ids = [r[0] for r in _read(db_path, "SELECT investor_id FROM investors ORDER BY investor_id")]
+    step = max(1, len(investor_ids) // VALUE_HISTORY_SAMPLE)
+    sample = investor_ids[::step][:VALUE_HISTORY_SAMPLE]
+    first_nav = _read(db_path, "SELECT MIN(date) FROM daily_nav")[0][0]
+    days = (date.today() - date.fromisoformat(first_nav)).days + 1
+
+    def run():
+        with _portal_database(db_path):
+            for investor_id in sample:
+                get_investor_value_history(investor_id, days=days)
+
+    return run, len(sample), None
+
+
+def _etl_load_to_trades(db_path, profile, work_dir) -> Prepared:
+    from src.etl.load import load_to_trades
+    from src.etl.transform import transform_pending
+
+    scratch = Path(work_dir) / 'etl_load.db'
+    state = {}
+
+    def reset():
+        # Every run loads the same pending backlog into the same trades table
+        shutil.copyfile(db_path, scratch)
+        state['batch'] = transform_pending(db_path=scratch)
+
+    def run():
+        batch = state['batch']
+        return load_to_trades(batch['transformed'], batch['errors'], batch['skipped'],
+                              db_path=scratch)
+
+    pending = _read(db_path, "SELECT COUNT(*) FROM brokerage_transactions_raw "
+                             "WHERE etl_status = 'pending'")[0][0]
+    return run, pending, reset
+
+
+def _sanitize_message(db_path, profile, work_dir) -> Prepared:
+    from src.utils.safe_logging import PIIProtector
+
+    lines = synthetic_log_lines(profile.log_lines, seed=profile.seed)
+
+    def run():
+        for line in lines:
+            PIIProtector.sanitize_message(line)
+
+    return run, len(lines), None
+
+
+HOT_PATHS: Dict[str, Callable[..., Prepared]] = {
+    'find_closest_nav': _find_closest_nav,
+    'risk_metrics': _risk_metrics,
+    'investor_value_history': _investor_value_history,
+    'etl_load_to_trades': _etl_load_to_trades,
+    'sanitize_message': _sanitize_message,
+}
+
+
+# ================================================================
+# RUNNER
+# ================================================================
+
+def time_runs(run: Callable[[], object], repeat: int,
+              reset: Optional[Callable[[], None]] = None, warmup: int = 1) -> List[float]:
+    """Seconds taken by each of `repeat` calls to run(), after `warmup`
+    untimed calls (imports, SQLite page cache)."""
+    timings = []
+    for i in range(warmup + repeat):
+        if reset is not None:
+            reset()
+        started = time.perf_counter()
+        run()
+        if i >= warmup:
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_hot_paths(db_path, profile: FundProfile, repeat: int = 5,
+                  names: Optional[List[str]] = None) -> Dict[str, BenchmarkResult]:
+    """
+    Time each hot path against a generated database.
+
+    Args:
+        db_path: Database written by generate_fund(profile)
+        profile: The profile the database was generated from
+        repeat: Timed runs per benchmark
+        names: Benchmarks to run (default: all of HOT_PATHS)
+
+    Returns:
+        dict of benchmark name -> BenchmarkResult
+    """
+    names = names or list(HOT_PATHS)
+    unknown = [n for n in names if n not in HOT_PATHS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='hot_paths_') as work_dir:
+        for name in names:
+            run, ops, reset = HOT_PATHS[name](str(db_path), profile, work_dir)
+            timings = time_runs(run, repeat, reset)
+            results[name] = BenchmarkResult(
+                name=name,
+                ops=ops,
+                runs=len(timings),
+                best=min(timings),
+                median=statistics.median(timings),
+                mean=statistics.fmean(timings),
+            )
+    return results
+
+
+# ================================================================
+# BASELINES
+# ================================================================
+
+def save_baseline(results: Dict[str, BenchmarkResult], path, profile: FundProfile):
+    """Write results as a JSON baseline."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        'version': BASELINE_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'profile': profile.describe(),
+        'results': {name: asdict(result) for name, result in results.items()},
+    }
+    path.write_text(json.dumps(baseline, indent=2), encoding='utf-8')
+    return path
+
+
+def load_baseline(path) -> Dict:
+    """Read a JSON baseline written by save_baseline()."""
+    baseline = json.loads(Path(path).read_text(encoding='utf-8'))
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {baseline.get('version')}")
+    return baseline
+
+
+def profile_mismatch(baseline: Dict, profile: FundProfile) -> List[str]:
+    """Profile settings that differ from the baseline's (end date ignored)."""
+    current = profile.describe()
+    recorded = baseline.get('profile', {})
+    return [key for key in current
+            if key != 'end_date' and recorded.get(key) != current[key]]
+
+
+def compare_to_baseline(results: Dict[str, BenchmarkResult], baseline: Dict,
+                        tolerance: float = 0.25) -> List[Comparison]:
+    """
+    Compare median timings with a baseline.
+
+    A benchmark is 'regressed' when it is more than `tolerance` slower
+    (0.25 = 25%) and 'faster' when it beats the baseline by the same margin.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must be >= 0")
+
+    comparisons = []
+    recorded = baseline.get('results', {})
+    for name, result in results.items():
+        base = recorded.get(name)
+        if base is None or not base.get('median'):
+            comparisons.append(Comparison(name, None, result.median, None, 'new'))
+            continue
+        ratio = result.median / base['median']
+        if ratio > 1 + tolerance:
+            status = 'regressed'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'faster'
+        else:
+            status = 'ok'
+        comparisons.append(Comparison(name, base['median'], result.median, ratio, status))
+    return comparisons
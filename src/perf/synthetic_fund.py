@@ -0,0 +1,369 @@
+"""
+Synthetic Fund Generator
+========================
+Builds a production-shaped SQLite database for performance work: years
+of daily NAV, thousands of investors with their contribution and
+withdrawal history, a large trades table and a backlog of pending raw
+ETL rows (some of which duplicate trades already loaded, as happens
+when a sync window overlaps the previous one).
+
+Generation is deterministic: the same profile (including its seed and
+end date) always produces the same rows.  Without an explicit end date
+the history ends today, so its shape stays the same from day to day.
+
+Tables use the production DDL and indexes from schema_v2.py, plus the
+legacy 'type' column the production trades table still carries (the
+ETL load writes it).
+
+Usage:
+    from src.perf.synthetic_fund import PROFILES, generate_fund
+
+    stats = generate_fund('data/perf/medium.db', PROFILES['medium'])
+"""
+
+import json
+import random
+import re
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SYMBOLS = [
+    'SPY', 'QQQ', 'IWM', 'AAPL', 'MSFT', 'NVDA', 'AMZN', 'GOOGL', 'META', 'TSLA',
+    'AMD', 'SGOV', 'TLT', 'GLD', 'XLE', 'XLF', 'JPM', 'COST', 'AVGO', 'NFLX',
+]
+
+# Raw ETL rows in TastyTrade's shape: (transaction_type, subtype, is_option)
+RAW_TRADE_KINDS = [
+    ('Trade', 'Buy', False),
+    ('Trade', 'Sell', False),
+    ('Trade', 'Buy to Open', True),
+    ('Trade', 'Sell to Close', True),
+    ('Trade', 'Sell to Open', True),
+    ('Trade', 'Buy to Close', True),
+    ('Money Movement', '', False),
+    ('Dividend', '', False),
+    ('Fee', '', False),
+]
+
+LOG_TEMPLATES = [
+    "Daily NAV update completed for fund without issues",
+    "Loaded {n} rows from tastytrade_positions in 0.{n}s",
+    "NAV 2026-03-{d:02d} per share 1.0{n}",
+    "Processed ${n},{n:03d}.00 contribution for investor {d}",
+    "Sent statement to investor{n}@example.com",
+    "Callback from 555-{n:03d}-{n:04d} recorded",
+    "Brokerage sync using sk_{key} finished",
+    "Heartbeat ok",
+]
+
+
+@dataclass(frozen=True)
+class FundProfile:
+    """Size and shape of a synthetic fund."""
+    name: str
+    years: float = 3
+    investors: int = 2000
+    flows_per_investor: int = 6      # Average contributions/withdrawals after the initial one
+    trades: int = 100_000
+    raw_rows: int = 50_000
+    raw_duplicate_pct: float = 0.1   # Share of raw rows already present in trades
+    log_lines: int = 200_000
+    seed: int = 42
+    end_date: Optional[date] = None  # Default: today
+
+    def resolved(self) -> 'FundProfile':
+        """The profile with its end date pinned."""
+        return self if self.end_date else replace(self, end_date=date.today())
+
+    def describe(self) -> Dict:
+        return {key: str(value) if isinstance(value, date) else value
+                for key, value in asdict(self.resolved()).items()}
+
+
+PROFILES = {
+    'small': FundProfile('small', years=1, investors=200, trades=20_000,
+                         raw_rows=5_000, log_lines=50_000),
+    'medium': FundProfile('medium'),
+    'large': FundProfile('large', years=5, investors=5_000, flows_per_investor=10,
+                         trades=300_000, raw_rows=200_000, log_lines=1_000_000),
+}
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """Weekdays from start to end inclusive."""
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def synthetic_log_lines(count: int, seed: int = 42) -> List[str]:
+    """Log lines in the mix SafeLogger sees: plain status lines plus
+    lines carrying dollar amounts, emails, phone numbers and API keys."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        template = rng.choice(LOG_TEMPLATES)
+        n = rng.randint(100, 999)
+        lines.append(template.format(n=n, d=rng.randint(1, 28),
+                                     key=''.join(rng.choices('abcdef0123456789', k=24))))
+    return lines
+
+
+# ================================================================
+# SCHEMA
+# ================================================================
+
+def _create_schema(conn: sqlite3.Connection):
+    from src.database.schema_v2 import (
+        BROKERAGE_TRANSACTIONS_RAW_TABLE,
+        DAILY_NAV_TABLE,
+        INDEXES,
+        INVESTORS_TABLE,
+        TRADES_TABLE,
+        TRANSACTIONS_TABLE,
+    )
+
+    tables = {'investors', 'transactions', 'daily_nav', 'trades', 'brokerage_transactions_raw'}
+    for ddl in (INVESTORS_TABLE, TRANSACTIONS_TABLE, DAILY_NAV_TABLE, TRADES_TABLE,
+                BROKERAGE_TRANSACTIONS_RAW_TABLE):
+        conn.execute(ddl)
+    conn.execute("ALTER TABLE trades ADD COLUMN type TEXT")
+    for index in INDEXES:
+        match = re.search(r'\bON (\w+)\(', index)
+        if match and match.group(1) in tables:
+            conn.execute(index)
+
+
+# ================================================================
+# GENERATION
+# ================================================================
+
+def _nav_series(rng: random.Random, days: List[date]) -> List[float]:
+    nav = 10.0
+    series = []
+    for _ in days:
+        nav = max(0.01, round(nav * (1 + rng.gauss(0.0004, 0.011)), 4))
+        series.append(nav)
+    return series
+
+
+def _investor_rows(rng, profile, days, navs, now):
+    """Investors and their transactions; returns (investors, transactions, share deltas)."""
+    investors, transactions = [], []
+    share_delta = [0.0] * len(days)
+
+    for i in range(profile.investors):
+        # The first few investors found the fund; the rest join over time
+        join = 0 if i < 10 else rng.randrange(len(days))
+        join_date = days[join]
+        investor_id = f"{join_date:%Y%m%d}-{i:05d}A"
+
+        flow_days = sorted(rng.randrange(join, len(days))
+                           for _ in range(rng.randint(0, 2 * profile.flows_per_investor)))
+        initial = float(rng.randrange(5_000, 100_001, 500))
+        shares = net = 0.0
+        for n, day in enumerate([join] + flow_days):
+            nav = navs[day]
+            if n == 0:
+                kind, amount = 'Initial', initial
+            elif rng.random() < 0.7 or shares * nav < 1_000:
+                kind, amount = 'Contribution', float(rng.randrange(500, 25_001, 100))
+            else:
+                kind = 'Withdrawal'
+                amount = -round(shares * nav * rng.uniform(0.05, 0.5), 2)
+            shares_transacted = round(amount / nav, 4)
+            shares += shares_transacted
+            net += amount
+            share_delta[day] += shares_transacted
+            transactions.append((days[day].isoformat(), investor_id, kind, amount,
+                                 shares_transacted, nav, now, now))
+
+        investors.append((investor_id, f"Synthetic Investor {i:05d}",
+                          f"investor{i:05d}@example.com", initial, round(shares, 4),
+                          round(net, 2), join_date.isoformat(), now, now))
+
+    return investors, transactions, share_delta
+
+
+def _nav_rows(days, navs, share_delta, now):
+    rows = []
+    total_shares = 0.0
+    prev_value = None
+    prev_nav = None
+    for day, nav, delta in zip(days, navs, share_delta):
+        total_shares += delta
+        value = round(nav * total_shares, 2)
+        change_value = round(value - prev_value, 2) if prev_value is not None else 0.0
+        change_pct = round((nav / prev_nav - 1) * 100, 4) if prev_nav else 0.0
+        rows.append((day.isoformat(), value, round(total_shares, 4), nav,
+                     change_value, change_pct, now, now))
+        prev_value, prev_nav = value, nav
+    return rows
+
+
+def _trade_rows(rng, profile, days, now):
+    rows = []
+    for i in range(profile.trades):
+        day = days[rng.randrange(len(days))].isoformat()
+        symbol = rng.choice(SYMBOLS)
+        roll = rng.random()
+        option_type = strike = expiration = None
+        if roll < 0.6:
+            trade_type = rng.choice(('buy', 'sell'))
+            quantity = rng.randint(1, 200)
+            price = round(rng.uniform(20, 900), 2)
+            amount = round(quantity * price * (-1 if trade_type == 'buy' else 1), 2)
+            category, subcategory = 'Trade', 'Stock Buy' if trade_type == 'buy' else 'Stock Sell'
+        elif roll < 0.9:
+            trade_type = rng.choice(('buy_to_open', 'sell_to_close', 'sell_to_open', 'buy_to_close'))
+            quantity = rng.randint(1, 20)
+            price = round(rng.uniform(0.5, 25), 2)
+            amount = round(quantity * price * 100 * (-1 if trade_type.startswith('buy') else 1), 2)
+            option_type = rng.choice(('call', 'put'))
+            strike = float(rng.randrange(50, 900, 5))
+            expiration = day
+            symbol = f"{symbol} {strike:g}{option_type[0].upper()}"
+            category = 'Trade'
+            subcategory = 'Option Buy' if trade_type.startswith('buy') else 'Option Sell'
+        else:
+            trade_type = rng.choice(('dividend', 'fee'))
+            quantity = price = None
+            amount = round(rng.uniform(1, 500) * (1 if trade_type == 'dividend' else -1), 2)
+            category, subcategory = ('Income', 'Dividend') if trade_type == 'dividend' else ('Fee', 'Fee')
+        rows.append((day, trade_type, trade_type, symbol, quantity, price, amount,
+                     option_type, strike, expiration, round(rng.uniform(0, 1), 2),
+                     round(rng.uniform(0, 0.2), 2), category, subcategory,
+                     f"Synthetic {trade_type} {symbol}", 'tastytrade', f"SYN-{i:07d}",
+                     now, now))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def _raw_rows(rng, profile, days, now):
+    rows = []
+    duplicates = min(int(profile.raw_rows * profile.raw_duplicate_pct), profile.trades)
+    already_loaded = rng.sample(range(profile.trades), duplicates)
+    for i in range(profile.raw_rows):
+        if i < duplicates:
+            brokerage_id = f"SYN-{already_loaded[i]:07d}"
+        else:
+            brokerage_id = f"SYN-RAW-{i:07d}"
+        day = days[rng.randrange(len(days))].isoformat()
+        txn_type, subtype, is_option = rng.choice(RAW_TRADE_KINDS)
+        symbol = rng.choice(SYMBOLS) if txn_type in ('Trade', 'Dividend') else None
+        raw = {
+            'id': brokerage_id,
+            'executed_at': f"{day}T14:30:00Z",
+            'commission': round(rng.uniform(0, 1), 2),
+            'clearing_fees': round(rng.uniform(0, 0.2), 2),
+            'regulatory_fees': round(rng.uniform(0, 0.05), 2),
+        }
+        if txn_type == 'Trade':
+            raw['quantity'] = rng.randint(1, 20 if is_option else 200)
+            raw['price'] = round(rng.uniform(0.5, 25) if is_option else rng.uniform(20, 900), 2)
+            sign = -1 if subtype.startswith('Buy') else 1
+            amount = round(raw['quantity'] * raw['price'] * (100 if is_option else 1) * sign, 2)
+            if is_option:
+                raw['option_type'] = rng.choice(('call', 'put'))
+                raw['strike_price'] = float(rng.randrange(50, 900, 5))
+                raw['expiration_date'] = day
+        elif txn_type == 'Money Movement':
+            amount = float(rng.randrange(-20_000, 50_001, 100))
+        elif txn_type == 'Dividend':
+            amount = round(rng.uniform(1, 500), 2)
+        else:
+            amount = -round(rng.uniform(1, 50), 2)
+        rows.append(('tastytrade', brokerage_id, json.dumps(raw), day, txn_type, subtype,
+                     symbol, amount, f"Synthetic {txn_type} {subtype}".strip(), now))
+    return rows
+
+
+def generate_fund(db_path, profile: FundProfile = PROFILES['medium']) -> Dict:
+    """
+    Write a synthetic fund database, replacing any existing file.
+
+    Args:
+        db_path: Database file to create
+        profile: Size and shape of the fund
+
+    Returns:
+        dict of row counts, the date range and generation time.
+    """
+    started = time.perf_counter()
+    profile = profile.resolved()
+    rng = random.Random(profile.seed)
+    # Fixed timestamp so identical profiles produce identical rows
+    now = f"{profile.end_date.isoformat()} 18:00:00"
+
+    days = trading_days(profile.end_date - timedelta(days=round(profile.years * 365)),
+                        profile.end_date)
+    if not days:
+        raise ValueError(f"Profile '{profile.name}' covers no trading days")
+    navs = _nav_series(rng, days)
+    investors, transactions, share_delta = _investor_rows(rng, profile, days, navs, now)
+    nav_rows = _nav_rows(days, navs, share_delta, now)
+    trades = _trade_rows(rng, profile, days, now)
+    raw = _raw_rows(rng, profile, days, now)
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        _create_schema(conn)
+        with conn:
+            conn.executemany("""
+                INSERT INTO investors (investor_id, name, email, initial_capital,
+                    current_shares, net_investment, join_date, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, investors)
+            conn.executemany("""
+                INSERT INTO transactions (date, investor_id, transaction_type, amount,
+                    shares_transacted, nav_per_share, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, transactions)
+            conn.executemany("""
+                INSERT INTO daily_nav (date, total_portfolio_value, total_shares, nav_per_share,
+                    daily_change_value, daily_change_percent, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, nav_rows)
+            conn.executemany("""
+                INSERT INTO trades (date, type, trade_type, symbol, quantity, price, amount,
+                    option_type, strike, expiration_date, commission, fees,
+                    category, subcategory, description, source, brokerage_transaction_id,
+                    created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, trades)
+            conn.executemany("""
+                INSERT INTO brokerage_transactions_raw (source, brokerage_transaction_id,
+                    raw_data, transaction_date, transaction_type, transaction_subtype,
+                    symbol, amount, description, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, raw)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    return {
+        'profile': profile.name,
+        'start_date': days[0].isoformat(),
+        'end_date': days[-1].isoformat(),
+        'nav_days': len(nav_rows),
+        'investors': len(investors),
+        'transactions': len(transactions),
+        'trades': len(trades),
+        'raw_rows': len(raw),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
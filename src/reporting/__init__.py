@@ -4,5 +4,6 @@ Reporting Module
 Chart generation and report utilities for Tovito Trader.
 
 Sub-modules:
-    charts — matplotlib chart generation for PDF reports
+    charts     — matplotlib chart generation for PDF reports
+    performers — per-symbol P&L across holdings snapshots
 """
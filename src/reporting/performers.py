@@ -0,0 +1,201 @@
+"""
+Historical Performer Analytics
+==============================
+Per-symbol P&L across the holdings snapshots: first and last
+observation, holding period, best/worst unrealized P&L (dollars and
+percent of cost basis) and the P&L on the last day the symbol was held.
+
+compute_symbol_performance() gets all of it in one pass over the
+snapshots with window functions.  The all-history result is also kept
+in the symbol_performance_summary table.  Each snapshot write updates
+the table with just that day's positions, so reading it costs the same
+however long the snapshot history gets.  A rewrite of a day that is
+already in the summary (a re-run or a backfill) rebuilds it.
+
+Cash and cash-like instruments are excluded, and only symbols that ever
+had a non-zero cost basis are reported.
+
+Usage:
+    from src.reporting.performers import get_symbol_performance
+
+    rows = get_symbol_performance(conn, since='2025-01-01')   # best % first
+"""
+
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-symbol aggregate columns, in table order
+SUMMARY_COLUMNS = (
+    'symbol', 'first_seen', 'last_seen', 'holding_days', 'observation_days',
+    'best_unrealized_pl', 'worst_unrealized_pl', 'best_pl_pct', 'worst_pl_pct',
+    'latest_unrealized_pl', 'latest_cost_basis', 'max_abs_cost_basis',
+)
+
+# One pass over the observations (one row per position per snapshot):
+# FIRST_VALUE finds each symbol's last observed date so the latest P&L
+# is summed in the same GROUP BY.  {where} filters the snapshot dates.
+_PERFORMANCE_SQL = """
+    WITH observations AS (
+        SELECT
+            ps.symbol,
+            hs.date,
+            ps.unrealized_pl,
+            ps.cost_basis,
+            FIRST_VALUE(hs.date) OVER (
+                PARTITION BY ps.symbol ORDER BY hs.date DESC
+            ) AS last_date
+        FROM holdings_snapshots hs
+        JOIN position_snapshots ps ON ps.snapshot_id = hs.snapshot_id
+        WHERE {where}
+          AND ps.symbol NOT IN ('Cash', 'CASH')
+          AND ps.instrument_type NOT LIKE '%Cash%'
+    )
+    SELECT
+        symbol,
+        MIN(date) AS first_seen,
+        MAX(date) AS last_seen,
+        CAST(julianday(MAX(date)) - julianday(MIN(date)) AS INTEGER) AS holding_days,
+        COUNT(DISTINCT date) AS observation_days,
+        MAX(unrealized_pl) AS best_unrealized_pl,
+        MIN(unrealized_pl) AS worst_unrealized_pl,
+        MAX(CASE WHEN cost_basis > 0 THEN unrealized_pl / cost_basis * 100 END) AS best_pl_pct,
+        MIN(CASE WHEN cost_basis > 0 THEN unrealized_pl / cost_basis * 100 END) AS worst_pl_pct,
+        SUM(CASE WHEN date = last_date THEN unrealized_pl END) AS latest_unrealized_pl,
+        SUM(CASE WHEN date = last_date THEN cost_basis END) AS latest_cost_basis,
+        MAX(ABS(cost_basis)) AS max_abs_cost_basis
+    FROM observations
+    GROUP BY symbol
+"""
+
+
+def _dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _reportable(rows: List[Dict]) -> List[Dict]:
+    """Symbols with a cost basis, best P&L % first (unknown % last)."""
+    rows = [r for r in rows if r['max_abs_cost_basis']]
+    rows.sort(key=lambda r: (r['best_pl_pct'] is None, -(r['best_pl_pct'] or 0)))
+    return rows
+
+
+def ensure_performance_schema(conn: sqlite3.Connection) -> None:
+    """Create the symbol_performance_summary table."""
+    from src.database.schema_v2 import SYMBOL_PERFORMANCE_TABLE
+
+    conn.execute(SYMBOL_PERFORMANCE_TABLE)
+
+
+def compute_symbol_performance(conn: sqlite3.Connection,
+                               since: Optional[str] = None) -> List[Dict]:
+    """
+    Per-symbol performance straight from the snapshots.
+
+    Args:
+        conn: Database connection
+        since: Only snapshots on or after this date (default: all)
+
+    Returns:
+        List of dicts with SUMMARY_COLUMNS, best P&L % first.
+    """
+    query = _PERFORMANCE_SQL.format(where="hs.date >= ?")
+    return _reportable(_dicts(conn.execute(query, (since or '',))))
+
+
+def rebuild_performance_summary(conn: sqlite3.Connection) -> int:
+    """Recompute symbol_performance_summary from every snapshot.
+
+    Returns the number of symbols. The caller commits."""
+    ensure_performance_schema(conn)
+    conn.execute("DELETE FROM symbol_performance_summary")
+    conn.execute(f"""
+        INSERT INTO symbol_performance_summary ({', '.join(SUMMARY_COLUMNS)})
+        SELECT * FROM ({_PERFORMANCE_SQL.format(where='1 = 1')})
+    """)
+    return conn.execute("SELECT COUNT(*) FROM symbol_performance_summary").fetchone()[0]
+
+
+def _merge(column: str, func: str) -> str:
+    """NULL-safe two-argument MIN/MAX of the stored and the new value."""
+    return (f"{column} = {func}(COALESCE({column}, excluded.{column}), "
+            f"COALESCE(excluded.{column}, {column}))")
+
+
+def update_performance_summary(conn: sqlite3.Connection, snapshot_date: str) -> int:
+    """
+    Fold one day's snapshots into symbol_performance_summary.
+
+    Days after everything in the summary are merged in; anything else
+    (a re-run, a backfill or a summary that was never built) rebuilds
+    it. The caller commits.
+
+    Returns:
+        Number of symbols written.
+    """
+    ensure_performance_schema(conn)
+
+    last_seen = conn.execute("SELECT MAX(last_seen) FROM symbol_performance_summary").fetchone()[0]
+    if last_seen is None:
+        earlier = conn.execute("SELECT 1 FROM holdings_snapshots WHERE date < ? LIMIT 1",
+                               (snapshot_date,)).fetchone()
+        if earlier:
+            return rebuild_performance_summary(conn)
+    elif snapshot_date <= last_seen:
+        return rebuild_performance_summary(conn)
+
+    day = conn.execute(_PERFORMANCE_SQL.format(where="hs.date = ?"), (snapshot_date,)).fetchall()
+    placeholders = ', '.join('?' * len(SUMMARY_COLUMNS))
+    conn.executemany(f"""
+        INSERT INTO symbol_performance_summary ({', '.join(SUMMARY_COLUMNS)})
+        VALUES ({placeholders})
+        ON CONFLICT(symbol) DO UPDATE SET
+            last_seen = excluded.last_seen,
+            holding_days = CAST(julianday(excluded.last_seen) - julianday(first_seen) AS INTEGER),
+            observation_days = observation_days + 1,
+            {_merge('best_unrealized_pl', 'MAX')},
+            {_merge('worst_unrealized_pl', 'MIN')},
+            {_merge('best_pl_pct', 'MAX')},
+            {_merge('worst_pl_pct', 'MIN')},
+            latest_unrealized_pl = excluded.latest_unrealized_pl,
+            latest_cost_basis = excluded.latest_cost_basis,
+            {_merge('max_abs_cost_basis', 'MAX')},
+            updated_at = CURRENT_TIMESTAMP
+    """, [tuple(row) for row in day])
+    return len(day)
+
+
+def get_symbol_performance(conn: sqlite3.Connection,
+                           since: Optional[str] = None) -> List[Dict]:
+    """
+    Per-symbol performance, from the summary table when it applies.
+
+    The summary covers every snapshot, so it answers any window that
+    starts on or before the first snapshot; shorter windows are computed
+    from their own snapshots.
+
+    Args:
+        conn: Database connection
+        since: Only snapshots on or after this date (default: all)
+
+    Returns:
+        List of dicts with SUMMARY_COLUMNS, best P&L % first.
+    """
+    first_snapshot = conn.execute("SELECT MIN(date) FROM holdings_snapshots").fetchone()[0]
+    if first_snapshot is None:
+        return []
+    if since and since > first_snapshot:
+        return compute_symbol_performance(conn, since)
+
+    try:
+        rows = _dicts(conn.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM symbol_performance_summary"))
+    except sqlite3.OperationalError:
+        rows = []
+    if not rows:
+        # Summary not built yet (e.g. snapshots from before it existed)
+        return compute_symbol_performance(conn, since)
+    return _reportable(rows)
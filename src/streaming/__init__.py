@@ -31,6 +31,7 @@ from .tradier_streaming import (
     Quote,
     Trade,
     PortfolioUpdate,
+    OrderEvent,
     StreamType,
     stream_quotes,
     get_live_quote
@@ -42,6 +43,7 @@ __all__ = [
     'Quote',
     'Trade',
     'PortfolioUpdate',
+    'OrderEvent',
     'StreamType',
     'stream_quotes',
     'get_live_quote'
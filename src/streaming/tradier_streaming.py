@@ -8,6 +8,7 @@ Features:
 - Live quotes (bid/ask/last)
 - Trade data
 - Account balance updates
+- Account order events (fills, cancels)
 - Event-driven architecture
 - Auto-reconnection
 - Heartbeat monitoring
@@ -94,6 +95,23 @@ class PortfolioUpdate:
         return f"Portfolio: ${self.total_value:,.2f} (Cash: ${self.cash:,.2f} | Equity: ${self.equity:,.2f})"
 
 
+@dataclass
+class OrderEvent:
+    """Account order status change (Tradier sends no symbol or side)"""
+    order_id: str
+    status: str
+    order_type: str
+    avg_fill_price: float
+    executed_quantity: float
+    remaining_quantity: float
+    account: str
+    transaction_date: str
+    timestamp: datetime
+
+    def __str__(self):
+        return f"Order {self.order_id}: {self.status} ({self.executed_quantity:g} @ ${self.avg_fill_price:.2f})"
+
+
 class TradierStreaming:
     """
     Tradier WebSocket Streaming Client
@@ -115,6 +133,11 @@ class TradierStreaming:
     STREAM_ENDPOINT = "wss://ws.tradier.com/v1/markets/events"
     SESSION_URL = "https://api.tradier.com/v1/markets/events/session"
     SANDBOX_SESSION_URL = "https://sandbox.tradier.com/v1/markets/events/session"
+
+    # Account events (order status) use their own session and socket
+    ACCOUNT_STREAM_ENDPOINT = "wss://ws.tradier.com/v1/accounts/events"
+    ACCOUNT_SESSION_URL = "https://api.tradier.com/v1/accounts/events/session"
+    SANDBOX_ACCOUNT_SESSION_URL = "https://sandbox.tradier.com/v1/accounts/events/session"
     
     def __init__(
         self,
@@ -147,11 +170,13 @@ class TradierStreaming:
         # Subscriptions
         self._subscribed_symbols: List[str] = []
         self._stream_types: List[StreamType] = [StreamType.QUOTES]
+        self._account_events = False
         
         # Callbacks
         self._quote_callbacks: List[Callable[[Quote], None]] = []
         self._trade_callbacks: List[Callable[[Trade], None]] = []
         self._portfolio_callbacks: List[Callable[[PortfolioUpdate], None]] = []
+        self._order_callbacks: List[Callable[[OrderEvent], None]] = []
         self._error_callbacks: List[Callable[[Exception], None]] = []
         self._connect_callbacks: List[Callable[[], None]] = []
         self._disconnect_callbacks: List[Callable[[], None]] = []
@@ -166,7 +191,13 @@ class TradierStreaming:
 
     def _get_session_url(self) -> str:
         """Get the appropriate session URL"""
+        if self._account_events:
+            return self.SANDBOX_ACCOUNT_SESSION_URL if self.sandbox else self.ACCOUNT_SESSION_URL
         return self.SANDBOX_SESSION_URL if self.sandbox else self.SESSION_URL
+
+    def _get_stream_endpoint(self) -> str:
+        """Get the WebSocket endpoint for the subscribed stream"""
+        return self.ACCOUNT_STREAM_ENDPOINT if self._account_events else self.STREAM_ENDPOINT
     
     def _create_session(self) -> str:
         """Create a streaming session and get session ID"""
@@ -212,6 +243,11 @@ class TradierStreaming:
         self._portfolio_callbacks.append(callback)
         return self
     
+    def on_order(self, callback: Callable[[OrderEvent], None]) -> 'TradierStreaming':
+        """Register callback for account order events"""
+        self._order_callbacks.append(callback)
+        return self
+
     def on_error(self, callback: Callable[[Exception], None]) -> 'TradierStreaming':
         """Register callback for errors"""
         self._error_callbacks.append(callback)
@@ -247,6 +283,17 @@ class TradierStreaming:
             self._stream_types.append(StreamType.TRADES)
         return self.subscribe(symbols)
     
+    def subscribe_account_events(self) -> 'TradierStreaming':
+        """
+        Stream account order events instead of market data.
+
+        One client streams either market data or account events, since
+        Tradier serves them from separate sessions.
+        """
+        self._account_events = True
+        logger.info("Subscribed to account order events")
+        return self
+
     def add_symbol(self, symbol: str) -> 'TradierStreaming':
         """Add a symbol to subscription"""
         symbol = symbol.upper()
@@ -282,6 +329,12 @@ class TradierStreaming:
     
     async def _send_subscription(self):
         """Send subscription message to WebSocket"""
+        if self._websocket and self._account_events:
+            message = json.dumps({'events': ['order'], 'sessionid': self._session_id})
+            logger.debug("Sending account subscription")
+            await self._websocket.send(message)
+            return
+
         if not self._websocket or not self._subscribed_symbols:
             return
         
@@ -337,7 +390,16 @@ class TradierStreaming:
                         except Exception as e:
                             logger.error(f"Trade callback error: {e}")
             
-            elif msg_type == 'heartbeat':
+            elif data.get('event') == 'order':
+                order = self._parse_order(data)
+                if order:
+                    for callback in self._order_callbacks:
+                        try:
+                            callback(order)
+                        except Exception as e:
+                            logger.error(f"Order callback error: {e}")
+            
+            elif msg_type == 'heartbeat' or data.get('event') == 'heartbeat':
                 self._last_heartbeat = datetime.now()
                 logger.debug("Heartbeat received")
             
@@ -385,6 +447,24 @@ class TradierStreaming:
             logger.error(f"Trade parse error: {e}")
             return None
     
+    def _parse_order(self, data: dict) -> Optional[OrderEvent]:
+        """Parse an account order event"""
+        try:
+            return OrderEvent(
+                order_id=str(data.get('id', '')),
+                status=data.get('status', ''),
+                order_type=data.get('type', ''),
+                avg_fill_price=float(data.get('avg_fill_price') or 0),
+                executed_quantity=float(data.get('executed_quantity') or 0),
+                remaining_quantity=float(data.get('remaining_quantity') or 0),
+                account=data.get('account', ''),
+                transaction_date=data.get('transaction_date', ''),
+                timestamp=datetime.now()
+            )
+        except Exception as e:
+            logger.error(f"Order parse error: {e}")
+            return None
+    
     async def _connect(self):
         """Establish WebSocket connection"""
         while self._running:
@@ -395,7 +475,7 @@ class TradierStreaming:
                 # Connect to WebSocket
                 logger.info("Connecting to WebSocket...")
                 async with websockets.connect(
-                    self.STREAM_ENDPOINT,
+                    self._get_stream_endpoint(),
                     ping_interval=30,
                     ping_timeout=10
                 ) as ws:
@@ -461,7 +541,7 @@ class TradierStreaming:
             logger.warning("Already running")
             return
         
-        if not self._subscribed_symbols:
+        if not self._subscribed_symbols and not self._account_events:
             logger.warning("No symbols subscribed - call subscribe() first")
         
         self._running = True
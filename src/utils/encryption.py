@@ -21,16 +21,29 @@ Key Management:
     - Back up the key separately — data is unrecoverable without it
 
 Key Rotation:
-    - New encryptions use versioned format: v1:<ciphertext>
+    - New encryptions use versioned format: v<N>:<ciphertext>, where N is
+      the key generation (ENCRYPTION_KEY_VERSION, default 1)
     - Old unversioned ciphertext (v0) is supported for backward compatibility
-    - Set ENCRYPTION_LEGACY_KEYS (comma-separated) in .env for old keys
-    - Decrypt tries current key first, then each legacy key in order
+    - Set ENCRYPTION_LEGACY_KEYS (comma-separated, newest first) in .env for
+      old keys; they are generations N-1, N-2, ...
+    - Decrypt picks the key from the version prefix; it only falls back to
+      trying every key for v0 data or a prefix that does not match
     - Use scripts/setup/rotate_encryption_key.py to re-encrypt all fields
+
+Batch use:
+    values = enc.decrypt_many([row['ssn_encrypted'], row['tax_id_encrypted']])
+
+    with plaintext_cache():  # One request / screen
+        ...                  # Repeated decrypts of a value hit the cache
+    # Cached plaintext buffers are zeroed when the block exits
 """
 
 import os
+import re
 import logging
-from typing import Optional, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 from cryptography.fernet import Fernet, InvalidToken
 from dotenv import load_dotenv
 
@@ -38,9 +51,71 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Current ciphertext version prefix
+# Ciphertext version prefix for the default key generation
 CIPHERTEXT_VERSION = "v1"
 
+_VERSION_PREFIX = re.compile(r'v(\d+):')
+
+
+class PlaintextCache:
+    """
+    Short-lived ciphertext -> plaintext cache.
+
+    Entries are keyed by (encryptor id, ciphertext) so one encryptor never
+    serves plaintext that another could not decrypt itself.  Plaintext
+    is held in bytearrays so clear() can overwrite it in place.
+    This is best effort: str values already handed to callers are
+    immutable and are reclaimed by the garbage collector as usual.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, str], bytearray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[int, str]) -> Optional[str]:
+        buf = self._entries.get(key)
+        if buf is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return buf.decode('utf-8')
+
+    def put(self, key: Tuple[int, str], plaintext: bytes):
+        self._entries[key] = bytearray(plaintext)
+
+    def clear(self):
+        """Zero every cached plaintext buffer and drop the entries."""
+        for buf in self._entries.values():
+            buf[:] = bytes(len(buf))
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_active_cache: ContextVar[Optional[PlaintextCache]] = ContextVar(
+    'encryption_plaintext_cache', default=None
+)
+
+
+@contextmanager
+def plaintext_cache() -> Iterator[PlaintextCache]:
+    """
+    Scope a PlaintextCache to the enclosed block (e.g. one API request).
+
+    FieldEncryptor.decrypt() and decrypt_many() use the active cache
+    automatically.  The cache is zeroed and removed when the block exits,
+    including on error.
+    """
+    cache = PlaintextCache()
+    token = _active_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_cache.reset(token)
+        cache.clear()
+
 
 class FieldEncryptor:
     """
@@ -52,7 +127,8 @@ class FieldEncryptor:
     """
 
     def __init__(self, key: Optional[str] = None,
-                 legacy_keys: Optional[List[str]] = None):
+                 legacy_keys: Optional[List[str]] = None,
+                 key_version: Optional[int] = None):
         """
         Initialize the encryptor.
 
@@ -60,8 +136,12 @@ class FieldEncryptor:
             key: Base64-encoded Fernet key. If None, reads from
                  ENCRYPTION_KEY env var.
             legacy_keys: List of old Fernet keys for decrypting data
-                         encrypted with previous keys. If None, reads
-                         from ENCRYPTION_LEGACY_KEYS env var (comma-separated).
+                         encrypted with previous keys, newest first. If
+                         None, reads from ENCRYPTION_LEGACY_KEYS env var
+                         (comma-separated).
+            key_version: Generation number of key, written as the v<N>:
+                         ciphertext prefix. If None, reads from
+                         ENCRYPTION_KEY_VERSION env var (default 1).
 
         Raises:
             ValueError: If no key is available
@@ -86,12 +166,26 @@ class FieldEncryptor:
             legacy_env = os.getenv('ENCRYPTION_LEGACY_KEYS', '')
             legacy_keys = [k.strip() for k in legacy_env.split(',') if k.strip()]
 
+        if key_version is None:
+            key_version = int(os.getenv('ENCRYPTION_KEY_VERSION', '1'))
+        if key_version < 1:
+            raise ValueError(f"Invalid key version: {key_version} (must be >= 1)")
+        self._key_version = key_version
+
+        # Version prefix -> key.  Legacy keys are the generations before
+        # the current one, newest first.
+        self._fernets_by_version = {key_version: self._fernet}
+
         for i, lk in enumerate(legacy_keys):
             try:
                 lk_bytes = lk.encode() if isinstance(lk, str) else lk
-                self._legacy_fernets.append(Fernet(lk_bytes))
+                legacy_fernet = Fernet(lk_bytes)
             except Exception as e:
                 logger.warning("Invalid legacy key at index %d: %s", i, e)
+                continue
+            self._legacy_fernets.append(legacy_fernet)
+            if key_version - 1 - i >= 1:
+                self._fernets_by_version[key_version - 1 - i] = legacy_fernet
 
     def encrypt(self, plaintext: str) -> str:
         """
@@ -114,14 +208,17 @@ class FieldEncryptor:
             plaintext = str(plaintext)
 
         token = self._fernet.encrypt(plaintext.encode('utf-8'))
-        return f"{CIPHERTEXT_VERSION}:{token.decode('utf-8')}"
+        return f"v{self._key_version}:{token.decode('utf-8')}"
 
     def decrypt(self, ciphertext: str) -> str:
         """
         Decrypt a ciphertext string.
 
-        Supports both versioned (v1:...) and unversioned (legacy) formats.
-        Tries current key first, then each legacy key in order.
+        Supports both versioned (v<N>:...) and unversioned (legacy) formats.
+        The key is chosen from the version prefix; unversioned data, or a
+        prefix whose key does not match, falls back to trying the current
+        key and then each legacy key in order.  Uses the active
+        plaintext_cache() if there is one.
 
         Args:
             ciphertext: Ciphertext from encrypt() (versioned or unversioned)
@@ -135,25 +232,39 @@ class FieldEncryptor:
         if ciphertext is None:
             raise ValueError("Cannot decrypt None value")
 
-        # Strip version prefix if present
-        raw_token = ciphertext
-        if ':' in ciphertext:
-            prefix, remainder = ciphertext.split(':', 1)
-            if prefix in ('v1',):
-                raw_token = remainder
+        cache = _active_cache.get()
+        if cache is not None:
+            cached = cache.get((id(self), ciphertext))
+            if cached is not None:
+                return cached
 
-        # Try current key first
-        try:
-            plaintext = self._fernet.decrypt(raw_token.encode('utf-8'))
-            return plaintext.decode('utf-8')
-        except InvalidToken:
-            pass
+        plaintext = self._decrypt_bytes(ciphertext)
+        if cache is not None:
+            cache.put((id(self), ciphertext), plaintext)
+        return plaintext.decode('utf-8')
+
+    def _decrypt_bytes(self, ciphertext: str) -> bytes:
+        """Decrypt to raw bytes, choosing the key from the version prefix."""
+        raw_token = ciphertext
+        version = 0
+        match = _VERSION_PREFIX.match(ciphertext)
+        if match:
+            version = int(match.group(1))
+            raw_token = ciphertext[match.end():]
+        token = raw_token.encode('utf-8')
+
+        preferred = self._fernets_by_version.get(version)
+        if preferred is not None:
+            try:
+                return preferred.decrypt(token)
+            except InvalidToken:
+                pass  # e.g. v1 data written under a key later re-numbered
 
-        # Try each legacy key
-        for legacy_fernet in self._legacy_fernets:
+        for fernet in [self._fernet] + self._legacy_fernets:
+            if fernet is preferred:
+                continue
             try:
-                plaintext = legacy_fernet.decrypt(raw_token.encode('utf-8'))
-                return plaintext.decode('utf-8')
+                return fernet.decrypt(token)
             except InvalidToken:
                 continue
 
@@ -162,6 +273,63 @@ class FieldEncryptor:
             "Tried current key and %d legacy key(s)." % len(self._legacy_fernets)
         )
 
+    def encrypt_many(self, plaintexts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Encrypt a batch of values. None values pass through as None.
+
+        Args:
+            plaintexts: Values to encrypt
+
+        Returns:
+            Versioned ciphertexts, in input order
+        """
+        return [None if p is None else self.encrypt(p) for p in plaintexts]
+
+    def decrypt_many(self, ciphertexts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Decrypt a batch of values. None values pass through as None.
+
+        Each distinct ciphertext is decrypted once, with the key picked
+        from its version prefix, and the active plaintext_cache() is
+        used if there is one.
+
+        Args:
+            ciphertexts: Values from encrypt()/encrypt_many()
+
+        Returns:
+            Plaintext strings, in input order
+
+        Raises:
+            ValueError: If any value cannot be decrypted
+        """
+        seen: Dict[str, str] = {}
+        results = []
+        for ciphertext in ciphertexts:
+            if ciphertext is None:
+                results.append(None)
+                continue
+            plaintext = seen.get(ciphertext)
+            if plaintext is None:
+                plaintext = self.decrypt(ciphertext)
+                seen[ciphertext] = plaintext
+            results.append(plaintext)
+        return results
+
+    def key_version_of(self, ciphertext: str) -> int:
+        """
+        Return the version prefix of a ciphertext (0 if unversioned).
+
+        Does not decrypt; used to skip values that are already under the
+        current key.
+        """
+        match = _VERSION_PREFIX.match(ciphertext or '')
+        return int(match.group(1)) if match else 0
+
+    @property
+    def key_version(self) -> int:
+        """Generation number written as the ciphertext prefix."""
+        return self._key_version
+
     def encrypt_or_none(self, plaintext: Optional[str]) -> Optional[str]:
         """
         Encrypt a value, returning None if input is None.
@@ -220,9 +388,10 @@ class FieldEncryptor:
         """
         if not value or len(value) < 50:
             return False
-        # Versioned format: v1:gAAAAA...
-        if value.startswith('v1:'):
-            return value[3:].startswith('gAAAAA')
+        # Versioned format: v<N>:gAAAAA...
+        match = _VERSION_PREFIX.match(value)
+        if match:
+            return value[match.end():].startswith('gAAAAA')
         # Legacy unversioned format: gAAAAA...
         return value.startswith('gAAAAA')
 
@@ -278,4 +447,4 @@ if __name__ == "__main__":
     print(f"  Encrypted: {encrypted[:40]}...")
     print(f"  Decrypted: {decrypted}")
     print(f"  Match: {'YES' if decrypted == test_value else 'NO'}")
-    print(f"  Format:  versioned ({CIPHERTEXT_VERSION}: prefix)")
+    print(f"  Format:  versioned (v{enc.key_version}: prefix)")
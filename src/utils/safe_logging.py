@@ -6,12 +6,28 @@ CRITICAL: This module ensures NO personally identifiable information (PII)
 or sensitive financial data is exposed in logs or CLI output.
 
 All logging goes through this module to sanitize sensitive data.
+
+Performance:
+- sanitize_message() makes one pass over the message with a combined
+  regex built from only the patterns whose trigger character ('$', '@',
+  digits, key prefix) appears in it; lines with none skip the regex.
+- Sensitive-key lookups in mask_dict() are memoized.
+- SafeLogger sanitizes lazily: the record carries the raw message and
+  it is only masked when a handler actually emits it, so filtered-out
+  levels cost no regex work.
+- enable_async_logging() (or SAFE_LOGGING_ASYNC=true) moves handler
+  I/O and sanitization onto a background QueueListener thread.
 """
 
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import re
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -41,6 +57,18 @@ class PIIProtector:
     
     # Patterns for API keys (common formats)
     API_KEY_PATTERN = re.compile(r'(sk_|pk_|api_)[a-zA-Z0-9]{20,}')
+
+    # (group, replacement) in the order the patterns take precedence
+    _SANITIZE_RULES = (
+        ('dollar', DOLLAR_PATTERN, "$***"),
+        ('email', EMAIL_PATTERN, "***@***.com"),
+        ('phone', PHONE_PATTERN, "***-***-****"),
+        ('apikey', re.compile(r'(?:sk_|pk_|api_)[a-zA-Z0-9]{20,}'), "***_KEY"),
+    )
+    _REPLACEMENTS = {group: replacement for group, _, replacement in _SANITIZE_RULES}
+    _PHONE_TRIGGER = re.compile(r'\d{3}')
+    _API_KEY_TRIGGER = re.compile(r'(?:sk|pk|api)_')
+    _combined_patterns: Dict[Tuple[bool, ...], Optional[re.Pattern]] = {}
     
     @staticmethod
     def mask_string(value: str, visible_chars: int = 4) -> str:
@@ -139,11 +167,7 @@ class PIIProtector:
         masked = {}
         for key, value in data.items():
             key_lower = key.lower()
-            
-            # Check if this key contains sensitive data
-            is_sensitive = any(field in key_lower for field in PIIProtector.SENSITIVE_FIELDS)
-            
-            if is_sensitive:
+            if PIIProtector.is_sensitive_key(key_lower):
                 # Mask the value based on type
                 if isinstance(value, (int, float)):
                     masked[key] = "***"
@@ -163,30 +187,104 @@ class PIIProtector:
         
         return masked
     
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def is_sensitive_key(key_lower: str) -> bool:
+        """
+        Check whether a (lower-cased) key contains a sensitive field name
+
+        Memoized: payload keys repeat on every call, so each distinct key
+        is only scanned against SENSITIVE_FIELDS once.
+        """
+        return any(field in key_lower for field in PIIProtector.SENSITIVE_FIELDS)
+
+    @staticmethod
+    def _combined_pattern(key: Tuple[bool, ...]) -> Optional[re.Pattern]:
+        """Alternation of the rules enabled in key, compiled once per key."""
+        try:
+            return PIIProtector._combined_patterns[key]
+        except KeyError:
+            pass
+        branches = [
+            f'(?P<{group}>{pattern.pattern})'
+            for (group, pattern, _), enabled in zip(PIIProtector._SANITIZE_RULES, key)
+            if enabled
+        ]
+        combined = re.compile('|'.join(branches)) if branches else None
+        PIIProtector._combined_patterns[key] = combined
+        return combined
+
+    @staticmethod
+    def _replace_match(match: re.Match) -> str:
+        return PIIProtector._REPLACEMENTS[match.lastgroup]
+
     @staticmethod
     def sanitize_message(message: str) -> str:
         """
         Remove PII from a log message
         
+        Masks dollar amounts, emails, phone numbers and API keys in a
+        single pass (two when the line holds both '$' and '@').  Only
+        patterns that can match (their trigger character is present) are
+        included in the alternation, so a plain status line is returned
+        without running a regex.  Output is identical to applying the
+        four patterns one after another.
+        
         Args:
             message: Message to sanitize
             
         Returns:
             Sanitized message with PII removed/masked
         """
-        # Mask dollar amounts
-        message = PIIProtector.DOLLAR_PATTERN.sub("$***", message)
-        
-        # Mask emails
-        message = PIIProtector.EMAIL_PATTERN.sub("***@***.com", message)
-        
-        # Mask phone numbers
-        message = PIIProtector.PHONE_PATTERN.sub("***-***-****", message)
-        
-        # Mask API keys
-        message = PIIProtector.API_KEY_PATTERN.sub("***_KEY", message)
-        
-        return message
+        has_dollar = '$' in message
+        has_email = '@' in message
+        if has_dollar and has_email:
+            # Masking "$12" creates a word boundary the email pattern
+            # relies on ("$12ab@x.com" -> "$***ab@x.com"), so dollar
+            # amounts go first in lines that can contain both
+            message = PIIProtector.DOLLAR_PATTERN.sub("$***", message)
+            has_dollar = False
+        key = (
+            has_dollar,
+            has_email,
+            PIIProtector._PHONE_TRIGGER.search(message) is not None,
+            '_' in message and PIIProtector._API_KEY_TRIGGER.search(message) is not None,
+        )
+        pattern = PIIProtector._combined_pattern(key)
+        if pattern is None:
+            return message
+        return pattern.sub(PIIProtector._replace_match, message)
+
+
+def _format_safe(message: str, kwargs: Dict[str, Any]) -> str:
+    """Sanitize a message and append its masked kwargs as ' | k=v' pairs."""
+    safe_message = PIIProtector.sanitize_message(message)
+    if kwargs:
+        safe_kwargs = PIIProtector.mask_dict(kwargs)
+        kwargs_str = " | ".join(f"{k}={v}" for k, v in safe_kwargs.items())
+        return f"{safe_message} | {kwargs_str}"
+    return safe_message
+
+
+class _SafeMessage:
+    """
+    Log record message that is sanitized on first str()
+
+    logging only calls str(record.msg) when a handler formats the
+    record, so a message no handler accepts is never sanitized.
+    """
+
+    __slots__ = ('message', 'kwargs', '_text')
+
+    def __init__(self, message: str, kwargs: Dict[str, Any]):
+        self.message = message
+        self.kwargs = kwargs
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = _format_safe(self.message, self.kwargs)
+        return self._text
 
 
 class SafeLogger:
@@ -198,6 +296,9 @@ class SafeLogger:
         logger.info("Processing transaction", amount=5000.00, investor="John Doe")
         # Output: "Processing transaction | amount=$*** | investor=Investor ***"
     """
+
+    # Names of loggers configured by SafeLogger (for enable_async_logging)
+    _names = set()
     
     def __init__(self, name: str, log_file: Optional[str] = None):
         """
@@ -229,44 +330,171 @@ class SafeLogger:
             )
             file_handler.setFormatter(file_formatter)
             self.logger.addHandler(file_handler)
+
+        SafeLogger._names.add(name)
+        if _async_pipeline is None and os.getenv('SAFE_LOGGING_ASYNC', '').lower() in ('1', 'true', 'yes'):
+            enable_async_logging()
+        elif _async_pipeline is not None:
+            _async_pipeline.attach(self.logger)
     
     def _format_safe_message(self, message: str, **kwargs) -> str:
         """Format message with sanitized kwargs"""
-        # Sanitize the main message
-        safe_message = PIIProtector.sanitize_message(message)
-        
-        # Add sanitized kwargs
-        if kwargs:
-            safe_kwargs = PIIProtector.mask_dict(kwargs)
-            kwargs_str = " | ".join(f"{k}={v}" for k, v in safe_kwargs.items())
-            return f"{safe_message} | {kwargs_str}"
-        
-        return safe_message
+        return _format_safe(message, kwargs)
+
+    def _log(self, level: int, message: str, kwargs: Dict[str, Any]):
+        """Emit a lazily-sanitized record if the level is enabled"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, _SafeMessage(message, kwargs))
     
     def debug(self, message: str, **kwargs):
         """Log debug message with PII protection"""
-        safe_message = self._format_safe_message(message, **kwargs)
-        self.logger.debug(safe_message)
+        self._log(logging.DEBUG, message, kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message with PII protection"""
-        safe_message = self._format_safe_message(message, **kwargs)
-        self.logger.info(safe_message)
+        self._log(logging.INFO, message, kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message with PII protection"""
-        safe_message = self._format_safe_message(message, **kwargs)
-        self.logger.warning(safe_message)
+        self._log(logging.WARNING, message, kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message with PII protection"""
-        safe_message = self._format_safe_message(message, **kwargs)
-        self.logger.error(safe_message)
+        self._log(logging.ERROR, message, kwargs)
     
     def critical(self, message: str, **kwargs):
         """Log critical message with PII protection"""
-        safe_message = self._format_safe_message(message, **kwargs)
-        self.logger.critical(safe_message)
+        self._log(logging.CRITICAL, message, kwargs)
+
+
+class _SafeQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for the async pipeline without formatting them
+
+    The record keeps its lazy _SafeMessage and is tagged with the
+    logger's real handlers, so sanitization and I/O both happen on the
+    listener thread.
+    """
+
+    def __init__(self, pipeline: 'AsyncLogPipeline', handlers: List[logging.Handler]):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.target_handlers = handlers
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.safe_handlers = self.target_handlers
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline._count_drop()
+
+
+class _SafeQueueListener(logging.handlers.QueueListener):
+    """Dispatches each record to the handlers of the logger that queued it"""
+
+    def handle(self, record: logging.LogRecord):
+        for handler in getattr(record, 'safe_handlers', ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class AsyncLogPipeline:
+    """
+    Background logging for SafeLogger loggers
+
+    Each attached logger's handlers are replaced by one QueueHandler;
+    a single QueueListener thread formats (sanitizes) and writes the
+    records.  The queue is bounded: when full, records are dropped and
+    counted rather than blocking the caller.
+    """
+
+    def __init__(self, max_queue: int = 10_000):
+        self.max_queue = max_queue
+        self.queue: 'queue.Queue' = queue.Queue(maxsize=max_queue)
+        self.listener = _SafeQueueListener(self.queue)
+        self._attached: Dict[str, _SafeQueueHandler] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def start(self):
+        self.listener.start()
+
+    def attach(self, logger: logging.Logger):
+        """Route logger's handlers through the queue"""
+        with self._lock:
+            queue_handler = self._attached.get(logger.name)
+            if queue_handler is None:
+                queue_handler = _SafeQueueHandler(self, [])
+                self._attached[logger.name] = queue_handler
+            for handler in list(logger.handlers):
+                if handler is not queue_handler:
+                    logger.removeHandler(handler)
+                    queue_handler.target_handlers.append(handler)
+            if queue_handler not in logger.handlers:
+                logger.addHandler(queue_handler)
+
+    def stop(self):
+        """Drain the queue and give every logger its handlers back"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        with self._lock:
+            for name, queue_handler in self._attached.items():
+                logger = logging.getLogger(name)
+                logger.removeHandler(queue_handler)
+                for handler in queue_handler.target_handlers:
+                    logger.addHandler(handler)
+            self._attached.clear()
+
+    def _count_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue': self.max_queue,
+            'dropped': self.dropped,
+            'loggers': len(self._attached),
+            'running': self.listener._thread is not None,
+        }
+
+
+_async_pipeline: Optional[AsyncLogPipeline] = None
+_async_lock = threading.Lock()
+
+
+def enable_async_logging(max_queue: int = 10_000) -> AsyncLogPipeline:
+    """
+    Move SafeLogger handler work onto a background thread
+
+    Attaches every SafeLogger created so far and every one created
+    afterwards.  The pipeline is drained at interpreter exit.
+
+    Returns:
+        The running AsyncLogPipeline (the existing one if already enabled)
+    """
+    global _async_pipeline
+    with _async_lock:
+        if _async_pipeline is None:
+            pipeline = AsyncLogPipeline(max_queue)
+            pipeline.start()
+            for name in SafeLogger._names:
+                pipeline.attach(logging.getLogger(name))
+            _async_pipeline = pipeline
+            atexit.register(disable_async_logging)
+        return _async_pipeline
+
+
+def disable_async_logging():
+    """Flush the async pipeline and restore synchronous handlers"""
+    global _async_pipeline
+    with _async_lock:
+        pipeline, _async_pipeline = _async_pipeline, None
+    if pipeline is not None:
+        pipeline.stop()
 
 
 # Global logger factory
@@ -19,6 +19,17 @@ import shutil
 # Test database path
 TEST_DB_PATH = "data/test_tovito.db"
 
+
+@pytest.fixture(autouse=True)
+def _tracing_disabled():
+    """Keep spans out of the real trace_spans table; tests that check
+    tracing configure their own tracer."""
+    from src.monitoring import tracing
+    previous = tracing.get_tracer()
+    tracing.configure_tracing(enabled=False)
+    yield
+    tracing._tracer = previous
+
 # ============================================================
 # DATABASE FIXTURES
 # ============================================================
@@ -193,28 +204,10 @@ def _create_test_schema(conn):
         )
     """)
 
-    # Position snapshots table (individual positions per snapshot)
-    conn.execute("""
-        CREATE TABLE position_snapshots (
-            position_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            snapshot_id INTEGER NOT NULL,
-            symbol TEXT NOT NULL,
-            underlying_symbol TEXT,
-            quantity REAL NOT NULL,
-            instrument_type TEXT,
-            average_open_price REAL,
-            close_price REAL,
-            market_value REAL,
-            cost_basis REAL,
-            unrealized_pl REAL,
-            option_type TEXT,
-            strike REAL,
-            expiration_date TEXT,
-            multiplier INTEGER,
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY (snapshot_id) REFERENCES holdings_snapshots(snapshot_id)
-        )
-    """)
+    # Compact position storage + position_snapshots view (individual
+    # positions per snapshot)
+    from src.database.holdings_store import ensure_holdings_schema
+    ensure_holdings_schema(conn)
 
     # Email logs table
     conn.execute("""
@@ -395,16 +395,11 @@ class TestSyncPayloadAssembly:
         """)
 
         # Holdings snapshot
-        cursor.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-03-01', 'tastytrade', '2026-03-01T16:05:00', 1)
-        """)
-        snapshot_id = cursor.lastrowid
-        cursor.execute("""
-            INSERT INTO position_snapshots (snapshot_id, symbol, quantity, instrument_type,
-                                            market_value, cost_basis, unrealized_pl)
-            VALUES (?, 'SGOV', 100.0, 'Equity', 10050.0, 10000.0, 50.0)
-        """, (snapshot_id,))
+        from src.database.holdings_store import write_holdings_snapshots
+        write_holdings_snapshots(conn, '2026-03-01', {'tastytrade': [{
+            'symbol': 'SGOV', 'quantity': 100.0, 'instrument_type': 'Equity',
+            'market_value': 10050.0, 'cost_basis': 10000.0, 'unrealized_pl': 50.0,
+        }]}, snapshot_time='2026-03-01T16:05:00')
 
         # Trade
         cursor.execute("""
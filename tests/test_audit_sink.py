@@ -0,0 +1,190 @@
+"""
+Tests for the buffered PII audit log writer (services/audit_sink.py).
+
+Covers:
+- Events are batch-inserted on the size threshold
+- Events are committed within max_delay when the batch never fills
+- stop() drains everything queued; flush() waits for a commit
+- Full queue drops events and counts them
+- One invalid row does not lose the rest of its batch
+- log_pii_access() uses the sink when running, writes directly otherwise
+"""
+
+import sys
+import time
+import sqlite3
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.investor_portal.api.services.audit_sink import AuditSink
+
+
+def _row(i, access_type="read"):
+    return ("2026-03-01 12:00:00", f"20260101-{i:02d}A", "ssn_encrypted",
+            access_type, "api", "127.0.0.1", "profile_view")
+
+
+@pytest.fixture
+def audit_db(tmp_path):
+    db_path = tmp_path / "audit.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE pii_access_log (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            investor_id TEXT NOT NULL,
+            field_name TEXT NOT NULL,
+            access_type TEXT NOT NULL CHECK (access_type IN ('read', 'write')),
+            performed_by TEXT NOT NULL DEFAULT 'system',
+            ip_address TEXT,
+            context TEXT
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _count(db_path):
+    conn = sqlite3.connect(db_path)
+    n = conn.execute("SELECT COUNT(*) FROM pii_access_log").fetchone()[0]
+    conn.close()
+    return n
+
+
+class _CountingConnect:
+    """connect() that records how many connections (batches) were opened."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return sqlite3.connect(self.db_path)
+
+
+class TestBatching:
+
+    def test_size_threshold_batches_inserts(self, audit_db):
+        connect = _CountingConnect(audit_db)
+        sink = AuditSink(connect=connect, batch_size=50, max_delay_seconds=10)
+        sink.start()
+        for i in range(200):
+            assert sink.submit(_row(i)) is True
+        assert sink.flush() is True
+        sink.stop()
+
+        assert _count(audit_db) == 200
+        assert connect.calls <= 5  # 4 full batches (+ possibly an empty flush)
+        stats = sink.stats()
+        assert stats["written"] == 200
+        assert stats["avg_batch_size"] >= 40
+
+    def test_max_delay_commits_partial_batch(self, audit_db):
+        sink = AuditSink(connect=_CountingConnect(audit_db), batch_size=1000,
+                         max_delay_seconds=0.05)
+        sink.start()
+        sink.submit(_row(1))
+
+        deadline = time.monotonic() + 2
+        while _count(audit_db) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sink.stop()
+
+        assert _count(audit_db) == 1
+        assert sink.stats()["max_lag_ms"] < 1000
+
+    def test_stop_drains_queue(self, audit_db):
+        sink = AuditSink(connect=_CountingConnect(audit_db), batch_size=1000,
+                         max_delay_seconds=60)
+        sink.start()
+        for i in range(30):
+            sink.submit(_row(i))
+        sink.stop()
+
+        assert _count(audit_db) == 30
+        assert sink.running is False
+
+    def test_invalid_row_does_not_lose_batch(self, audit_db):
+        sink = AuditSink(connect=_CountingConnect(audit_db), batch_size=10)
+        sink.start()
+        sink.submit(_row(1))
+        sink.submit(_row(2, access_type="delete"))  # Violates CHECK
+        sink.submit(_row(3))
+        sink.stop()
+
+        assert _count(audit_db) == 2
+        assert sink.stats()["failed"] == 1
+
+
+class TestBackpressure:
+
+    def test_full_queue_drops_and_counts(self, audit_db):
+        release = threading.Event()
+
+        def slow_connect():
+            release.wait(5)
+            return sqlite3.connect(audit_db)
+
+        sink = AuditSink(connect=slow_connect, max_queue=5, batch_size=1)
+        sink.start()
+        for i in range(20):
+            sink.submit(_row(i))
+        stats = sink.stats()
+        release.set()
+        sink.stop()
+
+        assert stats["dropped"] > 0
+        assert stats["queue_depth"] <= 5
+        assert sink.stats()["written"] + stats["dropped"] == 20
+
+    def test_not_running_rejects(self, audit_db):
+        sink = AuditSink(connect=_CountingConnect(audit_db))
+        assert sink.submit(_row(1)) is False
+        assert sink.flush() is True
+
+
+class TestLogPiiAccess:
+
+    def test_routes_through_running_sink(self, audit_db):
+        from apps.investor_portal.api.models import database
+
+        sink = AuditSink(connect=lambda: sqlite3.connect(audit_db), max_delay_seconds=60)
+        sink.start()
+        with patch("apps.investor_portal.api.services.audit_sink.pii_audit_sink", sink), \
+                patch.object(database, "get_connection",
+                             side_effect=AssertionError("synchronous write")):
+            for field in ("ssn_encrypted", "bank_account_encrypted", "date_of_birth"):
+                database.log_pii_access("20260101-01A", field, "read", performed_by="api")
+        sink.stop()
+
+        conn = sqlite3.connect(audit_db)
+        rows = conn.execute("SELECT field_name, timestamp FROM pii_access_log").fetchall()
+        conn.close()
+        assert {r[0] for r in rows} == {"ssn_encrypted", "bank_account_encrypted", "date_of_birth"}
+        assert all(len(r[1]) == 19 for r in rows)  # YYYY-MM-DD HH:MM:SS
+
+    def test_writes_directly_when_sink_stopped(self, audit_db):
+        from apps.investor_portal.api.models import database
+
+        sink = AuditSink(connect=lambda: sqlite3.connect(audit_db))
+        with patch("apps.investor_portal.api.services.audit_sink.pii_audit_sink", sink), \
+                patch.object(database, "get_connection",
+                             side_effect=lambda: sqlite3.connect(audit_db)):
+            database.log_pii_access("20260101-01A", "ssn_encrypted", "write")
+
+        assert _count(audit_db) == 1
+
+    def test_admin_stats_endpoint(self):
+        from apps.investor_portal.api.routes.admin import pii_audit_stats
+
+        stats = asyncio.run(pii_audit_stats(_admin=True))
+        for key in ("queue_depth", "dropped", "written", "max_delay_ms", "running"):
+            assert key in stats
@@ -28,6 +28,8 @@ from apps.investor_portal.api.services.auth_service import (
     hash_password,
     verify_password,
     generate_token,
+    get_hash_rounds,
+    needs_rehash,
     initiate_verification,
     complete_verification,
     authenticate_user,
@@ -463,6 +465,62 @@ class TestAuthentication:
         assert row[0] == 0
 
 
+class TestRehashOnLogin:
+    """Test transparent bcrypt cost upgrade on successful login."""
+
+    def _stored_hash(self, auth_db):
+        conn = sqlite3.connect(str(auth_db))
+        row = conn.execute(
+            "SELECT password_hash FROM investor_auth WHERE investor_id = '20260101-01A'"
+        ).fetchone()
+        conn.close()
+        return row[0]
+
+    def _setup_with_rounds(self, auth_db, rounds):
+        conn = sqlite3.connect(str(auth_db))
+        conn.execute("""
+            INSERT INTO investor_auth (investor_id, password_hash, email_verified)
+            VALUES ('20260101-01A', ?, 1)
+        """, (hash_password("SecurePass1!", rounds=rounds),))
+        conn.commit()
+        conn.close()
+
+    def test_hash_rounds_parsed(self):
+        assert get_hash_rounds(hash_password("SecurePass1!", rounds=4)) == 4
+        assert get_hash_rounds("not-a-hash") is None
+
+    def test_needs_rehash(self):
+        hashed = hash_password("SecurePass1!", rounds=4)
+        assert needs_rehash(hashed, rounds=5) is True
+        assert needs_rehash(hashed, rounds=4) is False
+
+    def test_rehash_upgrades_cost(self, auth_db):
+        self._setup_with_rounds(auth_db, 4)
+        with patch("apps.investor_portal.api.services.auth_service.REHASH_ON_LOGIN", True), \
+             patch("apps.investor_portal.api.services.auth_service.BCRYPT_ROUNDS", 5):
+            success, _, _ = authenticate_user("active@test.com", "SecurePass1!")
+
+        assert success is True
+        new_hash = self._stored_hash(auth_db)
+        assert get_hash_rounds(new_hash) == 5
+        assert verify_password("SecurePass1!", new_hash)
+
+    def test_rehash_disabled_keeps_hash(self, auth_db):
+        self._setup_with_rounds(auth_db, 4)
+        before = self._stored_hash(auth_db)
+        with patch("apps.investor_portal.api.services.auth_service.REHASH_ON_LOGIN", False):
+            authenticate_user("active@test.com", "SecurePass1!")
+        assert self._stored_hash(auth_db) == before
+
+    def test_failed_login_never_rehashes(self, auth_db):
+        self._setup_with_rounds(auth_db, 4)
+        before = self._stored_hash(auth_db)
+        with patch("apps.investor_portal.api.services.auth_service.REHASH_ON_LOGIN", True), \
+             patch("apps.investor_portal.api.services.auth_service.BCRYPT_ROUNDS", 5):
+            authenticate_user("active@test.com", "WrongPass1!")
+        assert self._stored_hash(auth_db) == before
+
+
 # ============================================================
 # Password Reset Flow Tests
 # ============================================================
@@ -21,6 +21,10 @@ from src.market_data.benchmarks import (
     BENCHMARK_TICKERS,
     _ensure_table,
     _get_latest_cached_date,
+    CsvPriceProvider,
+    YFinanceProvider,
+    get_benchmark_frame,
+    get_price_provider,
 )
 
 
@@ -315,3 +319,155 @@ class TestRefreshBenchmarkCache:
         # Count should not have increased
         after_data = get_benchmark_data(populated_db, tickers=['SPY'], days=365)
         assert len(after_data['SPY']) == initial_count
+
+
+class FakeProvider:
+    """Records fetch_closes() calls and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def fetch_closes(self, tickers, start, end):
+        self.calls.append((list(tickers), start, end))
+        return [row for row in self.rows if row[1] in tickers and start <= row[0] < end]
+
+
+def _days_ago(n):
+    return (datetime.now() - timedelta(days=n)).strftime('%Y-%m-%d')
+
+
+class TestBatchedRefresh:
+    """One provider call and one write for all stale tickers."""
+
+    def test_single_fetch_for_all_tickers(self, benchmark_db):
+        rows = [(_days_ago(n), t, 100.0 + n) for n in range(1, 6) for t in BENCHMARK_TICKERS]
+        provider = FakeProvider(rows)
+
+        stats = refresh_benchmark_cache(benchmark_db, lookback_days=10, provider=provider)
+
+        assert len(provider.calls) == 1
+        assert sorted(provider.calls[0][0]) == sorted(BENCHMARK_TICKERS)
+        assert stats == {t: 5 for t in BENCHMARK_TICKERS}
+
+    def test_up_to_date_ticker_not_fetched(self, benchmark_db):
+        conn = sqlite3.connect(str(benchmark_db))
+        conn.execute("INSERT INTO benchmark_prices (date, ticker, close_price) VALUES (?, 'SPY', 500)",
+                     (datetime.now().strftime('%Y-%m-%d'),))
+        conn.commit()
+        conn.close()
+        provider = FakeProvider([])
+
+        refresh_benchmark_cache(benchmark_db, lookback_days=10, provider=provider)
+
+        assert 'SPY' not in provider.calls[0][0]
+
+    def test_all_up_to_date_skips_fetch(self, benchmark_db):
+        conn = sqlite3.connect(str(benchmark_db))
+        conn.execute("INSERT INTO benchmark_prices (date, ticker, close_price) VALUES (?, 'SPY', 500)",
+                     (datetime.now().strftime('%Y-%m-%d'),))
+        conn.commit()
+        conn.close()
+        provider = FakeProvider([])
+
+        stats = refresh_benchmark_cache(benchmark_db, tickers=['SPY'], provider=provider)
+
+        assert provider.calls == []
+        assert stats == {'SPY': 0}
+
+    def test_last_cached_close_replaced(self, benchmark_db):
+        """The last cached day is refetched so an intraday close is corrected."""
+        conn = sqlite3.connect(str(benchmark_db))
+        conn.executemany("INSERT INTO benchmark_prices (date, ticker, close_price) VALUES (?, 'SPY', ?)",
+                         [(_days_ago(3), 400.0), (_days_ago(2), 401.0)])
+        conn.commit()
+        conn.close()
+        provider = FakeProvider([
+            (_days_ago(3), 'SPY', 999.0),   # Older history is left alone
+            (_days_ago(2), 'SPY', 402.5),
+            (_days_ago(1), 'SPY', 403.0),
+        ])
+
+        stats = refresh_benchmark_cache(benchmark_db, tickers=['SPY'], provider=provider)
+
+        assert provider.calls[0][1] == _days_ago(2)
+        assert stats == {'SPY': 1}
+        closes = [p['close_price'] for p in get_benchmark_data(benchmark_db, ['SPY'], days=10)['SPY']]
+        assert closes == [400.0, 402.5, 403.0]
+
+    def test_provider_failure_returns_zeros(self, benchmark_db):
+        provider = MagicMock()
+        provider.fetch_closes.side_effect = RuntimeError("rate limited")
+
+        stats = refresh_benchmark_cache(benchmark_db, tickers=['SPY', 'QQQ'], provider=provider)
+
+        assert stats == {'SPY': 0, 'QQQ': 0}
+
+
+class TestPriceProviders:
+
+    def test_yfinance_multi_ticker_download(self):
+        dates = pd.date_range('2026-03-06', periods=3, freq='D')   # Fri, Sat, Sun
+        columns = pd.MultiIndex.from_product([['Close', 'Open'], ['BTC-USD', 'SPY']])
+        df = pd.DataFrame([[90000.0, 500.0, 1, 1],
+                           [91000.0, float('nan'), 1, 1],
+                           [92000.0, float('nan'), 1, 1]], index=dates, columns=columns)
+
+        with patch('yfinance.download', return_value=df) as mock_download:
+            rows = YFinanceProvider().fetch_closes(['SPY', 'BTC-USD'], '2026-03-06', '2026-03-09')
+
+        assert mock_download.call_count == 1
+        assert sorted(rows) == [
+            ('2026-03-06', 'BTC-USD', 90000.0),
+            ('2026-03-06', 'SPY', 500.0),
+            ('2026-03-07', 'BTC-USD', 91000.0),
+            ('2026-03-08', 'BTC-USD', 92000.0),
+        ]
+
+    def test_csv_provider_filters(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        path.write_text("date,ticker,close\n"
+                        "2026-03-05,SPY,499\n"
+                        "2026-03-06,SPY,500\n"
+                        "2026-03-06,QQQ,450\n"
+                        "2026-03-09,SPY,501\n")
+
+        rows = CsvPriceProvider(path).fetch_closes(['SPY'], '2026-03-06', '2026-03-09')
+
+        assert rows == [('2026-03-06', 'SPY', 500.0)]
+
+    def test_get_price_provider_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv('BENCHMARK_PROVIDER', raising=False)
+        assert isinstance(get_price_provider(), YFinanceProvider)
+
+        monkeypatch.setenv('BENCHMARK_PROVIDER', 'csv')
+        monkeypatch.setenv('BENCHMARK_CSV_PATH', str(tmp_path / "prices.csv"))
+        assert isinstance(get_price_provider(), CsvPriceProvider)
+
+    def test_unknown_provider(self):
+        with pytest.raises(ValueError, match="Unknown benchmark provider"):
+            get_price_provider('bloomberg')
+
+
+class TestGetBenchmarkFrame:
+
+    def test_pivots_by_date(self, populated_db):
+        conn = sqlite3.connect(str(populated_db))
+        conn.execute("DELETE FROM benchmark_prices WHERE ticker = 'SPY' AND date = '2026-01-03'")
+        conn.commit()
+        conn.close()
+
+        frame = get_benchmark_frame(populated_db, start_date='2026-01-02', end_date='2026-01-04')
+
+        assert list(frame.columns) == BENCHMARK_TICKERS
+        assert list(frame.index) == ['2026-01-02', '2026-01-03', '2026-01-04']
+        assert frame.loc['2026-01-02', 'SPY'] == 500.0
+        assert pd.isna(frame.loc['2026-01-03', 'SPY'])
+        assert frame.loc['2026-01-03', 'QQQ'] == 450.4
+
+    def test_matches_dict_reader(self, populated_db):
+        frame = get_benchmark_frame(populated_db, start_date='2026-01-01')
+        data = get_benchmark_data(populated_db, start_date='2026-01-01')
+
+        for ticker in BENCHMARK_TICKERS:
+            assert list(frame[ticker]) == [p['close_price'] for p in data[ticker]]
@@ -0,0 +1,320 @@
+"""
+Tests for bulk email delivery (BulkMailer + EmailService connection reuse).
+
+Covers:
+- SMTP connection reused across messages inside smtp_session()
+- Attachment encoding cached per file version; display filenames
+- Retry with backoff only when the message was not accepted; 5xx,
+  mid-send disconnects and unknown errors are not retried
+- Resend batch endpoint used for attachment-free emails
+- email_logs written once per run
+- Rate limiter spacing
+"""
+
+import smtplib
+import pytest
+from unittest.mock import patch, MagicMock
+
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from src.automation import email_service as email_module
+from src.automation.email_service import (
+    EmailService,
+    ResendAPIError,
+    SMTPNotSentError,
+    load_attachment,
+)
+from src.automation.bulk_mailer import (
+    BulkMailer,
+    OutgoingEmail,
+    RateLimiter,
+    is_retryable,
+)
+
+
+@pytest.fixture
+def smtp_env(monkeypatch):
+    monkeypatch.setenv('EMAIL_PROVIDER', 'smtp')
+    monkeypatch.setenv('SMTP_SERVER', 'localhost')
+    monkeypatch.setenv('SMTP_PORT', '587')
+    monkeypatch.setenv('SMTP_USERNAME', 'fund@example.com')
+    monkeypatch.setenv('SMTP_PASSWORD', 'secret')
+    monkeypatch.delenv('EMAIL_RATE_LIMIT', raising=False)
+
+
+@pytest.fixture
+def resend_env(monkeypatch):
+    monkeypatch.setenv('EMAIL_PROVIDER', 'resend')
+    monkeypatch.setenv('RESEND_API_KEY', 're_test')
+    monkeypatch.setenv('SMTP_FROM_EMAIL', 'fund@example.com')
+    monkeypatch.delenv('EMAIL_RATE_LIMIT', raising=False)
+
+
+def make_emails(n, attachments=None):
+    return [
+        OutgoingEmail(f'investor{i}@example.com', 'Statement', 'Body',
+                      attachments=attachments, email_type='MonthlyReport')
+        for i in range(n)
+    ]
+
+
+class FakeService:
+    """Stand-in EmailService recording deliveries."""
+
+    def __init__(self, provider='smtp', failures=None):
+        self.provider = provider
+        self.failures = list(failures or [])
+        self.delivered = []
+        self.sessions = 0
+
+    def smtp_session(self):
+        service = self
+
+        class _Session:
+            def __enter__(self):
+                service.sessions += 1
+                return service
+
+            def __exit__(self, *exc):
+                return False
+        return _Session()
+
+    def deliver(self, to_email, subject, message, html=False, attachments=None):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.delivered.append(to_email)
+        return True
+
+
+# ============================================================
+# EmailService connection reuse
+# ============================================================
+
+class TestSmtpSession:
+
+    def test_one_connection_for_many_messages(self, smtp_env):
+        with patch.object(smtplib, 'SMTP') as mock_smtp, \
+             patch.object(email_module, 'write_email_logs'):
+            service = EmailService()
+            with service.smtp_session():
+                for i in range(5):
+                    assert service.send_email(f'a{i}@example.com', 'S', 'B')
+
+        assert mock_smtp.call_count == 1
+        server = mock_smtp.return_value
+        assert server.login.call_count == 1
+        assert server.send_message.call_count == 5
+        server.quit.assert_called_once()
+
+    def test_without_session_connects_per_message(self, smtp_env):
+        with patch.object(smtplib, 'SMTP') as mock_smtp, \
+             patch.object(email_module, 'write_email_logs'):
+            service = EmailService()
+            service.send_email('a@example.com', 'S', 'B')
+            service.send_email('b@example.com', 'S', 'B')
+
+        assert mock_smtp.call_count == 2
+
+    def test_reconnects_when_idle_connection_dropped(self, smtp_env):
+        first, second = MagicMock(), MagicMock()
+        first.noop.side_effect = smtplib.SMTPServerDisconnected()
+        with patch.object(smtplib, 'SMTP', side_effect=[first, second]), \
+             patch.object(email_module, 'write_email_logs'):
+            service = EmailService()
+            with service.smtp_session():
+                assert service.send_email('a@example.com', 'S', 'B')
+                assert service.send_email('b@example.com', 'S', 'B')
+
+        first.send_message.assert_called_once()
+        second.send_message.assert_called_once()
+
+    def test_no_resend_after_mid_send_disconnect(self, smtp_env):
+        server = MagicMock()
+        server.send_message.side_effect = smtplib.SMTPServerDisconnected()
+        with patch.object(smtplib, 'SMTP', return_value=server) as mock_smtp, \
+             patch.object(email_module, 'write_email_logs'):
+            service = EmailService()
+            with service.smtp_session():
+                with pytest.raises(smtplib.SMTPServerDisconnected):
+                    service.deliver('a@example.com', 'S', 'B')
+
+        assert mock_smtp.call_count == 1
+        server.send_message.assert_called_once()
+
+    def test_connection_failure_is_not_sent(self, smtp_env):
+        with patch.object(smtplib, 'SMTP', side_effect=ConnectionRefusedError()), \
+             patch.object(email_module, 'write_email_logs'):
+            service = EmailService()
+            with pytest.raises(SMTPNotSentError):
+                service.deliver('a@example.com', 'S', 'B')
+
+    def test_starttls_can_be_disabled(self, smtp_env, monkeypatch):
+        monkeypatch.setenv('SMTP_STARTTLS', 'false')
+        with patch.object(smtplib, 'SMTP') as mock_smtp, \
+             patch.object(email_module, 'write_email_logs'):
+            EmailService().send_email('a@example.com', 'S', 'B')
+
+        mock_smtp.return_value.starttls.assert_not_called()
+
+    def test_buffer_logs_writes_once(self, smtp_env):
+        with patch.object(smtplib, 'SMTP'), \
+             patch.object(email_module, 'write_email_logs') as mock_write:
+            service = EmailService()
+            with service.buffer_logs():
+                service.send_email('a@example.com', 'S', 'B')
+                service.send_email('b@example.com', 'S', 'B')
+
+        mock_write.assert_called_once()
+        assert len(mock_write.call_args[0][0]) == 2
+
+
+class TestAttachmentCache:
+
+    def test_reads_file_once(self, tmp_path):
+        report = tmp_path / 'statement.pdf'
+        report.write_bytes(b'%PDF-1.4 test')
+        email_module._read_attachment.cache_clear()
+
+        first = load_attachment(str(report))
+        second = load_attachment(str(report))
+
+        assert first is second
+        assert first[0] == 'statement.pdf'
+        assert email_module._read_attachment.cache_info().hits == 1
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert load_attachment(str(tmp_path / 'missing.pdf')) is None
+
+    def test_display_name(self, tmp_path):
+        report = tmp_path / 'monthly_statement_20260101-01A_202601.pdf'
+        report.write_bytes(b'%PDF-1.4 test')
+
+        loaded = load_attachment((str(report), 'Monthly_Statement_January_2026.pdf'))
+
+        assert loaded[0] == 'Monthly_Statement_January_2026.pdf'
+        assert loaded[1] == b'%PDF-1.4 test'
+        assert load_attachment(str(report))[0] == report.name
+
+    def test_smtp_uses_display_name(self, smtp_env, tmp_path):
+        report = tmp_path / 'monthly_statement_20260101-01A_202601.pdf'
+        report.write_bytes(b'%PDF-1.4 test')
+        with patch.object(smtplib, 'SMTP') as mock_smtp, \
+             patch.object(email_module, 'write_email_logs'):
+            EmailService().send_email('a@example.com', 'S', 'B', attachments=[
+                (str(report), 'Monthly_Statement_January_2026.pdf')])
+
+        msg = mock_smtp.return_value.send_message.call_args[0][0]
+        filenames = [part.get_filename() for part in msg.walk() if part.get_filename()]
+        assert filenames == ['Monthly_Statement_January_2026.pdf']
+
+
+# ============================================================
+# BulkMailer
+# ============================================================
+
+class TestBulkMailer:
+
+    def test_sends_all_and_logs_once(self, smtp_env):
+        services = []
+
+        def factory():
+            services.append(FakeService())
+            return services[-1]
+
+        with patch('src.automation.bulk_mailer.write_email_logs') as mock_write:
+            report = BulkMailer(max_workers=3, service_factory=factory).send_all(make_emails(10))
+
+        assert report.sent == 10
+        assert report.failed == 0
+        assert sum(len(s.delivered) for s in services) == 10
+        mock_write.assert_called_once()
+        assert len(mock_write.call_args[0][0]) == 10
+
+    def test_retries_transient_errors_with_backoff(self, smtp_env):
+        service = FakeService(failures=[SMTPNotSentError('refused'),
+                                        smtplib.SMTPDataError(451, b'try later')])
+        sleeps = []
+
+        with patch('src.automation.bulk_mailer.write_email_logs'):
+            mailer = BulkMailer(max_workers=1, backoff_base=0.5,
+                                service_factory=lambda: service, sleep=sleeps.append)
+            report = mailer.send_all(make_emails(1))
+
+        assert report.sent == 1
+        assert report.results[0].attempts == 3
+        assert sleeps == [0.5, 1.0]
+
+    def test_permanent_error_not_retried(self, smtp_env):
+        error = smtplib.SMTPRecipientsRefused({'x@example.com': (550, b'no')})
+        service = FakeService(failures=[error])
+
+        with patch('src.automation.bulk_mailer.write_email_logs') as mock_write:
+            mailer = BulkMailer(max_workers=1, service_factory=lambda: service,
+                                sleep=lambda s: None)
+            report = mailer.send_all(make_emails(1))
+
+        assert report.failed == 1
+        assert report.results[0].attempts == 1
+        assert mock_write.call_args[0][0][0]['status'] == 'Failed'
+
+    def test_resend_batches_attachment_free_emails(self, resend_env):
+        service = MagicMock(spec=EmailService)
+        service.provider = 'resend'
+        service._build_resend_payload.side_effect = lambda to, *a, **k: {'to': [to]}
+        service.send_batch_via_resend.side_effect = lambda payloads: ['id'] * len(payloads)
+
+        with patch('src.automation.bulk_mailer.write_email_logs'):
+            mailer = BulkMailer(service_factory=lambda: service, rate_limit=0)
+            report = mailer.send_all(make_emails(150))
+
+        assert report.sent == 150
+        assert service.send_batch_via_resend.call_count == 2
+        assert report.requests_made == 2
+        service.deliver.assert_not_called()
+
+
+class TestRetryPolicy:
+
+    @pytest.mark.parametrize("error,expected", [
+        (SMTPNotSentError('refused'), True),
+        (smtplib.SMTPDataError(451, b'try later'), True),
+        (smtplib.SMTPRecipientsRefused({'x@example.com': (450, b'busy')}), True),
+        (ResendAPIError(429, 'slow down'), True),
+        (ResendAPIError(503, 'unavailable'), True),
+        (smtplib.SMTPDataError(554, b'rejected'), False),
+        (smtplib.SMTPRecipientsRefused({'x@example.com': (550, b'no')}), False),
+        (smtplib.SMTPServerDisconnected(), False),
+        (TimeoutError('timed out'), False),
+        (ConnectionError('reset'), False),
+        (RuntimeError('unexpected'), False),
+        (ResendAPIError(422, 'invalid'), False),
+        (ValueError('not configured'), False),
+        (smtplib.SMTPAuthenticationError(535, b'bad'), False),
+    ])
+    def test_is_retryable(self, error, expected):
+        assert is_retryable(error) is expected
+
+
+class TestRateLimiter:
+
+    def test_spaces_requests(self):
+        now = [0.0]
+        sleeps = []
+        limiter = RateLimiter(2.0, clock=lambda: now[0], sleep=sleeps.append)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        assert sleeps == [0.5, 1.0]
+
+    def test_unlimited_never_sleeps(self):
+        sleeps = []
+        limiter = RateLimiter(None, sleep=sleeps.append)
+        for _ in range(5):
+            limiter.acquire()
+        assert sleeps == []
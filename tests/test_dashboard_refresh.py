@@ -0,0 +1,193 @@
+"""
+Tests for the desktop dashboard refresh service
+(apps/fund_manager/data_refresh.py).
+
+Covers:
+- Read-only persistent connection sees new commits and rejects writes
+- Schema introspection cached until the schema changes
+- Fetches run on the worker thread, results applied by the poller
+- Waiting requests for the same tab are coalesced
+- Per-tab query/draw timings reported
+- ChangeTracker only reports changed values
+"""
+
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.fund_manager.data_refresh import (
+    ChangeTracker,
+    DataRefreshService,
+    SchemaCache,
+    open_read_connection,
+)
+
+
+@pytest.fixture
+def dashboard_db(tmp_path):
+    db_path = tmp_path / "tovito.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE investors (investor_id TEXT, name TEXT, current_shares REAL)")
+    conn.execute("CREATE TABLE daily_nav (date TEXT, nav_per_share REAL)")
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+class _Scheduler:
+    """Stands in for widget.after(): records callbacks instead of running them."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ms, fn):
+        self.calls.append((ms, fn))
+
+
+def _drain(service, name, timeout=5):
+    deadline = time.monotonic() + timeout
+    while name not in service.timings and time.monotonic() < deadline:
+        service.process_results()
+        time.sleep(0.005)
+
+
+class TestReadConnection:
+
+    def test_sees_later_commits(self, dashboard_db):
+        reader = open_read_connection(dashboard_db)
+        assert reader.execute("SELECT COUNT(*) FROM daily_nav").fetchone()[0] == 0
+
+        writer = sqlite3.connect(dashboard_db)
+        writer.execute("INSERT INTO daily_nav VALUES ('2026-03-02', 1.05)")
+        writer.commit()
+        writer.close()
+
+        assert reader.execute("SELECT COUNT(*) FROM daily_nav").fetchone()[0] == 1
+        reader.close()
+
+    def test_rejects_writes(self, dashboard_db):
+        reader = open_read_connection(dashboard_db)
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM daily_nav")
+        reader.close()
+
+
+class TestSchemaCache:
+
+    def test_table_info_read_once(self, dashboard_db):
+        conn = open_read_connection(dashboard_db)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        cache = SchemaCache()
+
+        for _ in range(5):
+            assert cache.columns(conn, dashboard_db, "investors") == [
+                "investor_id", "name", "current_shares"]
+            assert cache.tables(conn, dashboard_db) == ["daily_nav", "investors"]
+
+        assert sum("table_info" in s for s in statements) == 1
+        assert sum("sqlite_master" in s for s in statements) == 1
+        conn.close()
+
+    def test_schema_change_invalidates(self, dashboard_db):
+        conn = open_read_connection(dashboard_db)
+        cache = SchemaCache()
+        assert "status" not in cache.columns(conn, dashboard_db, "investors")
+
+        writer = sqlite3.connect(dashboard_db)
+        writer.execute("ALTER TABLE investors ADD COLUMN status TEXT")
+        writer.execute("CREATE TABLE trades (id INTEGER)")
+        writer.commit()
+        writer.close()
+
+        assert "status" in cache.columns(conn, dashboard_db, "investors")
+        assert "trades" in cache.tables(conn, dashboard_db)
+        conn.close()
+
+
+class TestDataRefreshService:
+
+    def test_fetch_on_worker_apply_on_caller(self):
+        scheduler = _Scheduler()
+        timings = []
+        service = DataRefreshService(scheduler, on_timing=lambda *t: timings.append(t))
+        service.start()
+        threads = {}
+
+        def fetch():
+            threads["fetch"] = threading.current_thread()
+            return {"nav": 1.05}
+
+        def apply(data):
+            threads["apply"] = threading.current_thread()
+            threads["data"] = data
+
+        service.submit("Dashboard", fetch, apply)
+        _drain(service, "Dashboard")
+        service.stop()
+
+        assert threads["fetch"] is not threading.main_thread()
+        assert threads["apply"] is threading.main_thread()
+        assert threads["data"] == {"nav": 1.05}
+        assert timings[0][0] == "Dashboard"
+        assert set(service.timings["Dashboard"]) == {"query_ms", "draw_ms"}
+        assert scheduler.calls[0][1] == service._poll
+
+    def test_poll_reschedules_while_running(self):
+        scheduler = _Scheduler()
+        service = DataRefreshService(scheduler, poll_ms=25)
+        service.start()
+        service._poll()
+        service.stop()
+        service._poll()
+        assert [ms for ms, _ in scheduler.calls] == [25, 25]
+
+    def test_waiting_requests_coalesced(self):
+        service = DataRefreshService(_Scheduler())
+        release = threading.Event()
+        applied = []
+
+        service.submit("Blocker", lambda: release.wait(5), lambda data: None)
+        service.start()
+        for i in range(5):
+            service.submit("Trading Journal", lambda i=i: i, applied.append)
+        release.set()
+        _drain(service, "Trading Journal")
+        service.stop()
+
+        assert applied == [4]
+
+    def test_fetch_error_skips_apply(self):
+        service = DataRefreshService(_Scheduler())
+        service.start()
+        applied = []
+
+        def broken():
+            raise sqlite3.OperationalError("no such table: trades")
+
+        service.submit("Tax Management", broken, applied.append)
+        service.submit("Dashboard", lambda: 1, applied.append)
+        _drain(service, "Dashboard")
+        service.stop()
+
+        assert applied == [1]
+        assert "Tax Management" not in service.timings
+
+
+class TestChangeTracker:
+
+    def test_only_changes_reported(self):
+        tracker = ChangeTracker()
+        assert tracker.changed("positions", [["A", "1.00"]]) is True
+        assert tracker.changed("positions", [["A", "1.00"]]) is False
+        assert tracker.changed("positions", [["A", "2.00"]]) is True
+        assert tracker.changed("transactions", None) is True
+        tracker.reset()
+        assert tracker.changed("positions", [["A", "2.00"]]) is True
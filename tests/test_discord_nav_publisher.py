@@ -0,0 +1,210 @@
+"""
+Tests for the persistent Discord NAV publisher (scripts/discord/nav_publisher.py).
+
+Covers:
+- First publish posts and pins; identical data pushes nothing
+- NAV-only changes edit the embed without re-rendering the chart
+- New chart inputs re-render and replace the chart
+- Restarted service edits the existing pinned message
+- A deleted pinned message is replaced by a new post
+- Local event server: one gateway connection across many events
+- notify_nav_written() when no service is running
+"""
+
+import asyncio
+import socket
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from scripts.discord import update_nav_message as nav_message
+from scripts.discord.nav_publisher import (
+    DiscordGateway,
+    FakeGateway,
+    NavPublisher,
+    notify_nav_written,
+)
+
+
+@pytest.fixture
+def nav_db(tmp_path):
+    db_path = tmp_path / "tovito.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE daily_nav (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL UNIQUE,
+            total_portfolio_value REAL NOT NULL,
+            total_shares REAL NOT NULL,
+            nav_per_share REAL NOT NULL,
+            daily_change_value REAL,
+            daily_change_percent REAL
+        );
+        CREATE TABLE investors (investor_id TEXT PRIMARY KEY, status TEXT DEFAULT 'Active');
+        CREATE TABLE trades (trade_id INTEGER PRIMARY KEY AUTOINCREMENT, date DATE,
+                             category TEXT);
+        INSERT INTO daily_nav (date, total_portfolio_value, total_shares, nav_per_share,
+                               daily_change_value, daily_change_percent)
+        VALUES ('2026-02-20', 22000, 2000, 11.00, 0.05, 0.46),
+               ('2026-02-21', 22100, 2000, 11.05, 0.05, 0.45);
+        INSERT INTO investors VALUES ('20260101-01A', 'Active');
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def renders(nav_db, tmp_path):
+    """Point the NAV queries at nav_db and count chart renders."""
+    rendered = []
+
+    def render(inputs):
+        path = tmp_path / f"chart_{len(rendered)}.png"
+        path.write_bytes(b"png")
+        rendered.append(inputs)
+        return path
+
+    with patch.object(nav_message, "DB_PATH", nav_db), \
+            patch.object(nav_message, "render_chart", side_effect=render):
+        yield rendered
+
+
+def _execute(db_path, sql):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+class TestPublish:
+
+    def test_post_then_unchanged(self, renders, tmp_path):
+        gateway = FakeGateway()
+        publisher = NavPublisher(gateway)
+        assert asyncio.run(publisher.publish()) == "posted"
+        assert asyncio.run(publisher.publish()) == "unchanged"
+
+        assert [(action, chart) for action, _, _, chart in gateway.calls] == [("post", True)]
+        assert len(renders) == 1
+        embed = gateway.calls[0][2]
+        assert embed.image.url == "attachment://nav_chart.png"
+        assert list(tmp_path.glob("chart_*.png")) == []     # Rendered chart cleaned up
+
+    def test_nav_only_change_keeps_chart(self, renders, nav_db):
+        gateway = FakeGateway()
+        publisher = NavPublisher(gateway)
+        asyncio.run(publisher.publish())
+        _execute(nav_db, "INSERT INTO investors VALUES ('20260101-02A', 'Active')")
+
+        assert asyncio.run(publisher.publish()) == "edited"
+        assert gateway.calls[-1][0] == "edit" and gateway.calls[-1][3] is False
+        assert len(renders) == 1
+        fields = {f.name: f.value for f in gateway.calls[-1][2].fields}
+        assert fields["Active Investors"] == "2"
+        assert gateway.calls[-1][2].image.url == "attachment://nav_chart.png"
+
+    def test_new_nav_rerenders_chart(self, renders, nav_db):
+        gateway = FakeGateway()
+        publisher = NavPublisher(gateway)
+        asyncio.run(publisher.publish())
+        _execute(nav_db, "INSERT INTO daily_nav (date, total_portfolio_value, total_shares, "
+                         "nav_per_share) VALUES ('2026-02-24', 22300, 2000, 11.15)")
+
+        assert asyncio.run(publisher.publish()) == "edited"
+        assert gateway.calls[-1][3] is True
+        assert len(renders) == 2
+        assert renders[-1]["nav_history"][-1]["date"] == "2026-02-24"
+
+    def test_restart_edits_existing_pin(self, renders):
+        gateway = FakeGateway()
+        asyncio.run(NavPublisher(gateway).publish())
+
+        restarted = NavPublisher(gateway)
+        assert asyncio.run(restarted.publish()) == "edited"
+        assert [c[0] for c in gateway.calls] == ["post", "edit"]
+        assert gateway.calls[-1][3] is True    # Chart re-rendered once after restart
+
+    def test_deleted_pin_reposted(self, renders, nav_db):
+        gateway = FakeGateway()
+        publisher = NavPublisher(gateway)
+        asyncio.run(publisher.publish())
+        gateway.deleted.add(publisher.message["id"])
+        _execute(nav_db, "INSERT INTO investors VALUES ('20260101-02A', 'Active')")
+
+        assert asyncio.run(publisher.publish()) == "posted"
+        assert [action for action, *_ in gateway.calls] == ["post", "edit_missing", "post"]
+        assert gateway.calls[-1][3] is True       # New message gets the chart again
+        assert publisher.message["id"] == 2
+
+        _execute(nav_db, "INSERT INTO investors VALUES ('20260101-03A', 'Active')")
+        assert asyncio.run(publisher.publish()) == "edited"
+        assert gateway.calls[-1][1] == 2
+
+    def test_gateway_edit_of_deleted_message(self):
+        message = MagicMock()
+        message.edit = AsyncMock(side_effect=discord.NotFound(MagicMock(status=404),
+                                                              "Unknown Message"))
+        gateway = DiscordGateway.__new__(DiscordGateway)
+
+        assert asyncio.run(gateway.edit(message, embed=None)) is None
+
+    def test_no_nav_data(self, renders, nav_db):
+        _execute(nav_db, "DELETE FROM daily_nav")
+        gateway = FakeGateway()
+        assert asyncio.run(NavPublisher(gateway).publish()) == "no_data"
+        assert gateway.calls == []
+
+
+class TestEventService:
+
+    def test_events_share_one_connection(self, renders, nav_db):
+        gateway = FakeGateway()
+        publisher = NavPublisher(gateway)
+
+        async def scenario():
+            started = asyncio.Event()
+            service = asyncio.create_task(publisher.serve(port=0, started=started))
+            await asyncio.wait_for(started.wait(), 5)
+            first = await asyncio.to_thread(notify_nav_written, "2026-02-21", 11.05,
+                                            port=publisher.port, timeout=5)
+            _execute(nav_db, "INSERT INTO daily_nav (date, total_portfolio_value, "
+                             "total_shares, nav_per_share) "
+                             "VALUES ('2026-02-24', 22300, 2000, 11.15)")
+            second = await asyncio.to_thread(notify_nav_written, "2026-02-24", 11.15,
+                                             port=publisher.port, timeout=5)
+            service.cancel()
+            await asyncio.gather(service, return_exceptions=True)
+            return first, second
+
+        assert asyncio.run(scenario()) == ("unchanged", "edited")
+        assert gateway.connects == 1
+        assert [c[0] for c in gateway.calls] == ["post", "edit"]
+
+    def test_unknown_event_rejected(self, renders):
+        publisher = NavPublisher(FakeGateway())
+
+        async def scenario():
+            server = await asyncio.start_server(publisher.handle_event, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"event": "other"}\n')
+            reply = await reader.readline()
+            writer.close()
+            server.close()
+            return reply
+
+        assert b"unknown event" in asyncio.run(scenario())
+
+    def test_notify_without_service(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        assert notify_nav_written("2026-02-21", 11.05, port=port, timeout=2) is None
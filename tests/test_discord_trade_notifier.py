@@ -7,11 +7,15 @@ Covers:
 - Warm-up behaviour (no posts on startup)
 - Embed formatting (correct colours, fields)
 - Market hours check logic
+- Durable cursors and seen trades (restarts, pruning)
+- Incremental, concurrent fetching and streamed Tradier fills
 """
 
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
-from datetime import datetime, time as dt_time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
 
 import sys
 from pathlib import Path
@@ -25,6 +29,12 @@ from scripts.trading.discord_trade_notifier import (
     format_embed,
     post_to_discord,
     TradeNotifier,
+    NotifierState,
+    BoundedSeenSet,
+    trade_key,
+    trade_keys,
+    fill_key,
+    order_to_trade,
     OPENING_TYPES,
     CLOSING_TYPES,
     TRADING_TYPES,
@@ -441,3 +451,322 @@ class TestErrorResilience:
         assert count == 0
         # Trade should still be in seen-set so we don't spam retries
         assert ("tastytrade", "txn-300") in notifier.seen
+
+
+# ============================================================
+# Durable state
+# ============================================================
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "notifier.db"
+
+
+def make_client(*responses):
+    client = MagicMock()
+    client.get_transactions.side_effect = list(responses)
+    return client
+
+
+class TestTradeKey:
+    """Test dedup keys."""
+
+    def test_brokerage_id_used(self):
+        assert trade_key(make_trade(brokerage_id="txn-1")) == "txn-1"
+
+    def test_generated_id_keyed_by_contents(self):
+        """Tradier's positional GENERATED_ IDs shift as events arrive."""
+        first = make_trade(brokerage_id="GENERATED_2026-02-21_0_buy")
+        shifted = make_trade(brokerage_id="GENERATED_2026-02-21_1_buy")
+        other = make_trade(brokerage_id="GENERATED_2026-02-21_1_buy", quantity=5)
+
+        assert trade_key(first) == trade_key(shifted)
+        assert trade_key(first) != trade_key(other)
+
+    def test_identical_generated_fills_numbered(self):
+        fill = make_trade(brokerage_id="GENERATED_2026-02-21_0_buy")
+        twin = make_trade(brokerage_id="GENERATED_2026-02-21_1_buy")
+
+        first, second = trade_keys([fill, twin])
+        assert first == trade_key(fill)
+        assert second == f"{trade_key(fill)}#1"
+        assert trade_keys([fill, make_trade(brokerage_id="txn-1")])[1] == "txn-1"
+
+
+class TestBoundedSeenSet:
+    """Test the in-memory cache stays bounded."""
+
+    def test_oldest_dropped(self):
+        seen = BoundedSeenSet(maxlen=3)
+        for i in range(5):
+            seen.add(("tastytrade", f"txn-{i}"))
+
+        assert len(seen) == 3
+        assert ("tastytrade", "txn-0") not in seen
+        assert ("tastytrade", "txn-4") in seen
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_evicted_keys_still_deduplicated(self, mock_post):
+        trades = [{**make_trade(brokerage_id=f"txn-{i}"), "date": str(date.today())}
+                  for i in range(5)]
+        notifier = TradeNotifier()
+        notifier.seen = BoundedSeenSet(maxlen=2)
+        notifier._clients = {"tastytrade": make_client(trades, trades)}
+
+        assert notifier.poll_cycle() == 5
+        assert notifier.poll_cycle() == 0
+        assert len(notifier.seen) == 2
+
+
+class TestDurableState:
+    """Test that cursors and seen trades survive a restart."""
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    @patch("scripts.trading.discord_trade_notifier.log_to_db")
+    def test_restart_does_not_repost(self, mock_log_db, mock_post, state_path):
+        today = str(date.today())
+        trade1 = {**make_trade(brokerage_id="txn-1"), "date": today}
+        trade2 = {**make_trade(brokerage_id="txn-2"), "date": today}
+        trade3 = {**make_trade(brokerage_id="txn-3"), "date": today}
+
+        first = TradeNotifier(state=NotifierState(state_path))
+        first._clients = {"tastytrade": make_client([trade1], [trade1, trade2])}
+        first.warm_up()
+        assert first.poll_cycle() == 1  # txn-2
+        first.state.close()
+
+        # Restart: no warm-up fetch, and txn-3 (made while down) is posted
+        client = make_client([trade1, trade2, trade3])
+        second = TradeNotifier(state=NotifierState(state_path))
+        second._clients = {"tastytrade": client}
+        second.warm_up()
+        assert client.get_transactions.call_count == 0
+
+        assert second.poll_cycle() == 1
+        assert [c.args[0]["title"] for c in mock_post.call_args_list] == [
+            format_embed(trade2, "tastytrade")["title"],
+            format_embed(trade3, "tastytrade")["title"],
+        ]
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_fetch_starts_at_cursor(self, mock_post, state_path):
+        state = NotifierState(state_path)
+        cursor_date = date.today() - timedelta(days=2)
+        state.advance("tastytrade", cursor_date)
+
+        client = make_client([])
+        notifier = TradeNotifier(state=state)
+        notifier._clients = {"tastytrade": client}
+        notifier.poll_cycle()
+
+        start = client.get_transactions.call_args.kwargs["start_date"]
+        assert start == datetime.combine(cursor_date, dt_time.min)
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_cursor_advance_prunes_seen(self, mock_post, state_path):
+        today = date.today()
+        old = {**make_trade(brokerage_id="txn-old"), "date": str(today - timedelta(days=1))}
+        new = {**make_trade(brokerage_id="txn-new"), "date": str(today)}
+
+        state = NotifierState(state_path)
+        notifier = TradeNotifier(state=state)
+        notifier._clients = {"tastytrade": make_client([old], [old, new])}
+        notifier.poll_cycle()
+        assert state.is_seen("tastytrade", "txn-old")
+
+        notifier.poll_cycle()
+        assert state.get_cursor("tastytrade") == (today, None)
+        assert not state.is_seen("tastytrade", "txn-old")
+        assert state.is_seen("tastytrade", "txn-new")
+
+    def test_cursor_never_trails_far_behind(self, state_path):
+        state = NotifierState(state_path)
+        notifier = TradeNotifier(state=state)
+        notifier._advance("tastytrade", [])
+
+        cursor_date, _ = state.get_cursor("tastytrade")
+        assert cursor_date == date.today() - timedelta(days=5)
+
+
+class TestIncrementalFetch:
+    """Test timestamp cursors and concurrent fetching."""
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_timestamp_cursor_uses_transactions_since(self, mock_post):
+        executed = datetime.now(timezone.utc).replace(microsecond=0)
+        trade = {**make_trade(brokerage_id="txn-1"), "date": str(date.today()),
+                 "executed_at": executed.isoformat()}
+        later = {**make_trade(brokerage_id="txn-2"), "date": str(date.today()),
+                 "executed_at": (executed + timedelta(minutes=3)).isoformat()}
+
+        client = make_client([trade])
+        client.get_transactions_since.return_value = [trade, later]
+        notifier = TradeNotifier()
+        notifier._clients = {"tastytrade": client}
+
+        assert notifier.poll_cycle() == 1
+        assert notifier.poll_cycle() == 1
+        client.get_transactions_since.assert_called_once_with(executed)
+        assert notifier.state.get_cursor("tastytrade")[1] == executed + timedelta(minutes=3)
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_brokerages_fetched_concurrently(self, mock_post):
+        # Each fetch waits for the other: only passes if both run at once
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(start_date=None, end_date=None):
+            barrier.wait()
+            return []
+
+        tastytrade, tradier = MagicMock(), MagicMock()
+        tastytrade.get_transactions.side_effect = fetch
+        tradier.get_transactions.side_effect = fetch
+
+        notifier = TradeNotifier()
+        notifier._clients = {"tastytrade": tastytrade, "tradier": tradier}
+        notifier.poll_cycle()
+
+        assert notifier.state.get_cursor("tastytrade") is not None
+        assert notifier.state.get_cursor("tradier") is not None
+
+
+class TestStreaming:
+    """Test Tradier fills pushed from the account stream."""
+
+    ORDER = {
+        "id": 228749, "side": "buy_to_open", "symbol": "SPY",
+        "option_symbol": "SPY260320C00600000", "exec_quantity": "2",
+        "avg_fill_price": "3.15", "transaction_date": "2026-03-02T15:00:25.584Z",
+    }
+
+    def todays_order(self):
+        # Seen trades dated before the cursor are pruned, so fills that
+        # must be matched later are dated today
+        return dict(self.ORDER, transaction_date=f"{date.today()}T15:00:25.584Z")
+
+    def test_order_to_trade(self):
+        txn = order_to_trade(self.ORDER)
+
+        assert txn["transaction_type"] == "buy_to_open"
+        assert txn["date"] == "2026-03-02"
+        assert txn["option_type"] == "call"
+        assert txn["strike"] == 600.0
+        assert txn["expiration_date"] == "2026-03-20"
+        assert txn["amount"] == -630.0
+        assert txn["brokerage_transaction_id"] == "order-228749"
+        assert "600C" in format_embed(txn, "tradier")["title"]
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_filled_orders_posted_once(self, mock_post):
+        tradier = MagicMock()
+        tradier.get_order.return_value = self.ORDER
+        notifier = TradeNotifier(streaming=True)
+        notifier._clients = {"tradier": tradier}
+
+        for status in ("open", "filled", "filled"):
+            notifier._on_order(MagicMock(order_id="228749", status=status))
+
+        assert notifier.handle_streamed() == 1
+        assert tradier.get_order.call_count == 2
+        assert mock_post.call_count == 1
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_streamed_source_not_polled_while_connected(self, mock_post):
+        tastytrade, tradier = make_client([]), make_client([])
+        notifier = TradeNotifier(streaming=True)
+        notifier._clients = {"tastytrade": tastytrade, "tradier": tradier}
+
+        notifier._stream_connected.set()
+        notifier.poll_cycle()
+        assert tradier.get_transactions.call_count == 0
+        assert tastytrade.get_transactions.call_count == 1
+
+        # Stream dropped: Tradier is polled again
+        notifier._stream_connected.clear()
+        tastytrade.get_transactions.side_effect = [[]]
+        notifier.poll_cycle()
+        assert tradier.get_transactions.call_count == 1
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_fill_not_reposted_when_polled_after_disconnect(self, mock_post):
+        # The same fill as Tradier's history reports it
+        history_fill = make_trade(
+            symbol="SPY260320C00600000", quantity=2, price=3.15, amount=-631.0,
+            option_type="call", strike=600.0, expiration_date="2026-03-20",
+            brokerage_id="GENERATED_2026-03-02_0_buy_to_open",
+        )
+        history_fill["date"] = date.today().isoformat()
+        tradier = make_client([history_fill])
+        tradier.get_order.return_value = self.todays_order()
+        notifier = TradeNotifier(streaming=True)
+        notifier._clients = {"tradier": tradier}
+
+        notifier._stream_connected.set()
+        notifier._on_order(MagicMock(order_id="228749", status="filled"))
+        assert notifier.handle_streamed() == 1
+
+        notifier._stream_connected.clear()
+        notifier.poll_cycle()
+
+        assert tradier.get_transactions.call_count == 1
+        assert mock_post.call_count == 1
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_identical_fills_each_posted(self, mock_post):
+        """Two real 2-lot fills at the same price are two posts, however they arrive."""
+        order = self.todays_order()
+        twin = dict(order, id=228750)
+        history = [make_trade(symbol="SPY260320C00600000", quantity=2, price=3.15,
+                              brokerage_id=f"hist-{n}") for n in (1, 2)]
+        for row in history:
+            row["date"] = date.today().isoformat()
+        tradier = make_client(history)
+        tradier.get_order.side_effect = lambda order_id: {
+            "228749": order, "228750": twin}[order_id]
+        notifier = TradeNotifier(streaming=True)
+        notifier._clients = {"tradier": tradier}
+
+        notifier._stream_connected.set()
+        notifier._on_order(MagicMock(order_id="228749", status="filled"))
+        notifier._on_order(MagicMock(order_id="228750", status="filled"))
+        assert notifier.handle_streamed() == 2
+
+        # Both history rows are matched to a streamed fill, once each
+        notifier._stream_connected.clear()
+        assert notifier.poll_cycle() == 0
+        assert mock_post.call_count == 2
+
+    @patch("scripts.trading.discord_trade_notifier.post_to_discord", return_value=True)
+    def test_streamed_fill_matches_one_history_row(self, mock_post):
+        history = [make_trade(symbol="SPY260320C00600000", quantity=2, price=3.15,
+                              brokerage_id=f"hist-{n}") for n in (1, 2)]
+        for row in history:
+            row["date"] = date.today().isoformat()
+        tradier = make_client(history)
+        tradier.get_order.return_value = self.todays_order()
+        notifier = TradeNotifier(streaming=True)
+        notifier._clients = {"tradier": tradier}
+
+        # Only the first fill was streamed before the disconnect
+        notifier._stream_connected.set()
+        notifier._on_order(MagicMock(order_id="228749", status="filled"))
+        assert notifier.handle_streamed() == 1
+
+        notifier._stream_connected.clear()
+        assert notifier.poll_cycle() == 1
+        assert mock_post.call_count == 2
+
+    def test_fill_key_ignores_ids_and_type(self):
+        streamed = order_to_trade(self.ORDER)
+        polled = make_trade(txn_type="trade", symbol="SPY260320C00600000",
+                            quantity=-2, price=3.15, brokerage_id="hist-9")
+        polled["date"] = "2026-03-02"
+
+        assert fill_key(streamed) == fill_key(polled)
+        assert fill_key(streamed) != fill_key(dict(polled, price=3.2))
+        assert trade_key(streamed) != trade_key(polled)
+
+    def test_stop_wakes_wait(self):
+        notifier = TradeNotifier()
+        notifier.stop()
+        assert notifier.handle_streamed(timeout=30) == 0
@@ -7,12 +7,16 @@ Covers:
 - Invalid key raises error
 - None handling
 - Encrypted value detection heuristic
+- Key selection from the version prefix
+- Batch encrypt_many / decrypt_many
+- Request-scoped plaintext cache
 """
 
 import pytest
+from unittest.mock import patch
 from cryptography.fernet import Fernet
 
-from src.utils.encryption import FieldEncryptor
+from src.utils.encryption import FieldEncryptor, PlaintextCache, plaintext_cache
 
 
 @pytest.fixture
@@ -153,3 +157,109 @@ class TestEdgeCases:
         assert FieldEncryptor.is_encrypted("plain text") is False
         assert FieldEncryptor.is_encrypted("") is False
         assert FieldEncryptor.is_encrypted("short") is False
+
+
+class TestKeyVersions:
+    """Tests for picking the key from the v<N>: prefix."""
+
+    def test_prefix_uses_key_version(self, test_key):
+        enc = FieldEncryptor(key=test_key, key_version=3)
+        assert enc.encrypt("x").startswith("v3:")
+        assert enc.key_version_of(enc.encrypt("x")) == 3
+        assert enc.key_version_of("gAAAAAunversioned") == 0
+
+    def test_legacy_key_chosen_without_trying_current(self):
+        old_key, new_key = FieldEncryptor.generate_key(), FieldEncryptor.generate_key()
+        old_ct = FieldEncryptor(key=old_key, key_version=1).encrypt("123-45-6789")
+        enc = FieldEncryptor(key=new_key, legacy_keys=[old_key], key_version=2)
+
+        with patch.object(enc._fernet, "decrypt", side_effect=AssertionError("tried current")):
+            assert enc.decrypt(old_ct) == "123-45-6789"
+
+    def test_mismatched_prefix_falls_back(self):
+        old_key, new_key = FieldEncryptor.generate_key(), FieldEncryptor.generate_key()
+        # Written as v1 before versioning, but under what is now the current key
+        ct = FieldEncryptor(key=new_key, key_version=1).encrypt("secret")
+        enc = FieldEncryptor(key=new_key, legacy_keys=[old_key], key_version=2)
+        assert enc.decrypt(ct) == "secret"
+
+    def test_is_encrypted_any_version(self, test_key):
+        enc = FieldEncryptor(key=test_key, key_version=12)
+        assert FieldEncryptor.is_encrypted(enc.encrypt("value")) is True
+
+    def test_invalid_version_rejected(self, test_key):
+        with pytest.raises(ValueError):
+            FieldEncryptor(key=test_key, key_version=0)
+
+
+class TestBatchApi:
+    """Tests for encrypt_many / decrypt_many."""
+
+    def test_round_trip_with_none(self, encryptor):
+        values = ["123-45-6789", None, "021000021", ""]
+        encrypted = encryptor.encrypt_many(values)
+        assert encrypted[1] is None
+        assert encryptor.decrypt_many(encrypted) == values
+
+    def test_duplicates_decrypted_once(self, encryptor):
+        ct = encryptor.encrypt("same")
+        with patch.object(encryptor, "_decrypt_bytes", wraps=encryptor._decrypt_bytes) as spy:
+            assert encryptor.decrypt_many([ct, ct, ct]) == ["same"] * 3
+        assert spy.call_count == 1
+
+    def test_bad_value_raises(self, encryptor):
+        with pytest.raises(ValueError):
+            encryptor.decrypt_many([encryptor.encrypt("ok"), "garbage"])
+
+
+class TestPlaintextCache:
+    """Tests for the request-scoped plaintext cache."""
+
+    def test_repeat_decrypts_hit_cache(self, encryptor):
+        ct = encryptor.encrypt("123-45-6789")
+        with plaintext_cache() as cache:
+            with patch.object(encryptor, "_decrypt_bytes", wraps=encryptor._decrypt_bytes) as spy:
+                for _ in range(3):
+                    assert encryptor.decrypt(ct) == "123-45-6789"
+            assert spy.call_count == 1
+            assert cache.hits == 2
+            assert len(cache) == 1
+
+    def test_cache_zeroed_on_exit(self, encryptor):
+        ct = encryptor.encrypt("123-45-6789")
+        with plaintext_cache() as cache:
+            encryptor.decrypt(ct)
+            buffers = list(cache._entries.values())
+        assert len(cache) == 0
+        assert all(not any(buf) for buf in buffers)
+
+    def test_cache_zeroed_on_error(self, encryptor):
+        with pytest.raises(RuntimeError):
+            with plaintext_cache() as cache:
+                encryptor.decrypt(encryptor.encrypt("x"))
+                raise RuntimeError()
+        assert len(cache) == 0
+
+    def test_no_cache_outside_block(self, encryptor):
+        ct = encryptor.encrypt("v")
+        with plaintext_cache():
+            pass
+        with patch.object(encryptor, "_decrypt_bytes", wraps=encryptor._decrypt_bytes) as spy:
+            encryptor.decrypt(ct)
+            encryptor.decrypt(ct)
+        assert spy.call_count == 2
+
+    def test_encryptor_without_key_not_served_from_cache(self, encryptor):
+        ct = encryptor.encrypt("secret")
+        other = FieldEncryptor(key=FieldEncryptor.generate_key())
+        with plaintext_cache():
+            encryptor.decrypt(ct)
+            with pytest.raises(ValueError):
+                other.decrypt(ct)
+
+    def test_clear_standalone(self):
+        cache = PlaintextCache()
+        cache.put((1, "ct"), b"plain")
+        assert cache.get((1, "ct")) == "plain"
+        cache.clear()
+        assert cache.get((1, "ct")) is None
@@ -0,0 +1,166 @@
+"""
+Tests for the password hash pool (bcrypt offload from the event loop).
+
+Covers:
+- Work runs on pool threads, not the event loop thread
+- The event loop stays responsive while hashing
+- Backpressure: jobs beyond max_pending are rejected
+- Jobs cancelled while queued release their slot
+- Queue-depth and timing metrics
+- Login route returns 503 when the pool is saturated
+"""
+
+import sys
+import time
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.investor_portal.api.services.hash_pool import HashPool, HashPoolBusy
+from apps.investor_portal.api.services.auth_service import hash_password, verify_password
+
+
+class TestHashPool:
+
+    def test_runs_off_event_loop_thread(self):
+        pool = HashPool(max_workers=2)
+
+        async def main():
+            loop_thread = threading.get_ident()
+            worker_thread = await pool.run(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(main())
+        pool.shutdown()
+        assert loop_thread != worker_thread
+
+    def test_event_loop_stays_responsive(self):
+        pool = HashPool(max_workers=1)
+        hashed = hash_password("SecurePass1!", rounds=10)
+        ticks = []
+
+        async def ticker(stop):
+            while not stop.is_set():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        async def main():
+            stop = asyncio.Event()
+            task = asyncio.create_task(ticker(stop))
+            results = await asyncio.gather(*(
+                pool.run(verify_password, "SecurePass1!", hashed) for _ in range(3)
+            ))
+            stop.set()
+            await task
+            return results
+
+        results = asyncio.run(main())
+        pool.shutdown()
+
+        assert all(results)
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        # Without offload the loop would freeze for the whole bcrypt run
+        assert len(ticks) > 5
+        assert max(gaps) < 0.5
+
+    def test_rejects_beyond_max_pending(self):
+        pool = HashPool(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.ensure_future(pool.run(release.wait))
+            second = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+            with pytest.raises(HashPoolBusy):
+                await pool.run(release.wait)
+            stats = pool.stats()
+            release.set()
+            await asyncio.gather(first, second)
+            return stats
+
+        stats = asyncio.run(main())
+        pool.shutdown()
+
+        assert stats["rejected"] == 1
+        assert stats["active"] == 1
+        assert stats["queue_depth"] == 1
+
+    def test_cancelled_queued_job_releases_slot(self):
+        pool = HashPool(max_workers=1, max_pending=2)
+        release = threading.Event()
+        calls = []
+
+        async def main():
+            running = asyncio.ensure_future(pool.run(release.wait))
+            queued = asyncio.ensure_future(pool.run(calls.append, "queued"))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            after_cancel = pool.stats()
+            release.set()
+            await running
+            # The freed slot accepts new work
+            await pool.run(calls.append, "next")
+            return after_cancel
+
+        after_cancel = asyncio.run(main())
+        stats = pool.stats()
+        pool.shutdown()
+
+        assert after_cancel["queue_depth"] == 0
+        assert after_cancel["active"] == 1
+        assert calls == ["next"]
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+
+    def test_stats_after_completion(self):
+        pool = HashPool(max_workers=2)
+
+        async def main():
+            await asyncio.gather(*(pool.run(time.sleep, 0.01) for _ in range(4)))
+
+        asyncio.run(main())
+        stats = pool.stats()
+        pool.shutdown()
+
+        assert stats["completed"] == 4
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+        assert stats["avg_run_ms"] >= 10
+        assert stats["peak_queue_depth"] >= 1
+
+    def test_restarts_after_shutdown(self):
+        pool = HashPool(max_workers=1)
+        pool.shutdown()
+
+        async def main():
+            return await pool.run(sum, [1, 2, 3])
+
+        assert asyncio.run(main()) == 6
+        pool.shutdown()
+
+
+class TestLoginRouteOffload:
+
+    def test_saturated_pool_returns_503(self):
+        from apps.investor_portal.api.routes import auth as auth_routes
+
+        async def busy(*args):
+            raise HashPoolBusy()
+
+        with patch.object(auth_routes.hash_pool, "run", busy):
+            with pytest.raises(HTTPException) as exc:
+                asyncio.run(auth_routes.login(
+                    auth_routes.LoginRequest(email="a@test.com", password="Pass1!")
+                ))
+
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "2"
@@ -2,13 +2,34 @@
 Tests for holdings snapshot functionality.
 
 Validates that daily position snapshots are correctly stored
-and retrieved, with proper deduplication on (date, source).
+and retrieved, with proper deduplication on (date, source), and that
+the compact storage only records positions that changed.
 """
 
 import pytest
 import sqlite3
 from datetime import datetime
 
+from src.database.holdings_store import (
+    LEGACY_TABLE,
+    ensure_holdings_schema,
+    get_holdings_as_of,
+    get_snapshot_positions,
+    storage_stats,
+    write_holdings_snapshots,
+)
+
+
+def _snapshot_id(conn, snapshot_date, source='tradier'):
+    return conn.execute(
+        "SELECT snapshot_id FROM holdings_snapshots WHERE date = ? AND source = ?",
+        (snapshot_date, source),
+    ).fetchone()[0]
+
+
+def _symbols(conn, snapshot_date, source='tradier'):
+    return sorted(p['symbol'] for p in get_snapshot_positions(conn, _snapshot_id(conn, snapshot_date, source)))
+
 
 class TestSnapshotCreation:
     """Test creating holdings snapshots."""
@@ -31,30 +52,20 @@ class TestSnapshotCreation:
 
     def test_insert_position_snapshots(self, test_db):
         """Test inserting position records linked to a snapshot."""
-        test_db.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-01-15', 'tradier', '2026-01-15T16:05:00', 2)
-        """)
-        snapshot_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-
         positions = [
-            (snapshot_id, 'AAPL', 'AAPL', 100, 'Equity', 150.0, 175.0, 17500.0, 15000.0, 2500.0),
-            (snapshot_id, 'SPY 250321C500', 'SPY', 5, 'Equity Option', 3.50, 5.20, 2600.0, 1750.0, 850.0),
+            {'symbol': 'AAPL', 'underlying_symbol': 'AAPL', 'quantity': 100, 'instrument_type': 'Equity',
+             'average_open_price': 150.0, 'close_price': 175.0, 'market_value': 17500.0,
+             'cost_basis': 15000.0, 'unrealized_pl': 2500.0},
+            {'symbol': 'SPY 250321C500', 'underlying_symbol': 'SPY', 'quantity': 5,
+             'instrument_type': 'Equity Option', 'average_open_price': 3.50, 'close_price': 5.20,
+             'market_value': 2600.0, 'cost_basis': 1750.0, 'unrealized_pl': 850.0},
         ]
-
-        for pos in positions:
-            test_db.execute("""
-                INSERT INTO position_snapshots (
-                    snapshot_id, symbol, underlying_symbol, quantity,
-                    instrument_type, average_open_price, close_price,
-                    market_value, cost_basis, unrealized_pl
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, pos)
-
-        test_db.commit()
+        ids = write_holdings_snapshots(test_db, '2026-01-15', {'tradier': positions},
+                                       snapshot_time='2026-01-15T16:05:00')
+        snapshot_id = ids['tradier']
 
         rows = test_db.execute(
-            "SELECT * FROM position_snapshots WHERE snapshot_id = ?",
+            "SELECT * FROM position_snapshots WHERE snapshot_id = ? ORDER BY market_value DESC",
             (snapshot_id,)
         ).fetchall()
 
@@ -63,6 +74,12 @@ class TestSnapshotCreation:
         assert rows[0]['market_value'] == 17500.0
         assert rows[1]['instrument_type'] == 'Equity Option'
 
+        header = test_db.execute(
+            "SELECT * FROM holdings_snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        assert header['total_positions'] == 2
+        assert header['snapshot_time'] == '2026-01-15T16:05:00'
+
     def test_multiple_brokerages_same_day(self, test_db):
         """Test snapshots from different brokerages on the same day."""
         test_db.execute("""
@@ -128,33 +145,13 @@ class TestPositionCounting:
 
     def test_count_positions_by_source(self, test_db):
         """Test counting positions grouped by brokerage source."""
-        # Tradier snapshot with 2 positions
-        test_db.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-01-15', 'tradier', '2026-01-15T16:05:00', 2)
-        """)
-        tradier_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-
-        for sym in ['AAPL', 'MSFT']:
-            test_db.execute("""
-                INSERT INTO position_snapshots (snapshot_id, symbol, quantity, market_value)
-                VALUES (?, ?, 100, 10000)
-            """, (tradier_id, sym))
-
-        # TastyTrade snapshot with 3 positions
-        test_db.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-01-15', 'tastytrade', '2026-01-15T16:05:00', 3)
-        """)
-        tt_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-
-        for sym in ['TSLA', 'NVDA', 'AMD']:
-            test_db.execute("""
-                INSERT INTO position_snapshots (snapshot_id, symbol, quantity, market_value)
-                VALUES (?, ?, 50, 5000)
-            """, (tt_id, sym))
-
-        test_db.commit()
+        write_holdings_snapshots(test_db, '2026-01-15', {
+            # Tradier snapshot with 2 positions
+            'tradier': [{'symbol': sym, 'quantity': 100, 'market_value': 10000} for sym in ['AAPL', 'MSFT']],
+            # TastyTrade snapshot with 3 positions
+            'tastytrade': [{'symbol': sym, 'quantity': 50, 'market_value': 5000}
+                           for sym in ['TSLA', 'NVDA', 'AMD']],
+        })
 
         # Count total positions across all sources
         total = test_db.execute(
@@ -179,19 +176,10 @@ class TestPositionCounting:
         """Test snapshot data across multiple days."""
         for day in range(15, 18):
             date_str = f'2026-01-{day}'
-            test_db.execute("""
-                INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-                VALUES (?, 'tradier', ?, ?)
-            """, (date_str, f'{date_str}T16:05:00', day - 14))
-
-            snap_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-            for i in range(day - 14):
-                test_db.execute("""
-                    INSERT INTO position_snapshots (snapshot_id, symbol, quantity, market_value)
-                    VALUES (?, ?, 100, 10000)
-                """, (snap_id, f'SYM{i}'))
-
-        test_db.commit()
+            write_holdings_snapshots(test_db, date_str, {'tradier': [
+                {'symbol': f'SYM{i}', 'quantity': 100, 'market_value': 10000}
+                for i in range(day - 14)
+            ]}, snapshot_time=f'{date_str}T16:05:00')
 
         # Query history
         rows = test_db.execute("""
@@ -203,6 +191,7 @@ class TestPositionCounting:
         assert rows[0]['total_positions'] == 1
         assert rows[1]['total_positions'] == 2
         assert rows[2]['total_positions'] == 3
+        assert _symbols(test_db, '2026-01-16') == ['SYM0', 'SYM1']
 
 
 class TestPositionDataIntegrity:
@@ -210,23 +199,12 @@ class TestPositionDataIntegrity:
 
     def test_option_position_fields(self, test_db):
         """Test that option-specific fields are stored correctly."""
-        test_db.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-01-15', 'tastytrade', '2026-01-15T16:05:00', 1)
-        """)
-        snap_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-
-        test_db.execute("""
-            INSERT INTO position_snapshots (
-                snapshot_id, symbol, underlying_symbol, quantity,
-                instrument_type, average_open_price, close_price,
-                market_value, cost_basis, unrealized_pl,
-                option_type, strike, expiration_date, multiplier
-            ) VALUES (?, 'SPY 250321C500', 'SPY', 10, 'Equity Option',
-                      3.50, 5.20, 5200.0, 3500.0, 1700.0,
-                      'call', 500.0, '2025-03-21', 100)
-        """, (snap_id,))
-        test_db.commit()
+        write_holdings_snapshots(test_db, '2026-01-15', {'tastytrade': [{
+            'symbol': 'SPY 250321C500', 'underlying_symbol': 'SPY', 'quantity': 10,
+            'instrument_type': 'Equity Option', 'average_open_price': 3.50, 'close_price': 5.20,
+            'market_value': 5200.0, 'cost_basis': 3500.0, 'unrealized_pl': 1700.0,
+            'option_type': 'call', 'strike': 500.0, 'expiration_date': '2025-03-21', 'multiplier': 100,
+        }]})
 
         row = test_db.execute(
             "SELECT * FROM position_snapshots WHERE symbol = 'SPY 250321C500'"
@@ -242,35 +220,20 @@ class TestPositionDataIntegrity:
 
     def test_unrealized_pl_calculation(self, test_db):
         """Test that unrealized P&L values are stored correctly."""
-        test_db.execute("""
-            INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
-            VALUES ('2026-01-15', 'tradier', '2026-01-15T16:05:00', 2)
-        """)
-        snap_id = test_db.execute("SELECT last_insert_rowid()").fetchone()[0]
-
-        # Profitable position
-        test_db.execute("""
-            INSERT INTO position_snapshots (
-                snapshot_id, symbol, quantity, average_open_price, close_price,
-                market_value, cost_basis, unrealized_pl
-            ) VALUES (?, 'AAPL', 100, 150.0, 175.0, 17500.0, 15000.0, 2500.0)
-        """, (snap_id,))
-
-        # Losing position
-        test_db.execute("""
-            INSERT INTO position_snapshots (
-                snapshot_id, symbol, quantity, average_open_price, close_price,
-                market_value, cost_basis, unrealized_pl
-            ) VALUES (?, 'MSFT', 50, 400.0, 380.0, 19000.0, 20000.0, -1000.0)
-        """, (snap_id,))
-
-        test_db.commit()
+        ids = write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [
+            # Profitable position
+            {'symbol': 'AAPL', 'quantity': 100, 'average_open_price': 150.0, 'close_price': 175.0,
+             'market_value': 17500.0, 'cost_basis': 15000.0, 'unrealized_pl': 2500.0},
+            # Losing position
+            {'symbol': 'MSFT', 'quantity': 50, 'average_open_price': 400.0, 'close_price': 380.0,
+             'market_value': 19000.0, 'cost_basis': 20000.0, 'unrealized_pl': -1000.0},
+        ]})
 
         rows = test_db.execute("""
             SELECT symbol, unrealized_pl FROM position_snapshots
             WHERE snapshot_id = ?
             ORDER BY symbol
-        """, (snap_id,)).fetchall()
+        """, (ids['tradier'],)).fetchall()
 
         assert rows[0]['symbol'] == 'AAPL'
         assert rows[0]['unrealized_pl'] == 2500.0
@@ -278,13 +241,208 @@ class TestPositionDataIntegrity:
         assert rows[1]['unrealized_pl'] == -1000.0
 
     def test_foreign_key_constraint(self, test_db):
-        """Test that position_snapshots requires a valid snapshot_id."""
+        """Test that position history requires a known symbol."""
         # Enable foreign keys (SQLite has them off by default)
         test_db.execute("PRAGMA foreign_keys = ON")
 
         with pytest.raises(sqlite3.IntegrityError):
             test_db.execute("""
-                INSERT INTO position_snapshots (
-                    snapshot_id, symbol, quantity, market_value
-                ) VALUES (999, 'AAPL', 100, 10000)
+                INSERT INTO position_history (source, symbol_id, valid_from, quantity)
+                VALUES ('tradier', 999, '2026-01-15', 100)
             """)
+
+    def test_position_snapshots_is_read_only(self, test_db):
+        """Positions are written through write_holdings_snapshots only."""
+        with pytest.raises(sqlite3.OperationalError):
+            test_db.execute("INSERT INTO position_snapshots (snapshot_id, symbol, quantity) "
+                            "VALUES (1, 'AAPL', 100)")
+
+
+def _aapl(quantity=100, close=175.0):
+    return {'symbol': 'AAPL', 'quantity': quantity, 'close_price': close,
+            'market_value': quantity * close, 'instrument_type': 'Equity'}
+
+
+def _sgov(quantity=200):
+    return {'symbol': 'SGOV', 'quantity': quantity, 'close_price': 100.0,
+            'market_value': quantity * 100.0, 'instrument_type': 'Equity'}
+
+
+class TestCompactStorage:
+    """Only changed positions add rows."""
+
+    def test_unchanged_positions_add_no_rows(self, test_db):
+        for day in ('2026-01-15', '2026-01-16', '2026-01-17'):
+            write_holdings_snapshots(test_db, day, {'tradier': [_aapl(), _sgov()]})
+
+        stats = storage_stats(test_db)
+        assert stats == {'snapshots': 3, 'snapshot_positions': 6, 'symbols': 2, 'history_rows': 2}
+        for day in ('2026-01-15', '2026-01-16', '2026-01-17'):
+            assert _symbols(test_db, day) == ['AAPL', 'SGOV']
+
+    def test_changed_position_adds_one_row(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl(), _sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': [_aapl(close=180.0), _sgov()]})
+
+        assert storage_stats(test_db)['history_rows'] == 3
+        before, after = (
+            {p['symbol']: p for p in get_snapshot_positions(test_db, _snapshot_id(test_db, day))}
+            for day in ('2026-01-15', '2026-01-16')
+        )
+        assert before['AAPL']['close_price'] == 175.0
+        assert after['AAPL']['close_price'] == 180.0
+        assert after['SGOV']['position_id'] == before['SGOV']['position_id']
+
+    def test_closed_and_reopened_position(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl(), _sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': [_sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-17', {'tradier': [_aapl(), _sgov()]})
+
+        assert _symbols(test_db, '2026-01-15') == ['AAPL', 'SGOV']
+        assert _symbols(test_db, '2026-01-16') == ['SGOV']
+        assert _symbols(test_db, '2026-01-17') == ['AAPL', 'SGOV']
+        assert storage_stats(test_db)['symbols'] == 2
+
+    def test_empty_snapshot(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl()]})
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': []})
+
+        assert _symbols(test_db, '2026-01-16') == []
+        assert _symbols(test_db, '2026-01-15') == ['AAPL']
+
+    def test_sources_are_independent(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl()], 'tastytrade': [_sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': []})
+
+        assert _symbols(test_db, '2026-01-15', 'tastytrade') == ['SGOV']
+        assert _symbols(test_db, '2026-01-16') == []
+
+    def test_repeated_symbol_kept(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl(10), _aapl(-5)]})
+
+        quantities = sorted(p['quantity'] for p in
+                            get_snapshot_positions(test_db, _snapshot_id(test_db, '2026-01-15')))
+        assert quantities == [-5.0, 10.0]
+
+
+    def test_empty_string_and_null_are_one_symbol(self, test_db):
+        """'' and NULL share a key in idx_position_symbols_key."""
+        write_holdings_snapshots(test_db, '2026-01-15',
+                                 {'tradier': [dict(_aapl(), underlying_symbol=None)]})
+        write_holdings_snapshots(test_db, '2026-01-16',
+                                 {'tradier': [dict(_aapl(), underlying_symbol='', strike=-1)]})
+
+        assert _symbols(test_db, '2026-01-16') == ['AAPL']
+        assert storage_stats(test_db)['symbols'] == 1
+        assert storage_stats(test_db)['history_rows'] == 1
+
+
+class TestRewriteSnapshot:
+    """Re-running or backfilling a date leaves the other snapshots intact."""
+
+    def test_rerun_same_day_replaces(self, test_db):
+        ids = write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl(), _sgov()]})
+        ids_2 = write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_sgov(300)]})
+
+        assert ids == ids_2
+        positions = get_snapshot_positions(test_db, ids['tradier'])
+        assert [(p['symbol'], p['quantity']) for p in positions] == [('SGOV', 300.0)]
+        assert storage_stats(test_db)['history_rows'] == 1
+
+    def test_backfill_earlier_date(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl(), _sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-17', {'tradier': [_aapl(), _sgov()]})
+
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': [_sgov(50)]})
+
+        assert _symbols(test_db, '2026-01-15') == ['AAPL', 'SGOV']
+        assert _symbols(test_db, '2026-01-16') == ['SGOV']
+        assert _symbols(test_db, '2026-01-17') == ['AAPL', 'SGOV']
+        sgov = [p for p in get_snapshot_positions(test_db, _snapshot_id(test_db, '2026-01-17'))
+                if p['symbol'] == 'SGOV']
+        assert sgov[0]['quantity'] == 200.0
+
+    def test_failed_write_rolls_back(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl()]})
+
+        with pytest.raises(KeyError):
+            write_holdings_snapshots(test_db, '2026-01-16', {'tradier': [_sgov()],
+                                                             'tastytrade': [{'quantity': 1}]})
+
+        assert storage_stats(test_db)['snapshots'] == 1
+
+
+class TestHoldingsAsOf:
+
+    def test_uses_latest_snapshot_on_or_before(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl()], 'tastytrade': [_sgov()]})
+        write_holdings_snapshots(test_db, '2026-01-16', {'tradier': [_aapl(), _sgov(10)]})
+
+        holdings = get_holdings_as_of(test_db, '2026-01-18')
+
+        assert [(h['source'], h['symbol'], h['snapshot_date']) for h in holdings] == [
+            ('tastytrade', 'SGOV', '2026-01-15'),
+            ('tradier', 'AAPL', '2026-01-16'),
+            ('tradier', 'SGOV', '2026-01-16'),
+        ]
+
+    def test_source_filter_and_before_first(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-15', {'tradier': [_aapl()], 'tastytrade': [_sgov()]})
+
+        assert [h['symbol'] for h in get_holdings_as_of(test_db, '2026-01-15', 'tastytrade')] == ['SGOV']
+        assert get_holdings_as_of(test_db, '2026-01-14') == []
+
+
+class TestLegacyMigration:
+    """A database with the original position_snapshots table is converted."""
+
+    @pytest.fixture
+    def legacy_db(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "legacy.db")
+        conn.row_factory = sqlite3.Row
+        conn.execute("""
+            CREATE TABLE holdings_snapshots (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+                source TEXT NOT NULL, snapshot_time TEXT NOT NULL,
+                total_positions INTEGER NOT NULL DEFAULT 0, UNIQUE(date, source))
+        """)
+        conn.execute("""
+            CREATE TABLE position_snapshots (
+                position_id INTEGER PRIMARY KEY AUTOINCREMENT, snapshot_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL, underlying_symbol TEXT, quantity REAL NOT NULL,
+                instrument_type TEXT, average_open_price REAL, close_price REAL,
+                market_value REAL, cost_basis REAL, unrealized_pl REAL, option_type TEXT,
+                strike REAL, expiration_date TEXT, multiplier INTEGER,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')))
+        """)
+        holdings = {
+            '2026-01-15': [('AAPL', 100, 17500.0), ('SGOV', 200, 20000.0)],
+            '2026-01-16': [('AAPL', 100, 17500.0), ('SGOV', 200, 20000.0)],
+            '2026-01-17': [('SGOV', 200, 20000.0)],
+        }
+        for day, positions in holdings.items():
+            cursor = conn.execute("""
+                INSERT INTO holdings_snapshots (date, source, snapshot_time, total_positions)
+                VALUES (?, 'tradier', ?, ?)
+            """, (day, f'{day}T16:05:00', len(positions)))
+            conn.executemany(
+                "INSERT INTO position_snapshots (snapshot_id, symbol, quantity, market_value) "
+                "VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, *p) for p in positions])
+        conn.commit()
+        yield conn
+        conn.close()
+
+    def test_converts_and_keeps_legacy_table(self, legacy_db):
+        ensure_holdings_schema(legacy_db)
+
+        assert _symbols(legacy_db, '2026-01-15') == ['AAPL', 'SGOV']
+        assert _symbols(legacy_db, '2026-01-17') == ['SGOV']
+        assert storage_stats(legacy_db)['history_rows'] == 2
+        assert legacy_db.execute(f"SELECT COUNT(*) FROM {LEGACY_TABLE}").fetchone()[0] == 5
+
+    def test_writes_after_conversion(self, legacy_db):
+        write_holdings_snapshots(legacy_db, '2026-01-18', {'tradier': [_aapl()]})
+
+        assert _symbols(legacy_db, '2026-01-16') == ['AAPL', 'SGOV']
+        assert _symbols(legacy_db, '2026-01-18') == ['AAPL']
@@ -0,0 +1,325 @@
+"""
+Tests for Incremental (page-deduplicated) Backups
+=================================================
+Tests the online snapshot engine, chunk deduplication, verification,
+point-in-time restore, and rotation with chunk garbage collection.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.utilities.backup_database import DatabaseBackup
+from scripts.utilities.incremental_backup import IncrementalBackup, online_copy
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _rows(db_path):
+    conn = sqlite3.connect(str(db_path))
+    rows = conn.execute("SELECT id, value FROM trades ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.fixture
+def incr_env(tmp_path):
+    """A ~2 MB database and an engine pointed at a temp store."""
+    db_path = tmp_path / "data" / "tovito.db"
+    db_path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.executemany(
+        "INSERT INTO trades VALUES (?, ?)",
+        ((i, os.urandom(200).hex()) for i in range(5000)),
+    )
+    conn.commit()
+    conn.close()
+
+    engine = IncrementalBackup(db_path, tmp_path / "backups" / "incremental", workers=2)
+    return {"db_path": db_path, "engine": engine, "tmp_path": tmp_path}
+
+
+# ---------------------------------------------------------------------------
+# Snapshots and deduplication
+# ---------------------------------------------------------------------------
+
+class TestSnapshot:
+    """Test create_snapshot() and chunk deduplication."""
+
+    def test_snapshot_round_trip(self, incr_env):
+        engine = incr_env["engine"]
+        manifest = engine.create_snapshot()
+
+        target = incr_env["tmp_path"] / "restored.db"
+        engine.restore_snapshot(manifest["snapshot_id"], target)
+
+        assert _rows(target) == _rows(incr_env["db_path"])
+        assert manifest["size_bytes"] == manifest["page_size"] * manifest["page_count"]
+        assert os.path.getsize(target) == manifest["size_bytes"]
+
+    def test_second_snapshot_stores_only_changed_chunks(self, incr_env):
+        engine = incr_env["engine"]
+        first = engine.create_snapshot()
+
+        conn = sqlite3.connect(str(incr_env["db_path"]))
+        conn.execute("UPDATE trades SET value = 'changed' WHERE id = 2500")
+        conn.commit()
+        conn.close()
+
+        second = engine.create_snapshot()
+
+        assert first["stats"]["chunks_new"] == first["stats"]["chunks_total"]
+        # Header page + the page holding row 2500 (plus possibly a b-tree page)
+        assert second["stats"]["chunks_new"] <= 3
+        assert second["stats"]["chunks_reused"] >= second["stats"]["chunks_total"] - 3
+        assert second["stats"]["bytes_stored"] < first["stats"]["bytes_stored"] / 5
+
+    def test_unchanged_database_reuses_all_but_header(self, incr_env):
+        engine = incr_env["engine"]
+        engine.create_snapshot()
+        again = engine.create_snapshot()
+        assert again["stats"]["chunks_new"] <= 1
+
+    def test_snapshot_ids_unique_within_same_second(self, incr_env):
+        engine = incr_env["engine"]
+        ids = {engine.create_snapshot()["snapshot_id"] for _ in range(3)}
+        assert len(ids) == 3
+
+    def test_missing_database_raises(self, incr_env, tmp_path):
+        engine = IncrementalBackup(tmp_path / "nope.db", tmp_path / "store")
+        with pytest.raises(FileNotFoundError):
+            engine.create_snapshot()
+
+
+class TestOnlineCopy:
+    """The online backup API gives consistent copies of a live database."""
+
+    def test_uncommitted_writes_excluded(self, incr_env):
+        writer = sqlite3.connect(str(incr_env["db_path"]))
+        writer.execute("BEGIN")
+        writer.execute("INSERT INTO trades VALUES (999999, 'uncommitted')")
+
+        dest = incr_env["tmp_path"] / "copy.db"
+        online_copy(incr_env["db_path"], dest)
+        writer.rollback()
+        writer.close()
+
+        assert (999999, 'uncommitted') not in _rows(dest)
+        assert len(_rows(dest)) == 5000
+
+    def test_wal_frames_included(self, incr_env):
+        conn = sqlite3.connect(str(incr_env["db_path"]))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        conn.execute("INSERT INTO trades VALUES (777777, 'in-wal')")
+        conn.commit()
+
+        manifest = incr_env["engine"].create_snapshot()
+        conn.close()
+
+        target = incr_env["tmp_path"] / "restored.db"
+        incr_env["engine"].restore_snapshot(manifest["snapshot_id"], target)
+        assert (777777, 'in-wal') in _rows(target)
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+class TestVerifySnapshot:
+    """Test fast and deep snapshot verification."""
+
+    def test_verify_ok(self, incr_env):
+        engine = incr_env["engine"]
+        manifest = engine.create_snapshot()
+        assert engine.verify_snapshot(manifest["snapshot_id"])["status"] == "ok"
+        assert engine.verify_snapshot(manifest["snapshot_id"], deep=True)["status"] == "ok"
+
+    def test_missing_chunk_detected(self, incr_env):
+        engine = incr_env["engine"]
+        manifest = engine.create_snapshot()
+        engine.chunks.path_for(manifest["chunks"][3]).unlink()
+
+        result = engine.verify_snapshot(manifest["snapshot_id"])
+        assert result["status"] == "corrupted"
+        assert any("MISSING" in d for d in result["details"])
+
+    def test_corrupted_chunk_detected_by_deep_verify(self, incr_env):
+        import zlib
+
+        engine = incr_env["engine"]
+        manifest = engine.create_snapshot()
+        engine.chunks.path_for(manifest["chunks"][3]).write_bytes(
+            zlib.compress(b"bit rot")
+        )
+
+        assert engine.verify_snapshot(manifest["snapshot_id"])["status"] == "ok"
+        result = engine.verify_snapshot(manifest["snapshot_id"], deep=True)
+        assert result["status"] == "corrupted"
+        assert any("CHECKSUM MISMATCH" in d for d in result["details"])
+
+    def test_restore_refuses_corrupted_chunk(self, incr_env):
+        import zlib
+
+        engine = incr_env["engine"]
+        manifest = engine.create_snapshot()
+        engine.chunks.path_for(manifest["chunks"][3]).write_bytes(
+            zlib.compress(b"bit rot")
+        )
+        target = incr_env["tmp_path"] / "restored.db"
+
+        with pytest.raises(ValueError):
+            engine.restore_snapshot(manifest["snapshot_id"], target)
+        assert not target.exists()
+
+
+# ---------------------------------------------------------------------------
+# DatabaseBackup / DatabaseRestore integration
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def managers(incr_env):
+    from scripts.utilities.restore_database import DatabaseRestore
+
+    backup = DatabaseBackup()
+    backup.db_path = str(incr_env["db_path"])
+    backup.backup_dir = str(incr_env["tmp_path"] / "backups")
+
+    restorer = DatabaseRestore()
+    restorer.db_path = backup.db_path
+    restorer.backup_dir = backup.backup_dir
+    return backup, restorer
+
+
+class TestBackupManagerIntegration:
+    """Test incremental snapshots through DatabaseBackup/DatabaseRestore."""
+
+    def test_create_and_list(self, managers):
+        backup, _ = managers
+        result = backup.create_incremental_backup()
+
+        assert result["status"] == "success"
+        listed = [b for b in backup.list_backups() if b["type"] == "incremental"]
+        assert [b["filename"] for b in listed] == [result["snapshot_id"]]
+        assert listed[0]["logical_size_bytes"] == result["size_bytes"]
+
+    def test_verify_backup_accepts_manifest(self, managers):
+        backup, _ = managers
+        result = backup.create_incremental_backup()
+        assert backup.verify_backup(result["manifest_path"], deep=True)["status"] == "ok"
+
+    def test_restore_from_manifest(self, managers, incr_env):
+        backup, restorer = managers
+        result = backup.create_incremental_backup()
+        target = incr_env["tmp_path"] / "restored" / "tovito.db"
+
+        restored = restorer.restore_database(result["manifest_path"], target_path=str(target))
+
+        assert restored["status"] == "success"
+        assert restored["snapshot_id"] == result["snapshot_id"]
+        assert _rows(target) == _rows(incr_env["db_path"])
+
+    def test_point_in_time_restore(self, managers, incr_env):
+        backup, restorer = managers
+        engine = backup.incremental_engine()
+
+        first = engine.create_snapshot()
+        conn = sqlite3.connect(str(incr_env["db_path"]))
+        conn.execute("DELETE FROM trades WHERE id < 100")
+        conn.commit()
+        conn.close()
+        second = engine.create_snapshot()
+
+        # Backdate the first snapshot so the two are an hour apart
+        manifest_path = engine.snapshot_dir / f"{first['snapshot_id']}.json"
+        first["created_at"] = (
+            datetime.fromisoformat(second["created_at"]) - timedelta(hours=1)
+        ).isoformat(timespec="seconds")
+        engine._write_manifest(first)
+        assert manifest_path.exists()
+
+        target = incr_env["tmp_path"] / "pit.db"
+        when = datetime.fromisoformat(second["created_at"]) - timedelta(minutes=30)
+        result = restorer.restore_as_of(when, target_path=str(target))
+
+        assert result["status"] == "success"
+        assert result["snapshot_id"] == first["snapshot_id"]
+        assert len(_rows(target)) == 5000
+
+    def test_point_in_time_before_any_snapshot(self, managers):
+        backup, restorer = managers
+        backup.create_incremental_backup()
+        result = restorer.restore_as_of(datetime(2000, 1, 1))
+        assert result["status"] == "error"
+
+    def test_rotation_garbage_collects_chunks(self, managers, incr_env):
+        backup, _ = managers
+        engine = backup.incremental_engine()
+
+        snapshots = []
+        for i in range(3):
+            conn = sqlite3.connect(str(incr_env["db_path"]))
+            conn.execute("UPDATE trades SET value = ? WHERE id % 7 = 0", (f"v{i}",))
+            conn.commit()
+            conn.close()
+            snapshots.append(engine.create_snapshot())
+
+        # Backdate all but the newest beyond retention
+        for i, manifest in enumerate(snapshots[:-1]):
+            manifest["created_at"] = (
+                datetime.now() - timedelta(days=201 - i)
+            ).isoformat(timespec="seconds")
+            engine._write_manifest(manifest)
+
+        chunks_before = sum(1 for _ in engine.chunks.digests())
+        result = backup.rotate_backups(keep_count=1, keep_days=90)
+        chunks_after = sum(1 for _ in engine.chunks.digests())
+
+        # The middle snapshot goes; the oldest is always kept as a baseline
+        assert result["removed_count"] == 1
+        assert result["freed_bytes"] > 0
+        assert chunks_after < chunks_before
+        for manifest in (snapshots[0], snapshots[-1]):
+            assert engine.verify_snapshot(manifest["snapshot_id"])["status"] == "ok"
+
+
+class TestConcurrentWriter:
+    """A steady writer cannot starve the stepped online copy."""
+
+    def test_copy_finishes_under_constant_writes(self, incr_env):
+        import threading
+
+        stop = threading.Event()
+
+        def writer():
+            conn = sqlite3.connect(str(incr_env["db_path"]), timeout=30)
+            i = 10_000
+            while not stop.is_set():
+                conn.execute("INSERT INTO trades VALUES (?, 'w')", (i,))
+                conn.commit()
+                i += 1
+            conn.close()
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        try:
+            dest = incr_env["tmp_path"] / "copy.db"
+            restarts = online_copy(incr_env["db_path"], dest, pages_per_step=5)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert restarts >= 1
+        conn = sqlite3.connect(str(dest))
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        conn.close()
@@ -0,0 +1,398 @@
+"""
+Tests for the event-driven scheduler (src/automation/job_scheduler.py)
+and the cached market calendar (src/automation/market_calendar.py).
+
+Covers:
+- Bundled holidays, early closes and Tradier calendar parsing
+- Calendar months cached in SQLite and reused
+- Trading-day and month-end rules skip closed days
+- Missed runs caught up once after a restart, never duplicated
+- run_forever sleeps until the next job instead of polling
+"""
+
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytz
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.automation.job_scheduler import (
+    Job,
+    JobScheduler,
+    daily_at,
+    last_trading_day_of_month_at,
+    trading_days_at,
+    weekly_at,
+)
+from src.automation.market_calendar import MarketCalendar, parse_tradier_calendar
+
+ET = pytz.timezone('America/New_York')
+
+
+class Clock:
+    """Settable clock for JobScheduler."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "tovito.db")
+
+
+@pytest.fixture
+def calendar(db_path):
+    return MarketCalendar(db_path)
+
+
+TRADIER_NOVEMBER = {
+    'calendar': {'month': 11, 'year': 2026, 'days': {'day': [
+        {'date': '2026-11-25', 'status': 'open', 'description': 'Market is open',
+         'open': {'start': '09:30', 'end': '16:00'}},
+        {'date': '2026-11-26', 'status': 'closed', 'description': 'Thanksgiving Day'},
+        {'date': '2026-11-27', 'status': 'open', 'description': 'Early close',
+         'open': {'start': '09:30', 'end': '13:00'}},
+    ]}}
+}
+
+
+class TestMarketCalendar:
+
+    def test_bundled_holidays_and_early_closes(self, calendar):
+        assert calendar.is_trading_day(date(2026, 4, 3)) is False      # Good Friday
+        assert calendar.is_trading_day(date(2026, 7, 3)) is False      # July 4th observed
+        assert calendar.is_trading_day(date(2026, 10, 17)) is False    # Saturday
+        assert calendar.close_time(date(2026, 10, 16)) == dt_time(16, 0)
+        assert calendar.close_time(date(2026, 12, 24)) == dt_time(13, 0)
+        assert calendar.is_early_close(date(2026, 11, 27))
+        assert calendar.next_trading_day(date(2026, 4, 2)) == date(2026, 4, 6)
+        assert calendar.last_trading_day_of_month(2027, 12) == date(2027, 12, 31)
+        assert calendar.last_trading_day_of_month(2026, 1) == date(2026, 1, 30)
+
+    def test_parse_tradier(self):
+        days = parse_tradier_calendar(TRADIER_NOVEMBER)
+        assert days['2026-11-26']['status'] == 'closed'
+        assert days['2026-11-26']['close_time'] is None
+        assert days['2026-11-27']['close_time'] == '13:00'
+        assert parse_tradier_calendar({}) == {}
+
+    def test_month_cached(self, db_path):
+        client = MagicMock()
+        client.get_market_calendar.return_value = TRADIER_NOVEMBER
+        calendar = MarketCalendar(db_path, client=client)
+        assert calendar.is_early_close(date(2026, 11, 27))
+        assert calendar.is_trading_day(date(2026, 11, 28)) is False    # Weekend, bundled
+        client.get_market_calendar.assert_called_once_with(month=11, year=2026)
+
+        # A fresh instance reads the cache instead of calling Tradier
+        client2 = MagicMock()
+        reloaded = MarketCalendar(db_path, client=client2)
+        assert reloaded.close_time(date(2026, 11, 27)) == dt_time(13, 0)
+        client2.get_market_calendar.assert_not_called()
+
+        conn = sqlite3.connect(db_path)
+        sources = dict(conn.execute("SELECT date, source FROM market_calendar"))
+        conn.close()
+        assert sources['2026-11-26'] == 'tradier'
+
+    def test_tradier_failure_falls_back(self, db_path):
+        client = MagicMock()
+        client.get_market_calendar.side_effect = Exception("401")
+        calendar = MarketCalendar(db_path, client=client)
+        assert calendar.is_trading_day(date(2026, 11, 26)) is False
+        assert calendar.refresh_month(2026, 11) == 'bundled'
+
+    def test_fallback_month_refetched_later(self, db_path):
+        client = MagicMock()
+        client.get_market_calendar.side_effect = Exception("503")
+        calendar = MarketCalendar(db_path, client=client)
+        assert calendar.is_early_close(date(2026, 11, 27))              # Bundled
+        assert client.get_market_calendar.call_count == 1
+
+        # Tradier is back: not retried until the retry interval has passed
+        client.get_market_calendar.side_effect = None
+        client.get_market_calendar.return_value = TRADIER_NOVEMBER
+        calendar.is_trading_day(date(2026, 11, 25))
+        assert client.get_market_calendar.call_count == 1
+
+        with patch('src.automation.market_calendar.PROVISIONAL_RETRY_SECONDS', 0):
+            calendar.is_trading_day(date(2026, 11, 25))
+            calendar.is_trading_day(date(2026, 11, 25))
+        assert client.get_market_calendar.call_count == 2
+        assert calendar.day(date(2026, 11, 27))['description'] == 'Early close'
+
+        conn = sqlite3.connect(db_path)
+        sources = dict(conn.execute("SELECT date, source FROM market_calendar"))
+        conn.close()
+        assert sources['2026-11-26'] == 'tradier'
+
+    def test_cached_fallback_month_refetched_on_load(self, db_path):
+        MarketCalendar(db_path).is_trading_day(date(2026, 11, 25))      # No client: bundled
+
+        client = MagicMock()
+        client.get_market_calendar.return_value = TRADIER_NOVEMBER
+        reloaded = MarketCalendar(db_path, client=client)
+        assert reloaded.day(date(2026, 11, 27))['description'] == 'Early close'
+        client.get_market_calendar.assert_called_once_with(month=11, year=2026)
+
+        # Now cached from Tradier: later loads do not call it again
+        client3 = MagicMock()
+        MarketCalendar(db_path, client=client3).is_trading_day(date(2026, 11, 25))
+        client3.get_market_calendar.assert_not_called()
+
+
+class TestRules:
+
+    def test_trading_days_skip_holidays(self, calendar):
+        rule = trading_days_at(calendar, tz=ET)
+        fire = rule(ET.localize(datetime(2026, 4, 2, 16, 0)))   # Thursday close
+        assert fire == ET.localize(datetime(2026, 4, 6, 16, 0))  # Monday after Good Friday
+
+    def test_offset_applies_to_early_close(self, calendar):
+        rule = trading_days_at(calendar, timedelta(minutes=5))
+        assert rule(datetime(2026, 12, 23, 17, 0)) == datetime(2026, 12, 24, 13, 5)
+        assert rule(datetime(2026, 12, 24, 13, 5)) == datetime(2026, 12, 28, 16, 5)
+
+    def test_last_trading_day_of_month(self, calendar):
+        rule = last_trading_day_of_month_at(calendar, dt_time(20, 0))
+        # Jan 31 2026 is a Saturday
+        assert rule(datetime(2026, 1, 1)) == datetime(2026, 1, 30, 20, 0)
+        assert rule(datetime(2026, 1, 30, 20, 0)) == datetime(2026, 2, 27, 20, 0)
+
+    def test_weekly(self):
+        rule = weekly_at(6, dt_time(18, 0))
+        assert rule(datetime(2026, 10, 18, 18, 0)) == datetime(2026, 10, 25, 18, 0)
+
+    def test_dst_aware(self):
+        rule = daily_at(dt_time(16, 0), tz=ET)
+        before = ET.localize(datetime(2026, 3, 7, 16, 0))
+        fire = rule(rule(before))
+        assert fire - before == timedelta(hours=47)   # Clocks spring forward Mar 8
+
+
+class TestJobScheduler:
+
+    def _scheduler(self, db_path, now, calls, catch_up=True):
+        scheduler = JobScheduler(db_path, clock=Clock(now))
+        scheduler.add(Job('hourly', lambda: calls.append(scheduler.clock()),
+                          lambda after: after.replace(minute=0, second=0, microsecond=0)
+                          + timedelta(hours=1),
+                          catch_up=catch_up))
+        scheduler.start()
+        return scheduler
+
+    def test_first_start_has_nothing_to_catch_up(self, db_path):
+        calls = []
+        scheduler = self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls)
+        assert scheduler.next_runs() == [(datetime(2026, 10, 16, 10, 0), 'hourly')]
+        assert scheduler.run_pending() == []
+
+    def test_runs_when_due_and_reschedules(self, db_path):
+        calls = []
+        scheduler = self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls)
+        scheduler.clock.now = datetime(2026, 10, 16, 10, 0)
+        assert scheduler.run_pending() == ['hourly']
+        assert scheduler.next_runs()[0][0] == datetime(2026, 10, 16, 11, 0)
+
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("SELECT last_fire_at, status FROM scheduler_state").fetchone()
+        conn.close()
+        assert row == ('2026-10-16T10:00:00', 'success')
+
+    def test_missed_runs_caught_up_once(self, db_path):
+        calls = []
+        scheduler = self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls)
+        scheduler.clock.now = datetime(2026, 10, 16, 10, 0)
+        scheduler.run_pending()
+
+        # Down from 10:00 until 14:20: 11:00-14:00 missed
+        restarted = self._scheduler(db_path, datetime(2026, 10, 16, 14, 20), calls)
+        assert restarted.next_runs() == [(datetime(2026, 10, 16, 14, 0), 'hourly')]
+        assert restarted.run_pending() == ['hourly']
+        assert restarted.run_pending() == []
+        assert restarted.next_runs() == [(datetime(2026, 10, 16, 15, 0), 'hourly')]
+        assert len(calls) == 2
+
+        # Restarting again in the same hour does not repeat the catch-up
+        again = self._scheduler(db_path, datetime(2026, 10, 16, 14, 40), calls)
+        assert again.run_pending() == []
+        assert len(calls) == 2
+
+    def test_catch_up_disabled(self, db_path):
+        calls = []
+        self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls, catch_up=False)
+        restarted = self._scheduler(db_path, datetime(2026, 10, 16, 14, 20), calls,
+                                    catch_up=False)
+        assert restarted.next_runs() == [(datetime(2026, 10, 16, 15, 0), 'hourly')]
+
+    def test_slot_claimed_by_other_process_not_repeated(self, db_path):
+        calls = []
+        first = self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls)
+        second = self._scheduler(db_path, datetime(2026, 10, 16, 9, 30), calls)
+        for s in (first, second):
+            s.clock.now = datetime(2026, 10, 16, 10, 0)
+        assert first.run_pending() == ['hourly']
+        assert second.run_pending() == []
+        assert len(calls) == 1
+
+    def test_pass_slot_gets_fire_time(self, db_path):
+        slots = []
+        scheduler = JobScheduler(db_path, clock=Clock(datetime(2026, 10, 16, 9, 30)))
+        scheduler.add(Job('nav', slots.append, daily_at(dt_time(16, 0)), pass_slot=True))
+        scheduler.start()
+
+        # Restarted the next morning: the catch-up gets the missed slot so
+        # the job can decide whether it is still safe to run
+        restarted = JobScheduler(db_path, clock=Clock(datetime(2026, 10, 17, 9, 0)))
+        restarted.add(Job('nav', slots.append, daily_at(dt_time(16, 0)), pass_slot=True))
+        restarted.start()
+        assert restarted.run_pending() == ['nav']
+        assert slots == [datetime(2026, 10, 16, 16, 0)]
+
+    def test_failure_recorded(self, db_path):
+        def boom():
+            raise RuntimeError("API down")
+
+        scheduler = JobScheduler(db_path, clock=Clock(datetime(2026, 10, 16, 9, 30)))
+        scheduler.add(Job('nav', boom, daily_at(dt_time(16, 0))))
+        scheduler.start()
+        scheduler.clock.now = datetime(2026, 10, 16, 16, 0)
+        assert scheduler.run_pending() == ['nav']
+
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("SELECT status, error FROM scheduler_state").fetchone()
+        conn.close()
+        assert row == ('failed', 'RuntimeError: API down')
+
+    def test_run_forever_sleeps_until_due(self, db_path):
+        ran = threading.Event()
+        due = datetime.now() + timedelta(milliseconds=200)
+        scheduler = JobScheduler(db_path)
+        scheduler.add(Job('soon', ran.set,
+                          lambda after: due if after < due else after + timedelta(days=1)))
+        waits = []
+        real_wait = scheduler._wake.wait
+        scheduler._wake.wait = lambda timeout=None: waits.append(timeout) or real_wait(timeout)
+
+        thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+        thread.start()
+        assert ran.wait(5)
+        for _ in range(100):
+            if len(waits) == 2:
+                break
+            threading.Event().wait(0.01)
+        scheduler.stop()
+        thread.join(5)
+        assert not thread.is_alive()
+        # One sleep until the job, one until the next day's slot
+        assert len(waits) == 2
+        assert waits[1] > 3600
+
+
+class TestTaskScheduler:
+
+    @pytest.fixture
+    def task_scheduler(self, db_path, monkeypatch):
+        from src.automation import scheduler as module
+        monkeypatch.setenv('DATABASE_PATH', db_path)
+        monkeypatch.delenv('TRADIER_API_KEY', raising=False)
+        monkeypatch.setattr(module, 'NAVCalculator', MagicMock())
+        monkeypatch.setattr(module, 'EmailService', MagicMock())
+        monkeypatch.setattr(module, 'Database', MagicMock())
+        return module.TaskScheduler()
+
+    def test_jobs_registered_on_calendar(self, task_scheduler):
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 12, 23, 17, 0)))
+        task_scheduler.setup_schedules()
+        runs = {name: fire for fire, name in task_scheduler.scheduler.next_runs()}
+        assert runs['daily_nav_update'] == ET.localize(datetime(2026, 12, 24, 13, 0))
+        assert runs['weekly_newsletter'] == ET.localize(datetime(2026, 12, 27, 18, 0))
+        assert runs['monthly_reports'] == ET.localize(datetime(2026, 12, 31, 20, 0))
+
+    def test_daily_update_skips_closed_day(self, task_scheduler):
+        task_scheduler.calendar.is_trading_day = lambda d: False
+        task_scheduler._log_event = MagicMock()
+        task_scheduler.daily_nav_update()
+        task_scheduler.nav_calculator.fetch_and_update_nav.assert_not_called()
+
+    def test_daily_update_values_the_slot_day(self, task_scheduler):
+        task_scheduler.nav_calculator.fetch_and_update_nav.return_value = {'status': 'success'}
+        task_scheduler.nav_calculator.validate_data.return_value = {'valid': True, 'errors': []}
+
+        # Caught up on a Saturday for Friday's missed close
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 17, 10, 0)))
+        task_scheduler.daily_nav_update(ET.localize(datetime(2026, 10, 16, 16, 0)))
+
+        task_scheduler.nav_calculator.fetch_and_update_nav.assert_called_once_with(
+            update_date=date(2026, 10, 16))
+
+    def test_catch_up_before_next_open_runs(self, task_scheduler):
+        task_scheduler.nav_calculator.fetch_and_update_nav.return_value = {'status': 'success'}
+        task_scheduler.nav_calculator.validate_data.return_value = {'valid': True, 'errors': []}
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 16, 9, 0)))
+
+        task_scheduler.daily_nav_update(ET.localize(datetime(2026, 10, 15, 16, 0)))
+
+        task_scheduler.nav_calculator.fetch_and_update_nav.assert_called_once_with(
+            update_date=date(2026, 10, 15))
+
+    def test_catch_up_after_next_open_skipped_and_alerted(self, task_scheduler, monkeypatch):
+        monkeypatch.setenv('NOTIFY_EMAIL', 'ops@example.com')
+        task_scheduler._log_event = MagicMock()
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 14, 17, 0)))
+        task_scheduler.setup_schedules()
+
+        # Down over Thursday's close, restarted after Friday's open
+        from src.automation import scheduler as module
+        restarted = module.TaskScheduler()
+        restarted.nav_calculator = task_scheduler.nav_calculator
+        restarted._log_event = task_scheduler._log_event
+        restarted.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 16, 10, 0)))
+        restarted.setup_schedules()
+
+        assert 'daily_nav_update' in restarted.scheduler.run_pending()
+        restarted.nav_calculator.fetch_and_update_nav.assert_not_called()
+        restarted._log_event.assert_called_once()
+        assert restarted._log_event.call_args[0][0] == 'ERROR'
+        assert '2026-10-15' in restarted._log_event.call_args[0][2]
+        restarted.email_service.send_alert_email.assert_called_once()
+
+    def test_weekend_restart_catches_up_missed_close(self, task_scheduler):
+        task_scheduler.nav_calculator.fetch_and_update_nav.return_value = {'status': 'success'}
+        task_scheduler.nav_calculator.validate_data.return_value = {'valid': True, 'errors': []}
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 15, 17, 0)))
+        task_scheduler.setup_schedules()
+
+        # Down over Friday's close, restarted on Saturday
+        from src.automation import scheduler as module
+        restarted = module.TaskScheduler()
+        restarted.nav_calculator = task_scheduler.nav_calculator
+        restarted.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 17, 10, 0)))
+        restarted.setup_schedules()
+
+        assert 'daily_nav_update' in restarted.scheduler.run_pending()
+        restarted.nav_calculator.fetch_and_update_nav.assert_called_once_with(
+            update_date=date(2026, 10, 16))
+
+    def test_monthly_reports_not_caught_up(self, task_scheduler):
+        task_scheduler.scheduler.clock = Clock(ET.localize(datetime(2026, 10, 29, 12, 0)))
+        task_scheduler.setup_schedules()
+
+        from src.automation import scheduler as module
+        restarted = module.TaskScheduler()
+        restarted.scheduler.clock = Clock(ET.localize(datetime(2026, 11, 2, 9, 0)))
+        restarted.setup_schedules()
+
+        runs = {name: fire for fire, name in restarted.scheduler.next_runs()}
+        assert runs['monthly_reports'] == ET.localize(datetime(2026, 11, 30, 20, 0))
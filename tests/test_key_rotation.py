@@ -0,0 +1,151 @@
+"""
+Tests for the encryption key rotation script
+(scripts/setup/rotate_encryption_key.py).
+
+Covers:
+- Chunked, multi-threaded rotation of every encrypted field
+- NULL and already-rotated values skipped
+- Failing chunk rolled back, earlier chunks kept, --resume continues
+- Checkpoint tied to the new key
+"""
+
+import os
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.encryption import FieldEncryptor
+from scripts.setup import rotate_encryption_key as rotation
+from scripts.setup.rotate_encryption_key import ENCRYPTED_FIELDS, rotate_keys
+
+
+@pytest.fixture
+def rotation_env(tmp_path):
+    """A database of 25 profiles encrypted with the current key."""
+    current_key = FieldEncryptor.generate_key()
+    new_key = FieldEncryptor.generate_key()
+    enc = FieldEncryptor(current_key, legacy_keys=[], key_version=1)
+
+    db_path = tmp_path / "tovito.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"""
+        CREATE TABLE investor_profiles (
+            investor_id TEXT PRIMARY KEY,
+            {', '.join(f'{f} TEXT' for f in ENCRYPTED_FIELDS)},
+            updated_at TEXT
+        )
+    """)
+    for i in range(25):
+        values = enc.encrypt_many([f"{i:03d}-45-6789", None, f"0210{i:05d}",
+                                   f"9876{i:04d}", "1980-01-01"])
+        conn.execute(
+            f"INSERT INTO investor_profiles (investor_id, {', '.join(ENCRYPTED_FIELDS)}) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            [f"20260101-{i:02d}A"] + values,
+        )
+    conn.commit()
+    conn.close()
+
+    env = {"ENCRYPTION_KEY": current_key, "ENCRYPTION_LEGACY_KEYS": "",
+           "ENCRYPTION_KEY_VERSION": "1"}
+    with patch.dict(os.environ, env):
+        yield {
+            "db_path": str(db_path),
+            "checkpoint": tmp_path / "checkpoint.json",
+            "new_key": new_key,
+            "current_key": current_key,
+        }
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(r) for r in conn.execute(
+        "SELECT * FROM investor_profiles ORDER BY investor_id")]
+    conn.close()
+    return rows
+
+
+def _rotate(env, **kwargs):
+    kwargs.setdefault("chunk_size", 10)
+    kwargs.setdefault("workers", 3)
+    return rotate_keys(env["new_key"], db_path=env["db_path"],
+                       checkpoint_path=env["checkpoint"], **kwargs)
+
+
+class TestRotation:
+
+    def test_all_fields_rotated(self, rotation_env):
+        assert _rotate(rotation_env) is True
+
+        new_only = FieldEncryptor(rotation_env["new_key"], legacy_keys=[], key_version=2)
+        for i, row in enumerate(_rows(rotation_env["db_path"])):
+            assert row["tax_id_encrypted"] is None
+            assert row["ssn_encrypted"].startswith("v2:")
+            assert new_only.decrypt(row["ssn_encrypted"]) == f"{i:03d}-45-6789"
+            assert new_only.decrypt(row["date_of_birth"]) == "1980-01-01"
+        assert not rotation_env["checkpoint"].exists()
+
+    def test_dry_run_writes_nothing(self, rotation_env):
+        before = _rows(rotation_env["db_path"])
+        assert _rotate(rotation_env, dry_run=True) is True
+        assert _rows(rotation_env["db_path"]) == before
+
+    def test_rerun_skips_rotated_values(self, rotation_env, capsys):
+        _rotate(rotation_env)
+        after_first = _rows(rotation_env["db_path"])
+
+        # A second run with the same new key finds every value already at v2
+        assert _rotate(rotation_env) is True
+        assert _rows(rotation_env["db_path"]) == after_first
+        assert "Already rotated:    100" in capsys.readouterr().out
+
+
+class TestResume:
+
+    def _corrupt(self, db_path, investor_id):
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE investor_profiles SET ssn_encrypted = 'v1:gAAAAAgarbage' "
+                     "WHERE investor_id = ?", (investor_id,))
+        conn.commit()
+        conn.close()
+
+    def test_failing_chunk_rolled_back_and_resumed(self, rotation_env):
+        self._corrupt(rotation_env["db_path"], "20260101-15A")
+
+        assert _rotate(rotation_env) is False
+        rows = _rows(rotation_env["db_path"])
+        # First chunk (ids 00-09) committed, second chunk (10-19) rolled back
+        assert all(r["ssn_encrypted"].startswith("v2:") for r in rows[:10])
+        assert all(r["bank_account_encrypted"].startswith("v1:") for r in rows[10:])
+        state = json.loads(rotation_env["checkpoint"].read_text())
+        assert state["last_investor_id"] == "20260101-09A"
+        assert rotation_env["new_key"] not in rotation_env["checkpoint"].read_text()
+
+        # Fix the bad value and resume
+        enc = FieldEncryptor(rotation_env["current_key"], legacy_keys=[], key_version=1)
+        conn = sqlite3.connect(rotation_env["db_path"])
+        conn.execute("UPDATE investor_profiles SET ssn_encrypted = ? WHERE investor_id = ?",
+                     (enc.encrypt("015-45-6789"), "20260101-15A"))
+        conn.commit()
+        conn.close()
+
+        with patch.object(rotation, "rotate_rows", wraps=rotation.rotate_rows) as spy:
+            assert _rotate(rotation_env, resume=True) is True
+        resumed_ids = {row["investor_id"] for call in spy.call_args_list for row in call.args[0]}
+        assert min(resumed_ids) == "20260101-10A"
+        assert all(r["ssn_encrypted"].startswith("v2:") for r in _rows(rotation_env["db_path"]))
+
+    def test_checkpoint_for_other_key_refused(self, rotation_env):
+        rotation_env["checkpoint"].write_text(json.dumps({
+            "new_key_fingerprint": "someotherkey", "last_investor_id": "",
+            "profiles_done": 0,
+        }))
+        assert _rotate(rotation_env, resume=True) is False
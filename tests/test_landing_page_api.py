@@ -241,11 +241,11 @@ class TestPublicInquiryEndpoint:
         with patch("apps.investor_portal.api.models.database.get_database_path") as mock_path:
             mock_path.return_value = TEST_DB_PATH
 
-            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, _inquiry_rate_limit
+            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, inquiry_limiter
             import asyncio
 
             # Clear rate limit state
-            _inquiry_rate_limit.clear()
+            inquiry_limiter.clear()
 
             request = InquiryRequest(
                 name="Test User",
@@ -271,10 +271,10 @@ class TestPublicInquiryEndpoint:
         with patch("apps.investor_portal.api.models.database.get_database_path") as mock_path:
             mock_path.return_value = TEST_DB_PATH
 
-            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, _inquiry_rate_limit
+            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, inquiry_limiter
             import asyncio
 
-            _inquiry_rate_limit.clear()
+            inquiry_limiter.clear()
 
             request = InquiryRequest(name="User A", email="same@example.com")
 
@@ -303,10 +303,10 @@ class TestPublicInquiryEndpoint:
         with patch("apps.investor_portal.api.models.database.get_database_path") as mock_path:
             mock_path.return_value = TEST_DB_PATH
 
-            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, _inquiry_rate_limit
+            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, inquiry_limiter
             import asyncio
 
-            _inquiry_rate_limit.clear()
+            inquiry_limiter.clear()
 
             request = InquiryRequest(name="New User", email="new@example.com")
 
@@ -325,10 +325,10 @@ class TestPublicInquiryEndpoint:
         with patch("apps.investor_portal.api.models.database.get_database_path") as mock_path:
             mock_path.return_value = TEST_DB_PATH
 
-            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, _inquiry_rate_limit
+            from apps.investor_portal.api.routes.public import submit_inquiry, InquiryRequest, inquiry_limiter
             import asyncio
 
-            _inquiry_rate_limit.clear()
+            inquiry_limiter.clear()
 
             request = InquiryRequest(name="Repeat User", email="repeat@example.com")
 
@@ -355,40 +355,40 @@ class TestRateLimiting:
 
     def test_rate_limit_allows_under_threshold(self):
         """Requests under the limit are allowed."""
-        from apps.investor_portal.api.routes.public import _check_rate_limit, _inquiry_rate_limit
+        from apps.investor_portal.api.services.rate_limit import inquiry_limiter
 
-        _inquiry_rate_limit.clear()
+        inquiry_limiter.clear()
 
         # First 5 requests should be allowed
         for i in range(5):
-            assert _check_rate_limit("10.0.0.1") is True
+            assert inquiry_limiter.hit("10.0.0.1") is True
 
     def test_rate_limit_blocks_over_threshold(self):
         """Sixth request from same IP is blocked."""
-        from apps.investor_portal.api.routes.public import _check_rate_limit, _inquiry_rate_limit
+        from apps.investor_portal.api.services.rate_limit import inquiry_limiter
 
-        _inquiry_rate_limit.clear()
+        inquiry_limiter.clear()
 
         # Exhaust the limit
         for i in range(5):
-            _check_rate_limit("10.0.0.2")
+            inquiry_limiter.hit("10.0.0.2")
 
         # 6th should be blocked
-        assert _check_rate_limit("10.0.0.2") is False
+        assert inquiry_limiter.hit("10.0.0.2") is False
 
     def test_rate_limit_per_ip(self):
         """Different IPs have independent limits."""
-        from apps.investor_portal.api.routes.public import _check_rate_limit, _inquiry_rate_limit
+        from apps.investor_portal.api.services.rate_limit import inquiry_limiter
 
-        _inquiry_rate_limit.clear()
+        inquiry_limiter.clear()
 
         # Exhaust limit for IP A
         for i in range(5):
-            _check_rate_limit("10.0.0.3")
-        assert _check_rate_limit("10.0.0.3") is False
+            inquiry_limiter.hit("10.0.0.3")
+        assert inquiry_limiter.hit("10.0.0.3") is False
 
         # IP B should still be allowed
-        assert _check_rate_limit("10.0.0.4") is True
+        assert inquiry_limiter.hit("10.0.0.4") is True
 
 
 # ============================================================
@@ -364,3 +364,50 @@ class TestOverallHealthScore:
             if c['name'] == 'Database Integrity'
         )
         assert db_comp['score'] == 15
+
+
+# ===================================================================
+# Test: Stage Timings
+# ===================================================================
+
+class TestStageTimings:
+
+    @staticmethod
+    def _write_spans(durations, name='etl.extract', when=None, root=False):
+        from src.monitoring.tracing import Tracer, STATUS_ERROR, write_spans
+        tracer = Tracer(enabled=True, exporter=lambda batch: None)
+        spans = []
+        for i, duration in enumerate(durations):
+            s = tracer.span(name)
+            s.started_at = when or datetime.now()
+            s.duration_ms = duration
+            s.parent_id = None if root else 'parent'
+            if i == 0 and duration < 0:
+                s.duration_ms = -duration
+                s.status = STATUS_ERROR
+            spans.append(s)
+        write_spans("data/test_tovito.db", spans)
+
+    def test_no_table(self, test_db, health_svc):
+        assert health_svc.get_stage_timings() == {
+            'stages': [], 'trend': [], 'slowest_today': None}
+
+    def test_percentiles_and_slowest(self, test_db, health_svc):
+        self._write_spans([-10.0] + [float(i) for i in range(11, 101)])
+        self._write_spans([500.0, 700.0], name='sync.push')
+        self._write_spans([9000.0], name='daily_nav', root=True)
+        self._write_spans([100000.0], when=datetime.now() - timedelta(days=60))
+
+        timings = health_svc.get_stage_timings(days=30)
+        stages = {s['name']: s for s in timings['stages']}
+        extract = stages['etl.extract']
+        assert extract['runs'] == 91
+        assert extract['errors'] == 1
+        assert extract['p50_ms'] == 55.0
+        assert extract['p95_ms'] == 96.0
+        assert extract['max_ms'] == 100.0
+        assert timings['stages'][0]['name'] == 'daily_nav'  # Highest p95 first
+        # Root spans are whole runs, not stages
+        assert timings['slowest_today']['name'] == 'sync.push'
+        assert timings['slowest_today']['duration_ms'] == 700.0
+        assert {t['name'] for t in timings['trend']} == {'etl.extract', 'sync.push', 'daily_nav'}
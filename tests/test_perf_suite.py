@@ -0,0 +1,182 @@
+"""
+Tests for the hot-path benchmark suite (src/perf/).
+
+Covers:
+- Synthetic fund generation is deterministic and internally consistent
+- Every hot path runs against a generated database
+- The ETL benchmark never touches the generated database
+- Baselines round-trip through JSON and regressions are flagged
+"""
+
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.perf.hot_paths import (
+    HOT_PATHS,
+    BenchmarkResult,
+    compare_to_baseline,
+    load_baseline,
+    profile_mismatch,
+    run_hot_paths,
+    save_baseline,
+    time_runs,
+)
+from src.perf.synthetic_fund import FundProfile, generate_fund, synthetic_log_lines
+
+TINY = FundProfile('tiny', years=0.25, investors=30, flows_per_investor=3, trades=500,
+                   raw_rows=200, raw_duplicate_pct=0.25, log_lines=500,
+                   end_date=date(2026, 9, 30))
+
+
+@pytest.fixture(scope="module")
+def fund_db(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("perf") / "tiny.db"
+    generate_fund(db_path, TINY)
+    return db_path
+
+
+def _dump(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+                for table in ('investors', 'transactions', 'daily_nav', 'trades',
+                              'brokerage_transactions_raw')}
+    finally:
+        conn.close()
+
+
+def _result(name, median):
+    return BenchmarkResult(name, ops=1, runs=1, best=median, median=median, mean=median)
+
+
+class TestSyntheticFund:
+
+    def test_row_counts(self, tmp_path):
+        stats = generate_fund(tmp_path / "fund.db", TINY)
+        assert stats['investors'] == 30
+        assert stats['trades'] == 500
+        assert stats['raw_rows'] == 200
+        assert stats['end_date'] == '2026-09-30'
+        assert stats['transactions'] >= 30
+
+    def test_deterministic(self, tmp_path, fund_db):
+        generate_fund(tmp_path / "again.db", TINY)
+        assert _dump(tmp_path / "again.db") == _dump(fund_db)
+
+    def test_seed_changes_data(self, tmp_path, fund_db):
+        from dataclasses import replace
+        generate_fund(tmp_path / "other.db", replace(TINY, seed=7))
+        assert _dump(tmp_path / "other.db")['daily_nav'] != _dump(fund_db)['daily_nav']
+
+    def test_shares_consistent(self, fund_db):
+        conn = sqlite3.connect(fund_db)
+        total_txn_shares = conn.execute("SELECT SUM(shares_transacted) FROM transactions").fetchone()[0]
+        last_nav_shares = conn.execute(
+            "SELECT total_shares FROM daily_nav ORDER BY date DESC LIMIT 1").fetchone()[0]
+        investor_shares = conn.execute("SELECT SUM(current_shares) FROM investors").fetchone()[0]
+        conn.close()
+        assert last_nav_shares == pytest.approx(total_txn_shares, abs=0.01)
+        assert investor_shares == pytest.approx(total_txn_shares, abs=0.01)
+
+    def test_raw_backlog_overlaps_loaded_trades(self, fund_db):
+        conn = sqlite3.connect(fund_db)
+        overlap = conn.execute("""
+            SELECT COUNT(*) FROM brokerage_transactions_raw r
+            JOIN trades t ON t.source = r.source
+             AND t.brokerage_transaction_id = r.brokerage_transaction_id
+        """).fetchone()[0]
+        pending = conn.execute("SELECT COUNT(*) FROM brokerage_transactions_raw "
+                               "WHERE etl_status = 'pending'").fetchone()[0]
+        conn.close()
+        assert overlap == 50
+        assert pending == 200
+
+    def test_log_lines_deterministic(self):
+        assert synthetic_log_lines(100, seed=1) == synthetic_log_lines(100, seed=1)
+        assert any('@' in line for line in synthetic_log_lines(100))
+
+
+class TestRunHotPaths:
+
+    def test_all_hot_paths_run(self, fund_db):
+        results = run_hot_paths(fund_db, TINY, repeat=2)
+        assert list(results) == list(HOT_PATHS)
+        for result in results.values():
+            assert result.runs == 2
+            assert result.ops > 0
+            assert 0 < result.best <= result.median
+
+        assert results['etl_load_to_trades'].ops == 200
+        assert results['sanitize_message'].ops == 500
+
+    def test_etl_benchmark_leaves_database_untouched(self, fund_db):
+        before = _dump(fund_db)
+        run_hot_paths(fund_db, TINY, repeat=1, names=['etl_load_to_trades'])
+        assert _dump(fund_db) == before
+
+    def test_portal_database_restored(self, fund_db):
+        from apps.investor_portal.api.config import settings
+        previous = settings.DATABASE_PATH
+        run_hot_paths(fund_db, TINY, repeat=1, names=['risk_metrics'])
+        assert settings.DATABASE_PATH == previous
+
+    def test_unknown_benchmark(self, fund_db):
+        with pytest.raises(ValueError, match="Unknown benchmark"):
+            run_hot_paths(fund_db, TINY, names=['nope'])
+
+    def test_reset_untimed_and_warmup(self):
+        calls = []
+        timings = time_runs(lambda: calls.append('run'), repeat=3,
+                            reset=lambda: calls.append('reset'))
+        assert len(timings) == 3
+        assert calls == ['reset', 'run'] * 4
+
+
+class TestBaselines:
+
+    def test_round_trip(self, tmp_path):
+        path = save_baseline({'a': _result('a', 0.5)}, tmp_path / "base" / "tiny.json", TINY)
+        baseline = load_baseline(path)
+        assert baseline['results']['a']['median'] == 0.5
+        assert baseline['profile']['end_date'] == '2026-09-30'
+        assert profile_mismatch(baseline, TINY) == []
+
+    def test_profile_mismatch_ignores_end_date(self, tmp_path):
+        from dataclasses import replace
+        path = save_baseline({}, tmp_path / "tiny.json", TINY)
+        baseline = load_baseline(path)
+        assert profile_mismatch(baseline, replace(TINY, end_date=date(2026, 10, 30))) == []
+        assert profile_mismatch(baseline, replace(TINY, trades=1000)) == ['trades']
+
+    def test_compare(self):
+        baseline = {'results': {
+            'slow': {'median': 1.0}, 'same': {'median': 1.0}, 'fast': {'median': 1.0},
+        }}
+        results = {
+            'slow': _result('slow', 1.3),
+            'same': _result('same', 1.2),
+            'fast': _result('fast', 0.7),
+            'added': _result('added', 0.1),
+        }
+        statuses = {c.name: c.status for c in compare_to_baseline(results, baseline, 0.25)}
+        assert statuses == {'slow': 'regressed', 'same': 'ok', 'fast': 'faster', 'added': 'new'}
+
+        statuses = {c.name: c.status for c in compare_to_baseline(results, baseline, 0.1)}
+        assert statuses['same'] == 'regressed'
+
+    def test_negative_tolerance(self):
+        with pytest.raises(ValueError):
+            compare_to_baseline({}, {'results': {}}, tolerance=-0.1)
+
+    def test_unsupported_version(self, tmp_path):
+        path = tmp_path / "old.json"
+        path.write_text('{"version": 0}')
+        with pytest.raises(ValueError, match="Unsupported baseline version"):
+            load_baseline(path)
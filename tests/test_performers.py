@@ -0,0 +1,223 @@
+"""
+Tests for historical performer analytics (src/reporting/performers.py).
+
+Covers:
+- The window-function query matches the original correlated-subquery query
+- The incrementally maintained summary matches a full recomputation
+- Re-runs and backfills rebuild the summary
+- Short windows are computed from their own snapshots
+- The /analysis/historical-performers endpoint reads the summary
+"""
+
+import asyncio
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.database.holdings_store import write_holdings_snapshots
+from src.reporting.performers import (
+    compute_symbol_performance,
+    get_symbol_performance,
+    rebuild_performance_summary,
+)
+from tests.conftest import TEST_DB_PATH
+
+# The endpoint's query before the rewrite, as the reference
+CORRELATED_SQL = """
+    SELECT
+        ps.symbol,
+        MIN(hs.date) as first_seen,
+        MAX(hs.date) as last_seen,
+        MAX(ps.unrealized_pl) as best_unrealized_pl,
+        MIN(ps.unrealized_pl) as worst_unrealized_pl,
+        SUM(CASE WHEN hs.date = (
+            SELECT MAX(hs2.date)
+            FROM holdings_snapshots hs2
+            JOIN position_snapshots ps2 ON ps2.snapshot_id = hs2.snapshot_id
+            WHERE ps2.symbol = ps.symbol AND hs2.date >= ?
+        ) THEN ps.unrealized_pl ELSE NULL END) as latest_unrealized_pl,
+        SUM(CASE WHEN hs.date = (
+            SELECT MAX(hs2.date)
+            FROM holdings_snapshots hs2
+            JOIN position_snapshots ps2 ON ps2.snapshot_id = hs2.snapshot_id
+            WHERE ps2.symbol = ps.symbol AND hs2.date >= ?
+        ) THEN ps.cost_basis ELSE NULL END) as latest_cost_basis,
+        MAX(CASE WHEN ps.cost_basis > 0
+            THEN (ps.unrealized_pl / ps.cost_basis * 100)
+            ELSE NULL END) as best_pl_pct,
+        MIN(CASE WHEN ps.cost_basis > 0
+            THEN (ps.unrealized_pl / ps.cost_basis * 100)
+            ELSE NULL END) as worst_pl_pct
+    FROM position_snapshots ps
+    JOIN holdings_snapshots hs ON hs.snapshot_id = ps.snapshot_id
+    WHERE hs.date >= ?
+      AND ps.symbol NOT IN ('Cash', 'CASH')
+      AND ps.instrument_type NOT LIKE '%%Cash%%'
+    GROUP BY ps.symbol
+    HAVING MAX(ABS(ps.cost_basis)) > 0
+    ORDER BY best_pl_pct DESC
+"""
+
+COMPARED = ('symbol', 'first_seen', 'last_seen', 'best_unrealized_pl', 'worst_unrealized_pl',
+            'latest_unrealized_pl', 'latest_cost_basis', 'best_pl_pct', 'worst_pl_pct')
+
+
+def _position(symbol, cost_basis, pl, instrument_type='Equity'):
+    return {'symbol': symbol, 'quantity': 10, 'instrument_type': instrument_type,
+            'market_value': cost_basis + pl, 'cost_basis': cost_basis, 'unrealized_pl': pl}
+
+
+def _random_days(seed=3, days=30):
+    """Daily holdings for two brokerages with symbols coming and going."""
+    rng = random.Random(seed)
+    start = date(2026, 1, 5)
+    symbols = ['AAPL', 'MSFT', 'NVDA', 'SPY 260320C600', 'TSLA', 'SGOV']
+    history = []
+    for d in range(days):
+        held = {}
+        for source in ('tradier', 'tastytrade'):
+            positions = []
+            for symbol in symbols:
+                if rng.random() < 0.6:
+                    positions.append(_position(symbol, rng.choice([0.0, 1000.0, 2500.0]),
+                                               round(rng.uniform(-500, 800), 2)))
+            if rng.random() < 0.5:
+                positions.append(_position('CASH', 0.0, 0.0, 'Cash'))
+            held[source] = positions
+        history.append((str(start + timedelta(days=d)), held))
+    return history
+
+
+def _rounded(rows):
+    return [{k: round(r[k], 6) if isinstance(r[k], float) else r[k] for k in COMPARED}
+            for r in rows]
+
+
+@pytest.fixture
+def daily_history(test_db):
+    for day, held in _random_days():
+        write_holdings_snapshots(test_db, day, held)
+    return test_db
+
+
+class TestWindowQuery:
+
+    @pytest.mark.parametrize('since', ['', '2026-01-20'])
+    def test_matches_correlated_query(self, daily_history, since):
+        expected = [dict(r) for r in daily_history.execute(CORRELATED_SQL, (since, since, since))]
+        actual = compute_symbol_performance(daily_history, since)
+
+        assert len(expected) >= 4
+        assert [r['symbol'] for r in actual] == [r['symbol'] for r in expected]
+        assert _rounded(actual) == _rounded(expected)
+
+    def test_holding_period(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-05', {'tradier': [_position('AAPL', 1000.0, 50.0)]})
+        write_holdings_snapshots(test_db, '2026-01-06', {'tradier': []})
+        write_holdings_snapshots(test_db, '2026-01-12', {'tradier': [_position('AAPL', 1000.0, 80.0)]})
+
+        row, = compute_symbol_performance(test_db)
+
+        assert row['first_seen'] == '2026-01-05'
+        assert row['last_seen'] == '2026-01-12'
+        assert row['holding_days'] == 7
+        assert row['observation_days'] == 2
+        assert row['latest_unrealized_pl'] == 80.0
+
+
+class TestSummaryMaintenance:
+
+    def _summary(self, conn):
+        rows = conn.execute("SELECT * FROM symbol_performance_summary ORDER BY symbol").fetchall()
+        return [{k: round(v, 6) if isinstance(v, float) else v
+                 for k, v in dict(r).items() if k != 'updated_at'} for r in rows]
+
+    def test_incremental_matches_rebuild(self, daily_history):
+        incremental = self._summary(daily_history)
+        assert incremental
+
+        rebuild_performance_summary(daily_history)
+        assert self._summary(daily_history) == incremental
+
+    def test_rerun_of_last_day_rebuilds(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-05', {'tradier': [_position('AAPL', 1000.0, 50.0)]})
+        write_holdings_snapshots(test_db, '2026-01-06', {'tradier': [_position('AAPL', 1000.0, 400.0)]})
+        # Corrected re-run of the same day lowers the best P&L
+        write_holdings_snapshots(test_db, '2026-01-06', {'tradier': [_position('AAPL', 1000.0, 100.0)]})
+
+        row = test_db.execute("SELECT * FROM symbol_performance_summary").fetchone()
+        assert row['best_unrealized_pl'] == 100.0
+        assert row['observation_days'] == 2
+
+    def test_backfill_rebuilds(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-06', {'tradier': [_position('AAPL', 1000.0, 50.0)]})
+        write_holdings_snapshots(test_db, '2026-01-05', {'tradier': [_position('AAPL', 1000.0, -20.0)]})
+
+        row = test_db.execute("SELECT * FROM symbol_performance_summary").fetchone()
+        assert row['first_seen'] == '2026-01-05'
+        assert row['worst_unrealized_pl'] == -20.0
+        assert row['latest_unrealized_pl'] == 50.0
+
+    def test_new_source_same_day(self, test_db):
+        write_holdings_snapshots(test_db, '2026-01-05', {'tradier': [_position('AAPL', 1000.0, 50.0)]})
+        write_holdings_snapshots(test_db, '2026-01-05', {'tastytrade': [_position('AAPL', 500.0, 10.0)]})
+
+        row = test_db.execute("SELECT * FROM symbol_performance_summary").fetchone()
+        assert row['latest_unrealized_pl'] == 60.0
+        assert row['latest_cost_basis'] == 1500.0
+
+
+class TestGetSymbolPerformance:
+
+    def test_full_window_reads_summary(self, daily_history):
+        daily_history.execute("UPDATE symbol_performance_summary SET best_pl_pct = 999 WHERE symbol = 'AAPL'")
+
+        rows = get_symbol_performance(daily_history, since='2025-01-01')
+        assert rows[0]['symbol'] == 'AAPL'
+        assert rows[0]['best_pl_pct'] == 999
+
+    def test_short_window_computed(self, daily_history):
+        daily_history.execute("UPDATE symbol_performance_summary SET best_pl_pct = 999 WHERE symbol = 'AAPL'")
+
+        rows = get_symbol_performance(daily_history, since='2026-01-20')
+        assert _rounded(rows) == _rounded(compute_symbol_performance(daily_history, '2026-01-20'))
+
+    def test_missing_summary_falls_back(self, daily_history):
+        expected = compute_symbol_performance(daily_history)
+        daily_history.execute("DROP TABLE symbol_performance_summary")
+
+        assert _rounded(get_symbol_performance(daily_history)) == _rounded(expected)
+
+    def test_no_snapshots(self, test_db):
+        assert get_symbol_performance(test_db) == []
+
+
+class TestHistoricalPerformersEndpoint:
+
+    def test_reads_summary(self, test_db):
+        today = date.today()
+        for offset, pl in ((2, 100.0), (1, 300.0)):
+            write_holdings_snapshots(test_db, str(today - timedelta(days=offset)), {'tradier': [
+                _position('AAPL', 1000.0, pl),
+                _position('MSFT', 1000.0, -pl),
+            ]})
+
+        with patch("apps.investor_portal.api.models.database.get_database_path",
+                   return_value=Path(TEST_DB_PATH)):
+            from apps.investor_portal.api.routes.analysis import get_historical_performers
+            response = asyncio.run(get_historical_performers(user=None, days=730))
+
+        assert response.top_performers[0].symbol == 'AAPL'
+        assert response.top_performers[0].best_unrealized_pl_pct == 30.0
+        assert response.top_performers[0].latest_unrealized_pl == 300.0
+        assert response.top_performers[0].holding_days == 1
+        assert response.bottom_performers[0].symbol == 'MSFT'
+        assert response.bottom_performers[0].worst_unrealized_pl_pct == -30.0
+        assert response.period_end == str(today - timedelta(days=1))
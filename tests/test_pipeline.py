@@ -0,0 +1,291 @@
+"""
+Tests for the pipeline task-graph runner (src/automation/pipeline.py)
+and the daily NAV step graph (scripts/daily_nav_enhanced.py).
+
+Covers:
+- Dependency order and concurrent independent steps
+- Fail-fast on critical steps; non-critical failures don't block
+- Per-step timeouts skip dependents; run() waits for timed-out steps
+- Resume with from_step
+- pipeline_runs persistence
+- Daily NAV graph: declared steps, NAV path failure stops the run,
+  side-step failures are recorded as failed
+"""
+
+import sys
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.automation.pipeline import (
+    FAILED,
+    SKIPPED,
+    SUCCESS,
+    TIMEOUT,
+    Pipeline,
+    PipelineStep,
+    record_pipeline_run,
+)
+
+
+def _recorder(order, name, delay=0.0, error=None):
+    def func():
+        order.append(name)
+        if delay:
+            time.sleep(delay)
+        if error:
+            raise error
+        return name
+    return func
+
+
+class TestValidation:
+
+    def test_unknown_dependency(self):
+        with pytest.raises(ValueError, match="unknown step"):
+            Pipeline('p', [PipelineStep('a', lambda: 1, depends_on=('b',))])
+
+    def test_cycle(self):
+        with pytest.raises(ValueError, match="cycle"):
+            Pipeline('p', [
+                PipelineStep('a', lambda: 1, depends_on=('b',)),
+                PipelineStep('b', lambda: 1, depends_on=('a',)),
+            ])
+
+    def test_unknown_resume_step(self):
+        with pytest.raises(ValueError):
+            Pipeline('p', [PipelineStep('a', lambda: 1)]).run(from_step='z')
+
+
+class TestExecution:
+
+    def test_dependencies_respected(self):
+        order = []
+        report = Pipeline('p', [
+            PipelineStep('c', _recorder(order, 'c'), depends_on=('b',)),
+            PipelineStep('b', _recorder(order, 'b'), depends_on=('a',)),
+            PipelineStep('a', _recorder(order, 'a')),
+        ]).run()
+        assert order == ['a', 'b', 'c']
+        assert report.success
+        assert list(report.results) == ['c', 'b', 'a']
+        assert report.results['b'].value == 'b'
+
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        steps = [PipelineStep(f's{i}', barrier.wait, timeout=10) for i in range(3)]
+        report = Pipeline('p', steps, max_workers=3).run()
+        assert all(r.status == SUCCESS for r in report.results.values())
+
+    def test_max_workers_limits_concurrency(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def work():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        Pipeline('p', [PipelineStep(f's{i}', work) for i in range(6)], max_workers=2).run()
+        assert peak[0] == 2
+
+    def test_critical_failure_stops_run(self):
+        order = []
+        report = Pipeline('p', [
+            PipelineStep('balance', _recorder(order, 'balance', error=RuntimeError("API down")),
+                         critical=True),
+            PipelineStep('nav', _recorder(order, 'nav'), depends_on=('balance',), critical=True),
+            PipelineStep('snapshot', _recorder(order, 'snapshot'), depends_on=('nav',)),
+        ]).run()
+        assert order == ['balance']
+        assert report.success is False
+        assert report.halted_by == 'balance'
+        assert report.results['balance'].error == "RuntimeError: API down"
+        assert [report.results[n].status for n in ('nav', 'snapshot')] == [SKIPPED, SKIPPED]
+
+    def test_running_steps_finish_after_critical_failure(self):
+        order = []
+        report = Pipeline('p', [
+            PipelineStep('balance', _recorder(order, 'balance', error=RuntimeError()),
+                         critical=True),
+            PipelineStep('shares', _recorder(order, 'shares', delay=0.05), critical=True),
+            PipelineStep('nav', _recorder(order, 'nav'), depends_on=('balance', 'shares')),
+        ]).run()
+        assert report.results['shares'].status == SUCCESS
+        assert report.results['nav'].status == SKIPPED
+
+    def test_non_critical_failure_does_not_block(self):
+        order = []
+        report = Pipeline('p', [
+            PipelineStep('snapshot', _recorder(order, 'snapshot', error=ValueError("x"))),
+            PipelineStep('plan', _recorder(order, 'plan'), depends_on=('snapshot',)),
+        ]).run()
+        assert order == ['snapshot', 'plan']
+        assert report.success
+        assert report.results['snapshot'].status == FAILED
+        assert report.results['plan'].status == SUCCESS
+
+    def test_timeout_skips_dependents(self):
+        order = []
+        release = threading.Event()
+        threading.Timer(0.3, release.set).start()
+        report = Pipeline('p', [
+            PipelineStep('trade_sync', lambda: release.wait(5), timeout=0.1),
+            PipelineStep('plan', _recorder(order, 'plan'), depends_on=('trade_sync',)),
+            PipelineStep('sync', _recorder(order, 'sync'), depends_on=('plan',)),
+            PipelineStep('discord', _recorder(order, 'discord')),
+        ]).run()
+        assert order == ['discord']
+        assert report.results['trade_sync'].status == TIMEOUT
+        assert [report.results[n].status for n in ('plan', 'sync')] == [SKIPPED, SKIPPED]
+        assert report.results['sync'].error == 'not run: trade_sync timed out'
+        assert report.success
+
+    def test_waits_for_timed_out_step(self):
+        writes = []
+
+        def slow_write():
+            time.sleep(0.3)
+            writes.append('nav')
+
+        report = Pipeline('p', [
+            PipelineStep('nav', slow_write, critical=True, timeout=0.05),
+            PipelineStep('after', lambda: 1, depends_on=('nav',)),
+        ]).run()
+        assert writes == ['nav']
+        assert report.halted_by == 'nav'
+        assert report.results['nav'].error.startswith("Timed out after 0.05s; finished after")
+        assert report.results['after'].status == SKIPPED
+
+    def test_resume_from_step(self):
+        order = []
+        report = Pipeline('p', [
+            PipelineStep('a', _recorder(order, 'a'), critical=True),
+            PipelineStep('b', _recorder(order, 'b'), depends_on=('a',)),
+            PipelineStep('c', _recorder(order, 'c'), depends_on=('b',)),
+        ]).run(from_step='b')
+        assert order == ['b', 'c']
+        assert report.results['a'].status == SKIPPED
+        assert report.success
+
+    def test_events(self):
+        events = []
+        Pipeline('p', [PipelineStep('a', lambda: 1)],
+                 on_event=lambda e, r: events.append((e, r.name, r.status))).run()
+        assert events == [('start', 'a', 'running'), ('finish', 'a', SUCCESS)]
+
+
+class TestRecordPipelineRun:
+
+    def test_rows_written(self, tmp_path):
+        db_path = tmp_path / "tovito.db"
+        report = Pipeline('daily_nav', [
+            PipelineStep('a', lambda: 1, critical=True),
+            PipelineStep('b', _recorder([], 'b', error=RuntimeError("boom")), depends_on=('a',)),
+        ]).run(run_id='run-1')
+        record_pipeline_run(db_path, report)
+        record_pipeline_run(db_path, report)  # Table already exists
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT run_id, pipeline, step_name, status, critical, duration_ms IS NOT NULL, error "
+            "FROM pipeline_runs ORDER BY id LIMIT 2").fetchall()
+        conn.close()
+        assert rows == [
+            ('run-1', 'daily_nav', 'a', 'success', 1, 1, None),
+            ('run-1', 'daily_nav', 'b', 'failed', 0, 1, 'RuntimeError: boom'),
+        ]
+
+
+class TestDailyNAVPipeline:
+
+    @pytest.fixture
+    def updater(self, tmp_path):
+        from scripts import daily_nav_enhanced as module
+        with patch.object(module, 'LOG_FILE', tmp_path / "daily_runner.log"), \
+                patch.object(module, 'DB_PATH', tmp_path / "tovito.db"), \
+                patch.object(module, 'HEARTBEAT_FILE', tmp_path / "heartbeat.txt"):
+            yield module, module.DailyNAVUpdater()
+
+    def test_graph_declaration(self, updater):
+        module, nav = updater
+        pipeline = nav.build_pipeline()
+        assert pipeline.step_names == module.STEP_NAMES
+        steps = {s.name: s for s in pipeline.steps}
+        assert {n for n, s in steps.items() if s.critical} == {'balance', 'shares', 'nav'}
+        for name in ('holdings_snapshot', 'reconciliation', 'trade_sync', 'discord', 'benchmarks'):
+            assert tuple(steps[name].depends_on) == ('nav',)
+        assert all(s.timeout for s in pipeline.steps)
+
+    def test_balance_failure_fails_fast(self, updater):
+        module, nav = updater
+        with patch.object(nav, 'get_portfolio_balance', return_value=None), \
+                patch.object(nav, 'get_total_shares', return_value=100.0), \
+                patch.object(nav, 'update_nav') as update_nav, \
+                patch.object(nav, 'snapshot_holdings') as snapshot, \
+                patch.object(nav, 'ping_healthcheck') as ping, \
+                patch.object(nav, 'send_failure_alert') as alert:
+            assert nav.run() is False
+        update_nav.assert_not_called()
+        snapshot.assert_not_called()
+        ping.assert_called_once_with("fail")
+        alert.assert_called_once()
+
+        conn = sqlite3.connect(module.DB_PATH)
+        statuses = dict(conn.execute("SELECT step_name, status FROM pipeline_runs"))
+        conn.close()
+        assert statuses['balance'] == 'failed'
+        assert statuses['nav'] == 'skipped'
+
+    def test_successful_run(self, updater):
+        module, nav = updater
+        calls = []
+        with patch.object(nav, 'get_portfolio_balance', return_value=1000.0), \
+                patch.object(nav, 'get_total_shares', return_value=100.0), \
+                patch.object(nav, 'update_nav', return_value=True), \
+                patch.object(nav, 'snapshot_holdings', side_effect=lambda: calls.append('snap')), \
+                patch.object(nav, 'compute_plan_performance', side_effect=lambda: calls.append('plan')), \
+                patch.object(nav, 'run_daily_reconciliation',
+                             side_effect=lambda v, s: calls.append(('recon', v, s))), \
+                patch.object(nav, 'run_trade_sync'), \
+                patch.object(nav, 'step_discord', side_effect=RuntimeError("no webhook")), \
+                patch.object(nav, 'step_benchmarks'), \
+                patch.object(nav, 'step_production_sync'), \
+                patch.object(nav, 'ping_healthcheck') as ping:
+            assert nav.run() is True
+        ping.assert_called_once_with("success")
+        assert calls.index('snap') < calls.index('plan')
+        assert ('recon', 1000.0, 100.0) in calls
+
+    def test_failed_side_steps_recorded(self, updater):
+        module, nav = updater
+        with patch.object(nav, 'get_portfolio_balance', return_value=1000.0), \
+                patch.object(nav, 'get_total_shares', return_value=100.0), \
+                patch.object(nav, 'update_nav', return_value=True), \
+                patch('src.api.brokerage.get_all_brokerage_clients',
+                      side_effect=RuntimeError("no brokerages")), \
+                patch('src.etl.load.run_full_pipeline', side_effect=RuntimeError("ETL down")), \
+                patch.object(nav, 'run_daily_reconciliation'), \
+                patch.object(nav, 'step_discord'), \
+                patch.object(nav, 'step_benchmarks'), \
+                patch.object(nav, 'step_production_sync'), \
+                patch.object(nav, 'ping_healthcheck') as ping:
+            assert nav.run() is True
+        ping.assert_called_once_with("success")
+
+        conn = sqlite3.connect(module.DB_PATH)
+        statuses = dict(conn.execute("SELECT step_name, status FROM pipeline_runs"))
+        conn.close()
+        assert statuses['holdings_snapshot'] == 'failed'
+        assert statuses['plan_performance'] == 'failed'
+        assert statuses['trade_sync'] == 'failed'
+        assert statuses['reconciliation'] == 'success'
@@ -0,0 +1,177 @@
+"""
+Tests for the authenticated principal cache.
+
+Covers:
+- Repeated requests with the same token hit the database once
+- Token expiry and type checks are unchanged (expired tokens never served)
+- Inactive / unknown investors are never cached
+- Explicit invalidation by investor and LRU eviction
+- Metrics counters
+"""
+
+import sys
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from pathlib import Path
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.investor_portal.api.config import settings
+from apps.investor_portal.api.dependencies import (
+    create_access_token,
+    create_refresh_token,
+    get_current_user,
+)
+from apps.investor_portal.api.services.principal_cache import (
+    PrincipalCache,
+    principal_cache,
+)
+
+INVESTOR = {"investor_id": "20260101-01A", "name": "Test Investor", "status": "Active"}
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def _call(token):
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(get_current_user(creds))
+
+
+class TestGetCurrentUserCaching:
+
+    def test_repeated_calls_query_database_once(self):
+        token = create_access_token(INVESTOR["investor_id"], "t@example.com")
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=INVESTOR) as mock_lookup:
+            users = [_call(token) for _ in range(8)]
+
+        assert mock_lookup.call_count == 1
+        assert all(u.investor_id == INVESTOR["investor_id"] for u in users)
+
+    def test_tokens_are_unique(self):
+        a = create_access_token("20260101-01A", "t@example.com")
+        b = create_access_token("20260101-01A", "t@example.com")
+        assert a != b
+
+    def test_expired_token_rejected(self):
+        payload = {
+            "sub": INVESTOR["investor_id"],
+            "email": "t@example.com",
+            "exp": datetime.utcnow() - timedelta(seconds=5),
+            "type": "access",
+        }
+        token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=INVESTOR):
+            with pytest.raises(HTTPException) as exc:
+                _call(token)
+        assert exc.value.status_code == 401
+        assert principal_cache.stats()["size"] == 0
+
+    def test_refresh_token_rejected(self):
+        token = create_refresh_token(INVESTOR["investor_id"])
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=INVESTOR):
+            with pytest.raises(HTTPException) as exc:
+                _call(token)
+        assert exc.value.detail == "Invalid token type"
+
+    def test_inactive_investor_not_cached(self):
+        token = create_access_token(INVESTOR["investor_id"], "t@example.com")
+        inactive = dict(INVESTOR, status="Inactive")
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=inactive) as mock_lookup:
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc:
+                    _call(token)
+                assert exc.value.status_code == 403
+
+        assert mock_lookup.call_count == 2
+
+    def test_invalidation_forces_status_recheck(self):
+        token = create_access_token(INVESTOR["investor_id"], "t@example.com")
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=INVESTOR):
+            _call(token)
+
+        principal_cache.invalidate_investor(INVESTOR["investor_id"])
+
+        closed = dict(INVESTOR, status="Inactive")
+        with patch("apps.investor_portal.api.models.database.get_investor_by_id",
+                   return_value=closed):
+            with pytest.raises(HTTPException) as exc:
+                _call(token)
+        assert exc.value.status_code == 403
+
+
+class TestPrincipalCache:
+
+    def test_entry_expires_after_ttl(self):
+        now = [1000.0]
+        cache = PrincipalCache(ttl_seconds=30, clock=lambda: now[0])
+        cache.put("tok", "inv", "principal")
+
+        now[0] += 29
+        assert cache.get("tok") == "principal"
+        now[0] += 2
+        assert cache.get("tok") is None
+        assert cache.stats()["expired"] == 1
+
+    def test_entry_never_outlives_token(self):
+        now = [1000.0]
+        cache = PrincipalCache(ttl_seconds=30, clock=lambda: now[0])
+        cache.put("tok", "inv", "principal", token_expires_at=1010.0)
+
+        now[0] = 1010.0
+        assert cache.get("tok") is None
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        cache.put("a", "inv-a", 1)
+        cache.put("b", "inv-b", 2)
+        cache.get("a")  # a is now most recent
+        cache.put("c", "inv-c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_investor_drops_all_tokens(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put("t1", "inv", 1)
+        cache.put("t2", "inv", 2)
+        cache.put("t3", "other", 3)
+
+        assert cache.invalidate_investor("inv") == 2
+        assert cache.get("t1") is None
+        assert cache.get("t3") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl_seconds=0)
+        cache.put("tok", "inv", "principal")
+        assert cache.get("tok") is None
+        assert cache.stats()["size"] == 0
+
+    def test_stats_hit_rate(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put("tok", "inv", "p")
+        cache.get("tok")
+        cache.get("tok")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.6667, abs=1e-4)
@@ -0,0 +1,189 @@
+"""
+Tests for the portal rate limiter (services/rate_limit.py).
+
+Covers:
+- Sliding-window budget per key, independent keys and scopes
+- Previous window's weight decays across the boundary
+- Stale keys evicted after two idle windows; max_keys bound
+- SQLite backend shares one budget across backend instances (workers)
+- FastAPI dependency raises 429 with Retry-After
+"""
+
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.investor_portal.api.services.rate_limit import (
+    MemoryBackend,
+    SQLiteBackend,
+    RateLimiter,
+    rate_limit_dependency,
+)
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(1000 * 60)  # Start exactly on a window boundary
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, clock, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(clock=clock)
+    return SQLiteBackend(tmp_path / "rate_limits.db", clock=clock)
+
+
+class TestSlidingWindow:
+
+    def test_allows_up_to_limit(self, backend):
+        limiter = RateLimiter("test", 5, 60, backend=backend)
+        assert all(limiter.hit("10.0.0.1") for _ in range(5))
+        assert limiter.hit("10.0.0.1") is False
+
+    def test_keys_are_independent(self, backend):
+        limiter = RateLimiter("test", 2, 60, backend=backend)
+        limiter.hit("a")
+        limiter.hit("a")
+        assert limiter.hit("a") is False
+        assert limiter.hit("b") is True
+
+    def test_scopes_are_independent(self, backend):
+        login = RateLimiter("login", 1, 60, backend=backend)
+        inquiry = RateLimiter("inquiry", 1, 60, backend=backend)
+        assert login.hit("ip") is True
+        assert inquiry.hit("ip") is True
+        assert login.hit("ip") is False
+
+    def test_previous_window_decays(self, backend, clock):
+        limiter = RateLimiter("test", 4, 60, backend=backend)
+        for _ in range(4):
+            limiter.hit("ip")
+
+        # Just after the boundary the previous window still counts fully
+        clock.now += 60
+        assert limiter.hit("ip") is False
+
+        # Halfway through: estimate = 4 * 0.5 + 0 -> two more allowed
+        clock.now += 30
+        assert limiter.hit("ip") is True
+        assert limiter.hit("ip") is True
+        assert limiter.hit("ip") is False
+
+    def test_budget_resets_after_two_windows(self, backend, clock):
+        limiter = RateLimiter("test", 1, 60, backend=backend)
+        limiter.hit("ip")
+        clock.now += 120
+        assert limiter.hit("ip") is True
+
+    def test_retry_after_reported(self, backend, clock):
+        limiter = RateLimiter("test", 1, 60, backend=backend)
+        limiter.hit("ip")
+        clock.now += 15
+        allowed, retry_after = limiter.check("ip")
+        assert allowed is False
+        assert retry_after == pytest.approx(45)
+
+    def test_stats(self, backend):
+        limiter = RateLimiter("test", 1, 60, backend=backend)
+        limiter.hit("a")
+        limiter.hit("a")
+        limiter.hit("b")
+        stats = limiter.stats()
+        assert stats["allowed"] == 2
+        assert stats["rejected"] == 1
+        assert stats["tracked_keys"] == 2
+
+
+class TestEviction:
+
+    def test_stale_keys_swept(self, clock):
+        backend = MemoryBackend(clock=clock)
+        limiter = RateLimiter("test", 5, 60, backend=backend)
+        for i in range(1000):
+            limiter.hit(f"10.0.{i // 256}.{i % 256}")
+        assert backend.size() == 1000
+
+        clock.now += 120
+        limiter.hit("192.0.2.1")
+        assert backend.size() == 1
+        assert backend.evicted == 1000
+
+    def test_max_keys_bound(self, clock):
+        backend = MemoryBackend(max_keys=100, clock=clock)
+        limiter = RateLimiter("test", 5, 60, backend=backend)
+        for i in range(500):
+            limiter.hit(f"ip-{i}")
+        assert backend.size() <= 100
+
+    def test_sqlite_stale_rows_deleted(self, clock, tmp_path):
+        backend = SQLiteBackend(tmp_path / "rl.db", clock=clock)
+        limiter = RateLimiter("test", 5, 60, backend=backend)
+        for i in range(50):
+            limiter.hit(f"ip-{i}")
+        clock.now += 120
+        limiter.hit("fresh")
+        assert backend.size("test") == 1
+
+
+class TestSharedBackend:
+
+    def test_two_workers_share_one_budget(self, clock, tmp_path):
+        db_path = tmp_path / "shared.db"
+        worker_a = RateLimiter("login", 3, 60, backend=SQLiteBackend(db_path, clock=clock))
+        worker_b = RateLimiter("login", 3, 60, backend=SQLiteBackend(db_path, clock=clock))
+
+        assert worker_a.hit("ip") is True
+        assert worker_b.hit("ip") is True
+        assert worker_a.hit("ip") is True
+        assert worker_b.hit("ip") is False
+
+
+class TestDependency:
+
+    def test_raises_429_when_exhausted(self, clock):
+        limiter = RateLimiter("test", 1, 60, backend=MemoryBackend(clock=clock))
+        dependency = rate_limit_dependency(limiter, "Slow down")
+        request = MagicMock()
+        request.client.host = "198.51.100.7"
+
+        dependency(request)
+        with pytest.raises(HTTPException) as exc:
+            dependency(request)
+
+        assert exc.value.status_code == 429
+        assert exc.value.detail == "Slow down"
+        assert int(exc.value.headers["Retry-After"]) >= 1
+
+    def test_dependency_runs_in_threadpool(self):
+        import inspect
+
+        # A sync dependency is run off the event loop by FastAPI
+        dependency = rate_limit_dependency(RateLimiter("test", 1, 60, backend=MemoryBackend()))
+        assert not inspect.iscoroutinefunction(dependency)
+
+    @pytest.mark.parametrize("module,endpoint", [
+        ("auth", "login"),
+        ("auth", "forgot_password"),
+        ("public", "submit_inquiry"),
+    ])
+    def test_endpoints_declare_limit(self, module, endpoint):
+        import inspect
+        import importlib
+
+        routes = importlib.import_module(f"apps.investor_portal.api.routes.{module}")
+        param = inspect.signature(getattr(routes, endpoint)).parameters["_limit"]
+        assert callable(param.default.dependency)
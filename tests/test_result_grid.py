@@ -0,0 +1,217 @@
+"""
+Tests for the Data Explorer paging and export back end
+(apps/fund_manager/result_grid.py).
+
+Covers:
+- Keyset paging of tables (including gaps in rowid and WITHOUT ROWID)
+- Cursor paging of custom SQL, page cache and re-reading evicted pages
+- Cancelling a running query with Connection.interrupt()
+- Chunked CSV export without fetchall(), cancellation, Parquet export
+- Lazy cell formatting
+"""
+
+import csv
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.fund_manager.result_grid import (
+    QueryCancelled,
+    QueryExport,
+    ResultPager,
+    format_cell,
+)
+
+ROWS = 1050
+
+
+@pytest.fixture
+def trades_db(tmp_path):
+    db_path = tmp_path / "tovito.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE trades (trade_id INTEGER PRIMARY KEY, symbol TEXT, "
+                 "amount REAL, notes TEXT)")
+    conn.executemany("INSERT INTO trades VALUES (?, ?, ?, ?)",
+                     ((i * 3, f"SYM{i % 7}", i * 1.5, None if i % 5 else 'a, "quoted"\nnote')
+                      for i in range(1, ROWS + 1)))
+    conn.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID")
+    conn.executemany("INSERT INTO settings VALUES (?, ?)",
+                     ((f"k{i:03d}", str(i)) for i in range(250)))
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+class _TracingConnect:
+    """connect() that records every statement executed."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, db_path):
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
+class TestKeysetPaging:
+
+    def test_pages_cover_table_in_order(self, trades_db):
+        pager = ResultPager(trades_db, table="trades", page_size=100)
+        seen, index, has_next = [], 0, True
+        while has_next:
+            rows, has_next = pager.page(index)
+            seen.extend(r[0] for r in rows)
+            index += 1
+        pager.close()
+
+        assert index == 11
+        assert seen == [i * 3 for i in range(1, ROWS + 1)]
+        assert pager.columns == ["trade_id", "symbol", "amount", "notes"]
+
+    def test_deep_page_uses_keyset_not_offset(self, trades_db):
+        connect = _TracingConnect()
+        pager = ResultPager(trades_db, table="trades", page_size=100, connect=connect)
+        rows, _ = pager.page(5)  # Walks forward to learn the start key
+        assert rows[0][0] == 501 * 3
+        connect.statements.clear()
+
+        rows, has_next = pager.page(6)
+        pager.close()
+        assert rows[0][0] == 601 * 3
+        assert has_next is True
+        assert len(connect.statements) == 1
+        assert "WHERE rowid > 1800" in connect.statements[0]
+        assert "OFFSET" not in connect.statements[0]
+
+    def test_without_rowid_table_falls_back_to_cursor(self, trades_db):
+        pager = ResultPager(trades_db, table="settings", page_size=100)
+        rows, has_next = pager.page(2)
+        pager.close()
+        assert [r[0] for r in rows] == [f"k{i:03d}" for i in range(200, 250)]
+        assert has_next is False
+
+
+class TestCursorPaging:
+
+    def test_pages_and_has_next(self, trades_db):
+        pager = ResultPager(trades_db, query="SELECT trade_id FROM trades ORDER BY trade_id DESC",
+                            page_size=500)
+        first, more = pager.page(0)
+        last, no_more = pager.page(2)
+        pager.close()
+        assert first[0] == (ROWS * 3,) and more is True
+        assert len(last) == 50 and no_more is False
+
+    def test_exact_multiple_has_no_empty_next_page(self, trades_db):
+        pager = ResultPager(trades_db, query="SELECT * FROM trades LIMIT 200", page_size=100)
+        assert pager.page(0)[1] is True
+        assert pager.page(1)[1] is False
+        pager.close()
+
+    def test_evicted_page_reread(self, trades_db):
+        connect = _TracingConnect()
+        pager = ResultPager(trades_db, query="SELECT trade_id FROM trades",
+                            page_size=100, max_cached_pages=2, connect=connect)
+        for index in range(4):
+            pager.page(index)
+        runs = sum("FROM trades" in s for s in connect.statements)
+
+        assert pager.page(3)[0][0] == (301 * 3,)  # Cached: no re-run
+        assert sum("FROM trades" in s for s in connect.statements) == runs
+        assert pager.page(0)[0][0] == (3,)        # Evicted: query re-run
+        assert sum("FROM trades" in s for s in connect.statements) == runs + 1
+        pager.close()
+
+    def test_invalid_sql_raises(self, trades_db):
+        pager = ResultPager(trades_db, query="SELECT * FROM missing_table")
+        with pytest.raises(sqlite3.OperationalError):
+            pager.page(0)
+        pager.close()
+
+    def test_read_only(self, trades_db):
+        pager = ResultPager(trades_db, query="DELETE FROM trades")
+        with pytest.raises(sqlite3.OperationalError):
+            pager.page(0)
+        pager.close()
+
+    def test_cancel_interrupts_running_query(self, trades_db):
+        pager = ResultPager(trades_db, query="""
+            WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n)
+            SELECT MAX(x) FROM n
+        """)
+        outcome = {}
+
+        def run():
+            try:
+                pager.page(0)
+            except QueryCancelled:
+                outcome["cancelled"] = True
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(0.2)
+        pager.cancel()
+        thread.join(5)
+        pager.close()
+        assert outcome == {"cancelled": True}
+
+
+class TestQueryExport:
+
+    def test_csv_streams_in_chunks(self, trades_db, tmp_path):
+        path = tmp_path / "trades.csv"
+        progress = []
+        export = QueryExport(trades_db, "SELECT * FROM trades", str(path),
+                             chunk_rows=200, progress=progress.append)
+        result = export.run()
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert result["rows"] == ROWS
+        assert rows[0] == ["trade_id", "symbol", "amount", "notes"]
+        assert len(rows) == ROWS + 1
+        assert rows[5][3] == 'a, "quoted"\nnote'
+        assert rows[1][3] == ""
+        assert progress[:3] == [200, 400, 600]
+        assert not Path(str(path) + ".part").exists()
+
+    def test_cancelled_export_leaves_no_file(self, trades_db, tmp_path):
+        path = tmp_path / "trades.csv"
+        export = QueryExport(trades_db, "SELECT * FROM trades", str(path), chunk_rows=100)
+        export.progress = lambda rows: export.cancel() if rows >= 300 else None
+
+        with pytest.raises(QueryCancelled):
+            export.run()
+        assert list(tmp_path.glob("trades.csv*")) == []
+
+    def test_unknown_format_rejected(self, trades_db, tmp_path):
+        with pytest.raises(ValueError):
+            QueryExport(trades_db, "SELECT 1", str(tmp_path / "out.xlsx"))
+
+    def test_parquet_round_trip(self, trades_db, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "trades.parquet"
+        result = QueryExport(trades_db, "SELECT * FROM trades", str(path), chunk_rows=300).run()
+
+        table = pq.read_table(path)
+        assert result["rows"] == table.num_rows == ROWS
+        assert table.column("trade_id").to_pylist()[:2] == [3, 6]
+
+
+class TestFormatCell:
+
+    @pytest.mark.parametrize("value,expected", [
+        (None, "NULL"),
+        (1.23456789, "1.2346"),
+        (42, "42"),
+        ("x" * 80, "x" * 50),
+    ])
+    def test_format(self, value, expected):
+        assert format_cell(value) == expected
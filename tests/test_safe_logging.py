@@ -0,0 +1,169 @@
+"""
+Tests for the PII sanitizer and SafeLogger (src/utils/safe_logging.py).
+
+Covers:
+- Single-pass sanitize_message() matches the old four-pass output
+- Memoized sensitive-key lookup in mask_dict()
+- Lazy formatting: filtered levels are never sanitized
+- Async QueueHandler pipeline: records written, drained and restored
+"""
+
+import re
+import sys
+import logging
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import safe_logging
+from src.utils.safe_logging import (
+    PIIProtector,
+    SafeLogger,
+    enable_async_logging,
+    disable_async_logging,
+)
+
+
+def _four_pass(message):
+    """The sanitizer before it was combined into one pass."""
+    message = re.sub(r'\$[\d,]+\.?\d*', "$***", message)
+    message = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "***@***.com", message)
+    message = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "***-***-****", message)
+    return re.sub(r'(sk_|pk_|api_)[a-zA-Z0-9]{20,}', "***_KEY", message)
+
+
+@pytest.fixture
+def safe_logger(tmp_path):
+    """A SafeLogger with a file handler and a unique logger name."""
+    name = f"test_safe_logging.{tmp_path.name}"
+    log_file = tmp_path / "logs" / "app.log"
+    safe = SafeLogger(name, log_file=str(log_file))
+    safe.logger.propagate = False
+    yield safe, log_file
+    disable_async_logging()
+    for handler in list(safe.logger.handlers):
+        safe.logger.removeHandler(handler)
+        handler.close()
+
+
+class TestSanitizeMessage:
+
+    @pytest.mark.parametrize("message,expected", [
+        ("Processed $5,000.00 for john.doe@example.com (phone: 555-123-4567)",
+         "Processed $*** for ***@***.com (phone: ***-***-****)"),
+        ("key sk_abcdefghijklmnopqrstuvwxyz used", "key ***_KEY used"),
+        ("Daily NAV update completed", "Daily NAV update completed"),
+        ("555-123-4567@example.com", "***@***.com"),
+        ("paid $12ab@y.com", "paid $******@***.com"),
+    ])
+    def test_masks(self, message, expected):
+        assert PIIProtector.sanitize_message(message) == expected
+
+    def test_matches_four_pass_output(self):
+        rng = random.Random(7)
+        alphabet = "ab_@.$,-0123456789 skpi"
+        fragments = ["$1,234.50", "a.b@example.com", "555.123.4567", "sk_",
+                     "api_" + "x" * 22, "5551234567", "$12ab@y.com", " "]
+        for _ in range(20000):
+            parts = [rng.choice(fragments) if rng.random() < 0.5
+                     else ''.join(rng.choices(alphabet, k=rng.randint(1, 8)))
+                     for _ in range(rng.randint(1, 6))]
+            message = ''.join(parts)
+            assert PIIProtector.sanitize_message(message) == _four_pass(message), message
+
+    def test_plain_line_skips_regex(self):
+        message = "Heartbeat ok"
+        assert PIIProtector._combined_pattern((False,) * 4) is None
+        assert PIIProtector.sanitize_message(message) is message
+
+
+class TestMaskDict:
+
+    def test_masks_nested_values(self):
+        masked = PIIProtector.mask_dict({
+            "Investor_Name": "John Doe", "shares": 10,
+            "details": {"bank_account_number": "123456789", "status": "ok"},
+        })
+        assert masked == {"Investor_Name": "**** Doe", "shares": 10,
+                          "details": {"bank_account_number": "*****6789", "status": "ok"}}
+
+    def test_key_lookup_memoized(self):
+        PIIProtector.is_sensitive_key.cache_clear()
+        for _ in range(50):
+            PIIProtector.mask_dict({"amount": 1, "trade_id": "T1"})
+        info = PIIProtector.is_sensitive_key.cache_info()
+        assert info.misses == 2
+        assert info.hits == 98
+
+
+class TestLazyFormatting:
+
+    def test_filtered_level_not_sanitized(self, safe_logger):
+        safe, _ = safe_logger
+        for handler in safe.logger.handlers:
+            handler.setLevel(logging.INFO)
+        with patch.object(PIIProtector, "sanitize_message",
+                          side_effect=AssertionError("sanitized")):
+            safe.debug("Processed $5,000.00", amount=5000)
+
+    def test_disabled_logger_creates_no_record(self, safe_logger):
+        safe, _ = safe_logger
+        safe.logger.setLevel(logging.WARNING)
+        with patch.object(safe.logger, "handle") as handle:
+            safe.info("ignored")
+        handle.assert_not_called()
+
+    def test_emitted_line_is_sanitized(self, safe_logger):
+        safe, log_file = safe_logger
+        safe.info("Processed $5,000.00", email="john@example.com", shares=4750)
+        for handler in safe.logger.handlers:
+            handler.flush()
+        line = log_file.read_text()
+        assert "Processed $*** | email=************.com | shares=4750" in line
+        assert "john@" not in line
+
+
+class TestAsyncPipeline:
+
+    def test_records_written_after_drain(self, safe_logger):
+        safe, log_file = safe_logger
+        pipeline = enable_async_logging()
+        assert any(isinstance(h, safe_logging._SafeQueueHandler) for h in safe.logger.handlers)
+
+        for i in range(200):
+            safe.info(f"Processed ${i}.00", investor_name="John Doe")
+        safe.debug("debug goes to the file only")
+        disable_async_logging()
+
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 201
+        assert all("John" not in line for line in lines)
+        assert pipeline.stats()["dropped"] == 0
+        # Synchronous handlers restored
+        assert not any(isinstance(h, safe_logging._SafeQueueHandler)
+                       for h in safe.logger.handlers)
+        assert any(isinstance(h, logging.FileHandler) for h in safe.logger.handlers)
+
+    def test_full_queue_drops_and_counts(self, safe_logger):
+        safe, _ = safe_logger
+        pipeline = enable_async_logging(max_queue=1)
+        pipeline.listener.stop()  # Nothing drains the queue
+        for _ in range(5):
+            safe.info("burst")
+        assert pipeline.stats()["dropped"] == 4
+        disable_async_logging()
+
+    def test_new_logger_attached_when_enabled(self, tmp_path):
+        enable_async_logging()
+        safe = SafeLogger(f"test_safe_logging.late.{tmp_path.name}")
+        try:
+            assert [type(h) for h in safe.logger.handlers] == [safe_logging._SafeQueueHandler]
+        finally:
+            disable_async_logging()
+            for handler in list(safe.logger.handlers):
+                safe.logger.removeHandler(handler)
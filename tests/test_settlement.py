@@ -0,0 +1,351 @@
+"""
+Tests for batch settlement (src/automation/settlement.py).
+
+Covers:
+- NAV resolution for many dates in one query, with the old fallbacks
+- Fund flow plans match the single-request share and gain math
+- Several flows for one investor build on each other
+- Plans with errors, and stale plans, write nothing
+- Quarterly tax settlement of realized-gain tax events
+"""
+
+import sqlite3
+import sys
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.automation.settlement import (
+    apply_plan,
+    format_plan,
+    plan_fund_flows,
+    plan_quarterly_tax,
+    quarter_dates,
+    resolve_navs,
+)
+
+# tax_events and system_logs as the fund flow scripts write them
+TAX_EVENTS_TABLE = """
+    CREATE TABLE tax_events (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        investor_id TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        withdrawal_amount REAL NOT NULL,
+        realized_gain REAL NOT NULL,
+        tax_rate REAL NOT NULL,
+        tax_due REAL NOT NULL,
+        net_proceeds REAL NOT NULL,
+        reference_id TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    )
+"""
+
+SYSTEM_LOGS_TABLE = """
+    CREATE TABLE system_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        level TEXT NOT NULL,
+        category TEXT NOT NULL,
+        message TEXT NOT NULL,
+        details TEXT
+    )
+"""
+
+
+@pytest.fixture
+def conn(tmp_path):
+    from src.database.schema_v2 import (
+        DAILY_NAV_TABLE, FUND_FLOW_REQUESTS_TABLE, INVESTORS_TABLE, TRANSACTIONS_TABLE,
+    )
+
+    conn = sqlite3.connect(str(tmp_path / "settlement.db"))
+    for ddl in (INVESTORS_TABLE, TRANSACTIONS_TABLE, DAILY_NAV_TABLE,
+                FUND_FLOW_REQUESTS_TABLE, TAX_EVENTS_TABLE, SYSTEM_LOGS_TABLE):
+        conn.execute(ddl)
+    for day, nav in (('2026-01-02', 1.0), ('2026-02-13', 1.25), ('2026-03-31', 1.5)):
+        conn.execute("""
+            INSERT INTO daily_nav (date, total_portfolio_value, total_shares, nav_per_share)
+            VALUES (?, ?, 30000, ?)
+        """, (day, 30000 * nav, nav))
+    add_investor(conn, '20260101-01A', 'Alice', 10000.0, 10000.0)
+    add_investor(conn, '20260101-02A', 'Bob', 20000.0, 18000.0)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def add_investor(conn, investor_id, name, shares, invested):
+    conn.execute("""
+        INSERT INTO investors (investor_id, name, email, current_shares, net_investment,
+                               initial_capital, join_date)
+        VALUES (?, ?, ?, ?, ?, ?, '2026-01-01')
+    """, (investor_id, name, f"{name.lower()}@example.com", shares, invested, invested))
+
+
+def add_request(conn, investor_id, flow_type, amount, matched_date, request_date='2026-02-01'):
+    cursor = conn.execute("""
+        INSERT INTO fund_flow_requests (investor_id, flow_type, requested_amount,
+                                        request_date, status, matched_date)
+        VALUES (?, ?, ?, ?, 'matched', ?)
+    """, (investor_id, flow_type, amount, request_date, matched_date))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def add_gain(conn, investor_id, day, gain, tax_due=0.0):
+    conn.execute("""
+        INSERT INTO tax_events (date, investor_id, event_type, withdrawal_amount,
+                                realized_gain, tax_rate, tax_due, net_proceeds)
+        VALUES (?, ?, 'Realized_Gain', ?, ?, 0.37, ?, ?)
+    """, (day, investor_id, gain * 3, gain, tax_due, gain * 3))
+    conn.commit()
+
+
+def investor(conn, investor_id):
+    return conn.execute(
+        "SELECT current_shares, net_investment FROM investors WHERE investor_id = ?",
+        (investor_id,)).fetchone()
+
+
+def count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestResolveNavs:
+
+    def test_fallbacks(self, conn):
+        navs = resolve_navs(conn, ['2026-02-13', '2026-02-20', '2025-12-31', '2027-01-01'])
+
+        assert navs['2026-02-13'] == ('2026-02-13', Decimal('1.25'))
+        assert navs['2026-02-20'] == ('2026-02-13', Decimal('1.25'))
+        assert navs['2027-01-01'] == ('2026-03-31', Decimal('1.5'))
+        # Before the first NAV: the most recent NAV
+        assert navs['2025-12-31'] == ('2026-03-31', Decimal('1.5'))
+
+    def test_one_query(self, conn):
+        statements = []
+        conn.set_trace_callback(statements.append)
+        navs = resolve_navs(conn, [f"2026-02-{day:02d}" for day in range(1, 29)])
+        conn.set_trace_callback(None)
+
+        assert len(navs) == 28
+        assert len(statements) == 1
+
+    def test_no_nav(self, conn):
+        conn.execute("DELETE FROM daily_nav")
+        assert resolve_navs(conn, ['2026-02-13']) == {}
+        assert resolve_navs(conn, []) == {}
+
+
+class TestPlanFundFlows:
+
+    def test_contribution(self, conn):
+        request_id = add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13T10:00:00')
+
+        item, = plan_fund_flows(conn).items
+
+        assert item.request_id == request_id
+        assert item.nav_per_share == Decimal('1.25')
+        assert item.shares_transacted == Decimal('4000.0000')
+        assert item.shares_after == Decimal('14000.0000')
+        assert item.net_investment_after == Decimal('15000.0')
+
+    def test_withdrawal(self, conn):
+        add_request(conn, '20260101-01A', 'withdrawal', 5000.0, '2026-03-31')
+
+        item, = plan_fund_flows(conn).items
+
+        # value 15,000 on 10,000 invested: a third of the 5,000 gain is realized
+        assert item.shares_transacted == Decimal('3333.3333')
+        assert item.realized_gain == Decimal('1666.67')
+        assert item.shares_after == Decimal('6666.6667')
+        assert item.net_investment_after == Decimal('6666.67')
+
+    def test_flows_for_one_investor_chain(self, conn):
+        add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13', '2026-02-01')
+        add_request(conn, '20260101-01A', 'withdrawal', 21000.0, '2026-03-31', '2026-02-02')
+
+        contribution, withdrawal = plan_fund_flows(conn).items
+
+        assert withdrawal.shares_before == contribution.shares_after == Decimal('14000.0000')
+        assert withdrawal.net_investment_before == Decimal('15000.0')
+        assert withdrawal.shares_after == Decimal('0.0000')
+        assert withdrawal.realized_gain == Decimal('6000.00')
+
+    def test_over_withdrawal_is_an_error(self, conn):
+        add_request(conn, '20260101-01A', 'withdrawal', 20000.0, '2026-03-31')
+
+        plan = plan_fund_flows(conn)
+
+        assert len(plan.errors) == 1
+        assert "exceeds current value $15,000.00" in plan.errors[0]
+        assert "ERRORS" in format_plan(plan)
+
+    def test_selected_requests(self, conn):
+        first = add_request(conn, '20260101-01A', 'contribution', 100.0, '2026-02-13')
+        add_request(conn, '20260101-02A', 'contribution', 100.0, '2026-02-13')
+
+        assert [i.request_id for i in plan_fund_flows(conn, [first]).items] == [first]
+        assert plan_fund_flows(conn, []).items == []
+
+    def test_two_queries_for_any_batch(self, conn):
+        for day in range(1, 29):
+            add_request(conn, '20260101-02A', 'contribution', 100.0 + day, f"2026-02-{day:02d}")
+        statements = []
+        conn.set_trace_callback(statements.append)
+        plan = plan_fund_flows(conn)
+        conn.set_trace_callback(None)
+
+        assert len(plan.items) == 28
+        assert len(statements) == 2
+
+
+class TestApplyFundFlows:
+
+    def test_applies_batch(self, conn):
+        contribution = add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13')
+        withdrawal = add_request(conn, '20260101-02A', 'withdrawal', 3000.0, '2026-03-31')
+
+        plan = apply_plan(conn, plan_fund_flows(conn))
+
+        assert investor(conn, '20260101-01A') == (14000.0, 15000.0)
+        assert investor(conn, '20260101-02A') == (18000.0, 16200.0)
+
+        rows = conn.execute("""
+            SELECT request_id, status, transaction_id, shares_transacted, realized_gain
+            FROM fund_flow_requests ORDER BY request_id
+        """).fetchall()
+        assert rows == [
+            (contribution, 'processed', plan.items[0].transaction_id, 4000.0, 0.0),
+            (withdrawal, 'processed', plan.items[1].transaction_id, 2000.0, 1200.0),
+        ]
+        assert conn.execute("""
+            SELECT transaction_type, amount, shares_transacted, reference_id FROM transactions
+            ORDER BY transaction_id
+        """).fetchall() == [
+            ('Contribution', 5000.0, 4000.0, f"ffr-{contribution}"),
+            ('Withdrawal', -3000.0, -2000.0, f"ffr-{withdrawal}"),
+        ]
+        assert conn.execute(
+            "SELECT investor_id, realized_gain, tax_due FROM tax_events").fetchall() == [
+            ('20260101-02A', 1200.0, 0.0)]
+        assert count(conn, 'system_logs') == 2
+
+    def test_plan_with_errors_writes_nothing(self, conn):
+        add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13')
+        add_request(conn, '20260101-02A', 'withdrawal', 99000.0, '2026-03-31')
+
+        with pytest.raises(ValueError, match="error"):
+            apply_plan(conn, plan_fund_flows(conn))
+
+        assert count(conn, 'transactions') == 0
+        assert investor(conn, '20260101-01A') == (10000.0, 10000.0)
+
+    def test_stale_plan_rolls_back(self, conn):
+        add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13')
+        add_request(conn, '20260101-02A', 'contribution', 5000.0, '2026-02-13')
+        plan = plan_fund_flows(conn)
+        conn.execute("UPDATE investors SET current_shares = 19000 WHERE investor_id = '20260101-02A'")
+        conn.commit()
+
+        with pytest.raises(ValueError, match="out of date"):
+            apply_plan(conn, plan)
+
+        assert investor(conn, '20260101-01A') == (10000.0, 10000.0)
+        assert count(conn, 'transactions') == 0
+        assert all(item.transaction_id is None for item in plan.items)
+
+    def test_applying_twice_fails(self, conn):
+        add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13')
+        plan = plan_fund_flows(conn)
+        apply_plan(conn, plan)
+
+        with pytest.raises(ValueError, match="out of date"):
+            apply_plan(conn, plan)
+        assert count(conn, 'transactions') == 1
+
+    def test_format_plan_shows_changes(self, conn):
+        add_request(conn, '20260101-01A', 'contribution', 5000.0, '2026-02-13')
+
+        text = format_plan(plan_fund_flows(conn))
+
+        assert "Alice (20260101-01A)" in text
+        assert "10,000.0000 -> 14,000.0000  (+4,000.0000)" in text
+        assert "$10,000.00 -> $15,000.00  (+5,000.00)" in text
+
+
+class TestQuarterlyTax:
+
+    def test_quarter_dates(self):
+        assert quarter_dates(2026, 1) == ('2026-01-01', '2026-03-31')
+        assert quarter_dates(2026, 4) == ('2026-10-01', '2026-12-31')
+        with pytest.raises(ValueError):
+            quarter_dates(2026, 5)
+
+    def test_plan(self, conn):
+        add_gain(conn, '20260101-01A', '2026-02-10', 1000.01)
+        add_gain(conn, '20260101-01A', '2026-03-15', 500.0)
+        add_gain(conn, '20260101-02A', '2026-04-01', 900.0)                  # Next quarter
+        add_gain(conn, '20260101-02A', '2026-01-20', 300.0, tax_due=111.0)   # Already settled
+
+        plan = plan_quarterly_tax(conn, 2026, 1, settle_date='2026-04-15')
+
+        item, = plan.items
+        expected_tax = sum((Decimal(g) * Decimal('0.37')).quantize(Decimal('0.01'), ROUND_HALF_UP)
+                           for g in ('1000.01', '500.0'))
+        assert item.amount == expected_tax == Decimal('555.00')
+        assert item.realized_gain == Decimal('1500.01')
+        assert plan.nav_date == '2026-03-31'
+        assert item.shares_transacted == Decimal('370.0000')
+        assert item.shares_after == Decimal('9630.0000')
+
+    def test_apply(self, conn):
+        add_gain(conn, '20260101-01A', '2026-02-10', 1000.0)
+        add_gain(conn, '20260101-02A', '2026-03-10', 2000.0)
+
+        apply_plan(conn, plan_quarterly_tax(conn, 2026, 1, settle_date='2026-04-15'))
+
+        assert investor(conn, '20260101-01A')[0] == pytest.approx(10000 - 246.6667)
+        assert investor(conn, '20260101-02A')[0] == pytest.approx(20000 - 493.3333)
+        assert conn.execute("SELECT tax_due FROM tax_events ORDER BY event_id").fetchall() == [
+            (370.0,), (740.0,)]
+        assert conn.execute("""
+            SELECT transaction_type, amount, reference_id FROM transactions ORDER BY transaction_id
+        """).fetchall() == [
+            ('Tax_Payment', -370.0, 'tax-2026-Q1'),
+            ('Tax_Payment', -740.0, 'tax-2026-Q1'),
+        ]
+        assert conn.execute("""
+            SELECT total_portfolio_value, total_shares FROM daily_nav WHERE date = '2026-03-31'
+        """).fetchone() == (45000.0 - 1110.0, 30000.0 - 740.0)
+
+        # Settled events are not taxed again
+        assert plan_quarterly_tax(conn, 2026, 1, settle_date='2026-04-15').items == []
+
+    def test_closed_account_must_be_acknowledged(self, conn):
+        add_investor(conn, '20260101-03A', 'Carol', 0.0, 0.0)
+        add_gain(conn, '20260101-03A', '2026-02-10', 1000.0)
+        add_gain(conn, '20260101-01A', '2026-02-10', 1000.0)
+
+        plan = plan_quarterly_tax(conn, 2026, 1, settle_date='2026-04-15')
+
+        assert [i.investor_id for i in plan.items] == ['20260101-01A']
+        assert [i.investor_id for i, _ in plan.skipped] == ['20260101-03A']
+        assert plan.errors == ["20260101-03A: not settled, only 0.0000 shares to pay $370.00"]
+        with pytest.raises(ValueError, match="error"):
+            apply_plan(conn, plan)
+        assert count(conn, 'transactions') == 0
+
+        plan.acknowledge_skipped()
+        assert "SKIPPED (acknowledged" in format_plan(plan)
+        apply_plan(conn, plan)
+
+        assert count(conn, 'transactions') == 1
+        assert conn.execute(
+            "SELECT tax_due FROM tax_events WHERE investor_id = '20260101-03A'").fetchone() == (0.0,)
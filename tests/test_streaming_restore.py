@@ -0,0 +1,269 @@
+"""
+Tests for the Streaming Restore Pipeline
+========================================
+Tests chunked encryption/decryption, the staged restore (checksum,
+integrity check, atomic swap), and concurrent --verify-only checks.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from scripts.utilities import backup_database
+from scripts.utilities.backup_database import (
+    DatabaseBackup,
+    ENCRYPTION_MAGIC,
+    _decrypt_file,
+    _decrypt_file_to,
+    _derive_key_from_passphrase,
+    _encrypt_file,
+)
+from scripts.utilities.restore_database import DatabaseRestore
+
+SALT = b"0123456789abcdef"
+PASSPHRASE = "test-passphrase-123"
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _make_db(path, rows):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.executemany("INSERT INTO test VALUES (?, ?)", ((i, f"v{i}") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def _count(path):
+    conn = sqlite3.connect(str(path))
+    n = conn.execute("SELECT COUNT(*) FROM test").fetchone()[0]
+    conn.close()
+    return n
+
+
+@pytest.fixture
+def restore_env(tmp_path):
+    """A live database, a backup with more rows, and managers on temp paths."""
+    db_path = tmp_path / "data" / "tovito.db"
+    db_path.parent.mkdir(parents=True)
+    _make_db(db_path, 10)
+
+    backup_dir = tmp_path / "data" / "backups"
+    backup_dir.mkdir()
+    source = tmp_path / "source.db"
+    _make_db(source, 500)
+
+    backup = DatabaseBackup()
+    backup.db_path = str(source)
+    backup.backup_dir = str(backup_dir)
+
+    restorer = DatabaseRestore()
+    restorer.db_path = str(db_path)
+    restorer.backup_dir = str(backup_dir)
+
+    return {
+        "backup": backup,
+        "restorer": restorer,
+        "db_path": db_path,
+        "backup_dir": backup_dir,
+        "tmp_path": tmp_path,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Chunked encryption
+# ---------------------------------------------------------------------------
+
+class TestChunkedEncryption:
+    """Test the chunked Fernet format written by _encrypt_file()."""
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self):
+        with patch.object(backup_database, "ENCRYPTION_CHUNK_BYTES", 1000):
+            yield
+
+    def test_round_trip_multiple_chunks(self, tmp_path):
+        plain = tmp_path / "plain"
+        plain.write_bytes(os.urandom(4500))
+        enc = tmp_path / "plain.enc"
+        _encrypt_file(str(plain), str(enc), PASSPHRASE, SALT)
+
+        assert enc.read_bytes().startswith(ENCRYPTION_MAGIC)
+        assert _decrypt_file(str(enc), PASSPHRASE, SALT) == plain.read_bytes()
+
+    def test_empty_file_round_trip(self, tmp_path):
+        plain = tmp_path / "empty"
+        plain.write_bytes(b"")
+        enc = tmp_path / "empty.enc"
+        _encrypt_file(str(plain), str(enc), PASSPHRASE, SALT)
+        assert _decrypt_file(str(enc), PASSPHRASE, SALT) == b""
+
+    def test_legacy_single_token_still_decrypts(self, tmp_path):
+        enc = tmp_path / "legacy.enc"
+        fernet = Fernet(_derive_key_from_passphrase(PASSPHRASE, SALT))
+        enc.write_bytes(fernet.encrypt(b"SECRET_KEY=abc\n"))
+        assert _decrypt_file(str(enc), PASSPHRASE, SALT) == b"SECRET_KEY=abc\n"
+
+    def test_truncated_file_rejected(self, tmp_path):
+        plain = tmp_path / "plain"
+        plain.write_bytes(os.urandom(4500))
+        enc = tmp_path / "plain.enc"
+        _encrypt_file(str(plain), str(enc), PASSPHRASE, SALT)
+
+        # Drop the final chunk: every remaining token is still authentic
+        data = enc.read_bytes()
+        offset, last = len(ENCRYPTION_MAGIC), None
+        while offset < len(data):
+            last = offset
+            offset += 4 + int.from_bytes(data[offset:offset + 4], "big")
+        enc.write_bytes(data[:last])
+
+        with pytest.raises(InvalidToken):
+            _decrypt_file(str(enc), PASSPHRASE, SALT)
+
+    def test_wrong_passphrase_leaves_no_output(self, tmp_path):
+        plain = tmp_path / "plain"
+        plain.write_bytes(b"x" * 3000)
+        enc = tmp_path / "plain.enc"
+        _encrypt_file(str(plain), str(enc), PASSPHRASE, SALT)
+
+        dest = tmp_path / "out"
+        with pytest.raises(InvalidToken):
+            _decrypt_file_to(str(enc), str(dest), "wrong", SALT)
+        assert sorted(tmp_path.iterdir()) == sorted([plain, enc])
+
+    def test_decrypt_to_reports_hash(self, tmp_path):
+        import hashlib
+
+        plain = tmp_path / "plain"
+        plain.write_bytes(os.urandom(2500))
+        enc = tmp_path / "plain.enc"
+        _encrypt_file(str(plain), str(enc), PASSPHRASE, SALT)
+
+        dest = tmp_path / "out"
+        result = _decrypt_file_to(str(enc), str(dest), PASSPHRASE, SALT)
+        assert dest.read_bytes() == plain.read_bytes()
+        assert result["size_bytes"] == 2500
+        assert result["sha256"] == hashlib.sha256(plain.read_bytes()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Staged restore
+# ---------------------------------------------------------------------------
+
+class TestStreamingRestore:
+    """Test restore_database() staging, verification and swap."""
+
+    def test_restore_reports_throughput(self, restore_env):
+        backup_path = restore_env["backup"].create_backup()["backup_path"]
+        result = restore_env["restorer"].restore_database(backup_path)
+
+        assert result["status"] == "success"
+        assert _count(restore_env["db_path"]) == 500
+        assert result["size_bytes"] == os.path.getsize(backup_path)
+        assert result["throughput_mb_s"] > 0
+
+    def test_safety_backup_is_of_target(self, restore_env):
+        backup_path = restore_env["backup"].create_backup()["backup_path"]
+        result = restore_env["restorer"].restore_database(backup_path)
+
+        safety = Path(result["safety_backup_path"])
+        assert safety.parent == restore_env["backup_dir"]
+        assert safety.name.endswith("_pre_restore.db")
+        assert _count(safety) == 10
+
+    def test_stale_sidecar_files_removed(self, restore_env):
+        backup_path = restore_env["backup"].create_backup()["backup_path"]
+        wal = Path(str(restore_env["db_path"]) + "-wal")
+        wal.write_bytes(b"stale")
+
+        result = restore_env["restorer"].restore_database(backup_path)
+        assert result["status"] == "success"
+        assert not wal.exists()
+
+    def test_corrupted_backup_leaves_target_untouched(self, restore_env):
+        bad = restore_env["tmp_path"] / "bad.db"
+        bad.write_bytes(b"not a database" * 100)
+
+        result = restore_env["restorer"].restore_database(str(bad))
+
+        assert result["status"] == "error"
+        assert _count(restore_env["db_path"]) == 10
+        leftovers = [p for p in restore_env["db_path"].parent.iterdir()
+                     if p.name.startswith(".restore_")]
+        assert leftovers == []
+
+    def test_full_backup_checksum_mismatch_aborts(self, restore_env):
+        backup = restore_env["backup"]
+        backup_dir = Path(backup.create_full_backup()["backup_dir"])
+        manifest_path = backup_dir / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["files"][0]["sha256"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest))
+
+        result = restore_env["restorer"].restore_database(str(backup_dir))
+
+        assert result["status"] == "error"
+        assert "checksum" in result["error"].lower()
+        assert _count(restore_env["db_path"]) == 10
+
+    def test_full_backup_checksum_verified(self, restore_env):
+        backup_dir = restore_env["backup"].create_full_backup()["backup_dir"]
+        result = restore_env["restorer"].restore_database(backup_dir)
+
+        manifest = json.loads((Path(backup_dir) / "manifest.json").read_text())
+        assert result["status"] == "success"
+        assert result["sha256"] == manifest["files"][0]["sha256"]
+
+
+# ---------------------------------------------------------------------------
+# Verify-only mode
+# ---------------------------------------------------------------------------
+
+class TestVerifyAll:
+    """Test verify_all_backups() across every backup type."""
+
+    def test_all_types_verified(self, restore_env):
+        backup = restore_env["backup"]
+        backup.create_backup()
+        backup.create_full_backup()
+        backup.create_incremental_backup()
+
+        result = restore_env["restorer"].verify_all_backups(workers=3)
+
+        assert result["status"] == "ok"
+        assert result["checked"] == 3
+        assert {r["type"] for r in result["results"]} == {"simple", "full", "incremental"}
+        assert result["bytes_verified"] > 0
+        assert result["throughput_mb_s"] > 0
+
+    def test_corrupted_backup_reported(self, restore_env):
+        backup = restore_env["backup"]
+        backup.create_backup()
+        (restore_env["backup_dir"] / "tovito_backup_2000-01-01_000000.db").write_bytes(
+            b"garbage" * 500
+        )
+
+        result = restore_env["restorer"].verify_all_backups()
+
+        assert result["status"] == "corrupted"
+        assert result["failed"] == 1
+        failed = [r for r in result["results"] if r["status"] != "ok"]
+        assert failed[0]["filename"] == "tovito_backup_2000-01-01_000000.db"
+
+    def test_empty_directory(self, restore_env):
+        result = restore_env["restorer"].verify_all_backups()
+        assert result["status"] == "ok"
+        assert result["checked"] == 0
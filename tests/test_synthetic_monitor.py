@@ -555,3 +555,294 @@ class TestMakeResult:
 
         assert result['status'] == 'fail'
         assert result['error'] == 'Something broke'
+
+
+# ============================================================
+# Concurrent Runner Tests
+# ============================================================
+
+def _timed_check(name, log, delay=0.1, status='pass', details=None):
+    """Build a fake check that sleeps, records start/end, and passes."""
+    import time as _time
+
+    def check(*args):
+        log.append((name, 'start', _time.perf_counter(), args))
+        _time.sleep(delay)
+        log.append((name, 'end', _time.perf_counter(), args))
+        return SyntheticMonitor._make_result(name, status, delay * 1000, details=details)
+    return check
+
+
+class TestConcurrentRunner:
+    """Tests for run_all_checks_async() scheduling."""
+
+    def _patch_checks(self, monitor, log, delay=0.1):
+        monitor.check_health_endpoint = _timed_check('health', log, delay)
+        monitor.check_public_teaser = _timed_check('teaser', log, delay)
+        monitor.check_frontend_accessible = _timed_check('frontend', log, delay)
+        monitor.check_admin_endpoint = _timed_check('admin', log, delay)
+        monitor.check_login_flow = _timed_check(
+            'login', log, delay, details={'access_token': 'tok-123'}
+        )
+        monitor.check_nav_freshness = _timed_check('nav', log, delay)
+        monitor.check_authenticated_endpoints = _timed_check('auth', log, delay)
+
+    def test_independent_checks_overlap(self, monitor):
+        """Seven 100ms checks finish in about two rounds, not seven."""
+        log = []
+        monitor.repeat = 1
+        self._patch_checks(monitor, log)
+
+        results = monitor.run_all_checks()
+
+        assert results['overall_status'] == 'pass'
+        assert results['checks_passed'] == 7
+        assert results['wall_time_ms'] < 500
+        assert results['total_response_time_ms'] == pytest.approx(700, abs=1)
+
+    def test_token_checks_start_after_login(self, monitor):
+        """nav/auth start only after login ends and receive its token."""
+        log = []
+        monitor.repeat = 1
+        self._patch_checks(monitor, log)
+
+        monitor.run_all_checks()
+
+        login_end = next(t for n, e, t, _ in log if n == 'login' and e == 'end')
+        for dependent in ('nav', 'auth'):
+            start, args = next((t, a) for n, e, t, a in log if n == dependent and e == 'start')
+            assert start >= login_end
+            assert args == ('tok-123',)
+
+    def test_results_keep_report_order(self, monitor):
+        monitor.repeat = 1
+        self._patch_checks(monitor, [], delay=0)
+
+        results = monitor.run_all_checks()
+
+        assert list(results['results']) == [
+            'health_endpoint', 'public_teaser', 'frontend_accessible',
+            'login_flow', 'nav_freshness', 'authenticated_endpoints',
+            'admin_endpoint',
+        ]
+
+
+# ============================================================
+# Probe / Percentile Tests
+# ============================================================
+
+class TestProbe:
+    """Tests for probe() repetition and latency summaries."""
+
+    def test_repeat_produces_percentiles(self, monitor):
+        monitor.repeat = 20
+        timings = iter(range(10, 210, 10))
+
+        def check():
+            return SyntheticMonitor._make_result('Fake', 'pass', next(timings))
+
+        result = monitor.probe(check)
+
+        assert result['latency']['samples'] == 20
+        assert result['latency']['p50_ms'] == 100
+        assert result['latency']['p95_ms'] == 190
+        assert result['latency']['p99_ms'] == 200
+        assert result['response_time_ms'] == 100
+
+    def test_any_failed_run_fails_check(self, monitor):
+        monitor.repeat = 3
+        statuses = iter(['pass', 'fail', 'pass'])
+
+        def check():
+            status = next(statuses)
+            return SyntheticMonitor._make_result(
+                'Fake', status, 5, error='HTTP 502' if status == 'fail' else None
+            )
+
+        result = monitor.probe(check)
+
+        assert result['status'] == 'fail'
+        assert result['error'] == 'HTTP 502'
+        assert result['failed_runs'] == 1
+
+    def test_skip_not_repeated(self, monitor):
+        monitor.repeat = 5
+        calls = []
+
+        def check():
+            calls.append(1)
+            return SyntheticMonitor._make_result('Fake', 'skip', 0.0)
+
+        result = monitor.probe(check)
+
+        assert result['status'] == 'skip'
+        assert len(calls) == 1
+
+
+# ============================================================
+# SLO and Latency History Tests
+# ============================================================
+
+def _latency_result(name, p95, status='pass'):
+    result = SyntheticMonitor._make_result(name, status, p95)
+    result['latency'] = {
+        'samples': 5, 'min_ms': p95, 'mean_ms': p95, 'p50_ms': p95,
+        'p95_ms': p95, 'p99_ms': p95, 'max_ms': p95,
+    }
+    return result
+
+
+class TestLatencySlo:
+    """Tests for find_slo_breaches() and latency alerts."""
+
+    def test_breach_reported(self, monitor):
+        breaches = monitor.find_slo_breaches({
+            'health_endpoint': _latency_result('Health Endpoint', 900),
+            'public_teaser': _latency_result('Public Teaser Stats', 200),
+        })
+
+        assert breaches == [{
+            'check': 'health_endpoint', 'name': 'Health Endpoint',
+            'p95_ms': 900, 'slo_ms': 500,
+        }]
+
+    def test_slo_override(self):
+        m = SyntheticMonitor(base_url='https://api.test.com', slos={'health_endpoint': 1000})
+        assert m.find_slo_breaches({
+            'health_endpoint': _latency_result('Health Endpoint', 900),
+        }) == []
+
+    def test_breach_alerts_even_when_checks_pass(self, monitor):
+        results = {
+            'timestamp': '2026-02-26T15:00:00Z',
+            'base_url': 'https://api.test.com',
+            'overall_status': 'pass',
+            'checks_passed': 1,
+            'checks_failed': 0,
+            'checks_skipped': 0,
+            'total_response_time_ms': 900.0,
+            'slo_breaches': [{
+                'check': 'health_endpoint', 'name': 'Health Endpoint',
+                'p95_ms': 900, 'slo_ms': 500,
+            }],
+            'regressions': [],
+            'results': {'health_endpoint': _latency_result('Health Endpoint', 900)},
+        }
+
+        with patch('scripts.devops.synthetic_monitor.os.getenv',
+                   side_effect=lambda k, d='': 'https://discord.test/hook' if k == 'DISCORD_ALERTS_WEBHOOK_URL' else ''), \
+             patch('src.utils.discord.post_embed') as mock_post:
+            monitor.send_notifications(results)
+
+        embed = mock_post.call_args[0][1]
+        assert 'Health Endpoint (latency SLO)' in embed['fields'][0]['name']
+        assert '900ms' in embed['fields'][0]['value']
+
+
+class TestLatencyHistory:
+    """Tests for record_history() regression detection."""
+
+    def _run(self, p95, timestamp):
+        return {
+            'timestamp': timestamp,
+            'results': {'health_endpoint': _latency_result('Health Endpoint', p95)},
+        }
+
+    def test_regression_against_baseline(self, monitor, tmp_path):
+        monitor.history_db = tmp_path / 'history.db'
+        for i in range(6):
+            assert monitor.record_history(self._run(100, f'2026-03-01T10:0{i}:00Z')) == []
+
+        regressions = monitor.record_history(self._run(400, '2026-03-01T10:10:00Z'))
+
+        assert regressions == [{
+            'check': 'health_endpoint', 'name': 'Health Endpoint',
+            'p95_ms': 400, 'baseline_p95_ms': 100,
+        }]
+
+    def test_no_regression_without_enough_history(self, monitor, tmp_path):
+        monitor.history_db = tmp_path / 'history.db'
+        monitor.record_history(self._run(100, '2026-03-01T10:00:00Z'))
+        assert monitor.record_history(self._run(900, '2026-03-01T10:01:00Z')) == []
+
+    def test_small_absolute_change_ignored(self, monitor, tmp_path):
+        """A 3x jump from 10ms to 30ms is noise, not a regression."""
+        monitor.history_db = tmp_path / 'history.db'
+        for i in range(6):
+            monitor.record_history(self._run(10, f'2026-03-01T10:0{i}:00Z'))
+        assert monitor.record_history(self._run(30, '2026-03-01T10:10:00Z')) == []
+
+    def test_recent_rows_for_trend(self, monitor, tmp_path):
+        from scripts.devops.synthetic_monitor import LatencyHistory
+
+        monitor.history_db = tmp_path / 'history.db'
+        for i in range(3):
+            run = self._run(100 + i, f'2026-03-01T10:0{i}:00Z')
+            run['base_url'] = monitor.base_url
+            monitor.record_history(run)
+
+        rows = LatencyHistory(monitor.history_db).recent(monitor.base_url, limit=2)
+        assert [r['p95_ms'] for r in rows] == [102, 101]
+
+
+# ============================================================
+# Local API Tests
+# ============================================================
+
+@pytest.fixture
+def local_api():
+    """Serve the Fund API on a free localhost port (no lifespan hooks)."""
+    import socket
+    import threading
+    import time as _time
+    import uvicorn
+    from apps.investor_portal.api.main import app
+
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, lifespan='off', log_level='error'))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    deadline = _time.time() + 10
+    while not server.started and _time.time() < deadline:
+        _time.sleep(0.02)
+
+    teaser = {
+        'since_inception_pct': 4.2, 'inception_date': '2026-01-01',
+        'total_investors': 3, 'trading_days': 30, 'as_of_date': '2026-02-26',
+    }
+    with patch('apps.investor_portal.api.routes.public.get_teaser_stats', return_value=teaser):
+        yield f'http://127.0.0.1:{port}'
+
+    server.should_exit = True
+    thread.join(timeout=5)
+    sock.close()
+
+
+class TestAgainstLocalApi:
+    """Runs the monitor against the FastAPI app served locally."""
+
+    def test_run_all_checks_local(self, local_api, tmp_path):
+        m = SyntheticMonitor(base_url=local_api, admin_key='', repeat=5,
+                             history_db=tmp_path / 'history.db')
+        m.frontend_url = f'{local_api}/docs'
+        m.monitor_email = ''
+        m.monitor_password = ''
+
+        results = m.run_all_checks()
+        m.record_history(results)
+
+        checks = results['results']
+        assert checks['health_endpoint']['status'] == 'pass'
+        assert checks['public_teaser']['status'] == 'pass'
+        assert checks['health_endpoint']['latency']['samples'] == 5
+        assert checks['health_endpoint']['latency']['p95_ms'] < 500
+        assert checks['login_flow']['status'] == 'skip'
+        assert checks['admin_endpoint']['status'] == 'skip'
+        assert results['slo_breaches'] == []
+
+        from scripts.devops.synthetic_monitor import LatencyHistory
+        rows = LatencyHistory(m.history_db).recent(local_api)
+        assert {r['check_key'] for r in rows} >= {'health_endpoint', 'public_teaser'}
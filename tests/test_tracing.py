@@ -0,0 +1,179 @@
+"""
+Tests for pipeline tracing (src/monitoring/tracing.py).
+
+Covers:
+- Span timing, attributes, errors and parent/child links
+- One write per trace when the root span ends
+- Spans from pipeline steps join the caller's trace
+- Storage never creates a missing database and never raises
+- Instrumented ETL pipeline stages
+"""
+
+import json
+import sys
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.monitoring import tracing
+from src.monitoring.tracing import (
+    STATUS_ERROR,
+    STATUS_OK,
+    Tracer,
+    configure_tracing,
+    current_span,
+    span,
+    traced,
+)
+
+
+@pytest.fixture
+def batches():
+    """Route the module tracer to an in-memory list of exported batches."""
+    exported = []
+    previous = tracing.get_tracer()
+    configure_tracing(enabled=True, exporter=exported.append)
+    yield exported
+    tracing._tracer = previous
+
+
+class TestSpans:
+
+    def test_nested_spans_linked(self, batches):
+        with span('daily_nav', run='1') as root:
+            with span('daily_nav.nav') as child:
+                time.sleep(0.01)
+                current_span().set_attribute('nav', 1.05)
+
+        assert len(batches) == 1
+        child_out, root_out = batches[0]
+        assert child_out is child and root_out is root
+        assert child.parent_id == root.span_id
+        assert child.trace_id == root.trace_id
+        assert root.parent_id is None
+        assert child.attributes == {'nav': 1.05}
+        assert child.duration_ms >= 10
+        assert root.duration_ms >= child.duration_ms
+
+    def test_error_recorded_and_raised(self, batches):
+        with pytest.raises(ValueError):
+            with span('sync.push'):
+                raise ValueError("HTTP 500")
+        (s,) = batches[0]
+        assert s.status == STATUS_ERROR
+        assert s.error == "ValueError: HTTP 500"
+
+    def test_decorator(self, batches):
+        @traced('report.generate')
+        def generate(x):
+            return x * 2
+
+        assert generate(21) == 42
+        assert batches[0][0].name == 'report.generate'
+        assert batches[0][0].status == STATUS_OK
+
+    def test_disabled_is_noop(self):
+        tracer = Tracer(enabled=False, exporter=pytest.fail)
+        with tracer.span('x') as s:
+            s.set_attribute('a', 1)
+        assert current_span().name is None
+
+    def test_late_child_written_alone(self, batches):
+        with span('root'):
+            child = span('late')
+        with child:
+            pass
+        assert [[s.name for s in b] for b in batches] == [['root'], ['late']]
+
+
+class TestPipelineSpans:
+
+    def test_steps_join_caller_trace(self, batches):
+        from src.automation.pipeline import Pipeline, PipelineStep
+
+        def nav():
+            with span('nav.write'):
+                pass
+
+        with span('daily_nav') as root:
+            Pipeline('daily_nav', [
+                PipelineStep('balance', lambda: 1, critical=True),
+                PipelineStep('nav', nav, depends_on=('balance',), critical=True),
+            ]).run()
+
+        names = {s.name: s for s in batches[0]}
+        assert set(names) == {'daily_nav', 'daily_nav.balance', 'daily_nav.nav', 'nav.write'}
+        assert names['daily_nav.nav'].parent_id == root.span_id
+        assert names['nav.write'].parent_id == names['daily_nav.nav'].span_id
+        assert names['daily_nav.balance'].attributes == {'critical': True}
+
+
+class TestStorage:
+
+    def test_written_in_one_transaction(self, tmp_path):
+        db_path = tmp_path / "tovito.db"
+        sqlite3.connect(db_path).close()
+        tracer = Tracer(db_path=str(db_path), enabled=True)
+        with tracer.span('etl.run_full_pipeline'):
+            with tracer.span('etl.extract', provider='tastytrade'):
+                pass
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT name, parent_id IS NULL, status, attributes FROM trace_spans "
+            "ORDER BY parent_id IS NULL").fetchall()
+        conn.close()
+        assert rows[0][:3] == ('etl.extract', 0, 'ok')
+        assert json.loads(rows[0][3]) == {'provider': 'tastytrade'}
+        assert rows[1][:3] == ('etl.run_full_pipeline', 1, 'ok')
+
+    def test_missing_database_not_created(self, tmp_path):
+        db_path = tmp_path / "missing.db"
+        tracer = Tracer(db_path=str(db_path), enabled=True)
+        with tracer.span('x'):
+            pass
+        assert not db_path.exists()
+
+    def test_env_disables(self, monkeypatch):
+        monkeypatch.setenv('TRACING_ENABLED', 'false')
+        assert Tracer().enabled is False
+
+
+class TestInstrumentedETL:
+
+    def test_stage_spans(self, batches, tmp_path):
+        from src.etl import load
+        transform_result = {'transformed': [(1, {})], 'errors': [], 'skipped': []}
+        with patch('src.etl.extract.extract_from_brokerage',
+                   return_value={'ingested': 3, 'skipped': 0}), \
+                patch('src.etl.transform.transform_pending', return_value=transform_result), \
+                patch.object(load, 'load_to_trades',
+                             return_value={'loaded': 1, 'duplicates': 0, 'load_errors': 0}):
+            load.run_full_pipeline(source='tastytrade', db_path=tmp_path / "t.db")
+
+        spans = {s.name: s for s in batches[0]}
+        assert set(spans) == {'etl.run_full_pipeline', 'etl.extract', 'etl.transform', 'etl.load'}
+        assert spans['etl.extract'].attributes == {'provider': 'tastytrade', 'ingested': 3}
+        assert spans['etl.load'].attributes == {'loaded': 1}
+
+    def test_spans_written_to_given_db(self, tmp_path):
+        from src.etl import load
+        db_path = tmp_path / "t.db"
+        sqlite3.connect(db_path).close()
+        tracing.configure_tracing(enabled=True)
+        transform_result = {'transformed': [], 'errors': [], 'skipped': []}
+        with patch('src.etl.extract.extract_from_brokerage',
+                   return_value={'ingested': 0, 'skipped': 0}), \
+                patch('src.etl.transform.transform_pending', return_value=transform_result):
+            load.run_full_pipeline(source='tastytrade', db_path=db_path)
+
+        conn = sqlite3.connect(db_path)
+        names = {r[0] for r in conn.execute("SELECT name FROM trace_spans")}
+        conn.close()
+        assert names == {'etl.run_full_pipeline', 'etl.extract', 'etl.transform'}
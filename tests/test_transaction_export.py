@@ -0,0 +1,250 @@
+"""
+Tests for the streaming transaction export
+(scripts/reporting/export_transactions_excel.py).
+
+Covers:
+- Date-range and investor filters pushed into the SQL WHERE clause
+- SQL GROUP BY summaries match a pandas groupby of the same rows
+- Streaming xlsx (write-only workbook), CSV and Parquet output
+- Failed exports leave no partial file
+- Rows/sec and peak memory reported
+- schema_v2 tables: nav_per_share exported as share_price, soft-deleted rows skipped
+"""
+
+import csv
+import sys
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.reporting.export_transactions_excel import (
+    TransactionExport,
+    build_filter,
+    export_transactions_to_excel,
+)
+
+TYPES = ('Initial', 'Contribution', 'Withdrawal', 'Tax_Payment')
+
+
+@pytest.fixture
+def export_db(tmp_path):
+    db_path = tmp_path / "tovito.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE investors (investor_id TEXT PRIMARY KEY, name TEXT)")
+    conn.execute("""
+        CREATE TABLE transactions (
+            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            investor_id TEXT NOT NULL,
+            transaction_type TEXT NOT NULL,
+            amount REAL NOT NULL,
+            share_price REAL NOT NULL,
+            shares_transacted REAL NOT NULL,
+            notes TEXT,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.executemany("INSERT INTO investors VALUES (?, ?)", [
+        ("20260101-01A", "Alpha Investor"),
+        ("20260101-02A", "Beta Investor"),
+    ])
+    rows = []
+    for i in range(1200):
+        investor = ("20260101-01A", "20260101-02A", "20260101-99Z")[i % 3]
+        date = f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        rows.append((date, investor, TYPES[i % 4], (i % 50) * 100.0 - 1000,
+                     1.0 + i / 10000, i / 7, None if i % 5 else "note, with comma",
+                     f"{date} 10:00:00"))
+    conn.executemany("""
+        INSERT INTO transactions (date, investor_id, transaction_type, amount,
+                                  share_price, shares_transacted, notes, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def schema_v2_db(tmp_path):
+    from src.database.schema_v2 import INVESTORS_TABLE, TRANSACTIONS_TABLE
+
+    db_path = tmp_path / "tovito_v2.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(INVESTORS_TABLE)
+    conn.execute(TRANSACTIONS_TABLE)
+    conn.execute("""
+        INSERT INTO investors (investor_id, name, current_shares, net_investment,
+                               initial_capital, status, join_date)
+        VALUES ('20260101-01A', 'Alpha Investor', 1000, 1000, 1000, 'Active', '2026-01-01')
+    """)
+    conn.executemany("""
+        INSERT INTO transactions (date, investor_id, transaction_type, amount,
+                                  shares_transacted, nav_per_share, is_deleted)
+        VALUES (?, '20260101-01A', ?, ?, ?, ?, ?)
+    """, [
+        ('2026-01-01', 'Initial', 1000.0, 1000.0, 1.0, 0),
+        ('2026-02-01', 'Contribution', 550.0, 500.0, 1.1, 0),
+        ('2026-02-02', 'Contribution', 550.0, 500.0, 1.1, 1),   # Soft-deleted
+    ])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _frame(db_path, where="", params=()):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(
+        "SELECT t.*, i.name AS investor_name FROM transactions t "
+        f"LEFT JOIN investors i ON t.investor_id = i.investor_id {where}",
+        conn, params=params)
+    conn.close()
+    return df
+
+
+class TestBuildFilter:
+
+    def test_no_filters(self):
+        assert build_filter() == ("", [])
+
+    def test_all_filters_parameterised(self):
+        where, params = build_filter("2026-01-01", "2026-03-31", "20260101-01A")
+        assert where == "WHERE t.date >= ? AND t.date <= ? AND t.investor_id = ?"
+        assert params == ["2026-01-01", "2026-03-31", "20260101-01A"]
+
+
+class TestSummaries:
+
+    def test_match_pandas_groupby(self, export_db):
+        summaries = TransactionExport(export_db).summaries()
+        df = _frame(export_db)
+
+        by_type = df.groupby('transaction_type')['amount'].agg(['count', 'sum'])
+        assert {t: (c, s) for t, c, s, _ in summaries['by_type']} == {
+            t: (row['count'], row['sum']) for t, row in by_type.iterrows()}
+
+        by_investor = df.groupby('investor_name')['amount'].agg(['count', 'sum'])
+        assert {n: (c, s) for n, c, s, _ in summaries['by_investor']} == {
+            n: (row['count'], row['sum']) for n, row in by_investor.iterrows()}
+
+        overview = summaries['overview']
+        assert overview['count'] == len(df)
+        assert overview['first_date'] == df['date'].min()
+        assert overview['days'] == (pd.to_datetime(df['date'].max())
+                                    - pd.to_datetime(df['date'].min())).days
+
+    def test_filters_applied_in_sql(self, export_db):
+        export = TransactionExport(export_db, start="2026-03-01", end="2026-04-30",
+                                   investor="20260101-01A")
+        statements = []
+        conn = sqlite3.connect(export_db)
+        conn.set_trace_callback(statements.append)
+        summaries = export.summaries(conn)
+        conn.close()
+
+        df = _frame(export_db, "WHERE t.date BETWEEN ? AND ? AND t.investor_id = ?",
+                    ("2026-03-01", "2026-04-30", "20260101-01A"))
+        assert summaries['overview']['count'] == len(df) > 0
+        assert [n for n, *_ in summaries['by_investor']] == ["Alpha Investor"]
+        queries = [s for s in statements if s.startswith("SELECT")]
+        assert queries and all("t.investor_id = '20260101-01A'" in s for s in queries)
+
+    def test_empty_selection(self, export_db):
+        summaries = TransactionExport(export_db, start="2030-01-01").summaries()
+        assert summaries['overview'] == {'first_date': None, 'last_date': None,
+                                         'days': None, 'count': 0, 'total_amount': 0}
+
+
+class TestWrite:
+
+    def test_xlsx_sheets(self, export_db, tmp_path):
+        path = tmp_path / "tx.xlsx"
+        result = TransactionExport(export_db, chunk_rows=128).write(path)
+
+        wb = load_workbook(path, read_only=True)
+        assert wb.sheetnames == ['All Transactions', 'Summary by Type',
+                                 'Summary by Investor', 'Overview']
+        rows = list(wb['All Transactions'].values)
+        assert rows[0][:4] == ('transaction_id', 'date', 'investor_id', 'investor_name')
+        assert len(rows) == result['rows'] + 1 == 1201
+        types = list(wb['Summary by Type'].values)
+        assert types[0] == ('Transaction Type', 'Count', 'Total Amount', 'Total Shares')
+        assert sum(r[1] for r in types[1:]) == 1200
+        wb.close()
+
+        assert result['format'] == 'xlsx'
+        assert result['rows_per_sec'] > 0
+        assert result['peak_memory_mb'] > 0
+        assert len(result['preview']) == 10
+
+    def test_csv_rows_sorted_and_filtered(self, export_db, tmp_path):
+        path = tmp_path / "tx.csv"
+        result = TransactionExport(export_db, investor="20260101-01A",
+                                   chunk_rows=50).write(path)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert result['rows'] == len(rows) == 400
+        assert {r['investor_id'] for r in rows} == {"20260101-01A"}
+        dates = [r['date'] for r in rows]
+        assert dates == sorted(dates)
+        assert any(r['notes'] == "note, with comma" for r in rows)
+
+    def test_unknown_format_rejected(self, export_db, tmp_path):
+        with pytest.raises(ValueError):
+            TransactionExport(export_db).write(tmp_path / "tx.json")
+
+    def test_failed_export_leaves_no_file(self, export_db, tmp_path):
+        export = TransactionExport(export_db)
+        export._select = lambda: "SELECT * FROM missing_table"
+        with pytest.raises(sqlite3.OperationalError):
+            export.write(tmp_path / "tx.csv")
+        assert list(tmp_path.glob("tx.csv*")) == []
+
+    def test_parquet_round_trip(self, export_db, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "tx.parquet"
+        result = TransactionExport(export_db, chunk_rows=300).write(path)
+        table = pq.read_table(path)
+        assert result['rows'] == table.num_rows == 1200
+
+
+class TestSchemaV2:
+    """transactions tables with nav_per_share and is_deleted."""
+
+    def test_share_price_from_nav_per_share(self, schema_v2_db, tmp_path):
+        path = tmp_path / "tx.csv"
+        result = TransactionExport(schema_v2_db).write(path)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert result['rows'] == 2
+        assert [float(r['share_price']) for r in rows] == [1.0, 1.1]
+
+    def test_soft_deleted_rows_left_out(self, schema_v2_db):
+        summaries = TransactionExport(schema_v2_db).summaries()
+
+        assert summaries['overview']['count'] == 2
+        assert summaries['overview']['total_amount'] == 1550.0
+        assert summaries['overview']['last_date'] == '2026-02-01'
+
+
+class TestEntryPoint:
+
+    def test_export_prints_stats(self, export_db, tmp_path, capsys):
+        output = tmp_path / "out" / "tx.csv"
+        assert export_transactions_to_excel(start="2026-01-01", end="2026-06-30", fmt='csv',
+                                            output=str(output), db_path=export_db) is True
+        out = capsys.readouterr().out
+        assert "rows/sec" in out and "peak Python memory" in out
+        assert output.exists()
+
+    def test_no_matching_rows(self, export_db, capsys):
+        assert export_transactions_to_excel(start="2030-01-01", db_path=export_db) is False
+        assert "No transactions found" in capsys.readouterr().out
@@ -8,6 +8,7 @@ Tests the core tutorial infrastructure modules:
 - HTML guide generator
 - Video composer (frame rendering)
 - CLI recorder terminal rendering
+- Render cache, single-pass video command and build farm
 """
 
 import os
@@ -45,6 +46,16 @@ def temp_dir():
         yield Path(td)
 
 
+@pytest.fixture(autouse=True)
+def render_cache_dir(temp_dir, monkeypatch):
+    """Keep cached renders out of data/tutorials."""
+    from scripts.tutorials import config
+    cache_dir = temp_dir / '.cache'
+    monkeypatch.setattr(config, 'CACHE_DIR', cache_dir)
+    monkeypatch.delenv('TUTORIAL_CACHE', raising=False)
+    return cache_dir
+
+
 @pytest.fixture
 def sample_image(temp_dir):
     """Create a sample 1280x720 test image."""
@@ -376,6 +387,154 @@ class TestVideoComposer:
             video_composer.compose_cli_video(['frame.png'], temp_dir / 'out.mp4')
 
 
+# ============================================================
+# RENDER CACHE TESTS
+# ============================================================
+
+class TestRenderCache:
+    def test_terminal_frame_cache_hit_skips_render(self, temp_dir, render_cache_dir, monkeypatch):
+        from scripts.tutorials import cli_recorder
+
+        first = save_terminal_frame("$ python backup.py", temp_dir / 'a.png', title="Backup")
+        assert len(list((render_cache_dir / 'frames').glob('*.png'))) == 1
+
+        monkeypatch.setattr(cli_recorder, 'render_terminal_frame',
+                            lambda *a, **kw: pytest.fail("cache hit should not re-render"))
+        second = save_terminal_frame("$ python backup.py", temp_dir / 'b.png', title="Backup")
+        assert Path(second).read_bytes() == Path(first).read_bytes()
+
+    def test_cache_disabled_by_env(self, temp_dir, render_cache_dir, monkeypatch):
+        monkeypatch.setenv('TUTORIAL_CACHE', 'off')
+        save_terminal_frame("$ ls", temp_dir / 'a.png')
+        assert (temp_dir / 'a.png').exists()
+        assert not (render_cache_dir / 'frames').exists()
+
+    def test_annotation_keyed_on_params_and_source(self, sample_image, temp_dir, render_cache_dir):
+        add_numbered_callout(sample_image, 100, 100, 1, output_path=temp_dir / 'a.png')
+        add_numbered_callout(sample_image, 100, 100, 1, output_path=temp_dir / 'b.png')
+        add_numbered_callout(sample_image, 100, 100, 2, output_path=temp_dir / 'c.png')
+        assert len(list((render_cache_dir / 'frames').glob('*.png'))) == 2
+
+        Image.new('RGB', (1280, 720), color=(0, 0, 0)).save(sample_image)
+        add_numbered_callout(sample_image, 100, 100, 1, output_path=temp_dir / 'd.png')
+        assert len(list((render_cache_dir / 'frames').glob('*.png'))) == 3
+        assert (temp_dir / 'd.png').read_bytes() != (temp_dir / 'a.png').read_bytes()
+
+
+# ============================================================
+# SINGLE-PASS VIDEO COMPOSITION TESTS
+# ============================================================
+
+class TestTutorialVideo:
+    @pytest.fixture
+    def frames(self, temp_dir):
+        paths = []
+        for i in range(3):
+            path = temp_dir / f'frame{i}.png'
+            Image.new('RGB', (1280, 720), color=(i * 80, 100, 150)).save(path)
+            paths.append(str(path))
+        return paths
+
+    def test_command_concats_all_segments_once(self, frames, temp_dir):
+        from scripts.tutorials.video_composer import build_tutorial_command
+
+        args = build_tutorial_command([(fp, 2) for fp in frames], temp_dir / 'out.mp4', fps=25)
+        assert args.count('-i') == 3
+        assert args.count('-filter_complex') == 1
+        graph = args[args.index('-filter_complex') + 1]
+        assert '[v0][v1][v2]concat=n=3:v=1:a=0[out]' in graph
+        assert args[-1] == str(temp_dir / 'out.mp4')
+
+    def test_command_no_segments_raises(self, temp_dir):
+        from scripts.tutorials.video_composer import build_tutorial_command
+
+        with pytest.raises(ValueError, match="No frames"):
+            build_tutorial_command([], temp_dir / 'out.mp4')
+
+    def test_unchanged_video_not_re_encoded(self, frames, temp_dir, monkeypatch):
+        from scripts.tutorials import video_composer
+
+        encodes = []
+
+        def fake_ffmpeg(args, timeout=120):
+            encodes.append(args)
+            Path(args[-1]).write_bytes(b'mp4')
+
+        monkeypatch.setattr(video_composer, 'check_ffmpeg', lambda: True)
+        monkeypatch.setattr(video_composer, '_run_ffmpeg', fake_ffmpeg)
+
+        output = temp_dir / 'video' / 'demo.mp4'
+        assert video_composer.compose_tutorial_video(frames, output, "Demo") == (output, True)
+        assert video_composer.compose_tutorial_video(frames, output, "Demo") == (output, False)
+        assert len(encodes) == 1
+        # Title card + 3 frames + end card in one encode
+        assert encodes[0].count('-i') == 5
+        assert not output.with_name('demo.part.mp4').exists()
+
+        Image.new('RGB', (1280, 720), color=(1, 2, 3)).save(frames[1])
+        assert video_composer.compose_tutorial_video(frames, output, "Demo") == (output, True)
+        assert len(encodes) == 2
+
+
+# ============================================================
+# BUILD FARM TESTS
+# ============================================================
+
+class FakeRecorder:
+    """Stands in for a BaseRecorder subclass in build farm tests."""
+    built = []
+
+    def __init__(self, tutorial_id):
+        self.tutorial_id = tutorial_id
+        self.steps = []
+        self.video_status = None
+
+    def run(self, skip_video=False):
+        if self.tutorial_id == 'admin_backup':
+            raise RuntimeError("browser crashed")
+        FakeRecorder.built.append(self.tutorial_id)
+        self.steps = [object(), object()]
+        if not skip_video:
+            self.video_status = 'cached'
+
+
+class TestBuildFarm:
+    @pytest.fixture(autouse=True)
+    def fake_recorder(self, monkeypatch):
+        from scripts.tutorials import build_farm
+        FakeRecorder.built = []
+        monkeypatch.setattr(build_farm, 'get_recorder_class', lambda tid: FakeRecorder)
+
+    def test_shared_resource_tutorials_chained(self):
+        from scripts.tutorials.build_farm import plan_builds
+
+        units = plan_builds(['admin_daily_nav', 'admin_backup', 'admin_fund_flow'])
+        assert ['admin_daily_nav', 'admin_fund_flow'] in units
+        assert ['admin_backup'] in units
+        assert len(units) == 2
+
+    def test_run_in_process(self):
+        from scripts.tutorials.build_farm import run_builds
+
+        results = run_builds(['admin_fund_flow', 'admin_backup'], jobs=1)
+        assert [r.tutorial_id for r in results] == ['admin_fund_flow', 'admin_backup']
+        assert results[0].status == 'cached'
+        assert results[0].steps == 2
+        assert results[1].status == 'failed'
+        assert 'browser crashed' in results[1].error
+
+    def test_run_parallel(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from scripts.tutorials.build_farm import run_builds
+
+        ids = ['admin_fund_flow', 'admin_daily_nav', 'admin_backup']
+        results = run_builds(ids, jobs=4, skip_video=True,
+                             executor_factory=ThreadPoolExecutor)
+        assert [r.status for r in results] == ['guide_only', 'guide_only', 'failed']
+        # Dev-DB tutorials ran in their given order within one unit
+        assert FakeRecorder.built == ['admin_fund_flow', 'admin_daily_nav']
+
+
 # ============================================================
 # TUTORIAL REGISTRY COMPLETENESS
 # ============================================================
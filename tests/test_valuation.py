@@ -0,0 +1,247 @@
+"""
+Tests for single-query fund valuation (src/automation/valuation.py).
+
+Covers:
+- Values match the per-investor calculation NAVCalculator used before
+- The fund is valued in one query however many investors there are
+- Inactive investors are only valued when asked for by id
+- A blank status counts as active, as in the daily NAV share count
+- Behaviour before any NAV exists
+- NAVCalculator's investor value methods use the valuation
+"""
+
+import random
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.automation.valuation import FundValuation, active_investor_filter, value_fund
+from src.utils.rounding import round_dollars, round_pct
+
+TAX_RATE = 0.37
+
+
+def _reference_value(shares, invested, nav, tax_rate=TAX_RATE):
+    """NAVCalculator.get_investor_value()'s original per-investor math."""
+    current_value = round_dollars(shares * nav)
+    unrealized_gain = round_dollars(max(0, current_value - invested))
+    tax_liability = round_dollars(unrealized_gain * tax_rate)
+    after_tax_value = round_dollars(current_value - tax_liability)
+    if invested > 0:
+        total_return = round_pct(((current_value - invested) / invested) * 100)
+        after_tax_return = round_pct(((after_tax_value - invested) / invested) * 100)
+    else:
+        total_return = 0.0
+        after_tax_return = 0.0
+    return {
+        'current_value': current_value,
+        'unrealized_gain': unrealized_gain,
+        'tax_liability': tax_liability,
+        'after_tax_value': after_tax_value,
+        'total_return_percent': total_return,
+        'after_tax_return_percent': after_tax_return,
+    }
+
+
+def _create_db(path):
+    from src.database.schema_v2 import DAILY_NAV_TABLE, INVESTORS_TABLE
+
+    conn = sqlite3.connect(path)
+    conn.execute(INVESTORS_TABLE)
+    conn.execute(DAILY_NAV_TABLE)
+    return conn
+
+
+def _add_investor(conn, investor_id, shares, invested, status='Active'):
+    conn.execute("""
+        INSERT INTO investors (investor_id, name, current_shares, net_investment,
+                               initial_capital, status, join_date)
+        VALUES (?, ?, ?, ?, ?, ?, '2026-01-01')
+    """, (investor_id, f"Investor {investor_id}", shares, invested, invested, status))
+
+
+def _add_nav(conn, day, nav, total_shares):
+    conn.execute("""
+        INSERT INTO daily_nav (date, total_portfolio_value, total_shares, nav_per_share)
+        VALUES (?, ?, ?, ?)
+    """, (day, round_dollars(nav * total_shares), total_shares, nav))
+
+
+def _fund(conn, investors, nav=1.2345):
+    for index, (shares, invested) in enumerate(investors):
+        _add_investor(conn, f"20260101-{index:02d}A", shares, invested)
+    total_shares = sum(shares for shares, _ in investors)
+    _add_nav(conn, '2026-03-02', 1.0, total_shares)
+    _add_nav(conn, '2026-03-03', nav, total_shares)
+    conn.commit()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "valuation.db")
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = _create_db(db_path)
+    yield conn
+    conn.close()
+
+
+class TestValueFund:
+
+    def test_matches_per_investor_calculation(self, conn):
+        rng = random.Random(7)
+        investors = [(round(rng.uniform(0, 50000), 4), round(rng.uniform(0, 60000), 2))
+                     for _ in range(40)]
+        investors.append((1000.0, 0.0))   # No net investment
+        _fund(conn, investors)
+
+        valuation = value_fund(conn, tax_rate=TAX_RATE)
+
+        assert len(valuation) == len(investors)
+        assert valuation.nav_per_share == 1.2345
+        assert valuation.nav_date == '2026-03-03'
+        for index, (shares, invested) in enumerate(investors):
+            row = valuation.row(f"20260101-{index:02d}A")
+            expected = _reference_value(shares, invested, 1.2345)
+            assert {k: row[k] for k in expected} == expected
+            assert row['share_price'] == 1.2345
+            assert row['total_gain'] == round_dollars(row['current_value'] - invested)
+
+    def test_allocation_adds_up(self, conn):
+        _fund(conn, [(1000.0, 900.0), (3000.0, 3100.0)])
+
+        valuation = value_fund(conn)
+
+        assert valuation.total_shares == 4000.0
+        assert valuation.total_portfolio_percent == pytest.approx(100.0, abs=0.01)
+        assert valuation.portfolio_percent[0] == pytest.approx(25.0, abs=0.01)
+        assert valuation.total_value == round_dollars(sum(valuation.current_value))
+
+    def test_losses_carry_no_tax(self, conn):
+        _fund(conn, [(1000.0, 1500.0)], nav=1.0)
+
+        row = value_fund(conn).row("20260101-00A")
+
+        assert row['total_gain'] == -500.0
+        assert row['unrealized_gain'] == 0.0
+        assert row['tax_liability'] == 0.0
+        assert row['after_tax_value'] == 1000.0
+
+    @pytest.mark.parametrize('count', [1, 25, 200])
+    def test_one_query_for_any_fund_size(self, conn, count):
+        _fund(conn, [(100.0 + i, 100.0) for i in range(count)])
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        valuation = value_fund(conn)
+
+        conn.set_trace_callback(None)
+        assert len(valuation) == count
+        assert len(statements) == 1
+
+    def test_inactive_investors_only_by_id(self, conn):
+        _fund(conn, [(1000.0, 1000.0)])
+        _add_investor(conn, "20250101-01A", 0.0, 0.0, status='Inactive')
+
+        assert value_fund(conn).investor_id == ["20260101-00A"]
+        valuation = value_fund(conn, investor_ids=["20250101-01A"])
+        assert valuation.investor_id == ["20250101-01A"]
+        assert valuation.current_value == [0.0]
+
+    def test_blank_status_counts_as_active(self):
+        # Older databases allow a NULL or empty status
+        from src.database.schema_v2 import DAILY_NAV_TABLE
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE investors (investor_id TEXT, name TEXT, "
+                     "current_shares REAL, net_investment REAL, status TEXT)")
+        conn.execute(DAILY_NAV_TABLE)
+        conn.executemany("INSERT INTO investors VALUES (?, ?, ?, ?, ?)", [
+            ("20260101-01A", "A", 1000.0, 1000.0, 'Active'),
+            ("20260101-02A", "B", 500.0, 500.0, None),
+            ("20260101-03A", "C", 250.0, 250.0, ''),
+            ("20260101-04A", "D", 100.0, 100.0, 'Inactive'),
+        ])
+        _add_nav(conn, '2026-03-02', 1.0, 1750.0)
+
+        valuation = value_fund(conn)
+        total = conn.execute(
+            f"SELECT SUM(current_shares) FROM investors WHERE {active_investor_filter()}"
+        ).fetchone()[0]
+        conn.close()
+
+        assert valuation.investor_id == ["20260101-01A", "20260101-02A", "20260101-03A"]
+        assert valuation.total_shares == total == valuation.nav_total_shares
+
+    def test_unknown_or_empty_ids(self, conn):
+        _fund(conn, [(1000.0, 1000.0)])
+
+        assert len(value_fund(conn, investor_ids=["missing"])) == 0
+        assert len(value_fund(conn, investor_ids=[])) == 0
+        assert value_fund(conn).row("missing") is None
+
+    def test_no_nav_yet(self, conn):
+        _add_investor(conn, "20260101-01A", 1000.0, 1000.0)
+
+        valuation = value_fund(conn)
+
+        assert valuation.nav_per_share is None
+        assert valuation.current_shares == [1000.0]
+        assert valuation.current_value == [None]
+
+    def test_empty_fund(self, conn):
+        valuation = value_fund(conn)
+
+        assert isinstance(valuation, FundValuation)
+        assert len(valuation) == 0
+        assert valuation.rows() == []
+        assert valuation.total_value == 0.0
+
+
+class TestNAVCalculatorValuation:
+
+    @pytest.fixture
+    def calculator(self, db_path, conn):
+        from src.automation.nav_calculator import NAVCalculator
+
+        with patch('src.automation.nav_calculator.get_brokerage_client'):
+            calculator = NAVCalculator(db_path=db_path)
+        calculator.tax_rate = TAX_RATE
+        return calculator
+
+    def test_get_investor_value(self, calculator, conn):
+        _fund(conn, [(1000.0, 1000.0), (2000.0, 1500.0)])
+
+        value = calculator.get_investor_value("20260101-01A")
+
+        assert value['name'] == "Investor 20260101-01A"
+        assert value['share_price'] == 1.2345
+        for key, expected in _reference_value(2000.0, 1500.0, 1.2345).items():
+            assert value[key] == expected
+
+    def test_get_investor_value_errors(self, calculator, conn):
+        _add_investor(conn, "20260101-01A", 1000.0, 1000.0)
+        conn.commit()
+
+        with pytest.raises(ValueError, match="not found"):
+            calculator.get_investor_value("missing")
+        with pytest.raises(ValueError, match="No NAV data"):
+            calculator.get_investor_value("20260101-01A")
+
+    def test_get_all_investor_values(self, calculator, conn):
+        _fund(conn, [(1000.0, 1000.0), (2000.0, 1500.0)])
+        _add_investor(conn, "20250101-09A", 0.0, 0.0, status='Inactive')
+        conn.commit()
+
+        values = calculator.get_all_investor_values()
+
+        assert [v['investor_id'] for v in values] == ["20260101-00A", "20260101-01A"]
+        assert values == [calculator.get_investor_value(v['investor_id']) for v in values]